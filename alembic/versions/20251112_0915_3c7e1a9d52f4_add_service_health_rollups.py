@@ -0,0 +1,85 @@
+"""add_service_health_rollups
+
+Revision ID: 3c7e1a9d52f4
+Revises: 60d4f94b9647
+Create Date: 2025-11-12 09:15:00.000000
+
+Uptime rollups:
+- Add service_health_rollups table (per-service minute and hour aggregates)
+- Backfill rollups from existing service_health_checks rows
+- Add partial index on non-up health checks for incident lookups
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7e1a9d52f4'
+down_revision = '60d4f94b9647'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create health check rollups and backfill them.
+    """
+
+    # ==================== Rollups Table ====================
+    op.create_table(
+        'service_health_rollups',
+        sa.Column('service_name', sa.String(length=50), nullable=False),
+        sa.Column('bucket_size', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('total_checks', sa.Integer(), nullable=False),
+        sa.Column('up_checks', sa.Integer(), nullable=False),
+        sa.Column('up_latency_sum_ms', sa.Float(), nullable=False),
+        sa.Column('max_latency_ms', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('service_name', 'bucket_size', 'bucket_start')
+    )
+
+    # Report queries filter by bucket size and time range across all services
+    op.create_index(
+        'idx_service_health_rollups_bucket',
+        'service_health_rollups',
+        ['bucket_size', 'bucket_start'],
+        postgresql_using='btree'
+    )
+
+    # ==================== Backfill ====================
+    for bucket_size in ('minute', 'hour'):
+        op.execute(f"""
+            INSERT INTO service_health_rollups (
+                service_name, bucket_size, bucket_start,
+                total_checks, up_checks, up_latency_sum_ms, max_latency_ms
+            )
+            SELECT
+                service_name,
+                '{bucket_size}',
+                date_trunc('{bucket_size}', checked_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                COUNT(*),
+                COUNT(*) FILTER (WHERE status = 'up'),
+                COALESCE(SUM(latency_ms) FILTER (WHERE status = 'up'), 0),
+                COALESCE(MAX(latency_ms), 0)
+            FROM service_health_checks
+            GROUP BY service_name, date_trunc('{bucket_size}', checked_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+        """)
+
+    # ==================== Health Checks Table ====================
+    # Raw rows are compacted after rollup; incidents (non-up checks) are kept
+    op.create_index(
+        'idx_service_health_checks_incidents',
+        'service_health_checks',
+        ['checked_at'],
+        postgresql_using='btree',
+        postgresql_where=sa.text("status <> 'up'")
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop health check rollups.
+    """
+    op.drop_index('idx_service_health_checks_incidents', 'service_health_checks')
+    op.drop_index('idx_service_health_rollups_bucket', 'service_health_rollups')
+    op.drop_table('service_health_rollups')
@@ -0,0 +1,44 @@
+"""add_retention_checkpoints
+
+Revision ID: 8f2d4b6a1c3e
+Revises: 3c7e1a9d52f4
+Create Date: 2025-11-13 10:20:00.000000
+
+Chunked retention cleanup:
+- Add retention_checkpoints table (resumable progress per retention job)
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2d4b6a1c3e'
+down_revision = '3c7e1a9d52f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create retention checkpoints table.
+    """
+    op.create_table(
+        'retention_checkpoints',
+        sa.Column('job_name', sa.String(length=100), nullable=False),
+        sa.Column('cutoff', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('phase', sa.String(length=50), nullable=False),
+        sa.Column('cursor', sa.String(length=100), nullable=True),
+        sa.Column('rows_deleted', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('job_name')
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop retention checkpoints table.
+    """
+    op.drop_table('retention_checkpoints')
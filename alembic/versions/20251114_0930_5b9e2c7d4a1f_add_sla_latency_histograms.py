@@ -0,0 +1,106 @@
+"""add_sla_latency_histograms
+
+Revision ID: 5b9e2c7d4a1f
+Revises: 8f2d4b6a1c3e
+Create Date: 2025-11-14 09:30:00.000000
+
+SLA latency histograms:
+- Add sla_latency_histograms table (per-endpoint minute and hour histogram buckets)
+- Backfill histograms from existing api_response_time_* rows in sla_metrics
+- Add partial index on SLA violations, the only raw rows still written
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9e2c7d4a1f'
+down_revision = '8f2d4b6a1c3e'
+branch_labels = None
+depends_on = None
+
+# Must match LATENCY_BUCKETS_MS in src/api/sla_tracking_service.py
+LATENCY_BUCKETS_MS = (
+    5, 10, 25, 50, 75, 100, 150, 200, 300, 400, 500,
+    750, 1000, 1500, 2500, 5000, 10000,
+)
+
+
+def upgrade() -> None:
+    """
+    Create latency histograms and backfill them.
+    """
+
+    # ==================== Histograms Table ====================
+    op.create_table(
+        'sla_latency_histograms',
+        sa.Column('endpoint', sa.String(length=255), nullable=False),
+        sa.Column('bucket_size', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('le_ms', sa.Float(), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('sum_ms', sa.Float(), nullable=False),
+        sa.Column('min_ms', sa.Float(), nullable=False),
+        sa.Column('max_ms', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('endpoint', 'bucket_size', 'bucket_start', 'le_ms')
+    )
+
+    # Stats queries filter by bucket size and time range across all endpoints
+    op.create_index(
+        'idx_sla_latency_histograms_bucket',
+        'sla_latency_histograms',
+        ['bucket_size', 'bucket_start'],
+        postgresql_using='btree'
+    )
+
+    # ==================== Backfill ====================
+    bounds = ", ".join(str(float(b)) for b in LATENCY_BUCKETS_MS)
+    for bucket_size in ('minute', 'hour'):
+        op.execute(f"""
+            INSERT INTO sla_latency_histograms (
+                endpoint, bucket_size, bucket_start, le_ms,
+                sample_count, sum_ms, min_ms, max_ms
+            )
+            SELECT
+                endpoint,
+                '{bucket_size}',
+                bucket,
+                le_ms,
+                COUNT(*),
+                SUM(metric_value),
+                MIN(metric_value),
+                MAX(metric_value)
+            FROM (
+                SELECT
+                    substr(metric_name, length('api_response_time_') + 1) AS endpoint,
+                    date_trunc('{bucket_size}', recorded_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS bucket,
+                    COALESCE(
+                        (SELECT MIN(le) FROM unnest(ARRAY[{bounds}]::float8[]) AS le
+                         WHERE le > metric_value),
+                        'Infinity'::float8
+                    ) AS le_ms,
+                    metric_value
+                FROM sla_metrics
+                WHERE metric_name LIKE 'api\\_response\\_time\\_%'
+            ) samples
+            GROUP BY endpoint, bucket, le_ms
+        """)
+
+    # ==================== SLA Metrics Table ====================
+    # Only violations are kept as raw rows from now on
+    op.create_index(
+        'idx_sla_metrics_violations',
+        'sla_metrics',
+        ['recorded_at'],
+        postgresql_using='btree',
+        postgresql_where=sa.text('meets_sla = false')
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop latency histograms.
+    """
+    op.drop_index('idx_sla_metrics_violations', 'sla_metrics')
+    op.drop_index('idx_sla_latency_histograms_bucket', 'sla_latency_histograms')
+    op.drop_table('sla_latency_histograms')
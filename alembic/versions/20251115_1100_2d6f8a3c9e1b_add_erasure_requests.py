@@ -0,0 +1,48 @@
+"""add_erasure_requests
+
+Revision ID: 2d6f8a3c9e1b
+Revises: 5b9e2c7d4a1f
+Create Date: 2025-11-15 11:00:00.000000
+
+Set-based GDPR erasure:
+- Add erasure_requests table (targets and resumable progress per erasure job)
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '2d6f8a3c9e1b'
+down_revision = '5b9e2c7d4a1f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create erasure requests table.
+    """
+    op.create_table(
+        'erasure_requests',
+        sa.Column('request_id', sa.String(length=50), nullable=False),
+        sa.Column('user_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('tutor_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('student_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('reason', sa.String(length=500), nullable=False),
+        sa.Column('retain_audit_logs', sa.Boolean(), nullable=False),
+        sa.Column('phase', sa.String(length=50), nullable=False),
+        sa.Column('rows_affected', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('requested_by', sa.Integer(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('request_id')
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop erasure requests table.
+    """
+    op.drop_table('erasure_requests')
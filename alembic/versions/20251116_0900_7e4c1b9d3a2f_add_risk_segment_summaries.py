@@ -0,0 +1,97 @@
+"""add_risk_segment_summaries
+
+Revision ID: 7e4c1b9d3a2f
+Revises: 2d6f8a3c9e1b
+Create Date: 2025-11-16 09:00:00.000000
+
+Incremental risk segments:
+- Add tutor_risk_segments (latest prediction counted per active tutor)
+- Add risk_segment_summaries and risk_segment_factors (per risk level aggregates)
+- Backfill all three from existing churn_predictions
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e4c1b9d3a2f'
+down_revision = '2d6f8a3c9e1b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create risk segment tables and backfill them.
+    """
+
+    # ==================== Tables ====================
+    op.create_table(
+        'tutor_risk_segments',
+        sa.Column('tutor_id', sa.String(length=50), nullable=False),
+        sa.Column('prediction_id', sa.String(length=50), nullable=False),
+        sa.Column('risk_level', sa.String(length=20), nullable=False),
+        sa.Column('churn_score', sa.Integer(), nullable=False),
+        sa.Column('factors', sa.ARRAY(sa.String()), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['tutor_id'], ['tutors.tutor_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tutor_id')
+    )
+
+    op.create_table(
+        'risk_segment_summaries',
+        sa.Column('risk_level', sa.String(length=20), nullable=False),
+        sa.Column('tutor_count', sa.Integer(), nullable=False),
+        sa.Column('churn_score_sum', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('risk_level')
+    )
+
+    op.create_table(
+        'risk_segment_factors',
+        sa.Column('risk_level', sa.String(length=20), nullable=False),
+        sa.Column('factor', sa.String(length=255), nullable=False),
+        sa.Column('tutor_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('risk_level', 'factor')
+    )
+
+    # ==================== Backfill ====================
+    # Same as src.evaluation.risk_segments.rebuild_risk_segments
+    op.execute("""
+        INSERT INTO tutor_risk_segments (tutor_id, prediction_id, risk_level, churn_score, factors, updated_at)
+        SELECT DISTINCT ON (p.tutor_id)
+            p.tutor_id, p.prediction_id, p.risk_level, p.churn_score,
+            CASE WHEN jsonb_typeof(p.contributing_factors) = 'object'
+                THEN ARRAY(
+                    SELECT DISTINCT left(k, 255)
+                    FROM jsonb_object_keys(p.contributing_factors) AS k
+                    ORDER BY 1
+                )
+                ELSE '{}'::varchar[]
+            END,
+            p.prediction_date
+        FROM churn_predictions p
+        JOIN tutors t ON t.tutor_id = p.tutor_id
+        WHERE t.status = 'ACTIVE'
+        ORDER BY p.tutor_id, p.prediction_date DESC
+    """)
+    op.execute("""
+        INSERT INTO risk_segment_summaries (risk_level, tutor_count, churn_score_sum)
+        SELECT risk_level, COUNT(*), SUM(churn_score)
+        FROM tutor_risk_segments
+        GROUP BY risk_level
+    """)
+    op.execute("""
+        INSERT INTO risk_segment_factors (risk_level, factor, tutor_count)
+        SELECT s.risk_level, f.factor, COUNT(*)
+        FROM tutor_risk_segments s, unnest(s.factors) AS f(factor)
+        GROUP BY s.risk_level, f.factor
+    """)
+
+
+def downgrade() -> None:
+    """
+    Drop risk segment tables.
+    """
+    op.drop_table('risk_segment_factors')
+    op.drop_table('risk_segment_summaries')
+    op.drop_table('tutor_risk_segments')
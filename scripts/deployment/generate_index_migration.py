@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+CLI script for generating an index migration from the index advisor.
+
+Analyzes the query workload in pg_stat_statements, proposes composite,
+partial and covering indexes, and writes an Alembic migration that creates
+them (and optionally drops unused/redundant indexes) concurrently.
+
+Usage:
+    # Print the report only
+    python scripts/deployment/generate_index_migration.py --report
+
+    # Write a migration for the top 5 proposals
+    python scripts/deployment/generate_index_migration.py --limit 5
+
+    # Also drop unused and redundant indexes
+    python scripts/deployment/generate_index_migration.py --drop-unused
+
+    # Check ORM index declarations against the live schema
+    python scripts/deployment/generate_index_migration.py --drift
+"""
+
+import asyncio
+import argparse
+import json
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from src.database.database import get_db_session
+from src.database.index_advisor import (
+    IndexAdvisor,
+    detect_index_drift,
+    orm_indexes,
+    render_index_migration,
+    logger,
+)
+from src.database.models import Base
+
+
+async def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Generate an Alembic migration from index advisor recommendations",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Print the advisor report without writing a migration",
+    )
+
+    parser.add_argument(
+        "--drift",
+        action="store_true",
+        help="Print ORM/database index drift and exit",
+    )
+
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="Maximum number of indexes to create (default: 10)",
+    )
+
+    parser.add_argument(
+        "--drop-unused",
+        action="store_true",
+        help="Drop unused and redundant indexes in the migration",
+    )
+
+    parser.add_argument(
+        "--no-estimate",
+        action="store_true",
+        help="Skip hypothetical index cost estimates",
+    )
+
+    args = parser.parse_args()
+
+    advisor = IndexAdvisor(max_candidates=args.limit)
+
+    async with get_db_session() as session:
+        existing = await advisor.load_existing_indexes(session)
+
+        if args.drift:
+            drift = detect_index_drift(orm_indexes(Base.metadata), existing)
+            print(json.dumps(drift, indent=2))
+            sys.exit(1 if any(drift.values()) else 0)
+
+        workload = await advisor.load_pg_stat_statements(session)
+        candidates = advisor.propose(workload, existing)
+        if not args.no_estimate:
+            for candidate in candidates:
+                await advisor.estimate_with_hypothetical_index(session, candidate)
+
+    drop = []
+    if args.drop_unused:
+        drop = advisor.find_unused_indexes(existing)
+        drop_names = {idx.name for idx in drop}
+        drop += [idx for idx, _ in advisor.find_redundant_indexes(existing) if idx.name not in drop_names]
+
+    print("=" * 80)
+    print("INDEX ADVISOR")
+    print("=" * 80)
+    print(f"Statements analyzed: {len(workload)}")
+    for candidate in candidates:
+        improvement = candidate.estimated_improvement_pct
+        if improvement is not None:
+            estimate = f" (est. {improvement}% cheaper)"
+        elif candidate.estimate_error:
+            estimate = f" (no estimate: {candidate.estimate_error})"
+        else:
+            estimate = ""
+        print(f"  + {candidate.ddl()}{estimate}")
+    for idx in drop:
+        print(f"  - DROP INDEX {idx.name} ({idx.size_bytes} bytes)")
+    print("=" * 80)
+
+    if args.report or not (candidates or drop):
+        sys.exit(0)
+
+    script = ScriptDirectory.from_config(Config(str(project_root / "alembic.ini")))
+    head = script.get_current_head()
+    revision = uuid.uuid4().hex[-12:]
+    now = datetime.now()
+
+    path = Path(script.versions) / f"{now:%Y%m%d_%H%M}_{revision}_apply_index_advisor_recommendations.py"
+    path.write_text(render_index_migration(revision, head, candidates, drop, create_date=now))
+
+    logger.info(f"Wrote migration {path}")
+    print(f"Migration written: {path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -14,6 +14,8 @@ Options:
     --no-debounce: Disable debouncing (process immediately)
     --debounce-window: Debounce window in seconds (default: 30)
     --consumer-group: Consumer group name (default: metrics-update-workers)
+    --recompute-batch-size: Tutors claimed per recompute batch (default: 100)
+    --metrics-port: Serve Prometheus metrics on this port (default: off)
 """
 
 import sys
@@ -74,6 +76,20 @@ def parse_args():
         help='Consumer group name (default: metrics-update-workers)'
     )
 
+    parser.add_argument(
+        '--recompute-batch-size',
+        type=int,
+        default=100,
+        help='Tutors claimed per recompute batch (default: 100)'
+    )
+
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=None,
+        help='Serve Prometheus metrics on this port (default: off)'
+    )
+
     return parser.parse_args()
 
 
@@ -91,6 +107,9 @@ def main():
     logger.info(f"  Debouncing: {not args.no_debounce}")
     if not args.no_debounce:
         logger.info(f"  Debounce window: {args.debounce_window}s")
+        logger.info(f"  Recompute batch size: {args.recompute_batch_size}")
+    if args.metrics_port:
+        logger.info(f"  Metrics port: {args.metrics_port}")
     logger.info("=" * 80)
 
     # Create and start worker
@@ -101,8 +120,13 @@ def main():
             poll_interval_ms=args.poll_interval,
             enable_debouncing=not args.no_debounce,
             debounce_window_seconds=args.debounce_window,
+            recompute_batch_size=args.recompute_batch_size,
         )
 
+        if args.metrics_port:
+            from prometheus_client import start_http_server
+            start_http_server(args.metrics_port)
+
         logger.info("Starting worker... (Press Ctrl+C to stop)")
         worker.start()
 
@@ -63,6 +63,7 @@ echo ""
 exec celery -A src.workers.celery_app worker \
     --loglevel=${LOG_LEVEL} \
     --concurrency=${CONCURRENCY} \
+    --prefetch-multiplier=1 \
     --queues=${QUEUES} \
     --hostname=${WORKER_NAME} \
     --time-limit=3600 \
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Run a Celery worker for one workload profile.
+
+Profiles (see src/workers/workloads.py) fix the queues, pool, concurrency and
+prefetch for a class of tasks, so minute-level monitoring never shares worker
+slots with model training.
+
+Usage:
+    python scripts/deployment/run_worker_profile.py realtime
+    python scripts/deployment/run_worker_profile.py ml --concurrency=1 -- --loglevel=debug
+    python scripts/deployment/run_worker_profile.py --list
+
+Options:
+    --concurrency: Override the profile's concurrency
+    --print: Print the celery command instead of running it
+    --list: List the available profiles
+    Arguments after -- are passed to celery unchanged (e.g. --detach, --logfile)
+"""
+
+import argparse
+import os
+import shlex
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.workers.workloads import WORKER_PROFILES, get_profile
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    argv = sys.argv[1:]
+    passthrough = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, passthrough = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description="Run a TutorMax Celery worker profile")
+    parser.add_argument("profile", nargs="?", choices=sorted(WORKER_PROFILES))
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--print", action="store_true", dest="print_only")
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args(argv)
+
+    if not args.list and not args.profile:
+        parser.error("a profile is required")
+    return args, passthrough
+
+
+def main():
+    """Main entry point."""
+    args, passthrough = parse_args()
+
+    if args.list:
+        for profile in WORKER_PROFILES.values():
+            print(f"{profile.name:<10} {','.join(profile.queues):<36} {profile.description}")
+        return 0
+
+    profile = get_profile(args.profile)
+    command = [
+        "celery", "-A", "src.workers.celery_app", "worker", "--loglevel=info",
+        *profile.worker_args(args.concurrency),
+        *passthrough,
+    ]
+
+    if args.print_only:
+        print(shlex.join(command))
+        return 0
+
+    os.execvp(command[0], command)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -30,50 +30,30 @@ mkdir -p "$LOG_DIR"
 PID_DIR="$PROJECT_ROOT/logs/pids"
 mkdir -p "$PID_DIR"
 
-# Start workers for each queue
-echo -e "${GREEN}Starting data generation worker...${NC}"
-celery -A src.workers.celery_app worker \
-    --loglevel=info \
-    --queues=data_generation \
-    --concurrency=2 \
-    --logfile="$LOG_DIR/data_generation.log" \
-    --pidfile="$PID_DIR/data_generation.pid" \
+# Start one worker per workload profile (queues, pool and prefetch are
+# defined in src/workers/workloads.py)
+echo -e "${GREEN}Starting realtime monitoring worker...${NC}"
+python scripts/deployment/run_worker_profile.py realtime -- \
+    --logfile="$LOG_DIR/realtime.log" \
+    --pidfile="$PID_DIR/realtime.pid" \
     --detach
 
-echo -e "${GREEN}Starting evaluation worker...${NC}"
-celery -A src.workers.celery_app worker \
-    --loglevel=info \
-    --queues=evaluation \
-    --concurrency=2 \
-    --logfile="$LOG_DIR/evaluation.log" \
-    --pidfile="$PID_DIR/evaluation.pid" \
+echo -e "${GREEN}Starting email/IO worker...${NC}"
+python scripts/deployment/run_worker_profile.py io -- \
+    --logfile="$LOG_DIR/io.log" \
+    --pidfile="$PID_DIR/io.pid" \
     --detach
 
-echo -e "${GREEN}Starting prediction worker...${NC}"
-celery -A src.workers.celery_app worker \
-    --loglevel=info \
-    --queues=prediction \
-    --concurrency=2 \
-    --logfile="$LOG_DIR/prediction.log" \
-    --pidfile="$PID_DIR/prediction.pid" \
+echo -e "${GREEN}Starting batch evaluation worker...${NC}"
+python scripts/deployment/run_worker_profile.py batch -- \
+    --logfile="$LOG_DIR/batch.log" \
+    --pidfile="$PID_DIR/batch.pid" \
     --detach
 
-echo -e "${GREEN}Starting training worker...${NC}"
-celery -A src.workers.celery_app worker \
-    --loglevel=info \
-    --queues=training \
-    --concurrency=1 \
-    --logfile="$LOG_DIR/training.log" \
-    --pidfile="$PID_DIR/training.pid" \
-    --detach
-
-echo -e "${GREEN}Starting default queue worker...${NC}"
-celery -A src.workers.celery_app worker \
-    --loglevel=info \
-    --queues=default \
-    --concurrency=2 \
-    --logfile="$LOG_DIR/default.log" \
-    --pidfile="$PID_DIR/default.pid" \
+echo -e "${GREEN}Starting ML prediction/training worker...${NC}"
+python scripts/deployment/run_worker_profile.py ml -- \
+    --logfile="$LOG_DIR/ml.log" \
+    --pidfile="$PID_DIR/ml.pid" \
     --detach
 
 echo -e "${GREEN}Starting Celery Beat scheduler...${NC}"
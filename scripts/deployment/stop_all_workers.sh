@@ -54,11 +54,10 @@ stop_worker() {
 }
 
 # Stop all workers
-stop_worker "data_generation"
-stop_worker "evaluation"
-stop_worker "prediction"
-stop_worker "training"
-stop_worker "default"
+stop_worker "realtime"
+stop_worker "io"
+stop_worker "batch"
+stop_worker "ml"
 stop_worker "beat"
 
 # Stop Flower
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Bulk synthetic data for load testing.
+
+Generates sessions with BulkSessionGenerator and either COPYs them straight
+into PostgreSQL or writes one file per day (CSV for COPY, or Parquet). The
+date range is split across worker processes; every day is seeded from
+(--seed, date), so the output is identical for any --workers value and a
+failed range can be re-run on its own.
+
+Tutors are generated deterministically from --seed (or taken from the
+database with --use-existing-tutors) and the student pool is created once up
+front, so workers only ever append sessions.
+
+Usage:
+    # 90 days x 100k sessions/day straight into the database, 8 processes
+    python scripts/load_tests/generate_bulk_data.py --start 2024-01-01 --end 2024-03-30 \\
+        --sessions-per-day 100000 --workers 8
+
+    # Files only (load later with \\copy sessions FROM 'file.csv' WITH (FORMAT csv))
+    python scripts/load_tests/generate_bulk_data.py --start 2024-01-01 --end 2024-12-31 \\
+        --format csv --output-dir /tmp/bulk --workers 8
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.data_generation.bulk_generator import (
+    BulkSessionGenerator,
+    copy_rows,
+    date_range,
+    write_csv,
+    write_parquet,
+)
+from src.data_generation.tutor_generator import TutorGenerator
+
+
+def make_tutors(count: int, seed: int) -> List[Dict]:
+    """Deterministic tutor profiles for this seed."""
+    generator = TutorGenerator(seed=seed)
+    return [generator.generate_tutor(tutor_id=f"bulk_tutor_{i:06d}") for i in range(count)]
+
+
+def load_tutors() -> List[Dict]:
+    """Existing tutors, in a stable order so every worker sees the same list."""
+    from sqlalchemy import select
+
+    from src.database.models import Tutor
+    from src.workers.tasks.data_generator import get_db
+
+    with get_db() as db:
+        tutors = db.execute(select(Tutor).order_by(Tutor.tutor_id)).scalars().all()
+        return [
+            {
+                "tutor_id": t.tutor_id,
+                "subjects": t.subjects,
+                "behavioral_archetype": t.behavioral_archetype.value if t.behavioral_archetype else None,
+                "baseline_sessions_per_week": t.baseline_sessions_per_week,
+            }
+            for t in tutors
+        ]
+
+
+def seed_database(generator: BulkSessionGenerator, tutors: List[Dict], insert_tutors: bool) -> None:
+    """Insert tutors (optionally) and the student pool before workers start."""
+    from sqlalchemy import insert
+
+    from src.database.models import Tutor
+    from src.workers.tasks.data_generator import get_db
+
+    with get_db() as db:
+        if insert_tutors:
+            db.execute(insert(Tutor), [
+                {
+                    "tutor_id": t["tutor_id"],
+                    "name": t["name"],
+                    "email": t["email"],
+                    "onboarding_date": datetime.fromisoformat(t["onboarding_date"]),
+                    "status": t.get("status", "active"),
+                    "subjects": t["subjects"],
+                    "education_level": t.get("education_level"),
+                    "location": t.get("location"),
+                    "baseline_sessions_per_week": t["baseline_sessions_per_week"],
+                    "behavioral_archetype": t["behavioral_archetype"],
+                }
+                for t in tutors
+            ])
+        copy_rows(db, "students", generator.generate_students(datetime.utcnow()))
+        db.commit()
+
+
+def run_days(
+    tutors: List[Dict],
+    num_students: int,
+    seed: int,
+    days: List[date],
+    sessions_per_day: int,
+    output_format: str,
+    output_dir: Optional[str],
+) -> int:
+    """Worker: generate and load (or write) each day; one transaction per day."""
+    generator = BulkSessionGenerator(tutors, num_students, seed=seed)
+    rows = 0
+
+    if output_format == "copy":
+        from src.workers.tasks.data_generator import get_db
+
+        with get_db() as db:
+            for day in days:
+                rows += copy_rows(db, "sessions", generator.generate_day(day, sessions_per_day))
+                db.commit()
+        return rows
+
+    writer = write_csv if output_format == "csv" else write_parquet
+    for day in days:
+        columns = generator.generate_day(day, sessions_per_day)
+        writer(columns, Path(output_dir) / f"sessions_{day:%Y%m%d}.{output_format}")
+        rows += len(columns["session_id"])
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk synthetic data for load testing")
+    parser.add_argument("--start", type=date.fromisoformat, required=True)
+    parser.add_argument("--end", type=date.fromisoformat, required=True)
+    parser.add_argument("--sessions-per-day", type=int, default=100_000)
+    parser.add_argument("--tutors", type=int, default=5_000)
+    parser.add_argument("--students", type=int, default=500_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--format", choices=["copy", "csv", "parquet"], default="copy")
+    parser.add_argument("--output-dir", help="Directory for csv/parquet output")
+    parser.add_argument("--use-existing-tutors", action="store_true",
+                        help="Draw sessions from tutors already in the database")
+    parser.add_argument("--skip-seed", action="store_true",
+                        help="Tutors and students already loaded (e.g. resuming a range)")
+    args = parser.parse_args()
+
+    if args.end < args.start:
+        parser.error("--end is before --start")
+    if args.format != "copy":
+        if not args.output_dir:
+            parser.error("--output-dir is required for csv/parquet output")
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+
+    tutors = load_tutors() if args.use_existing_tutors else make_tutors(args.tutors, args.seed)
+    generator = BulkSessionGenerator(tutors, args.students, seed=args.seed)
+
+    if args.format == "copy" and not args.skip_seed:
+        print(f"Seeding {len(tutors):,} tutors and {args.students:,} students...")
+        seed_database(generator, tutors, insert_tutors=not args.use_existing_tutors)
+    elif args.format != "copy":
+        writer = write_csv if args.format == "csv" else write_parquet
+        writer(generator.generate_students(datetime.utcnow()), Path(args.output_dir) / f"students.{args.format}")
+
+    # Round-robin days over workers so each gets a similar share of weekdays
+    days = list(date_range(args.start, args.end))
+    workers = max(1, min(args.workers, len(days)))
+    assignments = [days[i::workers] for i in range(workers)]
+
+    print(f"Generating {len(days)} days x ~{args.sessions_per_day:,} sessions on {workers} workers...")
+    started = time.perf_counter()
+    total = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                run_days, tutors, args.students, args.seed, chunk,
+                args.sessions_per_day, args.format, args.output_dir,
+            )
+            for chunk in assignments
+        ]
+        for future in as_completed(futures):
+            total += future.result()
+
+    elapsed = time.perf_counter() - started
+    print(f"Done: {total:,} sessions in {elapsed:.1f}s ({total / elapsed:,.0f} rows/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Celery queue latency benchmark for workload profiles.
+
+Measures how long minute-level tasks (health checks) wait in the queue while
+long training jobs are running, for two layouts:
+- shared:   one worker pool consumes every task from one queue with the
+            global prefetch multiplier (4)
+- profiles: health checks go to the realtime queue (threads pool) and
+            training to the ml queue (prefetch 1), as in src/workers/workloads.py
+
+Runs in-process on Celery's in-memory transport, so no Redis is needed.
+Time is compressed: a "minute" is --interval seconds and training jobs
+sleep for --training-seconds. Training holds a worker slot without using
+CPU; that slot is what makes short tasks wait behind it.
+
+Usage:
+    python scripts/testing/benchmark_celery_queue_latency.py
+    python scripts/testing/benchmark_celery_queue_latency.py --training-jobs 6 --training-seconds 8
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, List
+
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.workers.workloads import WORKER_PROFILES
+
+app = Celery("tutormax-benchmark", broker="memory://", backend="cache+memory://")
+app.conf.update(
+    task_acks_late=True,
+    worker_prefetch_multiplier=4,
+    worker_hijack_root_logger=False,
+    broker_connection_retry_on_startup=True,
+    broker_transport_options={"polling_interval": 0.01},
+)
+
+_latencies: List[float] = []
+_lock = threading.Lock()
+
+
+@app.task(name="benchmark.health_check")
+def health_check(sent_at: float) -> None:
+    with _lock:
+        _latencies.append(time.time() - sent_at)
+
+
+@app.task(name="benchmark.train_model")
+def train_model(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def run_scenario(layout: str, args) -> Dict[str, float]:
+    """Run training jobs and periodic health checks; return latency stats."""
+    _latencies.clear()
+    realtime = WORKER_PROFILES["realtime"]
+    ml = WORKER_PROFILES["ml"]
+
+    if layout == "shared":
+        workers = [dict(queues=["default"], concurrency=args.shared_concurrency, prefetch_multiplier=4)]
+        check_queue = train_queue = "default"
+    else:
+        workers = [
+            dict(queues=["realtime"], concurrency=2, prefetch_multiplier=realtime.prefetch_multiplier),
+            dict(queues=["training"], concurrency=args.shared_concurrency,
+                 prefetch_multiplier=ml.prefetch_multiplier),
+        ]
+        check_queue, train_queue = "realtime", "training"
+
+    with ExitStack() as stack:
+        for options in workers:
+            stack.enter_context(start_worker(
+                app, pool="threads", perform_ping_check=False,
+                shutdown_timeout=args.training_seconds * args.training_jobs + 10,
+                loglevel="WARNING", **options,
+            ))
+
+        for _ in range(args.training_jobs):
+            train_model.apply_async((args.training_seconds,), queue=train_queue)
+
+        checks = int(args.duration / args.interval)
+        for _ in range(checks):
+            health_check.apply_async((time.time(),), queue=check_queue)
+            time.sleep(args.interval)
+
+        deadline = time.time() + args.training_seconds * args.training_jobs + 5
+        while len(_latencies) < checks and time.time() < deadline:
+            time.sleep(0.05)
+
+    latencies = sorted(_latencies)
+    return {
+        "checks": checks,
+        "completed": len(latencies),
+        "p50": statistics.median(latencies) if latencies else float("nan"),
+        "p95": latencies[int(len(latencies) * 0.95) - 1] if latencies else float("nan"),
+        "max": latencies[-1] if latencies else float("nan"),
+        "late": sum(1 for latency in latencies if latency > args.interval),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Celery queue latency benchmark")
+    parser.add_argument("--training-jobs", type=int, default=4)
+    parser.add_argument("--training-seconds", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=0.25,
+                        help="Seconds between health checks (one compressed minute)")
+    parser.add_argument("--duration", type=float, default=8.0)
+    parser.add_argument("--shared-concurrency", type=int, default=2,
+                        help="Worker slots for the shared pool and the ml worker")
+    args = parser.parse_args()
+
+    logging.getLogger("celery").setLevel(logging.ERROR)
+
+    results = {layout: run_scenario(layout, args) for layout in ("shared", "profiles")}
+
+    print("\n" + "=" * 60)
+    print("CELERY QUEUE LATENCY (health checks while training runs)")
+    print(f"  {args.training_jobs} training jobs x {args.training_seconds:.1f}s, "
+          f"check every {args.interval:.2f}s for {args.duration:.0f}s")
+    for layout, stats in results.items():
+        print(f"  {layout + ':':<10} p50 {stats['p50'] * 1000:8.1f} ms   "
+              f"p95 {stats['p95'] * 1000:8.1f} ms   max {stats['max'] * 1000:8.1f} ms   "
+              f"late {stats['late']}/{stats['checks']}")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Churn training data generation benchmark.
+
+Measures ChurnDataGenerator on a realistic training set (10k tutors x 180 days
+by default):
+- runtime and peak traced Python memory of generate_historical_data
+- DataFrame memory of the typed frames vs the same data in the legacy
+  layout (object strings, int64/float64, ISO timestamp strings)
+- legacy per-session rate: SessionGenerator.generate_session +
+  FeedbackGenerator.generate_feedback on a sample, extrapolated to the
+  session count of this run
+
+Usage:
+    python scripts/testing/benchmark_churn_data_generation.py
+    python scripts/testing/benchmark_churn_data_generation.py --tutors 2000 --days 90 --legacy-sample 5000
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.data_generation.feedback_generator import FeedbackGenerator
+from src.data_generation.session_generator import SessionGenerator
+from src.data_generation.tutor_generator import TutorGenerator
+from src.evaluation.data_preparation import ChurnConfig, ChurnDataGenerator
+
+
+def legacy_layout(df: pd.DataFrame) -> pd.DataFrame:
+    """The same frame as pd.DataFrame(list_of_dicts) used to produce it."""
+    legacy = {}
+    for column, values in df.items():
+        dtype = values.dtype
+        if isinstance(dtype, pd.CategoricalDtype) or dtype.name == "boolean":
+            legacy[column] = values.astype(object)
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            legacy[column] = values.map(lambda v: v.isoformat() if pd.notna(v) else None).astype(object)
+        elif dtype.name == "Int16":
+            legacy[column] = values.astype("float64")
+        elif pd.api.types.is_integer_dtype(dtype):
+            legacy[column] = values.astype("int64")
+        elif pd.api.types.is_float_dtype(dtype):
+            legacy[column] = values.astype("float64")
+        else:
+            legacy[column] = values
+    return pd.DataFrame(legacy)
+
+
+def frame_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def legacy_rate(sample: int) -> float:
+    """Sessions/sec for the per-session dict path (session + feedback)."""
+    tutors = TutorGenerator(seed=1).generate_tutors(count=50)
+    session_gen = SessionGenerator(seed=1)
+    feedback_gen = FeedbackGenerator(seed=1)
+
+    started = time.perf_counter()
+    for i in range(sample):
+        tutor = tutors[i % len(tutors)]
+        session = session_gen.generate_session(tutor)
+        feedback_gen.generate_feedback(session, tutor)
+    return sample / (time.perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Churn training data generation benchmark")
+    parser.add_argument("--tutors", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--legacy-sample", type=int, default=20_000,
+                        help="Sessions generated with the per-session generators (0 to skip)")
+    args = parser.parse_args()
+
+    config = ChurnConfig(num_tutors=args.tutors, days_history=args.days)
+    print(f"Generating {args.tutors:,} tutors x {args.days} days...")
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        tutors_df, sessions_df, feedback_df = ChurnDataGenerator(config).generate_historical_data()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rate = legacy_rate(args.legacy_sample) if args.legacy_sample else None
+
+    print("\n" + "=" * 60)
+    print("CHURN DATA GENERATION")
+    print(f"  Sessions:          {len(sessions_df):,}")
+    print(f"  Feedback:          {len(feedback_df):,}")
+    print(f"  Duration:          {seconds:.1f}s ({len(sessions_df) / seconds:,.0f} sessions/sec)")
+    print(f"  Peak traced mem:   {peak / 1024 / 1024:,.0f} MB")
+    for name, df in (("tutors", tutors_df), ("sessions", sessions_df), ("feedback", feedback_df)):
+        print(f"  {name + ' frame:':<19}{frame_mb(df):,.0f} MB typed vs {frame_mb(legacy_layout(df)):,.0f} MB legacy layout")
+    if rate:
+        print(f"  Legacy rate:       {rate:,.0f} sessions/sec "
+              f"(~{len(sessions_df) / rate / 60:.0f} min for this run's sessions)")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
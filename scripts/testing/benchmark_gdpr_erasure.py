@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+GDPR erasure benchmark.
+
+Seeds tutor users (1,000 by default), each with a long history of sessions,
+feedback and audit logs, then measures:
+- legacy: the previous per-user erasure (load every related row as ORM
+  objects to count it, then delete per table in one long transaction),
+  timed on a sample of users and extrapolated
+- bulk: one BulkErasure request for all remaining users, reporting
+  throughput and the longest single chunk (an upper bound on lock hold time)
+
+Only rows created by the seed (prefix "gdprbench") are erased; the seeded
+students are left behind. Run it against a scratch database anyway.
+
+Usage:
+    python scripts/testing/benchmark_gdpr_erasure.py --yes
+    python scripts/testing/benchmark_gdpr_erasure.py --users 200 --sessions-per-user 5000 --yes
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import delete, select, text
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database.erasure import BulkErasure
+from src.database.models import (
+    AuditLog,
+    Session as SessionModel,
+    StudentFeedback,
+    Tutor,
+    User,
+)
+from src.workers.tasks.data_generator import get_db
+
+BENCH_PREFIX = "gdprbench"
+USER_ID_BASE = 900_000_000
+
+
+def seed(users: int, sessions_per_user: int, students: int) -> List[int]:
+    """Insert users, tutors, students, sessions, feedback and audit logs with generate_series."""
+    ts = datetime.utcnow() - timedelta(days=400)
+    params = {
+        "prefix": BENCH_PREFIX,
+        "base": USER_ID_BASE,
+        "users": users,
+        "students": students,
+        "per_user": sessions_per_user,
+        "ts": ts,
+    }
+
+    with get_db() as db:
+        db.execute(text("""
+            INSERT INTO tutors (tutor_id, name, email, onboarding_date, status, subjects, created_at, updated_at)
+            SELECT :prefix || '_t' || g, 'Benchmark Tutor ' || g, :prefix || '_t' || g || '@example.com',
+                   :ts, 'ACTIVE', ARRAY['Math'], :ts, :ts
+            FROM generate_series(1, :users) AS g
+        """), params)
+        db.execute(text("""
+            INSERT INTO users (id, email, hashed_password, full_name, is_active, is_superuser, is_verified,
+                               roles, tutor_id, failed_login_attempts, created_at, updated_at)
+            SELECT :base + g, :prefix || '_u' || g || '@example.com', 'x', 'Benchmark User ' || g,
+                   true, false, true, ARRAY['TUTOR'], :prefix || '_t' || g, 0, :ts, :ts
+            FROM generate_series(1, :users) AS g
+        """), params)
+        db.execute(text("""
+            INSERT INTO students (student_id, name, is_under_13, parent_consent_given, created_at, updated_at)
+            SELECT :prefix || '_s' || g, 'Benchmark Student ' || g, false, false, :ts, :ts
+            FROM generate_series(1, :students) AS g
+        """), params)
+        db.execute(text("""
+            INSERT INTO sessions (
+                session_id, tutor_id, student_id, session_number, scheduled_start,
+                duration_minutes, subject, session_type, tutor_initiated_reschedule,
+                no_show, late_start_minutes, technical_issues, created_at, updated_at
+            )
+            SELECT :prefix || '_x' || g,
+                   :prefix || '_t' || (1 + g % :users),
+                   :prefix || '_s' || (1 + g % :students),
+                   1, :ts + (g % 86400) * interval '1 second',
+                   60, 'Math', 'ONE_ON_ONE', false, false, 0, false, :ts, :ts
+            FROM generate_series(1, :users * :per_user) AS g
+        """), params)
+        db.execute(text("""
+            INSERT INTO student_feedback (feedback_id, session_id, student_id, tutor_id, overall_rating,
+                                          is_first_session, submitted_at, created_at)
+            SELECT :prefix || '_f' || g, :prefix || '_x' || g,
+                   :prefix || '_s' || (1 + g % :students), :prefix || '_t' || (1 + g % :users),
+                   4, false, :ts, :ts
+            FROM generate_series(1, :users * :per_user, 2) AS g
+        """), params)
+        db.execute(text("""
+            INSERT INTO audit_logs (log_id, user_id, action, timestamp, success, metadata)
+            SELECT :prefix || '_a' || g, :base + 1 + g % :users, 'login', :ts, true,
+                   jsonb_build_object('email', 'someone@example.com', 'ip', '10.0.0.1')
+            FROM generate_series(1, :users * 20) AS g
+        """), params)
+        db.commit()
+        for table in ("users", "tutors", "students", "sessions", "student_feedback", "audit_logs"):
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+
+    return [USER_ID_BASE + i for i in range(1, users + 1)]
+
+
+def legacy_erase(user_id: int) -> int:
+    """The previous erasure for one tutor user: count by loading, delete per table, one transaction."""
+    rows = 0
+    with get_db() as db:
+        user = db.get(User, user_id)
+        tutor_id = user.tutor_id
+        for model, column in (
+            (SessionModel, SessionModel.tutor_id),
+            (StudentFeedback, StudentFeedback.tutor_id),
+        ):
+            rows += len(db.execute(select(model).where(column == tutor_id)).scalars().all())
+            db.execute(delete(model).where(column == tutor_id))
+        logs = db.execute(select(AuditLog).where(AuditLog.user_id == user_id)).scalars().all()
+        for log in logs:
+            log.user_id = None
+            if isinstance(log.audit_metadata, dict):
+                log.audit_metadata = {k: v for k, v in log.audit_metadata.items() if k != "email"}
+        rows += len(logs)
+        db.execute(delete(Tutor).where(Tutor.tutor_id == tutor_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+    return rows
+
+
+def run_bulk(user_ids: List[int], chunk_size: int) -> dict:
+    erasure = BulkErasure(get_db, chunk_size=chunk_size)
+    chunk_seconds: List[float] = []
+    run_chunk = erasure._run_chunk
+
+    def timed_chunk(*args):
+        started = time.perf_counter()
+        try:
+            return run_chunk(*args)
+        finally:
+            chunk_seconds.append(time.perf_counter() - started)
+
+    erasure._run_chunk = timed_chunk
+
+    started = time.perf_counter()
+    stats = erasure.run(erasure.create(user_ids, "Benchmark"))
+    stats["seconds"] = time.perf_counter() - started
+    stats["chunk_seconds"] = chunk_seconds
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="GDPR erasure benchmark")
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--sessions-per-user", type=int, default=2_000)
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--legacy-sample", type=int, default=20,
+                        help="Users erased with the legacy per-user loop (0 to skip)")
+    parser.add_argument("--yes", action="store_true", help="Confirm this is a scratch database")
+    args = parser.parse_args()
+
+    if not args.yes:
+        print("Refusing to run without --yes: seeds and erases benchmark users in the target database.")
+        return 2
+
+    print(f"Seeding {args.users:,} tutor users with {args.sessions_per_user:,} sessions each...")
+    started = time.perf_counter()
+    user_ids = seed(args.users, args.sessions_per_user, args.students)
+    print(f"  seeded in {time.perf_counter() - started:.1f}s")
+
+    legacy_rate = None
+    legacy_user_seconds: List[float] = []
+    if args.legacy_sample:
+        sample, user_ids = user_ids[:args.legacy_sample], user_ids[args.legacy_sample:]
+        print(f"Legacy erasure of {len(sample):,} users...")
+        legacy_rows = 0
+        for user_id in sample:
+            started = time.perf_counter()
+            legacy_rows += legacy_erase(user_id)
+            legacy_user_seconds.append(time.perf_counter() - started)
+        legacy_rate = legacy_rows / sum(legacy_user_seconds)
+
+    print(f"Bulk erasure of {len(user_ids):,} users (chunk size {args.chunk_size:,})...")
+    stats = run_bulk(user_ids, args.chunk_size)
+    chunk_seconds = stats["chunk_seconds"]
+    rows = sum(stats["rows_affected"].values())
+
+    print("\n" + "=" * 60)
+    print("GDPR ERASURE")
+    print(f"  Users erased:      {stats['users']:,}")
+    print(f"  Rows affected:     {rows:,}")
+    print(f"  Duration:          {stats['seconds']:.1f}s ({rows / stats['seconds']:,.0f} rows/sec)")
+    if chunk_seconds:
+        print(f"  Chunks:            {len(chunk_seconds):,} "
+              f"(median {statistics.median(chunk_seconds) * 1000:.0f}ms, "
+              f"max {max(chunk_seconds) * 1000:.0f}ms)")
+    if legacy_rate:
+        print(f"  Legacy rate:       {legacy_rate:,.0f} rows/sec "
+              f"(longest transaction {max(legacy_user_seconds) * 1000:.0f}ms, "
+              f"~{rows / legacy_rate / 60:.1f} min for this run's rows)")
+    print("=" * 60)
+
+    return 0 if stats["completed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+End-to-end ingestion throughput benchmark.
+
+Measures the full path from HTTP POST to persisted row:
+API batch endpoint -> Redis stream -> validation worker -> enrichment
+worker -> PostgreSQL. Tutors are used because they have no foreign keys.
+
+Requires the API, the validation worker and the enrichment worker to be
+running against the same Redis and database.
+
+Usage:
+    python scripts/testing/benchmark_ingestion_pipeline.py --count 10000 --batch-size 1000
+    python scripts/testing/benchmark_ingestion_pipeline.py --ndjson --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import func, select
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.data_generation.tutor_generator import TutorGenerator
+from src.database.database import async_session_maker
+from src.database.models import Tutor
+
+
+def build_tutors(count: int, run_id: str) -> List[Dict]:
+    """Generate tutors with IDs unique to this run."""
+    tutors = TutorGenerator(seed=42).generate_tutors(count=count)
+    for i, tutor in enumerate(tutors):
+        tutor["tutor_id"] = f"bench_{run_id}_{i:07d}"
+    return tutors
+
+
+async def post_batches(
+    api_url: str,
+    tutors: List[Dict],
+    batch_size: int,
+    concurrency: int,
+    ndjson: bool,
+) -> Dict:
+    """POST all batches and collect per-request latencies and status codes."""
+    batches = [tutors[i:i + batch_size] for i in range(0, len(tutors), batch_size)]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    accepted = 0
+
+    async with httpx.AsyncClient(base_url=api_url, timeout=120.0) as client:
+
+        async def send(batch: List[Dict]) -> None:
+            nonlocal accepted
+            async with semaphore:
+                started = time.perf_counter()
+                if ndjson:
+                    response = await client.post(
+                        "/api/tutors/batch/ndjson",
+                        content="\n".join(json.dumps(t) for t in batch),
+                        headers={"Content-Type": "application/x-ndjson"},
+                    )
+                else:
+                    response = await client.post("/api/tutors/batch", json=batch)
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 201:
+                    accepted += response.json()["count"]
+
+        await asyncio.gather(*(send(batch) for batch in batches))
+
+    return {"latencies_ms": latencies, "statuses": statuses, "accepted": accepted}
+
+
+async def count_persisted(run_id: str) -> int:
+    """Count tutors from this run that reached the database."""
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(func.count()).select_from(Tutor).where(Tutor.tutor_id.like(f"bench_{run_id}_%"))
+        )
+        return result.scalar_one()
+
+
+async def wait_for_rows(run_id: str, expected: int, timeout: float, poll_interval: float) -> int:
+    """Poll the database until all accepted rows are persisted or timeout."""
+    deadline = time.perf_counter() + timeout
+    persisted = 0
+    while time.perf_counter() < deadline:
+        persisted = await count_persisted(run_id)
+        if persisted >= expected:
+            break
+        await asyncio.sleep(poll_interval)
+    return persisted
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="End-to-end ingestion throughput benchmark")
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--count", type=int, default=10000, help="Tutors to ingest")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent batch requests")
+    parser.add_argument("--ndjson", action="store_true", help="Use the NDJSON batch endpoint")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds to wait for persistence")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    tutors = build_tutors(args.count, run_id)
+
+    print(f"Run {run_id}: {args.count} tutors, batches of {args.batch_size}, "
+          f"concurrency {args.concurrency}, {'NDJSON' if args.ndjson else 'JSON'}")
+
+    started = time.perf_counter()
+    posted = await post_batches(args.api_url, tutors, args.batch_size, args.concurrency, args.ndjson)
+    ingest_seconds = time.perf_counter() - started
+
+    persisted = await wait_for_rows(run_id, posted["accepted"], args.timeout, args.poll_interval)
+    total_seconds = time.perf_counter() - started
+
+    latencies = posted["latencies_ms"]
+    print("\n" + "=" * 60)
+    print("INGESTION (HTTP POST -> Redis stream)")
+    print(f"  Accepted:        {posted['accepted']}/{args.count}")
+    print(f"  Status codes:    {posted['statuses']}")
+    print(f"  Duration:        {ingest_seconds:.2f}s ({posted['accepted'] / ingest_seconds:.0f} items/sec)")
+    if latencies:
+        print(f"  Batch latency:   p50={statistics.median(latencies):.0f}ms "
+              f"p95={percentile(latencies, 0.95):.0f}ms max={max(latencies):.0f}ms")
+    print("END TO END (HTTP POST -> persisted row)")
+    print(f"  Persisted:       {persisted}/{posted['accepted']}")
+    print(f"  Duration:        {total_seconds:.2f}s ({persisted / total_seconds:.0f} items/sec)")
+    print("=" * 60)
+
+    return 0 if persisted >= posted["accepted"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Per-request middleware overhead benchmark.
+
+Calls an empty route in-process (no network) through three stacks:
+- bare: no middleware
+- stacked: four BaseHTTPMiddleware layers shaped like the previous stack
+  (Prometheus, performance timing, rate limiting, audit), each timing the
+  request on its own
+- pipeline: the single pure-ASGI PerformanceMiddleware with rate limiting,
+  audit hook and Prometheus observer
+
+Overhead is reported relative to the bare app.
+
+Usage:
+    python scripts/testing/benchmark_middleware_overhead.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api.metrics_exporter import prometheus_observer
+from src.api.performance_middleware import PerformanceMiddleware, SlidingWindowRateLimiter
+
+
+class NeverAudit:
+    """Audit hook that skips every request, so no database is needed."""
+
+    def should_audit(self, method: str, path: str) -> bool:
+        return False
+
+    def record(self, timing) -> None:
+        pass
+
+
+class TimingLayer(BaseHTTPMiddleware):
+    """One BaseHTTPMiddleware layer doing its own timing, like the old stack."""
+
+    def __init__(self, app, header: str):
+        super().__init__(app)
+        self.header = header
+
+    async def dispatch(self, request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        response.headers[self.header] = f"{(time.perf_counter() - start) * 1000:.2f}"
+        return response
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/empty")
+    async def empty():
+        return {}
+
+    if stack == "stacked":
+        for header in ("x-prometheus", "x-response-time", "x-ratelimit", "x-audit"):
+            app.add_middleware(TimingLayer, header=header)
+    elif stack == "pipeline":
+        app.add_middleware(
+            PerformanceMiddleware,
+            rate_limiter=SlidingWindowRateLimiter(requests_per_minute=10**9),
+            audit_hook=NeverAudit(),
+            observers=[prometheus_observer],
+        )
+
+    return app
+
+
+async def run(stack: str, requests: int, warmup: int) -> List[float]:
+    app = build_app(stack)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for i in range(warmup + requests):
+            started = time.perf_counter()
+            response = await client.get("/empty")
+            elapsed_us = (time.perf_counter() - started) * 1_000_000
+            assert response.status_code == 200
+            if i >= warmup:
+                latencies.append(elapsed_us)
+
+    return latencies
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "mean": statistics.mean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Middleware overhead benchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=500)
+    args = parser.parse_args()
+
+    results = {}
+    for stack in ("bare", "stacked", "pipeline"):
+        results[stack] = summarize(await run(stack, args.requests, args.warmup))
+
+    bare = results["bare"]
+    print("\n" + "=" * 60)
+    print(f"MIDDLEWARE OVERHEAD ({args.requests} requests, empty route)")
+    print(f"{'stack':<10} {'mean us':>10} {'p50 us':>10} {'p99 us':>10} {'overhead us':>12}")
+    for stack, summary in results.items():
+        print(f"{stack:<10} {summary['mean']:>10.1f} {summary['p50']:>10.1f} "
+              f"{summary['p99']:>10.1f} {summary['mean'] - bare['mean']:>12.1f}")
+    print("=" * 60)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
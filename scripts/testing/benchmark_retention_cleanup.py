@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Retention cleanup benchmark.
+
+Seeds expired sessions (10M by default) plus students that become orphans,
+then measures:
+- legacy: the previous per-row ORM cleanup (load each session, db.delete,
+  then one query per student), timed on a small sample and extrapolated
+- chunked: RetentionCleanup's set-based DELETE ... RETURNING chunks, reporting
+  throughput and the longest single chunk (an upper bound on lock hold time)
+
+WARNING: cleanup deletes every session older than the cutoff, not only the
+seeded ones. Run it against a scratch database.
+
+Usage:
+    python scripts/testing/benchmark_retention_cleanup.py --yes
+    python scripts/testing/benchmark_retention_cleanup.py --sessions 1000000 --chunk-size 10000 --yes
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import select, text
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database.models import Session as SessionModel, Student, Tutor, TutorStatus
+from src.database.retention import RetentionCleanup
+from src.workers.tasks.data_generator import get_db
+
+# Seeded sessions are this old, so any cutoff up to a year back covers them
+SEED_AGE_DAYS = 400
+BENCH_PREFIX = "retbench"
+
+
+def seed(sessions: int, students: int, tutors: int) -> None:
+    """Insert expired sessions with generate_series (server side)."""
+    started_at = datetime.utcnow() - timedelta(days=SEED_AGE_DAYS)
+
+    with get_db() as db:
+        db.add_all([
+            Tutor(
+                tutor_id=f"{BENCH_PREFIX}_t{i}",
+                name=f"Benchmark Tutor {i}",
+                email=f"{BENCH_PREFIX}_t{i}@example.com",
+                onboarding_date=started_at,
+                status=TutorStatus.ACTIVE,
+                subjects=["Math"],
+            )
+            for i in range(tutors)
+        ])
+        db.commit()
+
+        db.execute(text("""
+            INSERT INTO students (student_id, name, is_under_13, parent_consent_given, created_at, updated_at)
+            SELECT :prefix || '_s' || g, 'Benchmark Student ' || g, false, false, :ts, :ts
+            FROM generate_series(1, :students) AS g
+        """), {"prefix": BENCH_PREFIX, "students": students, "ts": started_at})
+
+        db.execute(text("""
+            INSERT INTO sessions (
+                session_id, tutor_id, student_id, session_number, scheduled_start,
+                duration_minutes, subject, session_type, tutor_initiated_reschedule,
+                no_show, late_start_minutes, technical_issues, created_at, updated_at
+            )
+            SELECT
+                :prefix || '_x' || g,
+                :prefix || '_t' || (g % :tutors),
+                :prefix || '_s' || (1 + g % :students),
+                1,
+                :ts + (g % 86400) * interval '1 second',
+                60, 'Math', 'ONE_ON_ONE', false, false, 0, false, :ts, :ts
+            FROM generate_series(1, :sessions) AS g
+        """), {
+            "prefix": BENCH_PREFIX,
+            "sessions": sessions,
+            "students": students,
+            "tutors": tutors,
+            "ts": started_at,
+        })
+        db.commit()
+        db.execute(text("ANALYZE sessions"))
+        db.execute(text("ANALYZE students"))
+        db.commit()
+
+
+def legacy_sample(cutoff: datetime, sample: int) -> float:
+    """Time the previous ORM cleanup on `sample` sessions; returns rows/sec."""
+    with get_db() as db:
+        started = time.perf_counter()
+        old_sessions = db.execute(
+            select(SessionModel).where(SessionModel.scheduled_start < cutoff).limit(sample)
+        ).scalars().all()
+        for session in old_sessions:
+            db.delete(session)
+        db.commit()
+        elapsed = time.perf_counter() - started
+
+    return len(old_sessions) / elapsed if elapsed else 0.0
+
+
+def run_chunked(days_to_keep: int, chunk_size: int) -> dict:
+    cleanup = RetentionCleanup(get_db, job_name="retention_benchmark", chunk_size=chunk_size)
+    chunk_seconds: List[float] = []
+    run_chunk = cleanup._run_chunk
+
+    def timed_chunk(checkpoint):
+        started = time.perf_counter()
+        try:
+            return run_chunk(checkpoint)
+        finally:
+            chunk_seconds.append(time.perf_counter() - started)
+
+    cleanup._run_chunk = timed_chunk
+
+    started = time.perf_counter()
+    stats = cleanup.run(days_to_keep)
+    stats["seconds"] = time.perf_counter() - started
+    stats["chunk_seconds"] = chunk_seconds
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Retention cleanup benchmark")
+    parser.add_argument("--sessions", type=int, default=10_000_000)
+    parser.add_argument("--students", type=int, default=200_000)
+    parser.add_argument("--tutors", type=int, default=1_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--days-to-keep", type=int, default=90)
+    parser.add_argument("--legacy-sample", type=int, default=20_000,
+                        help="Sessions deleted with the legacy ORM loop (0 to skip)")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--yes", action="store_true", help="Confirm this is a scratch database")
+    args = parser.parse_args()
+
+    if not args.yes:
+        print("Refusing to run without --yes: cleanup deletes ALL expired sessions in the target database.")
+        return 2
+
+    if not args.skip_seed:
+        print(f"Seeding {args.sessions:,} sessions, {args.students:,} students, {args.tutors:,} tutors...")
+        started = time.perf_counter()
+        seed(args.sessions, args.students, args.tutors)
+        print(f"  seeded in {time.perf_counter() - started:.1f}s")
+
+    cutoff = datetime.utcnow() - timedelta(days=args.days_to_keep)
+
+    legacy_rate = None
+    if args.legacy_sample:
+        print(f"Legacy ORM cleanup on {args.legacy_sample:,} sessions...")
+        legacy_rate = legacy_sample(cutoff, args.legacy_sample)
+
+    print(f"Chunked cleanup (chunk size {args.chunk_size:,})...")
+    stats = run_chunked(args.days_to_keep, args.chunk_size)
+    chunk_seconds = stats["chunk_seconds"]
+    deleted = stats["sessions_deleted"] + stats["students_deleted"]
+
+    print("\n" + "=" * 60)
+    print("RETENTION CLEANUP")
+    print(f"  Sessions deleted:  {stats['sessions_deleted']:,}")
+    print(f"  Students deleted:  {stats['students_deleted']:,}")
+    print(f"  Duration:          {stats['seconds']:.1f}s ({deleted / stats['seconds']:,.0f} rows/sec)")
+    if chunk_seconds:
+        print(f"  Chunks:            {len(chunk_seconds):,} "
+              f"(median {statistics.median(chunk_seconds) * 1000:.0f}ms, "
+              f"max {max(chunk_seconds) * 1000:.0f}ms)")
+    if legacy_rate:
+        print(f"  Legacy ORM rate:   {legacy_rate:,.0f} sessions/sec "
+              f"(~{stats['sessions_deleted'] / legacy_rate / 60:.0f} min for this run's sessions)")
+    print("=" * 60)
+
+    return 0 if stats["completed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
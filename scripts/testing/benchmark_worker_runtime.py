@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Worker runtime benchmark: per-task async overhead.
+
+Compares running async Celery task bodies the old way (a new event loop per
+invocation, as asyncio.run() and the previous run_async_task did) with the
+shared per-process loop in src/workers/runtime.py:
+- loop:       an empty coroutine, i.e. the bare cost of a loop per task
+- redis:      PING, with a client per task vs the runtime's shared client
+- database:   SELECT 1 through async_session_maker; a loop per task has to
+              dispose the async pool afterwards (asyncpg connections cannot
+              move between loops), so every task reconnects
+- recipients: report delivery to N recipients with simulated SMTP latency,
+              one after another vs concurrently (as _deliver_report does)
+
+The loop and recipients scenarios need no services. The redis and database
+scenarios use settings.redis_url and the configured PostgreSQL database and
+only run when requested.
+
+Usage:
+    python scripts/testing/benchmark_worker_runtime.py
+    python scripts/testing/benchmark_worker_runtime.py --redis --database --tasks 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Coroutine, Dict, List
+
+import redis.asyncio as aioredis
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api.config import settings
+from src.database.database import async_session_maker
+from src.database.engines import registry as engine_registry
+from src.workers.runtime import run_async, runtime
+
+
+def per_loop(coro: Coroutine):
+    """Previous behaviour: a fresh event loop for one task."""
+    return asyncio.run(coro)
+
+
+def measure(runner: Callable[[Coroutine], object], make_coro: Callable[[], Coroutine], tasks: int) -> Dict[str, float]:
+    """Run tasks one after another (like a worker slot); return latency stats in ms."""
+    timings: List[float] = []
+    for _ in range(tasks):
+        started = time.perf_counter()
+        runner(make_coro())
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return {
+        "mean": statistics.fmean(timings),
+        "p50": statistics.median(timings),
+        "p95": timings[int(len(timings) * 0.95) - 1],
+    }
+
+
+# ==================== Task bodies ====================
+
+async def noop():
+    return None
+
+
+async def redis_ping_new_client():
+    client = aioredis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        await client.ping()
+    finally:
+        await client.aclose()
+
+
+async def redis_ping_shared():
+    await runtime.redis().ping()
+
+
+async def select_one():
+    async with async_session_maker() as session:
+        await session.execute(text("SELECT 1"))
+
+
+async def select_one_and_dispose():
+    await select_one()
+    await engine_registry.dispose_async()
+
+
+def report_delivery(recipients: int, latency: float, concurrent: bool) -> Callable[[], Coroutine]:
+    def send(recipient: int) -> bool:
+        time.sleep(latency)
+        return True
+
+    async def deliver():
+        if concurrent:
+            await asyncio.gather(*(asyncio.to_thread(send, r) for r in range(recipients)))
+        else:
+            for r in range(recipients):
+                send(r)
+
+    return deliver
+
+
+# ==================== Main ====================
+
+def print_row(label: str, stats: Dict[str, float]) -> None:
+    print(f"  {label + ':':<14} mean {stats['mean']:8.3f} ms   "
+          f"p50 {stats['p50']:8.3f} ms   p95 {stats['p95']:8.3f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Worker runtime per-task overhead benchmark")
+    parser.add_argument("--tasks", type=int, default=2000, help="Task invocations per scenario")
+    parser.add_argument("--redis", action="store_true", help="Include the Redis PING scenario")
+    parser.add_argument("--database", action="store_true", help="Include the SELECT 1 scenario")
+    parser.add_argument("--recipients", type=int, default=10)
+    parser.add_argument("--smtp-latency", type=float, default=0.2,
+                        help="Simulated seconds to deliver one email")
+    args = parser.parse_args()
+
+    scenarios = [("loop", noop, noop)]
+    if args.redis:
+        scenarios.append(("redis", redis_ping_new_client, redis_ping_shared))
+    if args.database:
+        scenarios.append(("database", select_one_and_dispose, select_one))
+
+    print("\n" + "=" * 60)
+    print(f"PER-TASK ASYNC OVERHEAD ({args.tasks} sequential tasks)")
+    for name, legacy, shared in scenarios:
+        # Warm up: start the runtime loop and open pooled connections
+        run_async(shared())
+
+        before = measure(per_loop, legacy, args.tasks)
+        after = measure(run_async, shared, args.tasks)
+        print(f" {name}")
+        print_row("loop per task", before)
+        print_row("shared loop", after)
+        print(f"  {'saved:':<14} {before['mean'] - after['mean']:8.3f} ms per task "
+              f"({before['mean'] / after['mean']:.1f}x)")
+
+    runs = max(1, min(5, args.tasks))
+    sequential = measure(run_async, report_delivery(args.recipients, args.smtp_latency, False), runs)
+    concurrent = measure(run_async, report_delivery(args.recipients, args.smtp_latency, True), runs)
+    print(f" report to {args.recipients} recipients ({args.smtp_latency * 1000:.0f} ms per email)")
+    print_row("sequential", sequential)
+    print_row("concurrent", concurrent)
+    print("=" * 60)
+
+    runtime.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -471,7 +471,7 @@ class SecurityAudit:
 
         # Check for security middleware
         security_checks = {
-            "RateLimitMiddleware": "Rate limiting middleware",
+            "SlidingWindowRateLimiter": "Rate limiting middleware",
             "SecurityHeadersMiddleware": "Security headers middleware",
             "CSRFProtectionMiddleware": "CSRF protection middleware",
         }
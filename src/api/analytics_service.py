@@ -28,8 +28,9 @@ from src.database.database import get_db_session as get_db
 from src.database.models import (
     Tutor, TutorStatus, PerformanceTier, RiskLevel,
     ChurnPrediction, Intervention, InterventionType, InterventionStatus, InterventionOutcome,
-    TutorPerformanceMetric, MetricWindow, Session as TutoringSession
+    TutorPerformanceMetric, MetricWindow, RiskSegmentSummary, Session as TutoringSession
 )
+from src.evaluation.risk_segments import load_risk_segments
 from src.api.redis_service import RedisService
 from src.api.config import settings
 
@@ -627,49 +628,25 @@ class AnalyticsService:
         """
         Segment tutors by risk level and identify patterns.
 
+        Reads the incrementally maintained risk segment summaries (each
+        active tutor's latest prediction) instead of scanning predictions.
+
         Returns:
             Risk segment analysis
         """
         async with get_db() as db:
-            # Get latest predictions for all active tutors
-            stmt = select(ChurnPrediction).join(Tutor).where(
-                Tutor.status == TutorStatus.ACTIVE
-            ).order_by(
-                ChurnPrediction.tutor_id,
-                ChurnPrediction.prediction_date.desc()
-            ).distinct(ChurnPrediction.tutor_id)
-
-            result = await db.execute(stmt)
-            predictions = result.scalars().all()
+            segments = await load_risk_segments(db)
 
-            # Segment by risk level
-            segments = defaultdict(list)
-            for pred in predictions:
-                segments[pred.risk_level.value].append(pred)
-
-            # Analyze each segment
-            segment_analysis = []
-
-            for risk_level, preds in segments.items():
-                if not preds:
-                    continue
-
-                # Calculate common factors
-                common_factors = self._analyze_common_factors([p.contributing_factors for p in preds])
-
-                segment_analysis.append({
-                    "risk_level": risk_level,
-                    "tutor_count": len(preds),
-                    "avg_churn_score": round(np.mean([p.churn_score for p in preds]), 1),
-                    "common_factors": common_factors,
-                    "recommended_interventions": self._recommend_interventions(risk_level, common_factors)
-                })
+        for segment in segments:
+            segment["recommended_interventions"] = self._recommend_interventions(
+                segment["risk_level"], segment["common_factors"]
+            )
 
-            return {
-                "segments": segment_analysis,
-                "total_tutors": sum(len(preds) for preds in segments.values()),
-                "generated_at": datetime.now().isoformat()
-            }
+        return {
+            "segments": segments,
+            "total_tutors": sum(segment["tutor_count"] for segment in segments),
+            "generated_at": datetime.now().isoformat()
+        }
 
     # ========================================================================
     # OVERVIEW & SUMMARY METHODS
@@ -1085,32 +1062,6 @@ class AnalyticsService:
         base_rate = 2.5
         return [base_rate + np.random.normal(0, 0.5) for _ in range(days)]
 
-    def _analyze_common_factors(
-        self,
-        factor_dicts: List[Optional[dict]]
-    ) -> List[Dict[str, Any]]:
-        """Analyze common contributing factors."""
-        # Aggregate factors
-        factor_counts = defaultdict(int)
-
-        for factors in factor_dicts:
-            if not factors:
-                continue
-            for factor, value in factors.items():
-                factor_counts[factor] += 1
-
-        # Return top factors
-        sorted_factors = sorted(
-            factor_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-
-        return [
-            {"factor": factor, "frequency": count}
-            for factor, count in sorted_factors
-        ]
-
     def _recommend_interventions(
         self,
         risk_level: str,
@@ -1154,12 +1105,9 @@ class AnalyticsService:
         return result.scalar() or 0
 
     async def _count_high_risk_tutors(self, db: AsyncSession) -> int:
-        """Count high-risk tutors."""
-        stmt = select(func.count(ChurnPrediction.prediction_id)).where(
-            or_(
-                ChurnPrediction.risk_level == RiskLevel.HIGH,
-                ChurnPrediction.risk_level == RiskLevel.CRITICAL
-            )
+        """Count active tutors whose latest prediction is high or critical risk."""
+        stmt = select(func.sum(RiskSegmentSummary.tutor_count)).where(
+            RiskSegmentSummary.risk_level.in_([RiskLevel.HIGH, RiskLevel.CRITICAL])
         )
         result = await db.execute(stmt)
         return result.scalar() or 0
@@ -3,25 +3,29 @@ Audit logging middleware for FastAPI.
 
 Automatically logs all requests to sensitive endpoints and tracks
 authentication events, data access, and modifications.
+
+AuditHook runs inside PerformanceMiddleware's request pipeline and reuses its
+request timing; audit rows are written in background tasks after the response
+has been sent, so auditing never delays a response.
 """
 
-import time
+import asyncio
 import logging
-from typing import Callable, Optional
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Set
+from urllib.parse import parse_qsl
+
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from ..database.database import async_session_maker
 from .audit_service import AuditService
+from .performance_middleware import PerformanceMiddleware, RequestTiming
 
 logger = logging.getLogger(__name__)
 
 
-class AuditLoggingMiddleware(BaseHTTPMiddleware):
+class AuditHook:
     """
-    Middleware to automatically log sensitive operations to audit log.
+    Request hook that logs sensitive operations to the audit log.
 
     Logs:
     - All authentication endpoints
@@ -66,30 +70,27 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         "/static/",
     ]
 
-    def __init__(self, app: ASGIApp, log_all_requests: bool = False):
+    def __init__(self, log_all_requests: bool = False):
         """
-        Initialize audit logging middleware.
+        Initialize audit hook.
 
         Args:
-            app: ASGI application
             log_all_requests: If True, log all requests (verbose). If False, only log sensitive operations.
         """
-        super().__init__(app)
         self.log_all_requests = log_all_requests
+        self._pending: Set[asyncio.Task] = set()
 
-    def _should_audit_request(self, request: Request) -> bool:
+    def should_audit(self, method: str, path: str) -> bool:
         """
         Determine if request should be audited.
 
         Args:
-            request: FastAPI request
+            method: HTTP method
+            path: Request path
 
         Returns:
             True if request should be audited
         """
-        path = request.url.path
-        method = request.method
-
         # Check if path is excluded
         if any(path.startswith(excluded) for excluded in self.EXCLUDED_PATHS):
             return False
@@ -113,65 +114,69 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
 
         return False
 
-    def _get_client_ip(self, request: Request) -> Optional[str]:
+    def _get_header(self, scope: Scope, name: bytes) -> Optional[str]:
+        for key, value in scope["headers"]:
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    def _get_client_ip(self, scope: Scope) -> Optional[str]:
         """
         Extract client IP address from request.
 
         Handles X-Forwarded-For header for proxied requests.
 
         Args:
-            request: FastAPI request
+            scope: ASGI request scope
 
         Returns:
             Client IP address
         """
         # Check X-Forwarded-For header (if behind proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
+        forwarded_for = self._get_header(scope, b"x-forwarded-for")
         if forwarded_for:
             # Get first IP in chain (original client)
             return forwarded_for.split(",")[0].strip()
 
         # Get direct client IP
-        if request.client:
-            return request.client.host
+        client = scope.get("client")
+        if client:
+            return client[0]
 
         return None
 
-    def _get_user_id(self, request: Request) -> Optional[int]:
+    def _get_user_id(self, scope: Scope) -> Optional[int]:
         """
         Extract user ID from request state (set by FastAPI-Users).
 
         Args:
-            request: FastAPI request
+            scope: ASGI request scope
 
         Returns:
             User ID if authenticated, None otherwise
         """
-        # FastAPI-Users stores user in request.state.user
-        if hasattr(request.state, "user"):
-            user = request.state.user
-            if user and hasattr(user, "id"):
-                return user.id
+        # FastAPI-Users stores user in request.state.user, backed by scope["state"]
+        user = scope.get("state", {}).get("user")
+        if user and hasattr(user, "id"):
+            return user.id
 
         return None
 
-    def _determine_action(self, request: Request, response: Response) -> str:
+    def _determine_action(self, method: str, path: str, status_code: int) -> str:
         """
         Determine audit action based on request/response.
 
         Args:
-            request: FastAPI request
-            response: Response object
+            method: HTTP method
+            path: Request path
+            status_code: Response status code
 
         Returns:
             Action string for audit log
         """
-        path = request.url.path
-        method = request.method
-
         # Authentication actions
         if "/auth/jwt/login" in path:
-            return AuditService.ACTION_LOGIN if response.status_code == 200 else AuditService.ACTION_LOGIN_FAILED
+            return AuditService.ACTION_LOGIN if status_code == 200 else AuditService.ACTION_LOGIN_FAILED
         if "/auth/jwt/logout" in path:
             return AuditService.ACTION_LOGOUT
         if "/auth/register" in path:
@@ -256,63 +261,76 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
 
         return None
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def record(self, timing: RequestTiming) -> None:
         """
-        Process request and log to audit trail if needed.
+        Schedule the audit log write for a finished request.
 
         Args:
-            request: FastAPI request
-            call_next: Next middleware/handler
+            timing: Request outcome from PerformanceMiddleware
+        """
+        task = asyncio.create_task(self._write(timing))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def drain(self) -> None:
+        """Wait for scheduled audit writes (used on shutdown and in tests)."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def _write(self, timing: RequestTiming) -> None:
+        scope = timing.scope
+        try:
+            query_string = scope.get("query_string", b"").decode("latin-1")
+
+            # Create database session for audit logging
+            async with async_session_maker() as session:
+                await AuditService.log(
+                    session=session,
+                    action=self._determine_action(timing.method, timing.path, timing.status_code),
+                    user_id=self._get_user_id(scope),
+                    resource_type=self._determine_resource_type(timing.path),
+                    resource_id=self._extract_resource_id(timing.path),
+                    ip_address=self._get_client_ip(scope),
+                    user_agent=self._get_header(scope, b"user-agent"),
+                    request_method=timing.method,
+                    request_path=timing.path,
+                    status_code=timing.status_code,
+                    success=200 <= timing.status_code < 400,
+                    error_message=None,
+                    metadata={
+                        "query_params": dict(parse_qsl(query_string)),
+                        "duration_ms": int(timing.duration_ms),
+                    },
+                )
+        except Exception as e:
+            # Don't fail the request if audit logging fails
+            logger.error(f"Failed to write audit log: {e}", exc_info=True)
+
+
+class AuditLoggingMiddleware:
+    """
+    Standalone pure-ASGI audit logging middleware.
 
-        Returns:
-            Response
+    Apps that already use PerformanceMiddleware should pass an AuditHook to it
+    instead of stacking this middleware.
+    """
+
+    def __init__(self, app: ASGIApp, log_all_requests: bool = False):
+        """
+        Initialize audit logging middleware.
+
+        Args:
+            app: ASGI application
+            log_all_requests: If True, log all requests (verbose). If False, only log sensitive operations.
         """
-        start_time = time.time()
-
-        # Check if we should audit this request
-        should_audit = self._should_audit_request(request)
-
-        # Process request
-        response = await call_next(request)
-
-        # Only audit if needed and response was generated
-        if should_audit:
-            try:
-                # Extract request information
-                ip_address = self._get_client_ip(request)
-                user_agent = request.headers.get("User-Agent")
-                user_id = self._get_user_id(request)
-                action = self._determine_action(request, response)
-                resource_type = self._determine_resource_type(request.url.path)
-                resource_id = self._extract_resource_id(request.url.path)
-
-                # Create database session for audit logging
-                async with async_session_maker() as session:
-                    try:
-                        await AuditService.log(
-                            session=session,
-                            action=action,
-                            user_id=user_id,
-                            resource_type=resource_type,
-                            resource_id=resource_id,
-                            ip_address=ip_address,
-                            user_agent=user_agent,
-                            request_method=request.method,
-                            request_path=request.url.path,
-                            status_code=response.status_code,
-                            success=200 <= response.status_code < 400,
-                            error_message=None,
-                            metadata={
-                                "query_params": dict(request.query_params),
-                                "duration_ms": int((time.time() - start_time) * 1000),
-                            },
-                        )
-                    except Exception as log_error:
-                        # Don't fail the request if audit logging fails
-                        logger.error(f"Failed to write audit log: {log_error}", exc_info=True)
-
-            except Exception as e:
-                # Catch any unexpected errors to prevent middleware from breaking requests
-                logger.error(f"Error in audit middleware: {e}", exc_info=True)
-
-        return response
+        self.hook = AuditHook(log_all_requests=log_all_requests)
+        self.app = PerformanceMiddleware(
+            app,
+            enable_timing=False,
+            enable_cache_headers=False,
+            log_slow_requests=False,
+            audit_hook=self.hook,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.app(scope, receive, send)
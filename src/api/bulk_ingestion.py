@@ -0,0 +1,179 @@
+"""
+Bulk ingestion helpers for the batch endpoints.
+
+Batches are dumped to plain dicts and published to the ingestion stream in a
+single pipelined round trip. NDJSON bodies are validated line by line as they
+stream in and flushed to the queue in chunks, so a large upload never
+materializes as a list of models.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Sequence, Type
+
+from pydantic import BaseModel, ValidationError
+
+from .models import BatchIngestionResponse, BatchItemStatus
+
+
+logger = logging.getLogger(__name__)
+
+# Content type accepted by the NDJSON batch endpoints
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Validated NDJSON items buffered before each flush to Redis
+NDJSON_FLUSH_SIZE = 500
+
+BulkEnqueue = Callable[[Sequence[Dict[str, Any]]], Awaitable[bool]]
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Split a byte stream into lines.
+
+    Newline bytes never occur inside multi-byte UTF-8 sequences, so splitting
+    before decoding is safe.
+
+    Args:
+        chunks: Async iterator of raw body chunks
+
+    Yields:
+        Each line without its trailing newline (blank lines included)
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+def _validation_summary(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"]) or "body"
+    return f"{location}: {first['msg']}"
+
+
+def _build_response(
+    label: str,
+    items: List[BatchItemStatus],
+    errors: List[str],
+) -> BatchIngestionResponse:
+    successful = sum(1 for item in items if item.accepted)
+
+    logger.info(f"Batch ingestion: {successful}/{len(items)} {label} queued")
+
+    return BatchIngestionResponse(
+        success=successful > 0,
+        message=f"Batch ingestion completed: {successful}/{len(items)} {label} queued",
+        count=successful,
+        queued=successful > 0,
+        timestamp=datetime.now().isoformat(),
+        errors=errors,
+        items=items,
+    )
+
+
+async def queue_models(
+    records: Sequence[BaseModel],
+    id_field: str,
+    enqueue: BulkEnqueue,
+    label: str,
+) -> BatchIngestionResponse:
+    """
+    Queue a validated batch with one bulk Redis write.
+
+    Args:
+        records: Validated models to queue
+        id_field: Name of the model's ID attribute
+        enqueue: Bulk enqueue method of the Redis service
+        label: Plural item name used in messages (e.g. "tutors")
+
+    Returns:
+        Batch response with per-item acceptance
+    """
+    queued = await enqueue([record.model_dump() for record in records])
+
+    error = None if queued else "Redis unavailable"
+    items = [
+        BatchItemStatus(
+            index=index,
+            id=getattr(record, id_field),
+            accepted=queued,
+            error=error,
+        )
+        for index, record in enumerate(records)
+    ]
+    errors = [] if queued else [f"Failed to queue {len(records)} {label}"]
+
+    return _build_response(label, items, errors)
+
+
+async def queue_ndjson(
+    chunks: AsyncIterator[bytes],
+    model: Type[BaseModel],
+    id_field: str,
+    enqueue: BulkEnqueue,
+    label: str,
+    flush_size: int = NDJSON_FLUSH_SIZE,
+) -> BatchIngestionResponse:
+    """
+    Validate an NDJSON body line by line and queue it in chunks.
+
+    Invalid lines are rejected individually; valid lines are queued even if
+    other lines fail. Blank lines are ignored.
+
+    Args:
+        chunks: Async iterator of raw body chunks
+        model: Pydantic model each line must match
+        id_field: Name of the model's ID attribute
+        enqueue: Bulk enqueue method of the Redis service
+        label: Plural item name used in messages (e.g. "tutors")
+        flush_size: Validated items buffered before each Redis write
+
+    Returns:
+        Batch response with per-line acceptance (index is the line number)
+    """
+    items: List[BatchItemStatus] = []
+    errors: List[str] = []
+    pending: List[Dict[str, Any]] = []
+    pending_items: List[BatchItemStatus] = []
+
+    async def flush() -> None:
+        queued = await enqueue(pending)
+        if not queued:
+            errors.append(f"Failed to queue {len(pending)} {label}")
+            for item in pending_items:
+                item.accepted = False
+                item.error = "Redis unavailable"
+        pending.clear()
+        pending_items.clear()
+
+    line_number = 0
+    async for line in iter_ndjson_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+
+        try:
+            record = model.model_validate_json(line)
+        except ValidationError as e:
+            summary = _validation_summary(e)
+            items.append(BatchItemStatus(index=line_number, accepted=False, error=summary))
+            errors.append(f"Line {line_number}: {summary}")
+            continue
+
+        item = BatchItemStatus(index=line_number, id=getattr(record, id_field), accepted=True)
+        items.append(item)
+        pending.append(record.model_dump())
+        pending_items.append(item)
+
+        if len(pending) >= flush_size:
+            await flush()
+
+    if pending:
+        await flush()
+
+    return _build_response(label, items, errors)
@@ -32,6 +32,7 @@ class CacheService:
     METRICS_PREFIX = "tutormax:cache:metrics:"
     TUTOR_PROFILE_PREFIX = "tutormax:cache:tutor_profile:"
     SESSION_STATS_PREFIX = "tutormax:cache:session_stats:"
+    COHORT_PERCENTILES_PREFIX = "tutormax:cache:cohort_percentiles:"
 
     # Cache TTLs (in seconds)
     DASHBOARD_TTL = 300  # 5 minutes
@@ -39,6 +40,7 @@ class CacheService:
     METRICS_TTL = 900  # 15 minutes
     TUTOR_PROFILE_TTL = 1800  # 30 minutes
     SESSION_STATS_TTL = 600  # 10 minutes
+    COHORT_PERCENTILES_TTL = 129600  # 36 hours (rebuilt by daily aggregation)
 
     # Cache warming configuration
     WARM_CACHE_ON_STARTUP = True
@@ -376,6 +378,31 @@ class CacheService:
         key = f"{self.SESSION_STATS_PREFIX}{tutor_id}:{window}"
         return await self.get(key)
 
+    # ==================== Cohort Percentile Caching ====================
+
+    async def cache_cohort_percentiles(
+        self,
+        cohort_key: str,
+        sketch_data: Dict[str, Any]
+    ) -> bool:
+        """
+        Cache a cohort percentile sketch with 36-hour TTL.
+
+        Args:
+            cohort_key: Cohort identifier (e.g., "2025-03")
+            sketch_data: Serialized CohortPercentileSketch
+
+        Returns:
+            True if cached successfully
+        """
+        key = f"{self.COHORT_PERCENTILES_PREFIX}{cohort_key}"
+        return await self.set(key, sketch_data, self.COHORT_PERCENTILES_TTL)
+
+    async def get_cohort_percentiles(self, cohort_key: str) -> Optional[Dict[str, Any]]:
+        """Get cached cohort percentile sketch."""
+        key = f"{self.COHORT_PERCENTILES_PREFIX}{cohort_key}"
+        return await self.get(key)
+
     # ==================== Cache Warming ====================
 
     async def warm_dashboard_cache(
@@ -14,15 +14,16 @@ This service manages the full data lifecycle:
 4. Deletion (on user request or legal requirement)
 """
 
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, delete, update, func, text
+from sqlalchemy import select, and_, or_, update, func, text
 from sqlalchemy.orm import selectinload
-import uuid
 import json
 from enum import Enum
 
+from ...database.erasure import anonymize_entities_update
 from ...database.models import (
     User, Tutor, Student, Session as TutoringSession,
     StudentFeedback, TutorPerformanceMetric, ChurnPrediction,
@@ -70,14 +71,21 @@ class DataRetentionService:
     @staticmethod
     async def scan_for_retention_actions(
         session: AsyncSession,
-        dry_run: bool = True
+        dry_run: bool = True,
+        limit: int = 1000
     ) -> Dict[str, Any]:
         """
         Scan all records and identify those eligible for retention actions.
 
+        Eligibility is evaluated in the database: summary totals come from
+        COUNT queries and each category lists at most `limit` records (oldest
+        first), so scan cost does not grow with the number of eligible rows
+        loaded into memory.
+
         Args:
             session: Database session
             dry_run: If True, only report what would be done (don't take action)
+            limit: Maximum records listed per category
 
         Returns:
             Dictionary with scan results and eligible records
@@ -85,12 +93,14 @@ class DataRetentionService:
         scan_date = datetime.utcnow()
         retention_deadline = scan_date - timedelta(days=DataRetentionService.FERPA_RETENTION_DAYS)
         anonymization_deadline = scan_date - timedelta(days=DataRetentionService.GDPR_ANONYMIZATION_DAYS)
+        audit_deadline = scan_date - timedelta(days=DataRetentionService.AUDIT_LOG_RETENTION_DAYS)
 
         results = {
             "scan_date": scan_date.isoformat(),
             "retention_deadline": retention_deadline.isoformat(),
             "anonymization_deadline": anonymization_deadline.isoformat(),
             "dry_run": dry_run,
+            "limit": limit,
             "eligible_for_archival": {
                 "students": [],
                 "tutors": [],
@@ -105,156 +115,135 @@ class DataRetentionService:
             "summary": {},
         }
 
-        # Find students eligible for archival (no activity in 7 years)
-        students_query = (
-            select(Student)
-            .where(Student.updated_at <= retention_deadline)
-        )
-        students_result = await session.execute(students_query)
-        eligible_students = students_result.scalars().all()
-
-        for student in eligible_students:
-            # Check last activity (last session)
-            last_session_query = (
-                select(TutoringSession)
-                .where(TutoringSession.student_id == student.student_id)
-                .order_by(TutoringSession.scheduled_start.desc())
-                .limit(1)
+        async def count(*criteria) -> int:
+            return await session.scalar(select(func.count()).where(*criteria))
+
+        # Students and tutors eligible for archival (no activity in 7 years).
+        # Last activity is the latest session (index lookup per candidate),
+        # falling back to the creation date.
+        for entity, id_column, key in (
+            (Student, Student.student_id, "students"),
+            (Tutor, Tutor.tutor_id, "tutors"),
+        ):
+            session_fk = TutoringSession.student_id if entity is Student else TutoringSession.tutor_id
+            last_session = (
+                select(func.max(TutoringSession.scheduled_start))
+                .where(session_fk == id_column)
+                .scalar_subquery()
             )
-            last_session_result = await session.execute(last_session_query)
-            last_session = last_session_result.scalar_one_or_none()
-
-            last_activity = last_session.scheduled_start if last_session else student.created_at
-            days_since_activity = (scan_date - last_activity).days
-
-            if days_since_activity >= DataRetentionService.FERPA_RETENTION_DAYS:
-                results["eligible_for_archival"]["students"].append({
-                    "student_id": student.student_id,
-                    "name": student.name,
-                    "created_at": student.created_at.isoformat(),
-                    "last_activity": last_activity.isoformat(),
-                    "days_since_activity": days_since_activity,
-                    "eligible_for": RetentionAction.ARCHIVE.value,
-                })
-
-        # Find tutors eligible for archival (inactive for 7 years)
-        tutors_query = (
-            select(Tutor)
-            .where(Tutor.updated_at <= retention_deadline)
-        )
-        tutors_result = await session.execute(tutors_query)
-        eligible_tutors = tutors_result.scalars().all()
-
-        for tutor in eligible_tutors:
-            # Check last activity (last session)
-            last_session_query = (
-                select(TutoringSession)
-                .where(TutoringSession.tutor_id == tutor.tutor_id)
-                .order_by(TutoringSession.scheduled_start.desc())
-                .limit(1)
+            last_activity = func.coalesce(last_session, entity.created_at)
+            criteria = (entity.updated_at <= retention_deadline, last_activity <= retention_deadline)
+
+            rows = await session.execute(
+                select(id_column, entity.name, entity.created_at, last_activity.label("last_activity"))
+                .where(*criteria)
+                .order_by(last_activity)
+                .limit(limit)
             )
-            last_session_result = await session.execute(last_session_query)
-            last_session = last_session_result.scalar_one_or_none()
-
-            last_activity = last_session.scheduled_start if last_session else tutor.created_at
-            days_since_activity = (scan_date - last_activity).days
-
-            if days_since_activity >= DataRetentionService.FERPA_RETENTION_DAYS:
-                results["eligible_for_archival"]["tutors"].append({
-                    "tutor_id": tutor.tutor_id,
-                    "name": tutor.name,
-                    "created_at": tutor.created_at.isoformat(),
-                    "last_activity": last_activity.isoformat(),
-                    "days_since_activity": days_since_activity,
+            results["eligible_for_archival"][key] = [
+                {
+                    id_column.key: row[0],
+                    "name": row.name,
+                    "created_at": row.created_at.isoformat(),
+                    "last_activity": row.last_activity.isoformat(),
+                    "days_since_activity": (scan_date - row.last_activity.replace(tzinfo=None)).days,
                     "eligible_for": RetentionAction.ARCHIVE.value,
-                })
+                }
+                for row in rows
+            ]
+            results["summary"][f"total_{key}_for_archival"] = await count(*criteria)
 
         # Find old sessions (7+ years old)
-        sessions_query = (
-            select(TutoringSession)
-            .where(TutoringSession.scheduled_start <= retention_deadline)
+        sessions_criteria = (TutoringSession.scheduled_start <= retention_deadline,)
+        rows = await session.execute(
+            select(
+                TutoringSession.session_id,
+                TutoringSession.tutor_id,
+                TutoringSession.student_id,
+                TutoringSession.scheduled_start,
+                TutoringSession.subject,
+            )
+            .where(*sessions_criteria)
+            .order_by(TutoringSession.scheduled_start)
+            .limit(limit)
         )
-        sessions_result = await session.execute(sessions_query)
-        old_sessions = sessions_result.scalars().all()
-
         results["eligible_for_archival"]["sessions"] = [
             {
-                "session_id": sess.session_id,
-                "tutor_id": sess.tutor_id,
-                "student_id": sess.student_id,
-                "scheduled_start": sess.scheduled_start.isoformat(),
-                "subject": sess.subject,
+                "session_id": row.session_id,
+                "tutor_id": row.tutor_id,
+                "student_id": row.student_id,
+                "scheduled_start": row.scheduled_start.isoformat(),
+                "subject": row.subject,
                 "eligible_for": RetentionAction.ARCHIVE.value,
             }
-            for sess in old_sessions
+            for row in rows
         ]
+        results["summary"]["total_sessions_for_archival"] = await count(*sessions_criteria)
 
         # Find old feedback (7+ years old)
-        feedback_query = (
-            select(StudentFeedback)
-            .where(StudentFeedback.submitted_at <= retention_deadline)
+        feedback_criteria = (StudentFeedback.submitted_at <= retention_deadline,)
+        rows = await session.execute(
+            select(
+                StudentFeedback.feedback_id,
+                StudentFeedback.session_id,
+                StudentFeedback.tutor_id,
+                StudentFeedback.student_id,
+                StudentFeedback.submitted_at,
+            )
+            .where(*feedback_criteria)
+            .order_by(StudentFeedback.submitted_at)
+            .limit(limit)
         )
-        feedback_result = await session.execute(feedback_query)
-        old_feedback = feedback_result.scalars().all()
-
         results["eligible_for_archival"]["feedback"] = [
             {
-                "feedback_id": fb.feedback_id,
-                "session_id": fb.session_id,
-                "tutor_id": fb.tutor_id,
-                "student_id": fb.student_id,
-                "submitted_at": fb.submitted_at.isoformat(),
+                "feedback_id": row.feedback_id,
+                "session_id": row.session_id,
+                "tutor_id": row.tutor_id,
+                "student_id": row.student_id,
+                "submitted_at": row.submitted_at.isoformat(),
                 "eligible_for": RetentionAction.ARCHIVE.value,
             }
-            for fb in old_feedback
+            for row in rows
         ]
+        results["summary"]["total_feedback_for_archival"] = await count(*feedback_criteria)
 
         # Find old audit logs (7+ years old) - only keep for compliance
-        audit_deadline = scan_date - timedelta(days=DataRetentionService.AUDIT_LOG_RETENTION_DAYS)
-        audit_logs_query = (
-            select(AuditLog)
-            .where(AuditLog.timestamp <= audit_deadline)
+        audit_criteria = (AuditLog.timestamp <= audit_deadline,)
+        rows = await session.execute(
+            select(AuditLog.log_id, AuditLog.action, AuditLog.timestamp)
+            .where(*audit_criteria)
+            .order_by(AuditLog.timestamp)
+            .limit(limit)
         )
-        audit_logs_result = await session.execute(audit_logs_query)
-        old_audit_logs = audit_logs_result.scalars().all()
-
         results["eligible_for_archival"]["audit_logs"] = [
             {
-                "log_id": log.log_id,
-                "action": log.action,
-                "timestamp": log.timestamp.isoformat(),
+                "log_id": row.log_id,
+                "action": row.action,
+                "timestamp": row.timestamp.isoformat(),
                 "eligible_for": RetentionAction.ARCHIVE.value,
             }
-            for log in old_audit_logs
+            for row in rows
         ]
+        results["summary"]["total_audit_logs_for_archival"] = await count(*audit_criteria)
 
         # Find records eligible for anonymization (3+ years old)
-        students_anon_query = (
-            select(Student)
-            .where(Student.updated_at <= anonymization_deadline)
+        anon_criteria = (Student.updated_at <= anonymization_deadline,)
+        rows = await session.execute(
+            select(Student.student_id, Student.name, Student.created_at)
+            .where(*anon_criteria)
+            .order_by(Student.updated_at)
+            .limit(limit)
         )
-        students_anon_result = await session.execute(students_anon_query)
-        anon_students = students_anon_result.scalars().all()
-
         results["eligible_for_anonymization"]["students"] = [
             {
-                "student_id": student.student_id,
-                "name": student.name,
-                "created_at": student.created_at.isoformat(),
+                "student_id": row.student_id,
+                "name": row.name,
+                "created_at": row.created_at.isoformat(),
                 "eligible_for": RetentionAction.ANONYMIZE.value,
             }
-            for student in anon_students
+            for row in rows
         ]
-
-        # Generate summary
-        results["summary"] = {
-            "total_students_for_archival": len(results["eligible_for_archival"]["students"]),
-            "total_tutors_for_archival": len(results["eligible_for_archival"]["tutors"]),
-            "total_sessions_for_archival": len(results["eligible_for_archival"]["sessions"]),
-            "total_feedback_for_archival": len(results["eligible_for_archival"]["feedback"]),
-            "total_audit_logs_for_archival": len(results["eligible_for_archival"]["audit_logs"]),
-            "total_students_for_anonymization": len(results["eligible_for_anonymization"]["students"]),
-        }
+        results["summary"]["total_students_for_anonymization"] = await count(*anon_criteria)
 
         # Log the scan
         await AuditService.log(
@@ -282,7 +271,9 @@ class DataRetentionService:
         """
         Archive all data for a student to cold storage.
 
-        This moves data to archival tables and removes from active tables.
+        Writes the student's record, sessions and feedback to compressed
+        Parquet in the archive store (see src.database.archival), then
+        removes them from the active tables in the same transaction.
         Maintains compliance with FERPA 7-year retention.
 
         Args:
@@ -295,14 +286,11 @@ class DataRetentionService:
             Summary of archival operation
         """
         archive_date = datetime.utcnow()
-        archive_id = str(uuid.uuid4())
 
         # Get student record
-        student_query = select(Student).where(Student.student_id == student_id)
+        student_query = select(Student.student_id).where(Student.student_id == student_id)
         student_result = await session.execute(student_query)
-        student = student_result.scalar_one_or_none()
-
-        if not student:
+        if student_result.scalar_one_or_none() is None:
             raise ValueError(f"Student {student_id} not found")
 
         # Check retention eligibility
@@ -313,65 +301,33 @@ class DataRetentionService:
                 f"Days until eligible: {retention_check.get('days_until_eligible_deletion')}"
             )
 
+        # Parquet writer is only needed when something is actually archived
+        from ...database.archival import ParquetArchiver
+
+        def _archive(sync_session) -> Dict[str, Any]:
+            archiver = ParquetArchiver(lambda: nullcontext(sync_session))
+            return archiver.archive_students([student_id], reason=reason)
+
+        # Copies the rows to cold storage and deletes them in one transaction
+        archive = await session.run_sync(_archive)
+
         archival_summary = {
-            "archive_id": archive_id,
+            "archive_id": archive["run_id"],
             "student_id": student_id,
             "archive_date": archive_date.isoformat(),
             "reason": reason,
             "performed_by": performed_by_user_id,
-            "archived_records": {},
-        }
-
-        # Archive student sessions
-        sessions_query = select(TutoringSession).where(TutoringSession.student_id == student_id)
-        sessions_result = await session.execute(sessions_query)
-        sessions = sessions_result.scalars().all()
-
-        # For now, we'll store archived data as JSON in audit logs
-        # In production, you'd create separate archival tables
-        archived_sessions = [
-            {
-                "session_id": sess.session_id,
-                "tutor_id": sess.tutor_id,
-                "scheduled_start": sess.scheduled_start.isoformat(),
-                "duration_minutes": sess.duration_minutes,
-                "subject": sess.subject,
-                "engagement_score": sess.engagement_score,
-            }
-            for sess in sessions
-        ]
-
-        # Archive student feedback
-        feedback_query = select(StudentFeedback).where(StudentFeedback.student_id == student_id)
-        feedback_result = await session.execute(feedback_query)
-        feedbacks = feedback_result.scalars().all()
-
-        archived_feedback = [
-            {
-                "feedback_id": fb.feedback_id,
-                "session_id": fb.session_id,
-                "overall_rating": fb.overall_rating,
-                "submitted_at": fb.submitted_at.isoformat(),
-            }
-            for fb in feedbacks
-        ]
-
-        # Store archival record
-        archival_summary["archived_records"] = {
-            "student_data": {
-                "student_id": student.student_id,
-                "name": student.name,
-                "created_at": student.created_at.isoformat(),
+            "manifest": archive["manifest"],
+            "archived_records": {
+                "files": archive["files"],
+                "record_counts": {
+                    "sessions": archive["rows_archived"]["sessions"],
+                    "feedback": archive["rows_archived"]["student_feedback"],
+                },
             },
-            "sessions": archived_sessions,
-            "feedback": archived_feedback,
-            "record_counts": {
-                "sessions": len(archived_sessions),
-                "feedback": len(archived_feedback),
-            }
         }
 
-        # Log archival action
+        # Log archival action (file locations and checksums only, no record contents)
         await AuditService.log(
             session=session,
             action="data_archived",
@@ -380,19 +336,12 @@ class DataRetentionService:
             resource_id=student_id,
             success=True,
             metadata={
-                "archive_id": archive_id,
+                "archive_id": archive["run_id"],
                 "archival_summary": archival_summary,
                 "ferpa_retention_deadline_met": True,
             }
         )
 
-        # Delete active records (they're now in archival storage via audit log)
-        await session.execute(delete(StudentFeedback).where(StudentFeedback.student_id == student_id))
-        await session.execute(delete(TutoringSession).where(TutoringSession.student_id == student_id))
-        await session.execute(delete(Student).where(Student.student_id == student_id))
-
-        await session.commit()
-
         return archival_summary
 
     @staticmethod
@@ -420,68 +369,28 @@ class DataRetentionService:
         anonymization_date = datetime.utcnow()
 
         if entity_type == "student":
-            # Get student
-            student_query = select(Student).where(Student.student_id == entity_id)
-            student_result = await session.execute(student_query)
-            student = student_result.scalar_one_or_none()
-
-            if not student:
-                raise ValueError(f"Student {entity_id} not found")
-
-            # Anonymize PII
-            original_data = {
-                "name": student.name,
-                "parent_email": student.parent_email,
-            }
-
-            student.name = f"ANONYMIZED_STUDENT_{entity_id[:8]}"
-            student.parent_email = None
-            student.parent_consent_ip = None
-
-            # Keep: age, grade_level, subjects_interested (for analytics)
-
-            anonymization_summary = {
-                "entity_type": entity_type,
-                "entity_id": entity_id,
-                "anonymization_date": anonymization_date.isoformat(),
-                "anonymized_fields": ["name", "parent_email", "parent_consent_ip"],
-                "retained_fields": ["age", "grade_level", "subjects_interested"],
-                "performed_by": performed_by_user_id,
-            }
-
+            anonymized_fields = ["name", "parent_email", "parent_consent_ip"]
+            retained_fields = ["age", "grade_level", "subjects_interested"]
         elif entity_type == "tutor":
-            # Get tutor
-            tutor_query = select(Tutor).where(Tutor.tutor_id == entity_id)
-            tutor_result = await session.execute(tutor_query)
-            tutor = tutor_result.scalar_one_or_none()
-
-            if not tutor:
-                raise ValueError(f"Tutor {entity_id} not found")
-
-            # Anonymize PII
-            original_data = {
-                "name": tutor.name,
-                "email": tutor.email,
-                "location": tutor.location,
-            }
-
-            tutor.name = f"ANONYMIZED_TUTOR_{entity_id[:8]}"
-            tutor.email = f"anonymized_{entity_id[:8]}@example.com"
-            tutor.location = "REDACTED"
-
-            # Keep: subjects, education_level, behavioral_archetype, performance data
-
-            anonymization_summary = {
-                "entity_type": entity_type,
-                "entity_id": entity_id,
-                "anonymization_date": anonymization_date.isoformat(),
-                "anonymized_fields": ["name", "email", "location"],
-                "retained_fields": ["subjects", "education_level", "behavioral_archetype", "status"],
-                "performed_by": performed_by_user_id,
-            }
+            anonymized_fields = ["name", "email", "location"]
+            retained_fields = ["subjects", "education_level", "behavioral_archetype", "status"]
         else:
             raise ValueError(f"Unsupported entity type: {entity_type}")
 
+        # One UPDATE ... RETURNING; the row is never loaded
+        result = await session.execute(anonymize_entities_update(entity_type, [entity_id]))
+        if result.scalar_one_or_none() is None:
+            raise ValueError(f"{entity_type.capitalize()} {entity_id} not found")
+
+        anonymization_summary = {
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "anonymization_date": anonymization_date.isoformat(),
+            "anonymized_fields": anonymized_fields,
+            "retained_fields": retained_fields,
+            "performed_by": performed_by_user_id,
+        }
+
         # Log anonymization
         await AuditService.log(
             session=session,
@@ -711,21 +620,25 @@ class DataRetentionService:
         }
 
         if perform_actions:
-            # Archive eligible students
-            for student_info in scan_results["eligible_for_archival"]["students"]:
-                try:
-                    await DataRetentionService.archive_student_data(
-                        session=session,
-                        student_id=student_info["student_id"],
-                        reason="Automated archival - FERPA retention period expired"
-                    )
-                    archival_results["actions_performed"]["students_archived"] += 1
-                except Exception as e:
-                    archival_results["actions_performed"]["errors"].append({
-                        "entity_type": "student",
-                        "entity_id": student_info["student_id"],
-                        "error": str(e)
-                    })
+            from ...database.archival import ParquetArchiver
+
+            def _archive(sync_session) -> Dict[str, Any]:
+                # Chunks commit on this session's connection, one transaction each
+                archiver = ParquetArchiver(lambda: nullcontext(sync_session))
+                return archiver.run(DataRetentionService.FERPA_RETENTION_DAYS)
+
+            try:
+                archive = await session.run_sync(_archive)
+                archival_results["actions_performed"]["students_archived"] = archive["students_archived"]
+                archival_results["archive"] = archive
+            except Exception as e:
+                # Chunks committed before the failure stay archived; the next run resumes
+                await session.rollback()
+                archival_results["actions_performed"]["errors"].append({
+                    "entity_type": "student",
+                    "entity_id": None,
+                    "error": str(e)
+                })
 
         # Log scheduled run
         await AuditService.log(
@@ -13,10 +13,11 @@ Rights Implemented:
 - Data breach notification (Article 33-34)
 """
 
-from datetime import datetime, timedelta
+from contextlib import nullcontext
+from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, delete, update
+from sqlalchemy import select, and_, or_, update
 from sqlalchemy.orm import selectinload
 import json
 import uuid
@@ -27,14 +28,12 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 
-from ...database.models import (
-    User, Tutor, Student, Session as TutoringSession,
-    StudentFeedback, TutorPerformanceMetric, ChurnPrediction,
-    Intervention, TutorEvent, Notification, AuditLog, ManagerNote
-)
+from ...database.erasure import BulkErasure
+from ...database.models import User, Tutor, Student, AuditLog
 from ..security import encryption_service, anonymization_service
 from ..audit_service import AuditService
 from ..config import settings
+from .gdpr_export import EXPORT_SECTIONS, load_profile
 
 
 class GDPRService:
@@ -69,302 +68,19 @@ class GDPRService:
         Returns:
             Dictionary containing all user data organized by category
         """
-        # Get user record
-        user_query = select(User).where(User.id == user_id)
-        result = await session.execute(user_query)
-        user = result.scalar_one_or_none()
-
-        if not user:
-            raise ValueError(f"User {user_id} not found")
-
-        export_data = {
-            "export_metadata": {
-                "export_date": datetime.utcnow().isoformat(),
-                "user_id": user_id,
-                "data_controller": "TutorMax",
-                "gdpr_article": "Article 15 - Right of Access",
-            },
-            "account_information": {},
-            "tutor_data": None,
-            "student_data": None,
-            "sessions": [],
-            "feedback": [],
-            "performance_metrics": [],
-            "predictions": [],
-            "interventions": [],
-            "events": [],
-            "notifications": [],
-            "manager_notes": [],
-            "audit_logs": [],
-        }
-
-        # Export account information
-        export_data["account_information"] = {
-            "id": user.id,
-            "email": user.email if not include_encrypted else user.email,
-            "full_name": user.full_name,
-            "roles": [role.value for role in user.roles],
-            "oauth_provider": user.oauth_provider.value if user.oauth_provider else None,
-            "is_active": user.is_active,
-            "is_verified": user.is_verified,
-            "is_superuser": user.is_superuser,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at else None,
-            "last_login": user.last_login.isoformat() if user.last_login else None,
-        }
-
-        # Export tutor data if applicable
-        if user.tutor_id:
-            tutor_query = select(Tutor).where(Tutor.tutor_id == user.tutor_id)
-            result = await session.execute(tutor_query)
-            tutor = result.scalar_one_or_none()
-
-            if tutor:
-                export_data["tutor_data"] = {
-                    "tutor_id": tutor.tutor_id,
-                    "name": tutor.name,
-                    "email": tutor.email,
-                    "onboarding_date": tutor.onboarding_date.isoformat(),
-                    "status": tutor.status.value,
-                    "subjects": tutor.subjects,
-                    "education_level": tutor.education_level,
-                    "location": tutor.location,
-                    "baseline_sessions_per_week": tutor.baseline_sessions_per_week,
-                    "behavioral_archetype": tutor.behavioral_archetype.value if tutor.behavioral_archetype else None,
-                    "created_at": tutor.created_at.isoformat(),
-                    "updated_at": tutor.updated_at.isoformat(),
-                }
-
-                # Export tutor sessions
-                sessions_query = select(TutoringSession).where(
-                    TutoringSession.tutor_id == tutor.tutor_id
-                )
-                result = await session.execute(sessions_query)
-                sessions = result.scalars().all()
-
-                for sess in sessions:
-                    export_data["sessions"].append({
-                        "session_id": sess.session_id,
-                        "student_id": sess.student_id,
-                        "session_number": sess.session_number,
-                        "scheduled_start": sess.scheduled_start.isoformat(),
-                        "actual_start": sess.actual_start.isoformat() if sess.actual_start else None,
-                        "duration_minutes": sess.duration_minutes,
-                        "subject": sess.subject,
-                        "session_type": sess.session_type.value,
-                        "tutor_initiated_reschedule": sess.tutor_initiated_reschedule,
-                        "no_show": sess.no_show,
-                        "late_start_minutes": sess.late_start_minutes,
-                        "engagement_score": sess.engagement_score,
-                        "learning_objectives_met": sess.learning_objectives_met,
-                        "technical_issues": sess.technical_issues,
-                    })
-
-                # Export performance metrics
-                metrics_query = select(TutorPerformanceMetric).where(
-                    TutorPerformanceMetric.tutor_id == tutor.tutor_id
-                )
-                result = await session.execute(metrics_query)
-                metrics = result.scalars().all()
-
-                for metric in metrics:
-                    export_data["performance_metrics"].append({
-                        "metric_id": metric.metric_id,
-                        "calculation_date": metric.calculation_date.isoformat(),
-                        "window": metric.window.value,
-                        "sessions_completed": metric.sessions_completed,
-                        "avg_rating": metric.avg_rating,
-                        "first_session_success_rate": metric.first_session_success_rate,
-                        "reschedule_rate": metric.reschedule_rate,
-                        "no_show_count": metric.no_show_count,
-                        "engagement_score": metric.engagement_score,
-                        "learning_objectives_met_pct": metric.learning_objectives_met_pct,
-                        "response_time_avg_minutes": metric.response_time_avg_minutes,
-                        "performance_tier": metric.performance_tier.value if metric.performance_tier else None,
-                    })
-
-                # Export churn predictions
-                predictions_query = select(ChurnPrediction).where(
-                    ChurnPrediction.tutor_id == tutor.tutor_id
-                )
-                result = await session.execute(predictions_query)
-                predictions = result.scalars().all()
-
-                for pred in predictions:
-                    export_data["predictions"].append({
-                        "prediction_id": pred.prediction_id,
-                        "prediction_date": pred.prediction_date.isoformat(),
-                        "churn_score": pred.churn_score,
-                        "risk_level": pred.risk_level.value,
-                        "window_1day_probability": pred.window_1day_probability,
-                        "window_7day_probability": pred.window_7day_probability,
-                        "window_30day_probability": pred.window_30day_probability,
-                        "window_90day_probability": pred.window_90day_probability,
-                        "contributing_factors": pred.contributing_factors,
-                        "model_version": pred.model_version,
-                    })
-
-                # Export interventions
-                interventions_query = select(Intervention).where(
-                    Intervention.tutor_id == tutor.tutor_id
-                )
-                result = await session.execute(interventions_query)
-                interventions = result.scalars().all()
-
-                for interv in interventions:
-                    export_data["interventions"].append({
-                        "intervention_id": interv.intervention_id,
-                        "intervention_type": interv.intervention_type.value,
-                        "trigger_reason": interv.trigger_reason,
-                        "recommended_date": interv.recommended_date.isoformat(),
-                        "assigned_to": interv.assigned_to,
-                        "status": interv.status.value,
-                        "due_date": interv.due_date.isoformat() if interv.due_date else None,
-                        "completed_date": interv.completed_date.isoformat() if interv.completed_date else None,
-                        "outcome": interv.outcome.value if interv.outcome else None,
-                        "notes": interv.notes,
-                    })
-
-                # Export tutor events
-                events_query = select(TutorEvent).where(
-                    TutorEvent.tutor_id == tutor.tutor_id
-                )
-                result = await session.execute(events_query)
-                events = result.scalars().all()
-
-                for event in events:
-                    export_data["events"].append({
-                        "event_id": event.event_id,
-                        "event_type": event.event_type,
-                        "event_timestamp": event.event_timestamp.isoformat(),
-                        "metadata": event.event_metadata,
-                    })
-
-                # Export manager notes
-                notes_query = select(ManagerNote).where(
-                    ManagerNote.tutor_id == tutor.tutor_id
-                )
-                result = await session.execute(notes_query)
-                notes = result.scalars().all()
-
-                for note in notes:
-                    export_data["manager_notes"].append({
-                        "note_id": note.note_id,
-                        "author_name": note.author_name,
-                        "note_text": note.note_text,
-                        "is_important": note.is_important,
-                        "created_at": note.created_at.isoformat(),
-                    })
-
-        # Export student data if applicable
-        if user.student_id:
-            student_query = select(Student).where(Student.student_id == user.student_id)
-            result = await session.execute(student_query)
-            student = result.scalar_one_or_none()
-
-            if student:
-                export_data["student_data"] = {
-                    "student_id": student.student_id,
-                    "name": student.name,
-                    "age": student.age,
-                    "grade_level": student.grade_level,
-                    "subjects_interested": student.subjects_interested,
-                    "is_under_13": student.is_under_13,
-                    "parent_email": student.parent_email,
-                    "parent_consent_given": student.parent_consent_given,
-                    "parent_consent_date": student.parent_consent_date.isoformat() if student.parent_consent_date else None,
-                    "created_at": student.created_at.isoformat(),
-                    "updated_at": student.updated_at.isoformat(),
-                }
-
-                # Export student sessions
-                sessions_query = select(TutoringSession).where(
-                    TutoringSession.student_id == student.student_id
-                )
-                result = await session.execute(sessions_query)
-                sessions = result.scalars().all()
-
-                for sess in sessions:
-                    # Only add if not already in sessions list (from tutor export)
-                    if not any(s["session_id"] == sess.session_id for s in export_data["sessions"]):
-                        export_data["sessions"].append({
-                            "session_id": sess.session_id,
-                            "tutor_id": sess.tutor_id,
-                            "session_number": sess.session_number,
-                            "scheduled_start": sess.scheduled_start.isoformat(),
-                            "actual_start": sess.actual_start.isoformat() if sess.actual_start else None,
-                            "duration_minutes": sess.duration_minutes,
-                            "subject": sess.subject,
-                            "session_type": sess.session_type.value,
-                        })
-
-                # Export student feedback
-                feedback_query = select(StudentFeedback).where(
-                    StudentFeedback.student_id == student.student_id
-                )
-                result = await session.execute(feedback_query)
-                feedbacks = result.scalars().all()
-
-                for fb in feedbacks:
-                    export_data["feedback"].append({
-                        "feedback_id": fb.feedback_id,
-                        "session_id": fb.session_id,
-                        "tutor_id": fb.tutor_id,
-                        "overall_rating": fb.overall_rating,
-                        "is_first_session": fb.is_first_session,
-                        "subject_knowledge_rating": fb.subject_knowledge_rating,
-                        "communication_rating": fb.communication_rating,
-                        "patience_rating": fb.patience_rating,
-                        "engagement_rating": fb.engagement_rating,
-                        "helpfulness_rating": fb.helpfulness_rating,
-                        "would_recommend": fb.would_recommend,
-                        "improvement_areas": fb.improvement_areas,
-                        "free_text_feedback": fb.free_text_feedback,
-                        "submitted_at": fb.submitted_at.isoformat(),
-                    })
-
-        # Export notifications
-        notifications_query = select(Notification).where(
-            Notification.recipient_id == str(user_id)
-        )
-        result = await session.execute(notifications_query)
-        notifications = result.scalars().all()
-
-        for notif in notifications:
-            export_data["notifications"].append({
-                "notification_id": notif.notification_id,
-                "recipient_email": notif.recipient_email,
-                "notification_type": notif.notification_type.value,
-                "priority": notif.priority.value,
-                "status": notif.status.value,
-                "subject": notif.subject,
-                "body": notif.body,
-                "sent_at": notif.sent_at.isoformat() if notif.sent_at else None,
-                "read_at": notif.read_at.isoformat() if notif.read_at else None,
-                "created_at": notif.created_at.isoformat(),
-            })
-
-        # Export audit logs (last 90 days for privacy)
-        audit_start = datetime.utcnow() - timedelta(days=90)
-        audit_query = select(AuditLog).where(
-            and_(
-                AuditLog.user_id == user_id,
-                AuditLog.timestamp >= audit_start
-            )
-        ).order_by(AuditLog.timestamp.desc())
-        result = await session.execute(audit_query)
-        audit_logs = result.scalars().all()
-
-        for log in audit_logs:
-            export_data["audit_logs"].append({
-                "log_id": log.log_id,
-                "action": log.action,
-                "resource_type": log.resource_type,
-                "resource_id": log.resource_id,
-                "ip_address": log.ip_address,
-                "timestamp": log.timestamp.isoformat(),
-                "success": log.success,
-            })
+        profile = await load_profile(session, user_id)
+        ctx = profile.pop("context")
+        export_data = profile
+
+        for section in EXPORT_SECTIONS:
+            query = section.query(ctx)
+            if query is None:
+                export_data[section.name] = []
+                continue
+            result = await session.execute(query)
+            export_data[section.name] = [
+                section.record(obj, ctx) for obj in result.scalars()
+            ]
 
         return export_data
 
@@ -395,153 +111,33 @@ class GDPRService:
         if not user:
             raise ValueError(f"User {user_id} not found")
 
-        deletion_summary = {
-            "user_id": user_id,
-            "deletion_date": datetime.utcnow().isoformat(),
-            "deletion_reason": deletion_reason,
-            "records_deleted": {},
-            "records_anonymized": {},
-        }
-
-        # Delete or anonymize tutor data
-        if user.tutor_id:
-            tutor_id = user.tutor_id
-
-            # Count records before deletion
-            sessions_count = await session.execute(
-                select(TutoringSession).where(TutoringSession.tutor_id == tutor_id)
-            )
-            deletion_summary["records_deleted"]["sessions"] = len(sessions_count.scalars().all())
-
-            # Delete sessions
-            await session.execute(
-                delete(TutoringSession).where(TutoringSession.tutor_id == tutor_id)
-            )
-
-            # Delete performance metrics
-            metrics_count = await session.execute(
-                select(TutorPerformanceMetric).where(TutorPerformanceMetric.tutor_id == tutor_id)
-            )
-            deletion_summary["records_deleted"]["performance_metrics"] = len(metrics_count.scalars().all())
-            await session.execute(
-                delete(TutorPerformanceMetric).where(TutorPerformanceMetric.tutor_id == tutor_id)
-            )
-
-            # Delete churn predictions
-            predictions_count = await session.execute(
-                select(ChurnPrediction).where(ChurnPrediction.tutor_id == tutor_id)
-            )
-            deletion_summary["records_deleted"]["churn_predictions"] = len(predictions_count.scalars().all())
-            await session.execute(
-                delete(ChurnPrediction).where(ChurnPrediction.tutor_id == tutor_id)
-            )
-
-            # Delete interventions
-            interventions_count = await session.execute(
-                select(Intervention).where(Intervention.tutor_id == tutor_id)
-            )
-            deletion_summary["records_deleted"]["interventions"] = len(interventions_count.scalars().all())
-            await session.execute(
-                delete(Intervention).where(Intervention.tutor_id == tutor_id)
-            )
-
-            # Delete tutor events
-            events_count = await session.execute(
-                select(TutorEvent).where(TutorEvent.tutor_id == tutor_id)
-            )
-            deletion_summary["records_deleted"]["tutor_events"] = len(events_count.scalars().all())
-            await session.execute(
-                delete(TutorEvent).where(TutorEvent.tutor_id == tutor_id)
-            )
-
-            # Delete manager notes
-            notes_count = await session.execute(
-                select(ManagerNote).where(ManagerNote.tutor_id == tutor_id)
-            )
-            deletion_summary["records_deleted"]["manager_notes"] = len(notes_count.scalars().all())
-            await session.execute(
-                delete(ManagerNote).where(ManagerNote.tutor_id == tutor_id)
-            )
-
-            # Delete tutor record
-            await session.execute(
-                delete(Tutor).where(Tutor.tutor_id == tutor_id)
-            )
-            deletion_summary["records_deleted"]["tutor"] = 1
-
-        # Delete student data
-        if user.student_id:
-            student_id = user.student_id
+        deletion_date = datetime.utcnow()
+        session.expunge(user)
 
-            # Delete student sessions
-            sessions_count = await session.execute(
-                select(TutoringSession).where(TutoringSession.student_id == student_id)
-            )
-            count = len(sessions_count.scalars().all())
-            deletion_summary["records_deleted"]["student_sessions"] = count
-            await session.execute(
-                delete(TutoringSession).where(TutoringSession.student_id == student_id)
-            )
-
-            # Delete student feedback
-            feedback_count = await session.execute(
-                select(StudentFeedback).where(StudentFeedback.student_id == student_id)
-            )
-            deletion_summary["records_deleted"]["student_feedback"] = len(feedback_count.scalars().all())
-            await session.execute(
-                delete(StudentFeedback).where(StudentFeedback.student_id == student_id)
-            )
-
-            # Delete student record
-            await session.execute(
-                delete(Student).where(Student.student_id == student_id)
-            )
-            deletion_summary["records_deleted"]["student"] = 1
-
-        # Delete notifications
-        notifications_count = await session.execute(
-            select(Notification).where(Notification.recipient_id == str(user_id))
-        )
-        deletion_summary["records_deleted"]["notifications"] = len(notifications_count.scalars().all())
-        await session.execute(
-            delete(Notification).where(Notification.recipient_id == str(user_id))
-        )
-
-        # Handle audit logs
-        if retain_audit_logs:
-            # Anonymize audit logs instead of deleting (for compliance)
-            audit_logs_query = select(AuditLog).where(AuditLog.user_id == user_id)
-            result = await session.execute(audit_logs_query)
-            audit_logs = result.scalars().all()
-
-            for log in audit_logs:
-                log.user_id = None  # Anonymize user ID
-                if log.audit_metadata:
-                    # Remove PII from metadata
-                    if isinstance(log.audit_metadata, dict):
-                        log.audit_metadata.pop("email", None)
-                        log.audit_metadata.pop("name", None)
-                        log.audit_metadata["anonymized"] = True
-
-            deletion_summary["records_anonymized"]["audit_logs"] = len(audit_logs)
-        else:
-            # Delete audit logs
-            audit_count = await session.execute(
-                select(AuditLog).where(AuditLog.user_id == user_id)
-            )
-            deletion_summary["records_deleted"]["audit_logs"] = len(audit_count.scalars().all())
-            await session.execute(
-                delete(AuditLog).where(AuditLog.user_id == user_id)
+        def _erase(sync_session) -> Dict[str, Any]:
+            # Chunks commit on this session's connection, one transaction each
+            erasure = BulkErasure(lambda: nullcontext(sync_session))
+            request_id = erasure.create(
+                [user_id], deletion_reason, retain_audit_logs=retain_audit_logs
             )
+            return erasure.run(request_id)
 
-        # Delete user account
-        await session.execute(
-            delete(User).where(User.id == user_id)
-        )
-        deletion_summary["records_deleted"]["user_account"] = 1
+        stats = await session.run_sync(_erase)
+        rows_affected = stats["rows_affected"]
 
-        # Commit all deletions
-        await session.commit()
+        deletion_summary = {
+            "user_id": user_id,
+            "deletion_date": deletion_date.isoformat(),
+            "deletion_reason": deletion_reason,
+            "erasure_request_id": stats["request_id"],
+            "records_deleted": {
+                phase: count for phase, count in rows_affected.items()
+                if not (phase == "audit_logs" and retain_audit_logs)
+            },
+            "records_anonymized": (
+                {"audit_logs": rows_affected.get("audit_logs", 0)} if retain_audit_logs else {}
+            ),
+        }
 
         # Log the deletion (in a new session since we deleted the user)
         await AuditService.log(
@@ -0,0 +1,664 @@
+"""
+GDPR Data Export Engine
+
+Builds the Article 15/20 data export for a user as a ZIP archive without
+holding the user's data in memory:
+
+- profile.json: export metadata, account, tutor and student records
+- one NDJSON entry per section (sessions, feedback, audit_logs, ...)
+
+Sections are queried concurrently, each on its own session, and streamed
+through server-side cursors in batches of EXPORT_BATCH_SIZE rows into
+per-section files in export storage (shared by the API and workers).
+Progress is kept in a Redis manifest, so an interrupted export resumes, on
+any worker, by re-running only the unfinished sections.
+
+The same section definitions back GDPRService.export_user_data, which
+returns the export as a dict for small, synchronous requests.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_, select, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...database.models import (
+    User, Tutor, Student, Session as TutoringSession,
+    StudentFeedback, TutorPerformanceMetric, ChurnPrediction,
+    Intervention, TutorEvent, Notification, AuditLog, ManagerNote
+)
+from ..config import settings
+from ..export_service import EXPORT_BATCH_SIZE
+from ..export_storage import ExportStorage
+
+logger = logging.getLogger(__name__)
+
+# Audit log entries older than this are not exported (privacy)
+AUDIT_LOG_EXPORT_DAYS = 90
+
+# A job whose manifest has not been updated for this long is taken to have
+# lost its worker and may be resumed
+EXPORT_STALL_TIMEOUT = timedelta(minutes=10)
+
+EXPORT_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _value(enum_member) -> Optional[str]:
+    return enum_member.value if enum_member else None
+
+
+@dataclass
+class ExportContext:
+    """Whose data a section selects."""
+
+    user_id: int
+    tutor_id: Optional[str] = None
+    student_id: Optional[str] = None
+    audit_since: datetime = field(
+        default_factory=lambda: datetime.utcnow() - timedelta(days=AUDIT_LOG_EXPORT_DAYS)
+    )
+
+
+# ============================================================================
+# Record formatting
+# ============================================================================
+
+def account_record(user: User) -> Dict[str, Any]:
+    return {
+        "id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "roles": [role.value for role in user.roles],
+        "oauth_provider": _value(user.oauth_provider),
+        "is_active": user.is_active,
+        "is_verified": user.is_verified,
+        "is_superuser": user.is_superuser,
+        "created_at": _iso(user.created_at),
+        "updated_at": _iso(user.updated_at),
+        "last_login": _iso(user.last_login),
+    }
+
+
+def tutor_record(tutor: Tutor) -> Dict[str, Any]:
+    return {
+        "tutor_id": tutor.tutor_id,
+        "name": tutor.name,
+        "email": tutor.email,
+        "onboarding_date": tutor.onboarding_date.isoformat(),
+        "status": tutor.status.value,
+        "subjects": tutor.subjects,
+        "education_level": tutor.education_level,
+        "location": tutor.location,
+        "baseline_sessions_per_week": tutor.baseline_sessions_per_week,
+        "behavioral_archetype": _value(tutor.behavioral_archetype),
+        "created_at": tutor.created_at.isoformat(),
+        "updated_at": tutor.updated_at.isoformat(),
+    }
+
+
+def student_record(student: Student) -> Dict[str, Any]:
+    return {
+        "student_id": student.student_id,
+        "name": student.name,
+        "age": student.age,
+        "grade_level": student.grade_level,
+        "subjects_interested": student.subjects_interested,
+        "is_under_13": student.is_under_13,
+        "parent_email": student.parent_email,
+        "parent_consent_given": student.parent_consent_given,
+        "parent_consent_date": _iso(student.parent_consent_date),
+        "created_at": student.created_at.isoformat(),
+        "updated_at": student.updated_at.isoformat(),
+    }
+
+
+def _session_record(sess: TutoringSession, ctx: ExportContext) -> Dict[str, Any]:
+    as_tutor = ctx.tutor_id is not None and sess.tutor_id == ctx.tutor_id
+    record = {"session_id": sess.session_id}
+    if as_tutor:
+        record["student_id"] = sess.student_id
+    else:
+        record["tutor_id"] = sess.tutor_id
+    record.update({
+        "session_number": sess.session_number,
+        "scheduled_start": sess.scheduled_start.isoformat(),
+        "actual_start": _iso(sess.actual_start),
+        "duration_minutes": sess.duration_minutes,
+        "subject": sess.subject,
+        "session_type": sess.session_type.value,
+    })
+    if as_tutor:
+        # The tutor's own session quality data
+        record.update({
+            "tutor_initiated_reschedule": sess.tutor_initiated_reschedule,
+            "no_show": sess.no_show,
+            "late_start_minutes": sess.late_start_minutes,
+            "engagement_score": sess.engagement_score,
+            "learning_objectives_met": sess.learning_objectives_met,
+            "technical_issues": sess.technical_issues,
+        })
+    return record
+
+
+def _sessions_query(ctx: ExportContext) -> Optional[Select]:
+    # One query covers sessions as tutor and as student, so a session is
+    # never exported twice
+    conditions = []
+    if ctx.tutor_id:
+        conditions.append(TutoringSession.tutor_id == ctx.tutor_id)
+    if ctx.student_id:
+        conditions.append(TutoringSession.student_id == ctx.student_id)
+    if not conditions:
+        return None
+    return select(TutoringSession).where(or_(*conditions)).order_by(TutoringSession.scheduled_start)
+
+
+def _metric_record(metric: TutorPerformanceMetric, ctx: ExportContext) -> Dict[str, Any]:
+    return {
+        "metric_id": metric.metric_id,
+        "calculation_date": metric.calculation_date.isoformat(),
+        "window": metric.window.value,
+        "sessions_completed": metric.sessions_completed,
+        "avg_rating": metric.avg_rating,
+        "first_session_success_rate": metric.first_session_success_rate,
+        "reschedule_rate": metric.reschedule_rate,
+        "no_show_count": metric.no_show_count,
+        "engagement_score": metric.engagement_score,
+        "learning_objectives_met_pct": metric.learning_objectives_met_pct,
+        "response_time_avg_minutes": metric.response_time_avg_minutes,
+        "performance_tier": _value(metric.performance_tier),
+    }
+
+
+def _prediction_record(pred: ChurnPrediction, ctx: ExportContext) -> Dict[str, Any]:
+    return {
+        "prediction_id": pred.prediction_id,
+        "prediction_date": pred.prediction_date.isoformat(),
+        "churn_score": pred.churn_score,
+        "risk_level": pred.risk_level.value,
+        "window_1day_probability": pred.window_1day_probability,
+        "window_7day_probability": pred.window_7day_probability,
+        "window_30day_probability": pred.window_30day_probability,
+        "window_90day_probability": pred.window_90day_probability,
+        "contributing_factors": pred.contributing_factors,
+        "model_version": pred.model_version,
+    }
+
+
+def _intervention_record(interv: Intervention, ctx: ExportContext) -> Dict[str, Any]:
+    return {
+        "intervention_id": interv.intervention_id,
+        "intervention_type": interv.intervention_type.value,
+        "trigger_reason": interv.trigger_reason,
+        "recommended_date": interv.recommended_date.isoformat(),
+        "assigned_to": interv.assigned_to,
+        "status": interv.status.value,
+        "due_date": _iso(interv.due_date),
+        "completed_date": _iso(interv.completed_date),
+        "outcome": _value(interv.outcome),
+        "notes": interv.notes,
+    }
+
+
+def _event_record(event: TutorEvent, ctx: ExportContext) -> Dict[str, Any]:
+    return {
+        "event_id": event.event_id,
+        "event_type": event.event_type,
+        "event_timestamp": event.event_timestamp.isoformat(),
+        "metadata": event.event_metadata,
+    }
+
+
+def _note_record(note: ManagerNote, ctx: ExportContext) -> Dict[str, Any]:
+    return {
+        "note_id": note.note_id,
+        "author_name": note.author_name,
+        "note_text": note.note_text,
+        "is_important": note.is_important,
+        "created_at": note.created_at.isoformat(),
+    }
+
+
+def _feedback_record(fb: StudentFeedback, ctx: ExportContext) -> Dict[str, Any]:
+    return {
+        "feedback_id": fb.feedback_id,
+        "session_id": fb.session_id,
+        "tutor_id": fb.tutor_id,
+        "overall_rating": fb.overall_rating,
+        "is_first_session": fb.is_first_session,
+        "subject_knowledge_rating": fb.subject_knowledge_rating,
+        "communication_rating": fb.communication_rating,
+        "patience_rating": fb.patience_rating,
+        "engagement_rating": fb.engagement_rating,
+        "helpfulness_rating": fb.helpfulness_rating,
+        "would_recommend": fb.would_recommend,
+        "improvement_areas": fb.improvement_areas,
+        "free_text_feedback": fb.free_text_feedback,
+        "submitted_at": fb.submitted_at.isoformat(),
+    }
+
+
+def _notification_record(notif: Notification, ctx: ExportContext) -> Dict[str, Any]:
+    return {
+        "notification_id": notif.notification_id,
+        "recipient_email": notif.recipient_email,
+        "notification_type": notif.notification_type.value,
+        "priority": notif.priority.value,
+        "status": notif.status.value,
+        "subject": notif.subject,
+        "body": notif.body,
+        "sent_at": _iso(notif.sent_at),
+        "read_at": _iso(notif.read_at),
+        "created_at": notif.created_at.isoformat(),
+    }
+
+
+def _audit_log_record(log: AuditLog, ctx: ExportContext) -> Dict[str, Any]:
+    return {
+        "log_id": log.log_id,
+        "action": log.action,
+        "resource_type": log.resource_type,
+        "resource_id": log.resource_id,
+        "ip_address": log.ip_address,
+        "timestamp": log.timestamp.isoformat(),
+        "success": log.success,
+    }
+
+
+def _tutor_query(model, order_by) -> Callable[[ExportContext], Optional[Select]]:
+    def query(ctx: ExportContext) -> Optional[Select]:
+        if not ctx.tutor_id:
+            return None
+        return select(model).where(model.tutor_id == ctx.tutor_id).order_by(order_by)
+    return query
+
+
+def _feedback_query(ctx: ExportContext) -> Optional[Select]:
+    if not ctx.student_id:
+        return None
+    return (
+        select(StudentFeedback)
+        .where(StudentFeedback.student_id == ctx.student_id)
+        .order_by(StudentFeedback.submitted_at)
+    )
+
+
+def _notifications_query(ctx: ExportContext) -> Select:
+    return (
+        select(Notification)
+        .where(Notification.recipient_id == str(ctx.user_id))
+        .order_by(Notification.created_at)
+    )
+
+
+def _audit_logs_query(ctx: ExportContext) -> Select:
+    return (
+        select(AuditLog)
+        .where(and_(AuditLog.user_id == ctx.user_id, AuditLog.timestamp >= ctx.audit_since))
+        .order_by(AuditLog.timestamp.desc())
+    )
+
+
+@dataclass(frozen=True)
+class ExportSection:
+    """One list-valued part of the export."""
+
+    name: str
+    query: Callable[[ExportContext], Optional[Select]]
+    record: Callable[[Any, ExportContext], Dict[str, Any]]
+
+
+EXPORT_SECTIONS: List[ExportSection] = [
+    ExportSection("sessions", _sessions_query, _session_record),
+    ExportSection("feedback", _feedback_query, _feedback_record),
+    ExportSection(
+        "performance_metrics",
+        _tutor_query(TutorPerformanceMetric, TutorPerformanceMetric.calculation_date),
+        _metric_record,
+    ),
+    ExportSection("predictions", _tutor_query(ChurnPrediction, ChurnPrediction.prediction_date), _prediction_record),
+    ExportSection("interventions", _tutor_query(Intervention, Intervention.recommended_date), _intervention_record),
+    ExportSection("events", _tutor_query(TutorEvent, TutorEvent.event_timestamp), _event_record),
+    ExportSection("notifications", _notifications_query, _notification_record),
+    ExportSection("manager_notes", _tutor_query(ManagerNote, ManagerNote.created_at), _note_record),
+    ExportSection("audit_logs", _audit_logs_query, _audit_log_record),
+]
+
+
+async def load_profile(session: AsyncSession, user_id: int) -> Dict[str, Any]:
+    """
+    Load the single-record part of an export.
+
+    Returns:
+        Dict with export_metadata, account_information, tutor_data,
+        student_data and the ExportContext used to select the sections
+
+    Raises:
+        ValueError: If the user does not exist
+    """
+    user = (await session.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+    if not user:
+        raise ValueError(f"User {user_id} not found")
+
+    ctx = ExportContext(user_id=user_id)
+    profile = {
+        "export_metadata": {
+            "export_date": datetime.utcnow().isoformat(),
+            "user_id": user_id,
+            "data_controller": "TutorMax",
+            "gdpr_article": "Article 15 - Right of Access",
+        },
+        "account_information": account_record(user),
+        "tutor_data": None,
+        "student_data": None,
+        "context": ctx,
+    }
+
+    if user.tutor_id:
+        tutor = (await session.execute(
+            select(Tutor).where(Tutor.tutor_id == user.tutor_id)
+        )).scalar_one_or_none()
+        if tutor:
+            ctx.tutor_id = tutor.tutor_id
+            profile["tutor_data"] = tutor_record(tutor)
+
+    if user.student_id:
+        student = (await session.execute(
+            select(Student).where(Student.student_id == user.student_id)
+        )).scalar_one_or_none()
+        if student:
+            ctx.student_id = student.student_id
+            profile["student_data"] = student_record(student)
+
+    return profile
+
+
+# ============================================================================
+# Background export jobs
+# ============================================================================
+
+# Redis key of a job's progress manifest
+EXPORT_JOB_KEY = "gdpr:export:{export_id}"
+
+# Export storage prefix for job files
+EXPORT_PREFIX = "gdpr"
+
+_redis_client = None
+
+
+def _job_redis():
+    """Redis client for job manifests (shared by the API and workers)."""
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+    return _redis_client
+
+
+async def _single_chunk(data: bytes):
+    yield data
+
+
+class ExportJob:
+    """
+    Progress manifest and files of one background export.
+
+    The API creates the job and the worker builds it, usually on different
+    hosts, so nothing is kept on local disk:
+    - the manifest (see progress()) is JSON in Redis at gdpr:export:<export_id>,
+      expiring settings.export_retention_hours after its last update
+    - files are in export storage under gdpr/<export_id>/: profile.json,
+      one <section>.ndjson per finished section (removed once archived) and
+      tutormax_data_export_<user_id>.zip, deleted by cleanup_expired_exports
+    """
+
+    def __init__(self, export_id: str, storage: Optional[ExportStorage] = None, redis_client=None):
+        if not EXPORT_ID_PATTERN.match(export_id):
+            raise ValueError(f"Invalid export ID: {export_id}")
+        self.export_id = export_id
+        self.key = EXPORT_JOB_KEY.format(export_id=export_id)
+        self._storage = storage
+        self._redis = redis_client
+        self._manifest: Optional[Dict[str, Any]] = None
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            self._redis = _job_redis()
+        return self._redis
+
+    @property
+    def storage(self) -> ExportStorage:
+        if self._storage is None:
+            self._storage = ExportStorage()
+        return self._storage
+
+    @property
+    def ttl_seconds(self) -> int:
+        return settings.export_retention_hours * 3600
+
+    @property
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        if self._manifest is None:
+            raw = self.redis.get(self.key)
+            if raw is not None:
+                self._manifest = json.loads(raw)
+        return self._manifest
+
+    def create(self, user_id: int) -> Dict[str, Any]:
+        """Start a new job manifest (no-op if the job already exists)."""
+        now = datetime.utcnow().isoformat()
+        manifest = {
+            "export_id": self.export_id,
+            "user_id": user_id,
+            "status": "pending",
+            "created_at": now,
+            "updated_at": now,
+            "sections": {
+                section.name: {"status": "pending", "rows": 0} for section in EXPORT_SECTIONS
+            },
+        }
+        if self.redis.set(self.key, json.dumps(manifest), ex=self.ttl_seconds, nx=True):
+            self._manifest = manifest
+        return self.manifest
+
+    def save(self) -> None:
+        """Write the manifest (and extend its expiry)."""
+        self._manifest["updated_at"] = datetime.utcnow().isoformat()
+        self.redis.set(self.key, json.dumps(self._manifest), ex=self.ttl_seconds)
+
+    def update(self, **fields) -> None:
+        self._manifest.update(fields)
+        self.save()
+
+    def update_section(self, name: str, **fields) -> None:
+        self._manifest["sections"][name].update(fields)
+        self.save()
+
+    def _file(self, name: str) -> str:
+        return f"{EXPORT_PREFIX}/{self.export_id}/{name}"
+
+    @property
+    def profile_name(self) -> str:
+        return self._file("profile.json")
+
+    def section_name(self, name: str) -> str:
+        return self._file(f"{name}.ndjson")
+
+    @property
+    def archive_name(self) -> str:
+        return self._file(f"tutormax_data_export_{self.manifest['user_id']}.zip")
+
+    @property
+    def archive_filename(self) -> str:
+        return self.archive_name.rsplit("/", 1)[-1]
+
+    def is_stalled(self) -> bool:
+        """Whether a pending/running job has stopped making progress."""
+        updated_at = datetime.fromisoformat(self.manifest["updated_at"])
+        return datetime.utcnow() - updated_at > EXPORT_STALL_TIMEOUT
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Job progress for status endpoints.
+
+        Returns:
+            Status ("pending", "running", "ready" or "failed"), sections
+            done/total, rows exported per section, timestamps and, once
+            ready, when the archive expires
+        """
+        manifest = self.manifest
+        sections = manifest["sections"]
+        completed_at = manifest.get("completed_at")
+        expires_at = None
+        if completed_at:
+            expires_at = (
+                datetime.fromisoformat(completed_at) + timedelta(hours=settings.export_retention_hours)
+            ).isoformat()
+        return {
+            "export_id": self.export_id,
+            "status": manifest["status"],
+            "sections_done": sum(1 for s in sections.values() if s["status"] == "done"),
+            "sections_total": len(sections),
+            "rows_exported": {name: s["rows"] for name, s in sections.items()},
+            "created_at": manifest["created_at"],
+            "updated_at": manifest.get("updated_at"),
+            "completed_at": completed_at,
+            "expires_at": expires_at,
+            "error": manifest.get("error"),
+        }
+
+
+class GDPRExporter:
+    """
+    Writes a user's export archive, section by section, with bounded memory.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        max_concurrency: int = 4,
+    ):
+        """
+        Initialize exporter.
+
+        Args:
+            session_factory: Async session factory (one session per section)
+            batch_size: Rows fetched per server-side cursor round trip
+            max_concurrency: Sections queried at the same time
+        """
+        if session_factory is None:
+            from ...database.database import async_session_maker
+            session_factory = async_session_maker
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+
+    async def run(self, job: ExportJob) -> str:
+        """
+        Run (or resume) an export job.
+
+        Sections whose file was completed by an earlier attempt are skipped.
+
+        Args:
+            job: Export job created with ExportJob.create
+
+        Returns:
+            Export storage name of the finished ZIP archive
+        """
+        storage = job.storage
+        if job.manifest["status"] == "ready" and storage.exists(job.archive_name):
+            return job.archive_name
+
+        job.update(status="running", error=None)
+        try:
+            async with self.session_factory() as session:
+                profile = await load_profile(session, job.manifest["user_id"])
+            ctx = profile.pop("context")
+            await storage.write(
+                _single_chunk(json.dumps(profile, default=str, ensure_ascii=False).encode("utf-8")),
+                job.profile_name,
+            )
+
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def bounded(section: ExportSection) -> None:
+                async with semaphore:
+                    await self._export_section(job, section, ctx)
+
+            await asyncio.gather(*(
+                bounded(section) for section in EXPORT_SECTIONS
+                if not (job.manifest["sections"][section.name]["status"] == "done"
+                        and storage.exists(job.section_name(section.name)))
+            ))
+
+            archive = await asyncio.to_thread(self._write_archive, job)
+        except Exception as e:
+            job.update(status="failed", error=str(e))
+            raise
+
+        job.update(status="ready", completed_at=datetime.utcnow().isoformat())
+        return archive
+
+    async def _export_section(self, job: ExportJob, section: ExportSection, ctx: ExportContext) -> None:
+        query = section.query(ctx)
+        job.update_section(section.name, status="running", rows=0)
+        rows = 0
+
+        async def chunks():
+            nonlocal rows
+            if query is None:
+                return
+            async with self.session_factory() as session:
+                result = await session.stream(query.execution_options(yield_per=self.batch_size))
+                async for partition in result.scalars().partitions():
+                    yield "".join(
+                        json.dumps(section.record(obj, ctx), default=str, ensure_ascii=False) + "\n"
+                        for obj in partition
+                    ).encode("utf-8")
+                    rows += len(partition)
+                    job.update_section(section.name, rows=rows)
+
+        await job.storage.write(chunks(), job.section_name(section.name))
+        job.update_section(section.name, status="done", rows=rows)
+        logger.info(f"GDPR export {job.export_id}: {section.name} done ({rows} rows)")
+
+    @staticmethod
+    def _write_archive(job: ExportJob) -> str:
+        """
+        Zip the profile and section files, then upload the archive.
+
+        Files are streamed from storage into a local temporary ZIP in chunks,
+        never loaded whole.
+        """
+        storage = job.storage
+        members = [(job.profile_name, "profile.json")] + [
+            (job.section_name(section.name), f"{section.name}.ndjson") for section in EXPORT_SECTIONS
+        ]
+
+        with tempfile.TemporaryDirectory(prefix="gdpr_export_") as tmp:
+            local = os.path.join(tmp, job.archive_filename)
+            with zipfile.ZipFile(local, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for name, arcname in members:
+                    with zf.open(arcname, "w", force_zip64=True) as dst:
+                        for chunk in storage.read(name):
+                            dst.write(chunk)
+            storage.upload(local, job.archive_name)
+
+        for name, _ in members:
+            storage.delete(name)
+        return job.archive_name
@@ -106,6 +106,9 @@ class Settings(BaseSettings):
     # Data encryption & privacy (Task 14.6)
     encryption_enabled: bool = True
     encryption_key: str = ""  # Optional: Override derived key from secret_key
+    encryption_key_id: str = "k1"  # Key ID stamped on new ciphertexts
+    encryption_retired_keys: str = ""  # Decrypt-only keys after rotation: "k0:<key>,..."
+    blind_index_key: str = ""  # Optional: Pin blind index key (keeps indexes stable across rotations)
     anonymization_enabled: bool = True  # Anonymize data for analytics
     coppa_compliance_enabled: bool = True  # Enable COPPA protections for under-13 users
 
@@ -114,6 +117,15 @@ class Settings(BaseSettings):
     pii_data_retention_days: int = 2555  # 7 years for educational records
     anonymize_after_days: int = 1095  # Anonymize after 3 years (inactive users)
 
+    # Background report and GDPR exports, shared by API and workers
+    # (local path or s3://bucket/prefix?endpoint_override=host:port)
+    export_storage_uri: str = "output/exports"
+    export_retention_hours: int = 72  # Export files are deleted after this
+
+    # Cold-storage archival (local path or s3://bucket/prefix?endpoint_override=host:port)
+    archive_storage_uri: str = "output/archive"
+    archive_compression: str = "zstd"  # Parquet codec: zstd, snappy, gzip or none
+
     # Email settings (for feedback invitations)
     smtp_host: str = ""
     smtp_port: int = 587
@@ -134,6 +146,12 @@ class Settings(BaseSettings):
     db_max_overflow: int = 10
     db_pool_timeout: int = 30
     db_pool_recycle: int = 3600
+    db_worker_pool_size: int = 2  # Per Celery worker process (prefork multiplies by concurrency)
+    db_worker_max_overflow: int = 3
+    db_replica_host: str = ""  # Optional read replica for read-only batch and reporting queries
+    db_replica_port: int = 5432
+    db_pgbouncer_transaction_mode: bool = False  # Connect through PgBouncer in transaction pooling mode
+    query_workload_capture_enabled: bool = False  # Record query shapes for the index advisor
 
     # Monitoring & Error Tracking (Task 19)
     sentry_dsn: str = ""  # Sentry DSN for error tracking
@@ -141,6 +159,9 @@ class Settings(BaseSettings):
     sentry_traces_sample_rate: float = 0.1  # % of transactions to sample (0.0-1.0)
     sentry_profiles_sample_rate: float = 0.1  # % of profiles to sample (0.0-1.0)
     sentry_enabled: bool = True  # Enable/disable Sentry
+    sla_api_sample_rate: float = 0.1  # Fraction of API requests recorded for SLA response-time tracking (0.0-1.0)
+    latency_sketch_accuracy: float = 0.01  # Relative error of per-route latency percentiles
+    latency_metrics_window_minutes: int = 5  # Window of the per-route latency quantiles exported on /metrics
 
     # Alerting Configuration (Task 19.6)
     alert_email: str = ""  # Email address for alerts (defaults to smtp_from_email)
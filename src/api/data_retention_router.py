@@ -5,7 +5,8 @@ Provides admin endpoints for:
 - Scanning for eligible archival/deletion records
 - Archiving old data to cold storage
 - Anonymizing data for analytics
-- Processing GDPR deletion requests
+- Processing GDPR deletion requests (single users inline, many users in
+  a background erasure job)
 - Generating compliance reports
 """
 
@@ -14,6 +15,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from datetime import datetime
+from contextlib import nullcontext
 from pydantic import BaseModel, Field
 
 from .compliance.data_retention import (
@@ -25,7 +27,8 @@ from .compliance.ferpa import FERPAService
 from .compliance.gdpr import GDPRService
 from .auth.rbac import require_admin
 from ..database.database import get_async_session
-from src.database.models import User
+from src.database.erasure import BulkErasure
+from src.database.models import ErasureRequest, User
 
 
 router = APIRouter(prefix="/api/data-retention", tags=["Data Retention & Compliance"])
@@ -36,6 +39,7 @@ router = APIRouter(prefix="/api/data-retention", tags=["Data Retention & Complia
 class RetentionScanRequest(BaseModel):
     """Request to scan for retention actions."""
     dry_run: bool = Field(True, description="If true, only report without taking action")
+    limit: int = Field(1000, ge=1, le=10000, description="Maximum records listed per category")
 
 
 class ArchivalRequest(BaseModel):
@@ -57,6 +61,13 @@ class DeletionRequest(BaseModel):
     deletion_reason: str = Field("GDPR Article 17 - Right to Erasure", description="Reason for deletion")
 
 
+class BulkDeletionRequest(BaseModel):
+    """Request to delete many users' data (GDPR) in a background job."""
+    user_ids: List[int] = Field(..., min_length=1, max_length=100000, description="User IDs to delete")
+    deletion_reason: str = Field("GDPR Article 17 - Right to Erasure", description="Reason for deletion")
+    retain_audit_logs: bool = Field(True, description="Anonymize audit logs instead of deleting them")
+
+
 class ScheduledArchivalRequest(BaseModel):
     """Request to run scheduled archival."""
     perform_actions: bool = Field(False, description="If true, actually perform archival")
@@ -83,12 +94,13 @@ async def scan_for_retention_actions(
     - Records past 7-year FERPA retention period (eligible for archival)
     - Records past 3-year threshold (eligible for anonymization)
 
-    Returns detailed list of eligible records.
+    Returns eligible record totals and up to `limit` records per category.
     """
     try:
         results = await DataRetentionService.scan_for_retention_actions(
             session=session,
-            dry_run=request.dry_run
+            dry_run=request.dry_run,
+            limit=request.limit
         )
         return JSONResponse(
             status_code=200,
@@ -114,9 +126,9 @@ async def archive_data(
     Maintains FERPA compliance by preserving data in archival storage.
 
     The data is:
-    1. Exported to archival storage (audit log metadata)
+    1. Exported to archival storage (compressed Parquet, listed with checksums in a manifest)
     2. Removed from active tables
-    3. Retrievable if needed for compliance/legal reasons
+    3. Retrievable if needed for compliance/legal reasons (ArchiveStore.read)
     """
     try:
         if request.entity_type == "student":
@@ -235,6 +247,70 @@ async def process_deletion_request(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/erasure-requests", status_code=202, dependencies=[Depends(require_admin)])
+async def create_erasure_request(
+    request: BulkDeletionRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Erase many users' data (GDPR Article 17) in a background job.
+
+    **Admin only**. Deletes the same data as /delete for every user, using
+    set-based statements in short, checkpointed transactions. Poll the
+    returned status URL for progress.
+    """
+    try:
+        request_id = await session.run_sync(
+            lambda db: BulkErasure(lambda: nullcontext(db)).create(
+                request.user_ids,
+                request.deletion_reason,
+                retain_audit_logs=request.retain_audit_logs,
+                requested_by=current_user.id,
+            )
+        )
+
+        from src.workers.tasks.compliance import erase_users
+        erase_users.apply_async(kwargs={"request_id": request_id})
+
+        return JSONResponse(
+            status_code=202,
+            content={
+                "success": True,
+                "request_id": request_id,
+                "status_url": f"/api/data-retention/erasure-requests/{request_id}",
+            }
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/erasure-requests/{request_id}", dependencies=[Depends(require_admin)])
+async def get_erasure_request(
+    request_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get the progress of a background erasure job.
+
+    **Admin only**. Returns the current phase and rows affected per phase.
+    """
+    erasure = await session.get(ErasureRequest, request_id)
+    if erasure is None:
+        raise HTTPException(status_code=404, detail="Erasure request not found")
+
+    return {
+        "request_id": erasure.request_id,
+        "users": len(erasure.user_ids),
+        "phase": erasure.phase,
+        "rows_affected": erasure.rows_affected,
+        "started_at": erasure.started_at.isoformat(),
+        "updated_at": erasure.updated_at.isoformat(),
+        "completed_at": erasure.completed_at.isoformat() if erasure.completed_at else None,
+    }
+
+
 @router.get("/report", dependencies=[Depends(require_admin)])
 async def get_retention_report(
     start_date: Optional[str] = Query(None, description="Start date (ISO format)"),
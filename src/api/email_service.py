@@ -6,7 +6,8 @@ and parent notifications for COPPA compliance.
 """
 
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from email.mime.application import MIMEApplication
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import smtplib
@@ -60,7 +61,8 @@ class EmailService:
         to_email: str,
         subject: str,
         html_body: str,
-        text_body: Optional[str] = None
+        text_body: Optional[str] = None,
+        attachments: Optional[List[Dict[str, Any]]] = None
     ) -> bool:
         """
         Send an email via SMTP.
@@ -70,24 +72,38 @@ class EmailService:
             subject: Email subject
             html_body: HTML email body
             text_body: Plain text email body (fallback)
+            attachments: Optional files, dicts with filename, content (bytes)
+                and mimetype
 
         Returns:
             True if sent successfully, False otherwise
         """
         try:
             # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            msg['Subject'] = subject
+            body = MIMEMultipart('alternative')
 
             # Add text and HTML parts
             if text_body:
                 part1 = MIMEText(text_body, 'plain')
-                msg.attach(part1)
+                body.attach(part1)
 
             part2 = MIMEText(html_body, 'html')
-            msg.attach(part2)
+            body.attach(part2)
+
+            if attachments:
+                msg = MIMEMultipart('mixed')
+                msg.attach(body)
+                for attachment in attachments:
+                    subtype = attachment.get("mimetype", "application/octet-stream").split("/")[-1]
+                    part = MIMEApplication(attachment["content"], _subtype=subtype)
+                    part.add_header('Content-Disposition', 'attachment', filename=attachment["filename"])
+                    msg.attach(part)
+            else:
+                msg = body
+
+            msg['From'] = f"{self.from_name} <{self.from_email}>"
+            msg['To'] = to_email
+            msg['Subject'] = subject
 
             # Send email
             with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
@@ -297,6 +313,27 @@ This is an automated message from TutorMax. Please do not reply to this email.
 
         return self._send_email(parent_email, subject, html_body, text_body)
 
+    def send_report(
+        self,
+        to_email: str,
+        subject: str,
+        html_body: str,
+        attachments: Optional[List[Dict[str, Any]]] = None
+    ) -> bool:
+        """
+        Send a scheduled report with its exported files attached.
+
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            html_body: HTML email body
+            attachments: Dicts with filename, content (bytes) and mimetype
+
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        return self._send_email(to_email, subject, html_body, attachments=attachments)
+
 
 def get_email_service_from_settings() -> Optional[EmailService]:
     """
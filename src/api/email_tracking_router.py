@@ -10,16 +10,17 @@ Provides endpoints for:
 
 import logging
 from fastapi import APIRouter, HTTPException, Response, Request, Depends
-from fastapi.responses import RedirectResponse, StreamingResponse
+from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-import io
 
+from src.api.config import settings
 from src.database.database import get_db
-from src.email_automation.email_tracking_service import (
-    EmailTrackingService,
-    EmailEventType
+from src.email_automation.email_event_ingestion import (
+    get_email_event_ingestor,
+    verify_click_url
 )
+from src.email_automation.email_tracking_service import EmailTrackingService
 
 logger = logging.getLogger(__name__)
 
@@ -36,53 +37,56 @@ TRANSPARENT_PIXEL = bytes([
     0x45, 0x4E, 0x44, 0xAE, 0x42, 0x60, 0x82
 ])
 
+FALLBACK_REDIRECT_URL = "https://tutormax.com"
+
+
+def _client_details(request: Request):
+    """User agent and client IP (first X-Forwarded-For hop if behind a proxy)."""
+    user_agent = request.headers.get("user-agent")
+    ip_address = request.headers.get("x-forwarded-for")
+    if ip_address:
+        ip_address = ip_address.split(",")[0].strip()
+    else:
+        ip_address = request.client.host if request.client else None
+    return user_agent, ip_address
+
 
 @router.get("/open/{message_id}.png")
 async def track_email_open(
     message_id: str,
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    c: Optional[str] = None
 ):
     """
     Track email open via 1x1 transparent tracking pixel.
 
+    The open is buffered in memory and written to Redis in batches, so the
+    pixel is returned without waiting on Redis or the database.
+
     Args:
         message_id: Unique email message ID
         request: FastAPI request object for accessing headers
-        db: Database session
+        c: Campaign ID, if the email is part of a campaign
 
     Returns:
         1x1 transparent PNG image
     """
     try:
-        # Get tracking service
-        tracking_service = EmailTrackingService(db_session=db)
-
-        # Extract user agent and IP
-        user_agent = request.headers.get("user-agent")
-        # Get real IP from X-Forwarded-For header if behind proxy
-        ip_address = request.headers.get("x-forwarded-for")
-        if ip_address:
-            ip_address = ip_address.split(",")[0].strip()
-        else:
-            ip_address = request.client.host if request.client else None
-
-        # Record open event
-        tracking_service.record_open(
+        user_agent, ip_address = _client_details(request)
+        get_email_event_ingestor().record_open(
             message_id=message_id,
+            campaign_id=c,
             user_agent=user_agent,
             ip_address=ip_address
         )
 
-        logger.info(f"Recorded email open for message {message_id}")
-
     except Exception as e:
         # Don't fail the pixel - just log the error
         logger.error(f"Error tracking email open for {message_id}: {e}", exc_info=True)
 
     # Always return the tracking pixel
-    return StreamingResponse(
-        io.BytesIO(TRANSPARENT_PIXEL),
+    return Response(
+        content=TRANSPARENT_PIXEL,
         media_type="image/png",
         headers={
             "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -97,54 +101,47 @@ async def track_email_click(
     message_id: str,
     link_id: str,
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    u: Optional[str] = None,
+    s: Optional[str] = None,
+    c: Optional[str] = None
 ):
     """
     Track email link click and redirect to original URL.
 
+    The destination comes from the signed tracking URL itself (see
+    EmailTrackingService.generate_click_tracking_url); links with a missing
+    or invalid signature redirect to the home page and are not counted.
+
     Args:
         message_id: Unique email message ID
         link_id: Unique link identifier
         request: FastAPI request object
-        db: Database session
+        u: Original URL
+        s: Signature of message ID, link ID, campaign ID and original URL
+        c: Campaign ID, if the email is part of a campaign
 
     Returns:
         Redirect to original URL
     """
-    try:
-        # Get tracking service
-        tracking_service = EmailTrackingService(db_session=db)
-
-        # Extract user agent and IP
-        user_agent = request.headers.get("user-agent")
-        ip_address = request.headers.get("x-forwarded-for")
-        if ip_address:
-            ip_address = ip_address.split(",")[0].strip()
-        else:
-            ip_address = request.client.host if request.client else None
+    if not u or not verify_click_url(settings.secret_key, message_id, link_id, u, s, campaign_id=c):
+        logger.warning(f"Rejected unsigned click link for message {message_id}, link {link_id}")
+        return RedirectResponse(url=FALLBACK_REDIRECT_URL, status_code=302)
 
-        # Look up original URL from database or Redis
-        # For now, use a placeholder - in production you'd query:
-        # SELECT original_url FROM email_click_tracking WHERE message_id = ? AND link_id = ?
-        original_url = f"https://tutormax.com/redirect-placeholder/{message_id}/{link_id}"
-
-        # Record click event
-        tracking_service.record_click(
+    try:
+        user_agent, ip_address = _client_details(request)
+        get_email_event_ingestor().record_click(
             message_id=message_id,
-            link_url=original_url,
+            link_id=link_id,
+            link_url=u,
+            campaign_id=c,
             user_agent=user_agent,
             ip_address=ip_address
         )
 
-        logger.info(f"Recorded email click for message {message_id}, link {link_id}")
-
-        # Redirect to original URL
-        return RedirectResponse(url=original_url, status_code=302)
-
     except Exception as e:
         logger.error(f"Error tracking email click for {message_id}/{link_id}: {e}", exc_info=True)
-        # Redirect to home page on error
-        return RedirectResponse(url="https://tutormax.com", status_code=302)
+
+    return RedirectResponse(url=u, status_code=302)
 
 
 @router.post("/unsubscribe")
@@ -188,25 +185,20 @@ async def unsubscribe_email(
 
 
 @router.get("/status/{message_id}")
-async def get_email_status(
-    message_id: str,
-    db: AsyncSession = Depends(get_db)
-):
+async def get_email_status(message_id: str):
     """
     Get tracking status for a specific email message.
 
+    Served from the live Redis counters written by the tracking endpoints.
+
     Args:
         message_id: Unique email message ID
-        db: Database session
 
     Returns:
         Email tracking statistics
     """
     try:
-        tracking_service = EmailTrackingService(db_session=db)
-
-        # Get message stats
-        stats = tracking_service.get_message_stats(message_id)
+        stats = await get_email_event_ingestor().message_counters(message_id)
 
         return {
             "success": True,
@@ -220,25 +212,22 @@ async def get_email_status(
 
 
 @router.get("/campaign/{campaign_id}/stats")
-async def get_campaign_stats(
-    campaign_id: str,
-    db: AsyncSession = Depends(get_db)
-):
+async def get_campaign_stats(campaign_id: str):
     """
-    Get aggregated statistics for an email campaign.
+    Get aggregated engagement statistics for an email campaign.
+
+    Served from the live Redis counters written by the tracking endpoints:
+    total opens/clicks, unique opens/clicks (HyperLogLog estimates) and
+    clicks per link.
 
     Args:
         campaign_id: Email campaign ID
-        db: Database session
 
     Returns:
-        Campaign statistics including delivery, open, and click rates
+        Campaign engagement statistics
     """
     try:
-        tracking_service = EmailTrackingService(db_session=db)
-
-        # Get campaign stats
-        stats = tracking_service.get_campaign_stats(campaign_id)
+        stats = await get_email_event_ingestor().campaign_counters(campaign_id)
 
         return {
             "success": True,
@@ -3,13 +3,20 @@ Export Service for generating PDF and CSV reports.
 
 Provides functionality to export tutor performance data, intervention history,
 and analytics in multiple formats with FERPA compliance.
+
+CSV exports are streamed: rows are read through a server-side cursor in
+batches of EXPORT_BATCH_SIZE and written out chunk by chunk (optionally
+gzip-compressed), so neither the full result set nor the full file is held
+in memory. Large exports can also be written to export storage by a
+background task and downloaded later with resumable (Range) requests.
 """
 
 import csv
 import io
 import logging
+import zlib
 from datetime import datetime, date
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Callable, Iterable, List, Dict, Any, Optional, Sequence
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -17,7 +24,7 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.platypus.flowables import HRFlowable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc, func
+from sqlalchemy import select, and_, desc, func, Select
 from src.database.models import (
     Tutor,
     TutorPerformanceMetric,
@@ -31,6 +38,108 @@ from src.database.models import (
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per server-side cursor round trip
+EXPORT_BATCH_SIZE = 1000
+
+# Rows rendered in the tutor performance PDF table
+PDF_TABLE_ROWS = 50
+
+TUTOR_PERFORMANCE_HEADERS = [
+    'Tutor ID',
+    'Calculation Date',
+    'Performance Tier',
+    'Avg Rating',
+    'First Session Success Rate',
+    'Reschedule Rate',
+    'No-Show Count',
+    'Engagement Score',
+    'Learning Objectives Met %',
+    'Sessions Completed',
+]
+
+INTERVENTION_HEADERS = [
+    'Intervention ID',
+    'Tutor ID',
+    'Type',
+    'Status',
+    'Created Date',
+    'Due Date',
+    'Completed Date',
+    'Assigned To',
+    'Outcome',
+]
+
+
+def _format_tutor_performance_row(row: Sequence[Any]) -> List[Any]:
+    """Format a tutor performance row (FERPA compliant - no PII)."""
+    (tutor_id, calculation_date, performance_tier, avg_rating, first_session_success_rate,
+     reschedule_rate, no_show_count, engagement_score, learning_objectives_met_pct,
+     sessions_completed) = row
+    return [
+        tutor_id,
+        calculation_date.strftime('%Y-%m-%d'),
+        performance_tier.value if performance_tier else 'N/A',
+        f"{avg_rating:.2f}" if avg_rating else 'N/A',
+        f"{first_session_success_rate:.1f}%" if first_session_success_rate else 'N/A',
+        f"{reschedule_rate:.1f}%" if reschedule_rate else 'N/A',
+        no_show_count or 0,
+        f"{engagement_score:.2f}" if engagement_score else 'N/A',
+        f"{learning_objectives_met_pct:.1f}%" if learning_objectives_met_pct else 'N/A',
+        sessions_completed or 0,
+    ]
+
+
+def _format_intervention_row(row: Sequence[Any]) -> List[Any]:
+    """Format an intervention row."""
+    (intervention_id, tutor_id, intervention_type, status, created_at,
+     due_date, completed_date, assigned_to, outcome) = row
+    return [
+        intervention_id,
+        tutor_id,
+        intervention_type.value,
+        status.value,
+        created_at.strftime('%Y-%m-%d %H:%M'),
+        due_date.strftime('%Y-%m-%d') if due_date else 'N/A',
+        completed_date.strftime('%Y-%m-%d %H:%M') if completed_date else 'N/A',
+        assigned_to or 'Automated',
+        outcome.value if outcome else 'N/A',
+    ]
+
+
+def _csv_chunk(rows: Iterable[Sequence[Any]]) -> bytes:
+    """Encode a batch of rows as CSV bytes."""
+    output = io.StringIO()
+    csv.writer(output).writerows(rows)
+    return output.getvalue().encode('utf-8')
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Gzip-compress a byte stream chunk by chunk.
+
+    Args:
+        chunks: Uncompressed byte chunks
+
+    Yields:
+        Gzip-compressed byte chunks
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+# Background export files, relative to the export storage root
+REPORT_EXPORT_PREFIX = "reports"
+
+
+def export_file_name(export_id: str, compress: bool = False) -> str:
+    """Storage name of a background export file (see export_storage)."""
+    suffix = '.csv.gz' if compress else '.csv'
+    return f"{REPORT_EXPORT_PREFIX}/{export_id}{suffix}"
+
 
 class ExportService:
     """Service for generating data exports in various formats."""
@@ -38,79 +147,187 @@ class ExportService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def export_tutor_performance_csv(
+    @staticmethod
+    def _tutor_performance_conditions(
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        tutor_ids: Optional[List[str]],
+    ) -> list:
+        conditions = [TutorPerformanceMetric.window == MetricWindow.THIRTY_DAY]
+
+        if start_date:
+            conditions.append(TutorPerformanceMetric.calculation_date >= start_date)
+        if end_date:
+            conditions.append(TutorPerformanceMetric.calculation_date <= end_date)
+        if tutor_ids:
+            conditions.append(TutorPerformanceMetric.tutor_id.in_(tutor_ids))
+
+        return conditions
+
+    def _tutor_performance_query(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         tutor_ids: Optional[List[str]] = None,
-    ) -> io.StringIO:
+    ) -> Select:
+        """Tutor performance export query (exported columns only, no ORM objects)."""
+        conditions = self._tutor_performance_conditions(start_date, end_date, tutor_ids)
+
+        return select(
+            TutorPerformanceMetric.tutor_id,
+            TutorPerformanceMetric.calculation_date,
+            TutorPerformanceMetric.performance_tier,
+            TutorPerformanceMetric.avg_rating,
+            TutorPerformanceMetric.first_session_success_rate,
+            TutorPerformanceMetric.reschedule_rate,
+            TutorPerformanceMetric.no_show_count,
+            TutorPerformanceMetric.engagement_score,
+            TutorPerformanceMetric.learning_objectives_met_pct,
+            TutorPerformanceMetric.sessions_completed,
+        ).join(
+            Tutor, TutorPerformanceMetric.tutor_id == Tutor.tutor_id
+        ).where(and_(*conditions)).order_by(
+            desc(TutorPerformanceMetric.calculation_date)
+        )
+
+    def _interventions_query(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        status_filter: Optional[InterventionStatus] = None,
+    ) -> Select:
+        """Intervention export query (exported columns only, no ORM objects)."""
+        query = select(
+            Intervention.intervention_id,
+            Intervention.tutor_id,
+            Intervention.intervention_type,
+            Intervention.status,
+            Intervention.created_at,
+            Intervention.due_date,
+            Intervention.completed_date,
+            Intervention.assigned_to,
+            Intervention.outcome,
+        )
+
+        conditions = []
+        if start_date:
+            conditions.append(Intervention.created_at >= start_date)
+        if end_date:
+            conditions.append(Intervention.created_at <= end_date)
+        if status_filter:
+            conditions.append(Intervention.status == status_filter)
+
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        return query.order_by(desc(Intervention.created_at))
+
+    async def _stream_csv(
+        self,
+        query: Select,
+        headers: List[str],
+        format_row: Callable[[Sequence[Any]], List[Any]],
+        compress: bool = False,
+    ) -> AsyncIterator[bytes]:
         """
-        Export tutor performance data to CSV format.
+        Stream query results as CSV through a server-side cursor.
+
+        Args:
+            query: Column query to export
+            headers: CSV header row
+            format_row: Converts a result row to CSV values
+            compress: Gzip-compress the output
+
+        Yields:
+            CSV byte chunks (one per batch of EXPORT_BATCH_SIZE rows)
+        """
+        async def chunks() -> AsyncIterator[bytes]:
+            yield _csv_chunk([headers])
+            result = await self.session.stream(
+                query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            async for partition in result.partitions():
+                yield _csv_chunk(format_row(row) for row in partition)
+
+        stream = gzip_stream(chunks()) if compress else chunks()
+        async for chunk in stream:
+            yield chunk
+
+    def stream_tutor_performance_csv(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tutor_ids: Optional[List[str]] = None,
+        compress: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream tutor performance data as CSV.
 
         Args:
             start_date: Start date for filtering
             end_date: End date for filtering
             tutor_ids: Optional list of specific tutor IDs
+            compress: Gzip-compress the output
 
         Returns:
-            StringIO buffer containing CSV data
+            Async iterator of CSV byte chunks
         """
-        # Build query
-        query = select(TutorPerformanceMetric).join(
-            Tutor, TutorPerformanceMetric.tutor_id == Tutor.tutor_id
+        return self._stream_csv(
+            self._tutor_performance_query(start_date, end_date, tutor_ids),
+            TUTOR_PERFORMANCE_HEADERS,
+            _format_tutor_performance_row,
+            compress=compress,
         )
 
-        conditions = [TutorPerformanceMetric.window == MetricWindow.THIRTY_DAY]
+    def stream_interventions_csv(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        status_filter: Optional[InterventionStatus] = None,
+        compress: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream intervention data as CSV.
 
-        if start_date:
-            conditions.append(TutorPerformanceMetric.calculation_date >= start_date)
-        if end_date:
-            conditions.append(TutorPerformanceMetric.calculation_date <= end_date)
-        if tutor_ids:
-            conditions.append(TutorPerformanceMetric.tutor_id.in_(tutor_ids))
+        Args:
+            start_date: Start date for filtering
+            end_date: End date for filtering
+            status_filter: Filter by intervention status
+            compress: Gzip-compress the output
 
-        query = query.where(and_(*conditions)).order_by(
-            desc(TutorPerformanceMetric.calculation_date)
+        Returns:
+            Async iterator of CSV byte chunks
+        """
+        return self._stream_csv(
+            self._interventions_query(start_date, end_date, status_filter),
+            INTERVENTION_HEADERS,
+            _format_intervention_row,
+            compress=compress,
         )
 
-        result = await self.session.execute(query)
-        metrics = result.scalars().all()
+    async def export_tutor_performance_csv(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tutor_ids: Optional[List[str]] = None,
+    ) -> io.StringIO:
+        """
+        Export tutor performance data to CSV format.
 
-        # Create CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
+        Used where the whole file is needed (e.g. email attachments); API
+        downloads should use stream_tutor_performance_csv.
 
-        # Write headers (FERPA compliant - no PII)
-        writer.writerow([
-            'Tutor ID',
-            'Calculation Date',
-            'Performance Tier',
-            'Avg Rating',
-            'First Session Success Rate',
-            'Reschedule Rate',
-            'No-Show Rate',
-            'Engagement Score',
-            'Learning Objectives Met %',
-            'Sessions Completed',
-            'Total Session Hours',
-        ])
-
-        # Write data
-        for metric in metrics:
-            writer.writerow([
-                metric.tutor_id,
-                metric.calculation_date.strftime('%Y-%m-%d'),
-                metric.performance_tier.value if metric.performance_tier else 'N/A',
-                f"{metric.avg_rating:.2f}" if metric.avg_rating else 'N/A',
-                f"{metric.first_session_success_rate:.1f}%" if metric.first_session_success_rate else 'N/A',
-                f"{metric.reschedule_rate:.1f}%" if metric.reschedule_rate else 'N/A',
-                f"{metric.no_show_rate:.1f}%" if metric.no_show_rate else 'N/A',
-                f"{metric.engagement_score:.2f}" if metric.engagement_score else 'N/A',
-                f"{metric.learning_objectives_met_pct:.1f}%" if metric.learning_objectives_met_pct else 'N/A',
-                metric.sessions_completed or 0,
-                f"{metric.total_session_hours:.1f}" if metric.total_session_hours else '0.0',
-            ])
+        Args:
+            start_date: Start date for filtering
+            end_date: End date for filtering
+            tutor_ids: Optional list of specific tutor IDs
 
+        Returns:
+            StringIO buffer containing CSV data
+        """
+        output = io.StringIO()
+        async for chunk in self.stream_tutor_performance_csv(start_date, end_date, tutor_ids):
+            output.write(chunk.decode('utf-8'))
         output.seek(0)
         return output
 
@@ -123,6 +340,9 @@ class ExportService:
         """
         Export intervention data to CSV format.
 
+        Used where the whole file is needed (e.g. email attachments); API
+        downloads should use stream_interventions_csv.
+
         Args:
             start_date: Start date for filtering
             end_date: End date for filtering
@@ -131,57 +351,9 @@ class ExportService:
         Returns:
             StringIO buffer containing CSV data
         """
-        query = select(Intervention)
-
-        conditions = []
-        if start_date:
-            conditions.append(Intervention.created_date >= start_date)
-        if end_date:
-            conditions.append(Intervention.created_date <= end_date)
-        if status_filter:
-            conditions.append(Intervention.status == status_filter)
-
-        if conditions:
-            query = query.where(and_(*conditions))
-
-        query = query.order_by(desc(Intervention.created_date))
-
-        result = await self.session.execute(query)
-        interventions = result.scalars().all()
-
-        # Create CSV
         output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write headers
-        writer.writerow([
-            'Intervention ID',
-            'Tutor ID',
-            'Type',
-            'Priority',
-            'Status',
-            'Created Date',
-            'Due Date',
-            'Completed Date',
-            'Assigned To',
-            'Outcome',
-        ])
-
-        # Write data
-        for intervention in interventions:
-            writer.writerow([
-                intervention.intervention_id,
-                intervention.tutor_id,
-                intervention.intervention_type.value,
-                intervention.priority.value if intervention.priority else 'N/A',
-                intervention.status.value,
-                intervention.created_date.strftime('%Y-%m-%d %H:%M'),
-                intervention.due_date.strftime('%Y-%m-%d') if intervention.due_date else 'N/A',
-                intervention.completed_date.strftime('%Y-%m-%d %H:%M') if intervention.completed_date else 'N/A',
-                intervention.assigned_to or 'Automated',
-                intervention.outcome or 'N/A',
-            ])
-
+        async for chunk in self.stream_interventions_csv(start_date, end_date, status_filter):
+            output.write(chunk.decode('utf-8'))
         output.seek(0)
         return output
 
@@ -194,6 +366,9 @@ class ExportService:
         """
         Export tutor performance data to PDF format.
 
+        Only the first PDF_TABLE_ROWS records are rendered, so only those
+        rows are fetched; record and tutor totals are counted in SQL.
+
         Args:
             start_date: Start date for filtering
             end_date: End date for filtering
@@ -203,25 +378,21 @@ class ExportService:
             BytesIO buffer containing PDF data
         """
         # Get data
-        query = select(TutorPerformanceMetric).join(
-            Tutor, TutorPerformanceMetric.tutor_id == Tutor.tutor_id
+        conditions = self._tutor_performance_conditions(start_date, end_date, tutor_ids)
+        totals_result = await self.session.execute(
+            select(
+                func.count(),
+                func.count(func.distinct(TutorPerformanceMetric.tutor_id)),
+            ).select_from(TutorPerformanceMetric).join(
+                Tutor, TutorPerformanceMetric.tutor_id == Tutor.tutor_id
+            ).where(and_(*conditions))
         )
+        total_records, total_tutors = totals_result.one()
 
-        conditions = [TutorPerformanceMetric.window == MetricWindow.THIRTY_DAY]
-
-        if start_date:
-            conditions.append(TutorPerformanceMetric.calculation_date >= start_date)
-        if end_date:
-            conditions.append(TutorPerformanceMetric.calculation_date <= end_date)
-        if tutor_ids:
-            conditions.append(TutorPerformanceMetric.tutor_id.in_(tutor_ids))
-
-        query = query.where(and_(*conditions)).order_by(
-            desc(TutorPerformanceMetric.calculation_date)
+        result = await self.session.execute(
+            self._tutor_performance_query(start_date, end_date, tutor_ids).limit(PDF_TABLE_ROWS)
         )
-
-        result = await self.session.execute(query)
-        metrics = result.scalars().all()
+        rows = result.all()
 
         # Create PDF
         buffer = io.BytesIO()
@@ -254,8 +425,8 @@ class ExportService:
         meta_data = [
             ['Report Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
             ['Date Range:', date_range],
-            ['Total Tutors:', str(len(set(m.tutor_id for m in metrics)))],
-            ['Total Records:', str(len(metrics))],
+            ['Total Tutors:', str(total_tutors)],
+            ['Total Records:', str(total_records)],
         ]
         meta_table = Table(meta_data, colWidths=[2*inch, 4*inch])
         meta_table.setStyle(TableStyle([
@@ -274,7 +445,7 @@ class ExportService:
         heading = Paragraph("Performance Metrics", heading_style)
         elements.append(heading)
 
-        # Table data (limited to first 50 records for PDF)
+        # Table data (limited to first PDF_TABLE_ROWS records for PDF)
         table_data = [[
             'Tutor ID',
             'Date',
@@ -284,7 +455,7 @@ class ExportService:
             'Engagement',
         ]]
 
-        for metric in metrics[:50]:  # Limit to 50 for readability
+        for metric in rows:
             table_data.append([
                 metric.tutor_id[:8] + '...' if len(metric.tutor_id) > 8 else metric.tutor_id,
                 metric.calculation_date.strftime('%Y-%m-%d'),
@@ -312,9 +483,9 @@ class ExportService:
         ]))
         elements.append(data_table)
 
-        if len(metrics) > 50:
+        if total_records > PDF_TABLE_ROWS:
             note = Paragraph(
-                f"<i>Note: Showing first 50 of {len(metrics)} records. Download CSV for complete data.</i>",
+                f"<i>Note: Showing first {PDF_TABLE_ROWS} of {total_records} records. Download CSV for complete data.</i>",
                 styles['Normal']
             )
             elements.append(Spacer(1, 0.2*inch))
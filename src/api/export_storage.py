@@ -0,0 +1,191 @@
+"""
+Export Storage - Background export files shared by the API and workers.
+
+Report and GDPR exports are written by Celery workers and downloaded through
+the API, which run as separate services without a shared disk. Files are
+therefore kept under settings.export_storage_uri, which uses the same
+pyarrow filesystem URIs as cold-storage archival: a local path (single host
+and development), or s3://bucket/prefix?endpoint_override=host:port for
+S3-compatible object storage.
+
+Files are deleted settings.export_retention_hours after they were written
+by the scheduled_reports.cleanup_expired_exports task.
+"""
+
+import logging
+import posixpath
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterator, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bytes read or copied per chunk
+STORAGE_CHUNK_SIZE = 1024 * 1024
+
+
+class ExportStorage:
+    """Export files under one storage root (local path or object store URI)."""
+
+    def __init__(self, storage_uri: Optional[str] = None):
+        """
+        Initialize storage.
+
+        Args:
+            storage_uri: Local path or filesystem URI (defaults to
+                settings.export_storage_uri)
+        """
+        # pyarrow is only needed once exports are actually stored
+        from ..database.archival import resolve_storage
+
+        self.fs, self.root = resolve_storage(storage_uri or settings.export_storage_uri)
+
+    def path(self, name: str) -> str:
+        """Full path of a file, given its name relative to the storage root."""
+        return posixpath.join(self.root, name)
+
+    def size(self, name: str) -> Optional[int]:
+        """Size of a stored file in bytes, or None if it does not exist."""
+        import pyarrow.fs as pafs
+
+        info = self.fs.get_file_info(self.path(name))
+        if info.type != pafs.FileType.File:
+            return None
+        return info.size
+
+    def exists(self, name: str) -> bool:
+        return self.size(name) is not None
+
+    def _publish(self, partial: str, path: str) -> None:
+        try:
+            self.fs.move(partial, path)
+        except BaseException:
+            self.fs.delete_file(partial)
+            raise
+
+    async def write(self, chunks: AsyncIterator[bytes], name: str) -> int:
+        """
+        Write an export file from async byte chunks.
+
+        Chunks are written to a ``.part`` file which is renamed once complete,
+        so a finished export is never observed half-written.
+
+        Args:
+            chunks: Export byte chunks
+            name: Destination file name (relative to the storage root)
+
+        Returns:
+            Number of bytes written
+        """
+        path = self.path(name)
+        partial = path + ".part"
+        self.fs.create_dir(posixpath.dirname(path), recursive=True)
+
+        size = 0
+        try:
+            with self.fs.open_output_stream(partial) as f:
+                async for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            self.fs.delete_file(partial)
+            raise
+
+        self._publish(partial, path)
+        return size
+
+    def upload(self, local_path: str, name: str) -> int:
+        """
+        Copy a local file into storage (atomically, like write()).
+
+        Returns:
+            Number of bytes written
+        """
+        path = self.path(name)
+        partial = path + ".part"
+        self.fs.create_dir(posixpath.dirname(path), recursive=True)
+
+        size = 0
+        try:
+            with open(local_path, "rb") as src, self.fs.open_output_stream(partial) as dst:
+                while True:
+                    chunk = src.read(STORAGE_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            self.fs.delete_file(partial)
+            raise
+
+        self._publish(partial, path)
+        return size
+
+    def read(
+        self,
+        name: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = STORAGE_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """
+        Read a stored file (or a byte range of it) in chunks.
+
+        Args:
+            name: File name (relative to the storage root)
+            start: First byte to read
+            end: Last byte to read (inclusive), None for the end of the file
+            chunk_size: Bytes per chunk
+
+        Yields:
+            File content chunks
+        """
+        with self.fs.open_input_file(self.path(name)) as f:
+            f.seek(start)
+            remaining = (end - start + 1) if end is not None else None
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, name: str) -> None:
+        """Delete a stored file (no-op if it does not exist)."""
+        if self.exists(name):
+            self.fs.delete_file(self.path(name))
+
+    def delete_expired(self, max_age: timedelta, now: Optional[datetime] = None) -> int:
+        """
+        Delete files written longer than max_age ago, and emptied directories.
+
+        Args:
+            max_age: Retention period
+            now: Current time (defaults to now, UTC)
+
+        Returns:
+            Number of files deleted
+        """
+        import pyarrow.fs as pafs
+
+        cutoff = (now or datetime.now(timezone.utc)) - max_age
+        entries = self.fs.get_file_info(pafs.FileSelector(self.root, recursive=True, allow_not_found=True))
+
+        deleted = 0
+        for info in entries:
+            if info.type == pafs.FileType.File and info.mtime is not None and info.mtime < cutoff:
+                self.fs.delete_file(info.path)
+                deleted += 1
+
+        # Object stores have no directories; locally, remove the ones left empty
+        for info in sorted(entries, key=lambda i: i.path, reverse=True):
+            if info.type == pafs.FileType.Directory and not self.fs.get_file_info(
+                pafs.FileSelector(info.path)
+            ):
+                self.fs.delete_dir(info.path)
+
+        if deleted:
+            logger.info(f"Deleted {deleted} expired export files from {self.root}")
+        return deleted
@@ -11,11 +11,13 @@ from enum import Enum
 
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import select, func, desc
 from pydantic import BaseModel
 
 from .config import settings
+from .cache_service import CacheService, get_cache_service
 from ..database.database import get_async_session
+from ..evaluation.cohort_percentiles import CohortPercentileIndex, cohort_start_for
 from src.database.models import (
     Tutor,
     TutorPerformanceMetric,
@@ -356,16 +358,19 @@ async def get_tutor_badges(
 async def get_peer_comparison(
     tutor_id: str,
     db: AsyncSession = Depends(get_async_session),
+    cache: CacheService = Depends(get_cache_service),
 ):
     """
     Get anonymized peer comparison data for a tutor.
 
     Returns percentile rankings compared to other tutors with similar
-    experience levels (same onboarding quarter).
+    experience levels (same onboarding quarter). Cohort rankings come from
+    precomputed percentile sketches rather than the raw metrics table.
 
     Args:
         tutor_id: The tutor's unique identifier
         db: Database session
+        cache: Cache service holding cohort percentile sketches
 
     Returns:
         Percentile rankings and tier distribution
@@ -401,25 +406,12 @@ async def get_peer_comparison(
                 detail="No performance metrics available for comparison"
             )
 
-        # Get comparison cohort (tutors onboarded in same quarter)
-        cohort_start = tutor.onboarding_date.replace(day=1)
-        cohort_end = cohort_start + timedelta(days=90)
+        # Get comparison cohort sketch (tutors onboarded in same quarter),
+        # precomputed by the daily aggregation and built on demand if missing
+        index = CohortPercentileIndex(cache)
+        cohort = await index.get_or_build(db, cohort_start_for(tutor.onboarding_date))
 
-        # Get all metrics for cohort
-        cohort_metrics_result = await db.execute(
-            select(TutorPerformanceMetric)
-            .join(Tutor, TutorPerformanceMetric.tutor_id == Tutor.tutor_id)
-            .where(
-                and_(
-                    Tutor.onboarding_date >= cohort_start,
-                    Tutor.onboarding_date < cohort_end,
-                    TutorPerformanceMetric.window == MetricWindow.THIRTY_DAY
-                )
-            )
-        )
-        cohort_metrics = cohort_metrics_result.scalars().all()
-
-        if len(cohort_metrics) < 5:
+        if cohort.size < 5:
             # Not enough data for meaningful comparison
             return PeerComparisonResponse(
                 success=True,
@@ -438,23 +430,10 @@ async def get_peer_comparison(
                 timestamp=datetime.now()
             )
 
-        # Calculate percentiles
-        def calculate_percentile(value: float, all_values: List[float]) -> int:
-            """Calculate percentile rank (0-100)."""
-            if not all_values or value is None:
-                return 50
-            sorted_values = sorted(all_values)
-            rank = sum(1 for v in sorted_values if v < value)
-            return int((rank / len(sorted_values)) * 100)
-
-        # Extract metric values
-        all_ratings = [m.avg_rating for m in cohort_metrics if m.avg_rating]
-        all_sessions = [m.sessions_completed for m in cohort_metrics if m.sessions_completed]
-        all_engagement = [m.engagement_score for m in cohort_metrics if m.engagement_score]
-
-        avg_rating_percentile = calculate_percentile(tutor_metric.avg_rating, all_ratings)
-        sessions_percentile = calculate_percentile(tutor_metric.sessions_completed, all_sessions)
-        engagement_percentile = calculate_percentile(tutor_metric.engagement_score, all_engagement)
+        # Calculate percentiles (binary search over sorted cohort values)
+        avg_rating_percentile = cohort.percentile_rank("avg_rating", tutor_metric.avg_rating)
+        sessions_percentile = cohort.percentile_rank("sessions_completed", tutor_metric.sessions_completed)
+        engagement_percentile = cohort.percentile_rank("engagement_score", tutor_metric.engagement_score)
 
         # Overall percentile (weighted average)
         overall_percentile = int(
@@ -463,22 +442,7 @@ async def get_peer_comparison(
             (engagement_percentile * 0.3)
         )
 
-        # Calculate tier distribution
-        tier_counts = {}
-        for metric in cohort_metrics:
-            tier = metric.performance_tier.value if metric.performance_tier else "Developing"
-            tier_counts[tier] = tier_counts.get(tier, 0) + 1
-
-        total = len(cohort_metrics)
-        tier_distribution = {
-            tier: int((count / total) * 100)
-            for tier, count in tier_counts.items()
-        }
-
-        # Ensure all tiers are represented
-        for tier in ["Exemplary", "Strong", "Developing", "Needs Attention", "At Risk"]:
-            if tier not in tier_distribution:
-                tier_distribution[tier] = 0
+        tier_distribution = cohort.tier_distribution()
 
         return PeerComparisonResponse(
             success=True,
@@ -7,6 +7,10 @@ Endpoints:
 - GET /gdpr/export-my-data - Export all user data (Right to Access)
 - POST /gdpr/delete-my-data - Request account deletion (Right to Erasure)
 - GET /gdpr/download-data-report - Download portable data (Right to Portability)
+- POST /gdpr/exports - Start a background ZIP export of all user data
+- GET /gdpr/exports/{export_id} - Get background export progress
+- POST /gdpr/exports/{export_id}/resume - Resume an interrupted export
+- GET /gdpr/exports/{export_id}/download - Download a finished export
 - PUT /gdpr/rectify-data - Correct user data (Right to Rectification)
 - POST /gdpr/consent - Manage consent for data processing
 - GET /gdpr/consent - Get consent status
@@ -19,11 +23,14 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from io import BytesIO
+import uuid
 
 from ..database.database import get_async_session
 from src.database.models import User
 from .auth.fastapi_users_config import current_active_user
 from .compliance import gdpr_service, consent_manager, data_breach_notifier
+from .compliance.gdpr_export import ExportJob
+from .config import settings
 from .audit_service import AuditService
 
 
@@ -285,6 +292,177 @@ async def download_data_report(
         )
 
 
+def _start_export(job: ExportJob) -> Dict[str, Any]:
+    """Queue the export task for a job."""
+    from src.workers.tasks.scheduled_reports import generate_gdpr_export
+
+    generate_gdpr_export.apply_async(kwargs={"export_id": job.export_id}, task_id=uuid.uuid4().hex)
+    base_url = f"{settings.api_prefix}/gdpr/exports/{job.export_id}"
+    return {
+        "success": True,
+        "export_id": job.export_id,
+        "status_url": base_url,
+        "download_url": f"{base_url}/download",
+    }
+
+
+def _get_export_job(export_id: str, user: User) -> ExportJob:
+    """Load an export job owned by the user, validating the export ID."""
+    try:
+        job = ExportJob(export_id)
+    except ValueError:
+        job = None
+    if job is None or job.manifest is None or job.manifest["user_id"] != user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found")
+    return job
+
+
+@router.post(
+    "/exports",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start a full data export",
+    description="Export all personal data as a ZIP archive in the background (GDPR Articles 15 and 20)"
+)
+async def create_data_export(
+    current_user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Start a background export of all personal data for the authenticated user.
+
+    The archive holds profile.json plus one NDJSON file per data category and
+    is built by a worker without loading the data into memory. Poll the status
+    URL for progress, then fetch the download URL.
+
+    Args:
+        current_user: Authenticated user
+        session: Database session
+
+    Returns:
+        Export ID with status and download URLs
+    """
+    job = ExportJob(uuid.uuid4().hex)
+    job.create(current_user.id)
+
+    await AuditService.log_data_access(
+        session=session,
+        user_id=current_user.id,
+        resource_type="user",
+        resource_id=str(current_user.id),
+        action="gdpr_data_export",
+        ip_address=None,
+        user_agent=None,
+        request_path="/gdpr/exports",
+        metadata={"export_id": job.export_id, "format": "zip"}
+    )
+
+    return _start_export(job)
+
+
+@router.get(
+    "/exports/{export_id}",
+    summary="Get data export progress",
+)
+async def get_data_export(
+    export_id: str,
+    current_user: User = Depends(current_active_user),
+):
+    """
+    Get the progress of a background data export.
+
+    Args:
+        export_id: Export ID
+        current_user: Authenticated user
+
+    Returns:
+        Export status, sections done and rows exported per section
+    """
+    job = _get_export_job(export_id, current_user)
+    progress = job.progress()
+    if progress["status"] == "ready":
+        progress["download_url"] = f"{settings.api_prefix}/gdpr/exports/{export_id}/download"
+    return progress
+
+
+@router.post(
+    "/exports/{export_id}/resume",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Resume a data export",
+)
+async def resume_data_export(
+    export_id: str,
+    current_user: User = Depends(current_active_user),
+):
+    """
+    Resume a failed or interrupted data export.
+
+    Sections completed by the earlier attempt are kept; only the rest are
+    exported again.
+
+    Args:
+        export_id: Export ID
+        current_user: Authenticated user
+
+    Returns:
+        Export ID with status and download URLs
+    """
+    job = _get_export_job(export_id, current_user)
+    if job.manifest["status"] == "ready":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Export is already complete"
+        )
+    if job.manifest["status"] in ("pending", "running") and not job.is_stalled():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Export is still in progress"
+        )
+    return _start_export(job)
+
+
+# Redis and export storage calls block, so the download runs in the threadpool
+@router.get(
+    "/exports/{export_id}/download",
+    summary="Download a data export",
+)
+def download_data_export(
+    export_id: str,
+    current_user: User = Depends(current_active_user),
+):
+    """
+    Download a finished data export archive.
+
+    Archives are deleted settings.export_retention_hours after completion.
+
+    Args:
+        export_id: Export ID
+        current_user: Authenticated user
+
+    Returns:
+        ZIP archive
+    """
+    job = _get_export_job(export_id, current_user)
+    if job.manifest["status"] != "ready":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Export is not ready"
+        )
+    size = job.storage.size(job.archive_name)
+    if size is None:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Export has expired"
+        )
+    return StreamingResponse(
+        job.storage.read(job.archive_name),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename={job.archive_filename}",
+            "Content-Length": str(size),
+        },
+    )
+
+
 @router.post(
     "/delete-my-data",
     status_code=status.HTTP_202_ACCEPTED,
@@ -16,6 +16,7 @@ from sqlalchemy import select, func, and_, or_, desc, case
 from pydantic import BaseModel, Field
 
 from .config import settings
+from .cache_service import CacheService, get_cache_service
 from ..database.database import get_async_session
 from src.database.models import (
     Intervention,
@@ -418,6 +419,7 @@ async def assign_intervention(
     intervention_id: str,
     request: InterventionAssignRequest,
     db: AsyncSession = Depends(get_async_session),
+    cache: CacheService = Depends(get_cache_service),
 ):
     """
     Assign an intervention to a specific user (manager/coach).
@@ -446,6 +448,7 @@ async def assign_intervention(
 
         await db.commit()
         await db.refresh(intervention)
+        await cache.invalidate_tutor_profile(intervention.tutor_id)
 
         # Get tutor name
         tutor_result = await db.execute(
@@ -492,6 +495,7 @@ async def update_intervention_status(
     intervention_id: str,
     request: InterventionStatusUpdate,
     db: AsyncSession = Depends(get_async_session),
+    cache: CacheService = Depends(get_cache_service),
 ):
     """
     Update the status of an intervention.
@@ -529,6 +533,7 @@ async def update_intervention_status(
 
         await db.commit()
         await db.refresh(intervention)
+        await cache.invalidate_tutor_profile(intervention.tutor_id)
 
         # Get tutor name
         tutor_result = await db.execute(
@@ -575,6 +580,7 @@ async def record_intervention_outcome(
     intervention_id: str,
     request: InterventionOutcomeRequest,
     db: AsyncSession = Depends(get_async_session),
+    cache: CacheService = Depends(get_cache_service),
 ):
     """
     Record the outcome of a completed intervention.
@@ -616,6 +622,7 @@ async def record_intervention_outcome(
 
         await db.commit()
         await db.refresh(intervention)
+        await cache.invalidate_tutor_profile(intervention.tutor_id)
 
         # Get tutor name
         tutor_result = await db.execute(
@@ -0,0 +1,154 @@
+"""
+Mergeable latency sketch.
+
+LatencySketch is a log-bucketed quantile sketch (the DDSketch bucketing
+scheme): a value v lands in bucket ceil(log_gamma(v)) with
+gamma = (1 + a) / (1 - a), so every quantile it reports is within a relative
+error a of the true value (1% by default). Adding a sample is O(1), and two
+sketches merge by adding their bucket counts, so sketches from different
+workers and different time slots combine exactly.
+"""
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class LatencySketch:
+    """
+    Mergeable quantile sketch with bounded relative error.
+
+    Values at or below min_value are counted in a single zero bucket.
+    """
+
+    __slots__ = ("relative_accuracy", "min_value", "_gamma", "_log_gamma",
+                 "bins", "zero_count", "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of reported quantiles
+            min_value: Values at or below this are treated as zero
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def bucket(self, value: float) -> int:
+        """Bucket index for a value above min_value."""
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value (count times)."""
+        if value <= self.min_value:
+            self.zero_count += count
+        else:
+            key = self.bucket(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.count += count
+        self.sum += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_bucket(self, key: Optional[int], count: int) -> None:
+        """Add count samples to a bucket (None for the zero bucket)."""
+        if key is None:
+            self.zero_count += count
+            value = 0.0
+        else:
+            self.bins[key] = self.bins.get(key, 0) + count
+            value = self.bucket_value(key)
+        self.count += count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def bucket_value(self, key: int) -> float:
+        """Representative value of a bucket (relative error <= accuracy)."""
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        """
+        Add another sketch's samples to this one.
+
+        Raises:
+            ValueError: If the sketches use different accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Approximate q-quantile (0 <= q <= 1), or None if the sketch is empty.
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return min(max(self.bucket_value(key), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def summary(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """Count, mean, max and quantiles in milliseconds, rounded for display."""
+        result: Dict[str, Any] = {"count": self.count}
+        if not self.count:
+            return result
+        result["mean_ms"] = round(self.mean, 2)
+        result["max_ms"] = round(self.max, 2)
+        for q in quantiles:
+            result[f"p{q * 100:g}_ms"] = round(self.quantile(q), 2)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (see from_dict)."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "min_value": self.min_value,
+            "bins": {str(key): count for key, count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencySketch":
+        sketch = cls(data["relative_accuracy"], data["min_value"])
+        sketch.bins = {int(key): count for key, count in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min, sketch.max = data["min"], data["max"]
+        return sketch
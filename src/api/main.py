@@ -10,7 +10,7 @@ from datetime import datetime
 from typing import List
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
@@ -23,10 +23,12 @@ from .models import (
     IngestionResponse,
     BatchIngestionResponse,
 )
-from .redis_service import redis_service, get_redis_service, RedisService
+from .redis_service import redis_service, get_redis_service, require_queue_capacity, RedisService
+from .bulk_ingestion import NDJSON_MEDIA_TYPE, queue_models, queue_ndjson
 from .cache_service import cache_service, get_cache_service
-from .performance_middleware import PerformanceMiddleware, RateLimitMiddleware, configure_compression
-from .metrics_exporter import setup_metrics
+from .performance_middleware import PerformanceMiddleware, SlidingWindowRateLimiter, configure_compression
+from .metrics_exporter import setup_metrics, prometheus_observer
+from .route_latency import route_latency_recorder
 from .prediction_router import router as prediction_router
 from .websocket_router import router as websocket_router
 from .tutor_portal_router import router as tutor_portal_router
@@ -35,10 +37,11 @@ from .worker_monitoring_router import router as worker_monitoring_router
 from .feedback_auth_router import router as feedback_auth_router
 from .intervention_router import router as intervention_router
 from .audit_router import router as audit_router
-from .audit_middleware import AuditLoggingMiddleware
+from .audit_middleware import AuditHook
 from .data_retention_router import router as data_retention_router
 from .uptime_router import router as uptime_router
 from .sla_dashboard_router import router as sla_dashboard_router
+from .sla_tracking_service import APIResponseTimeRecorder, sla_tracking_service
 from .performance_dashboard_router import router as performance_dashboard_router
 from .alerting_router import router as alerting_router
 from .analytics_router import router as analytics_router
@@ -48,6 +51,7 @@ from .tutor_goals_router import router as tutor_goals_router
 from .training_resources_router import router as training_resources_router
 from .reports_router import router as reports_router
 from .email_tracking_router import router as email_tracking_router
+from src.email_automation.email_event_ingestion import get_email_event_ingestor
 from .email_campaigns_router import router as email_campaigns_router
 from .auth import (
     auth_router,
@@ -68,6 +72,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Request hooks run by PerformanceMiddleware
+audit_hook = AuditHook(log_all_requests=False)  # Set log_all_requests=True for verbose logging during development
+api_response_time_recorder = APIResponseTimeRecorder(
+    sla_tracking_service,
+    sample_rate=settings.sla_api_sample_rate,
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -110,10 +121,18 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize cache service: {e}")
         logger.warning("API will start but caching will be disabled")
 
+    api_response_time_recorder.start()
+    route_latency_recorder.start()
+    get_email_event_ingestor().start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down TutorMax Data Ingestion API...")
+    await api_response_time_recorder.stop()
+    await route_latency_recorder.stop()
+    await get_email_event_ingestor().stop()
+    await audit_hook.drain()
     await redis_service.disconnect()
     logger.info("Redis connection closed")
 
@@ -129,29 +148,32 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Set up Prometheus metrics
+# Set up Prometheus metrics endpoint
 setup_metrics(app)
 
-# Add performance middleware (should be first for accurate timing)
+# Add gzip compression
+configure_compression(app)
+
+# Add performance middleware: one pure-ASGI pipeline for timing, Prometheus,
+# SLA tracking, rate limiting and audit logging
 app.add_middleware(
     PerformanceMiddleware,
     enable_timing=True,
     enable_cache_headers=True,
     log_slow_requests=True,
-    slow_request_threshold_ms=200
+    slow_request_threshold_ms=200,
+    rate_limiter=(
+        SlidingWindowRateLimiter(
+            requests_per_minute=settings.rate_limit_api_read_requests,
+            burst_size=20,
+        )
+        if settings.rate_limit_enabled
+        else None
+    ),
+    audit_hook=audit_hook,
+    observers=[prometheus_observer, api_response_time_recorder, route_latency_recorder],
 )
 
-# Add rate limiting middleware
-if settings.rate_limit_enabled:
-    app.add_middleware(
-        RateLimitMiddleware,
-        requests_per_minute=settings.rate_limit_api_read_requests,
-        burst_size=20
-    )
-
-# Add gzip compression
-configure_compression(app)
-
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -161,10 +183,6 @@ app.add_middleware(
     allow_headers=settings.cors_allow_headers,
 )
 
-# Add audit logging middleware
-# Set log_all_requests=True for verbose logging during development
-app.add_middleware(AuditLoggingMiddleware, log_all_requests=False)
-
 # Include routers
 
 # Authentication routers (FastAPI-Users)
@@ -246,6 +264,7 @@ async def http_exception_handler(request, exc):
             "error": exc.detail,
             "timestamp": datetime.now().isoformat(),
         },
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -307,6 +326,7 @@ async def root():
     response_model=IngestionResponse,
     status_code=status.HTTP_201_CREATED,
     tags=["Tutors"],
+    dependencies=[Depends(require_queue_capacity(RedisService.TUTOR_QUEUE))],
 )
 async def ingest_tutor(
     tutor: TutorProfile,
@@ -342,6 +362,7 @@ async def ingest_tutor(
     response_model=BatchIngestionResponse,
     status_code=status.HTTP_201_CREATED,
     tags=["Tutors"],
+    dependencies=[Depends(require_queue_capacity(RedisService.TUTOR_QUEUE))],
 )
 async def ingest_tutors_batch(
     tutors: List[TutorProfile],
@@ -350,7 +371,8 @@ async def ingest_tutors_batch(
     """
     Ingest multiple tutor profiles in batch.
 
-    Validates and queues all tutor profiles. Returns count of successfully queued items.
+    Validates all tutor profiles and queues them with one pipelined Redis write.
+    Returns per-item acceptance.
     """
     if not tutors:
         raise HTTPException(
@@ -358,29 +380,36 @@ async def ingest_tutors_batch(
             detail="Empty batch - no tutors provided",
         )
 
-    successful = 0
-    errors = []
+    return await queue_models(tutors, "tutor_id", redis.queue_tutors_bulk, "tutors")
 
-    for tutor in tutors:
-        try:
-            queued = await redis.queue_tutor(tutor.model_dump())
-            if queued:
-                successful += 1
-            else:
-                errors.append(f"Failed to queue tutor {tutor.tutor_id}")
-        except Exception as e:
-            errors.append(f"Error processing tutor {tutor.tutor_id}: {str(e)}")
 
-    logger.info(f"Batch ingestion: {successful}/{len(tutors)} tutors queued")
+@app.post(
+    f"{settings.api_prefix}/tutors/batch/ndjson",
+    response_model=BatchIngestionResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Tutors"],
+    dependencies=[Depends(require_queue_capacity(RedisService.TUTOR_QUEUE))],
+    openapi_extra={"requestBody": {"content": {NDJSON_MEDIA_TYPE: {}}, "required": True}},
+)
+async def ingest_tutors_ndjson(
+    request: Request,
+    redis: RedisService = Depends(get_redis_service),
+) -> BatchIngestionResponse:
+    """
+    Ingest tutor profiles from an NDJSON body (one JSON object per line).
 
-    return BatchIngestionResponse(
-        success=successful > 0,
-        message=f"Batch ingestion completed: {successful}/{len(tutors)} tutors queued",
-        count=successful,
-        queued=successful > 0,
-        timestamp=datetime.now().isoformat(),
-        errors=errors,
-    )
+    Lines are validated as they stream in and queued in chunks, so invalid
+    lines are rejected individually. Returns per-line acceptance.
+    """
+    response = await queue_ndjson(request.stream(), TutorProfile, "tutor_id", redis.queue_tutors_bulk, "tutors")
+
+    if not response.items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty batch - no tutors provided",
+        )
+
+    return response
 
 
 # Session endpoints
@@ -389,6 +418,7 @@ async def ingest_tutors_batch(
     response_model=IngestionResponse,
     status_code=status.HTTP_201_CREATED,
     tags=["Sessions"],
+    dependencies=[Depends(require_queue_capacity(RedisService.SESSION_QUEUE))],
 )
 async def ingest_session(
     session: SessionData,
@@ -424,6 +454,7 @@ async def ingest_session(
     response_model=BatchIngestionResponse,
     status_code=status.HTTP_201_CREATED,
     tags=["Sessions"],
+    dependencies=[Depends(require_queue_capacity(RedisService.SESSION_QUEUE))],
 )
 async def ingest_sessions_batch(
     sessions: List[SessionData],
@@ -432,7 +463,8 @@ async def ingest_sessions_batch(
     """
     Ingest multiple session records in batch.
 
-    Validates and queues all sessions. Returns count of successfully queued items.
+    Validates all session records and queues them with one pipelined Redis write.
+    Returns per-item acceptance.
     """
     if not sessions:
         raise HTTPException(
@@ -440,29 +472,36 @@ async def ingest_sessions_batch(
             detail="Empty batch - no sessions provided",
         )
 
-    successful = 0
-    errors = []
+    return await queue_models(sessions, "session_id", redis.queue_sessions_bulk, "sessions")
 
-    for session in sessions:
-        try:
-            queued = await redis.queue_session(session.model_dump())
-            if queued:
-                successful += 1
-            else:
-                errors.append(f"Failed to queue session {session.session_id}")
-        except Exception as e:
-            errors.append(f"Error processing session {session.session_id}: {str(e)}")
 
-    logger.info(f"Batch ingestion: {successful}/{len(sessions)} sessions queued")
+@app.post(
+    f"{settings.api_prefix}/sessions/batch/ndjson",
+    response_model=BatchIngestionResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Sessions"],
+    dependencies=[Depends(require_queue_capacity(RedisService.SESSION_QUEUE))],
+    openapi_extra={"requestBody": {"content": {NDJSON_MEDIA_TYPE: {}}, "required": True}},
+)
+async def ingest_sessions_ndjson(
+    request: Request,
+    redis: RedisService = Depends(get_redis_service),
+) -> BatchIngestionResponse:
+    """
+    Ingest session records from an NDJSON body (one JSON object per line).
+
+    Lines are validated as they stream in and queued in chunks, so invalid
+    lines are rejected individually. Returns per-line acceptance.
+    """
+    response = await queue_ndjson(request.stream(), SessionData, "session_id", redis.queue_sessions_bulk, "sessions")
+
+    if not response.items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty batch - no sessions provided",
+        )
 
-    return BatchIngestionResponse(
-        success=successful > 0,
-        message=f"Batch ingestion completed: {successful}/{len(sessions)} sessions queued",
-        count=successful,
-        queued=successful > 0,
-        timestamp=datetime.now().isoformat(),
-        errors=errors,
-    )
+    return response
 
 
 # Feedback endpoints
@@ -471,6 +510,7 @@ async def ingest_sessions_batch(
     response_model=IngestionResponse,
     status_code=status.HTTP_201_CREATED,
     tags=["Feedback"],
+    dependencies=[Depends(require_queue_capacity(RedisService.FEEDBACK_QUEUE))],
 )
 async def ingest_feedback(
     feedback: FeedbackData,
@@ -506,6 +546,7 @@ async def ingest_feedback(
     response_model=BatchIngestionResponse,
     status_code=status.HTTP_201_CREATED,
     tags=["Feedback"],
+    dependencies=[Depends(require_queue_capacity(RedisService.FEEDBACK_QUEUE))],
 )
 async def ingest_feedback_batch(
     feedbacks: List[FeedbackData],
@@ -514,7 +555,8 @@ async def ingest_feedback_batch(
     """
     Ingest multiple feedback records in batch.
 
-    Validates and queues all feedback. Returns count of successfully queued items.
+    Validates all feedback records and queues them with one pipelined Redis write.
+    Returns per-item acceptance.
     """
     if not feedbacks:
         raise HTTPException(
@@ -522,29 +564,36 @@ async def ingest_feedback_batch(
             detail="Empty batch - no feedback provided",
         )
 
-    successful = 0
-    errors = []
+    return await queue_models(feedbacks, "feedback_id", redis.queue_feedbacks_bulk, "feedbacks")
 
-    for feedback in feedbacks:
-        try:
-            queued = await redis.queue_feedback(feedback.model_dump())
-            if queued:
-                successful += 1
-            else:
-                errors.append(f"Failed to queue feedback {feedback.feedback_id}")
-        except Exception as e:
-            errors.append(f"Error processing feedback {feedback.feedback_id}: {str(e)}")
 
-    logger.info(f"Batch ingestion: {successful}/{len(feedbacks)} feedbacks queued")
+@app.post(
+    f"{settings.api_prefix}/feedback/batch/ndjson",
+    response_model=BatchIngestionResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Feedback"],
+    dependencies=[Depends(require_queue_capacity(RedisService.FEEDBACK_QUEUE))],
+    openapi_extra={"requestBody": {"content": {NDJSON_MEDIA_TYPE: {}}, "required": True}},
+)
+async def ingest_feedback_ndjson(
+    request: Request,
+    redis: RedisService = Depends(get_redis_service),
+) -> BatchIngestionResponse:
+    """
+    Ingest feedback records from an NDJSON body (one JSON object per line).
 
-    return BatchIngestionResponse(
-        success=successful > 0,
-        message=f"Batch ingestion completed: {successful}/{len(feedbacks)} feedbacks queued",
-        count=successful,
-        queued=successful > 0,
-        timestamp=datetime.now().isoformat(),
-        errors=errors,
-    )
+    Lines are validated as they stream in and queued in chunks, so invalid
+    lines are rejected individually. Returns per-line acceptance.
+    """
+    response = await queue_ndjson(request.stream(), FeedbackData, "feedback_id", redis.queue_feedbacks_bulk, "feedbacks")
+
+    if not response.items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty batch - no feedback provided",
+        )
+
+    return response
 
 
 # Queue stats endpoint (useful for monitoring)
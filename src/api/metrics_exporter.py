@@ -12,12 +12,15 @@ from prometheus_client import (
     CONTENT_TYPE_LATEST,
 )
 from fastapi import FastAPI, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-import time
+from starlette.types import Scope
 import psutil
 import logging
 
+from .config import settings
+from .latency_sketch import DEFAULT_QUANTILES
+from .performance_middleware import RequestObserver, RequestTiming
+from .route_latency import route_latency_recorder
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -25,6 +28,8 @@ logger = logging.getLogger(__name__)
 # ============================================================================
 
 # HTTP Metrics
+# The endpoint label is the route template (e.g. /api/predictions/{tutor_id}),
+# so per-ID paths do not create unbounded label sets
 http_requests_total = Counter(
     "http_requests_total",
     "Total HTTP requests",
@@ -38,10 +43,25 @@ http_request_duration_seconds = Histogram(
     buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
 )
 
+# Quantiles of the per-route latency sketches over the last
+# latency_metrics_window_minutes, merged across all API workers in Redis.
+# Every instance reports the same merged values: aggregate with max(), not sum()
+http_request_latency_quantile_seconds = Gauge(
+    "http_request_latency_quantile_seconds",
+    "HTTP request latency quantile per route over the recent window (all workers)",
+    ["method", "endpoint", "status_class", "quantile"],
+)
+
+http_request_latency_window_requests = Gauge(
+    "http_request_latency_window_requests",
+    "HTTP requests per route over the recent latency window (all workers)",
+    ["method", "endpoint", "status_class"],
+)
+
 http_requests_in_progress = Gauge(
     "http_requests_in_progress",
     "HTTP requests currently being processed",
-    ["method", "endpoint"],
+    ["method"],  # The route is not known until routing has run
 )
 
 # Database Metrics
@@ -149,54 +169,36 @@ sla_compliance_percent = Gauge(
 
 
 # ============================================================================
-# Metrics Collection Middleware
+# Request Observer
 # ============================================================================
 
 
-class PrometheusMiddleware(BaseHTTPMiddleware):
+class PrometheusObserver(RequestObserver):
     """
-    Middleware to automatically track HTTP request metrics.
+    Records HTTP request metrics from PerformanceMiddleware's request timing.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def request_started(self, scope: Scope) -> None:
         # Skip metrics endpoint to avoid infinite loop
-        if request.url.path == "/metrics":
-            return await call_next(request)
-
-        method = request.method
-        path = request.url.path
-
-        # Track in-progress requests
-        http_requests_in_progress.labels(method=method, endpoint=path).inc()
-
-        # Time the request
-        start_time = time.time()
+        if scope["path"] == "/metrics":
+            return
+        http_requests_in_progress.labels(method=scope["method"]).inc()
 
-        try:
-            response = await call_next(request)
-            status_code = response.status_code
+    def request_finished(self, timing: RequestTiming) -> None:
+        if timing.path == "/metrics":
+            return
 
-            # Record metrics
-            duration = time.time() - start_time
-            http_request_duration_seconds.labels(method=method, endpoint=path).observe(
-                duration
-            )
-            http_requests_total.labels(
-                method=method, endpoint=path, status_code=status_code
-            ).inc()
+        http_requests_in_progress.labels(method=timing.method).dec()
 
-            return response
+        http_request_duration_seconds.labels(
+            method=timing.method, endpoint=timing.route
+        ).observe(timing.duration_ms / 1000)
+        http_requests_total.labels(
+            method=timing.method, endpoint=timing.route, status_code=timing.status_code
+        ).inc()
 
-        except Exception as e:
-            # Record error
-            http_requests_total.labels(
-                method=method, endpoint=path, status_code=500
-            ).inc()
-            raise
 
-        finally:
-            # Decrement in-progress
-            http_requests_in_progress.labels(method=method, endpoint=path).dec()
+prometheus_observer = PrometheusObserver()
 
 
 # ============================================================================
@@ -222,6 +224,31 @@ def collect_system_metrics():
         logger.error(f"Failed to collect system metrics: {e}")
 
 
+async def collect_route_latency_metrics():
+    """
+    Refresh per-route latency quantiles from the merged latency sketches.
+    """
+    try:
+        sketches, _ = await route_latency_recorder.merged_sketches(
+            settings.latency_metrics_window_minutes
+        )
+    except Exception as e:
+        logger.error(f"Failed to collect route latency metrics: {e}")
+        return
+
+    # Routes without traffic in the window are dropped, not left stale
+    http_request_latency_quantile_seconds.clear()
+    http_request_latency_window_requests.clear()
+    for (method, route, status_class), sketch in sketches.items():
+        http_request_latency_window_requests.labels(
+            method=method, endpoint=route, status_class=status_class
+        ).set(sketch.count)
+        for q in DEFAULT_QUANTILES:
+            http_request_latency_quantile_seconds.labels(
+                method=method, endpoint=route, status_class=status_class, quantile=str(q)
+            ).set(sketch.quantile(q) / 1000)
+
+
 # ============================================================================
 # FastAPI Integration
 # ============================================================================
@@ -231,12 +258,13 @@ def setup_metrics(app: FastAPI):
     """
     Set up Prometheus metrics for FastAPI application.
 
+    HTTP request metrics are recorded by prometheus_observer and per-route
+    latency quantiles by route_latency_recorder; both must be registered
+    with PerformanceMiddleware.
+
     Args:
         app: FastAPI application instance
     """
-    # Add middleware
-    app.add_middleware(PrometheusMiddleware)
-
     # Add metrics endpoint
     @app.get("/metrics", include_in_schema=False)
     async def metrics():
@@ -246,6 +274,7 @@ def setup_metrics(app: FastAPI):
         """
         # Collect system metrics before returning
         collect_system_metrics()
+        await collect_route_latency_metrics()
 
         # Generate Prometheus format
         return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
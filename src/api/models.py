@@ -219,6 +219,15 @@ class IngestionResponse(BaseModel):
     }
 
 
+class BatchItemStatus(BaseModel):
+    """Acceptance status of one item in a batch."""
+
+    index: int = Field(..., description="0-based position in a JSON batch, or 1-based line number in an NDJSON body")
+    id: Optional[str] = Field(None, description="Item ID, null if the item failed validation")
+    accepted: bool
+    error: Optional[str] = None
+
+
 class BatchIngestionResponse(BaseModel):
     """Response for batch ingestion endpoints."""
 
@@ -228,6 +237,7 @@ class BatchIngestionResponse(BaseModel):
     queued: bool
     timestamp: str
     errors: List[str] = Field(default_factory=list)
+    items: List[BatchItemStatus] = Field(default_factory=list)
 
     model_config = {
         "json_schema_extra": {
@@ -7,10 +7,11 @@ Displays API response times, database performance, queue depths, and Redis metri
 
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import HTMLResponse
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 
 from src.api.performance_metrics_service import get_performance_metrics_service
+from src.api.route_latency import route_latency_recorder
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +71,36 @@ async def get_api_response_times(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/route-latency")
+async def get_route_latency(
+    window_minutes: int = Query(15, ge=1, le=10080, description="Window in minutes (1-10080)"),
+    route: Optional[str] = Query(None, description="Route template, e.g. /api/predictions/{tutor_id}"),
+    status_class: Optional[str] = Query(None, pattern="^[1-5]xx$", description="Status class, e.g. 5xx"),
+) -> Dict[str, Any]:
+    """
+    Get per-route latency percentiles from the streaming latency sketches.
+
+    Sketches from all API workers are merged in Redis, so percentiles are
+    exact within the sketch's relative accuracy (1% by default). Windows up
+    to three hours use per-minute sketches, longer windows whole hours.
+
+    Args:
+        window_minutes: Window length in minutes
+        route: Only include this route template
+        status_class: Only include this status class
+
+    Returns:
+        p50/p90/p95/p99, mean and max per route and status class
+    """
+    try:
+        return await route_latency_recorder.route_summary(
+            window_minutes=window_minutes, route=route, status=status_class
+        )
+    except Exception as e:
+        logger.error(f"Failed to get route latency: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/database")
 async def get_database_performance() -> Dict[str, Any]:
     """
@@ -401,8 +432,12 @@ async def view_performance_dashboard() -> str:
                 try {
                     content.innerHTML = '<div class="loading">Loading performance metrics...</div>';
 
-                    const response = await fetch(`/api/performance/dashboard?hours=${hours}`);
+                    const [response, latencyResponse] = await Promise.all([
+                        fetch(`/api/performance/dashboard?hours=${hours}`),
+                        fetch(`/api/performance/route-latency?window_minutes=${hours * 60}`),
+                    ]);
                     const data = await response.json();
+                    data.route_latency = await latencyResponse.json();
 
                     renderDashboard(data);
                 } catch (error) {
@@ -417,6 +452,7 @@ async def view_performance_dashboard() -> str:
                 const queues = data.worker_queues;
                 const redis = data.redis_performance;
                 const tasks = data.celery_tasks;
+                const slowestRoutes = (data.route_latency.routes || []).slice(0, 8);
 
                 content.innerHTML = `
                     <div class="metrics-grid">
@@ -542,6 +578,19 @@ async def view_performance_dashboard() -> str:
                             </div>
                         </div>
 
+                        <!-- Slowest Routes (per-route latency sketches) -->
+                        <div class="metric-card">
+                            <div class="metric-header">
+                                <span class="metric-title">Slowest Routes (P99)</span>
+                            </div>
+                            ${slowestRoutes.map((r) => `
+                                <div class="metric-row">
+                                    <span class="metric-label">${r.method} ${r.route} ${r.status_class}</span>
+                                    <span class="metric-value ${r.p99_ms > 1000 ? 'warning' : ''}">${r.p50_ms} / ${r.p99_ms} ms</span>
+                                </div>
+                            `).join('')}
+                        </div>
+
                         <!-- Overall Health -->
                         <div class="metric-card">
                             <div class="metric-header">
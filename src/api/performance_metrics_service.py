@@ -75,13 +75,15 @@ class PerformanceMetricsService:
         self,
         hours: int
     ) -> Dict[str, int]:
-        """Get breakdown of HTTP status codes."""
-        # This would typically come from access logs or metrics
-        # For now, return a placeholder
+        """Get breakdown of HTTP status codes from the per-route latency sketches."""
+        from src.api.route_latency import route_latency_recorder
+
+        summary = await route_latency_recorder.route_summary(window_minutes=hours * 60)
         return {
             "2xx": 0,  # Success
             "4xx": 0,  # Client errors
             "5xx": 0,  # Server errors
+            **summary["status_codes"],
         }
 
     async def get_database_performance(self) -> Dict[str, Any]:
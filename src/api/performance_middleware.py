@@ -5,154 +5,327 @@ Implements:
 - Gzip compression for responses
 - Response caching headers
 - Request timing and logging
-- Rate limiting per endpoint
+- Rate limiting per client
+
+PerformanceMiddleware is a single pure-ASGI instrumentation pipeline. One
+timing measurement per request feeds Server-Timing, Prometheus, SLA tracking,
+per-route latency sketches and slow-request logging; rate limiting, audit logging and security headers
+plug in as hooks instead of separate middleware layers. Response bodies pass
+through untouched, so streaming responses are never buffered.
 """
 
 import time
 import logging
-from typing import Dict, Callable
-from datetime import datetime
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 
-from fastapi import Request, Response
-from fastapi.responses import StreamingResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.gzip import GZipMiddleware
-from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .latency_sketch import LatencySketch
 
 logger = logging.getLogger(__name__)
 
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
+@dataclass
+class RequestTiming:
+    """Outcome of one HTTP request, shared by all request observers."""
+
+    method: str
+    path: str
+    route: str  # Route template (e.g. /api/predictions/{tutor_id}), or "unmatched"
+    status_code: int
+    duration_ms: float  # Until the last body chunk was sent
+    client_ip: str
+    scope: Scope
+
+
+class RequestObserver:
+    """
+    Hook notified by PerformanceMiddleware for every HTTP request.
+
+    Observers run inline on the request path and must stay cheap; anything
+    that does I/O should buffer and flush in the background.
+    """
+
+    def request_started(self, scope: Scope) -> None:
+        """Called before the application handles the request."""
+
+    def request_finished(self, timing: RequestTiming) -> None:
+        """Called after the response has been fully sent (or failed)."""
+
+
+class SlidingWindowRateLimiter:
+    """
+    Simple in-memory sliding-window rate limiter, keyed by client IP.
+
+    For production, use Redis-based rate limiting (e.g., slowapi with Redis backend).
+    """
+
+    def __init__(self, requests_per_minute: int = 100, burst_size: int = 20):
+        """
+        Initialize rate limiter.
+
+        Args:
+            requests_per_minute: Max requests per minute per IP
+            burst_size: Max burst requests
+        """
+        self.requests_per_minute = requests_per_minute
+        self.burst_size = burst_size
+        self.request_counts: Dict[str, Deque[float]] = {}
+
+    def check(self, client_ip: str) -> Tuple[bool, int]:
+        """
+        Record a request and check it against the limit.
+
+        Args:
+            client_ip: Client IP address
+
+        Returns:
+            (allowed, remaining requests in the current window)
+        """
+        now = time.monotonic()
+        window_start = now - 60
+
+        timestamps = self.request_counts.get(client_ip)
+        if timestamps is None:
+            timestamps = self.request_counts[client_ip] = deque()
+
+        # Timestamps are appended in order, so expired ones are at the left
+        while timestamps and timestamps[0] <= window_start:
+            timestamps.popleft()
+
+        if len(timestamps) >= self.requests_per_minute:
+            return False, 0
+
+        timestamps.append(now)
+        return True, self.requests_per_minute - len(timestamps)
+
+
+def cache_control_headers(method: str, path: str) -> List[Tuple[str, str]]:
+    """
+    Cache control headers for an endpoint.
+
+    Only applied when the endpoint did not set its own Cache-Control
+    (e.g. the email tracking pixel).
+
+    Args:
+        method: HTTP method
+        path: Request path
+
+    Returns:
+        Header name/value pairs (empty if no policy applies)
+    """
+    # Static assets - long cache
+    if path.endswith(('.js', '.css', '.png', '.jpg', '.svg', '.woff2')):
+        return [("Cache-Control", "public, max-age=31536000, immutable")]
+
+    # API endpoints - different strategies
+    if path.startswith("/api/"):
+        # Read endpoints - short cache
+        if method == "GET":
+            if "/dashboard" in path:
+                # Dashboard data - 5 min cache
+                return [("Cache-Control", "public, max-age=300, stale-while-revalidate=60")]
+            if "/predictions" in path:
+                # Predictions - 1 hour cache
+                return [("Cache-Control", "public, max-age=3600, stale-while-revalidate=300")]
+            if "/metrics" in path:
+                # Metrics - 15 min cache
+                return [("Cache-Control", "public, max-age=900, stale-while-revalidate=60")]
+            # Other GET endpoints - 1 min cache
+            return [("Cache-Control", "public, max-age=60, stale-while-revalidate=30")]
+
+        # Write endpoints - no cache
+        if method in ("POST", "PUT", "PATCH", "DELETE"):
+            return [
+                ("Cache-Control", "no-store, no-cache, must-revalidate"),
+                ("Pragma", "no-cache"),
+            ]
+
+    # Health check - no cache
+    elif path in ("/health", "/healthz"):
+        return [("Cache-Control", "no-cache, no-store, must-revalidate")]
+
+    return []
+
+
+def _client_ip(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _route_template(scope: Scope) -> str:
+    # The router stores the matched route in the shared scope
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class PerformanceMiddleware:
     """
-    Middleware for request/response performance optimization and monitoring.
+    Pure-ASGI request instrumentation pipeline.
+
+    Per request:
+    1. Rate limit hook (rejects with 429 before the app runs)
+    2. Response headers at http.response.start: Server-Timing and
+       X-Response-Time (time to first byte), cache control, rate limit,
+       security headers
+    3. After the last body chunk: one duration shared by stats, slow request
+       logging, observers (Prometheus, SLA tracking) and the audit hook
     """
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         enable_timing: bool = True,
         enable_cache_headers: bool = True,
         log_slow_requests: bool = True,
-        slow_request_threshold_ms: int = 200
+        slow_request_threshold_ms: int = 200,
+        rate_limiter: Optional[SlidingWindowRateLimiter] = None,
+        audit_hook=None,
+        security_headers=None,
+        observers: Sequence[RequestObserver] = (),
     ):
         """
         Initialize performance middleware.
 
         Args:
-            app: FastAPI application
+            app: ASGI application
             enable_timing: Add timing headers to responses
             enable_cache_headers: Add appropriate cache control headers
             log_slow_requests: Log requests that exceed threshold
             slow_request_threshold_ms: Threshold for slow request logging
+            rate_limiter: Optional per-client rate limiter
+            audit_hook: Optional AuditHook writing audit log entries
+            security_headers: Optional SecurityHeaders applied to every response
+            observers: Request observers notified with the shared timing
         """
-        super().__init__(app)
+        self.app = app
         self.enable_timing = enable_timing
         self.enable_cache_headers = enable_cache_headers
         self.log_slow_requests = log_slow_requests
         self.slow_request_threshold_ms = slow_request_threshold_ms
+        self.rate_limiter = rate_limiter
+        self.audit_hook = audit_hook
+        self.security_headers = security_headers
+        self.observers = list(observers)
 
         # Performance statistics
         self.stats = {
             "total_requests": 0,
             "slow_requests": 0,
             "total_time_ms": 0,
-            "p50_time_ms": 0,
-            "p95_time_ms": 0,
-            "p99_time_ms": 0,
-            "request_times": []  # Store recent request times for percentile calculation
+            "request_times": LatencySketch(),  # Request time distribution for percentiles
         }
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Process request and add performance optimizations.
-
-        Args:
-            request: Incoming request
-            call_next: Next middleware/handler
-
-        Returns:
-            Response with performance headers
-        """
-        start_time = time.time()
-
-        # Process request
-        response = await call_next(request)
-
-        # Calculate request duration
-        duration_ms = (time.time() - start_time) * 1000
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        client_ip = _client_ip(scope)
+        status_code = 500
+
+        for observer in self.observers:
+            observer.request_started(scope)
+
+        remaining = None
+        if self.rate_limiter is not None:
+            allowed, remaining = self.rate_limiter.check(client_ip)
+            if not allowed:
+                await self._send_rate_limited(send)
+                self._finish(scope, method, path, client_ip, 429, start)
+                return
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+
+                if self.enable_timing:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    headers["X-Response-Time"] = f"{elapsed_ms:.2f}ms"
+                    headers["Server-Timing"] = f"app;dur={elapsed_ms:.2f}"
+                    request_id = _header(scope, b"x-request-id")
+                    if request_id:
+                        headers["X-Request-ID"] = request_id
+
+                if self.enable_cache_headers and "cache-control" not in headers:
+                    for name, value in cache_control_headers(method, path):
+                        headers[name] = value
+
+                if remaining is not None:
+                    headers["X-RateLimit-Limit"] = str(self.rate_limiter.requests_per_minute)
+                    headers["X-RateLimit-Remaining"] = str(remaining)
+
+                if self.security_headers is not None:
+                    self.security_headers.apply(headers, scope.get("scheme", "http"))
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._finish(scope, method, path, client_ip, status_code, start)
+
+    def _finish(
+        self,
+        scope: Scope,
+        method: str,
+        path: str,
+        client_ip: str,
+        status_code: int,
+        start: float,
+    ) -> RequestTiming:
+        duration_ms = (time.perf_counter() - start) * 1000
+        timing = RequestTiming(
+            method=method,
+            path=path,
+            route=_route_template(scope),
+            status_code=status_code,
+            duration_ms=duration_ms,
+            client_ip=client_ip,
+            scope=scope,
+        )
 
-        # Update statistics
         self._update_stats(duration_ms)
 
-        # Add timing header
-        if self.enable_timing:
-            response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-            response.headers["X-Request-ID"] = request.headers.get("X-Request-ID", "")
-
-        # Add cache control headers
-        if self.enable_cache_headers:
-            response = self._add_cache_headers(request, response)
-
         # Log slow requests
         if self.log_slow_requests and duration_ms > self.slow_request_threshold_ms:
-            logger.warning(
-                f"Slow request: {request.method} {request.url.path} "
-                f"took {duration_ms:.2f}ms"
-            )
-
-        # Add performance stats header (for monitoring)
-        response.headers["X-Server-Timing"] = (
-            f"total;dur={duration_ms:.2f}"
-        )
-
-        return response
-
-    def _add_cache_headers(self, request: Request, response: Response) -> Response:
-        """
-        Add appropriate cache control headers based on endpoint.
-
-        Args:
-            request: Request object
-            response: Response object
-
-        Returns:
-            Response with cache headers
-        """
-        path = request.url.path
-
-        # Static assets - long cache
-        if any(path.endswith(ext) for ext in ['.js', '.css', '.png', '.jpg', '.svg', '.woff2']):
-            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
-            return response
-
-        # API endpoints - different strategies
-        if path.startswith("/api/"):
-            # Read endpoints - short cache
-            if request.method == "GET":
-                if "/dashboard" in path:
-                    # Dashboard data - 5 min cache
-                    response.headers["Cache-Control"] = "public, max-age=300, stale-while-revalidate=60"
-                elif "/predictions" in path:
-                    # Predictions - 1 hour cache
-                    response.headers["Cache-Control"] = "public, max-age=3600, stale-while-revalidate=300"
-                elif "/metrics" in path:
-                    # Metrics - 15 min cache
-                    response.headers["Cache-Control"] = "public, max-age=900, stale-while-revalidate=60"
-                else:
-                    # Other GET endpoints - 1 min cache
-                    response.headers["Cache-Control"] = "public, max-age=60, stale-while-revalidate=30"
-
-            # Write endpoints - no cache
-            elif request.method in ["POST", "PUT", "PATCH", "DELETE"]:
-                response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
-                response.headers["Pragma"] = "no-cache"
-
-        # Health check - no cache
-        elif path in ["/health", "/healthz"]:
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-
-        return response
+            logger.warning(f"Slow request: {method} {path} took {duration_ms:.2f}ms")
+
+        for observer in self.observers:
+            try:
+                observer.request_finished(timing)
+            except Exception as e:
+                logger.error(f"Request observer {type(observer).__name__} failed: {e}")
+
+        # Audit rows are written in the background, after the response
+        if self.audit_hook is not None and self.audit_hook.should_audit(method, path):
+            self.audit_hook.record(timing)
+
+        return timing
+
+    async def _send_rate_limited(self, send: Send) -> None:
+        body = b"Rate limit exceeded. Please try again later."
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", b"60"),
+                (b"x-ratelimit-limit", str(self.rate_limiter.requests_per_minute).encode()),
+                (b"x-ratelimit-remaining", b"0"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
 
     def _update_stats(self, duration_ms: float) -> None:
         """
@@ -163,167 +336,52 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         """
         self.stats["total_requests"] += 1
         self.stats["total_time_ms"] += duration_ms
-
-        # Track request times for percentile calculation (keep last 1000)
-        self.stats["request_times"].append(duration_ms)
-        if len(self.stats["request_times"]) > 1000:
-            self.stats["request_times"].pop(0)
+        self.stats["request_times"].add(duration_ms)
 
         # Count slow requests
         if duration_ms > self.slow_request_threshold_ms:
             self.stats["slow_requests"] += 1
 
-        # Calculate percentiles
-        if len(self.stats["request_times"]) > 10:
-            sorted_times = sorted(self.stats["request_times"])
-            n = len(sorted_times)
-            self.stats["p50_time_ms"] = sorted_times[int(n * 0.50)]
-            self.stats["p95_time_ms"] = sorted_times[int(n * 0.95)]
-            self.stats["p99_time_ms"] = sorted_times[int(n * 0.99)]
-
     def get_stats(self) -> Dict:
         """
         Get performance statistics.
 
+        Percentiles cover every request since startup (within 1% relative
+        error); per-route, windowed percentiles come from RouteLatencyRecorder.
+
         Returns:
             Performance statistics dictionary
         """
-        avg_time = (
-            self.stats["total_time_ms"] / self.stats["total_requests"]
-            if self.stats["total_requests"] > 0
-            else 0
-        )
+        total = self.stats["total_requests"]
+        avg_time = self.stats["total_time_ms"] / total if total > 0 else 0
+
+        percentiles = {"p50_time_ms": 0, "p95_time_ms": 0, "p99_time_ms": 0}
+        sketch = self.stats["request_times"]
+        if sketch.count > 10:
+            percentiles = {
+                "p50_time_ms": sketch.quantile(0.50),
+                "p95_time_ms": sketch.quantile(0.95),
+                "p99_time_ms": sketch.quantile(0.99),
+            }
 
         return {
-            "total_requests": self.stats["total_requests"],
+            "total_requests": total,
             "slow_requests": self.stats["slow_requests"],
             "slow_request_rate": (
-                self.stats["slow_requests"] / self.stats["total_requests"] * 100
-                if self.stats["total_requests"] > 0
+                self.stats["slow_requests"] / total * 100
+                if total > 0
                 else 0
             ),
             "avg_time_ms": round(avg_time, 2),
-            "p50_time_ms": round(self.stats["p50_time_ms"], 2),
-            "p95_time_ms": round(self.stats["p95_time_ms"], 2),
-            "p99_time_ms": round(self.stats["p99_time_ms"], 2),
+            **{key: round(value, 2) for key, value in percentiles.items()},
         }
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """
-    Simple in-memory rate limiting middleware.
-
-    For production, use Redis-based rate limiting (e.g., slowapi with Redis backend).
-    """
-
-    def __init__(
-        self,
-        app,
-        requests_per_minute: int = 100,
-        burst_size: int = 20
-    ):
-        """
-        Initialize rate limiting middleware.
-
-        Args:
-            app: FastAPI application
-            requests_per_minute: Max requests per minute per IP
-            burst_size: Max burst requests
-        """
-        super().__init__(app)
-        self.requests_per_minute = requests_per_minute
-        self.burst_size = burst_size
-        self.request_counts: Dict[str, list] = {}
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Check rate limits and process request.
-
-        Args:
-            request: Incoming request
-            call_next: Next middleware/handler
-
-        Returns:
-            Response or 429 Too Many Requests
-        """
-        # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
-
-        # Check rate limit
-        if not self._check_rate_limit(client_ip):
-            return Response(
-                content="Rate limit exceeded. Please try again later.",
-                status_code=429,
-                headers={
-                    "Retry-After": "60",
-                    "X-RateLimit-Limit": str(self.requests_per_minute),
-                    "X-RateLimit-Remaining": "0"
-                }
-            )
-
-        # Process request
-        response = await call_next(request)
-
-        # Add rate limit headers
-        remaining = self._get_remaining_requests(client_ip)
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-
-        return response
-
-    def _check_rate_limit(self, client_ip: str) -> bool:
-        """
-        Check if client has exceeded rate limit.
-
-        Args:
-            client_ip: Client IP address
-
-        Returns:
-            True if within limit, False otherwise
-        """
-        now = time.time()
-        minute_ago = now - 60
-
-        # Initialize client request history
-        if client_ip not in self.request_counts:
-            self.request_counts[client_ip] = []
-
-        # Clean up old requests
-        self.request_counts[client_ip] = [
-            timestamp for timestamp in self.request_counts[client_ip]
-            if timestamp > minute_ago
-        ]
-
-        # Check limit
-        if len(self.request_counts[client_ip]) >= self.requests_per_minute:
-            return False
-
-        # Record request
-        self.request_counts[client_ip].append(now)
-        return True
-
-    def _get_remaining_requests(self, client_ip: str) -> int:
-        """
-        Get remaining requests for client.
-
-        Args:
-            client_ip: Client IP address
-
-        Returns:
-            Number of remaining requests
-        """
-        if client_ip not in self.request_counts:
-            return self.requests_per_minute
-
-        now = time.time()
-        minute_ago = now - 60
-
-        recent_requests = sum(
-            1 for timestamp in self.request_counts[client_ip]
-            if timestamp > minute_ago
-        )
-
-        return max(0, self.requests_per_minute - recent_requests)
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
 
 
 # Compression configuration
@@ -17,6 +17,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database.database import get_async_session
 from ..database.query_optimizer import query_optimizer, get_query_optimizer, QueryOptimizer
+from ..database.index_advisor import (
+    IndexAdvisor,
+    workload_recorder,
+    orm_indexes,
+    detect_index_drift,
+)
+from ..database.models import Base
 from .cache_service import cache_service, get_cache_service, CacheService
 from .performance_middleware import PerformanceMiddleware
 
@@ -198,6 +205,53 @@ async def get_index_suggestions(
     }
 
 
+@router.get("/database/index-advisor")
+async def get_index_advisor_report(
+    estimate: bool = True,
+    session: AsyncSession = Depends(get_async_session),
+) -> Dict[str, Any]:
+    """
+    Get workload-driven index recommendations.
+
+    Proposes composite, partial and covering indexes for the captured query
+    workload, and lists unused and redundant indexes.
+
+    Args:
+        estimate: Estimate benefit with hypothetical indexes (requires HypoPG)
+
+    Returns:
+        Index advisor report
+    """
+    advisor = IndexAdvisor()
+    try:
+        return await advisor.build_report(session, workload_recorder.shapes(), estimate=estimate)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to build index report: {str(e)}"
+        )
+
+
+@router.get("/database/index-drift")
+async def get_index_drift(
+    session: AsyncSession = Depends(get_async_session),
+) -> Dict[str, Any]:
+    """
+    Compare indexes declared on the ORM models with the live schema.
+
+    Returns:
+        Indexes missing from the database and indexes not declared in the ORM
+    """
+    advisor = IndexAdvisor()
+    live = await advisor.load_existing_indexes(session)
+    drift = detect_index_drift(orm_indexes(Base.metadata), live)
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        **drift,
+    }
+
+
 @router.post("/database/query/explain")
 async def explain_query(
     query: str,
@@ -6,12 +6,16 @@ Handles Redis connection and message queue operations for the data ingestion pip
 
 import json
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, Optional, Sequence, Tuple
 
 import redis.asyncio as redis
+from fastapi import Depends, HTTPException, status
 from redis.exceptions import RedisError
 
+from ..queue.channels import QueueChannels
+from ..queue.config import redis_config
+from ..queue.stream_transport import Backpressure, StreamTransport
+
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +27,11 @@ class RedisService:
     Supports async operations for non-blocking I/O in FastAPI.
     """
 
-    # Queue names for different data types
-    TUTOR_QUEUE = "tutormax:queue:tutors"
-    SESSION_QUEUE = "tutormax:queue:sessions"
-    FEEDBACK_QUEUE = "tutormax:queue:feedbacks"
+    # Streams consumed by the validation workers
+    TUTOR_QUEUE = QueueChannels.TUTORS.value
+    SESSION_QUEUE = QueueChannels.SESSIONS.value
+    FEEDBACK_QUEUE = QueueChannels.FEEDBACK.value
+    CONSUMER_GROUP = redis_config.validation_consumer_group
 
     # Cache key prefixes
     PREDICTION_CACHE_PREFIX = "tutormax:cache:prediction:"
@@ -50,6 +55,7 @@ class RedisService:
         """
         self.redis_url = redis_url
         self.redis_client: Optional[redis.Redis] = None
+        self.transport: Optional[StreamTransport] = None
         self._connected = False
 
     async def connect(self) -> None:
@@ -67,6 +73,7 @@ class RedisService:
             )
             # Test connection
             await self.redis_client.ping()
+            self.transport = StreamTransport(self.redis_client)
             self._connected = True
             logger.info(f"Successfully connected to Redis at {self.redis_url}")
         except RedisError as e:
@@ -82,6 +89,7 @@ class RedisService:
         """
         if self.redis_client:
             await self.redis_client.close()
+            self.transport = None
             self._connected = False
             logger.info("Disconnected from Redis")
 
@@ -140,35 +148,24 @@ class RedisService:
 
     async def _enqueue(self, queue_name: str, data: Dict[str, Any]) -> bool:
         """
-        Enqueue data to specified Redis queue.
+        Enqueue data to specified Redis stream.
 
-        Uses Redis LPUSH to add to the left side of the list (queue).
-        Processors will use RPOP to dequeue from the right side (FIFO).
+        Messages are XADDed in the MessageSerializer envelope read by the
+        validation workers' consumer group.
 
         Args:
-            queue_name: Name of the Redis queue
+            queue_name: Name of the Redis stream
             data: Data dictionary to enqueue
 
         Returns:
             True if successfully queued, False otherwise
         """
-        if not self.redis_client:
+        if not self.transport:
             logger.error("Redis client not initialized")
             return False
 
         try:
-            # Add metadata
-            message = {
-                "data": data,
-                "queued_at": datetime.now().isoformat(),
-                "queue": queue_name,
-            }
-
-            # Serialize to JSON
-            message_json = json.dumps(message)
-
-            # Push to queue (LPUSH adds to left, RPOP removes from right = FIFO)
-            await self.redis_client.lpush(queue_name, message_json)
+            await self.transport.publish(queue_name, data)
 
             logger.debug(f"Successfully queued message to {queue_name}")
             return True
@@ -180,22 +177,113 @@ class RedisService:
             logger.error(f"Failed to serialize message for {queue_name}: {e}")
             return False
 
+    async def queue_tutors_bulk(self, records: Sequence[Dict[str, Any]]) -> bool:
+        """
+        Queue many tutor profiles for processing in one round trip.
+
+        Args:
+            records: Tutor profile dictionaries
+
+        Returns:
+            True if all records were queued, False otherwise
+        """
+        return await self.enqueue_bulk(self.TUTOR_QUEUE, records)
+
+    async def queue_sessions_bulk(self, records: Sequence[Dict[str, Any]]) -> bool:
+        """
+        Queue many session records for processing in one round trip.
+
+        Args:
+            records: Session data dictionaries
+
+        Returns:
+            True if all records were queued, False otherwise
+        """
+        return await self.enqueue_bulk(self.SESSION_QUEUE, records)
+
+    async def queue_feedbacks_bulk(self, records: Sequence[Dict[str, Any]]) -> bool:
+        """
+        Queue many feedback records for processing in one round trip.
+
+        Args:
+            records: Feedback data dictionaries
+
+        Returns:
+            True if all records were queued, False otherwise
+        """
+        return await self.enqueue_bulk(self.FEEDBACK_QUEUE, records)
+
+    async def enqueue_bulk(self, queue_name: str, records: Sequence[Dict[str, Any]]) -> bool:
+        """
+        Enqueue many records in one pipelined round trip.
+
+        Each record is encoded once into the MessageSerializer envelope and
+        all XADDs go through a single non-transactional pipeline.
+
+        Args:
+            queue_name: Name of the Redis stream
+            records: Data dictionaries to enqueue
+
+        Returns:
+            True if all records were queued, False otherwise
+        """
+        if not self.transport:
+            logger.error("Redis client not initialized")
+            return False
+
+        if not records:
+            return True
+
+        try:
+            await self.transport.publish_many(queue_name, records)
+
+            logger.debug(f"Successfully queued {len(records)} messages to {queue_name}")
+            return True
+
+        except RedisError as e:
+            logger.error(f"Failed to queue {len(records)} messages to {queue_name}: {e}")
+            return False
+        except (TypeError, ValueError) as e:
+            logger.error(f"Failed to serialize messages for {queue_name}: {e}")
+            return False
+
+    async def check_backpressure(self, queue_name: str) -> Tuple[Backpressure, int]:
+        """
+        Check whether the validation workers are keeping up with a stream.
+
+        Fails open: if lag cannot be read, ingestion is allowed and the
+        enqueue itself reports any Redis failure.
+
+        Args:
+            queue_name: Name of the Redis stream
+
+        Returns:
+            (state, lag) tuple
+        """
+        if not self.transport:
+            return Backpressure.OK, 0
+
+        try:
+            return await self.transport.backpressure(queue_name, self.CONSUMER_GROUP)
+        except RedisError as e:
+            logger.warning(f"Failed to read consumer lag for {queue_name}: {e}")
+            return Backpressure.OK, 0
+
     async def get_queue_length(self, queue_name: str) -> int:
         """
         Get the current length of a queue.
 
         Args:
-            queue_name: Name of the Redis queue
+            queue_name: Name of the Redis stream
 
         Returns:
             Queue length, or -1 on error
         """
-        if not self.redis_client:
+        if not self.transport:
             return -1
 
         try:
-            length = await self.redis_client.llen(queue_name)
-            return length
+            return await self.transport.length(queue_name)
         except RedisError as e:
             logger.error(f"Failed to get queue length for {queue_name}: {e}")
             return -1
@@ -599,3 +687,33 @@ async def get_redis_service() -> RedisService:
         RedisService instance
     """
     return redis_service
+
+
+def require_queue_capacity(queue_name: str):
+    """
+    Build a dependency that rejects ingestion while a stream is backlogged.
+
+    Answers 429 above the soft lag threshold and 503 above the hard one,
+    both with a Retry-After header.
+
+    Args:
+        queue_name: Stream the endpoint writes to
+
+    Returns:
+        FastAPI dependency
+    """
+    async def check_capacity(redis: RedisService = Depends(get_redis_service)) -> None:
+        state, lag = await redis.check_backpressure(queue_name)
+        if state is Backpressure.OK:
+            return
+
+        raise HTTPException(
+            status_code=(
+                status.HTTP_429_TOO_MANY_REQUESTS if state is Backpressure.THROTTLE
+                else status.HTTP_503_SERVICE_UNAVAILABLE
+            ),
+            detail=f"Ingestion queue {queue_name} is backlogged ({lag} messages pending)",
+            headers={"Retry-After": str(redis_config.backpressure_retry_after_seconds)},
+        )
+
+    return check_capacity
@@ -5,18 +5,21 @@ Provides comprehensive reporting and data export functionality for operations ma
 """
 
 import logging
+import re
+import uuid
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import AsyncIterator, Callable, List, Optional
 from enum import Enum
 
-from fastapi import APIRouter, HTTPException, Depends, status, Query, Response
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from .config import settings
-from ..database.database import get_async_session
-from .export_service import ExportService
+from ..database.database import get_async_session, async_session_maker
+from .export_service import ExportService, export_file_name
+from .export_storage import ExportStorage
 from .auth.rbac import require_operations_manager
 from src.database.models import User, InterventionStatus
 
@@ -63,6 +66,16 @@ class CustomReportRequest(BaseModel):
     include_summary: bool = Field(True, description="Include summary statistics")
 
 
+class ExportJobRequest(BaseModel):
+    """Request to run a large CSV export in the background."""
+    report_type: ReportType = Field(..., description="tutor_performance or intervention_history")
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    tutor_ids: Optional[List[str]] = Field(None, description="Specific tutors (tutor performance only)")
+    status_filter: Optional[InterventionStatus] = Field(None, description="Intervention status filter")
+    compress: bool = Field(False, description="Gzip-compress the export file")
+
+
 class ScheduledReportRequest(BaseModel):
     """Request to schedule a recurring report."""
     report_type: ReportType
@@ -73,18 +86,61 @@ class ScheduledReportRequest(BaseModel):
     end_date: Optional[datetime] = None
 
 
+# Chunk size for export file downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+EXPORT_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _stream_export(
+    build: Callable[[ExportService], AsyncIterator[bytes]],
+) -> AsyncIterator[bytes]:
+    """
+    Stream an export on its own database session.
+
+    The request-scoped session is closed before a streaming body is sent,
+    so the export opens a session that lives as long as the stream.
+    """
+    async def generate() -> AsyncIterator[bytes]:
+        async with async_session_maker() as session:
+            try:
+                async for chunk in build(ExportService(session)):
+                    yield chunk
+            except Exception as e:
+                logger.error(f"Export stream failed: {e}", exc_info=True)
+                raise
+
+    return generate()
+
+
+def _csv_response(chunks: AsyncIterator[bytes], filename: str, compress: bool) -> StreamingResponse:
+    """Streaming CSV download response."""
+    if compress:
+        filename = f"{filename}.gz"
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if compress else "text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
+    )
+
+
 @router.get("/tutor-performance/export")
 async def export_tutor_performance(
     format: ExportFormat = Query(..., description="Export format (csv or pdf)"),
     start_date: Optional[datetime] = Query(None, description="Start date"),
     end_date: Optional[datetime] = Query(None, description="End date"),
     tutor_ids: Optional[str] = Query(None, description="Comma-separated tutor IDs"),
+    compress: bool = Query(False, description="Gzip-compress CSV output"),
     session: AsyncSession = Depends(get_async_session),
     _user: User = Depends(require_operations_manager),
 ):
     """
     Export tutor performance data in CSV or PDF format.
 
+    CSV rows are streamed from a server-side cursor as they are read.
+
     **Requires:** Operations Manager role
 
     Args:
@@ -92,6 +148,7 @@ async def export_tutor_performance(
         start_date: Optional start date filter
         end_date: Optional end date filter
         tutor_ids: Optional comma-separated list of tutor IDs
+        compress: Gzip-compress CSV output
 
     Returns:
         File download with performance data
@@ -103,21 +160,18 @@ async def export_tutor_performance(
         tutor_id_list = tutor_ids.split(',') if tutor_ids else None
 
         if format == ExportFormat.CSV:
-            buffer = await export_service.export_tutor_performance_csv(
-                start_date=start_date,
-                end_date=end_date,
-                tutor_ids=tutor_id_list
+            chunks = _stream_export(
+                lambda service: service.stream_tutor_performance_csv(
+                    start_date=start_date,
+                    end_date=end_date,
+                    tutor_ids=tutor_id_list,
+                    compress=compress,
+                )
             )
 
             filename = f"tutor_performance_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
 
-            return StreamingResponse(
-                iter([buffer.getvalue()]),
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}"
-                }
-            )
+            return _csv_response(chunks, filename, compress)
 
         elif format == ExportFormat.PDF:
             buffer = await export_service.export_tutor_performance_pdf(
@@ -150,12 +204,14 @@ async def export_interventions(
     start_date: Optional[datetime] = Query(None, description="Start date"),
     end_date: Optional[datetime] = Query(None, description="End date"),
     status_filter: Optional[InterventionStatus] = Query(None, description="Filter by status"),
-    session: AsyncSession = Depends(get_async_session),
+    compress: bool = Query(False, description="Gzip-compress CSV output"),
     _user: User = Depends(require_operations_manager),
 ):
     """
     Export intervention history in CSV format.
 
+    Rows are streamed from a server-side cursor as they are read.
+
     **Requires:** Operations Manager role
 
     Args:
@@ -163,28 +219,24 @@ async def export_interventions(
         start_date: Optional start date filter
         end_date: Optional end date filter
         status_filter: Optional intervention status filter
+        compress: Gzip-compress CSV output
 
     Returns:
         CSV file download with intervention data
     """
     try:
-        export_service = ExportService(session)
-
-        buffer = await export_service.export_interventions_csv(
-            start_date=start_date,
-            end_date=end_date,
-            status_filter=status_filter
+        chunks = _stream_export(
+            lambda service: service.stream_interventions_csv(
+                start_date=start_date,
+                end_date=end_date,
+                status_filter=status_filter,
+                compress=compress,
+            )
         )
 
         filename = f"interventions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
 
-        return StreamingResponse(
-            iter([buffer.getvalue()]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
+        return _csv_response(chunks, filename, compress)
 
     except Exception as e:
         logger.error(f"Failed to export interventions: {e}", exc_info=True)
@@ -225,21 +277,17 @@ async def generate_custom_report(
         # In a production system, this would build a fully custom query based on selected metrics
 
         if request.format == ExportFormat.CSV:
-            buffer = await export_service.export_tutor_performance_csv(
-                start_date=request.start_date,
-                end_date=request.end_date,
-                tutor_ids=request.tutor_ids
+            chunks = _stream_export(
+                lambda service: service.stream_tutor_performance_csv(
+                    start_date=request.start_date,
+                    end_date=request.end_date,
+                    tutor_ids=request.tutor_ids,
+                )
             )
 
             filename = f"{request.report_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
 
-            return StreamingResponse(
-                iter([buffer.getvalue()]),
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}"
-                }
-            )
+            return _csv_response(chunks, filename, compress=False)
         else:
             buffer = await export_service.export_tutor_performance_pdf(
                 start_date=request.start_date,
@@ -310,6 +358,179 @@ async def export_analytics_summary(
         )
 
 
+@router.post("/exports", status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    request: ExportJobRequest,
+    _user: User = Depends(require_operations_manager),
+):
+    """
+    Start a large CSV export as a background job.
+
+    **Requires:** Operations Manager role
+
+    The export is written to export storage by a Celery worker and kept for
+    settings.export_retention_hours. Poll the status URL,
+    then fetch the download URL; downloads support HTTP Range requests so an
+    interrupted transfer can resume.
+
+    Args:
+        request: Export job configuration
+
+    Returns:
+        Export ID with status and download URLs
+    """
+    if request.report_type not in (ReportType.TUTOR_PERFORMANCE, ReportType.INTERVENTION_HISTORY):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Background export is not available for '{request.report_type.value}'"
+        )
+
+    from src.workers.tasks.scheduled_reports import generate_export_file
+
+    export_id = uuid.uuid4().hex
+    generate_export_file.apply_async(
+        kwargs={
+            "export_id": export_id,
+            "report_type": request.report_type.value,
+            "start_date": request.start_date.isoformat() if request.start_date else None,
+            "end_date": request.end_date.isoformat() if request.end_date else None,
+            "tutor_ids": request.tutor_ids,
+            "status_filter": request.status_filter.value if request.status_filter else None,
+            "compress": request.compress,
+        },
+        task_id=export_id,
+    )
+
+    base_url = f"{settings.api_prefix}/reports/exports/{export_id}"
+    return {
+        "success": True,
+        "export_id": export_id,
+        "status_url": base_url,
+        "download_url": f"{base_url}/download",
+    }
+
+
+def _find_export_file(export_id: str, storage: ExportStorage):
+    """
+    Locate a finished export file, validating the export ID.
+
+    Returns:
+        Tuple of (storage name, size in bytes), or None if not written (yet)
+    """
+    if not EXPORT_ID_PATTERN.match(export_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found")
+
+    for compress in (False, True):
+        name = export_file_name(export_id, compress)
+        size = storage.size(name)
+        if size is not None:
+            return name, size
+    return None
+
+
+# Storage lookups are blocking (object store requests), so the status and
+# download endpoints are sync and run in the threadpool
+@router.get("/exports/{export_id}")
+def get_export_job(
+    export_id: str,
+    _user: User = Depends(require_operations_manager),
+):
+    """
+    Get the status of a background export.
+
+    **Requires:** Operations Manager role
+
+    Args:
+        export_id: Export ID
+
+    Returns:
+        Export status, and file size once ready
+    """
+    found = _find_export_file(export_id, ExportStorage())
+    if found is not None:
+        name, size = found
+        return {
+            "export_id": export_id,
+            "status": "ready",
+            "filename": name.rsplit("/", 1)[-1],
+            "size_bytes": size,
+            "download_url": f"{settings.api_prefix}/reports/exports/{export_id}/download",
+        }
+
+    from celery.result import AsyncResult
+    from src.workers.celery_app import celery_app
+
+    result = AsyncResult(export_id, app=celery_app)
+    return {
+        "export_id": export_id,
+        "status": "failed" if result.failed() else result.status.lower(),
+    }
+
+
+@router.get("/exports/{export_id}/download")
+def download_export(
+    export_id: str,
+    request: Request,
+    _user: User = Depends(require_operations_manager),
+):
+    """
+    Download a finished background export.
+
+    Supports a single ``Range: bytes=start-[end]`` header so interrupted
+    downloads can be resumed.
+
+    **Requires:** Operations Manager role
+
+    Args:
+        export_id: Export ID
+
+    Returns:
+        Export file (206 Partial Content for range requests)
+    """
+    storage = ExportStorage()
+    found = _find_export_file(export_id, storage)
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not ready")
+
+    name, file_size = found
+    start, end = 0, file_size - 1
+    status_code = status.HTTP_200_OK
+
+    range_header = request.headers.get("range")
+    if range_header:
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+        if not match or not (match.group(1) or match.group(2)):
+            raise HTTPException(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        if match.group(1):
+            start = int(match.group(1))
+            if match.group(2):
+                end = min(int(match.group(2)), file_size - 1)
+        else:
+            # Suffix range: last N bytes
+            start = max(file_size - int(match.group(2)), 0)
+        if start > end:
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{file_size}"},
+            )
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+
+    headers = {
+        "Content-Disposition": f"attachment; filename={name.rsplit('/', 1)[-1]}",
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+    }
+    if status_code == status.HTTP_206_PARTIAL_CONTENT:
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+
+    return StreamingResponse(
+        storage.read(name, start, end, chunk_size=DOWNLOAD_CHUNK_SIZE),
+        status_code=status_code,
+        media_type="application/gzip" if name.endswith(".gz") else "text/csv",
+        headers=headers,
+    )
+
+
 @router.post("/schedule")
 async def schedule_recurring_report(
     request: ScheduledReportRequest,
@@ -0,0 +1,298 @@
+"""
+Per-route streaming latency percentiles.
+
+RouteLatencyRecorder is the PerformanceMiddleware observer that keeps one
+LatencySketch per (method, route template, status class) for the current
+minute. A background task adds the bucket counts into Redis hashes, one per
+minute and one per hour:
+
+    tutormax:latency:m:<minute epoch>   field "<series>|<bucket>" -> count
+    tutormax:latency:h:<hour epoch>     same fields, coarser retention
+
+HINCRBY makes the merge across API workers atomic, so a windowed query is a
+pipelined HGETALL over the minutes (or hours) in the window. Without Redis the
+recorder answers from the minutes kept in this process.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import settings
+from .latency_sketch import LatencySketch
+from .performance_middleware import RequestObserver, RequestTiming
+from .redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "tutormax:latency"
+
+# Series key: (method, route template, status class)
+SeriesKey = Tuple[str, str, str]
+
+
+def status_class(status_code: int) -> str:
+    """HTTP status class label, e.g. 404 -> "4xx"."""
+    return f"{status_code // 100}xx"
+
+
+def _series_field(series: SeriesKey) -> str:
+    return " ".join(series)
+
+
+def _parse_series(field: str) -> SeriesKey:
+    method, rest = field.split(" ", 1)
+    route, klass = rest.rsplit(" ", 1)
+    return method, route, klass
+
+
+@dataclass
+class _Resolution:
+    name: str
+    seconds: int
+    ttl_seconds: int
+
+
+class RouteLatencyRecorder(RequestObserver):
+    """
+    Keeps per-route latency sketches and merges them across workers in Redis.
+    """
+
+    def __init__(
+        self,
+        redis_service=None,
+        relative_accuracy: float = 0.01,
+        flush_interval_seconds: float = 10.0,
+        local_retention_minutes: int = 60,
+        minute_retention_hours: int = 3,
+        hour_retention_days: int = 7,
+    ):
+        """
+        Initialize recorder.
+
+        Args:
+            redis_service: RedisService whose client stores merged sketches
+                (None keeps sketches in this process only)
+            relative_accuracy: Sketch relative accuracy
+            flush_interval_seconds: How often sketches are added into Redis
+            local_retention_minutes: Minutes of sketches kept in this process
+            minute_retention_hours: Retention of per-minute sketches in Redis
+            hour_retention_days: Retention of per-hour sketches in Redis
+        """
+        self.redis_service = redis_service
+        self.relative_accuracy = relative_accuracy
+        self.flush_interval_seconds = flush_interval_seconds
+        self.local_retention_minutes = local_retention_minutes
+        self.minute = _Resolution("m", 60, minute_retention_hours * 3600)
+        self.hour = _Resolution("h", 3600, hour_retention_days * 86400)
+
+        # Samples not yet added into Redis: minute epoch -> series -> sketch
+        self._pending: Dict[int, Dict[SeriesKey, LatencySketch]] = {}
+        # Flushed minutes kept for local queries
+        self._local: Dict[int, Dict[SeriesKey, LatencySketch]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+    def _new_sketch(self) -> LatencySketch:
+        return LatencySketch(self.relative_accuracy)
+
+    def request_finished(self, timing: RequestTiming) -> None:
+        if timing.path == "/metrics":
+            return
+        minute = int(time.time()) // 60 * 60
+        series = (timing.method, timing.route, status_class(timing.status_code))
+
+        by_series = self._pending.get(minute)
+        if by_series is None:
+            by_series = self._pending[minute] = {}
+        sketch = by_series.get(series)
+        if sketch is None:
+            sketch = by_series[series] = self._new_sketch()
+        sketch.add(timing.duration_ms)
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    @property
+    def redis(self):
+        service = self.redis_service
+        if service is None or not getattr(service, "_connected", False):
+            return None
+        return service.redis_client
+
+    async def flush(self) -> int:
+        """
+        Add pending sketches into Redis and the local minute history.
+
+        Returns:
+            Number of series-minutes written to Redis (0 without Redis or on failure)
+        """
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        for minute, by_series in pending.items():
+            local = self._local.setdefault(minute, {})
+            for series, sketch in by_series.items():
+                if series in local:
+                    local[series].merge(sketch)
+                else:
+                    local[series] = sketch
+        cutoff = int(time.time()) // 60 * 60 - self.local_retention_minutes * 60
+        for minute in [m for m in self._local if m < cutoff]:
+            del self._local[minute]
+
+        client = self.redis
+        if client is None:
+            return 0
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for minute, by_series in pending.items():
+                for resolution in (self.minute, self.hour):
+                    slot = minute // resolution.seconds * resolution.seconds
+                    key = f"{KEY_PREFIX}:{resolution.name}:{slot}"
+                    for series, sketch in by_series.items():
+                        field = _series_field(series)
+                        if sketch.zero_count:
+                            pipe.hincrby(key, f"{field}|z", sketch.zero_count)
+                        for bucket, count in sketch.bins.items():
+                            pipe.hincrby(key, f"{field}|{bucket}", count)
+                        pipe.hincrbyfloat(key, f"{field}|sum", sketch.sum)
+                    pipe.expire(key, resolution.ttl_seconds)
+            await pipe.execute()
+            return sum(len(by_series) for by_series in pending.values())
+        except Exception as e:
+            logger.error(f"Failed to flush latency sketches to Redis: {e}")
+            return 0
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush task."""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush task and write remaining sketches."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _merge_local(self, window_minutes: int) -> Dict[SeriesKey, LatencySketch]:
+        since = int(time.time()) // 60 * 60 - (window_minutes - 1) * 60
+        merged: Dict[SeriesKey, LatencySketch] = defaultdict(self._new_sketch)
+        for history in (self._local, self._pending):
+            for minute, by_series in history.items():
+                if minute < since:
+                    continue
+                for series, sketch in by_series.items():
+                    merged[series].merge(sketch)
+        return dict(merged)
+
+    async def _merge_redis(self, client, window_minutes: int) -> Dict[SeriesKey, LatencySketch]:
+        now = int(time.time())
+        # Minute keys while they are retained, hour keys for longer windows
+        resolution = self.minute if window_minutes * 60 <= self.minute.ttl_seconds else self.hour
+        step = resolution.seconds
+        last = now // step * step
+        slots = max(1, math.ceil(window_minutes * 60 / step))
+
+        pipe = client.pipeline(transaction=False)
+        for i in range(slots):
+            pipe.hgetall(f"{KEY_PREFIX}:{resolution.name}:{last - i * step}")
+        hashes = await pipe.execute()
+
+        merged: Dict[SeriesKey, LatencySketch] = defaultdict(self._new_sketch)
+        for fields in hashes:
+            for name, value in fields.items():
+                field, bucket = name.rsplit("|", 1)
+                sketch = merged[_parse_series(field)]
+                if bucket == "sum":
+                    sketch.sum += float(value)
+                else:
+                    sketch.add_bucket(None if bucket == "z" else int(bucket), int(value))
+        return dict(merged)
+
+    async def merged_sketches(
+        self,
+        window_minutes: int = 5,
+    ) -> Tuple[Dict[SeriesKey, LatencySketch], str]:
+        """
+        Sketches per series over the last window_minutes.
+
+        Returns:
+            (sketches by (method, route, status class), source) where source is
+            "redis" (all workers) or "local" (this process only)
+        """
+        client = self.redis
+        if client is not None:
+            try:
+                return await self._merge_redis(client, window_minutes), "redis"
+            except Exception as e:
+                logger.error(f"Failed to read latency sketches from Redis: {e}")
+        return self._merge_local(window_minutes), "local"
+
+    async def route_summary(
+        self,
+        window_minutes: int = 5,
+        route: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Latency percentiles per route and status class over a time window.
+
+        Args:
+            window_minutes: Window length in minutes
+            route: Only include this route template
+            status: Only include this status class (e.g. "5xx")
+
+        Returns:
+            Window, data source, per-series summaries (slowest p99 first) and
+            request counts per status class
+        """
+        sketches, source = await self.merged_sketches(window_minutes)
+        routes: List[Dict[str, Any]] = []
+        status_codes: Dict[str, int] = defaultdict(int)
+        for (method, route_template, klass), sketch in sketches.items():
+            if route is not None and route_template != route:
+                continue
+            status_codes[klass] += sketch.count
+            if status is not None and klass != status:
+                continue
+            routes.append({
+                "method": method,
+                "route": route_template,
+                "status_class": klass,
+                **sketch.summary(),
+            })
+        routes.sort(key=lambda r: r.get("p99_ms", 0), reverse=True)
+        return {
+            "window_minutes": window_minutes,
+            "source": source,
+            "relative_accuracy": self.relative_accuracy,
+            "routes": routes,
+            "status_codes": dict(status_codes),
+        }
+
+
+route_latency_recorder = RouteLatencyRecorder(
+    redis_service,
+    relative_accuracy=settings.latency_sketch_accuracy,
+)
@@ -14,7 +14,7 @@ Provides comprehensive security features including:
 """
 
 from .rate_limiter import rate_limiter, RateLimiter, RateLimitConfig
-from .security_headers import SecurityHeadersMiddleware
+from .security_headers import SecurityHeaders, SecurityHeadersMiddleware
 from .csrf import csrf_protect, CSRFProtect, generate_csrf_token
 from .input_sanitizer import (
     sanitize_input,
@@ -51,6 +51,7 @@ __all__ = [
     'RateLimiter',
     'RateLimitConfig',
     # Security headers
+    'SecurityHeaders',
     'SecurityHeadersMiddleware',
     # CSRF protection
     'csrf_protect',
@@ -1,19 +1,25 @@
 """
 Data Encryption & Privacy Module
 
-Provides AES-256 encryption for PII fields, data anonymization for analytics,
-and utilities for FERPA, COPPA, and GDPR compliance.
+Provides AES-256 encryption for PII fields (with key rotation and blind
+indexes for equality lookups), data anonymization for analytics, and
+utilities for FERPA, COPPA, and GDPR compliance.
 
 Task: 14.6 - Data Encryption & Privacy Measures
 """
 
 import base64
 import hashlib
+import hmac
+import os
 import secrets
 import re
-from typing import Optional, Union
-from cryptography.fernet import Fernet
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Union
+from cryptography.fernet import Fernet, MultiFernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
 
@@ -23,26 +29,71 @@ from ..config import settings
 class EncryptionService:
     """
     Service for encrypting and decrypting sensitive PII data.
-    Uses AES-256 encryption via Fernet (symmetric encryption).
+
+    New values are encrypted with AES-256-GCM under the primary key and stored
+    as "$g1$<key_id>$<base64(nonce + ciphertext)>", so ciphertexts written
+    under retired keys stay readable after a rotation. Values written as
+    Fernet tokens by earlier versions are still decrypted.
+
+    Derived keys and cipher objects are built once per service; use
+    encrypt_many/decrypt_many for result sets.
     """
 
-    def __init__(self, encryption_key: Optional[bytes] = None):
+    ENVELOPE_PREFIX = "$g1$"
+    NONCE_SIZE = 12
+
+    def __init__(
+        self,
+        encryption_key: Optional[bytes] = None,
+        key_id: Optional[str] = None,
+        retired_keys: Optional[Dict[str, bytes]] = None,
+        blind_index_key: Optional[bytes] = None,
+    ):
         """
         Initialize encryption service with a key.
 
         Args:
-            encryption_key: Base64-encoded Fernet key. If None, derives from settings.
+            encryption_key: Base64-encoded 32-byte key (a Fernet key). If None,
+                uses settings.encryption_key or derives one from settings.secret_key.
+            key_id: ID of the primary key (defaults to settings.encryption_key_id)
+            retired_keys: Decrypt-only keys by ID (defaults to
+                settings.encryption_retired_keys)
+            blind_index_key: Base64-encoded key for blind indexes (defaults to
+                settings.blind_index_key, else derived from the primary key)
         """
         if encryption_key is None:
-            encryption_key = self._derive_key_from_secret(settings.secret_key)
-
-        self.fernet = Fernet(encryption_key)
+            encryption_key = (
+                settings.encryption_key.encode() if settings.encryption_key
+                else self._derive_key_from_secret(settings.secret_key)
+            )
+        if key_id is None:
+            key_id = settings.encryption_key_id
+        if retired_keys is None:
+            retired_keys = self._parse_retired_keys(settings.encryption_retired_keys)
+        if blind_index_key is None and settings.blind_index_key:
+            blind_index_key = settings.blind_index_key.encode()
+
+        # Legacy Fernet tokens were written with the primary key material,
+        # which is a retired key once the key has been rotated
+        self.fernet = MultiFernet([Fernet(key) for key in (encryption_key, *retired_keys.values())])
+
+        self.key_id = key_id
+        self._ciphers: Dict[str, AESGCM] = {
+            kid: AESGCM(self._subkey(key, b"tutormax-field-encryption-v1"))
+            for kid, key in {**retired_keys, key_id: encryption_key}.items()
+        }
+        self._primary = self._ciphers[key_id]
+        self._blind_index_key = self._subkey(blind_index_key or encryption_key, b"tutormax-blind-index-v1")
 
     @staticmethod
+    @lru_cache(maxsize=8)
     def _derive_key_from_secret(secret: str) -> bytes:
         """
         Derive a Fernet key from the application secret key using PBKDF2.
 
+        Cached, since PBKDF2 is deliberately slow and every service instance
+        (API process, Celery worker, tests) derives the same key.
+
         Args:
             secret: Application secret key
 
@@ -65,28 +116,65 @@ class EncryptionService:
         key = kdf.derive(secret.encode())
         return base64.urlsafe_b64encode(key)
 
+    @staticmethod
+    def _subkey(key: bytes, purpose: bytes) -> bytes:
+        """Derive a 32-byte key for one purpose from base64-encoded key material."""
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=purpose,
+        ).derive(base64.urlsafe_b64decode(key))
+
+    @staticmethod
+    def _parse_retired_keys(value: str) -> Dict[str, bytes]:
+        """Parse "key_id:base64-key,..." into a key map."""
+        keys = {}
+        for entry in filter(None, (part.strip() for part in value.split(","))):
+            kid, _, key = entry.partition(":")
+            keys[kid] = key.encode()
+        return keys
+
     def encrypt(self, plaintext: str) -> str:
         """
-        Encrypt a string using AES-256.
+        Encrypt a string using AES-256-GCM under the primary key.
 
         Args:
             plaintext: Data to encrypt
 
         Returns:
-            Base64-encoded encrypted string
+            Encrypted envelope string
         """
         if not plaintext:
             return plaintext
 
-        encrypted = self.fernet.encrypt(plaintext.encode())
-        return encrypted.decode()
+        return self._seal(plaintext, os.urandom(self.NONCE_SIZE))
+
+    def _seal(self, plaintext: str, nonce: bytes) -> str:
+        aad = self.key_id.encode()
+        sealed = nonce + self._primary.encrypt(nonce, plaintext.encode(), aad)
+        return f"{self.ENVELOPE_PREFIX}{self.key_id}${base64.urlsafe_b64encode(sealed).decode()}"
+
+    def encrypt_many(self, values: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Encrypt a batch of values (empty values are returned unchanged).
+
+        Nonces for the whole batch come from a single os.urandom call.
+        """
+        values = list(values)
+        nonces = os.urandom(self.NONCE_SIZE * len(values))
+        size = self.NONCE_SIZE
+        return [
+            self._seal(value, nonces[i * size:(i + 1) * size]) if value else value
+            for i, value in enumerate(values)
+        ]
 
     def decrypt(self, ciphertext: str) -> str:
         """
-        Decrypt an AES-256 encrypted string.
+        Decrypt an encrypted string.
 
         Args:
-            ciphertext: Encrypted data (base64-encoded)
+            ciphertext: AES-GCM envelope or legacy Fernet token
 
         Returns:
             Decrypted plaintext string
@@ -95,12 +183,96 @@ class EncryptionService:
             return ciphertext
 
         try:
-            decrypted = self.fernet.decrypt(ciphertext.encode())
-            return decrypted.decode()
+            return self._open(ciphertext)
         except Exception:
             # If decryption fails, return as-is (might not be encrypted)
             return ciphertext
 
+    def _open(self, ciphertext: str) -> str:
+        """Decrypt an envelope or Fernet token, raising if no configured key opens it."""
+        if ciphertext.startswith(self.ENVELOPE_PREFIX):
+            kid, _, payload = ciphertext[len(self.ENVELOPE_PREFIX):].partition("$")
+            sealed = base64.urlsafe_b64decode(payload)
+            nonce, body = sealed[:self.NONCE_SIZE], sealed[self.NONCE_SIZE:]
+            return self._ciphers[kid].decrypt(nonce, body, kid.encode()).decode()
+
+        return self.fernet.decrypt(ciphertext.encode()).decode()
+
+    def decrypt_many(self, values: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Decrypt a batch of values (empty values are returned unchanged).
+
+        Repeated ciphertexts in the batch are decrypted once.
+        """
+        decrypted: Dict[str, str] = {}
+        results = []
+        for value in values:
+            if value:
+                plaintext = decrypted.get(value)
+                if plaintext is None:
+                    plaintext = decrypted[value] = self.decrypt(value)
+                value = plaintext
+            results.append(value)
+        return results
+
+    def key_id_of(self, ciphertext: Optional[str]) -> Optional[str]:
+        """Key ID a value was encrypted under (None for legacy Fernet tokens)."""
+        if not ciphertext or not ciphertext.startswith(self.ENVELOPE_PREFIX):
+            return None
+        return ciphertext[len(self.ENVELOPE_PREFIX):].partition("$")[0]
+
+    def needs_rotation(self, ciphertext: Optional[str]) -> bool:
+        """True if a stored value is not encrypted under the primary key."""
+        return bool(ciphertext) and self.key_id_of(ciphertext) != self.key_id
+
+    def rotate(self, ciphertext: str) -> str:
+        """
+        Re-encrypt a stored value under the primary key if needed.
+
+        Args:
+            ciphertext: Stored value (any known key, or legacy Fernet token)
+
+        Returns:
+            Value encrypted under the primary key
+
+        Raises:
+            ValueError: If no configured key decrypts the value. It is never
+                re-encrypted as if it were plaintext.
+        """
+        if not self.needs_rotation(ciphertext):
+            return ciphertext
+
+        try:
+            plaintext = self._open(ciphertext)
+        except Exception as e:
+            key_id = self.key_id_of(ciphertext) or "legacy Fernet"
+            raise ValueError(
+                f"Cannot rotate value encrypted under key {key_id!r}: "
+                f"add the key to ENCRYPTION_RETIRED_KEYS"
+            ) from e
+        if plaintext == ciphertext:
+            raise ValueError("Cannot rotate value: decryption returned the ciphertext unchanged")
+        return self.encrypt(plaintext)
+
+    def blind_index(self, value: Optional[str]) -> Optional[str]:
+        """
+        Deterministic keyed hash for equality lookups on encrypted values.
+
+        Case-insensitive and ignores surrounding whitespace, so it suits
+        emails and phone numbers. Unlike anonymization_service.hash_for_analytics,
+        it is an HMAC under a dedicated key.
+
+        Args:
+            value: Plaintext value
+
+        Returns:
+            64-character hex digest, or None for empty values
+        """
+        if not value:
+            return None
+        normalized = value.strip().lower().encode()
+        return hmac.new(self._blind_index_key, normalized, hashlib.sha256).hexdigest()
+
     def encrypt_email(self, email: str) -> str:
         """Encrypt email address for storage."""
         return self.encrypt(email)
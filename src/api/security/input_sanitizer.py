@@ -3,6 +3,12 @@ Input sanitization and validation utilities.
 
 Provides functions to sanitize user input, prevent XSS attacks,
 and validate against SQL injection attempts.
+
+Before any regex runs, a string is screened for literal markers that every
+pattern in a list needs (for example "=" or "select" for SQL, "<" or ":" for
+XSS), using plain substring tests. Only the rare strings containing a marker
+are scanned with the individual patterns, so typical payload values cost a
+few substring checks instead of one regex pass per pattern.
 """
 
 import re
@@ -51,6 +57,29 @@ XSS_PATTERNS = [
 
 COMPILED_XSS_PATTERNS = [re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in XSS_PATTERNS]
 
+# Every SQL pattern contains one of these (case-insensitively); keep in sync
+# with SQL_INJECTION_PATTERNS
+SQL_MARKERS = ("=", "--", "union", "select", "insert", "update", "delete", "drop", "exec")
+
+# Every XSS pattern contains one of these characters; keep in sync with XSS_PATTERNS
+XSS_MARKERS = ("<", ":", "=", "(")
+
+
+def _may_contain_sql(text: str) -> bool:
+    """False only if no SQL injection pattern can match text."""
+    if text.isalnum() and text.isascii():
+        return False
+    if not text.isascii():
+        # Unicode case folding (e.g. "ſ" matching "s") defeats substring tests
+        return True
+    lowered = text.lower()
+    return any(marker in lowered for marker in SQL_MARKERS)
+
+
+def _may_contain_xss(text: str) -> bool:
+    """False only if no XSS pattern can match text."""
+    return any(marker in text for marker in XSS_MARKERS)
+
 
 def sanitize_html(text: str, allow_basic_formatting: bool = False) -> str:
     """
@@ -92,6 +121,11 @@ def remove_xss_patterns(text: str) -> str:
     if not isinstance(text, str):
         return text
 
+    if not _may_contain_xss(text):
+        return text
+
+    # Remove pattern by pattern, so removals that expose a new match of a
+    # later pattern are still caught
     sanitized = text
     for pattern in COMPILED_XSS_PATTERNS:
         sanitized = pattern.sub('', sanitized)
@@ -116,6 +150,9 @@ def validate_no_sql_injection(text: str, raise_on_suspicious: bool = True) -> bo
     if not isinstance(text, str):
         return True
 
+    if not _may_contain_sql(text):
+        return True
+
     # Check against SQL injection patterns
     for pattern in COMPILED_SQL_PATTERNS:
         match = pattern.search(text)
@@ -179,6 +216,43 @@ def sanitize_string(
     return sanitized
 
 
+def _sanitize_container(
+    data: Union[Dict[str, Any], List[Any]],
+    max_string_length: Optional[int],
+    check_sql_injection: bool,
+) -> Union[Dict[str, Any], List[Any]]:
+    """
+    Sanitize all string values in a nested dict/list payload.
+
+    Walks the payload with an explicit stack, so deeply nested bulk bodies
+    cannot hit the recursion limit.
+    """
+    root = {} if isinstance(data, dict) else []
+    stack = [(data, root)]
+
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, value in items:
+            if isinstance(value, str):
+                value = sanitize_string(
+                    value,
+                    max_length=max_string_length,
+                    check_sql_injection=check_sql_injection,
+                )
+            elif isinstance(value, (dict, list)):
+                child = {} if isinstance(value, dict) else []
+                stack.append((value, child))
+                value = child
+
+            if isinstance(target, dict):
+                target[key] = value
+            else:
+                target.append(value)
+
+    return root
+
+
 def sanitize_dict(
     data: Dict[str, Any],
     max_string_length: Optional[int] = 10000,
@@ -198,22 +272,7 @@ def sanitize_dict(
     if not isinstance(data, dict):
         return data
 
-    sanitized = {}
-    for key, value in data.items():
-        if isinstance(value, str):
-            sanitized[key] = sanitize_string(
-                value,
-                max_length=max_string_length,
-                check_sql_injection=check_sql_injection,
-            )
-        elif isinstance(value, dict):
-            sanitized[key] = sanitize_dict(value, max_string_length, check_sql_injection)
-        elif isinstance(value, list):
-            sanitized[key] = sanitize_list(value, max_string_length, check_sql_injection)
-        else:
-            sanitized[key] = value
-
-    return sanitized
+    return _sanitize_container(data, max_string_length, check_sql_injection)
 
 
 def sanitize_list(
@@ -235,24 +294,7 @@ def sanitize_list(
     if not isinstance(data, list):
         return data
 
-    sanitized = []
-    for item in data:
-        if isinstance(item, str):
-            sanitized.append(
-                sanitize_string(
-                    item,
-                    max_length=max_string_length,
-                    check_sql_injection=check_sql_injection,
-                )
-            )
-        elif isinstance(item, dict):
-            sanitized.append(sanitize_dict(item, max_string_length, check_sql_injection))
-        elif isinstance(item, list):
-            sanitized.append(sanitize_list(item, max_string_length, check_sql_injection))
-        else:
-            sanitized.append(item)
-
-    return sanitized
+    return _sanitize_container(data, max_string_length, check_sql_injection)
 
 
 def sanitize_input(
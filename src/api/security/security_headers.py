@@ -9,21 +9,24 @@ Implements security headers following OWASP recommendations:
 - Strict-Transport-Security (HSTS)
 - Referrer-Policy
 - Permissions-Policy
+
+SecurityHeaders is applied at http.response.start, either by
+PerformanceMiddleware's request pipeline or by the standalone
+SecurityHeadersMiddleware.
 """
 
 import logging
-from typing import Callable
+from typing import List, Tuple
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeaders:
     """
-    Middleware that adds security headers to all responses.
+    Security headers added to all responses.
 
     Configurable security headers to prevent XSS, clickjacking,
     and other common web vulnerabilities.
@@ -31,7 +34,6 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app: ASGIApp,
         csp_policy: str = None,
         hsts_max_age: int = 31536000,  # 1 year
         hsts_include_subdomains: bool = True,
@@ -43,10 +45,9 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         permissions_policy: str = None,
     ):
         """
-        Initialize security headers middleware.
+        Initialize security headers.
 
         Args:
-            app: ASGI application
             csp_policy: Content Security Policy directive
             hsts_max_age: HSTS max-age in seconds
             hsts_include_subdomains: Include subdomains in HSTS
@@ -57,8 +58,6 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             referrer_policy: Referrer-Policy value
             permissions_policy: Permissions-Policy value
         """
-        super().__init__(app)
-
         # Content Security Policy
         # Default CSP that balances security and functionality
         self.csp_policy = csp_policy or (
@@ -99,39 +98,67 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "accelerometer=()"
         )
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        # Header values are fixed, so build them once
+        self.headers: List[Tuple[str, str]] = [
+            ("Content-Security-Policy", self.csp_policy),
+            ("X-Content-Type-Options", self.content_type_options),
+            ("X-Frame-Options", self.frame_options),
+            ("X-XSS-Protection", self.xss_protection),
+            ("Referrer-Policy", self.referrer_policy),
+            ("Permissions-Policy", self.permissions_policy),
+            # Additional security headers
+            ("X-Permitted-Cross-Domain-Policies", "none"),
+            ("Cross-Origin-Embedder-Policy", "require-corp"),
+            ("Cross-Origin-Opener-Policy", "same-origin"),
+            ("Cross-Origin-Resource-Policy", "same-origin"),
+        ]
+
+    def apply(self, headers: MutableHeaders, scheme: str) -> None:
         """
-        Process request and add security headers to response.
+        Add security headers to a response.
 
         Args:
-            request: Incoming request
-            call_next: Next middleware or endpoint handler
+            headers: Mutable headers of the http.response.start message
+            scheme: Request URL scheme
+        """
+        for name, value in self.headers:
+            headers[name] = value
 
-        Returns:
-            Response with security headers added
+        # Add HSTS only for HTTPS connections
+        if scheme == "https":
+            headers["Strict-Transport-Security"] = self.hsts_header
+
+
+class SecurityHeadersMiddleware:
+    """
+    Standalone pure-ASGI middleware that adds security headers to all responses.
+
+    Apps that already use PerformanceMiddleware should pass SecurityHeaders to
+    it instead of stacking this middleware.
+    """
+
+    def __init__(self, app: ASGIApp, **kwargs):
         """
-        # Process request
-        response = await call_next(request)
+        Initialize security headers middleware.
 
-        # Add security headers
-        response.headers["Content-Security-Policy"] = self.csp_policy
-        response.headers["X-Content-Type-Options"] = self.content_type_options
-        response.headers["X-Frame-Options"] = self.frame_options
-        response.headers["X-XSS-Protection"] = self.xss_protection
-        response.headers["Referrer-Policy"] = self.referrer_policy
-        response.headers["Permissions-Policy"] = self.permissions_policy
+        Args:
+            app: ASGI application
+            **kwargs: Passed to SecurityHeaders()
+        """
+        self.app = app
+        self.security_headers = SecurityHeaders(**kwargs)
 
-        # Add HSTS only for HTTPS connections
-        if request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = self.hsts_header
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Add additional security headers
-        response.headers["X-Permitted-Cross-Domain-Policies"] = "none"
-        response.headers["Cross-Origin-Embedder-Policy"] = "require-corp"
-        response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-        response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self.security_headers.apply(MutableHeaders(scope=message), scope.get("scheme", "http"))
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_wrapper)
 
 
 def get_security_headers_middleware(
@@ -6,20 +6,126 @@ Tracks and calculates SLA metrics for the TutorMax system:
 - API Response Times: p50, p95, p99 percentiles
 - System Uptime: Overall system availability (>99.5% target)
 - Data Processing Latency: Time to process incoming data
+
+API response times are stored as per-endpoint latency histograms in minute
+and hour buckets (sla_latency_histograms), upsert-accumulated on every
+flush. Percentiles and compliance come from one grouped query over the
+bucket sums; raw sla_metrics rows are only written for SLA violations.
 """
 
+import asyncio
+import bisect
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-from sqlalchemy import select, func, and_, or_
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from sqlalchemy import select, func, and_, or_, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 import statistics
 
 from src.database.database import get_db_session
-from src.database.models import SLAMetric, Session, TutorPerformanceMetric
+from src.database.models import SLALatencyHistogram, SLAMetric, Session, TutorPerformanceMetric
+from src.api.performance_middleware import RequestObserver, RequestTiming
+from src.api.time_buckets import HOUR_BUCKET, MINUTE_BUCKET, bucket_start, rollup_ranges
 
 logger = logging.getLogger(__name__)
 
+# Histogram upper bounds (exclusive, ms): a bucket holds values below its
+# bound, matching the "< target" SLA rule. The SLA targets are bucket edges,
+# so compliance counts are exact. Values from the last bound up go to +inf.
+LATENCY_BUCKETS_MS = (
+    5, 10, 25, 50, 75, 100, 150, 200, 300, 400, 500,
+    750, 1000, 1500, 2500, 5000, 10000,
+)
+
+# Retention for compaction (minute histograms must be kept for at least an hour)
+MINUTE_HISTOGRAM_RETENTION = timedelta(days=7)
+HOUR_HISTOGRAM_RETENTION = timedelta(days=400)
+
+
+def latency_bucket(response_time_ms: float) -> float:
+    """Upper bound of the histogram bucket containing a response time."""
+    index = bisect.bisect_right(LATENCY_BUCKETS_MS, response_time_ms)
+    return float(LATENCY_BUCKETS_MS[index]) if index < len(LATENCY_BUCKETS_MS) else math.inf
+
+
+def build_histogram_rows(samples: Iterable["APIResponseSample"]) -> List[Dict[str, Any]]:
+    """
+    Aggregate response time samples into minute and hour histogram rows.
+
+    Args:
+        samples: Response time samples
+
+    Returns:
+        One row per (endpoint, bucket size, bucket start, le) for upserting,
+        sorted by that key so concurrent upserts lock rows in the same order
+    """
+    rows: Dict[Tuple[str, str, datetime, float], Dict[str, Any]] = {}
+
+    for sample in samples:
+        value = sample.response_time_ms
+        le = latency_bucket(value)
+        for size in (MINUTE_BUCKET, HOUR_BUCKET):
+            key = (sample.endpoint, size, bucket_start(sample.recorded_at, size), le)
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {
+                    "endpoint": key[0],
+                    "bucket_size": size,
+                    "bucket_start": key[2],
+                    "le_ms": le,
+                    "sample_count": 0,
+                    "sum_ms": 0.0,
+                    "min_ms": value,
+                    "max_ms": value,
+                }
+            row["sample_count"] += 1
+            row["sum_ms"] += value
+            row["min_ms"] = min(row["min_ms"], value)
+            row["max_ms"] = max(row["max_ms"], value)
+
+    return [rows[key] for key in sorted(rows)]
+
+
+def histogram_quantile(
+    q: float,
+    buckets: Sequence[Tuple[float, int]],
+    min_ms: float,
+    max_ms: float,
+) -> float:
+    """
+    Estimate a quantile from histogram bucket counts.
+
+    Interpolates linearly inside the bucket holding the quantile rank, like
+    Prometheus histogram_quantile, and clamps to the observed min and max.
+
+    Args:
+        q: Quantile (0-1)
+        buckets: (upper bound, count) pairs sorted by upper bound
+        min_ms: Smallest observed value
+        max_ms: Largest observed value
+
+    Returns:
+        Estimated value in milliseconds (0 if there are no samples)
+    """
+    total = sum(count for _, count in buckets)
+    if total == 0:
+        return 0.0
+
+    rank = q * total
+    seen = 0
+    lower = 0.0
+    for le, count in buckets:
+        if count and seen + count >= rank:
+            upper = max_ms if math.isinf(le) else le
+            value = lower + (upper - lower) * (rank - seen) / count
+            return min(max(value, min_ms), max_ms)
+        seen += count
+        lower = le
+    return max_ms
+
 
 class SLATrackingService:
     """
@@ -172,21 +278,15 @@ class SLATrackingService:
         Returns:
             Tracking result
         """
-        # Determine if it meets SLA based on p95/p99 targets
-        # For individual requests, we just record; aggregation determines SLA compliance
+        # Individual requests are histogram samples; aggregation determines SLA compliance
         meets_sla = response_time_ms < self.API_P95_TARGET_MS
 
-        await self.record_sla_metric(
-            metric_name=f"api_response_time_{endpoint}",
-            metric_value=response_time_ms,
-            metric_unit="milliseconds",
-            threshold=self.API_P95_TARGET_MS,
-            meets_sla=meets_sla,
-            details={
-                "endpoint": endpoint,
-                "status_code": status_code,
-            }
-        )
+        await self.record_api_response_times([APIResponseSample(
+            endpoint=endpoint,
+            response_time_ms=response_time_ms,
+            status_code=status_code,
+            recorded_at=datetime.now(timezone.utc),
+        )])
 
         return {
             "endpoint": endpoint,
@@ -195,6 +295,55 @@ class SLATrackingService:
             "meets_sla": meets_sla,
         }
 
+    async def record_api_response_times(self, samples: Sequence["APIResponseSample"]) -> int:
+        """
+        Record many API response times in one transaction.
+
+        Samples are added to the minute and hour latency histograms; only
+        SLA violations are also stored as raw sla_metrics rows.
+
+        Args:
+            samples: Response time samples
+
+        Returns:
+            Number of samples recorded
+        """
+        if not samples:
+            return 0
+
+        async with get_db_session() as session:
+            session.add_all([
+                SLAMetric(
+                    metric_name=f"api_response_time_{sample.endpoint}",
+                    metric_value=sample.response_time_ms,
+                    metric_unit="milliseconds",
+                    threshold=self.API_P95_TARGET_MS,
+                    meets_sla=False,
+                    details={
+                        "endpoint": sample.endpoint,
+                        "status_code": sample.status_code,
+                    },
+                    recorded_at=sample.recorded_at,
+                )
+                for sample in samples
+                if sample.response_time_ms >= self.API_P95_TARGET_MS
+            ])
+
+            stmt = pg_insert(SLALatencyHistogram).values(build_histogram_rows(samples))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["endpoint", "bucket_size", "bucket_start", "le_ms"],
+                set_={
+                    "sample_count": SLALatencyHistogram.sample_count + stmt.excluded.sample_count,
+                    "sum_ms": SLALatencyHistogram.sum_ms + stmt.excluded.sum_ms,
+                    "min_ms": func.least(SLALatencyHistogram.min_ms, stmt.excluded.min_ms),
+                    "max_ms": func.greatest(SLALatencyHistogram.max_ms, stmt.excluded.max_ms),
+                },
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+        return len(samples)
+
     async def calculate_api_response_time_stats(
         self,
         endpoint: Optional[str] = None,
@@ -203,6 +352,10 @@ class SLATrackingService:
         """
         Calculate API response time statistics.
 
+        Reads the latency histograms with one query grouped by bucket bound:
+        whole hours from hour buckets, the edges of the window from minute
+        buckets.
+
         Args:
             endpoint: Specific endpoint to analyze (None for all)
             hours: Number of hours to analyze
@@ -210,59 +363,134 @@ class SLATrackingService:
         Returns:
             Response time statistics with p50, p95, p99
         """
-        end_time = datetime.utcnow()
+        end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours)
-
-        async with get_db_session() as session:
-            query = select(SLAMetric).where(
+        ranges = rollup_ranges(start_time, end_time, end_time - MINUTE_HISTOGRAM_RETENTION)
+
+        query = select(
+            SLALatencyHistogram.le_ms,
+            func.sum(SLALatencyHistogram.sample_count),
+            func.sum(SLALatencyHistogram.sum_ms),
+            func.min(SLALatencyHistogram.min_ms),
+            func.max(SLALatencyHistogram.max_ms),
+        ).where(
+            or_(*[
                 and_(
-                    SLAMetric.metric_name.like("api_response_time_%"),
-                    SLAMetric.recorded_at >= start_time,
-                    SLAMetric.recorded_at <= end_time,
+                    SLALatencyHistogram.bucket_size == size,
+                    SLALatencyHistogram.bucket_start >= range_start,
+                    SLALatencyHistogram.bucket_start < range_end,
                 )
-            )
+                for size, range_start, range_end in ranges
+            ])
+        ).group_by(SLALatencyHistogram.le_ms).order_by(SLALatencyHistogram.le_ms)
 
-            if endpoint:
-                query = query.where(SLAMetric.metric_name == f"api_response_time_{endpoint}")
+        if endpoint:
+            query = query.where(SLALatencyHistogram.endpoint == endpoint)
 
+        async with get_db_session() as session:
             result = await session.execute(query)
-            metrics = result.scalars().all()
-
-            if not metrics:
-                return {
-                    "period_hours": hours,
-                    "endpoint": endpoint or "all",
-                    "sample_count": 0,
-                    "p50_ms": 0,
-                    "p95_ms": 0,
-                    "p99_ms": 0,
-                    "average_ms": 0,
-                    "meets_p95_sla": True,
-                    "meets_p99_sla": True,
-                }
-
-            response_times = [m.metric_value for m in metrics]
+            rows = result.all()
 
-            p50 = statistics.median(response_times)
-            p95 = statistics.quantiles(response_times, n=20)[18] if len(response_times) > 1 else response_times[0]
-            p99 = statistics.quantiles(response_times, n=100)[98] if len(response_times) > 1 else response_times[0]
+        buckets = [(float(row[0]), int(row[1] or 0)) for row in rows]
+        sample_count = sum(count for _, count in buckets)
 
+        if sample_count == 0:
             return {
                 "period_hours": hours,
                 "endpoint": endpoint or "all",
-                "sample_count": len(metrics),
-                "p50_ms": round(p50, 2),
-                "p95_ms": round(p95, 2),
-                "p99_ms": round(p99, 2),
-                "average_ms": round(statistics.mean(response_times), 2),
-                "min_ms": round(min(response_times), 2),
-                "max_ms": round(max(response_times), 2),
-                "meets_p95_sla": p95 < self.API_P95_TARGET_MS,
-                "meets_p99_sla": p99 < self.API_P99_TARGET_MS,
-                "p95_target_ms": self.API_P95_TARGET_MS,
-                "p99_target_ms": self.API_P99_TARGET_MS,
+                "sample_count": 0,
+                "p50_ms": 0,
+                "p95_ms": 0,
+                "p99_ms": 0,
+                "average_ms": 0,
+                "meets_p95_sla": True,
+                "meets_p99_sla": True,
             }
 
+        total_ms = sum(float(row[2] or 0) for row in rows)
+        min_ms = min(float(row[3]) for row in rows if row[1])
+        max_ms = max(float(row[4]) for row in rows if row[1])
+
+        p50, p95, p99 = (
+            histogram_quantile(q, buckets, min_ms, max_ms) for q in (0.50, 0.95, 0.99)
+        )
+        within_target = sum(count for le, count in buckets if le <= self.API_P95_TARGET_MS)
+
+        return {
+            "period_hours": hours,
+            "endpoint": endpoint or "all",
+            "sample_count": sample_count,
+            "p50_ms": round(p50, 2),
+            "p95_ms": round(p95, 2),
+            "p99_ms": round(p99, 2),
+            "average_ms": round(total_ms / sample_count, 2),
+            "min_ms": round(min_ms, 2),
+            "max_ms": round(max_ms, 2),
+            "meets_p95_sla": p95 < self.API_P95_TARGET_MS,
+            "meets_p99_sla": p99 < self.API_P99_TARGET_MS,
+            "p95_target_ms": self.API_P95_TARGET_MS,
+            "p99_target_ms": self.API_P99_TARGET_MS,
+            "within_p95_target_percentage": round(within_target / sample_count * 100, 2),
+        }
+
+    async def compact_api_response_times(
+        self,
+        violation_retention_days: int = 30,
+    ) -> Dict[str, int]:
+        """
+        Compact API response time data.
+
+        Non-violating raw rows (written before histograms existed) are
+        already counted in the histograms and are dropped. Violations are
+        kept for ``violation_retention_days``. Minute and hour histograms are
+        pruned after their own retention periods.
+
+        Args:
+            violation_retention_days: Days to keep raw violation rows
+
+        Returns:
+            Number of rows deleted per category
+        """
+        now = datetime.now(timezone.utc)
+        is_api_metric = SLAMetric.metric_name.startswith("api_response_time_", autoescape=True)
+
+        async with get_db_session() as session:
+            raw = await session.execute(
+                delete(SLAMetric).where(and_(is_api_metric, SLAMetric.meets_sla.is_(True)))
+            )
+            violations = await session.execute(
+                delete(SLAMetric).where(
+                    and_(
+                        is_api_metric,
+                        SLAMetric.recorded_at < now - timedelta(days=violation_retention_days),
+                    )
+                )
+            )
+            minute_histograms = await session.execute(
+                delete(SLALatencyHistogram).where(
+                    and_(
+                        SLALatencyHistogram.bucket_size == MINUTE_BUCKET,
+                        SLALatencyHistogram.bucket_start < now - MINUTE_HISTOGRAM_RETENTION,
+                    )
+                )
+            )
+            hour_histograms = await session.execute(
+                delete(SLALatencyHistogram).where(
+                    and_(
+                        SLALatencyHistogram.bucket_size == HOUR_BUCKET,
+                        SLALatencyHistogram.bucket_start < now - HOUR_HISTOGRAM_RETENTION,
+                    )
+                )
+            )
+            await session.commit()
+
+        return {
+            "raw_samples": raw.rowcount,
+            "violations": violations.rowcount,
+            "minute_histograms": minute_histograms.rowcount,
+            "hour_histograms": hour_histograms.rowcount,
+        }
+
     async def record_sla_metric(
         self,
         metric_name: str,
@@ -385,6 +613,103 @@ class SLATrackingService:
             ]
 
 
+class APIResponseSample(NamedTuple):
+    """One sampled API response time."""
+
+    endpoint: str
+    response_time_ms: float
+    status_code: int
+    recorded_at: datetime
+
+
+class APIResponseTimeRecorder(RequestObserver):
+    """
+    Feeds sampled API response times from PerformanceMiddleware into SLA tracking.
+
+    Samples are buffered in memory and written in bulk by a background task,
+    either when the buffer fills or every flush interval.
+    """
+
+    def __init__(
+        self,
+        service: SLATrackingService,
+        sample_rate: float = 0.1,
+        flush_size: int = 200,
+        flush_interval_seconds: float = 10.0,
+    ):
+        """
+        Initialize recorder.
+
+        Args:
+            service: SLA tracking service that persists samples
+            sample_rate: Fraction of API requests recorded (0.0-1.0)
+            flush_size: Buffered samples that trigger an early flush
+            flush_interval_seconds: Maximum time a sample stays buffered
+        """
+        self.service = service
+        self.sample_rate = sample_rate
+        self.flush_size = flush_size
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self._buffer: List[APIResponseSample] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    def request_finished(self, timing: RequestTiming) -> None:
+        if not timing.path.startswith("/api/") or random.random() >= self.sample_rate:
+            return
+
+        self._buffer.append(APIResponseSample(
+            endpoint=timing.route,
+            response_time_ms=round(timing.duration_ms, 2),
+            status_code=timing.status_code,
+            recorded_at=datetime.utcnow(),
+        ))
+
+        if len(self._buffer) >= self.flush_size:
+            task = asyncio.create_task(self.flush())
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def flush(self) -> int:
+        """
+        Write buffered samples.
+
+        Returns:
+            Number of samples written (0 if the write failed)
+        """
+        samples, self._buffer = self._buffer, []
+        try:
+            return await self.service.record_api_response_times(samples)
+        except Exception as e:
+            logger.error(f"Failed to record {len(samples)} API response times: {e}")
+            return 0
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush task."""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush task and write remaining samples."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.flush()
+
+
 # Singleton instance
 sla_tracking_service = SLATrackingService()
 
@@ -0,0 +1,84 @@
+"""
+Minute and hour time buckets for rollup tables.
+
+Rollup tables (service health, SLA latency histograms) keep one row per key
+per minute and per hour. Reports read whole hours from hour buckets and the
+partial hours at the window edges from minute buckets.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+# Rollup bucket sizes
+MINUTE_BUCKET = "minute"
+HOUR_BUCKET = "hour"
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def bucket_start(value: datetime, bucket_size: str) -> datetime:
+    """
+    Start of the minute or hour bucket containing a timestamp (UTC).
+
+    Args:
+        value: Timestamp
+        bucket_size: MINUTE_BUCKET or HOUR_BUCKET
+
+    Returns:
+        Timezone-aware bucket start
+    """
+    value = _as_utc(value).replace(second=0, microsecond=0)
+    if bucket_size == HOUR_BUCKET:
+        value = value.replace(minute=0)
+    return value
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floored = bucket_start(value, HOUR_BUCKET)
+    return floored if floored == value else floored + timedelta(hours=1)
+
+
+def rollup_ranges(
+    start_time: datetime,
+    end_time: datetime,
+    minute_retention_start: datetime,
+) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Split a report window into rollup bucket ranges.
+
+    Whole hours are read from hour buckets and the partial hours at either
+    edge from minute buckets, at minute granularity. Edges older than the
+    minute rollup retention widen to whole hours.
+
+    Args:
+        start_time: Window start
+        end_time: Window end (the bucket containing it is included)
+        minute_retention_start: Oldest minute bucket still retained
+
+    Returns:
+        List of (bucket size, range start, range end) half-open ranges
+    """
+    start = bucket_start(start_time, MINUTE_BUCKET)
+    end = bucket_start(end_time, MINUTE_BUCKET) + timedelta(minutes=1)
+    retention = _as_utc(minute_retention_start)
+
+    if end <= retention:
+        return [(HOUR_BUCKET, bucket_start(start, HOUR_BUCKET), _ceil_hour(end))]
+    if start < retention:
+        start = bucket_start(start, HOUR_BUCKET)
+
+    first_hour = _ceil_hour(start)
+    last_hour = bucket_start(end, HOUR_BUCKET)
+    if first_hour >= last_hour:
+        return [(MINUTE_BUCKET, start, end)]
+
+    ranges = []
+    if start < first_hour:
+        ranges.append((MINUTE_BUCKET, start, first_hour))
+    ranges.append((HOUR_BUCKET, first_hour, last_hour))
+    if last_hour < end:
+        ranges.append((MINUTE_BUCKET, last_hour, end))
+    return ranges
@@ -23,19 +23,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .config import settings
-from .redis_service import RedisService, get_redis_service
+from .cache_service import CacheService, get_cache_service
+from .tutor_profile_service import TutorProfileAssembler
 from ..evaluation.prediction_service import ChurnPredictionService
 from ..database.database import get_async_session
-from ..database.models import (
-    ManagerNote,
-    Intervention,
-    Tutor,
-    TutorPerformanceMetric,
-    ChurnPrediction,
-    Session as SessionModel,
-    StudentFeedback,
-    MetricWindow
-)
+from ..database.models import ManagerNote
 
 logger = logging.getLogger(__name__)
 
@@ -285,12 +277,14 @@ def detect_active_flags(tutor_id: str, sessions_df: pd.DataFrame, feedback_df: p
 )
 async def get_tutor_profile(
     tutor_id: str,
-    redis: RedisService = Depends(get_redis_service),
-    db: AsyncSession = Depends(get_async_session),
+    cache: CacheService = Depends(get_cache_service),
 ) -> TutorProfileResponse:
     """
     Get comprehensive tutor profile for operations managers.
 
+    Profile sections are fetched concurrently and the assembled profile is
+    cached until a manager note, intervention or churn prediction changes.
+
     Returns:
     - Basic tutor info
     - Multi-window churn predictions (1d, 7d, 30d, 90d)
@@ -301,18 +295,23 @@ async def get_tutor_profile(
     - Recent feedback
     """
     try:
-        # 1. Check tutor exists in database
-        tutor_result = await db.execute(
-            select(Tutor).where(Tutor.tutor_id == tutor_id)
-        )
-        tutor = tutor_result.scalar_one_or_none()
+        cached_profile = await cache.get_tutor_profile(tutor_id)
+        if cached_profile:
+            response = TutorProfileResponse(**cached_profile)
+            response.timestamp = datetime.now().isoformat()
+            return response
+
+        # 1. Fetch all profile sections in parallel and check tutor exists
+        profile_data = await TutorProfileAssembler().fetch(tutor_id)
 
-        if not tutor:
+        if not profile_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Tutor {tutor_id} not found"
             )
 
+        tutor = profile_data.tutor
+
         # Basic tutor info
         onboarding_date = tutor.onboarding_date if isinstance(tutor.onboarding_date, datetime) else datetime.combine(tutor.onboarding_date, datetime.min.time())
         # Make both datetimes timezone-aware for comparison
@@ -335,14 +334,7 @@ async def get_tutor_profile(
         # 2. Multi-window churn predictions from database
         churn_predictions = []
 
-        # Query churn predictions from database
-        churn_result = await db.execute(
-            select(ChurnPrediction)
-            .where(ChurnPrediction.tutor_id == tutor_id)
-            .order_by(ChurnPrediction.prediction_date.desc())
-            .limit(1)
-        )
-        churn_data = churn_result.scalar_one_or_none()
+        churn_data = profile_data.churn_prediction
 
         if churn_data:
             # Use database churn prediction data
@@ -377,16 +369,7 @@ async def get_tutor_profile(
             ))
 
         # 3. Performance metrics from database
-        metrics_result = await db.execute(
-            select(TutorPerformanceMetric)
-            .where(
-                TutorPerformanceMetric.tutor_id == tutor_id,
-                TutorPerformanceMetric.window == MetricWindow.THIRTY_DAY
-            )
-            .order_by(TutorPerformanceMetric.calculation_date.desc())
-            .limit(1)
-        )
-        metrics = metrics_result.scalar_one_or_none()
+        metrics = profile_data.metrics
 
         if metrics:
             performance_metrics = PerformanceMetrics(
@@ -415,14 +398,7 @@ async def get_tutor_profile(
         # 4. Active flags (simplified for demo - would normally analyze patterns)
         active_flags = []
 
-        # 5. Intervention history - Query from database
-        interventions_result = await db.execute(
-            select(Intervention)
-            .where(Intervention.tutor_id == tutor_id)
-            .order_by(Intervention.recommended_date.desc())
-        )
-        interventions = interventions_result.scalars().all()
-
+        # 5. Intervention history
         intervention_history = [
             InterventionHistoryItem(
                 intervention_id=intervention.intervention_id,
@@ -436,57 +412,35 @@ async def get_tutor_profile(
                 assigned_to=intervention.assigned_to,
                 notes=intervention.notes
             )
-            for intervention in interventions
+            for intervention in profile_data.interventions
         ]
 
-        # 6. Manager notes - Query from database (handle missing table gracefully)
-        manager_notes = []
-        try:
-            notes_result = await db.execute(
-                select(ManagerNote)
-                .where(ManagerNote.tutor_id == tutor_id)
-                .order_by(ManagerNote.created_at.desc())
+        # 6. Manager notes (empty if the notes query failed)
+        manager_notes = [
+            ManagerNoteItem(
+                note_id=note.note_id,
+                author_name=note.author_name,
+                note_text=note.note_text,
+                is_important=note.is_important,
+                created_at=note.created_at.isoformat(),
+                updated_at=note.updated_at.isoformat()
             )
-            notes = notes_result.scalars().all()
-
-            manager_notes = [
-                ManagerNoteItem(
-                    note_id=note.note_id,
-                    author_name=note.author_name,
-                    note_text=note.note_text,
-                    is_important=note.is_important,
-                    created_at=note.created_at.isoformat(),
-                    updated_at=note.updated_at.isoformat()
-                )
-                for note in notes
-            ]
-        except Exception as e:
-            logger.warning(f"Could not fetch manager notes for {tutor_id}: {e}")
-
-        # 7. Recent feedback from database (last 5 sessions with feedback)
-        recent_feedback = []
-        try:
-            feedback_result = await db.execute(
-                select(SessionModel, StudentFeedback)
-                .join(StudentFeedback, SessionModel.session_id == StudentFeedback.session_id)
-                .where(SessionModel.tutor_id == tutor_id)
-                .order_by(SessionModel.scheduled_start.desc())
-                .limit(5)
+            for note in profile_data.manager_notes
+        ]
+
+        # 7. Recent feedback (last 5 sessions with feedback)
+        recent_feedback = [
+            RecentFeedback(
+                session_id=session.session_id,
+                student_id=session.student_id,
+                session_date=session.scheduled_start.isoformat(),
+                rating=feedback.overall_rating if feedback else None,
+                feedback_text=feedback.feedback_text if feedback else None,
+                would_recommend=feedback.would_recommend if feedback else None,
+                subject=session.subject
             )
-            feedback_data = feedback_result.all()
-
-            for session, feedback in feedback_data:
-                recent_feedback.append(RecentFeedback(
-                    session_id=session.session_id,
-                    student_id=session.student_id,
-                    session_date=session.scheduled_start.isoformat(),
-                    rating=feedback.overall_rating if feedback else None,
-                    feedback_text=feedback.feedback_text if feedback else None,
-                    would_recommend=feedback.would_recommend if feedback else None,
-                    subject=session.subject
-                ))
-        except Exception as e:
-            logger.warning(f"Could not fetch recent feedback for {tutor_id}: {e}")
+            for session, feedback in profile_data.recent_feedback
+        ]
 
         # Build response
         response = TutorProfileResponse(
@@ -500,6 +454,8 @@ async def get_tutor_profile(
             timestamp=datetime.now().isoformat()
         )
 
+        await cache.cache_tutor_profile(tutor_id, response.model_dump())
+
         logger.info(f"Retrieved tutor profile for {tutor_id}")
         return response
 
@@ -521,6 +477,7 @@ async def create_manager_note(
     tutor_id: str,
     request: CreateManagerNoteRequest,
     db: AsyncSession = Depends(get_async_session),
+    cache: CacheService = Depends(get_cache_service),
 ) -> dict:
     """
     Create a new manager note for a tutor.
@@ -544,6 +501,8 @@ async def create_manager_note(
         await db.commit()
         await db.refresh(new_note)
 
+        await cache.invalidate_tutor_profile(tutor_id)
+
         logger.info(f"Created manager note {note_id} for tutor {tutor_id}")
 
         return {
@@ -572,6 +531,7 @@ async def update_manager_note(
     note_id: str,
     request: UpdateManagerNoteRequest,
     db: AsyncSession = Depends(get_async_session),
+    cache: CacheService = Depends(get_cache_service),
 ) -> dict:
     """
     Update an existing manager note.
@@ -598,6 +558,8 @@ async def update_manager_note(
         await db.commit()
         await db.refresh(note)
 
+        await cache.invalidate_tutor_profile(tutor_id)
+
         logger.info(f"Updated manager note {note_id} for tutor {tutor_id}")
 
         return {
@@ -627,6 +589,7 @@ async def delete_manager_note(
     tutor_id: str,
     note_id: str,
     db: AsyncSession = Depends(get_async_session),
+    cache: CacheService = Depends(get_cache_service),
 ) -> dict:
     """
     Delete a manager note.
@@ -649,6 +612,8 @@ async def delete_manager_note(
         await db.delete(note)
         await db.commit()
 
+        await cache.invalidate_tutor_profile(tutor_id)
+
         logger.info(f"Deleted manager note {note_id} for tutor {tutor_id}")
 
         return {
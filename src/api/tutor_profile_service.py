@@ -0,0 +1,210 @@
+"""
+Tutor profile assembly service.
+
+Fetches the independent parts of a tutor profile (tutor row, latest churn
+prediction, latest 30-day metric, interventions, manager notes and recent
+feedback) concurrently, each on its own pooled connection, instead of one
+after another over a single session.
+
+Assembled profiles are cached by the tutor profile router and invalidated
+when manager notes, interventions or churn predictions are written.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Optional, Tuple
+
+import redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .config import settings
+from .cache_service import CacheService
+from ..database.database import async_session_maker
+from ..database.models import (
+    ManagerNote,
+    Intervention,
+    Tutor,
+    TutorPerformanceMetric,
+    ChurnPrediction,
+    Session as SessionModel,
+    StudentFeedback,
+    MetricWindow,
+)
+
+logger = logging.getLogger(__name__)
+
+# Number of recent sessions with feedback included in a profile
+RECENT_FEEDBACK_LIMIT = 5
+
+
+@dataclass
+class TutorProfileData:
+    """Raw rows backing a tutor profile."""
+
+    tutor: Tutor
+    churn_prediction: Optional[ChurnPrediction] = None
+    metrics: Optional[TutorPerformanceMetric] = None
+    interventions: List[Intervention] = field(default_factory=list)
+    manager_notes: List[ManagerNote] = field(default_factory=list)
+    recent_feedback: List[Tuple[SessionModel, StudentFeedback]] = field(default_factory=list)
+
+
+class TutorProfileAssembler:
+    """
+    Loads tutor profile sections in parallel on separate pooled sessions.
+
+    Usage:
+        assembler = TutorProfileAssembler()
+        data = await assembler.fetch("tutor_001")
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = async_session_maker):
+        """
+        Initialize the assembler.
+
+        Args:
+            session_factory: Factory used to open one session per section
+        """
+        self.session_factory = session_factory
+
+    async def fetch(self, tutor_id: str) -> Optional[TutorProfileData]:
+        """
+        Fetch all profile sections for a tutor concurrently.
+
+        Manager notes and recent feedback are optional: failures there are
+        logged and yield empty lists, matching the profile endpoint contract.
+
+        Args:
+            tutor_id: Tutor ID
+
+        Returns:
+            TutorProfileData, or None if the tutor does not exist
+        """
+        tutor, prediction, metrics, interventions, notes, feedback = await asyncio.gather(
+            self._run(self._fetch_tutor, tutor_id),
+            self._run(self._fetch_latest_prediction, tutor_id),
+            self._run(self._fetch_latest_metrics, tutor_id),
+            self._run(self._fetch_interventions, tutor_id),
+            self._run(self._fetch_manager_notes, tutor_id),
+            self._run(self._fetch_recent_feedback, tutor_id),
+            return_exceptions=True,
+        )
+
+        # Required sections propagate their errors
+        for required in (tutor, prediction, metrics, interventions):
+            if isinstance(required, BaseException):
+                raise required
+
+        if tutor is None:
+            return None
+
+        if isinstance(notes, BaseException):
+            logger.warning(f"Could not fetch manager notes for {tutor_id}: {notes}")
+            notes = []
+        if isinstance(feedback, BaseException):
+            logger.warning(f"Could not fetch recent feedback for {tutor_id}: {feedback}")
+            feedback = []
+
+        return TutorProfileData(
+            tutor=tutor,
+            churn_prediction=prediction,
+            metrics=metrics,
+            interventions=interventions,
+            manager_notes=notes,
+            recent_feedback=feedback,
+        )
+
+    async def _run(self, query_func, tutor_id: str) -> Any:
+        """Run a section query on its own session (and pooled connection)."""
+        async with self.session_factory() as session:
+            return await query_func(session, tutor_id)
+
+    @staticmethod
+    async def _fetch_tutor(session: AsyncSession, tutor_id: str) -> Optional[Tutor]:
+        result = await session.execute(
+            select(Tutor).where(Tutor.tutor_id == tutor_id)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def _fetch_latest_prediction(session: AsyncSession, tutor_id: str) -> Optional[ChurnPrediction]:
+        result = await session.execute(
+            select(ChurnPrediction)
+            .where(ChurnPrediction.tutor_id == tutor_id)
+            .order_by(ChurnPrediction.prediction_date.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def _fetch_latest_metrics(session: AsyncSession, tutor_id: str) -> Optional[TutorPerformanceMetric]:
+        result = await session.execute(
+            select(TutorPerformanceMetric)
+            .where(
+                TutorPerformanceMetric.tutor_id == tutor_id,
+                TutorPerformanceMetric.window == MetricWindow.THIRTY_DAY
+            )
+            .order_by(TutorPerformanceMetric.calculation_date.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def _fetch_interventions(session: AsyncSession, tutor_id: str) -> List[Intervention]:
+        result = await session.execute(
+            select(Intervention)
+            .where(Intervention.tutor_id == tutor_id)
+            .order_by(Intervention.recommended_date.desc())
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def _fetch_manager_notes(session: AsyncSession, tutor_id: str) -> List[ManagerNote]:
+        result = await session.execute(
+            select(ManagerNote)
+            .where(ManagerNote.tutor_id == tutor_id)
+            .order_by(ManagerNote.created_at.desc())
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def _fetch_recent_feedback(
+        session: AsyncSession,
+        tutor_id: str,
+    ) -> List[Tuple[SessionModel, StudentFeedback]]:
+        result = await session.execute(
+            select(SessionModel, StudentFeedback)
+            .join(StudentFeedback, SessionModel.session_id == StudentFeedback.session_id)
+            .where(SessionModel.tutor_id == tutor_id)
+            .order_by(SessionModel.scheduled_start.desc())
+            .limit(RECENT_FEEDBACK_LIMIT)
+        )
+        return [tuple(row) for row in result.all()]
+
+
+def invalidate_tutor_profiles_sync(tutor_ids: Iterable[str]) -> int:
+    """
+    Invalidate cached tutor profiles from synchronous code (Celery workers).
+
+    Args:
+        tutor_ids: Tutors whose profiles changed
+
+    Returns:
+        Number of cache keys deleted
+    """
+    keys = [f"{CacheService.TUTOR_PROFILE_PREFIX}{tutor_id}" for tutor_id in set(tutor_ids)]
+    if not keys:
+        return 0
+
+    try:
+        client = redis.Redis.from_url(settings.redis_url, socket_connect_timeout=5)
+        try:
+            return client.delete(*keys)
+        finally:
+            client.close()
+    except RedisError as e:
+        logger.warning(f"Failed to invalidate {len(keys)} tutor profile cache entries: {e}")
+        return 0
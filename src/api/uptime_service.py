@@ -3,14 +3,21 @@ Uptime Monitoring Service
 
 Tracks uptime for all system services to ensure >99.5% uptime SLA.
 Records health check results and calculates uptime percentages.
+
+Each health check also updates per-service minute and hour rollups (total
+checks, up checks, up-latency sum and max latency) in the same transaction.
+Uptime reports read those rollups with one grouped query, and raw
+successful checks are compacted once they are rolled up.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-from sqlalchemy import select, func, and_
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from sqlalchemy import select, func, and_, or_, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.time_buckets import HOUR_BUCKET, MINUTE_BUCKET, bucket_start, rollup_ranges
 from src.database.database import get_db_session
 from src.workers.monitoring import HealthCheck
 
@@ -24,6 +31,49 @@ class ServiceStatus:
     DEGRADED = "degraded"
 
 
+# Retention for compaction (minute rollups must be kept for at least an hour)
+RAW_CHECK_RETENTION = timedelta(hours=24)
+MINUTE_ROLLUP_RETENTION = timedelta(days=7)
+HOUR_ROLLUP_RETENTION = timedelta(days=400)
+
+
+def build_rollup_rows(checks: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Aggregate health checks into minute and hour rollup rows.
+
+    Args:
+        checks: Dicts with ``service``, ``status``, ``latency_ms`` and ``checked_at``
+
+    Returns:
+        One row per (service, bucket size, bucket start) for upserting
+    """
+    rows: Dict[Tuple[str, str, datetime], Dict[str, Any]] = {}
+
+    for check in checks:
+        latency = float(check.get("latency_ms") or 0)
+        is_up = check["status"] == ServiceStatus.UP
+        for size in (MINUTE_BUCKET, HOUR_BUCKET):
+            key = (check["service"], size, bucket_start(check["checked_at"], size))
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {
+                    "service_name": key[0],
+                    "bucket_size": size,
+                    "bucket_start": key[2],
+                    "total_checks": 0,
+                    "up_checks": 0,
+                    "up_latency_sum_ms": 0.0,
+                    "max_latency_ms": 0.0,
+                }
+            row["total_checks"] += 1
+            if is_up:
+                row["up_checks"] += 1
+                row["up_latency_sum_ms"] += latency
+            row["max_latency_ms"] = max(row["max_latency_ms"], latency)
+
+    return list(rows.values())
+
+
 class UptimeMonitor:
     """
     Monitor and track service uptime.
@@ -105,21 +155,55 @@ class UptimeMonitor:
             latency_ms: Response latency in milliseconds
             details: Additional details about the check
         """
+        await self.record_health_checks([{
+            "service": service,
+            "status": status,
+            "latency_ms": latency_ms,
+            "details": details,
+        }])
+
+    async def record_health_checks(self, checks: List[Dict[str, Any]]):
+        """
+        Record health check results and update their rollups in one transaction.
+
+        Args:
+            checks: Dicts with ``service``, ``status``, optional ``latency_ms``
+                and ``details``
+        """
         # Import here to avoid circular imports
-        from src.database.models import ServiceHealthCheck
+        from src.database.models import ServiceHealthCheck, ServiceHealthRollup
+
+        checked_at = datetime.now(timezone.utc)
+        checks = [{**check, "checked_at": checked_at} for check in checks]
+        if not checks:
+            return
 
         async with get_db_session() as session:
-            health_check = ServiceHealthCheck(
-                service_name=service,
-                status=status,
-                latency_ms=latency_ms,
-                details=details or {},
-                checked_at=datetime.utcnow(),
+            session.add_all([
+                ServiceHealthCheck(
+                    service_name=check["service"],
+                    status=check["status"],
+                    latency_ms=check.get("latency_ms") or 0,
+                    details=check.get("details") or {},
+                    checked_at=checked_at,
+                )
+                for check in checks
+            ])
+
+            stmt = pg_insert(ServiceHealthRollup).values(build_rollup_rows(checks))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["service_name", "bucket_size", "bucket_start"],
+                set_={
+                    "total_checks": ServiceHealthRollup.total_checks + stmt.excluded.total_checks,
+                    "up_checks": ServiceHealthRollup.up_checks + stmt.excluded.up_checks,
+                    "up_latency_sum_ms": ServiceHealthRollup.up_latency_sum_ms + stmt.excluded.up_latency_sum_ms,
+                    "max_latency_ms": func.greatest(ServiceHealthRollup.max_latency_ms, stmt.excluded.max_latency_ms),
+                },
             )
-            session.add(health_check)
+            await session.execute(stmt)
             await session.commit()
 
-        logger.debug(f"Recorded health check for {service}: {status}")
+        logger.debug(f"Recorded {len(checks)} health checks")
 
     async def record_all_health_checks(self) -> Dict[str, Any]:
         """
@@ -130,14 +214,16 @@ class UptimeMonitor:
         """
         results = await self.perform_health_checks()
 
-        # Record each result
-        for service, result in results.items():
-            await self.record_health_check(
-                service=service,
-                status=result["status"],
-                latency_ms=result.get("latency_ms", 0),
-                details=result.get("details"),
-            )
+        # Record all results in a single transaction
+        await self.record_health_checks([
+            {
+                "service": service,
+                "status": result["status"],
+                "latency_ms": result.get("latency_ms", 0),
+                "details": result.get("details"),
+            }
+            for service, result in results.items()
+        ])
 
         # Calculate overall status
         statuses = [r["status"] for r in results.values()]
@@ -149,6 +235,89 @@ class UptimeMonitor:
             "services": results,
         }
 
+    async def _aggregate_uptime(
+        self,
+        session: AsyncSession,
+        start_time: datetime,
+        end_time: datetime,
+        service: Optional[str] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Sum rollups per service over a time window in one grouped query.
+
+        Returns:
+            Mapping of service name to total, up, up-latency sum and max latency
+        """
+        from src.database.models import ServiceHealthRollup
+
+        minute_retention_start = datetime.now(timezone.utc) - MINUTE_ROLLUP_RETENTION
+        ranges = rollup_ranges(start_time, end_time, minute_retention_start)
+
+        query = select(
+            ServiceHealthRollup.service_name,
+            func.sum(ServiceHealthRollup.total_checks),
+            func.sum(ServiceHealthRollup.up_checks),
+            func.sum(ServiceHealthRollup.up_latency_sum_ms),
+            func.max(ServiceHealthRollup.max_latency_ms),
+        ).where(
+            or_(*[
+                and_(
+                    ServiceHealthRollup.bucket_size == size,
+                    ServiceHealthRollup.bucket_start >= range_start,
+                    ServiceHealthRollup.bucket_start < range_end,
+                )
+                for size, range_start, range_end in ranges
+            ])
+        ).group_by(ServiceHealthRollup.service_name)
+
+        if service:
+            query = query.where(ServiceHealthRollup.service_name == service)
+
+        result = await session.execute(query)
+        return {
+            row[0]: {
+                "total": int(row[1] or 0),
+                "up": int(row[2] or 0),
+                "up_latency_sum": float(row[3] or 0),
+                "max_latency": float(row[4] or 0),
+            }
+            for row in result.all()
+        }
+
+    def _uptime_stats(
+        self,
+        service: str,
+        start_time: datetime,
+        end_time: datetime,
+        totals: Optional[Dict[str, float]],
+    ) -> Dict[str, Any]:
+        """Build uptime statistics for a service from aggregated totals."""
+        totals = totals or {"total": 0, "up": 0, "up_latency_sum": 0.0, "max_latency": 0.0}
+        total_checks = totals["total"]
+        up_checks = totals["up"]
+
+        # Calculate uptime percentage
+        uptime_pct = (up_checks / total_checks * 100) if total_checks > 0 else 0
+
+        # Average latency for successful checks
+        avg_latency = totals["up_latency_sum"] / up_checks if up_checks > 0 else 0
+
+        return {
+            "service": service,
+            "period": {
+                "start": start_time.isoformat(),
+                "end": end_time.isoformat(),
+            },
+            "total_checks": total_checks,
+            "successful_checks": up_checks,
+            "failed_checks": total_checks - up_checks,
+            "uptime_percentage": round(uptime_pct, 3),
+            "meets_sla": uptime_pct >= self.SLA_TARGET,
+            "sla_target": self.SLA_TARGET,
+            "avg_latency_ms": round(avg_latency, 2),
+            "max_latency_ms": round(totals["max_latency"], 2),
+        }
+
     async def calculate_uptime(
         self,
         service: str,
@@ -166,64 +335,10 @@ class UptimeMonitor:
         Returns:
             Uptime statistics
         """
-        from src.database.models import ServiceHealthCheck
-
         async with get_db_session() as session:
-            # Count total checks
-            total_result = await session.execute(
-                select(func.count(ServiceHealthCheck.id)).where(
-                    and_(
-                        ServiceHealthCheck.service_name == service,
-                        ServiceHealthCheck.checked_at >= start_time,
-                        ServiceHealthCheck.checked_at <= end_time,
-                    )
-                )
-            )
-            total_checks = total_result.scalar() or 0
-
-            # Count successful checks (status = 'up')
-            up_result = await session.execute(
-                select(func.count(ServiceHealthCheck.id)).where(
-                    and_(
-                        ServiceHealthCheck.service_name == service,
-                        ServiceHealthCheck.status == ServiceStatus.UP,
-                        ServiceHealthCheck.checked_at >= start_time,
-                        ServiceHealthCheck.checked_at <= end_time,
-                    )
-                )
-            )
-            up_checks = up_result.scalar() or 0
+            aggregates = await self._aggregate_uptime(session, start_time, end_time, service)
 
-            # Calculate uptime percentage
-            uptime_pct = (up_checks / total_checks * 100) if total_checks > 0 else 0
-
-            # Get average latency for successful checks
-            latency_result = await session.execute(
-                select(func.avg(ServiceHealthCheck.latency_ms)).where(
-                    and_(
-                        ServiceHealthCheck.service_name == service,
-                        ServiceHealthCheck.status == ServiceStatus.UP,
-                        ServiceHealthCheck.checked_at >= start_time,
-                        ServiceHealthCheck.checked_at <= end_time,
-                    )
-                )
-            )
-            avg_latency = latency_result.scalar() or 0
-
-            return {
-                "service": service,
-                "period": {
-                    "start": start_time.isoformat(),
-                    "end": end_time.isoformat(),
-                },
-                "total_checks": total_checks,
-                "successful_checks": up_checks,
-                "failed_checks": total_checks - up_checks,
-                "uptime_percentage": round(uptime_pct, 3),
-                "meets_sla": uptime_pct >= self.SLA_TARGET,
-                "sla_target": self.SLA_TARGET,
-                "avg_latency_ms": round(avg_latency, 2),
-            }
+        return self._uptime_stats(service, start_time, end_time, aggregates.get(service))
 
     async def get_uptime_report(
         self,
@@ -253,10 +368,13 @@ class UptimeMonitor:
             "meets_sla": False,
         }
 
+        async with get_db_session() as session:
+            aggregates = await self._aggregate_uptime(session, start_time, end_time)
+
         # Calculate uptime for each service
         uptimes = []
         for service_key, service_name in self.SERVICES.items():
-            uptime_data = await self.calculate_uptime(service_key, start_time, end_time)
+            uptime_data = self._uptime_stats(service_key, start_time, end_time, aggregates.get(service_key))
             report["services"][service_key] = {
                 "name": service_name,
                 **uptime_data,
@@ -271,6 +389,69 @@ class UptimeMonitor:
 
         return report
 
+    async def compact_health_checks(
+        self,
+        incident_retention_days: int = 30,
+        raw_retention: timedelta = RAW_CHECK_RETENTION,
+    ) -> Dict[str, int]:
+        """
+        Compact rolled-up health check data.
+
+        Successful raw checks are already counted in the rollups and are
+        dropped after ``raw_retention``. Failed checks are kept as incidents
+        for ``incident_retention_days``. Minute and hour rollups are pruned
+        after their own retention periods.
+
+        Args:
+            incident_retention_days: Days to keep non-up raw checks
+            raw_retention: How long to keep successful raw checks
+
+        Returns:
+            Number of rows deleted per category
+        """
+        from src.database.models import ServiceHealthCheck, ServiceHealthRollup
+
+        now = datetime.now(timezone.utc)
+
+        async with get_db_session() as session:
+            raw_up = await session.execute(
+                delete(ServiceHealthCheck).where(
+                    and_(
+                        ServiceHealthCheck.status == ServiceStatus.UP,
+                        ServiceHealthCheck.checked_at < now - raw_retention,
+                    )
+                )
+            )
+            incidents = await session.execute(
+                delete(ServiceHealthCheck).where(
+                    ServiceHealthCheck.checked_at < now - timedelta(days=incident_retention_days)
+                )
+            )
+            minute_rollups = await session.execute(
+                delete(ServiceHealthRollup).where(
+                    and_(
+                        ServiceHealthRollup.bucket_size == MINUTE_BUCKET,
+                        ServiceHealthRollup.bucket_start < now - MINUTE_ROLLUP_RETENTION,
+                    )
+                )
+            )
+            hour_rollups = await session.execute(
+                delete(ServiceHealthRollup).where(
+                    and_(
+                        ServiceHealthRollup.bucket_size == HOUR_BUCKET,
+                        ServiceHealthRollup.bucket_start < now - HOUR_ROLLUP_RETENTION,
+                    )
+                )
+            )
+            await session.commit()
+
+        return {
+            "raw_checks": raw_up.rowcount,
+            "incidents": incidents.rowcount,
+            "minute_rollups": minute_rollups.rowcount,
+            "hour_rollups": hour_rollups.rowcount,
+        }
+
     async def get_downtime_incidents(
         self,
         service: Optional[str] = None,
@@ -3,5 +3,6 @@
 from .tutor_generator import TutorGenerator
 from .session_generator import SessionGenerator
 from .feedback_generator import FeedbackGenerator
+from .bulk_generator import BulkSessionGenerator
 
-__all__ = ["TutorGenerator", "SessionGenerator", "FeedbackGenerator"]
+__all__ = ["TutorGenerator", "SessionGenerator", "FeedbackGenerator", "BulkSessionGenerator"]
@@ -0,0 +1,590 @@
+"""
+Cold-storage archival to compressed Parquet.
+
+Students past the FERPA retention period are moved out of the active tables
+in bounded chunks. Each chunk runs in one short transaction:
+1. Lock a keyset-ordered batch of eligible students (FOR UPDATE SKIP LOCKED,
+   which also holds off new sessions for them until the chunk commits)
+2. Stream their students, sessions and student_feedback rows into one
+   compressed Parquet file per table, written under a hive-style partition
+   (<table>/archived_on=YYYY-MM-DD/<run_id>-<chunk>.parquet)
+3. Record every file with its row count, size and SHA-256 in the run manifest
+   (_manifests/<run_id>.json)
+4. Delete the archived rows (children first) and advance the checkpoint
+
+Files are uploaded and the manifest updated before the delete commits, so a
+crash can leave an archived copy of rows that are still live, never the other
+way round. File names are deterministic per chunk, so a retried chunk
+overwrites its own files and manifest entries.
+
+Storage is any pyarrow filesystem URI: a local path, or
+s3://bucket/prefix?endpoint_override=host:port for S3-compatible stores.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from sqlalchemy import ARRAY, JSON, Boolean, Date, DateTime, Enum, Float, Integer, delete, exists, or_, select
+from sqlalchemy.orm import Session
+
+from src.api.config import settings
+from src.database.models import (
+    RetentionCheckpoint,
+    Session as SessionModel,
+    Student,
+    StudentFeedback,
+)
+from src.database.retention import (
+    RETENTION_LOCK_TIMEOUT_MS,
+    run_chunk_with_retry,
+    set_chunk_timeouts,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Students archived per transaction
+ARCHIVE_CHUNK_SIZE = 500
+
+# Rows fetched from the cursor (and written as one row group) at a time
+ARCHIVE_BATCH_ROWS = 50_000
+
+# Per-chunk statement limit; longer than retention's, as it covers the upload too
+ARCHIVE_STATEMENT_TIMEOUT_MS = 120000
+
+ARCHIVE_JOB_NAME = "archive_students"
+MANIFEST_DIR = "_manifests"
+PARTITION_KEY = "archived_on"
+
+PHASE_STUDENTS = "students"
+PHASE_DONE = "done"
+
+
+# Archived tables and their models, children first so deletes respect FKs
+ARCHIVE_TABLES = (
+    ("student_feedback", StudentFeedback),
+    ("sessions", SessionModel),
+    ("students", Student),
+)
+
+
+def archived_rows(table: str, student_ids: Sequence[str]):
+    """
+    Row condition for one archived table and a batch of students.
+
+    Args:
+        table: Archived table name
+        student_ids: Students being archived
+
+    Returns:
+        WHERE clause selecting the table's rows for those students
+    """
+    if table == "student_feedback":
+        # Feedback follows its session as well, since the session delete cascades to it
+        return or_(
+            StudentFeedback.student_id.in_(student_ids),
+            StudentFeedback.session_id.in_(
+                select(SessionModel.session_id).where(SessionModel.student_id.in_(student_ids))
+            ),
+        )
+    if table == "sessions":
+        return SessionModel.student_id.in_(student_ids)
+    return Student.student_id.in_(student_ids)
+
+
+def eligible_students_select(cutoff: datetime, after_id: Optional[str], chunk_size: int):
+    """
+    SELECT for one chunk of students past the retention cutoff.
+
+    A student is eligible when the record itself, its creation and its latest
+    session are all older than the cutoff (the same rule as the retention scan).
+
+    Args:
+        cutoff: Retention deadline
+        after_id: Keyset cursor (last student_id processed), None to start
+        chunk_size: Maximum students selected
+
+    Returns:
+        Select of student IDs, locked FOR UPDATE SKIP LOCKED
+    """
+    recent_sessions = exists().where(
+        SessionModel.student_id == Student.student_id,
+        SessionModel.scheduled_start > cutoff,
+    )
+
+    stmt = (
+        select(Student.student_id)
+        .where(Student.created_at <= cutoff, Student.updated_at <= cutoff, ~recent_sessions)
+        .order_by(Student.student_id)
+        .limit(chunk_size)
+        .with_for_update(of=Student, skip_locked=True)
+    )
+    if after_id is not None:
+        stmt = stmt.where(Student.student_id > after_id)
+    return stmt
+
+
+def _arrow_column(column) -> Tuple[pa.DataType, Optional[Callable[[Any], Any]]]:
+    """Arrow type for a table column, plus a converter for values Arrow cannot take as-is."""
+    col_type = column.type
+    # Enum subclasses String, so it is checked first; members are stored by
+    # name, as SQLAlchemy stores them in the database
+    if isinstance(col_type, Enum):
+        return pa.string(), lambda v: v.name if hasattr(v, "name") else v
+    if isinstance(col_type, Boolean):
+        return pa.bool_(), None
+    if isinstance(col_type, Integer):
+        return pa.int64(), None
+    if isinstance(col_type, Float):
+        return pa.float64(), None
+    if isinstance(col_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if col_type.timezone else None), None
+    if isinstance(col_type, Date):
+        return pa.date32(), None
+    if isinstance(col_type, ARRAY):
+        return pa.list_(pa.string()), None
+    if isinstance(col_type, JSON):
+        return pa.string(), json.dumps
+    return pa.string(), None
+
+
+def table_schema(model) -> Tuple[pa.Schema, List[Optional[Callable[[Any], Any]]]]:
+    """
+    Arrow schema for a model's table.
+
+    Returns:
+        Tuple of (schema, per-column converters)
+    """
+    fields, converters = [], []
+    for column in model.__table__.columns:
+        arrow_type, converter = _arrow_column(column)
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+        converters.append(converter)
+    return pa.schema(fields), converters
+
+
+def rows_to_table(rows: Sequence[Sequence[Any]], schema: pa.Schema, converters: List) -> pa.Table:
+    """Build an Arrow table from result rows, one column at a time."""
+    arrays = []
+    for i, (field, converter) in enumerate(zip(schema, converters)):
+        values = [row[i] for row in rows]
+        if converter is not None:
+            values = [None if v is None else converter(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def resolve_storage(storage_uri: Optional[str] = None) -> Tuple[pafs.FileSystem, str]:
+    """
+    Filesystem and root path for an archive location.
+
+    Args:
+        storage_uri: Local path or filesystem URI (defaults to settings.archive_storage_uri)
+
+    Returns:
+        Tuple of (filesystem, root path within it)
+    """
+    storage_uri = storage_uri or settings.archive_storage_uri
+    if "://" not in storage_uri:
+        return pafs.LocalFileSystem(), os.path.abspath(storage_uri)
+    return pafs.FileSystem.from_uri(storage_uri)
+
+
+def _sha256(fs: pafs.FileSystem, path: str) -> str:
+    digest = hashlib.sha256()
+    with fs.open_input_stream(path) as f:
+        while True:
+            block = f.read(1 << 20)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArchiveStore:
+    """Parquet files and run manifests under one archive root."""
+
+    def __init__(self, storage_uri: Optional[str] = None, compression: Optional[str] = None):
+        self.fs, self.root = resolve_storage(storage_uri)
+        self.compression = compression or settings.archive_compression
+
+    def file_path(self, table: str, archived_on: datetime, name: str) -> str:
+        return posixpath.join(
+            self.root, table, f"{PARTITION_KEY}={archived_on:%Y-%m-%d}", f"{name}.parquet"
+        )
+
+    def manifest_path(self, run_id: str) -> str:
+        return posixpath.join(self.root, MANIFEST_DIR, f"{run_id}.json")
+
+    def write_table(self, db: Session, model, condition, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Stream a table's matching rows into one compressed Parquet file.
+
+        Args:
+            db: Session (inside the chunk transaction)
+            model: ORM model of the table
+            condition: Row filter
+            path: Destination file path
+
+        Returns:
+            Manifest entry for the file, or None when no rows matched
+        """
+        schema, converters = table_schema(model)
+        stmt = select(*model.__table__.columns).where(condition)
+        result = db.execute(stmt.execution_options(yield_per=ARCHIVE_BATCH_ROWS))
+
+        sink = pa.BufferOutputStream()
+        rows = 0
+        with pq.ParquetWriter(sink, schema, compression=self.compression) as writer:
+            for batch in result.partitions():
+                writer.write_table(rows_to_table(batch, schema, converters))
+                rows += len(batch)
+
+        if not rows:
+            return None
+
+        data = sink.getvalue()
+        self.fs.create_dir(posixpath.dirname(path), recursive=True)
+        with self.fs.open_output_stream(path) as out:
+            out.write(data)
+
+        return {
+            "path": posixpath.relpath(path, self.root),
+            "rows": rows,
+            "bytes": data.size,
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }
+
+    def load_manifest(self, run_id: str) -> Optional[Dict[str, Any]]:
+        path = self.manifest_path(run_id)
+        if self.fs.get_file_info(path).type == pafs.FileType.NotFound:
+            return None
+        with self.fs.open_input_stream(path) as f:
+            return json.loads(f.read())
+
+    def save_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Write the manifest through a temporary file so readers never see half of it."""
+        path = self.manifest_path(manifest["run_id"])
+        self.fs.create_dir(posixpath.dirname(path), recursive=True)
+        part = f"{path}.part"
+        with self.fs.open_output_stream(part) as out:
+            out.write(json.dumps(manifest, indent=2, default=str).encode())
+        self.fs.move(part, path)
+
+    def verify_manifest(self, run_id: str) -> List[str]:
+        """
+        Check every file of a run against its recorded checksum.
+
+        Args:
+            run_id: Archival run ID
+
+        Returns:
+            Relative paths of missing or corrupted files (empty when intact)
+        """
+        manifest = self.load_manifest(run_id)
+        if manifest is None:
+            raise ValueError(f"Archive manifest {run_id} not found")
+
+        bad = []
+        for entry in manifest["files"]:
+            path = posixpath.join(self.root, entry["path"])
+            if self.fs.get_file_info(path).type == pafs.FileType.NotFound or _sha256(self.fs, path) != entry["sha256"]:
+                bad.append(entry["path"])
+        return bad
+
+    def read(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pa.Table:
+        """
+        Read archived rows back, e.g. for an audit or a legal hold.
+
+        Partition pruning applies to archived_on; other filters are pushed
+        down to the Parquet row groups.
+
+        Args:
+            table: Archived table (students, sessions or student_feedback)
+            filters: Column equality filters; a list/tuple/set value means IN
+            columns: Columns to return (default all)
+
+        Returns:
+            Arrow table of matching rows (use .to_pylist() or .to_pandas())
+        """
+        if table not in dict(ARCHIVE_TABLES):
+            raise ValueError(f"Unknown archive table: {table}")
+
+        dataset = ds.dataset(
+            posixpath.join(self.root, table),
+            filesystem=self.fs,
+            format="parquet",
+            partitioning="hive",
+        )
+
+        expression = None
+        for name, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                condition = ds.field(name).isin(list(value))
+            else:
+                condition = ds.field(name) == value
+            expression = condition if expression is None else expression & condition
+
+        return dataset.to_table(columns=columns, filter=expression)
+
+
+class ParquetArchiver:
+    """
+    Resumable archival of expired students to Parquet cold storage.
+
+    Progress is stored in retention_checkpoints under job_name (the cursor is
+    the last student_id archived). A run stops early when its time budget is
+    spent; the next run with the same job name picks up from the checkpoint
+    and keeps appending to the same manifest.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        storage_uri: Optional[str] = None,
+        compression: Optional[str] = None,
+        job_name: str = ARCHIVE_JOB_NAME,
+        chunk_size: int = ARCHIVE_CHUNK_SIZE,
+        lock_timeout_ms: int = RETENTION_LOCK_TIMEOUT_MS,
+        statement_timeout_ms: int = ARCHIVE_STATEMENT_TIMEOUT_MS,
+        time_budget_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the archiver.
+
+        Args:
+            session_factory: Creates synchronous database sessions
+            storage_uri: Archive location (defaults to settings.archive_storage_uri)
+            compression: Parquet codec (defaults to settings.archive_compression)
+            job_name: Checkpoint key for this job
+            chunk_size: Students archived per transaction
+            lock_timeout_ms: lock_timeout for each chunk
+            statement_timeout_ms: statement_timeout for each chunk
+            time_budget_seconds: Stop (resumably) after this long; None for no limit
+        """
+        self.session_factory = session_factory
+        self.store = ArchiveStore(storage_uri, compression)
+        self.job_name = job_name
+        self.chunk_size = chunk_size
+        self.lock_timeout_ms = lock_timeout_ms
+        self.statement_timeout_ms = statement_timeout_ms
+        self.time_budget_seconds = time_budget_seconds
+
+    def run(self, days_to_keep: int) -> Dict[str, Any]:
+        """
+        Run (or resume) archival of students past the retention period.
+
+        Args:
+            days_to_keep: Retention period for a new run (a resumed run keeps
+                the cutoff it started with)
+
+        Returns:
+            Dict with run_id, manifest, students_archived, rows_archived,
+            cutoff_date, chunks, resumed and completed
+        """
+        started = time.monotonic()
+        checkpoint = self._load_or_start(datetime.utcnow() - timedelta(days=days_to_keep))
+        resumed = checkpoint["resumed"]
+        manifest = self.store.load_manifest(checkpoint["run_id"]) or self._new_manifest(
+            checkpoint["run_id"], cutoff=checkpoint["cutoff"].isoformat()
+        )
+        chunks = 0
+
+        if resumed:
+            logger.info(f"Resuming archival run {checkpoint['run_id']} after student {checkpoint['cursor']}")
+
+        while checkpoint["phase"] != PHASE_DONE:
+            if self.time_budget_seconds is not None and time.monotonic() - started >= self.time_budget_seconds:
+                logger.info(f"Archival run {checkpoint['run_id']} paused after {chunks} chunks (time budget)")
+                break
+
+            checkpoint = self._run_chunk(checkpoint, manifest)
+            chunks += 1
+
+        counts = checkpoint["rows_deleted"]
+        return {
+            "run_id": checkpoint["run_id"],
+            "manifest": self.store.manifest_path(checkpoint["run_id"]),
+            "students_archived": counts.get("students", 0),
+            "rows_archived": {name: counts.get(name, 0) for name, _ in ARCHIVE_TABLES},
+            "cutoff_date": checkpoint["cutoff"].isoformat(),
+            "chunks": chunks,
+            "resumed": resumed,
+            "completed": checkpoint["phase"] == PHASE_DONE,
+        }
+
+    def archive_students(self, student_ids: Iterable[str], reason: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Archive specific students in one transaction, without a checkpoint.
+
+        Eligibility is the caller's responsibility.
+
+        Args:
+            student_ids: Students to archive
+            reason: Recorded in the manifest
+
+        Returns:
+            Dict with run_id, manifest, files and rows_archived
+        """
+        run_id = f"manual-{datetime.utcnow():%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:8]}"
+        manifest = self._new_manifest(run_id, reason=reason)
+
+        with self.session_factory() as db:
+            set_chunk_timeouts(db, self.lock_timeout_ms, self.statement_timeout_ms)
+            locked = db.execute(
+                select(Student.student_id)
+                .where(Student.student_id.in_(list(student_ids)))
+                .order_by(Student.student_id)
+                .with_for_update(of=Student)
+            ).scalars().all()
+            counts, files = self._archive_chunk(db, run_id, 0, locked, manifest)
+            db.commit()
+
+        return {
+            "run_id": run_id,
+            "manifest": self.store.manifest_path(run_id),
+            "files": files,
+            "rows_archived": counts,
+        }
+
+    def _new_manifest(self, run_id: str, **extra) -> Dict[str, Any]:
+        return {
+            "run_id": run_id,
+            "compression": self.store.compression,
+            "created_at": datetime.utcnow().isoformat(),
+            **extra,
+            "files": [],
+        }
+
+    def _load_or_start(self, cutoff: datetime) -> Dict[str, Any]:
+        with self.session_factory() as db:
+            row = db.get(RetentionCheckpoint, self.job_name)
+
+            if row is not None and row.completed_at is None:
+                return self._checkpoint_dict(row, resumed=True)
+
+            if row is None:
+                row = RetentionCheckpoint(job_name=self.job_name)
+                db.add(row)
+
+            row.cutoff = cutoff
+            row.phase = PHASE_STUDENTS
+            row.cursor = None
+            row.rows_deleted = {}
+            row.started_at = datetime.utcnow()
+            row.completed_at = None
+            db.commit()
+
+            return self._checkpoint_dict(row, resumed=False)
+
+    def _checkpoint_dict(self, row: RetentionCheckpoint, resumed: bool) -> Dict[str, Any]:
+        return {
+            # The run ID is fixed by the run's start, so resumed chunks share its manifest
+            "run_id": f"{self.job_name}-{row.started_at:%Y%m%dT%H%M%SZ}",
+            "cutoff": row.cutoff,
+            "phase": row.phase,
+            "cursor": row.cursor,
+            "rows_deleted": dict(row.rows_deleted or {}),
+            "resumed": resumed,
+        }
+
+    def _run_chunk(self, checkpoint: Dict[str, Any], manifest: Dict[str, Any]) -> Dict[str, Any]:
+        # A retried chunk rewrites its own files and manifest entries
+        return run_chunk_with_retry(
+            lambda: self._archive_next_chunk(checkpoint, manifest),
+            describe=f"Archival chunk after student {checkpoint['cursor']}",
+        )
+
+    def _archive_next_chunk(self, checkpoint: Dict[str, Any], manifest: Dict[str, Any]) -> Dict[str, Any]:
+        rows_deleted = dict(checkpoint["rows_deleted"])
+        chunk = rows_deleted.get("chunks", 0)
+
+        with self.session_factory() as db:
+            set_chunk_timeouts(db, self.lock_timeout_ms, self.statement_timeout_ms)
+
+            student_ids = db.execute(
+                eligible_students_select(checkpoint["cutoff"], checkpoint["cursor"], self.chunk_size)
+            ).scalars().all()
+
+            phase, cursor = checkpoint["phase"], checkpoint["cursor"]
+            if student_ids:
+                counts, _ = self._archive_chunk(db, checkpoint["run_id"], chunk, student_ids, manifest)
+                for name, count in counts.items():
+                    rows_deleted[name] = rows_deleted.get(name, 0) + count
+                rows_deleted["chunks"] = chunk + 1
+                cursor = student_ids[-1]
+            if len(student_ids) < self.chunk_size:
+                phase = PHASE_DONE
+
+            row = db.get(RetentionCheckpoint, self.job_name)
+            row.phase = phase
+            row.cursor = cursor
+            row.rows_deleted = rows_deleted
+            if phase == PHASE_DONE:
+                row.completed_at = datetime.utcnow()
+
+            db.commit()
+
+        if phase == PHASE_DONE:
+            manifest["completed_at"] = datetime.utcnow().isoformat()
+            self.store.save_manifest(manifest)
+
+        return {**checkpoint, "phase": phase, "cursor": cursor, "rows_deleted": rows_deleted}
+
+    def _archive_chunk(
+        self,
+        db: Session,
+        run_id: str,
+        chunk: int,
+        student_ids: Sequence[str],
+        manifest: Dict[str, Any],
+    ) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """Write one chunk's files, record them in the manifest, then delete the rows."""
+        archived_on = datetime.utcnow()
+        name = f"{run_id}-{chunk:06d}"
+        files = []
+
+        for table, model in ARCHIVE_TABLES:
+            entry = self.store.write_table(
+                db,
+                model,
+                archived_rows(table, student_ids),
+                self.store.file_path(table, archived_on, name),
+            )
+            if entry is not None:
+                files.append({
+                    **entry,
+                    "table": table,
+                    "chunk": chunk,
+                    "first_student_id": student_ids[0],
+                    "last_student_id": student_ids[-1],
+                })
+
+        # A retried chunk replaces its earlier entries
+        manifest["files"] = [e for e in manifest["files"] if e["chunk"] != chunk] + files
+        manifest["updated_at"] = datetime.utcnow().isoformat()
+        self.store.save_manifest(manifest)
+
+        counts = {}
+        for table, model in ARCHIVE_TABLES:
+            result = db.execute(delete(model).where(archived_rows(table, student_ids)))
+            counts[table] = result.rowcount
+
+        logger.debug(f"Archival run {run_id}: chunk {chunk} archived {counts}")
+        return counts, files
@@ -6,14 +6,13 @@ Provides async SQLAlchemy engine and session management.
 from typing import AsyncGenerator, Optional
 from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import (
-    create_async_engine,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
 )
-from sqlalchemy.pool import NullPool
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from src.database.engines import registry
 from src.database.models import Base
 
 
@@ -58,8 +57,7 @@ class DatabaseSettings(BaseSettings):
         )
 
 
-# Global engine and session factory
-_engine: Optional[AsyncEngine] = None
+# Global session factory (engines are shared through src.database.engines)
 _async_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
 _settings: Optional[DatabaseSettings] = None
 
@@ -74,7 +72,7 @@ def get_settings() -> DatabaseSettings:
 
 def get_engine(echo: bool = False) -> AsyncEngine:
     """
-    Get or create the async SQLAlchemy engine.
+    Get the shared async SQLAlchemy engine.
 
     Args:
         echo: Enable SQL query logging
@@ -82,22 +80,10 @@ def get_engine(echo: bool = False) -> AsyncEngine:
     Returns:
         Async SQLAlchemy engine
     """
-    global _engine
-
-    if _engine is None:
-        settings = get_settings()
-
-        _engine = create_async_engine(
-            settings.database_url,
-            echo=echo or settings.db_echo,
-            pool_size=settings.db_pool_size,
-            max_overflow=settings.db_max_overflow,
-            pool_timeout=settings.db_pool_timeout,
-            pool_recycle=settings.db_pool_recycle,
-            pool_pre_ping=True,  # Verify connections before using
-        )
-
-    return _engine
+    engine = registry.async_engine()
+    if echo:
+        engine.sync_engine.echo = True
+    return engine
 
 
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
@@ -110,13 +96,9 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
     global _async_session_factory
 
     if _async_session_factory is None:
-        engine = get_engine()
-        _async_session_factory = async_sessionmaker(
-            engine,
-            class_=AsyncSession,
+        _async_session_factory = registry.async_session_factory(
             expire_on_commit=False,  # Don't expire objects after commit
             autoflush=False,  # Manual flush control
-            autocommit=False,  # Manual commit control
         )
 
     return _async_session_factory
@@ -174,13 +156,8 @@ async def close_db() -> None:
     Close database connections and dispose of the engine.
     Call this during application shutdown.
     """
-    global _engine, _async_session_factory
-
-    if _engine is not None:
-        await _engine.dispose()
-        _engine = None
-        _async_session_factory = None
-        print("Database connections closed.")
+    await registry.dispose_async()
+    print("Database connections closed.")
 
 
 # Dependency injection for FastAPI
@@ -4,10 +4,16 @@ SQLAlchemy Custom Types for Encrypted Fields
 Provides transparent encryption/decryption for database columns containing PII.
 Data is encrypted before storage and decrypted on retrieval using AES-256.
 
+For large result sets (exports, GDPR requests, retention scans), map the
+ciphertext column as a plain String and expose it through EncryptedAttribute:
+values are decrypted on first access only, and prefetch_decrypted decrypts a
+whole batch of loaded rows in one call. BlindIndex columns allow equality
+lookups without decrypting any row.
+
 Task: 14.6 - Data Encryption & Privacy Measures
 """
 
-from typing import Optional
+from typing import Any, Iterable, Optional
 from sqlalchemy import TypeDecorator, String, Text
 from sqlalchemy.engine import Dialect
 
@@ -19,7 +25,7 @@ class EncryptedString(TypeDecorator):
     SQLAlchemy type for encrypted string fields.
 
     Transparently encrypts data before INSERT/UPDATE and decrypts on SELECT.
-    Uses AES-256 encryption via Fernet.
+    Uses AES-256-GCM encryption via encryption_service.
 
     Usage:
         class User(Base):
@@ -124,6 +130,125 @@ class EncryptedText(TypeDecorator):
         return encryption_service.decrypt(value)
 
 
+class BlindIndex(TypeDecorator):
+    """
+    SQLAlchemy type for blind index columns.
+
+    Bound values are replaced by encryption_service.blind_index(value), so
+    both writes and comparisons take plaintext while only the keyed hash is
+    stored. Loaded values are the stored hashes.
+
+    Usage:
+        class Student(Base):
+            __tablename__ = "students"
+
+            email_ciphertext = Column(String(500))
+            email_index = Column(BlindIndex(), index=True)
+
+        # Finds the row without decrypting any email
+        select(Student).where(Student.email_index == "student@example.com")
+    """
+
+    impl = String
+    cache_ok = True
+
+    def __init__(self, length: int = 64, *args, **kwargs):
+        super().__init__(length, *args, **kwargs)
+
+    def process_bind_param(self, value: Optional[str], dialect: Dialect) -> Optional[str]:
+        """Hash value before storing or comparing."""
+        if value is None:
+            return None
+
+        return encryption_service.blind_index(value)
+
+
+class EncryptedAttribute:
+    """
+    Model attribute backed by a ciphertext column, decrypted on first access.
+
+    Assigning a plaintext value encrypts it into the ciphertext column and,
+    if given, fills the blind index column. Reading decrypts once and caches
+    the plaintext on the instance until the ciphertext changes.
+
+    Usage:
+        class Student(Base):
+            __tablename__ = "students"
+
+            email_ciphertext = Column(String(500))
+            email_index = Column(BlindIndex(), index=True)
+            email = EncryptedAttribute("email_ciphertext", blind_index="email_index")
+
+        students = session.scalars(select(Student)).all()
+        prefetch_decrypted(students, "email")  # One batch instead of N calls
+    """
+
+    def __init__(self, ciphertext_attr: str, blind_index: Optional[str] = None):
+        """
+        Args:
+            ciphertext_attr: Mapped attribute holding the ciphertext
+            blind_index: Mapped BlindIndex attribute to keep in sync
+        """
+        self.ciphertext_attr = ciphertext_attr
+        self.blind_index_attr = blind_index
+        self.name = ciphertext_attr
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+        self.cache_key = f"_decrypted_{name}"
+
+    def cached(self, instance) -> Optional[tuple]:
+        """(ciphertext, plaintext) if the current ciphertext is already decrypted."""
+        entry = instance.__dict__.get(self.cache_key)
+        if entry is not None and entry[0] == getattr(instance, self.ciphertext_attr):
+            return entry
+        return None
+
+    def fill(self, instance, ciphertext: Optional[str], plaintext: Optional[str]) -> None:
+        instance.__dict__[self.cache_key] = (ciphertext, plaintext)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        entry = self.cached(instance)
+        if entry is None:
+            ciphertext = getattr(instance, self.ciphertext_attr)
+            entry = (ciphertext, encryption_service.decrypt(ciphertext) if ciphertext else ciphertext)
+            instance.__dict__[self.cache_key] = entry
+        return entry[1]
+
+    def __set__(self, instance, value: Optional[str]) -> None:
+        ciphertext = encryption_service.encrypt(value) if value else value
+        setattr(instance, self.ciphertext_attr, ciphertext)
+        if self.blind_index_attr:
+            setattr(instance, self.blind_index_attr, value)
+        self.fill(instance, ciphertext, value)
+
+
+def prefetch_decrypted(instances: Iterable[Any], *attributes: str) -> None:
+    """
+    Decrypt EncryptedAttribute values for many loaded instances in one batch.
+
+    Args:
+        instances: Model instances (e.g. a page of query results)
+        attributes: Names of EncryptedAttribute attributes to decrypt
+    """
+    instances = list(instances)
+    if not instances:
+        return
+
+    model = type(instances[0])
+    for name in attributes:
+        attribute = getattr(model, name)
+        pending = [instance for instance in instances if attribute.cached(instance) is None]
+        ciphertexts = [getattr(instance, attribute.ciphertext_attr) for instance in pending]
+        for instance, ciphertext, plaintext in zip(
+            pending, ciphertexts, encryption_service.decrypt_many(ciphertexts)
+        ):
+            attribute.fill(instance, ciphertext, plaintext)
+
+
 # Convenience type aliases for common PII fields
 EncryptedEmail = EncryptedString  # For email addresses
 EncryptedPhone = EncryptedString  # For phone numbers
@@ -210,16 +335,20 @@ class User(Base):
    - VARCHAR(255) → VARCHAR(500) for encrypted fields
 
 2. **Indexing**: Cannot index encrypted fields for searching
-   - Create separate hash columns for searching if needed
-   - Use `anonymization_service.hash_for_analytics()` for search indexes
+   - Add a `BlindIndex()` column next to the ciphertext and index it
+   - Query with plaintext: `where(Student.email_index == email)`
 
-3. **Performance**: Encryption adds ~0.1ms per field
+3. **Performance**: Encryption adds ~0.05ms per field
    - Minimize encrypted fields to only PII
-   - Consider caching decrypted values in application layer
-
-4. **Key Rotation**: Plan for encryption key rotation
-   - Store key version with data
-   - Implement re-encryption strategy
+   - For large result sets use `EncryptedAttribute` + `prefetch_decrypted`,
+     or `encryption_service.decrypt_many()` on raw ciphertexts
+
+4. **Key Rotation**: Ciphertexts carry the ID of the key that wrote them
+   - Set a new `ENCRYPTION_KEY` / `ENCRYPTION_KEY_ID` and move the old key
+     to `ENCRYPTION_RETIRED_KEYS` ("k1:<key>"); old values stay readable
+   - Re-encrypt in batches with `encryption_service.rotate()`; it raises
+     ValueError for values no configured key can decrypt
+   - Pin `BLIND_INDEX_KEY` before rotating, or blind indexes change too
 
 5. **Backup & Recovery**: Encrypted backups require the encryption key
    - Store encryption keys separately (e.g., AWS Secrets Manager)
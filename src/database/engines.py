@@ -0,0 +1,371 @@
+"""
+Shared SQLAlchemy engine registry for the API and background workers.
+
+Every process gets at most one engine per (driver, target) pair:
+
+- driver: "sync" (psycopg2, Celery tasks) or "async" (asyncpg, API and
+  async tasks)
+- target: "primary", or "replica" for read-only work when a read replica is
+  configured (falls back to the primary otherwise)
+
+Engines are created on first use, so importing a module never opens a pool.
+Pool sizing depends on the process role: the API uses db_pool_size /
+db_max_overflow, Celery worker processes use the smaller
+db_worker_pool_size / db_worker_max_overflow, because prefork multiplies the
+pool by the worker concurrency. Celery signals in src/workers/celery_app.py
+switch the role to "worker" and call reset_after_fork() in each child, so
+children never share the parent's connections.
+
+With db_pgbouncer_transaction_mode, PgBouncer does the pooling: engines use
+NullPool and asyncpg prepared statements are disabled, since a transaction
+pooler can hand consecutive statements to different server connections.
+
+Pool wait time (waiting for a free connection) and checkout duration (how
+long a connection is held) are exported as Prometheus histograms.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
+from prometheus_client import Histogram
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+ROLES = ("api", "worker")
+
+
+# ============================================================================
+# Prometheus Metrics
+# ============================================================================
+
+db_pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["role", "driver", "target"],
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0],
+)
+
+db_connection_checkout_seconds = Histogram(
+    "db_connection_checkout_seconds",
+    "Time a connection is checked out of the pool",
+    ["role", "driver", "target"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 300.0],
+)
+
+
+class _TimedPoolMixin:
+    """Records how long _do_get waits for a connection."""
+
+    _wait_metric = None  # Set on the per-engine subclass
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self._wait_metric.observe(time.perf_counter() - started)
+
+
+def _timed_pool_class(base: type, labels: Dict[str, str]) -> type:
+    # A subclass per engine: pool.recreate() on dispose keeps the class
+    return type(
+        f"Timed{base.__name__}",
+        (_TimedPoolMixin, base),
+        {"_wait_metric": db_pool_wait_seconds.labels(**labels)},
+    )
+
+
+def _track_checkout(engine: Engine, labels: Dict[str, str]) -> None:
+    metric = db_connection_checkout_seconds.labels(**labels)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            metric.observe(time.perf_counter() - started)
+
+
+# ============================================================================
+# Session Factories
+# ============================================================================
+
+class _RegistryBoundMixin:
+    """Binds the factory to the registry's current engine when a session is made."""
+
+    def _bind_engine(self) -> None:
+        engine = self._engine_getter()
+        if self.kw.get("bind") is not engine:
+            self.configure(bind=engine)
+
+    def __call__(self, **local_kw):
+        self._bind_engine()
+        return super().__call__(**local_kw)
+
+    def begin(self):
+        self._bind_engine()
+        return super().begin()
+
+
+class RegistrySessionMaker(_RegistryBoundMixin, sessionmaker):
+    """sessionmaker whose engine is resolved from the registry on use."""
+
+    def __init__(self, engine_getter: Callable[[], Engine], **kw):
+        super().__init__(**kw)
+        self._engine_getter = engine_getter
+
+
+class RegistryAsyncSessionMaker(_RegistryBoundMixin, async_sessionmaker):
+    """async_sessionmaker whose engine is resolved from the registry on use."""
+
+    def __init__(self, engine_getter: Callable[[], AsyncEngine], **kw):
+        super().__init__(**kw)
+        self._engine_getter = engine_getter
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+class EngineRegistry:
+    """Lazily created, role-sized engines shared by everything in a process."""
+
+    def __init__(self, settings=None, role: str = "api"):
+        """
+        Initialize the registry.
+
+        Args:
+            settings: Settings object (defaults to src.api.config.settings)
+            role: Process role that selects pool sizing (api or worker)
+        """
+        self._settings = settings
+        self.role = role
+        self._engines: Dict[Tuple[str, str], Any] = {}
+        self._listeners: List[Callable[[Any], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def settings(self):
+        if self._settings is None:
+            from ..api.config import settings
+            self._settings = settings
+        return self._settings
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+
+    def configure(self, role: str) -> None:
+        """
+        Set the process role. Engines created for another role are dropped.
+
+        Raises:
+            ValueError: If the role is unknown
+        """
+        if role not in ROLES:
+            raise ValueError(f"Unknown engine role '{role}'. Available: {', '.join(ROLES)}")
+        if role == self.role:
+            return
+        with self._lock:
+            self._dispose_all(close=False)
+            self.role = role
+        logger.info(f"Database engine role set to {role}")
+
+    def add_listener(self, listener: Callable[[Any], None]) -> None:
+        """Call listener(engine) for every engine, existing and future."""
+        with self._lock:
+            self._listeners.append(listener)
+            engines = list(self._engines.values())
+        for engine in engines:
+            listener(engine)
+
+    def has_replica(self) -> bool:
+        return bool(self.settings.db_replica_host)
+
+    def _url(self, driver: str, target: str) -> str:
+        s = self.settings
+        host, port = s.postgres_host, s.postgres_port
+        if target == "replica":
+            host, port = s.db_replica_host, s.db_replica_port
+        dialect = "postgresql+asyncpg" if driver == "async" else "postgresql+psycopg2"
+        return f"{dialect}://{s.postgres_user}:{s.postgres_password}@{host}:{port}/{s.postgres_db}"
+
+    def pool_options(self, driver: str) -> Dict[str, Any]:
+        """Engine keyword arguments for this role's pool."""
+        s = self.settings
+        if s.db_pgbouncer_transaction_mode:
+            options = {"poolclass": NullPool}
+            if driver == "async":
+                options["connect_args"] = {
+                    "statement_cache_size": 0,
+                    "prepared_statement_cache_size": 0,
+                    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+                }
+            return options
+
+        if self.role == "worker":
+            pool_size, max_overflow = s.db_worker_pool_size, s.db_worker_max_overflow
+        else:
+            pool_size, max_overflow = s.db_pool_size, s.db_max_overflow
+        return {
+            "poolclass": AsyncAdaptedQueuePool if driver == "async" else QueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": s.db_pool_timeout,
+            "pool_recycle": s.db_pool_recycle,
+        }
+
+    # ------------------------------------------------------------------
+    # Engines
+    # ------------------------------------------------------------------
+
+    def _get(self, driver: str, replica: bool):
+        target = "replica" if replica and self.has_replica() else "primary"
+        key = (driver, target)
+        engine = self._engines.get(key)
+        if engine is not None:
+            return engine
+
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = self._create(driver, target)
+                self._engines[key] = engine
+                listeners = list(self._listeners)
+            else:
+                listeners = []
+        for listener in listeners:
+            listener(engine)
+        return engine
+
+    def _create(self, driver: str, target: str):
+        labels = {"role": self.role, "driver": driver, "target": target}
+        options = self.pool_options(driver)
+        options["poolclass"] = _timed_pool_class(options["poolclass"], labels)
+
+        if driver == "async":
+            engine = create_async_engine(
+                self._url(driver, target),
+                echo=self.settings.db_echo,
+                pool_pre_ping=True,
+                **options,
+            )
+            _track_checkout(engine.sync_engine, labels)
+        else:
+            engine = create_engine(
+                self._url(driver, target),
+                echo=self.settings.db_echo,
+                pool_pre_ping=True,
+                **options,
+            )
+            _track_checkout(engine, labels)
+
+        logger.info(
+            f"Created {driver} {target} engine for role {self.role} "
+            f"({options['poolclass'].__name__}, size={options.get('pool_size', 0)}, "
+            f"overflow={options.get('max_overflow', 0)})"
+        )
+        return engine
+
+    def sync_engine(self, replica: bool = False) -> Engine:
+        """Shared psycopg2 engine (replica=True for read-only work)."""
+        return self._get("sync", replica)
+
+    def async_engine(self, replica: bool = False) -> AsyncEngine:
+        """Shared asyncpg engine (replica=True for read-only work)."""
+        return self._get("async", replica)
+
+    def sync_session_factory(self, replica: bool = False, **kw) -> RegistrySessionMaker:
+        """New session factory bound to the sync engine when used."""
+        kw.setdefault("autoflush", False)
+        return RegistrySessionMaker(lambda: self.sync_engine(replica), **kw)
+
+    def async_session_factory(self, replica: bool = False, **kw) -> RegistryAsyncSessionMaker:
+        """New async session factory bound to the async engine when used."""
+        kw.setdefault("class_", AsyncSession)
+        kw.setdefault("expire_on_commit", False)
+        return RegistryAsyncSessionMaker(lambda: self.async_engine(replica), **kw)
+
+    # ------------------------------------------------------------------
+    # Disposal
+    # ------------------------------------------------------------------
+
+    def _dispose_all(self, close: bool) -> None:
+        for (driver, _), engine in self._engines.items():
+            sync_engine = engine.sync_engine if driver == "async" else engine
+            # Async connections can only be closed on their event loop
+            sync_engine.dispose(close=close and driver == "sync")
+        self._engines.clear()
+
+    def reset_after_fork(self) -> None:
+        """
+        Drop pooled connections inherited from the parent process.
+
+        The parent's sockets are left open for the parent; the child opens
+        its own connections on first use.
+        """
+        with self._lock:
+            for engine in self._engines.values():
+                sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+                sync_engine.dispose(close=False)
+
+    def dispose(self) -> None:
+        """Close sync connections and forget all engines."""
+        with self._lock:
+            self._dispose_all(close=True)
+
+    async def dispose_async(self) -> None:
+        """Close all connections, including async ones, and forget all engines."""
+        with self._lock:
+            engines = list(self._engines.items())
+            self._engines.clear()
+        for (driver, _), engine in engines:
+            if driver == "async":
+                await engine.dispose()
+            else:
+                engine.dispose()
+
+
+registry = EngineRegistry()
+
+
+def get_sync_engine(replica: bool = False) -> Engine:
+    """Shared psycopg2 engine for this process."""
+    return registry.sync_engine(replica)
+
+
+def get_async_engine(replica: bool = False) -> AsyncEngine:
+    """Shared asyncpg engine for this process."""
+    return registry.async_engine(replica)
+
+
+_sync_factories: Dict[bool, RegistrySessionMaker] = {}
+
+
+def get_sync_session(replica: bool = False) -> Session:
+    """
+    New sync ORM session on the shared engine. The caller closes it.
+
+    Args:
+        replica: Use the read replica (if configured) for read-only work
+    """
+    factory = _sync_factories.get(replica)
+    if factory is None:
+        factory = _sync_factories.setdefault(replica, registry.sync_session_factory(replica))
+    return factory()
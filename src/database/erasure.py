@@ -0,0 +1,418 @@
+"""
+Set-based, resumable GDPR erasure.
+
+Erases one or many users' data (GDPR Article 17) with chunked UPDATE/DELETE
+... RETURNING statements instead of loading and deleting ORM objects one at a
+time. Phases run in dependency order, children before parents, so deleting a
+tutor, student or session never cascades into a large implicit delete:
+
+    student_feedback, first_session_predictions, sessions, notifications,
+    performance_metrics, churn_predictions, interventions, tutor_events,
+    manager_notes, audit_logs (anonymized or deleted), tutor, student,
+    user_account
+
+Every phase covers all users in the request at once. Each chunk runs in its
+own short transaction with lock and statement timeouts, and the request's
+phase and row counts are updated in that same transaction, so an interrupted
+job resumes exactly where it stopped. Unlike retention cleanup, chunks do not
+SKIP LOCKED: erasure must not leave locked rows behind, so a chunk waits (up
+to the lock timeout, then retries) instead.
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import (
+    any_, bindparam, case, delete, func, literal, or_, select, update, String,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from src.database.models import (
+    AuditLog,
+    ChurnPrediction,
+    ErasureRequest,
+    FirstSessionPrediction,
+    Intervention,
+    ManagerNote,
+    Notification,
+    Session as SessionModel,
+    Student,
+    StudentFeedback,
+    Tutor,
+    TutorEvent,
+    TutorPerformanceMetric,
+    User,
+)
+from src.database.retention import (
+    RETENTION_LOCK_TIMEOUT_MS,
+    RETENTION_STATEMENT_TIMEOUT_MS,
+    run_chunk_with_retry,
+    set_chunk_timeouts,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Rows updated or deleted per transaction
+ERASURE_CHUNK_SIZE = 5000
+
+PHASE_DONE = "done"
+
+
+@dataclass(frozen=True)
+class ErasureTargets:
+    """Keys of everything erased for a request."""
+
+    user_ids: Sequence[int]
+    tutor_ids: Sequence[str]
+    student_ids: Sequence[str]
+    retain_audit_logs: bool = True
+
+
+def _in_ids(column, ids: Sequence[Any]):
+    """
+    ``column = ANY(:ids)`` with the IDs bound as one array parameter.
+
+    A request may name up to 100,000 users; IN (...) would bind one
+    parameter per ID and exceed the driver's limit of 32,767.
+    """
+    return column == any_(bindparam(None, list(ids), type_=ARRAY(column.type)))
+
+
+def chunked_delete(model, key, condition, chunk_size: int):
+    """
+    DELETE for one chunk of rows matching a condition.
+
+    Args:
+        model: Mapped class
+        key: Primary key column
+        condition: Rows to delete
+        chunk_size: Maximum rows deleted
+
+    Returns:
+        Delete statement returning the deleted keys
+    """
+    doomed = (
+        select(key)
+        .where(condition)
+        .limit(chunk_size)
+        .with_for_update()
+        .cte("doomed")
+    )
+    return delete(model).where(key.in_(select(doomed.c[key.key]))).returning(key)
+
+
+def audit_logs_anonymize(user_ids: Sequence[int], chunk_size: int):
+    """
+    UPDATE for one chunk of audit logs: drop the user link and PII metadata.
+
+    Logs leave the selection once their user_id is cleared, so repeated
+    chunks walk through all of a user's logs.
+
+    Args:
+        user_ids: Users whose audit logs are anonymized
+        chunk_size: Maximum rows updated
+
+    Returns:
+        Update statement returning the anonymized log IDs
+    """
+    doomed = (
+        select(AuditLog.log_id)
+        .where(_in_ids(AuditLog.user_id, user_ids))
+        .limit(chunk_size)
+        .with_for_update()
+        .cte("doomed")
+    )
+    metadata = AuditLog.audit_metadata
+    scrubbed = (
+        metadata.op("-")(literal("email", String))
+        .op("-")(literal("name", String))
+        .op("||")(func.jsonb_build_object("anonymized", True))
+    )
+    return (
+        update(AuditLog)
+        .where(AuditLog.log_id.in_(select(doomed.c.log_id)))
+        .values({
+            AuditLog.user_id: None,
+            metadata: case((func.jsonb_typeof(metadata) == "object", scrubbed), else_=metadata),
+        })
+        .returning(AuditLog.log_id)
+    )
+
+
+def _for_people(model, targets: ErasureTargets):
+    conditions = []
+    if targets.tutor_ids:
+        conditions.append(_in_ids(model.tutor_id, targets.tutor_ids))
+    if targets.student_ids:
+        conditions.append(_in_ids(model.student_id, targets.student_ids))
+    return or_(*conditions) if conditions else None
+
+
+def _for_tutors(model, targets: ErasureTargets):
+    return _in_ids(model.tutor_id, targets.tutor_ids) if targets.tutor_ids else None
+
+
+# (phase, model, key, condition) in dependency order; the audit_logs phase
+# is built separately because it may anonymize instead of delete
+ERASURE_PHASES: List[tuple] = [
+    ("student_feedback", StudentFeedback, StudentFeedback.feedback_id,
+     lambda t: _for_people(StudentFeedback, t)),
+    ("first_session_predictions", FirstSessionPrediction, FirstSessionPrediction.prediction_id,
+     lambda t: _for_people(FirstSessionPrediction, t)),
+    ("sessions", SessionModel, SessionModel.session_id,
+     lambda t: _for_people(SessionModel, t)),
+    ("notifications", Notification, Notification.notification_id,
+     lambda t: _in_ids(Notification.recipient_id, [str(user_id) for user_id in t.user_ids])),
+    ("performance_metrics", TutorPerformanceMetric, TutorPerformanceMetric.metric_id,
+     lambda t: _for_tutors(TutorPerformanceMetric, t)),
+    ("churn_predictions", ChurnPrediction, ChurnPrediction.prediction_id,
+     lambda t: _for_tutors(ChurnPrediction, t)),
+    ("interventions", Intervention, Intervention.intervention_id,
+     lambda t: _for_tutors(Intervention, t)),
+    ("tutor_events", TutorEvent, TutorEvent.event_id,
+     lambda t: _for_tutors(TutorEvent, t)),
+    ("manager_notes", ManagerNote, ManagerNote.note_id,
+     lambda t: _for_tutors(ManagerNote, t)),
+    ("audit_logs", AuditLog, AuditLog.log_id,
+     lambda t: _in_ids(AuditLog.user_id, t.user_ids)),
+    ("tutor", Tutor, Tutor.tutor_id,
+     lambda t: _in_ids(Tutor.tutor_id, t.tutor_ids) if t.tutor_ids else None),
+    ("student", Student, Student.student_id,
+     lambda t: _in_ids(Student.student_id, t.student_ids) if t.student_ids else None),
+    ("user_account", User, User.id,
+     lambda t: _in_ids(User.id, t.user_ids)),
+]
+
+PHASE_NAMES = [phase[0] for phase in ERASURE_PHASES]
+
+
+def phase_statement(phase: str, targets: ErasureTargets, chunk_size: int):
+    """
+    Statement for one chunk of a phase.
+
+    Returns:
+        UPDATE/DELETE ... RETURNING statement, or None if the phase has
+        nothing to do for these targets (e.g. no tutors)
+    """
+    _, model, key, condition = ERASURE_PHASES[PHASE_NAMES.index(phase)]
+    if phase == "audit_logs" and targets.retain_audit_logs:
+        return audit_logs_anonymize(targets.user_ids, chunk_size)
+
+    where = condition(targets)
+    if where is None:
+        return None
+    return chunked_delete(model, key, where, chunk_size)
+
+
+def _next_phase(phase: str) -> str:
+    index = PHASE_NAMES.index(phase) + 1
+    return PHASE_NAMES[index] if index < len(PHASE_NAMES) else PHASE_DONE
+
+
+class BulkErasure:
+    """
+    Resumable, set-based erasure of one or many users.
+
+    Create a request with create(), then run(request_id). A run stops early
+    when its time budget is spent; running the same request again resumes it.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        chunk_size: int = ERASURE_CHUNK_SIZE,
+        lock_timeout_ms: int = RETENTION_LOCK_TIMEOUT_MS,
+        statement_timeout_ms: int = RETENTION_STATEMENT_TIMEOUT_MS,
+        time_budget_seconds: Optional[float] = None,
+        pause_seconds: float = 0.0,
+    ):
+        """
+        Initialize erasure.
+
+        Args:
+            session_factory: Creates synchronous database sessions
+            chunk_size: Rows updated or deleted per transaction
+            lock_timeout_ms: lock_timeout for each chunk
+            statement_timeout_ms: statement_timeout for each chunk
+            time_budget_seconds: Stop (resumably) after this long; None for no limit
+            pause_seconds: Sleep between chunks to leave room for other writers
+        """
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.lock_timeout_ms = lock_timeout_ms
+        self.statement_timeout_ms = statement_timeout_ms
+        self.time_budget_seconds = time_budget_seconds
+        self.pause_seconds = pause_seconds
+
+    def create(
+        self,
+        user_ids: Sequence[int],
+        reason: str,
+        retain_audit_logs: bool = True,
+        requested_by: Optional[int] = None,
+    ) -> str:
+        """
+        Record an erasure request, resolving the users' tutor and student IDs.
+
+        Args:
+            user_ids: Users to erase (unknown IDs are ignored)
+            reason: Reason for erasure
+            retain_audit_logs: Anonymize audit logs instead of deleting them
+            requested_by: User who requested the erasure
+
+        Returns:
+            Request ID
+        """
+        request_id = f"erasure_{uuid.uuid4().hex[:16]}"
+
+        with self.session_factory() as db:
+            users = db.execute(
+                select(User.id, User.tutor_id, User.student_id).where(_in_ids(User.id, user_ids))
+            ).all()
+
+            db.add(ErasureRequest(
+                request_id=request_id,
+                user_ids=sorted(row.id for row in users),
+                tutor_ids=sorted({row.tutor_id for row in users if row.tutor_id}),
+                student_ids=sorted({row.student_id for row in users if row.student_id}),
+                reason=reason,
+                retain_audit_logs=retain_audit_logs,
+                phase=PHASE_NAMES[0],
+                rows_affected={},
+                requested_by=requested_by,
+                started_at=datetime.utcnow(),
+            ))
+            db.commit()
+
+        return request_id
+
+    def run(self, request_id: str) -> Dict[str, Any]:
+        """
+        Run (or resume) an erasure request.
+
+        Args:
+            request_id: Request ID from create()
+
+        Returns:
+            Dict with request_id, users, rows_affected (per phase), chunks
+            and completed
+        """
+        started = time.monotonic()
+
+        with self.session_factory() as db:
+            row = db.get(ErasureRequest, request_id)
+            if row is None:
+                raise ValueError(f"Erasure request {request_id} not found")
+            targets = ErasureTargets(
+                user_ids=list(row.user_ids),
+                tutor_ids=list(row.tutor_ids),
+                student_ids=list(row.student_ids),
+                retain_audit_logs=row.retain_audit_logs,
+            )
+            phase = row.phase
+            rows_affected = dict(row.rows_affected or {})
+
+        if phase != PHASE_NAMES[0] and phase != PHASE_DONE:
+            logger.info(f"Resuming erasure {request_id} in phase {phase}")
+
+        chunks = 0
+        while phase != PHASE_DONE:
+            if self.time_budget_seconds is not None and time.monotonic() - started >= self.time_budget_seconds:
+                logger.info(f"Erasure {request_id} paused after {chunks} chunks (time budget)")
+                break
+
+            phase, rows_affected = self._run_chunk(request_id, targets, phase, rows_affected)
+            chunks += 1
+
+            if self.pause_seconds:
+                time.sleep(self.pause_seconds)
+
+        return {
+            "request_id": request_id,
+            "users": len(targets.user_ids),
+            "rows_affected": rows_affected,
+            "chunks": chunks,
+            "completed": phase == PHASE_DONE,
+        }
+
+    def _run_chunk(self, request_id, targets, phase, rows_affected):
+        return run_chunk_with_retry(
+            lambda: self._erase_chunk(request_id, targets, phase, rows_affected),
+            describe=f"Erasure chunk in phase {phase}",
+        )
+
+    def _erase_chunk(self, request_id, targets, phase, rows_affected):
+        stmt = phase_statement(phase, targets, self.chunk_size)
+        rows_affected = dict(rows_affected)
+
+        with self.session_factory() as db:
+            if stmt is None:
+                count = 0
+            else:
+                set_chunk_timeouts(db, self.lock_timeout_ms, self.statement_timeout_ms)
+                count = len(db.execute(stmt).scalars().all())
+                rows_affected[phase] = rows_affected.get(phase, 0) + count
+
+            # Without SKIP LOCKED a short chunk means the phase is exhausted
+            next_phase = _next_phase(phase) if count < self.chunk_size else phase
+
+            row = db.get(ErasureRequest, request_id)
+            row.phase = next_phase
+            row.rows_affected = rows_affected
+            if next_phase == PHASE_DONE:
+                row.completed_at = datetime.utcnow()
+
+            db.commit()
+
+        if count:
+            logger.debug(f"Erasure {request_id}: {count} rows in phase {phase}")
+
+        return next_phase, rows_affected
+
+
+def anonymize_entities_update(entity_type: str, entity_ids: Sequence[str]):
+    """
+    UPDATE anonymizing the PII of tutors or students for analytics.
+
+    Keeps behavioral and statistical columns; replaces names (and tutor
+    email/location, student parent contact) with placeholders derived from
+    the ID.
+
+    Args:
+        entity_type: "tutor" or "student"
+        entity_ids: Tutor or student IDs
+
+    Returns:
+        Update statement returning the anonymized IDs
+    """
+    if entity_type == "tutor":
+        prefix = func.left(Tutor.tutor_id, 8)
+        return (
+            update(Tutor)
+            .where(_in_ids(Tutor.tutor_id, entity_ids))
+            .values(
+                name=literal("ANONYMIZED_TUTOR_") + prefix,
+                # Full ID: emails are unique and ID prefixes are not
+                email=literal("anonymized_") + Tutor.tutor_id + literal("@example.com"),
+                location="REDACTED",
+            )
+            .returning(Tutor.tutor_id)
+        )
+    if entity_type == "student":
+        return (
+            update(Student)
+            .where(_in_ids(Student.student_id, entity_ids))
+            .values(
+                name=literal("ANONYMIZED_STUDENT_") + func.left(Student.student_id, 8),
+                parent_email=None,
+                parent_consent_ip=None,
+            )
+            .returning(Student.student_id)
+        )
+    raise ValueError(f"Unsupported entity type: {entity_type}")
@@ -0,0 +1,965 @@
+"""
+Workload-driven index advisor.
+
+Provides tools for:
+- Capturing real query shapes via SQLAlchemy cursor events and pg_stat_statements
+- Proposing composite, partial and covering indexes for the captured workload
+- Estimating candidate benefit with hypothetical indexes (HypoPG)
+- Flagging unused and redundant indexes from pg_stat_user_indexes / pg_index
+- Detecting drift between ORM index metadata and the live schema
+- Rendering Alembic migrations for the chosen index set
+- Summarizing EXPLAIN plans for plan regression tests
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event, text, MetaData, UniqueConstraint
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL identifier length limit
+MAX_IDENTIFIER_LENGTH = 63
+
+# Maximum non-key columns added to a covering index
+MAX_INCLUDE_COLUMNS = 3
+
+# First server version with EXPLAIN (GENERIC_PLAN); older servers plan
+# parameterized statements through a prepared statement instead
+GENERIC_PLAN_MIN_VERSION = 160000
+
+
+# ==================== Query Shapes ====================
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_BIND_PARAM = re.compile(r"\$\d+(?:::[\w\s\[\]]+?(?=[\s,)]|$))?|%\(\w+\)s|__\[POSTCOMPILE_\w+\]|(?<![:\w]):\w+\b|\?")
+_NUMBER = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_CLAUSE_END = r"(?=\bGROUP\s+BY\b|\bORDER\s+BY\b|\bLIMIT\b|\bOFFSET\b|\bFOR\s+UPDATE\b|\bRETURNING\b|\bUNION\b|\)\s*(?:AS\s+)?\w*\s*(?:JOIN|WHERE|ORDER|GROUP|LIMIT|$)|$)"
+_FROM_TABLE = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+\"?(\w+)\"?(?:\s+(?:AS\s+)?\"?(\w+)\"?)?", re.IGNORECASE)
+_WHERE = re.compile(r"\bWHERE\b(.*?)" + _CLAUSE_END, re.IGNORECASE | re.DOTALL)
+_ORDER_BY = re.compile(r"\bORDER\s+BY\b(.*?)(?=\bLIMIT\b|\bOFFSET\b|\bFOR\s+UPDATE\b|\)|$)", re.IGNORECASE | re.DOTALL)
+_SELECT_LIST = re.compile(r"^\s*SELECT\s+(?:DISTINCT\s+)?(.*?)\s+FROM\b", re.IGNORECASE | re.DOTALL)
+_PREDICATE = re.compile(
+    r"(?<![:\w.\"])(?:\"?(\w+)\"?\.)?\"?(\w+)\"?\s*"
+    r"(IS\s+NOT\s+NULL|IS\s+NULL|>=|<=|<>|!=|=|<|>|\bNOT\s+IN\b|\bIN\b|\bBETWEEN\b|\bLIKE\b|\bILIKE\b)"
+    r"\s*(\"?\w+\"?(?:\.\"?\w+\"?)?|\?|\()?",
+    re.IGNORECASE,
+)
+_COLUMN_REF = re.compile(r"^(?:\"?(\w+)\"?\.)?\"?(\w+)\"?(?:\s+(ASC|DESC))?", re.IGNORECASE)
+
+_SQL_KEYWORDS = {
+    "and", "or", "not", "null", "true", "false", "select", "from", "where",
+    "case", "when", "then", "else", "end", "exists", "any", "all",
+}
+
+_EQUALITY_OPS = {"=", "IN"}
+_RANGE_OPS = {">=", "<=", "<", ">", "BETWEEN"}
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Normalize a statement so queries differing only in literals share a shape.
+
+    String/numeric literals and bind parameters become ``?`` and IN lists
+    collapse to ``IN (?)``. Boolean literals and NULL checks are kept because
+    they identify partial-index predicates.
+
+    Args:
+        sql: SQL statement text
+
+    Returns:
+        Normalized statement
+    """
+    normalized = _STRING_LITERAL.sub("?", sql)
+    normalized = _BIND_PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class TableAccess:
+    """How a single statement accesses one table."""
+
+    table: str
+    equality_columns: List[str] = field(default_factory=list)
+    range_columns: List[str] = field(default_factory=list)
+    order_columns: List[str] = field(default_factory=list)
+    constant_predicates: List[str] = field(default_factory=list)
+    selected_columns: Optional[List[str]] = None  # None means "all columns"
+
+
+@dataclass
+class QueryShape:
+    """A normalized statement with its workload statistics."""
+
+    statement: str
+    calls: int = 0
+    total_time_ms: float = 0.0
+    accesses: Dict[str, TableAccess] = field(default_factory=dict)
+
+    @property
+    def mean_time_ms(self) -> float:
+        return self.total_time_ms / self.calls if self.calls else 0.0
+
+    @property
+    def is_write(self) -> bool:
+        return self.statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+
+
+def _append_unique(items: List[str], value: str) -> None:
+    if value not in items:
+        items.append(value)
+
+
+def parse_query_shape(sql: str, calls: int = 1, total_time_ms: float = 0.0) -> QueryShape:
+    """
+    Extract per-table predicate and ordering columns from a statement.
+
+    Designed for SQLAlchemy-generated SQL, where columns are qualified with
+    their table name or alias.
+
+    Args:
+        sql: SQL statement (raw or normalized)
+        calls: Number of executions observed
+        total_time_ms: Total execution time observed
+
+    Returns:
+        QueryShape with per-table accesses
+    """
+    statement = normalize_sql(sql)
+    shape = QueryShape(statement=statement, calls=calls, total_time_ms=total_time_ms)
+
+    aliases: Dict[str, str] = {}
+    tables: List[str] = []
+    for match in _FROM_TABLE.finditer(statement):
+        table, alias = match.group(1), match.group(2)
+        if table.lower() in _SQL_KEYWORDS or table.lower().startswith("anon_"):
+            continue
+        _append_unique(tables, table)
+        aliases[table] = table
+        if alias and alias.lower() not in _SQL_KEYWORDS and alias.upper() not in {
+            "WHERE", "JOIN", "ON", "LEFT", "RIGHT", "INNER", "OUTER", "FULL",
+            "CROSS", "GROUP", "ORDER", "LIMIT", "SET", "VALUES",
+        }:
+            aliases[alias] = table
+
+    if not tables:
+        return shape
+
+    def resolve(qualifier: Optional[str]) -> Optional[str]:
+        if qualifier:
+            return aliases.get(qualifier)
+        return tables[0] if len(tables) == 1 else None
+
+    def access(table: str) -> TableAccess:
+        if table not in shape.accesses:
+            shape.accesses[table] = TableAccess(table=table)
+        return shape.accesses[table]
+
+    for where in _WHERE.finditer(statement):
+        for match in _PREDICATE.finditer(where.group(1)):
+            qualifier, column, operator, operand = match.groups()
+            table = resolve(qualifier)
+            if table is None or column.lower() in _SQL_KEYWORDS:
+                continue
+            op = _WHITESPACE.sub(" ", operator.upper())
+            operand_lower = (operand or "").lower().strip('"')
+
+            if op in ("IS NULL", "IS NOT NULL"):
+                _append_unique(access(table).constant_predicates, f"{column} {op}")
+            elif op == "=" and operand_lower in ("true", "false"):
+                _append_unique(access(table).constant_predicates, f"{column} = {operand_lower}")
+            elif op in _EQUALITY_OPS:
+                # Join conditions (column = other.column) are equality lookups too
+                _append_unique(access(table).equality_columns, column)
+            elif op in _RANGE_OPS or (op == "LIKE" and operand_lower == "?"):
+                _append_unique(access(table).range_columns, column)
+
+    order = _ORDER_BY.search(statement)
+    if order:
+        for part in order.group(1).split(","):
+            match = _COLUMN_REF.match(part.strip())
+            if not match:
+                continue
+            table = resolve(match.group(1))
+            if table is not None:
+                _append_unique(access(table).order_columns, match.group(2))
+
+    select_list = _SELECT_LIST.search(statement)
+    if select_list and "*" not in select_list.group(1):
+        selected: Dict[str, List[str]] = {}
+        for part in select_list.group(1).split(","):
+            match = _COLUMN_REF.match(part.strip())
+            if not match or "(" in part:
+                continue
+            table = resolve(match.group(1))
+            if table is not None:
+                _append_unique(selected.setdefault(table, []), match.group(2))
+        for table, columns in selected.items():
+            if table in shape.accesses:
+                shape.accesses[table].selected_columns = columns
+
+    return shape
+
+
+class WorkloadRecorder:
+    """
+    Captures query shapes from SQLAlchemy cursor events.
+
+    Usage:
+        workload_recorder.attach(engine)
+        ...
+        shapes = workload_recorder.shapes()
+    """
+
+    def __init__(self, max_shapes: int = 1000):
+        """
+        Initialize recorder.
+
+        Args:
+            max_shapes: Maximum distinct statements tracked
+        """
+        self.max_shapes = max_shapes
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._engines: List[Engine] = []
+
+    def attach(self, engine: Any) -> None:
+        """Start recording statements executed through an engine."""
+        sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        if sync_engine in self._engines:
+            return
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(sync_engine)
+        logger.info(f"Query workload capture enabled for {sync_engine.url.render_as_string(hide_password=True)}")
+
+    def detach(self) -> None:
+        """Stop recording on all attached engines."""
+        for sync_engine in self._engines:
+            event.remove(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("index_advisor_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("index_advisor_start")
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000 if starts else 0.0
+        self.record(statement, elapsed_ms)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        """Record one execution of a statement."""
+        key = normalize_sql(statement)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_shapes:
+                    return
+                stats = self._stats[key] = {"calls": 0, "total_time_ms": 0.0}
+            stats["calls"] += 1
+            stats["total_time_ms"] += elapsed_ms
+
+    def shapes(self) -> List[QueryShape]:
+        """Get recorded query shapes, most expensive first."""
+        with self._lock:
+            snapshot = list(self._stats.items())
+        shapes = [
+            parse_query_shape(statement, int(stats["calls"]), stats["total_time_ms"])
+            for statement, stats in snapshot
+        ]
+        return sorted(shapes, key=lambda s: s.total_time_ms, reverse=True)
+
+    def reset(self) -> None:
+        """Clear recorded statements."""
+        with self._lock:
+            self._stats = {}
+
+
+# ==================== Indexes ====================
+
+@dataclass
+class IndexInfo:
+    """An existing index (live schema or ORM metadata)."""
+
+    name: str
+    table: str
+    columns: List[str]
+    include_columns: List[str] = field(default_factory=list)
+    predicate: Optional[str] = None
+    unique: bool = False
+    primary: bool = False
+    size_bytes: int = 0
+    scans: int = 0
+
+    def covers(self, columns: Sequence[str], predicate: Optional[str]) -> bool:
+        """Whether this index can serve a lookup on ``columns`` (as a prefix)."""
+        if self.predicate and _normalize_predicate(self.predicate) != _normalize_predicate(predicate):
+            return False
+        return list(columns) == self.columns[:len(columns)]
+
+
+@dataclass
+class IndexCandidate:
+    """A proposed index with the workload that motivates it."""
+
+    table: str
+    columns: List[str]
+    include_columns: List[str] = field(default_factory=list)
+    predicate: Optional[str] = None
+    weight_ms: float = 0.0
+    calls: int = 0
+    statements: List[str] = field(default_factory=list)
+    estimated_cost_before: Optional[float] = None
+    estimated_cost_after: Optional[float] = None
+    estimate_error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        suffix = "_partial" if self.predicate else ""
+        name = f"idx_{self.table}_{'_'.join(self.columns)}{suffix}"
+        return name[:MAX_IDENTIFIER_LENGTH]
+
+    @property
+    def estimated_improvement_pct(self) -> Optional[float]:
+        if not self.estimated_cost_before or self.estimated_cost_after is None:
+            return None
+        return round((1 - self.estimated_cost_after / self.estimated_cost_before) * 100, 2)
+
+    def ddl(self) -> str:
+        """CREATE INDEX statement for this candidate."""
+        columns = ", ".join(_quote(c) for c in self.columns)
+        statement = f"CREATE INDEX {self.name} ON {_quote(self.table)} ({columns})"
+        if self.include_columns:
+            statement += f" INCLUDE ({', '.join(_quote(c) for c in self.include_columns)})"
+        if self.predicate:
+            statement += f" WHERE {self.predicate}"
+        return statement
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "table": self.table,
+            "columns": self.columns,
+            "include_columns": self.include_columns,
+            "predicate": self.predicate,
+            "ddl": self.ddl(),
+            "weight_ms": round(self.weight_ms, 2),
+            "calls": self.calls,
+            "estimated_cost_before": self.estimated_cost_before,
+            "estimated_cost_after": self.estimated_cost_after,
+            "estimated_improvement_pct": self.estimated_improvement_pct,
+            "estimate_error": self.estimate_error,
+            "example_statements": self.statements[:3],
+        }
+
+
+def _quote(identifier: str) -> str:
+    """Quote identifiers that collide with SQL keywords (e.g. "window")."""
+    return f'"{identifier}"' if identifier.lower() in {"window", "order", "user", "group"} else identifier
+
+
+def _normalize_predicate(predicate: Optional[str]) -> str:
+    if not predicate:
+        return ""
+    normalized = predicate.lower().replace("(", "").replace(")", "").replace('"', "")
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def candidate_for_access(access: TableAccess) -> Optional[IndexCandidate]:
+    """
+    Build the index a single table access would benefit from.
+
+    Key order follows the usual B-tree rule: equality columns, then one
+    range column, then ORDER BY columns. Constant predicates (booleans and
+    NULL checks) become a partial-index WHERE clause, and narrow column-only
+    selects get the remaining selected columns as INCLUDE columns.
+    """
+    predicate_columns = {p.split(" ")[0] for p in access.constant_predicates}
+    keys = [c for c in access.equality_columns if c not in predicate_columns]
+
+    range_columns = [c for c in access.range_columns if c not in keys and c not in predicate_columns]
+    if range_columns:
+        keys.append(range_columns[0])
+    else:
+        for column in access.order_columns:
+            _append_unique(keys, column)
+
+    if not keys:
+        return None
+
+    include: List[str] = []
+    if access.selected_columns is not None:
+        include = [c for c in access.selected_columns if c not in keys]
+        if len(include) > MAX_INCLUDE_COLUMNS:
+            include = []
+
+    predicate = " AND ".join(sorted(access.constant_predicates)) or None
+    return IndexCandidate(
+        table=access.table,
+        columns=keys,
+        include_columns=include,
+        predicate=predicate,
+    )
+
+
+class IndexAdvisor:
+    """
+    Proposes and audits indexes for the observed workload.
+
+    Usage:
+        advisor = IndexAdvisor()
+        report = await advisor.build_report(session, workload_recorder.shapes())
+    """
+
+    def __init__(
+        self,
+        min_weight_ms: float = 100.0,
+        max_candidates: int = 20,
+        min_unused_size_bytes: int = 1024 * 1024,
+    ):
+        """
+        Initialize advisor.
+
+        Args:
+            min_weight_ms: Minimum total query time for a candidate to be proposed
+            max_candidates: Maximum number of proposed indexes
+            min_unused_size_bytes: Ignore unused indexes smaller than this
+        """
+        self.min_weight_ms = min_weight_ms
+        self.max_candidates = max_candidates
+        self.min_unused_size_bytes = min_unused_size_bytes
+        self._server_version: Optional[int] = None
+
+    # ---------- Workload ----------
+
+    async def load_pg_stat_statements(
+        self,
+        session: AsyncSession,
+        limit: int = 200,
+    ) -> List[QueryShape]:
+        """
+        Load query shapes from pg_stat_statements.
+
+        Requires the pg_stat_statements extension. Returns an empty list if
+        it is not available.
+        """
+        query = text("""
+            SELECT query, calls, total_exec_time
+            FROM pg_stat_statements
+            WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+              AND query ~* '^\\s*(SELECT|UPDATE|DELETE)'
+            ORDER BY total_exec_time DESC
+            LIMIT :limit
+        """)
+
+        try:
+            result = await session.execute(query, {"limit": limit})
+            return [
+                parse_query_shape(row[0], int(row[1]), float(row[2]))
+                for row in result.fetchall()
+            ]
+        except Exception as e:
+            logger.warning(f"pg_stat_statements unavailable: {e}")
+            await session.rollback()
+            return []
+
+    # ---------- Existing indexes ----------
+
+    async def load_existing_indexes(self, session: AsyncSession) -> List[IndexInfo]:
+        """Load all indexes in the public schema with usage statistics."""
+        query = text("""
+            SELECT
+                i.relname AS index_name,
+                t.relname AS table_name,
+                ARRAY(
+                    SELECT a.attname
+                    FROM unnest(ix.indkey) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+                    WHERE k.ord <= ix.indnkeyatts
+                    ORDER BY k.ord
+                ) AS key_columns,
+                ARRAY(
+                    SELECT a.attname
+                    FROM unnest(ix.indkey) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+                    WHERE k.ord > ix.indnkeyatts
+                    ORDER BY k.ord
+                ) AS include_columns,
+                pg_get_expr(ix.indpred, ix.indrelid) AS predicate,
+                ix.indisunique,
+                ix.indisprimary,
+                pg_relation_size(i.oid) AS size_bytes,
+                COALESCE(s.idx_scan, 0) AS idx_scan
+            FROM pg_index ix
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_class t ON t.oid = ix.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = ix.indexrelid
+            WHERE n.nspname = 'public'
+            ORDER BY t.relname, i.relname
+        """)
+
+        result = await session.execute(query)
+        return [
+            IndexInfo(
+                name=row[0],
+                table=row[1],
+                columns=list(row[2]),
+                include_columns=list(row[3]),
+                predicate=row[4],
+                unique=row[5],
+                primary=row[6],
+                size_bytes=int(row[7]),
+                scans=int(row[8]),
+            )
+            for row in result.fetchall()
+        ]
+
+    def find_unused_indexes(self, indexes: Iterable[IndexInfo]) -> List[IndexInfo]:
+        """
+        Indexes never scanned since statistics were reset.
+
+        Primary keys and unique indexes are excluded since they enforce
+        constraints. Every unused index still costs a write on each ingest.
+        """
+        unused = [
+            idx for idx in indexes
+            if idx.scans == 0
+            and not idx.primary
+            and not idx.unique
+            and idx.size_bytes >= self.min_unused_size_bytes
+        ]
+        return sorted(unused, key=lambda idx: idx.size_bytes, reverse=True)
+
+    @staticmethod
+    def find_redundant_indexes(indexes: Iterable[IndexInfo]) -> List[Tuple[IndexInfo, IndexInfo]]:
+        """
+        Indexes whose key columns are a prefix of another index on the same table.
+
+        Returns:
+            List of (redundant index, covering index) pairs
+        """
+        by_table: Dict[str, List[IndexInfo]] = {}
+        for idx in indexes:
+            by_table.setdefault(idx.table, []).append(idx)
+
+        redundant: List[Tuple[IndexInfo, IndexInfo]] = []
+        for table_indexes in by_table.values():
+            for idx in table_indexes:
+                if idx.primary or idx.unique:
+                    continue
+                for other in table_indexes:
+                    if other is idx or len(other.columns) < len(idx.columns):
+                        continue
+                    if _normalize_predicate(other.predicate) != _normalize_predicate(idx.predicate):
+                        continue
+                    if other.columns[:len(idx.columns)] != idx.columns:
+                        continue
+                    if not set(idx.include_columns) <= set(other.columns) | set(other.include_columns):
+                        continue
+                    # For exact duplicates keep the alphabetically first name
+                    if len(other.columns) == len(idx.columns) and not other.primary and not other.unique \
+                            and other.name > idx.name:
+                        continue
+                    redundant.append((idx, other))
+                    break
+        return redundant
+
+    # ---------- Proposals ----------
+
+    def propose(
+        self,
+        shapes: Iterable[QueryShape],
+        existing: Iterable[IndexInfo] = (),
+    ) -> List[IndexCandidate]:
+        """
+        Propose indexes for a workload.
+
+        Candidates from different statements are merged by (table, columns,
+        predicate) and weighted by total execution time. Candidates already
+        served by an existing index are skipped.
+
+        Args:
+            shapes: Query shapes (recorder and/or pg_stat_statements)
+            existing: Existing indexes
+
+        Returns:
+            Candidates ordered by weight (highest first)
+        """
+        existing = list(existing)
+        merged: Dict[Tuple[str, Tuple[str, ...], str], IndexCandidate] = {}
+
+        for shape in shapes:
+            if shape.statement.lstrip().upper().startswith("INSERT"):
+                continue
+            for access in shape.accesses.values():
+                candidate = candidate_for_access(access)
+                if candidate is None:
+                    continue
+                if any(
+                    idx.table == candidate.table and idx.covers(candidate.columns, candidate.predicate)
+                    for idx in existing
+                ):
+                    continue
+
+                key = (candidate.table, tuple(candidate.columns), _normalize_predicate(candidate.predicate))
+                current = merged.setdefault(key, candidate)
+                current.weight_ms += shape.total_time_ms
+                current.calls += shape.calls
+                if shape.statement not in current.statements:
+                    current.statements.append(shape.statement)
+                if current is not candidate and current.include_columns != candidate.include_columns:
+                    # Different statements select different columns; keep it a plain index
+                    current.include_columns = []
+
+        candidates = [c for c in merged.values() if c.weight_ms >= self.min_weight_ms]
+        candidates.sort(key=lambda c: c.weight_ms, reverse=True)
+        return candidates[:self.max_candidates]
+
+    async def estimate_with_hypothetical_index(
+        self,
+        session: AsyncSession,
+        candidate: IndexCandidate,
+    ) -> IndexCandidate:
+        """
+        Estimate plan cost for a candidate's statements with a HypoPG index.
+
+        Captured statements carry bind parameters, so they are planned as
+        generic plans: with EXPLAIN (GENERIC_PLAN) on PostgreSQL 16+, and as
+        a prepared statement under plan_cache_mode = force_generic_plan on
+        older servers. If HypoPG is missing or a statement cannot be planned,
+        costs stay None and estimate_error says why.
+        """
+        statements = candidate.statements[:5]
+        if not statements:
+            return candidate
+
+        try:
+            before = await self._total_plan_cost(session, statements)
+            await session.execute(text("SELECT * FROM hypopg_create_index(:ddl)"), {"ddl": candidate.ddl()})
+            try:
+                after = await self._total_plan_cost(session, statements)
+            finally:
+                await session.execute(text("SELECT hypopg_reset()"))
+            candidate.estimated_cost_before = before
+            candidate.estimated_cost_after = after
+            candidate.estimate_error = None
+        except Exception as e:
+            logger.warning(f"Hypothetical index estimate unavailable for {candidate.name}: {e}")
+            candidate.estimate_error = str(e).splitlines()[0] if str(e) else type(e).__name__
+            await session.rollback()
+        return candidate
+
+    async def _total_plan_cost(self, session: AsyncSession, statements: Sequence[str]) -> float:
+        if self._server_version is None:
+            version = await session.execute(text("SHOW server_version_num"))
+            self._server_version = int(version.scalar())
+
+        total = 0.0
+        for statement in statements:
+            # Normalized statements use ? placeholders; generic plans need $n
+            counter = iter(range(1, 10000))
+            parameterized, params = re.subn(r"\?", lambda _: f"${next(counter)}", statement)
+            if self._server_version >= GENERIC_PLAN_MIN_VERSION:
+                explain = f"EXPLAIN (FORMAT JSON, GENERIC_PLAN) {parameterized}"
+                plan = (await session.execute(text(explain))).scalar()
+            else:
+                plan = await self._explain_prepared(session, parameterized, params)
+            total += float(plan[0]["Plan"]["Total Cost"])
+        return total
+
+    @staticmethod
+    async def _explain_prepared(session: AsyncSession, statement: str, params: int) -> Any:
+        """EXPLAIN the generic plan of a $n-parameterized statement before PostgreSQL 16."""
+        # The generic plan ignores parameter values, so NULLs stand in for them
+        arguments = f"({', '.join(['NULL'] * params)})" if params else ""
+        await session.execute(text("SET LOCAL plan_cache_mode = force_generic_plan"))
+        await session.execute(text(f"PREPARE index_advisor_plan AS {statement}"))
+        try:
+            # Prepared statements outlive rollbacks; the savepoint keeps the
+            # transaction usable so DEALLOCATE runs even if EXPLAIN fails
+            async with session.begin_nested():
+                explain = f"EXPLAIN (FORMAT JSON) EXECUTE index_advisor_plan{arguments}"
+                return (await session.execute(text(explain))).scalar()
+        finally:
+            await session.execute(text("DEALLOCATE index_advisor_plan"))
+            await session.execute(text("SET LOCAL plan_cache_mode = DEFAULT"))
+
+    # ---------- Reporting ----------
+
+    async def build_report(
+        self,
+        session: AsyncSession,
+        shapes: Optional[Iterable[QueryShape]] = None,
+        estimate: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Build a full index report: proposals, unused and redundant indexes.
+
+        Args:
+            session: Database session
+            shapes: Extra query shapes (e.g. from WorkloadRecorder)
+            estimate: Estimate proposals with hypothetical indexes
+
+        Returns:
+            Report dictionary
+        """
+        workload = list(shapes or []) + await self.load_pg_stat_statements(session)
+        existing = await self.load_existing_indexes(session)
+
+        candidates = self.propose(workload, existing)
+        if estimate:
+            for candidate in candidates:
+                await self.estimate_with_hypothetical_index(session, candidate)
+
+        unused = self.find_unused_indexes(existing)
+        redundant = self.find_redundant_indexes(existing)
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "statements_analyzed": len(workload),
+            "proposed_indexes": [c.to_dict() for c in candidates],
+            "estimates_unavailable": [c.name for c in candidates if c.estimate_error],
+            "unused_indexes": [
+                {"name": idx.name, "table": idx.table, "columns": idx.columns, "size_bytes": idx.size_bytes}
+                for idx in unused
+            ],
+            "redundant_indexes": [
+                {"name": idx.name, "table": idx.table, "columns": idx.columns, "covered_by": other.name}
+                for idx, other in redundant
+            ],
+        }
+
+
+# ==================== ORM Drift ====================
+
+def orm_indexes(metadata: MetaData) -> List[IndexInfo]:
+    """
+    Indexes declared in ORM metadata (index=True, Index(), unique constraints).
+
+    Primary keys are excluded.
+    """
+    declared: List[IndexInfo] = []
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            declared.append(IndexInfo(
+                name=index.name or "",
+                table=table.name,
+                columns=[c.name for c in index.columns],
+                predicate=_dialect_where(index),
+                unique=bool(index.unique),
+            ))
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                declared.append(IndexInfo(
+                    name=constraint.name or "",
+                    table=table.name,
+                    columns=[c.name for c in constraint.columns],
+                    unique=True,
+                ))
+        for column in table.columns:
+            if column.unique and not column.index:
+                declared.append(IndexInfo(
+                    name="",
+                    table=table.name,
+                    columns=[column.name],
+                    unique=True,
+                ))
+    return declared
+
+
+def _dialect_where(index: Any) -> Optional[str]:
+    where = index.dialect_options["postgresql"].get("where") if "postgresql" in index.dialect_options else None
+    return str(where) if where is not None else None
+
+
+def detect_index_drift(
+    declared: Iterable[IndexInfo],
+    live: Iterable[IndexInfo],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Compare ORM-declared indexes with the live schema by (table, columns, predicate).
+
+    Args:
+        declared: Indexes from orm_indexes()
+        live: Indexes from IndexAdvisor.load_existing_indexes()
+
+    Returns:
+        ``missing_in_database`` (declared but absent) and
+        ``undeclared_in_orm`` (present in the database only)
+    """
+    def signature(idx: IndexInfo) -> Tuple[str, Tuple[str, ...], str]:
+        return idx.table, tuple(idx.columns), _normalize_predicate(idx.predicate)
+
+    declared = list(declared)
+    live = [idx for idx in live if not idx.primary]
+    declared_tables = {idx.table for idx in declared}
+    declared_signatures: Set[Tuple[str, Tuple[str, ...], str]] = {signature(i) for i in declared}
+    live_signatures = {signature(i) for i in live}
+
+    return {
+        "missing_in_database": [
+            {"name": idx.name, "table": idx.table, "columns": idx.columns}
+            for idx in declared if signature(idx) not in live_signatures
+        ],
+        "undeclared_in_orm": [
+            {"name": idx.name, "table": idx.table, "columns": idx.columns, "predicate": idx.predicate}
+            for idx in live
+            if idx.table in declared_tables and signature(idx) not in declared_signatures
+        ],
+    }
+
+
+# ==================== Migrations ====================
+
+def render_index_migration(
+    revision: str,
+    down_revision: Optional[str],
+    create: Sequence[IndexCandidate] = (),
+    drop: Sequence[IndexInfo] = (),
+    message: str = "apply index advisor recommendations",
+    create_date: Optional[datetime] = None,
+) -> str:
+    """
+    Render an Alembic migration creating and dropping indexes.
+
+    Indexes are built and dropped CONCURRENTLY inside an autocommit block so
+    ingest writes are not blocked while the migration runs.
+
+    Args:
+        revision: New revision ID
+        down_revision: Current head revision
+        create: Candidates to create
+        drop: Existing indexes to drop (recreated on downgrade)
+        message: Migration message
+        create_date: Migration timestamp (defaults to now)
+
+    Returns:
+        Migration module source
+    """
+    create_date = create_date or datetime.now()
+
+    summary = [f"- Create {c.name} on {c.table} ({', '.join(c.columns)})" for c in create]
+    summary += [f"- Drop unused/redundant {i.name} on {i.table}" for i in drop]
+
+    def create_call(name: str, table: str, columns: Sequence[str], include: Sequence[str],
+                    predicate: Optional[str], unique: bool = False) -> List[str]:
+        lines = [
+            "        op.create_index(",
+            f"            {name!r},",
+            f"            {table!r},",
+            f"            {list(columns)!r},",
+        ]
+        if unique:
+            lines.append("            unique=True,")
+        lines.append("            postgresql_using='btree',")
+        if include:
+            lines.append(f"            postgresql_include={list(include)!r},")
+        if predicate:
+            lines.append(f"            postgresql_where=sa.text({predicate!r}),")
+        lines.append("            postgresql_concurrently=True,")
+        lines.append("        )")
+        return lines
+
+    def drop_call(name: str, table: str) -> List[str]:
+        return [f"        op.drop_index({name!r}, {table!r}, postgresql_concurrently=True)"]
+
+    upgrade: List[str] = []
+    for c in create:
+        upgrade += create_call(c.name, c.table, c.columns, c.include_columns, c.predicate)
+    for i in drop:
+        upgrade += drop_call(i.name, i.table)
+
+    downgrade: List[str] = []
+    for c in create:
+        downgrade += drop_call(c.name, c.table)
+    for i in drop:
+        downgrade += create_call(i.name, i.table, i.columns, i.include_columns, i.predicate, i.unique)
+
+    def body(lines: List[str]) -> str:
+        if not lines:
+            return "    pass\n"
+        return "    with op.get_context().autocommit_block():\n" + "\n".join(lines) + "\n"
+
+    return (
+        f'"""{message}\n'
+        f"\n"
+        f"Revision ID: {revision}\n"
+        f"Revises: {down_revision}\n"
+        f"Create Date: {create_date.strftime('%Y-%m-%d %H:%M:%S.%f')}\n"
+        f"\n"
+        f"Generated by the index advisor from the captured query workload:\n"
+        + "\n".join(summary) + "\n"
+        f'"""\n'
+        f"from alembic import op\n"
+        f"import sqlalchemy as sa\n"
+        f"\n"
+        f"\n"
+        f"# revision identifiers, used by Alembic.\n"
+        f"revision = {revision!r}\n"
+        f"down_revision = {down_revision!r}\n"
+        f"branch_labels = None\n"
+        f"depends_on = None\n"
+        f"\n"
+        f"\n"
+        f"def upgrade() -> None:\n"
+        f'    """\n'
+        f"    Create recommended indexes and drop unused ones.\n"
+        f'    """\n'
+        + body(upgrade) +
+        "\n"
+        "\n"
+        "def downgrade() -> None:\n"
+        '    """\n'
+        "    Restore the previous index set.\n"
+        '    """\n'
+        + body(downgrade)
+    )
+
+
+# ==================== Plan Regression ====================
+
+def summarize_plan(plan: Any) -> Dict[str, Any]:
+    """
+    Flatten an EXPLAIN (FORMAT JSON) plan into node types and index usage.
+
+    Args:
+        plan: Parsed JSON plan (list with a "Plan" entry, or a plan node)
+
+    Returns:
+        Dictionary with ``node_types``, ``indexes``, ``seq_scans`` (relations
+        read with a sequential scan) and ``total_cost``
+    """
+    root = plan[0]["Plan"] if isinstance(plan, list) else plan.get("Plan", plan)
+    summary = {"node_types": [], "indexes": [], "seq_scans": [], "total_cost": root.get("Total Cost")}
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        node_type = node.get("Node Type")
+        summary["node_types"].append(node_type)
+        if node.get("Index Name"):
+            summary["indexes"].append(node["Index Name"])
+        if node_type == "Seq Scan" and node.get("Relation Name"):
+            summary["seq_scans"].append(node["Relation Name"])
+        stack.extend(node.get("Plans", []))
+
+    return summary
+
+
+# Global recorder instance (attached when query workload capture is enabled)
+workload_recorder = WorkloadRecorder()
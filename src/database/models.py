@@ -582,6 +582,62 @@ class ChurnPrediction(Base):
         return f"<ChurnPrediction(prediction_id={self.prediction_id}, tutor_id={self.tutor_id}, score={self.churn_score})>"
 
 
+class TutorRiskSegment(Base):
+    """
+    Latest churn prediction of each active tutor, as counted in the risk
+    segment summaries. Replaced whenever a new prediction is saved.
+    """
+    __tablename__ = "tutor_risk_segments"
+
+    tutor_id: Mapped[str] = mapped_column(
+        String(50),
+        ForeignKey("tutors.tutor_id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    prediction_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    risk_level: Mapped[RiskLevel] = mapped_column(SQLEnum(RiskLevel, native_enum=False), nullable=False)
+    churn_score: Mapped[int] = mapped_column(Integer, nullable=False)
+    factors: Mapped[List[str]] = mapped_column(ARRAY(String), nullable=False, default=list)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<TutorRiskSegment(tutor_id={self.tutor_id}, risk={self.risk_level}, score={self.churn_score})>"
+
+
+class RiskSegmentSummary(Base):
+    """
+    Per risk level aggregates over tutor_risk_segments (tutor count and
+    churn score sum), updated in the same transaction as each prediction.
+    """
+    __tablename__ = "risk_segment_summaries"
+
+    risk_level: Mapped[RiskLevel] = mapped_column(SQLEnum(RiskLevel, native_enum=False), primary_key=True)
+    tutor_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    churn_score_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<RiskSegmentSummary(risk={self.risk_level}, tutors={self.tutor_count})>"
+
+
+class RiskSegmentFactor(Base):
+    """
+    Per risk level count of tutors whose latest prediction lists a
+    contributing factor, updated in the same transaction as each prediction.
+    """
+    __tablename__ = "risk_segment_factors"
+
+    risk_level: Mapped[RiskLevel] = mapped_column(SQLEnum(RiskLevel, native_enum=False), primary_key=True)
+    factor: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tutor_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<RiskSegmentFactor(risk={self.risk_level}, factor={self.factor}, tutors={self.tutor_count})>"
+
+
 class Intervention(Base):
     """
     Intervention entity (PRD lines 677-692).
@@ -877,6 +933,94 @@ class ServiceHealthCheck(Base):
         return f"<ServiceHealthCheck(id={self.id}, service={self.service_name}, status={self.status})>"
 
 
+class ServiceHealthRollup(Base):
+    """
+    Per-service health check aggregates for minute and hour buckets.
+
+    Updated in the same transaction as each health check insert, so uptime
+    reports read a few aggregate rows instead of every raw check.
+    """
+    __tablename__ = "service_health_rollups"
+
+    service_name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    bucket_size: Mapped[str] = mapped_column(String(10), primary_key=True)  # minute, hour
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    total_checks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    up_checks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    up_latency_sum_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    max_latency_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<ServiceHealthRollup(service={self.service_name}, {self.bucket_size}={self.bucket_start}, up={self.up_checks}/{self.total_checks})>"
+
+
+class RetentionCheckpoint(Base):
+    """
+    Progress of a chunked retention run.
+
+    Written after every committed chunk, so an interrupted run resumes from
+    the same cutoff, phase and keyset cursor instead of starting over.
+    """
+    __tablename__ = "retention_checkpoints"
+
+    job_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    cutoff: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    phase: Mapped[str] = mapped_column(String(50), nullable=False)
+    cursor: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # Last key processed in keyset phases
+    rows_deleted: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<RetentionCheckpoint(job={self.job_name}, phase={self.phase}, completed={self.completed_at is not None})>"
+
+
+class ErasureRequest(Base):
+    """
+    Progress of a (bulk) GDPR erasure job.
+
+    The target tutor and student IDs are resolved when the job is created.
+    Phase and row counts are written after every committed chunk, so an
+    interrupted job resumes where it stopped.
+    """
+    __tablename__ = "erasure_requests"
+
+    request_id: Mapped[str] = mapped_column(String(50), primary_key=True)
+    user_ids: Mapped[list] = mapped_column(JSONB, nullable=False)
+    tutor_ids: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    student_ids: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    reason: Mapped[str] = mapped_column(String(500), nullable=False)
+    retain_audit_logs: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    phase: Mapped[str] = mapped_column(String(50), nullable=False)
+    rows_affected: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    requested_by: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # Not a FK: may be erased too
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ErasureRequest(id={self.request_id}, users={len(self.user_ids or [])}, phase={self.phase})>"
+
+
 class SLAMetric(Base):
     """
     SLA metrics tracking for performance monitoring.
@@ -904,6 +1048,30 @@ class SLAMetric(Base):
         return f"<SLAMetric(id={self.id}, metric={self.metric_name}, value={self.metric_value}, meets_sla={self.meets_sla})>"
 
 
+class SLALatencyHistogram(Base):
+    """
+    Per-endpoint API latency histograms for minute and hour buckets.
+
+    One row per histogram bucket (le_ms is the exclusive upper bound, or
+    infinity for the overflow bucket). Rows are upsert-accumulated when
+    sampled response times are flushed, so SLA percentiles and compliance are
+    computed from bucket sums instead of raw per-request rows.
+    """
+    __tablename__ = "sla_latency_histograms"
+
+    endpoint: Mapped[str] = mapped_column(String(255), primary_key=True)
+    bucket_size: Mapped[str] = mapped_column(String(10), primary_key=True)  # minute, hour
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    le_ms: Mapped[float] = mapped_column(Float, primary_key=True)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sum_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    min_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    max_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<SLALatencyHistogram(endpoint={self.endpoint}, {self.bucket_size}={self.bucket_start}, le={self.le_ms}, count={self.sample_count})>"
+
+
 class FirstSessionPrediction(Base):
     """
     First session success prediction entity.
@@ -18,6 +18,8 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Query
 
+from .index_advisor import IndexAdvisor, workload_recorder
+
 
 logger = logging.getLogger(__name__)
 
@@ -233,7 +235,11 @@ class QueryOptimizer:
         table_name: str
     ) -> List[str]:
         """
-        Suggest indexes based on missing index statistics.
+        Suggest indexes for a table.
+
+        Uses the index advisor on the captured query workload (recorded
+        statements and pg_stat_statements). Falls back to high-cardinality
+        column statistics when no workload is available for the table.
 
         Args:
             session: Database session
@@ -242,7 +248,20 @@ class QueryOptimizer:
         Returns:
             List of suggested index DDL statements
         """
-        # This is a simplified version - production would use pg_qualstats or similar
+        advisor = IndexAdvisor()
+        try:
+            shapes = workload_recorder.shapes() + await advisor.load_pg_stat_statements(session)
+            existing = await advisor.load_existing_indexes(session)
+            candidates = [
+                c for c in advisor.propose(shapes, existing)
+                if c.table == table_name
+            ]
+            if candidates:
+                return [f"{c.ddl()};" for c in candidates]
+        except Exception as e:
+            logger.warning(f"Workload index advice unavailable for {table_name}: {e}")
+            await session.rollback()
+
         query = text("""
             SELECT
                 schemaname,
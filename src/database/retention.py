@@ -0,0 +1,313 @@
+"""
+Chunked, resumable retention cleanup.
+
+Deletes expired rows with set-based DELETE ... RETURNING statements in bounded
+chunks instead of loading ORM objects:
+- Sessions scheduled before the cutoff (feedback and other dependents go with
+  them via ON DELETE CASCADE)
+- Orphaned students (no sessions left) created before the cutoff, found with a
+  NOT EXISTS anti-join and walked in student_id keyset order
+
+Each chunk runs in its own short transaction with lock and statement timeouts
+and uses FOR UPDATE SKIP LOCKED, so cleanup never queues behind (or holds up)
+live writers for long. The checkpoint row is updated in the same transaction
+as the chunk it describes, so an interrupted run resumes exactly where it
+stopped, with the same cutoff.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from sqlalchemy import delete, exists, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from src.database.models import RetentionCheckpoint, Session as SessionModel, Student
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Rows deleted per transaction
+RETENTION_CHUNK_SIZE = 5000
+
+# Per-chunk limits; a chunk that cannot get its locks quickly is retried later
+RETENTION_LOCK_TIMEOUT_MS = 2000
+RETENTION_STATEMENT_TIMEOUT_MS = 30000
+
+# Attempts per chunk when it hits a lock or statement timeout
+RETENTION_CHUNK_ATTEMPTS = 3
+
+PHASE_SESSIONS = "sessions"
+PHASE_ORPHAN_STUDENTS = "orphan_students"
+PHASE_DONE = "done"
+
+
+def expired_sessions_delete(cutoff: datetime, chunk_size: int):
+    """
+    DELETE for one chunk of sessions scheduled before the cutoff.
+
+    Args:
+        cutoff: Sessions scheduled before this time are deleted
+        chunk_size: Maximum rows deleted
+
+    Returns:
+        Delete statement returning the deleted session IDs
+    """
+    doomed = (
+        select(SessionModel.session_id)
+        .where(SessionModel.scheduled_start < cutoff)
+        .order_by(SessionModel.scheduled_start)
+        .limit(chunk_size)
+        .with_for_update(skip_locked=True)
+        .cte("doomed")
+    )
+    return (
+        delete(SessionModel)
+        .where(SessionModel.session_id.in_(select(doomed.c.session_id)))
+        .returning(SessionModel.session_id)
+    )
+
+
+def orphan_students_delete(created_before: datetime, after_id: Optional[str], chunk_size: int):
+    """
+    DELETE for one chunk of students without sessions.
+
+    Args:
+        created_before: Only students created before this time are eligible,
+            so students whose first session has not arrived yet are kept
+        after_id: Keyset cursor (last student_id processed), None to start
+        chunk_size: Maximum rows deleted
+
+    Returns:
+        Delete statement returning the deleted student IDs
+    """
+    has_sessions = exists().where(SessionModel.student_id == Student.student_id)
+
+    doomed = (
+        select(Student.student_id)
+        .where(Student.created_at < created_before, ~has_sessions)
+        .order_by(Student.student_id)
+        .limit(chunk_size)
+        .with_for_update(of=Student, skip_locked=True)
+    )
+    if after_id is not None:
+        doomed = doomed.where(Student.student_id > after_id)
+    doomed = doomed.cte("doomed")
+
+    return (
+        delete(Student)
+        .where(Student.student_id.in_(select(doomed.c.student_id)))
+        .returning(Student.student_id)
+    )
+
+
+def set_chunk_timeouts(db: Session, lock_timeout_ms: int, statement_timeout_ms: int) -> None:
+    """
+    Limit lock waits and statement time for the current chunk transaction.
+
+    SET LOCAL scopes both limits to the open transaction, so they end with the
+    chunk's commit or rollback.
+
+    Args:
+        db: Session whose transaction runs the chunk
+        lock_timeout_ms: lock_timeout in milliseconds
+        statement_timeout_ms: statement_timeout in milliseconds
+    """
+    db.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+    db.execute(text(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}"))
+
+
+def run_chunk_with_retry(
+    fn: Callable[[], T],
+    attempts: int = RETENTION_CHUNK_ATTEMPTS,
+    describe: str = "Chunk",
+) -> T:
+    """
+    Run one chunk transaction, retrying it after a lock or statement timeout.
+
+    A timed-out chunk has rolled back, so running it again is safe. Retries
+    back off linearly (1s, 2s, ...).
+
+    Args:
+        fn: Runs and commits the chunk
+        attempts: Total attempts before the error is re-raised
+        describe: Names the chunk in the retry warning
+
+    Returns:
+        Whatever fn returns
+    """
+    attempt = 1
+    while True:
+        try:
+            return fn()
+        except OperationalError as e:
+            if attempt >= attempts:
+                raise
+            logger.warning(f"{describe} timed out (attempt {attempt}/{attempts}): {e.orig}")
+            time.sleep(attempt)
+            attempt += 1
+
+
+class RetentionCleanup:
+    """
+    Resumable cleanup of expired sessions and orphaned students.
+
+    Progress is stored in retention_checkpoints under job_name. A run stops
+    early when its time budget is spent; the next run with the same job name
+    picks up from the checkpoint.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        job_name: str = "cleanup_old_data",
+        chunk_size: int = RETENTION_CHUNK_SIZE,
+        lock_timeout_ms: int = RETENTION_LOCK_TIMEOUT_MS,
+        statement_timeout_ms: int = RETENTION_STATEMENT_TIMEOUT_MS,
+        time_budget_seconds: Optional[float] = None,
+        pause_seconds: float = 0.0,
+    ):
+        """
+        Initialize retention cleanup.
+
+        Args:
+            session_factory: Creates synchronous database sessions
+            job_name: Checkpoint key for this job
+            chunk_size: Rows deleted per transaction
+            lock_timeout_ms: lock_timeout for each chunk
+            statement_timeout_ms: statement_timeout for each chunk
+            time_budget_seconds: Stop (resumably) after this long; None for no limit
+            pause_seconds: Sleep between chunks to leave room for other writers
+        """
+        self.session_factory = session_factory
+        self.job_name = job_name
+        self.chunk_size = chunk_size
+        self.lock_timeout_ms = lock_timeout_ms
+        self.statement_timeout_ms = statement_timeout_ms
+        self.time_budget_seconds = time_budget_seconds
+        self.pause_seconds = pause_seconds
+
+    def run(self, days_to_keep: int) -> Dict[str, Any]:
+        """
+        Run (or resume) cleanup.
+
+        Args:
+            days_to_keep: Retention period for a new run (a resumed run keeps
+                the cutoff it started with)
+
+        Returns:
+            Dict with sessions_deleted, students_deleted, cutoff_date,
+            chunks, resumed and completed
+        """
+        started = time.monotonic()
+        checkpoint = self._load_or_start(datetime.utcnow() - timedelta(days=days_to_keep))
+        resumed = checkpoint["resumed"]
+        chunks = 0
+
+        if resumed:
+            logger.info(
+                f"Resuming retention job '{self.job_name}' in phase {checkpoint['phase']} "
+                f"(cutoff {checkpoint['cutoff'].isoformat()})"
+            )
+
+        while checkpoint["phase"] != PHASE_DONE:
+            if self.time_budget_seconds is not None and time.monotonic() - started >= self.time_budget_seconds:
+                logger.info(f"Retention job '{self.job_name}' paused after {chunks} chunks (time budget)")
+                break
+
+            checkpoint = self._run_chunk(checkpoint)
+            chunks += 1
+
+            if self.pause_seconds:
+                time.sleep(self.pause_seconds)
+
+        rows_deleted = checkpoint["rows_deleted"]
+        return {
+            "sessions_deleted": rows_deleted.get(PHASE_SESSIONS, 0),
+            "students_deleted": rows_deleted.get(PHASE_ORPHAN_STUDENTS, 0),
+            "cutoff_date": checkpoint["cutoff"].isoformat(),
+            "chunks": chunks,
+            "resumed": resumed,
+            "completed": checkpoint["phase"] == PHASE_DONE,
+        }
+
+    def _load_or_start(self, cutoff: datetime) -> Dict[str, Any]:
+        with self.session_factory() as db:
+            row = db.get(RetentionCheckpoint, self.job_name)
+
+            if row is not None and row.completed_at is None:
+                return {
+                    "cutoff": row.cutoff,
+                    "phase": row.phase,
+                    "cursor": row.cursor,
+                    "rows_deleted": dict(row.rows_deleted or {}),
+                    "resumed": True,
+                }
+
+            if row is None:
+                row = RetentionCheckpoint(job_name=self.job_name)
+                db.add(row)
+
+            row.cutoff = cutoff
+            row.phase = PHASE_SESSIONS
+            row.cursor = None
+            row.rows_deleted = {}
+            row.started_at = datetime.utcnow()
+            row.completed_at = None
+            db.commit()
+
+        return {
+            "cutoff": cutoff,
+            "phase": PHASE_SESSIONS,
+            "cursor": None,
+            "rows_deleted": {},
+            "resumed": False,
+        }
+
+    def _run_chunk(self, checkpoint: Dict[str, Any]) -> Dict[str, Any]:
+        return run_chunk_with_retry(
+            lambda: self._delete_chunk(checkpoint),
+            describe=f"Retention chunk in phase {checkpoint['phase']}",
+        )
+
+    def _delete_chunk(self, checkpoint: Dict[str, Any]) -> Dict[str, Any]:
+        phase = checkpoint["phase"]
+
+        if phase == PHASE_SESSIONS:
+            stmt = expired_sessions_delete(checkpoint["cutoff"], self.chunk_size)
+        else:
+            stmt = orphan_students_delete(checkpoint["cutoff"], checkpoint["cursor"], self.chunk_size)
+
+        with self.session_factory() as db:
+            set_chunk_timeouts(db, self.lock_timeout_ms, self.statement_timeout_ms)
+
+            deleted_ids = db.execute(stmt).scalars().all()
+
+            rows_deleted = dict(checkpoint["rows_deleted"])
+            rows_deleted[phase] = rows_deleted.get(phase, 0) + len(deleted_ids)
+            cursor = checkpoint["cursor"]
+
+            if not deleted_ids:
+                # Phase exhausted; move on
+                phase = PHASE_ORPHAN_STUDENTS if phase == PHASE_SESSIONS else PHASE_DONE
+                cursor = None
+            elif phase == PHASE_ORPHAN_STUDENTS:
+                cursor = max(deleted_ids)
+
+            row = db.get(RetentionCheckpoint, self.job_name)
+            row.phase = phase
+            row.cursor = cursor
+            row.rows_deleted = rows_deleted
+            if phase == PHASE_DONE:
+                row.completed_at = datetime.utcnow()
+
+            db.commit()
+
+        if deleted_ids:
+            logger.debug(f"Retention job '{self.job_name}': deleted {len(deleted_ids)} rows in phase {checkpoint['phase']}")
+
+        return {**checkpoint, "phase": phase, "cursor": cursor, "rows_deleted": rows_deleted}
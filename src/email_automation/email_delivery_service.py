@@ -148,11 +148,13 @@ class EnhancedEmailService:
         if enable_tracking:
             html_body = self.tracking_service.add_tracking_pixel(
                 html_body,
-                email_message.message_id
+                email_message.message_id,
+                campaign_id=email_message.campaign_id
             )
             html_body = self.tracking_service.wrap_links_for_tracking(
                 html_body,
-                email_message.message_id
+                email_message.message_id,
+                campaign_id=email_message.campaign_id
             )
 
         # Retry loop
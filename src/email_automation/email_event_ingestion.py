@@ -0,0 +1,627 @@
+"""
+High-volume email open/click event ingestion.
+
+Tracking pixel and click redirect requests never wait on Redis or Postgres:
+the endpoint hands the event to EmailEventIngestor, which buffers it in
+memory and answers immediately. A background task drains the buffer every
+flush interval (or when flush_size events are waiting) with one Redis
+pipeline that, per batch:
+
+- increments open/click counters per campaign, message and link
+  (pre-aggregated in process, so a burst costs one HINCRBY per key)
+- adds to HyperLogLog unique-opener/clicker sets per campaign, message and link
+- appends every raw event to the tutormax:email:events stream
+- marks the touched messages and campaigns dirty
+
+Campaign and message stats are served from those counters. The
+flush_email_events Celery task drains the stream into email_tracking_events
+and copies dirty counters onto email_messages / email_campaigns in batches.
+
+Click links carry their destination, campaign and an HMAC signature (see
+sign_click_url), so the redirect target is known without a lookup, the
+endpoint cannot be used as an open redirect and clicks cannot be credited
+to another campaign.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, column, func, select, table, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+
+from .email_tracking_service import EmailEventType
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "tutormax:email"
+EVENT_STREAM = f"{KEY_PREFIX}:events"
+DIRTY_MESSAGES = f"{KEY_PREFIX}:dirty:messages"
+DIRTY_CAMPAIGNS = f"{KEY_PREFIX}:dirty:campaigns"
+FLUSH_GROUP = "email-db-flush"
+
+# Counters outlive the 90-day tracking event retention
+COUNTER_TTL_SECONDS = 120 * 86400
+
+
+def message_key(message_id: str) -> str:
+    return f"{KEY_PREFIX}:message:{message_id}"
+
+
+def campaign_key(campaign_id: str) -> str:
+    return f"{KEY_PREFIX}:campaign:{campaign_id}"
+
+
+def sign_click_url(
+    secret: str,
+    message_id: str,
+    link_id: str,
+    url: str,
+    campaign_id: Optional[str] = None,
+) -> str:
+    """Signature binding a click-tracking link to its destination URL and campaign."""
+    payload = f"{message_id}\n{link_id}\n{campaign_id or ''}\n{url}".encode()
+    return hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()[:32]
+
+
+def verify_click_url(
+    secret: str,
+    message_id: str,
+    link_id: str,
+    url: str,
+    signature: str,
+    campaign_id: Optional[str] = None,
+) -> bool:
+    expected = sign_click_url(secret, message_id, link_id, url, campaign_id)
+    return hmac.compare_digest(expected, signature or "")
+
+
+@dataclass
+class IngestedEvent:
+    """One open or click, as buffered by the tracking endpoints."""
+
+    event_type: EmailEventType
+    message_id: str
+    event_time: float  # Epoch seconds
+    campaign_id: Optional[str] = None
+    link_id: Optional[str] = None
+    link_url: Optional[str] = None
+    user_agent: Optional[str] = None
+    ip_address: Optional[str] = None
+
+    def stream_fields(self) -> Dict[str, str]:
+        fields = {
+            "event_type": self.event_type.value,
+            "message_id": self.message_id,
+            "event_time": f"{self.event_time:.3f}",
+        }
+        for name in ("campaign_id", "link_id", "link_url", "user_agent", "ip_address"):
+            value = getattr(self, name)
+            if value:
+                fields[name] = value
+        return fields
+
+
+class EmailEventIngestor:
+    """
+    Buffers tracking events in memory and writes them to Redis in batches.
+    """
+
+    def __init__(
+        self,
+        redis_service=None,
+        flush_size: int = 500,
+        flush_interval_seconds: float = 0.25,
+        max_buffer: int = 100_000,
+        stream_maxlen: int = 1_000_000,
+    ):
+        """
+        Initialize ingestor.
+
+        Args:
+            redis_service: RedisService whose client receives the events
+            flush_size: Buffered events that trigger an early flush
+            flush_interval_seconds: Maximum time an event stays buffered
+            max_buffer: Upper bound on buffered events while Redis is unavailable
+            stream_maxlen: Approximate cap on the raw event stream (entries
+                trimmed before the flush task read them are dropped)
+        """
+        self.redis_service = redis_service
+        self.flush_size = flush_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.stream_maxlen = stream_maxlen
+
+        self._buffer: Deque[IngestedEvent] = deque(maxlen=max_buffer)
+        self._flusher: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    @property
+    def redis(self):
+        service = self.redis_service
+        if service is None or not getattr(service, "_connected", False):
+            return None
+        return service.redis_client
+
+    # ------------------------------------------------------------------
+    # Request path
+    # ------------------------------------------------------------------
+
+    def record(self, event: IngestedEvent) -> None:
+        """Buffer an event; never blocks on I/O."""
+        self._buffer.append(event)
+        if len(self._buffer) >= self.flush_size and not self._pending:
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    def record_open(
+        self,
+        message_id: str,
+        campaign_id: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ) -> None:
+        self.record(IngestedEvent(
+            event_type=EmailEventType.OPENED,
+            message_id=message_id,
+            event_time=time.time(),
+            campaign_id=campaign_id,
+            user_agent=user_agent,
+            ip_address=ip_address,
+        ))
+
+    def record_click(
+        self,
+        message_id: str,
+        link_id: str,
+        link_url: str,
+        campaign_id: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ) -> None:
+        self.record(IngestedEvent(
+            event_type=EmailEventType.CLICKED,
+            message_id=message_id,
+            event_time=time.time(),
+            campaign_id=campaign_id,
+            link_id=link_id,
+            link_url=link_url,
+            user_agent=user_agent,
+            ip_address=ip_address,
+        ))
+
+    # ------------------------------------------------------------------
+    # Flushing to Redis
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def aggregate(events: List[IngestedEvent]) -> Tuple[
+        Dict[Tuple[str, str], int],
+        Dict[str, Set[str]],
+        Dict[Tuple[str, str], float],
+        Set[str],
+        Set[str],
+    ]:
+        """
+        Pre-aggregate a batch into Redis operations.
+
+        Returns:
+            (hash increments keyed by (key, field), HyperLogLog additions by key,
+            first-event times keyed by (key, field), dirty message ids,
+            dirty campaign ids)
+        """
+        increments: Dict[Tuple[str, str], int] = defaultdict(int)
+        uniques: Dict[str, Set[str]] = defaultdict(set)
+        firsts: Dict[Tuple[str, str], float] = {}
+        messages: Set[str] = set()
+        campaigns: Set[str] = set()
+
+        for event in events:
+            opened = event.event_type == EmailEventType.OPENED
+            counter = "opens" if opened else "clicks"
+            visitors = "openers" if opened else "clickers"
+            mkey = message_key(event.message_id)
+            fingerprint = f"{event.ip_address or ''}|{event.user_agent or ''}"
+
+            messages.add(event.message_id)
+            increments[(mkey, counter)] += 1
+            uniques[f"{mkey}:{visitors}"].add(fingerprint)
+            first = (mkey, "first_opened_at" if opened else "first_clicked_at")
+            firsts[first] = min(firsts.get(first, event.event_time), event.event_time)
+
+            if event.campaign_id:
+                ckey = campaign_key(event.campaign_id)
+                campaigns.add(event.campaign_id)
+                increments[(ckey, counter)] += 1
+                uniques[f"{ckey}:{visitors}"].add(event.message_id)
+                if event.link_id:
+                    increments[(f"{ckey}:links", event.link_id)] += 1
+                    uniques[f"{ckey}:link:{event.link_id}:clickers"].add(event.message_id)
+            elif event.link_id:
+                increments[(mkey, f"link:{event.link_id}")] += 1
+
+        return increments, uniques, firsts, messages, campaigns
+
+    async def flush(self) -> int:
+        """
+        Write buffered events to Redis in one pipeline.
+
+        Returns:
+            Number of events written (0 without Redis or on failure; the
+            events stay buffered for the next attempt)
+        """
+        client = self.redis
+        if client is None or not self._buffer:
+            return 0
+
+        events = list(self._buffer)
+        self._buffer.clear()
+        increments, uniques, firsts, messages, campaigns = self.aggregate(events)
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for event in events:
+                pipe.xadd(EVENT_STREAM, event.stream_fields(),
+                          maxlen=self.stream_maxlen, approximate=True)
+            touched = set()
+            for (key, field), amount in increments.items():
+                pipe.hincrby(key, field, amount)
+                touched.add(key)
+            for (key, field), first in firsts.items():
+                pipe.hsetnx(key, field, f"{first:.3f}")
+            for key, members in uniques.items():
+                pipe.pfadd(key, *members)
+                touched.add(key)
+            for key in touched:
+                pipe.expire(key, COUNTER_TTL_SECONDS)
+            pipe.sadd(DIRTY_MESSAGES, *messages)
+            if campaigns:
+                pipe.sadd(DIRTY_CAMPAIGNS, *campaigns)
+            await pipe.execute()
+            return len(events)
+        except Exception as e:
+            logger.error(f"Failed to write {len(events)} email events to Redis: {e}")
+            self._buffer.extendleft(reversed(events))
+            return 0
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush task."""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush task and write remaining events."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.flush()
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    async def campaign_counters(self, campaign_id: str) -> Dict[str, Any]:
+        """
+        Live engagement counters for a campaign.
+
+        Returns:
+            Total and unique opens/clicks, and clicks per link
+        """
+        client = self.redis
+        if client is None:
+            raise RuntimeError("Redis is not connected")
+
+        ckey = campaign_key(campaign_id)
+        pipe = client.pipeline(transaction=False)
+        pipe.hgetall(ckey)
+        pipe.pfcount(f"{ckey}:openers")
+        pipe.pfcount(f"{ckey}:clickers")
+        pipe.hgetall(f"{ckey}:links")
+        counts, unique_opens, unique_clicks, links = await pipe.execute()
+
+        return {
+            "campaign_id": campaign_id,
+            "total_opens": int(counts.get("opens", 0)),
+            "total_clicks": int(counts.get("clicks", 0)),
+            "unique_opens": unique_opens,
+            "unique_clicks": unique_clicks,
+            "link_clicks": {link_id: int(count) for link_id, count in links.items()},
+        }
+
+    async def message_counters(self, message_id: str) -> Dict[str, Any]:
+        """
+        Live engagement counters for one message.
+
+        Returns:
+            Opens, clicks, distinct opening devices and first open/click times
+        """
+        client = self.redis
+        if client is None:
+            raise RuntimeError("Redis is not connected")
+
+        mkey = message_key(message_id)
+        pipe = client.pipeline(transaction=False)
+        pipe.hgetall(mkey)
+        pipe.pfcount(f"{mkey}:openers")
+        counts, devices = await pipe.execute()
+
+        return {
+            "message_id": message_id,
+            "opened": int(counts.get("opens", 0)) > 0,
+            "open_count": int(counts.get("opens", 0)),
+            "clicked": int(counts.get("clicks", 0)) > 0,
+            "click_count": int(counts.get("clicks", 0)),
+            "opening_devices": devices,
+            "first_opened_at": _iso(counts.get("first_opened_at")),
+            "first_clicked_at": _iso(counts.get("first_clicked_at")),
+        }
+
+
+def _iso(epoch: Optional[str]) -> Optional[str]:
+    return _datetime(epoch).isoformat() if epoch else None
+
+
+def _datetime(epoch: Optional[str]) -> Optional[datetime]:
+    return datetime.fromtimestamp(float(epoch), tz=timezone.utc) if epoch else None
+
+
+# ============================================================================
+# Batched flush to Postgres (Celery, sync)
+# ============================================================================
+
+# Lightweight table constructs for the columns the flush writes
+email_messages = table(
+    "email_messages",
+    column("message_id"),
+    column("opened_at"),
+    column("first_clicked_at"),
+    column("open_count"),
+    column("click_count"),
+    column("updated_at"),
+)
+
+email_campaigns = table(
+    "email_campaigns",
+    column("campaign_id"),
+    column("emails_opened"),
+    column("emails_clicked"),
+    column("updated_at"),
+)
+
+email_tracking_events = table(
+    "email_tracking_events",
+    column("event_id"),
+    column("message_id"),
+    column("event_type"),
+    column("event_time"),
+    column("user_agent"),
+    column("ip_address"),
+    column("link_url"),
+    column("event_data", JSONB),
+)
+
+
+def _ensure_group(client) -> None:
+    try:
+        client.xgroup_create(EVENT_STREAM, FLUSH_GROUP, id="0", mkstream=True)
+    except Exception as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _flush_stream(client, db, batch_size: int, consumer: str) -> Tuple[int, int]:
+    """Move one batch of raw events into email_tracking_events."""
+    # Entries delivered to this consumer but never acked come first
+    response = client.xreadgroup(FLUSH_GROUP, consumer, {EVENT_STREAM: "0"}, count=batch_size)
+    if not response or not response[0][1]:
+        response = client.xreadgroup(FLUSH_GROUP, consumer, {EVENT_STREAM: ">"}, count=batch_size)
+    entries = response[0][1] if response else []
+    if not entries:
+        return 0, 0
+
+    # MAXLEN trimming can remove entries that are still pending; Redis then
+    # returns their IDs without fields. Acknowledge them so they stop
+    # blocking the pending backlog.
+    trimmed = [entry_id for entry_id, fields in entries if not fields]
+    if trimmed:
+        logger.warning(f"Dropping {len(trimmed)} email events trimmed before they were flushed")
+        client.xack(EVENT_STREAM, FLUSH_GROUP, *trimmed)
+        entries = [(entry_id, fields) for entry_id, fields in entries if fields]
+        if not entries:
+            return 0, len(trimmed)
+
+    message_ids = {fields["message_id"] for _, fields in entries}
+    known = set(db.execute(
+        select(email_messages.c.message_id).where(email_messages.c.message_id.in_(message_ids))
+    ).scalars())
+
+    rows = [
+        {
+            "event_id": f"evt_{entry_id}",
+            "message_id": fields["message_id"],
+            "event_type": fields["event_type"],
+            "event_time": _datetime(fields["event_time"]),
+            "user_agent": fields.get("user_agent"),
+            "ip_address": fields.get("ip_address"),
+            "link_url": fields.get("link_url"),
+            "event_data": {
+                key: fields[key] for key in ("campaign_id", "link_id") if key in fields
+            } or None,
+        }
+        for entry_id, fields in entries
+        if fields["message_id"] in known
+    ]
+    if rows:
+        db.execute(
+            pg_insert(email_tracking_events).values(rows).on_conflict_do_nothing(
+                index_elements=["event_id"]
+            )
+        )
+    db.commit()
+
+    entry_ids = [entry_id for entry_id, _ in entries]
+    client.xack(EVENT_STREAM, FLUSH_GROUP, *entry_ids)
+    client.xdel(EVENT_STREAM, *entry_ids)
+    return len(rows), len(entries) - len(rows) + len(trimmed)
+
+
+def _flush_message_counters(client, db, batch_size: int) -> int:
+    message_ids = client.spop(DIRTY_MESSAGES, batch_size) or []
+    if not message_ids:
+        return 0
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for message_id in message_ids:
+            pipe.hgetall(message_key(message_id))
+        params = [
+            {
+                "b_message_id": message_id,
+                "b_opens": int(counts.get("opens", 0)),
+                "b_clicks": int(counts.get("clicks", 0)),
+                "b_opened_at": _datetime(counts.get("first_opened_at")),
+                "b_clicked_at": _datetime(counts.get("first_clicked_at")),
+            }
+            for message_id, counts in zip(message_ids, pipe.execute())
+        ]
+
+        m = email_messages.c
+        db.execute(
+            update(email_messages)
+            .where(m.message_id == bindparam("b_message_id"))
+            .values(
+                open_count=func.greatest(m.open_count, bindparam("b_opens")),
+                click_count=func.greatest(m.click_count, bindparam("b_clicks")),
+                opened_at=func.coalesce(m.opened_at, bindparam("b_opened_at")),
+                first_clicked_at=func.coalesce(m.first_clicked_at, bindparam("b_clicked_at")),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False),
+            params,
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        client.sadd(DIRTY_MESSAGES, *message_ids)
+        raise
+    return len(message_ids)
+
+
+def _flush_campaign_counters(client, db, batch_size: int) -> int:
+    campaign_ids = client.spop(DIRTY_CAMPAIGNS, batch_size) or []
+    if not campaign_ids:
+        return 0
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for campaign_id in campaign_ids:
+            pipe.pfcount(f"{campaign_key(campaign_id)}:openers")
+            pipe.pfcount(f"{campaign_key(campaign_id)}:clickers")
+        counts = pipe.execute()
+        params = [
+            {
+                "b_campaign_id": campaign_id,
+                "b_opened": counts[2 * i],
+                "b_clicked": counts[2 * i + 1],
+            }
+            for i, campaign_id in enumerate(campaign_ids)
+        ]
+
+        c = email_campaigns.c
+        db.execute(
+            update(email_campaigns)
+            .where(c.campaign_id == bindparam("b_campaign_id"))
+            .values(
+                emails_opened=func.greatest(c.emails_opened, bindparam("b_opened")),
+                emails_clicked=func.greatest(c.emails_clicked, bindparam("b_clicked")),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False),
+            params,
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        client.sadd(DIRTY_CAMPAIGNS, *campaign_ids)
+        raise
+    return len(campaign_ids)
+
+
+def flush_email_events(
+    client,
+    db,
+    batch_size: int = 1000,
+    max_batches: int = 50,
+    consumer: str = "flusher",
+) -> Dict[str, int]:
+    """
+    Copy ingested email events and counters from Redis to Postgres.
+
+    Raw events are moved from the stream into email_tracking_events (events
+    for unknown messages are dropped). Counters of dirty messages and
+    campaigns are written onto email_messages and email_campaigns; counts
+    only ever grow, so re-running a batch is harmless.
+
+    Args:
+        client: Sync Redis client (decode_responses=True)
+        db: Sync SQLAlchemy session
+        batch_size: Stream entries / dirty ids handled per batch
+        max_batches: Upper bound on stream batches per run
+        consumer: Consumer name within the flush group
+
+    Returns:
+        Counts of events stored, events skipped, messages and campaigns updated
+    """
+    _ensure_group(client)
+    stats = {"events_stored": 0, "events_skipped": 0, "messages_updated": 0, "campaigns_updated": 0}
+
+    for _ in range(max_batches):
+        stored, skipped = _flush_stream(client, db, batch_size, consumer)
+        stats["events_stored"] += stored
+        stats["events_skipped"] += skipped
+        if stored + skipped < batch_size:
+            break
+
+    for _ in range(max_batches):
+        updated = _flush_message_counters(client, db, batch_size)
+        stats["messages_updated"] += updated
+        if updated < batch_size:
+            break
+
+    for _ in range(max_batches):
+        updated = _flush_campaign_counters(client, db, batch_size)
+        stats["campaigns_updated"] += updated
+        if updated < batch_size:
+            break
+
+    return stats
+
+
+def get_email_event_ingestor() -> EmailEventIngestor:
+    """Get the API process's event ingestor (bound to the shared RedisService)."""
+    global _ingestor
+    if _ingestor is None:
+        from src.api.redis_service import redis_service
+        _ingestor = EmailEventIngestor(redis_service)
+    return _ingestor
+
+
+_ingestor: Optional[EmailEventIngestor] = None
@@ -9,9 +9,11 @@ Provides tracking for:
 - Unsubscribe management
 """
 
+import html
 import logging
 import uuid
 from datetime import datetime
+from urllib.parse import urlencode
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 from enum import Enum
@@ -72,56 +74,89 @@ class EmailTrackingService:
     - Analytics aggregation
     """
 
-    def __init__(self, db_session=None, base_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        db_session=None,
+        base_url: str = "http://localhost:8000",
+        signing_key: Optional[str] = None
+    ):
         """
         Initialize email tracking service.
 
         Args:
             db_session: SQLAlchemy database session
             base_url: Base URL for tracking endpoints
+            signing_key: Key for click URL signatures (defaults to settings.secret_key)
         """
         self.db_session = db_session
         self.base_url = base_url.rstrip('/')
+        if signing_key is None:
+            from src.api.config import settings
+            signing_key = settings.secret_key
+        self.signing_key = signing_key
         logger.info("EmailTrackingService initialized")
 
-    def generate_tracking_pixel_url(self, message_id: str) -> str:
+    def generate_tracking_pixel_url(
+        self,
+        message_id: str,
+        campaign_id: Optional[str] = None
+    ) -> str:
         """
         Generate tracking pixel URL for open tracking.
 
         Args:
             message_id: Email message ID
+            campaign_id: Campaign ID, so opens count toward the campaign
 
         Returns:
             URL for 1x1 transparent tracking pixel
         """
-        return f"{self.base_url}/api/email/track/open/{message_id}.png"
+        url = f"{self.base_url}/api/email/track/open/{message_id}.png"
+        if campaign_id:
+            url += "?" + urlencode({"c": campaign_id})
+        return url
 
     def generate_click_tracking_url(
         self,
         message_id: str,
         original_url: str,
-        link_id: Optional[str] = None
+        link_id: Optional[str] = None,
+        campaign_id: Optional[str] = None
     ) -> str:
         """
         Generate click tracking URL that wraps original URL.
 
+        The destination and campaign travel in the URL with an HMAC
+        signature, so the redirect needs no lookup and neither can be changed.
+
         Args:
             message_id: Email message ID
             original_url: Original destination URL
             link_id: Optional identifier for the link
+            campaign_id: Campaign ID, so clicks count toward the campaign
 
         Returns:
             Tracking URL that redirects to original
         """
-        # In production, you'd use a URL shortener or proper encoding
+        from .email_event_ingestion import sign_click_url
+
         link_id = link_id or str(uuid.uuid4())[:8]
-        # Store mapping in database or Redis for fast lookup
-        return f"{self.base_url}/api/email/track/click/{message_id}/{link_id}"
+        params = {
+            "u": original_url,
+            "s": sign_click_url(self.signing_key, message_id, link_id, original_url, campaign_id),
+        }
+        if campaign_id:
+            params["c"] = campaign_id
+        return (
+            f"{self.base_url}/api/email/track/click/{message_id}/{link_id}"
+            f"?{urlencode(params)}"
+        )
 
     def wrap_links_for_tracking(
         self,
         html_body: str,
-        message_id: str
+        message_id: str,
+        campaign_id: Optional[str] = None
     ) -> str:
         """
         Wrap all links in HTML body with tracking URLs.
@@ -129,6 +164,7 @@ class EmailTrackingService:
         Args:
             html_body: HTML email body
             message_id: Email message ID
+            campaign_id: Campaign ID, if the email is part of a campaign
 
         Returns:
             HTML with tracking-wrapped links
@@ -142,8 +178,10 @@ class EmailTrackingService:
             if 'track/open' in original_url or 'track/click' in original_url:
                 return match.group(0)
 
-            tracking_url = self.generate_click_tracking_url(message_id, original_url)
-            return f'href="{tracking_url}"'
+            tracking_url = self.generate_click_tracking_url(
+                message_id, html.unescape(original_url), campaign_id=campaign_id
+            )
+            return f'href="{html.escape(tracking_url)}"'
 
         # Replace all href attributes
         html_with_tracking = re.sub(
@@ -157,7 +195,8 @@ class EmailTrackingService:
     def add_tracking_pixel(
         self,
         html_body: str,
-        message_id: str
+        message_id: str,
+        campaign_id: Optional[str] = None
     ) -> str:
         """
         Add tracking pixel to HTML body.
@@ -165,11 +204,12 @@ class EmailTrackingService:
         Args:
             html_body: HTML email body
             message_id: Email message ID
+            campaign_id: Campaign ID, if the email is part of a campaign
 
         Returns:
             HTML with tracking pixel added
         """
-        pixel_url = self.generate_tracking_pixel_url(message_id)
+        pixel_url = html.escape(self.generate_tracking_pixel_url(message_id, campaign_id))
         tracking_pixel = f'\n<img src="{pixel_url}" width="1" height="1" alt="" style="display:block" />'
 
         # Try to insert before </body> tag
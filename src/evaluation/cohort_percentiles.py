@@ -0,0 +1,342 @@
+"""
+Cohort Percentile Index - Precomputed peer comparison sketches.
+
+Builds, per onboarding cohort, compact sorted NumPy arrays of each tutor's
+latest 30-day metrics plus the cohort's performance tier counts. Sketches are
+rebuilt when the daily metrics aggregation finishes and stored in Redis, so the
+peer comparison endpoint answers percentile ranks with a binary search instead
+of loading every cohort metric row.
+
+A cohort is every tutor onboarded within 90 days of the start of a calendar
+month, matching the peer comparison definition used by the gamification API.
+"""
+
+import base64
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import (
+    Tutor,
+    TutorPerformanceMetric,
+    MetricWindow,
+    PerformanceTier,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Metrics ranked in peer comparison
+PERCENTILE_METRICS = ("avg_rating", "sessions_completed", "engagement_score")
+
+# Width of an onboarding cohort
+COHORT_SPAN = timedelta(days=90)
+
+# Tier label used when a metric row has no tier assigned
+DEFAULT_TIER = PerformanceTier.DEVELOPING.value
+
+
+def cohort_start_for(onboarding_date: datetime) -> datetime:
+    """
+    Get the cohort start (first day of the onboarding month, UTC midnight).
+
+    Args:
+        onboarding_date: Tutor onboarding date
+
+    Returns:
+        Timezone-aware cohort start datetime
+    """
+    if onboarding_date.tzinfo is None:
+        onboarding_date = onboarding_date.replace(tzinfo=timezone.utc)
+    onboarding_date = onboarding_date.astimezone(timezone.utc)
+    return onboarding_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def cohort_key(cohort_start: datetime) -> str:
+    """Cache key suffix for a cohort (e.g. "2025-03")."""
+    return cohort_start.strftime("%Y-%m")
+
+
+def _encode_array(values: np.ndarray) -> str:
+    """Encode a float64 array as base64 for JSON storage."""
+    return base64.b64encode(np.ascontiguousarray(values, dtype="<f8").tobytes()).decode("ascii")
+
+
+def _decode_array(data: str) -> np.ndarray:
+    """Decode a base64 float64 array produced by _encode_array."""
+    return np.frombuffer(base64.b64decode(data), dtype="<f8")
+
+
+@dataclass
+class CohortPercentileSketch:
+    """Sorted metric values and tier counts for one onboarding cohort."""
+
+    cohort_start: datetime
+    size: int
+    values: Dict[str, np.ndarray] = field(default_factory=dict)
+    tier_counts: Dict[str, int] = field(default_factory=dict)
+    built_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def percentile_rank(self, metric: str, value: Optional[float]) -> int:
+        """
+        Percentile rank (0-100) of a value within the cohort.
+
+        Counts cohort values strictly below ``value`` using binary search.
+
+        Args:
+            metric: Metric name (one of PERCENTILE_METRICS)
+            value: Tutor's metric value
+
+        Returns:
+            Percentile rank, or 50 when there is nothing to compare against
+        """
+        sorted_values = self.values.get(metric)
+        if sorted_values is None or sorted_values.size == 0 or value is None:
+            return 50
+        rank = int(np.searchsorted(sorted_values, value, side="left"))
+        return int((rank / sorted_values.size) * 100)
+
+    def tier_distribution(self) -> Dict[str, int]:
+        """Percentage of cohort tutors in each performance tier."""
+        distribution = {
+            tier: int((count / self.size) * 100) if self.size else 0
+            for tier, count in self.tier_counts.items()
+        }
+        for tier in PerformanceTier:
+            distribution.setdefault(tier.value, 0)
+        return distribution
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary for caching."""
+        return {
+            "cohort_start": self.cohort_start.isoformat(),
+            "size": self.size,
+            "values": {
+                metric: _encode_array(arr) for metric, arr in self.values.items()
+            },
+            "tier_counts": self.tier_counts,
+            "built_at": self.built_at.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CohortPercentileSketch":
+        """Rebuild a sketch from its cached dictionary form."""
+        return cls(
+            cohort_start=datetime.fromisoformat(data["cohort_start"]),
+            size=int(data["size"]),
+            values={
+                metric: _decode_array(encoded)
+                for metric, encoded in data.get("values", {}).items()
+            },
+            tier_counts={k: int(v) for k, v in data.get("tier_counts", {}).items()},
+            built_at=datetime.fromisoformat(data["built_at"]),
+        )
+
+
+def build_cohort_sketches(
+    rows: Sequence[Dict[str, Any]],
+    cohort_starts: Optional[Iterable[datetime]] = None,
+) -> Dict[str, CohortPercentileSketch]:
+    """
+    Build sketches for every cohort from latest-metric rows.
+
+    Args:
+        rows: One row per tutor with ``onboarding_date``, ``performance_tier``
+            and each of PERCENTILE_METRICS
+        cohort_starts: Cohorts to build (defaults to every onboarding month
+            present in ``rows``)
+
+    Returns:
+        Mapping of cohort key to sketch
+    """
+    if not rows:
+        return {}
+
+    rows = sorted(rows, key=lambda r: _utc(r["onboarding_date"]))
+    onboarded = np.array([_utc(r["onboarding_date"]).timestamp() for r in rows])
+
+    columns: Dict[str, np.ndarray] = {
+        metric: np.array(
+            [r[metric] if r[metric] is not None else np.nan for r in rows],
+            dtype=np.float64,
+        )
+        for metric in PERCENTILE_METRICS
+    }
+    tiers = [_tier_value(r.get("performance_tier")) for r in rows]
+
+    if cohort_starts is None:
+        cohort_starts = {cohort_start_for(r["onboarding_date"]) for r in rows}
+
+    built_at = datetime.now(timezone.utc)
+    sketches: Dict[str, CohortPercentileSketch] = {}
+
+    for start in sorted(cohort_starts):
+        lo = int(np.searchsorted(onboarded, start.timestamp(), side="left"))
+        hi = int(np.searchsorted(onboarded, (start + COHORT_SPAN).timestamp(), side="left"))
+
+        values = {}
+        for metric, column in columns.items():
+            window = column[lo:hi]
+            # Zero and missing values are excluded from the comparison set
+            window = window[~np.isnan(window) & (window != 0)]
+            values[metric] = np.sort(window)
+
+        tier_counts: Dict[str, int] = {}
+        for tier in tiers[lo:hi]:
+            tier_counts[tier] = tier_counts.get(tier, 0) + 1
+
+        sketches[cohort_key(start)] = CohortPercentileSketch(
+            cohort_start=start,
+            size=hi - lo,
+            values=values,
+            tier_counts=tier_counts,
+            built_at=built_at,
+        )
+
+    return sketches
+
+
+def _utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _tier_value(tier: Any) -> str:
+    """Normalize a performance tier (enum, string or None) to its label."""
+    if tier is None:
+        return DEFAULT_TIER
+    return tier.value if isinstance(tier, PerformanceTier) else str(tier)
+
+
+class CohortPercentileIndex:
+    """
+    Builds and serves cohort percentile sketches backed by the cache service.
+
+    Usage:
+        index = CohortPercentileIndex(cache_service)
+        await index.rebuild(session)             # after daily aggregation
+        sketch = await index.get_or_build(session, cohort_start)
+        sketch.percentile_rank("avg_rating", 4.6)
+    """
+
+    def __init__(self, cache):
+        """
+        Initialize the index.
+
+        Args:
+            cache: CacheService used to store sketches
+        """
+        self.cache = cache
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """
+        Rebuild sketches for every cohort from the latest 30-day metrics.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Number of cohort sketches stored
+        """
+        rows = await self._fetch_latest_metrics(session)
+        sketches = build_cohort_sketches(rows)
+
+        stored = 0
+        for key, sketch in sketches.items():
+            if await self.cache.cache_cohort_percentiles(key, sketch.to_dict()):
+                stored += 1
+
+        logger.info(
+            f"Cohort percentile index rebuilt: {stored}/{len(sketches)} cohorts "
+            f"from {len(rows)} tutors"
+        )
+        return stored
+
+    async def get(self, cohort_start: datetime) -> Optional[CohortPercentileSketch]:
+        """Get a cached sketch, or None if it has not been built."""
+        data = await self.cache.get_cohort_percentiles(cohort_key(cohort_start))
+        if not data:
+            return None
+        try:
+            return CohortPercentileSketch.from_dict(data)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Discarding malformed cohort sketch {cohort_key(cohort_start)}: {e}")
+            return None
+
+    async def get_or_build(
+        self,
+        session: AsyncSession,
+        cohort_start: datetime,
+    ) -> CohortPercentileSketch:
+        """
+        Get a cohort sketch, building and caching it on a miss.
+
+        Args:
+            session: Database session
+            cohort_start: Cohort start (see cohort_start_for)
+
+        Returns:
+            Cohort sketch
+        """
+        sketch = await self.get(cohort_start)
+        if sketch is not None:
+            return sketch
+
+        rows = await self._fetch_latest_metrics(
+            session,
+            onboarded_from=cohort_start,
+            onboarded_before=cohort_start + COHORT_SPAN,
+        )
+        sketch = build_cohort_sketches(rows, cohort_starts=[cohort_start]).get(
+            cohort_key(cohort_start),
+            CohortPercentileSketch(cohort_start=cohort_start, size=0),
+        )
+        await self.cache.cache_cohort_percentiles(cohort_key(cohort_start), sketch.to_dict())
+        return sketch
+
+    async def _fetch_latest_metrics(
+        self,
+        session: AsyncSession,
+        onboarded_from: Optional[datetime] = None,
+        onboarded_before: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch each tutor's latest 30-day metric columns.
+
+        Only the ranked columns are selected, so no ORM objects are built.
+        """
+        conditions = [TutorPerformanceMetric.window == MetricWindow.THIRTY_DAY]
+        if onboarded_from is not None:
+            conditions.append(Tutor.onboarding_date >= onboarded_from)
+        if onboarded_before is not None:
+            conditions.append(Tutor.onboarding_date < onboarded_before)
+
+        ranked = (
+            select(
+                Tutor.onboarding_date.label("onboarding_date"),
+                TutorPerformanceMetric.performance_tier.label("performance_tier"),
+                *[getattr(TutorPerformanceMetric, m).label(m) for m in PERCENTILE_METRICS],
+                func.row_number().over(
+                    partition_by=TutorPerformanceMetric.tutor_id,
+                    order_by=TutorPerformanceMetric.calculation_date.desc(),
+                ).label("rn"),
+            )
+            .join(Tutor, TutorPerformanceMetric.tutor_id == Tutor.tutor_id)
+            .where(and_(*conditions))
+            .subquery()
+        )
+
+        result = await session.execute(
+            select(
+                ranked.c.onboarding_date,
+                ranked.c.performance_tier,
+                *[ranked.c[m] for m in PERCENTILE_METRICS],
+            ).where(ranked.c.rn == 1)
+        )
+        return [dict(row) for row in result.mappings().all()]
@@ -436,6 +436,7 @@ async def run_daily_aggregation(
     include_inactive: bool = False,
     cleanup_old_metrics: bool = False,
     retention_days: int = 90,
+    rebuild_percentile_index: bool = True,
 ) -> AggregationSummary:
     """
     Main entry point for daily metrics aggregation.
@@ -446,6 +447,8 @@ async def run_daily_aggregation(
         include_inactive: Include inactive tutors
         cleanup_old_metrics: Whether to cleanup old metrics after aggregation
         retention_days: Days to retain old metrics
+        rebuild_percentile_index: Whether to rebuild cohort percentile sketches
+            for peer comparison after aggregation
 
     Returns:
         AggregationSummary with results
@@ -468,9 +471,39 @@ async def run_daily_aggregation(
             )
             logger.info(f"Cleanup complete: {deleted_count} old metrics deleted")
 
+    # Refresh peer comparison sketches from the new metrics
+    if rebuild_percentile_index and summary.successful > 0:
+        await rebuild_cohort_percentile_index()
+
     return summary
 
 
+async def rebuild_cohort_percentile_index() -> int:
+    """
+    Rebuild cohort percentile sketches in Redis.
+
+    Failures are logged rather than raised; the peer comparison endpoint
+    builds missing sketches on demand.
+
+    Returns:
+        Number of cohort sketches stored
+    """
+    from src.api.config import settings
+    from src.api.cache_service import CacheService
+    from src.evaluation.cohort_percentiles import CohortPercentileIndex
+
+    cache = CacheService(redis_url=settings.redis_url)
+    try:
+        await cache.connect()
+        async with get_session() as session:
+            return await CohortPercentileIndex(cache).rebuild(session)
+    except Exception as e:
+        logger.warning(f"Failed to rebuild cohort percentile index: {e}")
+        return 0
+    finally:
+        await cache.disconnect()
+
+
 if __name__ == "__main__":
     # Allow running directly for testing
     asyncio.run(run_daily_aggregation())
@@ -16,8 +16,7 @@ import numpy as np
 from dataclasses import dataclass
 
 from src.data_generation.tutor_generator import TutorGenerator, BehavioralArchetype
-from src.data_generation.session_generator import SessionGenerator
-from src.data_generation.feedback_generator import FeedbackGenerator
+from src.data_generation.bulk_generator import BulkSessionGenerator
 
 
 @dataclass
@@ -31,9 +30,20 @@ class ChurnConfig:
     seed: int = 42
 
 
+def _categorical(values: np.ndarray) -> pd.Categorical:
+    """Categorical in order of appearance (skips sorting the categories)."""
+    return pd.Categorical(values, categories=pd.unique(values))
+
+
 class ChurnDataGenerator:
     """
     Generates comprehensive synthetic data for churn prediction with time-series patterns.
+
+    Generation is columnar: churn progression is computed as a (tutor x day)
+    array, session counts are drawn for the whole grid at once, and session
+    and feedback attributes are sampled per column by BulkSessionGenerator.
+    Results come back as typed DataFrames (categoricals for IDs and labels,
+    downcast numerics).
     """
 
     def __init__(self, config: Optional[ChurnConfig] = None):
@@ -45,17 +55,14 @@ class ChurnDataGenerator:
         """
         self.config = config or ChurnConfig()
         self.random = random.Random(self.config.seed)
-        self.np_random = np.random.RandomState(self.config.seed)
+        self.rng = np.random.default_rng(self.config.seed)
 
-        # Initialize base generators
+        # Tutor profiles still come from the per-tutor generator (one per tutor)
         self.tutor_gen = TutorGenerator(seed=self.config.seed)
-        self.session_gen = SessionGenerator(seed=self.config.seed)
-        self.feedback_gen = FeedbackGenerator(seed=self.config.seed)
 
         # Track generated data
         self.tutors: List[Dict] = []
-        self.all_sessions: List[Dict] = []
-        self.all_feedback: List[Dict] = []
+        self.bulk_gen: Optional[BulkSessionGenerator] = None
 
     def generate_historical_data(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
@@ -71,41 +78,30 @@ class ChurnDataGenerator:
 
         # Generate daily sessions for each day in history
         end_date = datetime.now()
-        start_date = end_date - timedelta(days=self.config.days_history)
+        start_date = (end_date - timedelta(days=self.config.days_history)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
 
         print(f"Generating sessions from {start_date.date()} to {end_date.date()}...")
 
-        current_date = start_date
-        day_num = 0
-
-        while current_date <= end_date:
-            # Generate sessions for this day with progression patterns
-            day_sessions = self._generate_day_sessions(current_date, day_num)
-            self.all_sessions.extend(day_sessions)
+        days_until_churn = self._days_until_churn()
+        counts = self._session_counts(days_until_churn)
+        sessions, tutor = self._generate_sessions(start_date, counts, days_until_churn)
 
-            current_date += timedelta(days=1)
-            day_num += 1
-
-            if day_num % 10 == 0:
-                print(f"  Generated day {day_num}/{self.config.days_history} ({len(self.all_sessions):,} sessions so far)")
-
-        print(f"Total sessions generated: {len(self.all_sessions):,}")
+        print(f"Total sessions generated: {len(tutor):,}")
 
         # Generate feedback for sessions
         print("Generating student feedback...")
-        tutors_dict = {t["tutor_id"]: t for t in self.tutors}
-        self.all_feedback = self.feedback_gen.generate_feedback_for_sessions(
-            sessions=self.all_sessions,
-            tutors=tutors_dict,
-            feedback_rate=self.config.feedback_rate
+        feedback = self.bulk_gen.sample_feedback(
+            self.rng, sessions, tutor, feedback_rate=self.config.feedback_rate
         )
 
-        print(f"Total feedback generated: {len(self.all_feedback):,}")
+        print(f"Total feedback generated: {len(feedback['feedback_id']):,}")
 
         # Convert to DataFrames
-        tutors_df = pd.DataFrame(self.tutors)
-        sessions_df = pd.DataFrame(self.all_sessions)
-        feedback_df = pd.DataFrame(self.all_feedback)
+        tutors_df = self._tutors_frame()
+        sessions_df = self._sessions_frame(sessions, tutor)
+        feedback_df = self._feedback_frame(feedback)
 
         # Clean and validate
         tutors_df, sessions_df, feedback_df = self._clean_and_validate(
@@ -168,122 +164,158 @@ class ChurnDataGenerator:
 
         return all_tutors
 
-    def _generate_day_sessions(self, date: datetime, day_num: int) -> List[Dict]:
+    def _days_until_churn(self) -> np.ndarray:
         """
-        Generate sessions for a single day with behavioral progression.
+        Days until churn for every (tutor, day); inf for tutors who stay.
 
-        Args:
-            date: Date for sessions
-            day_num: Day number in the sequence (0-indexed)
-
-        Returns:
-            List of session dictionaries
+        Day 0 is the first day of history, day days_history the last.
         """
-        day_sessions = []
-
-        # Calculate progression factor for each tutor
-        for tutor in self.tutors:
-            # Skip if tutor has already churned
-            if tutor.get("will_churn") and tutor.get("churn_day") <= day_num:
-                continue
-
-            # Determine session count based on progression
-            base_sessions_per_week = tutor["baseline_sessions_per_week"]
-            sessions_per_day = base_sessions_per_week / 7
-
-            # Apply progression factor
-            if tutor.get("will_churn"):
-                # Churners: decline in sessions over time
-                progression_factor = self._get_churn_progression_factor(
-                    day_num, tutor["churn_day"]
-                )
-            else:
-                # Non-churners: stable or slight growth
-                progression_factor = 1.0 + self.np_random.uniform(-0.1, 0.2)
-
-            # Calculate sessions for this day with some randomness
-            expected_sessions = sessions_per_day * progression_factor
-            actual_sessions = max(0, int(self.np_random.poisson(expected_sessions)))
-
-            # Generate sessions
-            for _ in range(actual_sessions):
-                session = self.session_gen.generate_session(
-                    tutor=tutor,
-                    scheduled_date=date + timedelta(
-                        hours=self.random.randint(8, 20),
-                        minutes=self.random.randint(0, 59)
-                    )
-                )
-
-                # Apply churn-related modifications
-                if tutor.get("will_churn"):
-                    session = self._apply_churn_patterns(session, day_num, tutor["churn_day"])
-
-                day_sessions.append(session)
-
-        return day_sessions
-
-    def _get_churn_progression_factor(self, current_day: int, churn_day: int) -> float:
+        day = np.arange(self.config.days_history + 1)
+        churn_day = np.array(
+            [t["churn_day"] if t.get("will_churn") else np.inf for t in self.tutors],
+            dtype=float,
+        )
+        return churn_day[:, None] - day[None, :]
+
+    def _session_counts(self, days_until_churn: np.ndarray) -> np.ndarray:
         """
-        Calculate progression factor for churning tutors.
+        Poisson session counts per (tutor, day).
 
-        Returns factor that decreases as tutor approaches churn.
+        Churners decline as churn approaches (factor ~0.9 until 30 days out,
+        then 0.7, 0.5 and 0.3 at 30/14/7 days) and stop at their churn day;
+        other tutors stay stable or grow slightly.
         """
-        days_until_churn = churn_day - current_day
-
-        if days_until_churn <= 0:
-            return 0.0  # Already churned
-
-        # Decline accelerates as churn approaches
-        if days_until_churn <= 7:
-            return 0.3 + self.np_random.uniform(-0.1, 0.1)
-        elif days_until_churn <= 14:
-            return 0.5 + self.np_random.uniform(-0.1, 0.1)
-        elif days_until_churn <= 30:
-            return 0.7 + self.np_random.uniform(-0.1, 0.1)
-        else:
-            return 0.9 + self.np_random.uniform(-0.1, 0.1)
+        shape = days_until_churn.shape
+        churning = np.isfinite(days_until_churn)
+
+        decline = np.select(
+            [days_until_churn <= 7, days_until_churn <= 14, days_until_churn <= 30],
+            [0.3, 0.5, 0.7],
+            0.9,
+        )
+        factor = np.where(
+            churning,
+            decline + self.rng.uniform(-0.1, 0.1, shape),
+            1.0 + self.rng.uniform(-0.1, 0.2, shape),
+        )
+        factor = np.where(days_until_churn > 0, factor, 0.0)
 
-    def _apply_churn_patterns(
+        sessions_per_day = np.array([t["baseline_sessions_per_week"] for t in self.tutors]) / 7
+        return self.rng.poisson(sessions_per_day[:, None] * factor)
+
+    def _generate_sessions(
         self,
-        session: Dict,
-        current_day: int,
-        churn_day: int
-    ) -> Dict:
+        start_date: datetime,
+        counts: np.ndarray,
+        days_until_churn: np.ndarray,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
         """
-        Modify session data to reflect churn patterns.
+        Sample every session in one pass, in day order.
+
+        Returns:
+            Tuple of (session columns, tutor position per session)
+        """
+        num_tutors, num_days = counts.shape
+        per_cell = counts.T.ravel()
+        day = np.repeat(np.repeat(np.arange(num_days), num_tutors), per_cell)
+        tutor = np.repeat(np.tile(np.arange(num_tutors), num_days), per_cell)
+        n = tutor.size
+
+        # The legacy generator created a new student for ~30% of sessions
+        self.bulk_gen = BulkSessionGenerator(
+            self.tutors,
+            num_students=max(1, int(n * 0.3)),
+            seed=self.config.seed,
+            id_prefix="churn",
+        )
+        self.student_ids = self.bulk_gen.student_ids()
+
+        minutes = day * 1440 + self.rng.integers(8, 21, n) * 60 + self.rng.integers(0, 60, n)
+        scheduled = np.datetime64(start_date, "m") + minutes.astype("timedelta64[m]")
+        session_id = np.array([f"churn_{i:09d}" for i in range(n)], dtype=object)
+
+        sessions = self.bulk_gen.sample_sessions(self.rng, tutor, scheduled, session_id)
+        sessions["is_first_session"] = sessions["session_number"] == 1
+
+        self._apply_churn_patterns(sessions, days_until_churn[tutor, day])
+
+        return sessions, tutor
+
+    def _apply_churn_patterns(self, sessions: Dict[str, np.ndarray], days_until_churn: np.ndarray):
+        """
+        Modify session columns in place to reflect churn patterns.
 
         Increases no-shows, reschedules, decreases engagement as churn approaches.
         """
-        days_until_churn = churn_day - current_day
-
-        if days_until_churn <= 0:
-            return session
-
-        # Increase no-show probability
-        if days_until_churn <= 14:
-            if self.random.random() < 0.25:  # 25% no-show rate
-                session["no_show"] = True
-
-        # Increase reschedule probability
-        if days_until_churn <= 30:
-            if self.random.random() < 0.20:  # 20% reschedule rate
-                session["tutor_initiated_reschedule"] = True
-
-        # Decrease engagement score
-        if days_until_churn <= 30:
-            decline_factor = 0.5 + (days_until_churn / 60)  # More decline as churn approaches
-            session["engagement_score"] = max(
-                0.0,
-                session["engagement_score"] * decline_factor
-            )
+        n = days_until_churn.size
+
+        # Increase no-show probability (25% within 14 days of churn)
+        sessions["no_show"] |= (days_until_churn <= 14) & (self.rng.random(n) < 0.25)
 
-        # Decrease learning objectives met
-        if days_until_churn <= 21:
-            if self.random.random() > 0.6:  # 40% not met
-                session["learning_objectives_met"] = False
+        # Increase reschedule probability (20% within 30 days)
+        sessions["tutor_initiated_reschedule"] |= (days_until_churn <= 30) & (self.rng.random(n) < 0.20)
 
-        return session
+        # Decrease engagement score (more decline as churn approaches)
+        decline_factor = 0.5 + np.minimum(days_until_churn, 30) / 60
+        sessions["engagement_score"] = np.where(
+            days_until_churn <= 30,
+            np.maximum(0.0, sessions["engagement_score"] * decline_factor),
+            sessions["engagement_score"],
+        )
+
+        # Decrease learning objectives met (40% not met within 21 days)
+        sessions["learning_objectives_met"] &= ~((days_until_churn <= 21) & (self.rng.random(n) > 0.6))
+
+    def _tutors_frame(self) -> pd.DataFrame:
+        """Tutor profiles with categorical labels."""
+        tutors_df = pd.DataFrame(self.tutors)
+        for column in ("behavioral_archetype", "subject_type", "education_level", "status"):
+            if column in tutors_df.columns:
+                tutors_df[column] = tutors_df[column].astype("category")
+        tutors_df["baseline_sessions_per_week"] = tutors_df["baseline_sessions_per_week"].astype(np.float32)
+        tutors_df["churn_day"] = tutors_df["churn_day"].astype("Int16")
+        return tutors_df
+
+    def _sessions_frame(self, sessions: Dict[str, np.ndarray], tutor: np.ndarray) -> pd.DataFrame:
+        """Session columns as a typed DataFrame."""
+        n = len(tutor)
+        return pd.DataFrame({
+            "session_id": sessions["session_id"],
+            "tutor_id": pd.Categorical.from_codes(tutor, categories=self.bulk_gen.tutor_ids),
+            "student_id": pd.Categorical(sessions["student_id"], categories=self.student_ids),
+            "session_number": sessions["session_number"].astype(np.int16),
+            "is_first_session": sessions["is_first_session"],
+            "scheduled_start": sessions["scheduled_start"].astype("datetime64[s]"),
+            "actual_start": sessions["actual_start"].astype("datetime64[s]"),
+            "duration_minutes": sessions["duration_minutes"].astype(np.int16),
+            "subject": _categorical(sessions["subject"]),
+            "session_type": pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=["1-on-1"]),
+            "tutor_initiated_reschedule": sessions["tutor_initiated_reschedule"],
+            "no_show": sessions["no_show"],
+            "late_start_minutes": sessions["late_start_minutes"].astype(np.int8),
+            "engagement_score": sessions["engagement_score"].astype(np.float32),
+            "learning_objectives_met": sessions["learning_objectives_met"],
+            "technical_issues": sessions["technical_issues"],
+        })
+
+    def _feedback_frame(self, feedback: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Feedback columns as a typed DataFrame."""
+        columns = dict(feedback)
+        for rating in (
+            "overall_rating",
+            "subject_knowledge_rating",
+            "communication_rating",
+            "patience_rating",
+            "engagement_rating",
+            "helpfulness_rating",
+        ):
+            columns[rating] = columns[rating].astype(np.int8)
+
+        columns["tutor_id"] = pd.Categorical(columns["tutor_id"], categories=self.bulk_gen.tutor_ids)
+        columns["student_id"] = pd.Categorical(columns["student_id"], categories=self.student_ids)
+        columns["free_text_feedback"] = _categorical(columns["free_text_feedback"])
+        columns["would_recommend"] = pd.array(columns["would_recommend"], dtype="boolean")
+        return pd.DataFrame(columns)
 
     def _clean_and_validate(
         self,
@@ -10,8 +10,11 @@ This module provides a high-level interface for the complete intervention workfl
 This is the main entry point for the intervention system.
 """
 
+import asyncio
 import logging
+import time
 import uuid
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 
@@ -27,6 +30,22 @@ from .notification_service import NotificationService, NotificationConfig
 
 logger = logging.getLogger(__name__)
 
+# Default number of concurrent SMTP connections for batch dispatch
+DEFAULT_EMAIL_CONCURRENCY = 8
+
+# Most urgent notifications first within a digest
+_PRIORITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
+def _record_stage(batch_result: Dict, name: str, items: int, started: float) -> None:
+    """Record duration and throughput of one batch pipeline stage."""
+    seconds = time.perf_counter() - started
+    batch_result["stages"][name] = {
+        "items": items,
+        "seconds": seconds,
+        "items_per_second": items / seconds if seconds > 0 else 0.0
+    }
+
 
 # ============================================================================
 # INTERVENTION ORCHESTRATOR
@@ -192,16 +211,67 @@ class InterventionOrchestrator:
         tutors: List[Tuple[TutorState, str]],  # List of (tutor_state, tutor_email)
         create_interventions: bool = True,
         send_notifications: bool = True,
-        notification_type: str = "both"
+        notification_type: str = "both",
+        max_concurrency: int = DEFAULT_EMAIL_CONCURRENCY
     ) -> Dict[str, any]:
         """
         Evaluate multiple tutors for interventions and send notifications.
 
+        Synchronous wrapper around batch_evaluate_and_notify_async; call that
+        directly from async code.
+
         Args:
             tutors: List of tuples (tutor_state, tutor_email)
             create_interventions: Create intervention records in database
             send_notifications: Send notification emails/in-app
             notification_type: Type of notification ('email', 'in_app', 'both')
+            max_concurrency: Maximum simultaneous SMTP connections
+
+        Returns:
+            Dict with batch results
+        """
+        # Private loop rather than asyncio.run, which would also clear the
+        # caller's current event loop
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.batch_evaluate_and_notify_async(
+                tutors,
+                create_interventions=create_interventions,
+                send_notifications=send_notifications,
+                notification_type=notification_type,
+                max_concurrency=max_concurrency
+            ))
+        finally:
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+    async def batch_evaluate_and_notify_async(
+        self,
+        tutors: List[Tuple[TutorState, str]],
+        create_interventions: bool = True,
+        send_notifications: bool = True,
+        notification_type: str = "both",
+        max_concurrency: int = DEFAULT_EMAIL_CONCURRENCY
+    ) -> Dict[str, any]:
+        """
+        Evaluate multiple tutors for interventions and send notifications.
+
+        Runs as a staged pipeline over the whole batch instead of tutor by tutor:
+        1. evaluate: run the rule engine for every tutor
+        2. persist: insert all intervention records in one transaction
+        3. render: build notification records and group emails by recipient
+           into one digest each
+        4. dispatch: send digests concurrently over at most max_concurrency
+           SMTP connections, then create in-app notifications in bulk
+
+        Per-stage duration and throughput are returned under "stages".
+
+        Args:
+            tutors: List of tuples (tutor_state, tutor_email)
+            create_interventions: Create intervention records in database
+            send_notifications: Send notification emails/in-app
+            notification_type: Type of notification ('email', 'in_app', 'both')
+            max_concurrency: Maximum simultaneous SMTP connections
 
         Returns:
             Dict with batch results
@@ -215,34 +285,141 @@ class InterventionOrchestrator:
             "total_interventions_created": 0,
             "total_notifications_sent": 0,
             "results": [],
-            "errors": []
+            "errors": [],
+            "stages": {}
         }
 
+        # Stage 1: evaluate
+        started = time.perf_counter()
+        pending = []  # (tutor result, tutor_state, tutor_email, intervention result, trigger)
         for tutor_state, tutor_email in tutors:
+            result = {
+                "tutor_id": tutor_state.tutor_id,
+                "tutor_name": tutor_state.tutor_name,
+                "evaluated_at": datetime.now().isoformat(),
+                "triggers_found": 0,
+                "interventions_created": 0,
+                "notifications_sent": 0,
+                "interventions": [],
+                "errors": []
+            }
             try:
-                result = self.evaluate_and_notify(
-                    tutor_state=tutor_state,
-                    tutor_email=tutor_email,
-                    create_interventions=create_interventions,
-                    send_notifications=send_notifications,
-                    notification_type=notification_type
-                )
-
-                if result["triggers_found"] > 0:
-                    batch_result["tutors_with_interventions"] += 1
-
-                batch_result["total_triggers"] += result["triggers_found"]
-                batch_result["total_interventions_created"] += result["interventions_created"]
-                batch_result["total_notifications_sent"] += result["notifications_sent"]
-                batch_result["results"].append(result)
-
+                triggers = self.intervention_framework.evaluate_tutor_for_interventions(tutor_state)
             except Exception as e:
                 logger.error(f"Error processing tutor {tutor_state.tutor_id}: {e}", exc_info=True)
                 batch_result["errors"].append({
                     "tutor_id": tutor_state.tutor_id,
                     "error": str(e)
                 })
+                continue
 
+            result["triggers_found"] = len(triggers)
+            for trigger in triggers:
+                intervention_result = {
+                    "type": trigger.intervention_type.value,
+                    "priority": trigger.priority.value,
+                    "intervention_id": None,
+                    "notification_id": None,
+                    "notification_sent": False,
+                    "errors": []
+                }
+                result["interventions"].append(intervention_result)
+                pending.append((result, tutor_state, tutor_email, intervention_result, trigger))
+
+            if triggers:
+                batch_result["tutors_with_interventions"] += 1
+            batch_result["total_triggers"] += len(triggers)
+            batch_result["results"].append(result)
+        _record_stage(batch_result, "evaluate", len(tutors), started)
+
+        # Stage 2: persist intervention records
+        if create_interventions and self.db_session and pending:
+            started = time.perf_counter()
+            self._create_intervention_records(pending)
+            created = sum(1 for item in pending if item[3]["intervention_id"])
+            for result, *_ in pending:
+                result["interventions_created"] = sum(
+                    1 for item in result["interventions"] if item["intervention_id"]
+                )
+            batch_result["total_interventions_created"] = created
+            _record_stage(batch_result, "persist", len(pending), started)
+
+        if send_notifications and pending:
+            # Stage 3: render notifications and build per-recipient digests
+            started = time.perf_counter()
+            records = []
+            for result, tutor_state, tutor_email, intervention_result, trigger in pending:
+                try:
+                    record = self.notification_service.build_notification_record(
+                        intervention_trigger=trigger,
+                        tutor_state=tutor_state,
+                        tutor_email=tutor_email,
+                        intervention_id=intervention_result["intervention_id"],
+                        notification_type=notification_type
+                    )
+                except Exception as e:
+                    logger.error(f"Error rendering notification: {e}", exc_info=True)
+                    intervention_result["errors"].append(f"Notification error: {str(e)}")
+                    continue
+                intervention_result["notification_id"] = record["notification_id"]
+                records.append((record, result, intervention_result, trigger))
+
+            by_recipient = defaultdict(list)
+            if notification_type in ["email", "both"]:
+                for item in records:
+                    by_recipient[item[0]["recipient_email"]].append(item)
+            groups = [
+                sorted(group, key=lambda item: _PRIORITY_ORDER.get(item[3].priority.value, len(_PRIORITY_ORDER)))
+                for group in by_recipient.values()
+            ]
+            digests = [
+                self.notification_service.build_digest([item[0] for item in group])
+                for group in groups
+            ]
+            _record_stage(batch_result, "render", len(records), started)
+
+            # Stage 4: dispatch
+            started = time.perf_counter()
+            delivered = await self.notification_service.send_digests(digests, max_concurrency=max_concurrency)
+            now = datetime.now()
+            for group, ok in zip(groups, delivered):
+                for record, _, intervention_result, _ in group:
+                    record["email_sent"] = ok
+                    if ok:
+                        record["status"] = "sent"
+                        record["sent_at"] = now
+                    else:
+                        record["status"] = "failed"
+                        record["failed_at"] = now
+                        record["failure_reason"] = "Email delivery failed"
+                        intervention_result["errors"].append("Email delivery failed")
+
+            in_app_created = False
+            if notification_type in ["in_app", "both"] and records:
+                in_app_created = await asyncio.to_thread(
+                    self.notification_service.create_in_app_notifications,
+                    [record for record, *_ in records]
+                )
+                if not in_app_created:
+                    for _, _, intervention_result, _ in records:
+                        intervention_result["errors"].append("In-app notification creation failed")
+
+            for record, result, intervention_result, _ in records:
+                sent = record.pop("email_sent", False) or in_app_created
+                intervention_result["notification_sent"] = sent
+                if sent:
+                    result["notifications_sent"] += 1
+                    batch_result["total_notifications_sent"] += 1
+                self.notification_service.notification_queue.append(record)
+            _record_stage(batch_result, "dispatch", len(digests) + (len(records) if in_app_created else 0), started)
+            batch_result["emails_sent"] = sum(delivered)
+            batch_result["email_digests"] = len(digests)
+
+        for name, stage in batch_result["stages"].items():
+            logger.info(
+                f"Stage {name}: {stage['items']} items in {stage['seconds']:.3f}s "
+                f"({stage['items_per_second']:.0f}/s)"
+            )
         logger.info(
             f"Batch evaluation complete: {batch_result['tutors_with_interventions']}/{batch_result['total_tutors']} "
             f"tutors with interventions, {batch_result['total_notifications_sent']} notifications sent"
@@ -250,6 +427,53 @@ class InterventionOrchestrator:
 
         return batch_result
 
+    def _create_intervention_records(self, pending: List[Tuple]) -> None:
+        """
+        Insert intervention records for a batch of triggers in one transaction.
+
+        Sets intervention_id on each intervention result, or records the
+        database error on all of them if the insert fails.
+        """
+        from ..api.tutor_profile_service import invalidate_tutor_profiles_sync
+
+        interventions = []
+        for _, tutor_state, _, intervention_result, trigger in pending:
+            intervention = self._build_intervention(tutor_state, trigger)
+            interventions.append((intervention_result, intervention))
+
+        try:
+            self.db_session.add_all([intervention for _, intervention in interventions])
+            self.db_session.commit()
+        except Exception as e:
+            logger.error(f"Error creating intervention records: {e}", exc_info=True)
+            self.db_session.rollback()
+            for intervention_result, _ in interventions:
+                intervention_result["errors"].append(f"Database error: {str(e)}")
+            return
+
+        for intervention_result, intervention in interventions:
+            intervention_result["intervention_id"] = intervention.intervention_id
+        invalidate_tutor_profiles_sync(list({item[1].tutor_id for item in pending}))
+
+        logger.info(f"Created {len(interventions)} intervention records")
+
+    def _build_intervention(self, tutor_state: TutorState, trigger: InterventionTrigger):
+        """Build an (unsaved) Intervention row for a trigger."""
+        # Import here to avoid circular dependency
+        from ..database.models import Intervention, InterventionType as DBInterventionType, InterventionStatus
+
+        return Intervention(
+            intervention_id=f"intv_{uuid.uuid4().hex[:12]}",
+            tutor_id=tutor_state.tutor_id,
+            intervention_type=DBInterventionType(trigger.intervention_type.value),
+            trigger_reason=trigger.trigger_reason,
+            recommended_date=datetime.now(),
+            assigned_to=trigger.assigned_to,
+            status=InterventionStatus.PENDING,
+            due_date=datetime.now() + timedelta(days=trigger.due_days),
+            notes=trigger.notes
+        )
+
     def _create_intervention_record(
         self,
         tutor_state: TutorState,
@@ -268,31 +492,15 @@ class InterventionOrchestrator:
         if not self.db_session:
             raise ValueError("Database session required to create intervention records")
 
-        # Import here to avoid circular dependency
-        from ..database.models import Intervention, InterventionType as DBInterventionType, InterventionStatus
-
-        # Generate intervention ID
-        intervention_id = f"intv_{uuid.uuid4().hex[:12]}"
+        from ..api.tutor_profile_service import invalidate_tutor_profiles_sync
 
-        # Calculate due date
-        due_date = datetime.now() + timedelta(days=trigger.due_days)
-
-        # Create intervention
-        intervention = Intervention(
-            intervention_id=intervention_id,
-            tutor_id=tutor_state.tutor_id,
-            intervention_type=DBInterventionType(trigger.intervention_type.value),
-            trigger_reason=trigger.trigger_reason,
-            recommended_date=datetime.now(),
-            assigned_to=trigger.assigned_to,
-            status=InterventionStatus.PENDING,
-            due_date=due_date,
-            notes=trigger.notes
-        )
+        intervention = self._build_intervention(tutor_state, trigger)
+        intervention_id = intervention.intervention_id
 
         # Add to session and commit
         self.db_session.add(intervention)
         self.db_session.commit()
+        invalidate_tutor_profiles_sync([tutor_state.tutor_id])
 
         logger.info(f"Created intervention record {intervention_id} for tutor {tutor_state.tutor_id}")
 
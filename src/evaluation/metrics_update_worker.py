@@ -6,16 +6,18 @@ tutor performance metrics in near real-time (<60 seconds).
 
 This worker:
 1. Consumes session completion events from Redis enrichment queue
-2. Calculates updated performance metrics for affected tutors
-3. Persists metrics to tutor_performance_metrics table
-4. Maintains low latency (<60s from event to database)
+2. Schedules a debounced recompute for affected tutors in Redis
+   (see recompute_scheduler), shared by all worker replicas
+3. Claims due tutors in batches and recalculates their metrics set-based
+4. Persists metrics to tutor_performance_metrics table
+5. Maintains low latency (<60s from event to database)
 """
 
 import logging
 import time
 import signal
 import asyncio
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from ..queue.client import RedisClient
@@ -24,6 +26,13 @@ from ..queue.channels import QueueChannels
 from ..database.connection import get_session
 from ..database.models import MetricWindow
 from .performance_calculator import PerformanceCalculator
+from .recompute_scheduler import (
+    RecomputeScheduler,
+    metrics_recompute_batch_seconds,
+    metrics_recompute_freshness_seconds,
+    metrics_recompute_pending,
+    metrics_recompute_tutors_total,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -40,9 +49,9 @@ class MetricsUpdateWorker:
     Processing flow:
     1. Listen to session enrichment queue
     2. Extract tutor_id from session completion events
-    3. Calculate updated metrics for affected tutor
-    4. Save metrics to database
-    5. Acknowledge processed events
+    3. Schedule the tutors in the shared recompute queue
+    4. Acknowledge processed events
+    5. Claim due tutors in batches, calculate and save their metrics
     """
 
     # Target metric calculation windows
@@ -60,6 +69,9 @@ class MetricsUpdateWorker:
         poll_interval_ms: int = 1000,
         enable_debouncing: bool = True,
         debounce_window_seconds: int = 30,
+        recompute_batch_size: int = 100,
+        lease_seconds: int = 300,
+        scheduler: Optional[RecomputeScheduler] = None,
     ):
         """
         Initialize metrics update worker.
@@ -71,6 +83,10 @@ class MetricsUpdateWorker:
             poll_interval_ms: Polling interval in milliseconds
             enable_debouncing: Enable debouncing to batch updates per tutor
             debounce_window_seconds: Window for debouncing tutor updates
+            recompute_batch_size: Maximum tutors claimed per recompute batch
+            lease_seconds: How long a claimed batch is reserved before another
+                worker may retry it
+            scheduler: Recompute scheduler (creates one on redis_client if None)
         """
         self.redis_client = redis_client or RedisClient()
         self.consumer_group = consumer_group
@@ -78,6 +94,7 @@ class MetricsUpdateWorker:
         self.poll_interval_ms = poll_interval_ms
         self.enable_debouncing = enable_debouncing
         self.debounce_window_seconds = debounce_window_seconds
+        self.recompute_batch_size = recompute_batch_size
 
         # Initialize components
         self.consumer = MessageConsumer(
@@ -95,10 +112,22 @@ class MetricsUpdateWorker:
             "tutors_updated": set(),
             "start_time": None,
             "total_processing_time_ms": 0,
+            "tutors_recomputed": 0,
+            "recompute_time_ms": 0,
+            "freshness_total_seconds": 0.0,
+            "freshness_max_seconds": 0.0,
         }
 
-        # Debouncing state: track tutors to update
-        self._pending_tutor_updates: Dict[str, datetime] = {}
+        # Debouncing state lives in Redis so it is shared across replicas
+        self.scheduler = scheduler or RecomputeScheduler(
+            self.redis_client,
+            debounce_seconds=debounce_window_seconds,
+            lease_seconds=lease_seconds,
+        )
+
+        # One event loop for the worker's lifetime, so the async engine's
+        # pooled connections are reused across batches
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -122,6 +151,7 @@ class MetricsUpdateWorker:
         logger.info(f"Debouncing: {self.enable_debouncing}")
         if self.enable_debouncing:
             logger.info(f"Debounce window: {self.debounce_window_seconds}s")
+            logger.info(f"Recompute batch size: {self.recompute_batch_size}")
 
         self.running = True
         self.stats["start_time"] = datetime.now()
@@ -157,9 +187,8 @@ class MetricsUpdateWorker:
             logger.error(f"Worker error: {e}", exc_info=True)
 
         finally:
-            # Process any remaining debounced updates before shutdown
-            if self.enable_debouncing:
-                self._process_debounced_updates(force=True)
+            # Pending recomputes stay in Redis for the other replicas (or
+            # this worker after a restart), so there is nothing to flush
             self._shutdown()
 
     def _process_session_events(self, queue: str) -> int:
@@ -186,7 +215,7 @@ class MetricsUpdateWorker:
             logger.info(f"Processing {len(messages)} session events from {queue}")
 
             # Extract tutor IDs from session events
-            tutor_ids = set()
+            tutor_ids = []
             message_ids = []
 
             for message in messages:
@@ -199,16 +228,11 @@ class MetricsUpdateWorker:
                     session_id = session_data.get("session_id")
 
                     if tutor_id:
-                        if self.enable_debouncing:
-                            # Add to debounce queue
-                            self._pending_tutor_updates[tutor_id] = datetime.now()
-                            logger.debug(
-                                f"Session {session_id} completed for tutor {tutor_id}, "
-                                f"queued for metrics update"
-                            )
-                        else:
-                            # Process immediately
-                            tutor_ids.add(tutor_id)
+                        tutor_ids.append(tutor_id)
+                        logger.debug(
+                            f"Session {session_id} completed for tutor {tutor_id}, "
+                            f"queued for metrics update"
+                        )
 
                         self.stats["events_processed"] += 1
                         message_ids.append(message.get("_redis_id"))
@@ -223,9 +247,13 @@ class MetricsUpdateWorker:
                     logger.error(f"Error processing session event: {e}", exc_info=True)
                     self.stats["errors"] += 1
 
-            # If not using debouncing, update metrics immediately
-            if not self.enable_debouncing and tutor_ids:
-                asyncio.run(self._update_metrics_batch(list(tutor_ids)))
+            if tutor_ids:
+                if self.enable_debouncing:
+                    # Schedule before acknowledging so no event is lost if we crash
+                    self.scheduler.schedule(tutor_ids)
+                else:
+                    # Process immediately
+                    self._run_recompute([(tutor_id, time.time()) for tutor_id in dict.fromkeys(tutor_ids)])
 
             # Acknowledge all processed messages
             for message_id in message_ids:
@@ -240,51 +268,125 @@ class MetricsUpdateWorker:
             logger.error(f"Error processing session events: {e}", exc_info=True)
             return 0
 
+    def _run_async(self, coro):
+        """Run a coroutine on the worker's event loop."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
     def _process_debounced_updates(self, force: bool = False):
         """
-        Process pending tutor updates from debounce queue.
+        Claim due tutors from the shared recompute queue and update them.
+
+        Claims batches of up to recompute_batch_size until nothing is due.
 
         Args:
-            force: If True, process all pending updates regardless of time
+            force: If True, claim all pending tutors regardless of time
         """
-        if not self._pending_tutor_updates:
-            return
+        while True:
+            claimed = self.scheduler.claim(self.recompute_batch_size, force=force)
+            if not claimed:
+                break
 
-        now = datetime.now()
-        tutors_to_update = []
+            logger.info(
+                f"Processing debounced metrics updates for {len(claimed)} tutors"
+            )
+            self._run_recompute(claimed)
 
-        # Find tutors ready for update
-        for tutor_id, queued_at in list(self._pending_tutor_updates.items()):
-            time_elapsed = (now - queued_at).total_seconds()
+            if len(claimed) < self.recompute_batch_size:
+                break
 
-            if force or time_elapsed >= self.debounce_window_seconds:
-                tutors_to_update.append(tutor_id)
-                del self._pending_tutor_updates[tutor_id]
+        metrics_recompute_pending.set(self.scheduler.pending_count())
 
-        # Update metrics for ready tutors
-        if tutors_to_update:
-            logger.info(
-                f"Processing debounced metrics updates for {len(tutors_to_update)} tutors"
-            )
-            asyncio.run(self._update_metrics_batch(tutors_to_update))
+    def _run_recompute(self, claimed: List[Tuple[str, float]]) -> None:
+        """
+        Recompute metrics for claimed tutors and record freshness/throughput.
 
-    async def _update_metrics_batch(self, tutor_ids: List[str]):
+        Args:
+            claimed: (tutor_id, first event timestamp) pairs
+        """
+        tutor_ids = [tutor_id for tutor_id, _ in claimed]
+        start_time = time.time()
+
+        updated = set(self._run_async(self._update_metrics_batch(tutor_ids)))
+
+        elapsed = time.time() - start_time
+        metrics_recompute_batch_seconds.observe(elapsed)
+        self.stats["recompute_time_ms"] += elapsed * 1000
+
+        if self.enable_debouncing:
+            # Failed tutors keep their lease and are retried when it expires
+            self.scheduler.complete(updated)
+
+        logger.info(
+            f"Updated metrics for {len(updated)}/{len(claimed)} tutors in {elapsed * 1000:.2f}ms"
+        )
+
+        now = time.time()
+        for tutor_id, first_seen in claimed:
+            if tutor_id not in updated:
+                metrics_recompute_tutors_total.labels(outcome="failed").inc()
+                continue
+
+            freshness = max(now - first_seen, 0.0)
+            metrics_recompute_freshness_seconds.observe(freshness)
+            metrics_recompute_tutors_total.labels(outcome="success").inc()
+            self.stats["tutors_recomputed"] += 1
+            self.stats["freshness_total_seconds"] += freshness
+            self.stats["freshness_max_seconds"] = max(self.stats["freshness_max_seconds"], freshness)
+
+    async def _update_metrics_batch(self, tutor_ids: List[str]) -> List[str]:
         """
         Update metrics for a batch of tutors.
 
+        All tutors and windows are calculated set-based and saved in one
+        transaction. If that fails, tutors are retried one at a time so a
+        single bad tutor does not hold back the rest.
+
         Args:
             tutor_ids: List of tutor IDs to update
+
+        Returns:
+            IDs of tutors whose metrics were saved
         """
+        try:
+            async with get_session() as db_session:
+                calculator = PerformanceCalculator(db_session)
+                metrics = await calculator.calculate_metrics_for_tutors(
+                    tutor_ids,
+                    self.METRIC_WINDOWS,
+                    reference_date=datetime.utcnow()
+                )
+                self.stats["metrics_calculated"] += len(metrics)
+
+                await calculator.save_metrics_bulk(metrics)
+                await db_session.commit()
+
+            self.stats["metrics_saved"] += len(metrics)
+            self.stats["tutors_updated"].update(tutor_ids)
+            return list(tutor_ids)
+
+        except Exception as e:
+            logger.error(
+                f"Batch metrics update failed for {len(tutor_ids)} tutors, "
+                f"retrying individually: {e}",
+                exc_info=True
+            )
+            self.stats["errors"] += 1
+
+        updated = []
         for tutor_id in tutor_ids:
             try:
                 await self._update_tutor_metrics(tutor_id)
                 self.stats["tutors_updated"].add(tutor_id)
+                updated.append(tutor_id)
             except Exception as e:
                 logger.error(
                     f"Failed to update metrics for tutor {tutor_id}: {e}",
                     exc_info=True
                 )
                 self.stats["errors"] += 1
+        return updated
 
     async def _update_tutor_metrics(self, tutor_id: str):
         """
@@ -358,9 +460,21 @@ class MetricsUpdateWorker:
                 f"tutors_updated={len(self.stats['tutors_updated'])}, "
                 f"event_rate={event_rate:.2f}/s, "
                 f"avg_processing_time={avg_processing_time:.2f}ms, "
-                f"pending_updates={len(self._pending_tutor_updates)}"
+                f"recompute_rate={self._recompute_rate():.2f} tutors/s, "
+                f"avg_freshness={self._avg_freshness():.1f}s"
             )
 
+    def _recompute_rate(self) -> float:
+        """Tutors recomputed per second of recompute time."""
+        seconds = self.stats["recompute_time_ms"] / 1000
+        return self.stats["tutors_recomputed"] / seconds if seconds > 0 else 0.0
+
+    def _avg_freshness(self) -> float:
+        """Mean seconds from first session event to saved metrics."""
+        if not self.stats["tutors_recomputed"]:
+            return 0.0
+        return self.stats["freshness_total_seconds"] / self.stats["tutors_recomputed"]
+
     def _shutdown(self) -> None:
         """Shutdown worker gracefully."""
         logger.info("Shutting down metrics update worker...")
@@ -368,13 +482,23 @@ class MetricsUpdateWorker:
         # Log final stats
         self._log_stats()
 
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+
         logger.info("Metrics update worker stopped")
 
     def get_stats(self) -> Dict[str, Any]:
         """Get worker statistics."""
         stats = self.stats.copy()
         stats["tutors_updated"] = len(self.stats["tutors_updated"])
-        stats["pending_updates"] = len(self._pending_tutor_updates)
+        stats["recompute_throughput_per_sec"] = self._recompute_rate()
+        stats["avg_freshness_seconds"] = self._avg_freshness()
+        try:
+            stats["pending_updates"] = self.scheduler.pending_count()
+        except Exception as e:
+            logger.warning(f"Could not read pending recompute count: {e}")
+            stats["pending_updates"] = None
         return stats
 
 
@@ -6,6 +6,8 @@ It provides a unified interface for notification delivery with retry logic,
 error handling, and database tracking.
 """
 
+import asyncio
+import html
 import logging
 import smtplib
 import uuid
@@ -24,7 +26,6 @@ from .notification_templates import (
 # Import intervention framework types
 from .intervention_framework import (
     InterventionTrigger,
-    InterventionType,
     InterventionPriority,
     TutorState
 )
@@ -59,6 +60,157 @@ class NotificationConfig:
     store_notifications: bool = True  # Store in database
 
 
+# ============================================================================
+# SMTP HELPERS
+# ============================================================================
+
+def _build_email_message(
+    email_config: EmailConfig,
+    to_email: str,
+    subject: str,
+    body_text: str,
+    body_html: Optional[str] = None
+) -> MIMEMultipart:
+    """Build a multipart (plain text + optional HTML) email message."""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = f"{email_config.from_name} <{email_config.from_email}>"
+    msg['To'] = to_email
+
+    # Add plain text part
+    msg.attach(MIMEText(body_text, 'plain'))
+
+    # Add HTML part if provided
+    if body_html:
+        msg.attach(MIMEText(body_html, 'html'))
+
+    return msg
+
+
+def _connect_smtp(email_config: EmailConfig) -> smtplib.SMTP:
+    """Open an authenticated SMTP connection."""
+    if email_config.smtp_use_ssl:
+        server = smtplib.SMTP_SSL(email_config.smtp_host, email_config.smtp_port)
+    else:
+        server = smtplib.SMTP(email_config.smtp_host, email_config.smtp_port)
+
+    if email_config.smtp_use_tls:
+        server.starttls()
+
+    if email_config.smtp_username:
+        server.login(email_config.smtp_username, email_config.smtp_password)
+
+    return server
+
+
+def _notification_model(notification_record: Dict):
+    """Build a Notification row from a notification record."""
+    # Import here to avoid circular dependency
+    from ..database.models import Notification, NotificationType, NotificationStatus, NotificationPriority, InterventionType as DBInterventionType
+
+    return Notification(
+        notification_id=notification_record["notification_id"],
+        recipient_id=notification_record["recipient_id"],
+        recipient_email=notification_record["recipient_email"],
+        notification_type=NotificationType(notification_record["notification_type"]),
+        priority=NotificationPriority(notification_record["priority"]),
+        status=NotificationStatus(notification_record["status"]),
+        subject=notification_record["subject"],
+        body=notification_record["body"],
+        html_body=notification_record.get("html_body"),
+        intervention_id=notification_record.get("intervention_id"),
+        intervention_type=DBInterventionType(notification_record["intervention_type"]) if notification_record.get("intervention_type") else None,
+        sent_at=notification_record.get("sent_at"),
+        failed_at=notification_record.get("failed_at"),
+        failure_reason=notification_record.get("failure_reason"),
+        retry_count=notification_record.get("retry_count", 0)
+    )
+
+
+class AsyncEmailSender:
+    """
+    Sends many emails concurrently with a bounded number of SMTP connections.
+
+    Each of max_concurrency workers pulls messages from a shared queue and
+    reuses one SMTP connection for everything it sends. smtplib is blocking,
+    so sends run in worker threads via asyncio.to_thread.
+    """
+
+    def __init__(self, email_config: EmailConfig, max_concurrency: int = 8):
+        self.email_config = email_config
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def send_all(self, messages: List[Dict]) -> List[bool]:
+        """
+        Send messages (dicts with to_email, subject, body_text, body_html).
+
+        Returns:
+            Delivery result per message, in order
+        """
+        if not messages:
+            return []
+
+        if not self.email_config.enabled:
+            logger.info(f"Email disabled, would send {len(messages)} emails")
+            return [True] * len(messages)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, message in enumerate(messages):
+            queue.put_nowait((index, message))
+
+        results = [False] * len(messages)
+        workers = min(self.max_concurrency, len(messages))
+        await asyncio.gather(*(self._worker(queue, results) for _ in range(workers)))
+        return results
+
+    async def _worker(self, queue: asyncio.Queue, results: List[bool]) -> None:
+        server = None
+        try:
+            while not queue.empty():
+                index, message = queue.get_nowait()
+                server, results[index] = await asyncio.to_thread(self._send, server, message)
+        finally:
+            if server is not None:
+                await asyncio.to_thread(_close_smtp, server)
+
+    def _send(self, server: Optional[smtplib.SMTP], message: Dict):
+        """Send one message, (re)connecting once if needed. Returns (server, ok)."""
+        msg = _build_email_message(
+            self.email_config,
+            message["to_email"],
+            message["subject"],
+            message["body_text"],
+            message.get("body_html")
+        )
+
+        for attempt in range(2):
+            try:
+                if server is None:
+                    server = _connect_smtp(self.email_config)
+                server.send_message(msg)
+                logger.info(f"Email sent to {message['to_email']}: {message['subject']}")
+                return server, True
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                # Stale pooled connection: drop it and retry on a fresh one
+                if server is not None:
+                    _close_smtp(server)
+                server = None
+                if attempt:
+                    logger.error(f"Failed to send email to {message['to_email']}: {e}")
+            except Exception as e:
+                logger.error(f"Failed to send email to {message['to_email']}: {e}", exc_info=True)
+                return server, False
+
+        return server, False
+
+
+def _close_smtp(server: smtplib.SMTP) -> None:
+    try:
+        server.quit()
+    except Exception:
+        pass
+
+
 # ============================================================================
 # NOTIFICATION SERVICE
 # ============================================================================
@@ -117,49 +269,16 @@ class NotificationService:
             f"to tutor {tutor_state.tutor_id}"
         )
 
-        # Convert InterventionType to TemplateInterventionType
-        template_type = TemplateInterventionType(intervention_trigger.intervention_type.value)
-
-        # Get notification template
-        template = get_notification_template(
-            intervention_type=template_type,
-            tutor_name=tutor_state.tutor_name,
-            trigger_reason=intervention_trigger.trigger_reason,
-            recommended_actions=intervention_trigger.recommended_actions,
-            tutor_id=tutor_state.tutor_id
+        notification_record = self.build_notification_record(
+            intervention_trigger=intervention_trigger,
+            tutor_state=tutor_state,
+            tutor_email=tutor_email,
+            intervention_id=intervention_id,
+            notification_type=notification_type
         )
-
-        # Determine recipient based on whether intervention requires human review
-        if intervention_trigger.requires_human:
-            # Send to staff (assigned_to)
-            recipient_id = intervention_trigger.assigned_to or "staff_default"
-            recipient_email = self._get_staff_email(recipient_id)
-        else:
-            # Send to tutor
-            recipient_id = tutor_state.tutor_id
-            recipient_email = tutor_email
-
-        # Map priority
-        priority = self._map_priority(intervention_trigger.priority)
-
-        # Generate notification ID
-        notification_id = f"notif_{uuid.uuid4().hex[:12]}"
-
-        # Create notification record
-        notification_record = {
-            "notification_id": notification_id,
-            "recipient_id": recipient_id,
-            "recipient_email": recipient_email,
-            "notification_type": notification_type,
-            "priority": priority,
-            "status": "pending",
-            "subject": template.subject,
-            "body": template.body_text,
-            "html_body": template.body_html,
-            "intervention_id": intervention_id,
-            "intervention_type": intervention_trigger.intervention_type.value,
-            "created_at": datetime.now()
-        }
+        notification_id = notification_record["notification_id"]
+        recipient_email = notification_record["recipient_email"]
+        recipient_id = notification_record["recipient_id"]
 
         results = {
             "notification_id": notification_id,
@@ -173,9 +292,9 @@ class NotificationService:
             try:
                 email_success = self._send_email(
                     to_email=recipient_email,
-                    subject=template.subject,
-                    body_text=template.body_text,
-                    body_html=template.body_html
+                    subject=notification_record["subject"],
+                    body_text=notification_record["body"],
+                    body_html=notification_record["html_body"]
                 )
 
                 if email_success:
@@ -226,6 +345,149 @@ class NotificationService:
 
         return results
 
+    def build_notification_record(
+        self,
+        intervention_trigger: InterventionTrigger,
+        tutor_state: TutorState,
+        tutor_email: str,
+        intervention_id: Optional[str] = None,
+        notification_type: str = "both"
+    ) -> Dict[str, any]:
+        """
+        Render the notification for an intervention trigger without sending it.
+
+        Args:
+            intervention_trigger: The intervention trigger
+            tutor_state: Current tutor state
+            tutor_email: Tutor's email address
+            intervention_id: ID of the intervention record (optional)
+            notification_type: Type of notification ('email', 'in_app', 'both')
+
+        Returns:
+            Pending notification record
+        """
+        # Convert InterventionType to TemplateInterventionType
+        template_type = TemplateInterventionType(intervention_trigger.intervention_type.value)
+
+        # Get notification template
+        template = get_notification_template(
+            intervention_type=template_type,
+            tutor_name=tutor_state.tutor_name,
+            trigger_reason=intervention_trigger.trigger_reason,
+            recommended_actions=intervention_trigger.recommended_actions,
+            tutor_id=tutor_state.tutor_id
+        )
+
+        # Determine recipient based on whether intervention requires human review
+        if intervention_trigger.requires_human:
+            # Send to staff (assigned_to)
+            recipient_id = intervention_trigger.assigned_to or "staff_default"
+            recipient_email = self._get_staff_email(recipient_id)
+        else:
+            # Send to tutor
+            recipient_id = tutor_state.tutor_id
+            recipient_email = tutor_email
+
+        return {
+            "notification_id": f"notif_{uuid.uuid4().hex[:12]}",
+            "recipient_id": recipient_id,
+            "recipient_email": recipient_email,
+            "notification_type": notification_type,
+            "priority": self._map_priority(intervention_trigger.priority),
+            "status": "pending",
+            "subject": template.subject,
+            "body": template.body_text,
+            "html_body": template.body_html,
+            "intervention_id": intervention_id,
+            "intervention_type": intervention_trigger.intervention_type.value,
+            "created_at": datetime.now()
+        }
+
+    def build_digest(self, notification_records: List[Dict]) -> Dict[str, any]:
+        """
+        Combine the notifications for one recipient into a single email.
+
+        Args:
+            notification_records: Records with the same recipient_email, most
+                urgent first
+
+        Returns:
+            Dict with to_email, subject, body_text and body_html
+        """
+        first = notification_records[0]
+        if len(notification_records) == 1:
+            return {
+                "to_email": first["recipient_email"],
+                "subject": first["subject"],
+                "body_text": first["body"],
+                "body_html": first["html_body"],
+            }
+
+        divider = "\n\n" + "-" * 60 + "\n\n"
+        body_text = divider.join(
+            f"{record['subject']}\n\n{record['body']}" for record in notification_records
+        )
+        body_html = "<hr>".join(
+            record["html_body"] or f"<pre>{html.escape(record['body'])}</pre>"
+            for record in notification_records
+        )
+
+        return {
+            "to_email": first["recipient_email"],
+            "subject": f"{len(notification_records)} TutorMax notifications: {first['subject']}",
+            "body_text": body_text,
+            "body_html": body_html,
+        }
+
+    async def send_digests(
+        self,
+        digests: List[Dict],
+        max_concurrency: int = 8
+    ) -> List[bool]:
+        """
+        Send digest emails concurrently over a bounded set of SMTP connections.
+
+        Args:
+            digests: Dicts from build_digest
+            max_concurrency: Maximum simultaneous SMTP connections
+
+        Returns:
+            Delivery result per digest, in order
+        """
+        sender = AsyncEmailSender(self.config.email_config, max_concurrency=max_concurrency)
+        return await sender.send_all(digests)
+
+    def create_in_app_notifications(self, notification_records: List[Dict]) -> bool:
+        """
+        Create in-app notifications for many records in one transaction.
+
+        Args:
+            notification_records: Notification data
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not notification_records:
+            return True
+
+        if not self.db_session:
+            logger.warning(
+                f"No database session provided, skipping {len(notification_records)} in-app notifications"
+            )
+            return False
+
+        try:
+            self.db_session.add_all([_notification_model(record) for record in notification_records])
+            self.db_session.commit()
+
+            logger.info(f"Created {len(notification_records)} in-app notifications in database")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to create in-app notifications: {e}", exc_info=True)
+            self.db_session.rollback()
+            return False
+
     def _send_email(
         self,
         to_email: str,
@@ -250,42 +512,9 @@ class NotificationService:
             return True  # Treat as success in test mode
 
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.config.email_config.from_name} <{self.config.email_config.from_email}>"
-            msg['To'] = to_email
-
-            # Add plain text part
-            part1 = MIMEText(body_text, 'plain')
-            msg.attach(part1)
-
-            # Add HTML part if provided
-            if body_html:
-                part2 = MIMEText(body_html, 'html')
-                msg.attach(part2)
-
-            # Send via SMTP
-            if self.config.email_config.smtp_use_ssl:
-                server = smtplib.SMTP_SSL(
-                    self.config.email_config.smtp_host,
-                    self.config.email_config.smtp_port
-                )
-            else:
-                server = smtplib.SMTP(
-                    self.config.email_config.smtp_host,
-                    self.config.email_config.smtp_port
-                )
-
-            if self.config.email_config.smtp_use_tls:
-                server.starttls()
-
-            if self.config.email_config.smtp_username:
-                server.login(
-                    self.config.email_config.smtp_username,
-                    self.config.email_config.smtp_password
-                )
+            msg = _build_email_message(self.config.email_config, to_email, subject, body_text, body_html)
 
+            server = _connect_smtp(self.config.email_config)
             server.send_message(msg)
             server.quit()
 
@@ -311,27 +540,7 @@ class NotificationService:
             return False
 
         try:
-            # Import here to avoid circular dependency
-            from ..database.models import Notification, NotificationType, NotificationStatus, NotificationPriority, InterventionType as DBInterventionType
-
-            # Create notification object
-            notification = Notification(
-                notification_id=notification_record["notification_id"],
-                recipient_id=notification_record["recipient_id"],
-                recipient_email=notification_record["recipient_email"],
-                notification_type=NotificationType(notification_record["notification_type"]),
-                priority=NotificationPriority(notification_record["priority"]),
-                status=NotificationStatus(notification_record["status"]),
-                subject=notification_record["subject"],
-                body=notification_record["body"],
-                html_body=notification_record.get("html_body"),
-                intervention_id=notification_record.get("intervention_id"),
-                intervention_type=DBInterventionType(notification_record["intervention_type"]) if notification_record.get("intervention_type") else None,
-                sent_at=notification_record.get("sent_at"),
-                failed_at=notification_record.get("failed_at"),
-                failure_reason=notification_record.get("failure_reason"),
-                retry_count=notification_record.get("retry_count", 0)
-            )
+            notification = _notification_model(notification_record)
 
             # Add to session and commit
             self.db_session.add(notification)
@@ -9,7 +9,7 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, asdict
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database.models import (
@@ -56,6 +56,14 @@ class PerformanceMetrics:
         return data
 
 
+def _group_by_tutor(rows: List[Any]) -> Dict[str, List[Any]]:
+    """Group rows by their tutor_id attribute."""
+    grouped: Dict[str, List[Any]] = {}
+    for row in rows:
+        grouped.setdefault(row.tutor_id, []).append(row)
+    return grouped
+
+
 class PerformanceCalculator:
     """
     Calculates tutor performance metrics.
@@ -115,52 +123,128 @@ class PerformanceCalculator:
             feedback = await self._get_feedback(tutor_id, window_start, reference_date)
             events = await self._get_tutor_events(tutor_id, window_start, reference_date)
 
-            # Calculate individual metrics
-            sessions_completed = self._calculate_sessions_completed(sessions)
-            avg_rating = self._calculate_avg_rating(feedback)
-            first_session_success_rate = self._calculate_first_session_success_rate(
-                sessions, feedback
-            )
-            reschedule_rate, reschedule_count = self._calculate_reschedule_rate(sessions)
-            no_show_count = self._calculate_no_show_count(sessions)
-            engagement_score = self._calculate_engagement_score(sessions, events)
-            learning_objectives_met_pct = self._calculate_learning_objectives_met(sessions)
-            response_time_avg = self._calculate_response_time(events)
-
-            # Assign performance tier
-            performance_tier = self._assign_performance_tier(
-                avg_rating=avg_rating,
-                first_session_success_rate=first_session_success_rate,
-                reschedule_rate=reschedule_rate,
-                no_show_count=no_show_count,
-                engagement_score=engagement_score,
-                learning_objectives_met_pct=learning_objectives_met_pct,
+            metrics = self._build_metrics(
+                tutor_id, window, reference_date, sessions, feedback, events
             )
-
             self.stats["calculations_successful"] += 1
-
-            return PerformanceMetrics(
-                tutor_id=tutor_id,
-                calculation_date=reference_date,
-                window=window,
-                sessions_completed=sessions_completed,
-                avg_rating=avg_rating,
-                first_session_success_rate=first_session_success_rate,
-                reschedule_rate=reschedule_rate,
-                no_show_count=no_show_count,
-                engagement_score=engagement_score,
-                learning_objectives_met_pct=learning_objectives_met_pct,
-                response_time_avg_minutes=response_time_avg,
-                performance_tier=performance_tier,
-                total_sessions_scheduled=len(sessions),
-                first_sessions_count=len([s for s in sessions if s.session_number == 1]),
-                reschedule_count=reschedule_count,
-            )
+            return metrics
 
         except Exception as e:
             self.stats["calculations_failed"] += 1
             raise Exception(f"Failed to calculate metrics for tutor {tutor_id}: {str(e)}")
 
+    async def calculate_metrics_for_tutors(
+        self,
+        tutor_ids: List[str],
+        windows: List[MetricWindow],
+        reference_date: Optional[datetime] = None,
+    ) -> List[PerformanceMetrics]:
+        """
+        Calculate metrics for many tutors and windows in one pass.
+
+        Sessions, feedback and events for the widest window are loaded with
+        one query per table for all tutors, then split per tutor and window in
+        memory. Metric formulas are the same as calculate_metrics.
+
+        Args:
+            tutor_ids: IDs of tutors to evaluate
+            windows: Time windows to calculate for each tutor
+            reference_date: Date to calculate from (defaults to now)
+
+        Returns:
+            PerformanceMetrics for every (tutor, window), tutor-major
+        """
+        if not tutor_ids or not windows:
+            return []
+
+        if reference_date is None:
+            reference_date = datetime.utcnow()
+
+        window_starts = {
+            window: reference_date - timedelta(days=self._get_window_days(window))
+            for window in windows
+        }
+        earliest = min(window_starts.values())
+
+        sessions = await self._get_sessions_for_tutors(tutor_ids, earliest, reference_date)
+        feedback = await self._get_feedback_for_tutors(tutor_ids, earliest, reference_date)
+        events = await self._get_tutor_events_for_tutors(tutor_ids, earliest, reference_date)
+
+        sessions_by_tutor = _group_by_tutor(sessions)
+        feedback_by_tutor = _group_by_tutor(feedback)
+        events_by_tutor = _group_by_tutor(events)
+
+        results = []
+        for tutor_id in tutor_ids:
+            tutor_sessions = sessions_by_tutor.get(tutor_id, [])
+            tutor_feedback = feedback_by_tutor.get(tutor_id, [])
+            tutor_events = events_by_tutor.get(tutor_id, [])
+
+            for window in windows:
+                start = window_starts[window]
+                self.stats["calculations_performed"] += 1
+                results.append(self._build_metrics(
+                    tutor_id,
+                    window,
+                    reference_date,
+                    [s for s in tutor_sessions if s.scheduled_start >= start],
+                    [f for f in tutor_feedback if f.scheduled_start >= start],
+                    [e for e in tutor_events if e.event_timestamp >= start],
+                ))
+                self.stats["calculations_successful"] += 1
+
+        return results
+
+    def _build_metrics(
+        self,
+        tutor_id: str,
+        window: MetricWindow,
+        reference_date: datetime,
+        sessions: List[Session],
+        feedback: List[StudentFeedback],
+        events: List[TutorEvent],
+    ) -> PerformanceMetrics:
+        """Calculate all metrics from a tutor's rows for one window."""
+        # Calculate individual metrics
+        sessions_completed = self._calculate_sessions_completed(sessions)
+        avg_rating = self._calculate_avg_rating(feedback)
+        first_session_success_rate = self._calculate_first_session_success_rate(
+            sessions, feedback
+        )
+        reschedule_rate, reschedule_count = self._calculate_reschedule_rate(sessions)
+        no_show_count = self._calculate_no_show_count(sessions)
+        engagement_score = self._calculate_engagement_score(sessions, events)
+        learning_objectives_met_pct = self._calculate_learning_objectives_met(sessions)
+        response_time_avg = self._calculate_response_time(events)
+
+        # Assign performance tier
+        performance_tier = self._assign_performance_tier(
+            avg_rating=avg_rating,
+            first_session_success_rate=first_session_success_rate,
+            reschedule_rate=reschedule_rate,
+            no_show_count=no_show_count,
+            engagement_score=engagement_score,
+            learning_objectives_met_pct=learning_objectives_met_pct,
+        )
+
+        return PerformanceMetrics(
+            tutor_id=tutor_id,
+            calculation_date=reference_date,
+            window=window,
+            sessions_completed=sessions_completed,
+            avg_rating=avg_rating,
+            first_session_success_rate=first_session_success_rate,
+            reschedule_rate=reschedule_rate,
+            no_show_count=no_show_count,
+            engagement_score=engagement_score,
+            learning_objectives_met_pct=learning_objectives_met_pct,
+            response_time_avg_minutes=response_time_avg,
+            performance_tier=performance_tier,
+            total_sessions_scheduled=len(sessions),
+            first_sessions_count=len([s for s in sessions if s.session_number == 1]),
+            reschedule_count=reschedule_count,
+        )
+
     async def save_metrics(self, metrics: PerformanceMetrics) -> str:
         """
         Persist calculated metrics to database.
@@ -194,6 +278,42 @@ class PerformanceCalculator:
 
         return metric_id
 
+    async def save_metrics_bulk(self, metrics_list: List[PerformanceMetrics]) -> List[str]:
+        """
+        Persist many calculated metrics with a single multi-row INSERT.
+
+        Args:
+            metrics_list: Calculated performance metrics
+
+        Returns:
+            metric_ids of saved records, in order
+        """
+        if not metrics_list:
+            return []
+
+        rows = [
+            {
+                "metric_id": f"metric_{uuid.uuid4().hex[:12]}",
+                "tutor_id": metrics.tutor_id,
+                "calculation_date": metrics.calculation_date,
+                "window": metrics.window,
+                "sessions_completed": metrics.sessions_completed,
+                "avg_rating": metrics.avg_rating,
+                "first_session_success_rate": metrics.first_session_success_rate,
+                "reschedule_rate": metrics.reschedule_rate,
+                "no_show_count": metrics.no_show_count,
+                "engagement_score": metrics.engagement_score,
+                "learning_objectives_met_pct": metrics.learning_objectives_met_pct,
+                "response_time_avg_minutes": metrics.response_time_avg_minutes,
+                "performance_tier": metrics.performance_tier,
+            }
+            for metrics in metrics_list
+        ]
+
+        await self.db.execute(insert(TutorPerformanceMetric), rows)
+
+        return [row["metric_id"] for row in rows]
+
     # ==================== Data Retrieval Methods ====================
 
     async def _get_sessions(
@@ -242,6 +362,73 @@ class PerformanceCalculator:
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def _get_sessions_for_tutors(
+        self, tutor_ids: List[str], start_date: datetime, end_date: datetime
+    ) -> List[Any]:
+        """Get the metric columns of all sessions for these tutors in window."""
+        query = select(
+            Session.tutor_id,
+            Session.session_id,
+            Session.session_number,
+            Session.scheduled_start,
+            Session.actual_start,
+            Session.no_show,
+            Session.tutor_initiated_reschedule,
+            Session.late_start_minutes,
+            Session.engagement_score,
+            Session.learning_objectives_met,
+        ).where(
+            and_(
+                Session.tutor_id.in_(tutor_ids),
+                Session.scheduled_start >= start_date,
+                Session.scheduled_start < end_date,
+            )
+        )
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    async def _get_feedback_for_tutors(
+        self, tutor_ids: List[str], start_date: datetime, end_date: datetime
+    ) -> List[Any]:
+        """Get ratings for these tutors' sessions in window, with the session start."""
+        query = (
+            select(
+                StudentFeedback.tutor_id,
+                StudentFeedback.session_id,
+                StudentFeedback.overall_rating,
+                Session.scheduled_start,
+            )
+            .join(Session, StudentFeedback.session_id == Session.session_id)
+            .where(
+                and_(
+                    StudentFeedback.tutor_id.in_(tutor_ids),
+                    Session.scheduled_start >= start_date,
+                    Session.scheduled_start < end_date,
+                )
+            )
+        )
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    async def _get_tutor_events_for_tutors(
+        self, tutor_ids: List[str], start_date: datetime, end_date: datetime
+    ) -> List[Any]:
+        """Get the metric columns of all events for these tutors in window."""
+        query = select(
+            TutorEvent.tutor_id,
+            TutorEvent.event_type,
+            TutorEvent.event_timestamp,
+            TutorEvent.event_metadata,
+        ).where(
+            and_(
+                TutorEvent.tutor_id.in_(tutor_ids),
+                TutorEvent.event_timestamp >= start_date,
+                TutorEvent.event_timestamp < end_date,
+            )
+        )
+        result = await self.db.execute(query)
+        return list(result.all())
+
     # ==================== Metric Calculation Methods ====================
 
     def _calculate_sessions_completed(self, sessions: List[Session]) -> int:
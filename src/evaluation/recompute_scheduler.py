@@ -0,0 +1,256 @@
+"""
+Distributed debounce scheduler for tutor metric recomputes.
+
+Session events mark a tutor as needing a metrics recompute. The pending set
+lives in Redis rather than in worker memory, so it survives restarts and any
+number of MetricsUpdateWorker replicas can share it:
+
+- tutormax:metrics:recompute:due        ZSET tutor_id -> due time
+- tutormax:metrics:recompute:first_seen HASH tutor_id -> oldest unprocessed event
+- tutormax:metrics:recompute:leases     ZSET tutor_id -> lease expiry
+- tutormax:metrics:recompute:claimed    HASH tutor_id -> "<worker token>|<first_seen>"
+
+Each event pushes the tutor's due time to now + debounce window (capped at
+first_seen + max delay so a busy tutor is not postponed forever). Workers
+claim due tutors in batches; a claim moves them to the lease set atomically.
+Completing a batch drops the leases. If a worker dies mid-batch its leases
+expire and the next claim puts those tutors back on the due set.
+
+All transitions are Lua scripts, so concurrent workers never claim the same
+due entry twice. Times come from the calling worker's clock.
+"""
+
+import logging
+import time
+import uuid
+from typing import Iterable, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from ..queue.client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# Prometheus Metrics
+# ============================================================================
+
+metrics_recompute_freshness_seconds = Histogram(
+    "metrics_recompute_freshness_seconds",
+    "Time from the first session event for a tutor to its metrics being saved",
+    buckets=[1, 5, 10, 30, 45, 60, 90, 120, 300, 600],
+)
+
+metrics_recompute_tutors_total = Counter(
+    "metrics_recompute_tutors_total",
+    "Tutor metric recomputes",
+    ["outcome"],  # success, failed
+)
+
+metrics_recompute_batch_seconds = Histogram(
+    "metrics_recompute_batch_seconds",
+    "Duration of one batched metrics recompute",
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+)
+
+metrics_recompute_pending = Gauge(
+    "metrics_recompute_pending",
+    "Tutors waiting for a metrics recompute",
+)
+
+
+# ============================================================================
+# Lua Scripts
+# ============================================================================
+
+# KEYS: due, first_seen
+# ARGV: now, debounce_seconds, max_delay_seconds, tutor_id...
+_SCHEDULE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local max_delay = tonumber(ARGV[3])
+for i = 4, #ARGV do
+    local id = ARGV[i]
+    redis.call('HSETNX', KEYS[2], id, ARGV[1])
+    local first = tonumber(redis.call('HGET', KEYS[2], id))
+    redis.call('ZADD', KEYS[1], math.min(now + window, first + max_delay), id)
+end
+return #ARGV - 3
+"""
+
+# KEYS: due, first_seen, leases, claimed
+# ARGV: now, max_due, lease_seconds, count, token
+# Returns a flat list: tutor_id, first_seen, tutor_id, first_seen, ...
+_CLAIM_SCRIPT = """
+local now = tonumber(ARGV[1])
+
+-- Put tutors whose lease expired back on the due set, keeping the oldest first_seen
+local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now)
+for _, id in ipairs(expired) do
+    redis.call('ZREM', KEYS[3], id)
+    local claim = redis.call('HGET', KEYS[4], id)
+    redis.call('HDEL', KEYS[4], id)
+    if claim then
+        local first = string.sub(claim, string.find(claim, '|', 1, true) + 1)
+        local current = redis.call('HGET', KEYS[2], id)
+        if (not current) or tonumber(first) < tonumber(current) then
+            redis.call('HSET', KEYS[2], id, first)
+        end
+    end
+    local due = redis.call('ZSCORE', KEYS[1], id)
+    if (not due) or tonumber(due) > now then
+        redis.call('ZADD', KEYS[1], now, id)
+    end
+end
+
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[2], 'LIMIT', 0, tonumber(ARGV[4]))
+local result = {}
+for _, id in ipairs(ids) do
+    local first = redis.call('HGET', KEYS[2], id) or ARGV[1]
+    redis.call('ZREM', KEYS[1], id)
+    redis.call('HDEL', KEYS[2], id)
+    redis.call('ZADD', KEYS[3], now + tonumber(ARGV[3]), id)
+    redis.call('HSET', KEYS[4], id, ARGV[5] .. '|' .. first)
+    table.insert(result, id)
+    table.insert(result, first)
+end
+return result
+"""
+
+# KEYS: leases, claimed
+# ARGV: token, tutor_id...
+# Only releases leases still held by this worker
+_COMPLETE_SCRIPT = """
+local prefix = ARGV[1] .. '|'
+local done = 0
+for i = 2, #ARGV do
+    local claim = redis.call('HGET', KEYS[2], ARGV[i])
+    if claim and string.sub(claim, 1, #prefix) == prefix then
+        redis.call('HDEL', KEYS[2], ARGV[i])
+        redis.call('ZREM', KEYS[1], ARGV[i])
+        done = done + 1
+    end
+end
+return done
+"""
+
+
+class RecomputeScheduler:
+    """
+    Redis sorted-set scheduler for debounced tutor metric recomputes.
+
+    Each instance has its own lease token; use one per worker process.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        key_prefix: str = "tutormax:metrics:recompute",
+        debounce_seconds: float = 30,
+        max_delay_seconds: Optional[float] = None,
+        lease_seconds: float = 300,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            redis_client: Redis client instance
+            key_prefix: Prefix for the scheduler's Redis keys
+            debounce_seconds: Quiet period after the last event before a recompute
+            max_delay_seconds: Upper bound from the first event to the due time
+                (defaults to 4x the debounce window)
+            lease_seconds: How long a claimed batch is reserved for its worker
+        """
+        self.redis_client = redis_client
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = (
+            max_delay_seconds if max_delay_seconds is not None else debounce_seconds * 4
+        )
+        self.lease_seconds = lease_seconds
+        self.token = uuid.uuid4().hex
+
+        self.due_key = f"{key_prefix}:due"
+        self.first_seen_key = f"{key_prefix}:first_seen"
+        self.leases_key = f"{key_prefix}:leases"
+        self.claimed_key = f"{key_prefix}:claimed"
+
+        self._scripts = None
+
+    def _script(self, name: str):
+        # Registered lazily: the client may not be connected at construction
+        if self._scripts is None:
+            client = self.redis_client.get_client()
+            self._scripts = {
+                "schedule": client.register_script(_SCHEDULE_SCRIPT),
+                "claim": client.register_script(_CLAIM_SCRIPT),
+                "complete": client.register_script(_COMPLETE_SCRIPT),
+            }
+        return self._scripts[name]
+
+    def schedule(self, tutor_ids: Iterable[str], now: Optional[float] = None) -> int:
+        """
+        Mark tutors as needing a recompute.
+
+        Args:
+            tutor_ids: Tutors with new session events
+            now: Event time as a Unix timestamp (defaults to now)
+
+        Returns:
+            Number of tutors scheduled
+        """
+        tutor_ids = list(dict.fromkeys(tutor_ids))
+        if not tutor_ids:
+            return 0
+
+        return self._script("schedule")(
+            keys=[self.due_key, self.first_seen_key],
+            args=[now if now is not None else time.time(), self.debounce_seconds, self.max_delay_seconds, *tutor_ids],
+        )
+
+    def claim(
+        self,
+        count: int,
+        force: bool = False,
+        now: Optional[float] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Claim up to count due tutors and lease them to this worker.
+
+        Args:
+            count: Maximum tutors to claim
+            force: Claim pending tutors even if their debounce window is still open
+            now: Current Unix timestamp (defaults to now)
+
+        Returns:
+            List of (tutor_id, first_seen timestamp)
+        """
+        now = now if now is not None else time.time()
+        flat = self._script("claim")(
+            keys=[self.due_key, self.first_seen_key, self.leases_key, self.claimed_key],
+            args=[now, "+inf" if force else now, self.lease_seconds, count, self.token],
+        )
+        return [(flat[i], float(flat[i + 1])) for i in range(0, len(flat), 2)]
+
+    def complete(self, tutor_ids: Iterable[str]) -> int:
+        """
+        Release this worker's leases after a successful recompute.
+
+        Tutors that are not completed (e.g. their recompute failed) are
+        retried once their lease expires.
+
+        Returns:
+            Number of leases released
+        """
+        tutor_ids = list(tutor_ids)
+        if not tutor_ids:
+            return 0
+
+        return self._script("complete")(
+            keys=[self.leases_key, self.claimed_key],
+            args=[self.token, *tutor_ids],
+        )
+
+    def pending_count(self) -> int:
+        """Number of tutors waiting for a recompute (due or not yet due)."""
+        return self.redis_client.get_client().zcard(self.due_key)
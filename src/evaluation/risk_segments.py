@@ -0,0 +1,269 @@
+"""
+Risk Segments - Incrementally maintained churn risk aggregates.
+
+Each active tutor's latest churn prediction is tracked in tutor_risk_segments.
+When a prediction is saved, apply_prediction replaces the tutor's entry and
+moves its contribution between the per risk level summaries (tutor count and
+churn score sum) and factor counts in the same transaction. The analytics risk
+segment endpoints then read a handful of summary rows instead of loading every
+prediction and its contributing factors.
+
+Tutor status changes and deletions do not go through save_prediction, so
+rebuild_risk_segments recomputes all three tables from churn_predictions; it
+backs the daily reconciliation task.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.database.models import (
+    ChurnPrediction,
+    RiskLevel,
+    RiskSegmentFactor,
+    RiskSegmentSummary,
+    Tutor,
+    TutorRiskSegment,
+    TutorStatus,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Factors reported per segment
+TOP_FACTORS = 5
+
+# Longest factor name stored (risk_segment_factors.factor)
+MAX_FACTOR_LENGTH = 255
+
+# (risk level, churn score, factor names) of one tutor's counted prediction
+SegmentEntry = Tuple[RiskLevel, int, Sequence[str]]
+
+
+def prediction_factors(contributing_factors: Optional[Any]) -> List[str]:
+    """
+    Factor names counted for a prediction (the keys of contributing_factors).
+
+    Args:
+        contributing_factors: Prediction's contributing_factors JSON
+
+    Returns:
+        Sorted, de-duplicated factor names
+    """
+    if not isinstance(contributing_factors, dict):
+        return []
+    return sorted({str(name)[:MAX_FACTOR_LENGTH] for name in contributing_factors})
+
+
+def segment_deltas(
+    old: Optional[SegmentEntry],
+    new: Optional[SegmentEntry],
+) -> Tuple[Dict[RiskLevel, Tuple[int, int]], Dict[Tuple[RiskLevel, str], int]]:
+    """
+    Summary changes for replacing a tutor's counted prediction.
+
+    Args:
+        old: Previously counted entry, None if the tutor was not counted
+        new: Entry to count now, None if the tutor should not be counted
+
+    Returns:
+        Tuple of ({risk_level: (count delta, score sum delta)},
+        {(risk_level, factor): count delta}), without zero deltas
+    """
+    summary = defaultdict(lambda: [0, 0])
+    factors = defaultdict(int)
+
+    for entry, sign in ((old, -1), (new, 1)):
+        if entry is None:
+            continue
+        risk_level, churn_score, names = entry
+        summary[risk_level][0] += sign
+        summary[risk_level][1] += sign * churn_score
+        for name in names:
+            factors[(risk_level, name)] += sign
+
+    return (
+        {level: (count, score) for level, (count, score) in summary.items() if count or score},
+        {key: count for key, count in factors.items() if count},
+    )
+
+
+def summary_upsert(deltas: Dict[RiskLevel, Tuple[int, int]]):
+    """
+    Upsert adding deltas to risk_segment_summaries.
+
+    Rows are sorted so concurrent writers lock them in the same order.
+    """
+    rows = [
+        {"risk_level": level, "tutor_count": count, "churn_score_sum": score}
+        for level, (count, score) in sorted(deltas.items(), key=lambda item: item[0].name)
+    ]
+    stmt = pg_insert(RiskSegmentSummary).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[RiskSegmentSummary.risk_level],
+        set_={
+            "tutor_count": RiskSegmentSummary.tutor_count + stmt.excluded.tutor_count,
+            "churn_score_sum": RiskSegmentSummary.churn_score_sum + stmt.excluded.churn_score_sum,
+        },
+    )
+
+
+def factor_upsert(deltas: Dict[Tuple[RiskLevel, str], int]):
+    """
+    Upsert adding deltas to risk_segment_factors.
+
+    Rows are sorted so concurrent writers lock them in the same order.
+    """
+    rows = [
+        {"risk_level": level, "factor": factor, "tutor_count": count}
+        for (level, factor), count in sorted(deltas.items(), key=lambda item: (item[0][0].name, item[0][1]))
+    ]
+    stmt = pg_insert(RiskSegmentFactor).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[RiskSegmentFactor.risk_level, RiskSegmentFactor.factor],
+        set_={"tutor_count": RiskSegmentFactor.tutor_count + stmt.excluded.tutor_count},
+    )
+
+
+def apply_prediction(db: Session, prediction: ChurnPrediction) -> None:
+    """
+    Count a newly saved prediction in the risk segment summaries.
+
+    Must run in the transaction that inserts the prediction. The tutor row is
+    locked (FOR NO KEY UPDATE, so session and feedback inserts are not
+    blocked), which serializes concurrent predictions for the same tutor.
+
+    Args:
+        db: Synchronous session
+        prediction: Prediction being saved
+    """
+    status = db.execute(
+        select(Tutor.status)
+        .where(Tutor.tutor_id == prediction.tutor_id)
+        .with_for_update(key_share=True)
+    ).scalar_one_or_none()
+
+    # FOR UPDATE also waits out a running rebuild (which locks the table)
+    current = db.get(TutorRiskSegment, prediction.tutor_id, with_for_update=True)
+    old = (current.risk_level, current.churn_score, current.factors or []) if current else None
+
+    new = None
+    if status == TutorStatus.ACTIVE:
+        new = (prediction.risk_level, prediction.churn_score, prediction_factors(prediction.contributing_factors))
+        if current is None:
+            current = TutorRiskSegment(tutor_id=prediction.tutor_id)
+            db.add(current)
+        current.prediction_id = prediction.prediction_id
+        current.risk_level, current.churn_score, current.factors = new
+        current.updated_at = prediction.prediction_date
+    elif current is not None:
+        db.delete(current)
+
+    summary, factors = segment_deltas(old, new)
+    if summary:
+        db.execute(summary_upsert(summary))
+    if factors:
+        db.execute(factor_upsert(factors))
+
+
+# Full recompute, used by the daily reconciliation (and mirrored by the
+# migration backfill). Statuses and risk levels are stored by enum name.
+REBUILD_STATEMENTS = (
+    # Blocks incremental writers, which lock their tutor_risk_segments row first
+    "LOCK TABLE tutor_risk_segments IN EXCLUSIVE MODE",
+    "DELETE FROM tutor_risk_segments",
+    f"""
+    INSERT INTO tutor_risk_segments (tutor_id, prediction_id, risk_level, churn_score, factors, updated_at)
+    SELECT DISTINCT ON (p.tutor_id)
+        p.tutor_id, p.prediction_id, p.risk_level, p.churn_score,
+        CASE WHEN jsonb_typeof(p.contributing_factors) = 'object'
+            THEN ARRAY(
+                SELECT DISTINCT left(k, {MAX_FACTOR_LENGTH})
+                FROM jsonb_object_keys(p.contributing_factors) AS k
+                ORDER BY 1
+            )
+            ELSE '{{}}'::varchar[]
+        END,
+        p.prediction_date
+    FROM churn_predictions p
+    JOIN tutors t ON t.tutor_id = p.tutor_id
+    WHERE t.status = 'ACTIVE'
+    ORDER BY p.tutor_id, p.prediction_date DESC
+    """,
+    "DELETE FROM risk_segment_summaries",
+    """
+    INSERT INTO risk_segment_summaries (risk_level, tutor_count, churn_score_sum)
+    SELECT risk_level, COUNT(*), SUM(churn_score)
+    FROM tutor_risk_segments
+    GROUP BY risk_level
+    """,
+    "DELETE FROM risk_segment_factors",
+    """
+    INSERT INTO risk_segment_factors (risk_level, factor, tutor_count)
+    SELECT s.risk_level, f.factor, COUNT(*)
+    FROM tutor_risk_segments s, unnest(s.factors) AS f(factor)
+    GROUP BY s.risk_level, f.factor
+    """,
+)
+
+
+def rebuild_risk_segments(db: Session) -> int:
+    """
+    Recompute the risk segment tables from churn_predictions.
+
+    Runs in the caller's transaction; the caller commits.
+
+    Args:
+        db: Synchronous session
+
+    Returns:
+        Number of tutors counted
+    """
+    for statement in REBUILD_STATEMENTS:
+        db.execute(text(statement))
+    return db.execute(select(func.count()).select_from(TutorRiskSegment)).scalar() or 0
+
+
+async def load_risk_segments(db: AsyncSession, top_factors: int = TOP_FACTORS) -> List[Dict[str, Any]]:
+    """
+    Read the risk segment summaries.
+
+    Args:
+        db: Async session
+        top_factors: Most common factors returned per segment
+
+    Returns:
+        One dict per non-empty risk level (in RiskLevel order) with
+        risk_level, tutor_count, avg_churn_score and common_factors
+    """
+    summaries = (await db.execute(
+        select(RiskSegmentSummary).where(RiskSegmentSummary.tutor_count > 0)
+    )).scalars().all()
+
+    factor_rows = (await db.execute(
+        select(RiskSegmentFactor.risk_level, RiskSegmentFactor.factor, RiskSegmentFactor.tutor_count)
+        .where(RiskSegmentFactor.tutor_count > 0)
+        .order_by(RiskSegmentFactor.tutor_count.desc(), RiskSegmentFactor.factor)
+    )).all()
+
+    factors = defaultdict(list)
+    for risk_level, factor, count in factor_rows:
+        if len(factors[risk_level]) < top_factors:
+            factors[risk_level].append({"factor": factor, "frequency": count})
+
+    order = list(RiskLevel)
+    return [
+        {
+            "risk_level": summary.risk_level.value,
+            "tutor_count": summary.tutor_count,
+            "avg_churn_score": round(summary.churn_score_sum / summary.tutor_count, 1),
+            "common_factors": factors[summary.risk_level],
+        }
+        for summary in sorted(summaries, key=lambda s: order.index(s.risk_level))
+    ]
@@ -1,22 +1,24 @@
 """
 Validation worker for processing messages from Redis queues.
 
-Consumes messages from Redis, validates data, and publishes to
-enrichment queues or dead letter queue based on validation results.
+Consumes messages from Redis Streams through the shared async transport,
+validates data, and publishes to enrichment queues or dead letter queue
+based on validation results.
 """
 
+import asyncio
 import logging
-import time
 import signal
+import socket
 import sys
+import time
+from collections import defaultdict
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
-from ...queue.client import RedisClient
-from ...queue.consumer import MessageConsumer
-from ...queue.publisher import MessagePublisher
 from ...queue.channels import QueueChannels
 from ...queue.config import redis_config
+from ...queue.stream_transport import StreamEntry, StreamTransport
 from .validation_engine import ValidationEngine
 
 # Configure logging
@@ -32,11 +34,17 @@ class ValidationWorker:
     Worker that validates messages from Redis queues.
 
     Processes messages in batches:
-    1. Consume from Redis queue
+    1. Consume from Redis streams (one XREADGROUP across all channels)
     2. Validate data
     3. Publish valid data to enrichment queue
     4. Send invalid data to dead letter queue
     5. Acknowledge processed messages
+
+    Steps 3-4 are one pipelined write per batch and step 5 one XACK per
+    channel, issued after the writes succeed (at-least-once delivery).
+    Before reading new messages the worker periodically claims entries
+    that any consumer left pending for claim_min_idle_ms (XAUTOCLAIM), so
+    a batch interrupted by a crash or deploy is retried.
     """
 
     # Queue mappings
@@ -57,31 +65,42 @@ class ValidationWorker:
 
     def __init__(
         self,
-        redis_client: Optional[RedisClient] = None,
-        consumer_group: str = "validation-workers",
+        transport: Optional[StreamTransport] = None,
+        consumer_group: str = redis_config.validation_consumer_group,
+        consumer_name: Optional[str] = None,
         batch_size: int = 10,
-        poll_interval_ms: int = 1000
+        poll_interval_ms: int = 1000,
+        claim_min_idle_ms: int = redis_config.validation_claim_min_idle_ms,
+        claim_interval_ms: int = redis_config.validation_claim_interval_ms,
     ):
         """
         Initialize validation worker.
 
         Args:
-            redis_client: Redis client instance (creates new if None)
+            transport: Stream transport (creates one from config if None)
             consumer_group: Consumer group name
+            consumer_name: Consumer name within the group; must be stable
+                across restarts (defaults to config, then "validator-<hostname>")
             batch_size: Number of messages to process per batch
-            poll_interval_ms: Polling interval in milliseconds
+            poll_interval_ms: Longest time to block waiting for messages
+            claim_min_idle_ms: Idle time after which another consumer's
+                pending messages are claimed
+            claim_interval_ms: Minimum time between claim passes
         """
-        self.redis_client = redis_client or RedisClient()
+        self.transport = transport or StreamTransport.from_url()
         self.consumer_group = consumer_group
+        self.consumer_name = (
+            consumer_name
+            or redis_config.validation_consumer_name
+            or f"validator-{socket.gethostname()}"
+        )
         self.batch_size = batch_size
         self.poll_interval_ms = poll_interval_ms
+        self.claim_min_idle_ms = claim_min_idle_ms
+        self.claim_interval_ms = claim_interval_ms
+        self._next_claim = 0.0
 
         # Initialize components
-        self.consumer = MessageConsumer(
-            self.redis_client,
-            consumer_group=consumer_group
-        )
-        self.publisher = MessagePublisher(self.redis_client)
         self.validation_engine = ValidationEngine()
 
         # Worker state
@@ -105,7 +124,16 @@ class ValidationWorker:
 
     def start(self, channels: Optional[List[str]] = None):
         """
-        Start the validation worker.
+        Start the validation worker (blocks until stopped).
+
+        Args:
+            channels: List of channels to process (processes all if None)
+        """
+        asyncio.run(self.run(channels))
+
+    async def run(self, channels: Optional[List[str]] = None):
+        """
+        Run the validation loop until stopped.
 
         Args:
             channels: List of channels to process (processes all if None)
@@ -119,6 +147,7 @@ class ValidationWorker:
 
         logger.info(f"Starting validation worker")
         logger.info(f"Consumer group: {self.consumer_group}")
+        logger.info(f"Consumer name: {self.consumer_name}")
         logger.info(f"Channels: {channels}")
         logger.info(f"Batch size: {self.batch_size}")
         logger.info(f"Poll interval: {self.poll_interval_ms}ms")
@@ -129,26 +158,17 @@ class ValidationWorker:
         # Create consumer groups for all channels
         for channel in channels:
             try:
-                self.consumer.create_consumer_group(channel, start_id="0")
+                await self.transport.ensure_group(channel, self.consumer_group, start_id="0")
             except Exception as e:
                 logger.error(f"Failed to create consumer group for {channel}: {e}")
 
-        # Main processing loop
+        # Main processing loop; blocking reads replace idle sleeps
         try:
             while self.running:
-                processed_any = False
-
-                for channel in channels:
-                    processed = self._process_channel(channel)
-                    if processed > 0:
-                        processed_any = True
-
-                # Sleep if no messages were processed
-                if not processed_any:
-                    time.sleep(self.poll_interval_ms / 1000.0)
+                processed = await self._process_batch(channels, block_ms=self.poll_interval_ms)
 
                 # Log stats periodically
-                if self.stats["batches_processed"] % 10 == 0:
+                if processed and self.stats["batches_processed"] % 10 == 0:
                     self._log_stats()
 
         except Exception as e:
@@ -156,49 +176,107 @@ class ValidationWorker:
 
         finally:
             self._shutdown()
+            await self.transport.close()
 
-    def _process_channel(self, channel: str) -> int:
+    async def _process_channel(self, channel: str) -> int:
         """
-        Process messages from a single channel.
+        Process one batch from a single channel without blocking.
 
         Args:
             channel: Channel name
 
+        Returns:
+            Number of messages processed
+        """
+        return await self._process_batch([channel])
+
+    async def _process_batch(self, channels: List[str], block_ms: Optional[int] = None) -> int:
+        """
+        Read, validate, forward and acknowledge one batch.
+
+        Args:
+            channels: Channels to read from
+            block_ms: Block for up to this many milliseconds (None = don't block)
+
         Returns:
             Number of messages processed
         """
         try:
-            # Consume messages
-            messages = self.consumer.consume(
-                channel,
-                count=self.batch_size,
-                block_ms=None  # Non-blocking
-            )
+            messages = await self._claim_stale(channels)
+            if not messages:
+                messages = await self.transport.read(
+                    channels,
+                    self.consumer_group,
+                    self.consumer_name,
+                    count=self.batch_size,
+                    block_ms=block_ms
+                )
 
             if not messages:
                 return 0
 
-            logger.info(f"Processing {len(messages)} messages from {channel}")
+            logger.info(f"Processing {len(messages)} messages from {channels}")
+
+            outgoing: List[StreamEntry] = []
+            acks: Dict[str, List[str]] = defaultdict(list)
 
-            # Process batch
             for message in messages:
-                self._process_message(channel, message)
+                channel = message.get("_stream")
+                entry = self._process_message(channel, message)
+                if entry is not None:
+                    outgoing.append(entry)
+                acks[channel].append(message.get("_redis_id"))
+
+            # Forward first so a failed write leaves messages pending for redelivery
+            await self.transport.publish_entries(outgoing)
+            for channel, message_ids in acks.items():
+                await self.transport.ack(channel, self.consumer_group, message_ids)
 
             self.stats["batches_processed"] += 1
 
             return len(messages)
 
         except Exception as e:
-            logger.error(f"Error processing channel {channel}: {e}", exc_info=True)
+            logger.error(f"Error processing channels {channels}: {e}", exc_info=True)
             return 0
 
-    def _process_message(self, channel: str, message: Dict[str, Any]) -> None:
+    async def _claim_stale(self, channels: List[str]) -> List[Dict[str, Any]]:
+        """
+        Claim messages left pending by a consumer that stopped mid-batch.
+
+        Runs at most once per claim_interval_ms, but keeps claiming on every
+        batch while stale messages remain.
+
+        Args:
+            channels: Channels to claim from
+
+        Returns:
+            Claimed messages (empty if none are stale or no pass is due)
+        """
+        if time.monotonic() < self._next_claim:
+            return []
+
+        messages = await self.transport.claim(
+            channels,
+            self.consumer_group,
+            self.consumer_name,
+            min_idle_ms=self.claim_min_idle_ms,
+            count=self.batch_size,
+        )
+        if not messages:
+            self._next_claim = time.monotonic() + self.claim_interval_ms / 1000
+        return messages
+
+    def _process_message(self, channel: str, message: Dict[str, Any]) -> Optional[StreamEntry]:
         """
-        Process a single message.
+        Validate a single message and decide where it goes next.
 
         Args:
             channel: Source channel
             message: Message data
+
+        Returns:
+            Stream entry to publish, or None if the message is only acknowledged
         """
         message_id = message.get("_redis_id")
         data = message.get("data", {})
@@ -207,8 +285,7 @@ class ValidationWorker:
             # Get queue mapping
             if channel not in self.QUEUE_MAPPINGS:
                 logger.error(f"Unknown channel: {channel}")
-                self.consumer.acknowledge(channel, message_id)
-                return
+                return None
 
             mapping = self.QUEUE_MAPPINGS[channel]
             data_type = mapping["data_type"]
@@ -220,61 +297,89 @@ class ValidationWorker:
             self.stats["messages_processed"] += 1
 
             if validation_result.valid:
-                # Publish to enrichment queue
-                self._publish_valid_data(
-                    enrichment_queue,
-                    data,
-                    message.get("metadata", {}),
-                    validation_result
-                )
                 self.stats["messages_valid"] += 1
 
                 logger.debug(
                     f"Valid {data_type}: {data.get(data_type + '_id', 'unknown')}"
                 )
 
-            else:
-                # Send to dead letter queue
-                self._publish_invalid_data(
-                    channel,
+                # Forward to enrichment queue
+                return self._enrichment_entry(
+                    enrichment_queue,
                     data,
                     message.get("metadata", {}),
                     validation_result
                 )
-                self.stats["messages_invalid"] += 1
 
-                logger.warning(
-                    f"Invalid {data_type}: {validation_result.errors[0].message if validation_result.errors else 'unknown error'}"
-                )
+            self.stats["messages_invalid"] += 1
+
+            logger.warning(
+                f"Invalid {data_type}: {validation_result.errors[0].message if validation_result.errors else 'unknown error'}"
+            )
 
-            # Acknowledge message
-            self.consumer.acknowledge(channel, message_id)
+            # Send to dead letter queue
+            return self._dead_letter_entry(
+                channel,
+                data,
+                message.get("metadata", {}),
+                validation_result
+            )
 
         except Exception as e:
             logger.error(f"Error processing message {message_id}: {e}", exc_info=True)
 
-            # Try to retry or send to DLQ
-            try:
-                self.consumer.retry_message(channel, message, max_retries=3)
-                self.consumer.acknowledge(channel, message_id)
-            except Exception as retry_error:
-                logger.error(f"Failed to retry message: {retry_error}")
+            # Retry or send to DLQ
+            return self._retry_entry(channel, message, max_retries=3)
 
-    def _publish_valid_data(
+    def _retry_entry(
+        self,
+        channel: str,
+        message: Dict[str, Any],
+        max_retries: int = 3
+    ) -> StreamEntry:
+        """
+        Build the retry (or dead letter) entry for a failed message.
+
+        Args:
+            channel: Original queue channel
+            message: Message dictionary
+            max_retries: Maximum retry attempts
+
+        Returns:
+            Stream entry for the retry channel, or the dead letter queue once
+            retries are exhausted
+        """
+        metadata = dict(message.get("metadata", {}))
+        retry_count = metadata.get("retry_count", 0) + 1
+        metadata["retry_count"] = retry_count
+        metadata["original_channel"] = channel
+
+        if retry_count <= max_retries:
+            logger.info(f"Retrying message (attempt {retry_count}/{max_retries})")
+            return (QueueChannels.get_retry_channel(channel), message.get("data", {}), metadata)
+
+        metadata["reason"] = "Max retries exceeded"
+        logger.warning(f"Message sent to dead letter queue after {retry_count} attempts")
+        return (QueueChannels.DEAD_LETTER.value, message.get("data", {}), metadata)
+
+    def _enrichment_entry(
         self,
         enrichment_queue: str,
         data: Dict[str, Any],
         metadata: Dict[str, Any],
         validation_result
-    ) -> None:
+    ) -> StreamEntry:
         """
-        Publish valid data to enrichment queue.
+        Build the enrichment queue entry for valid data.
 
         Args:
             enrichment_queue: Enrichment queue name
             data: Validated data
             metadata: Message metadata
             validation_result: Validation result
+
+        Returns:
+            Stream entry for the enrichment queue
         """
         # Enrich metadata
         enriched_metadata = metadata.copy()
@@ -285,28 +390,26 @@ class ValidationWorker:
         if validation_result.metadata:
             enriched_metadata["validation_metadata"] = validation_result.metadata
 
-        # Publish to enrichment queue
-        self.publisher.publish(
-            enrichment_queue,
-            data,
-            metadata=enriched_metadata
-        )
+        return (enrichment_queue, data, enriched_metadata)
 
-    def _publish_invalid_data(
+    def _dead_letter_entry(
         self,
         source_channel: str,
         data: Dict[str, Any],
         metadata: Dict[str, Any],
         validation_result
-    ) -> None:
+    ) -> StreamEntry:
         """
-        Publish invalid data to dead letter queue.
+        Build the dead letter queue entry for invalid data.
 
         Args:
             source_channel: Source channel name
             data: Invalid data
             metadata: Message metadata
             validation_result: Validation result with errors
+
+        Returns:
+            Stream entry for the dead letter queue
         """
         # Enrich metadata with validation errors
         dlq_metadata = metadata.copy()
@@ -314,12 +417,7 @@ class ValidationWorker:
         dlq_metadata["source_channel"] = source_channel
         dlq_metadata["validation_errors"] = validation_result.to_dict()
 
-        # Publish to dead letter queue
-        self.publisher.publish(
-            QueueChannels.DEAD_LETTER,
-            data,
-            metadata=dlq_metadata
-        )
+        return (QueueChannels.DEAD_LETTER.value, data, dlq_metadata)
 
     def _log_stats(self) -> None:
         """Log current statistics."""
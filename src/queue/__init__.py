@@ -13,6 +13,7 @@ from .consumer import MessageConsumer
 from .worker import QueueWorker
 from .channels import QueueChannels
 from .serializer import MessageSerializer
+from .stream_transport import StreamTransport, TrimPolicy, Backpressure
 
 __all__ = [
     "RedisClient",
@@ -22,4 +23,7 @@ __all__ = [
     "QueueWorker",
     "QueueChannels",
     "MessageSerializer",
+    "StreamTransport",
+    "TrimPolicy",
+    "Backpressure",
 ]
@@ -37,6 +37,26 @@ class RedisConfig(BaseSettings):
     # Queue settings
     queue_maxlen: int = 100000  # Maximum queue length
 
+    # Stream trimming: "maxlen" caps entries at queue_maxlen, "minid" drops
+    # entries older than stream_retention_seconds, "none" disables trimming
+    stream_trim_strategy: str = "maxlen"
+    stream_retention_seconds: int = 86400  # 24 hours
+
+    # Ingestion backpressure (undelivered + unacknowledged entries per stream).
+    # Keep both thresholds below queue_maxlen so trimming never drops unread work.
+    validation_consumer_group: str = "validation-workers"
+    backpressure_soft_lag: int = 50000  # API answers 429 above this
+    backpressure_hard_lag: int = 90000  # API answers 503 above this
+    backpressure_check_interval_ms: int = 1000
+    backpressure_retry_after_seconds: int = 5
+
+    # Validation consumers. The consumer name must survive restarts (defaults
+    # to "validator-<hostname>"); entries a consumer left pending for
+    # claim_min_idle_ms are claimed by another worker and retried.
+    validation_consumer_name: Optional[str] = None
+    validation_claim_min_idle_ms: int = 60000
+    validation_claim_interval_ms: int = 10000
+
     class Config:
         env_prefix = "REDIS_"
         env_file = ".env"
@@ -40,19 +40,21 @@ class MessageSerializer:
         Returns:
             JSON string ready for publishing
         """
-        message = {
-            "id": str(uuid4()),
-            "timestamp": datetime.utcnow().isoformat(),
-            "channel": channel,
-            "data": data,
-            "metadata": metadata or {},
-        }
-
-        # Add checksum for data integrity
-        data_str = json.dumps(message["data"], sort_keys=True)
-        message["checksum"] = hashlib.sha256(data_str.encode()).hexdigest()
-
-        return json.dumps(message)
+        # Canonical data encoding is both the checksum input and the
+        # embedded payload, so the data is only encoded once
+        data_str = json.dumps(data, sort_keys=True)
+        checksum = hashlib.sha256(data_str.encode()).hexdigest()
+
+        return (
+            '{"id": %s, "timestamp": %s, "channel": %s, "data": %s, "metadata": %s, "checksum": %s}' % (
+                json.dumps(str(uuid4())),
+                json.dumps(datetime.utcnow().isoformat()),
+                json.dumps(channel),
+                data_str,
+                json.dumps(metadata or {}),
+                json.dumps(checksum),
+            )
+        )
 
     @staticmethod
     def deserialize(message: str) -> Dict[str, Any]:
@@ -0,0 +1,449 @@
+"""
+Async Redis Streams transport shared by the ingestion API and pipeline workers.
+
+Both sides exchange MessageSerializer envelopes stored under the "message"
+field of each stream entry, so anything published here can be read by
+MessageConsumer and vice versa.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import redis.asyncio as aioredis
+from redis.exceptions import ResponseError
+
+from .config import redis_config, get_redis_url
+from .serializer import MessageSerializer
+
+logger = logging.getLogger(__name__)
+
+# (channel, data, metadata) triple accepted by publish_entries
+StreamEntry = Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class TrimPolicy:
+    """
+    Stream trimming applied on every XADD.
+
+    Strategies:
+    - "maxlen": keep roughly the newest `maxlen` entries
+    - "minid": drop entries older than `retention_seconds`
+    - "none": never trim
+    """
+
+    strategy: str = "maxlen"
+    maxlen: int = 100000
+    retention_seconds: int = 86400
+    approximate: bool = True
+
+    @classmethod
+    def from_config(cls) -> "TrimPolicy":
+        """Build the policy from queue configuration."""
+        return cls(
+            strategy=redis_config.stream_trim_strategy,
+            maxlen=redis_config.queue_maxlen,
+            retention_seconds=redis_config.stream_retention_seconds,
+        )
+
+    def xadd_kwargs(self, now_ms: Optional[int] = None) -> Dict[str, Any]:
+        """
+        XADD keyword arguments implementing this policy.
+
+        Args:
+            now_ms: Current time in milliseconds (defaults to wall clock)
+
+        Returns:
+            Keyword arguments for redis-py's xadd
+        """
+        if self.strategy == "maxlen":
+            return {"maxlen": self.maxlen, "approximate": self.approximate}
+        if self.strategy == "minid":
+            now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+            return {"minid": now_ms - self.retention_seconds * 1000, "approximate": self.approximate}
+        if self.strategy == "none":
+            return {}
+        raise ValueError(f"Unknown stream trim strategy: {self.strategy}")
+
+
+class Backpressure(str, Enum):
+    """Producer admission state derived from consumer lag."""
+
+    OK = "ok"
+    THROTTLE = "throttle"  # Soft limit exceeded; clients should retry later
+    REJECT = "reject"  # Hard limit exceeded; consumers are not keeping up
+
+
+class StreamTransport:
+    """
+    Async Redis Streams transport with consumer groups and backpressure.
+
+    Provides:
+    - Pipelined XADD of MessageSerializer envelopes with trimming
+    - Consumer-group reads and multi-ID acknowledgements
+    - XAUTOCLAIM recovery of entries left pending by dead consumers
+    - Lag-based backpressure for producers, cached per stream
+    """
+
+    def __init__(
+        self,
+        client: aioredis.Redis,
+        trim_policy: Optional[TrimPolicy] = None,
+        soft_lag: Optional[int] = None,
+        hard_lag: Optional[int] = None,
+        check_interval_ms: Optional[int] = None,
+    ):
+        """
+        Initialize stream transport.
+
+        Args:
+            client: Async Redis client (decode_responses=True)
+            trim_policy: Trimming applied on publish (defaults to config)
+            soft_lag: Lag above which producers are throttled
+            hard_lag: Lag above which producers are rejected
+            check_interval_ms: How long a lag reading is reused
+        """
+        self.client = client
+        self.trim_policy = trim_policy or TrimPolicy.from_config()
+        self.soft_lag = soft_lag if soft_lag is not None else redis_config.backpressure_soft_lag
+        self.hard_lag = hard_lag if hard_lag is not None else redis_config.backpressure_hard_lag
+        self.check_interval_ms = (
+            check_interval_ms if check_interval_ms is not None
+            else redis_config.backpressure_check_interval_ms
+        )
+        self.serializer = MessageSerializer()
+
+        self._known_groups: Set[Tuple[str, str]] = set()
+        self._claim_cursors: Dict[Tuple[str, str], str] = {}
+        self._lag_cache: Dict[Tuple[str, str], Tuple[float, int]] = {}
+
+    @classmethod
+    def from_url(cls, url: Optional[str] = None, **kwargs) -> "StreamTransport":
+        """
+        Create a transport with its own connection pool.
+
+        Args:
+            url: Redis connection URL (defaults to queue config)
+            **kwargs: Passed to StreamTransport()
+
+        Returns:
+            StreamTransport instance (connects lazily)
+        """
+        client = aioredis.from_url(
+            url or get_redis_url(),
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=redis_config.max_connections,
+            socket_timeout=redis_config.socket_timeout,
+            socket_connect_timeout=redis_config.socket_connect_timeout,
+        )
+        return cls(client, **kwargs)
+
+    async def close(self) -> None:
+        """Close the underlying Redis client."""
+        await self.client.close()
+
+    # ==================== Publishing ====================
+
+    async def publish(
+        self,
+        channel: str,
+        data: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Publish one message.
+
+        Args:
+            channel: Stream name
+            data: Message payload
+            metadata: Optional message metadata
+
+        Returns:
+            Stream entry ID
+        """
+        ids = await self.publish_entries([(channel, data, metadata)])
+        return ids[0]
+
+    async def publish_many(
+        self,
+        channel: str,
+        items: Sequence[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        Publish many messages to one stream in a single round trip.
+
+        Args:
+            channel: Stream name
+            items: Message payloads
+            metadata: Optional metadata applied to every message
+
+        Returns:
+            Stream entry IDs in input order
+        """
+        return await self.publish_entries([(channel, data, metadata) for data in items])
+
+    async def publish_entries(self, entries: Sequence[StreamEntry]) -> List[str]:
+        """
+        Publish messages to any mix of streams in one pipelined round trip.
+
+        Args:
+            entries: (channel, data, metadata) triples
+
+        Returns:
+            Stream entry IDs in input order
+
+        Raises:
+            RedisError: If the pipeline fails
+        """
+        if not entries:
+            return []
+
+        trim = self.trim_policy.xadd_kwargs()
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            for channel, data, metadata in entries:
+                pipe.xadd(
+                    channel,
+                    {"message": self.serializer.serialize(channel, data, metadata)},
+                    **trim,
+                )
+            ids = await pipe.execute()
+
+        logger.debug(f"Published {len(ids)} messages")
+        return ids
+
+    # ==================== Consuming ====================
+
+    async def ensure_group(self, channel: str, group: str, start_id: str = "0") -> bool:
+        """
+        Create a consumer group (and the stream) if missing.
+
+        Args:
+            channel: Stream name
+            group: Consumer group name
+            start_id: Starting entry ID ('0' for all, '$' for new only)
+
+        Returns:
+            True if the group was created by this call
+        """
+        if (channel, group) in self._known_groups:
+            return False
+
+        try:
+            await self.client.xgroup_create(channel, group, start_id, mkstream=True)
+            created = True
+            logger.info(f"Created consumer group '{group}' for {channel}")
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+            created = False
+
+        self._known_groups.add((channel, group))
+        return created
+
+    async def read(
+        self,
+        channels: Sequence[str],
+        group: str,
+        consumer: str,
+        count: int = 10,
+        block_ms: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Read new messages for a consumer across one or more streams.
+
+        Entries that fail to deserialize are acknowledged and dropped.
+
+        Args:
+            channels: Stream names
+            group: Consumer group name
+            consumer: Consumer name within the group
+            count: Maximum messages per stream
+            block_ms: Block for up to this many milliseconds (None = don't block)
+
+        Returns:
+            Deserialized envelopes with "_redis_id" and "_stream" set
+        """
+        for channel in channels:
+            await self.ensure_group(channel, group)
+
+        response = await self.client.xreadgroup(
+            group,
+            consumer,
+            {channel: ">" for channel in channels},
+            count=count,
+            block=block_ms,
+        )
+
+        messages = []
+        for stream_name, entries in response or []:
+            messages.extend(await self._decode(stream_name, group, entries))
+
+        return messages
+
+    async def claim(
+        self,
+        channels: Sequence[str],
+        group: str,
+        consumer: str,
+        min_idle_ms: int,
+        count: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Take over entries another consumer read but never acknowledged.
+
+        Runs one XAUTOCLAIM page per stream, resuming where the previous call
+        stopped, so a consumer that died mid-batch has its pending entries
+        redelivered instead of stranded. Entries trimmed from the stream
+        while pending are acknowledged and dropped.
+
+        Args:
+            channels: Stream names
+            group: Consumer group name
+            consumer: Consumer taking ownership
+            min_idle_ms: Only claim entries idle for at least this long
+            count: Maximum entries claimed per stream
+
+        Returns:
+            Deserialized envelopes with "_redis_id" and "_stream" set
+        """
+        messages = []
+        for channel in channels:
+            await self.ensure_group(channel, group)
+
+            key = (channel, group)
+            response = await self.client.xautoclaim(
+                channel,
+                group,
+                consumer,
+                min_idle_ms,
+                start_id=self._claim_cursors.get(key, "0-0"),
+                count=count,
+            )
+            # "0-0" once the whole pending list has been scanned
+            self._claim_cursors[key] = response[0]
+
+            claimed = await self._decode(channel, group, response[1])
+            if claimed:
+                logger.warning(f"Claimed {len(claimed)} stale pending messages from {channel}")
+            messages.extend(claimed)
+
+        return messages
+
+    async def _decode(
+        self,
+        stream_name: str,
+        group: str,
+        entries: Sequence[Tuple[str, Optional[Dict[str, str]]]],
+    ) -> List[Dict[str, Any]]:
+        """Deserialize stream entries, acknowledging ones that are unreadable or gone."""
+        messages = []
+        bad_ids = []
+        for message_id, fields in entries:
+            if fields is None:
+                # Pending entry whose data was trimmed from the stream
+                bad_ids.append(message_id)
+                continue
+            try:
+                message = self.serializer.deserialize(fields.get("message", "{}"))
+            except ValueError as e:
+                logger.error(f"Failed to deserialize message {message_id}: {e}")
+                bad_ids.append(message_id)
+                continue
+            message["_redis_id"] = message_id
+            message["_stream"] = stream_name
+            messages.append(message)
+
+        if bad_ids:
+            await self.ack(stream_name, group, bad_ids)
+
+        return messages
+
+    async def ack(self, channel: str, group: str, message_ids: Sequence[str]) -> int:
+        """
+        Acknowledge processed messages with a single XACK.
+
+        Args:
+            channel: Stream name
+            group: Consumer group name
+            message_ids: Entry IDs to acknowledge
+
+        Returns:
+            Number of entries acknowledged
+        """
+        if not message_ids:
+            return 0
+        return await self.client.xack(channel, group, *message_ids)
+
+    # ==================== Backpressure ====================
+
+    async def length(self, channel: str) -> int:
+        """Number of entries currently in a stream."""
+        return await self.client.xlen(channel)
+
+    async def lag(self, channel: str, group: str) -> int:
+        """
+        Entries a consumer group has not finished with.
+
+        Counts undelivered entries (XINFO GROUPS lag) plus delivered but
+        unacknowledged ones; entries left pending by dead consumers are
+        only counted until a worker claims them. Before the group exists
+        every entry counts.
+        Servers older than Redis 7 report no lag, so the stream length is
+        used instead.
+
+        Args:
+            channel: Stream name
+            group: Consumer group name
+
+        Returns:
+            Outstanding entry count
+        """
+        try:
+            groups = await self.client.xinfo_groups(channel)
+        except ResponseError:
+            # Stream does not exist yet
+            return 0
+
+        for info in groups:
+            if info.get("name") == group:
+                lag = info.get("lag")
+                if lag is None:
+                    return await self.length(channel)
+                return int(lag) + int(info.get("pending", 0))
+
+        return await self.length(channel)
+
+    async def backpressure(self, channel: str, group: str) -> Tuple[Backpressure, int]:
+        """
+        Admission state for producers writing to a stream.
+
+        Lag readings are reused for check_interval_ms so hot producers add at
+        most one XINFO round trip per interval.
+
+        Args:
+            channel: Stream name
+            group: Consumer group that drains the stream
+
+        Returns:
+            (state, lag) tuple
+        """
+        key = (channel, group)
+        now = time.monotonic()
+        cached = self._lag_cache.get(key)
+
+        if cached and (now - cached[0]) * 1000 < self.check_interval_ms:
+            lag = cached[1]
+        else:
+            lag = await self.lag(channel, group)
+            self._lag_cache[key] = (now, lag)
+
+        if lag > self.hard_lag:
+            return Backpressure.REJECT, lag
+        if lag > self.soft_lag:
+            return Backpressure.THROTTLE, lag
+        return Backpressure.OK, lag
@@ -8,12 +8,15 @@ It includes task discovery, scheduling, and monitoring configuration.
 import os
 from celery import Celery
 from celery.schedules import crontab
-from kombu import Exchange, Queue
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
 
 # Import settings
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from src.api.config import settings
+from src.database.engines import registry as engine_registry
+from src.workers.runtime import runtime as worker_runtime
+from src.workers.workloads import TASK_QUEUES, TASK_ROUTES
 
 # Initialize Sentry for Celery workers
 try:
@@ -36,6 +39,7 @@ celery_app = Celery(
         "src.workers.tasks.alerting",
         "src.workers.tasks.email_workflows",
         "src.workers.tasks.scheduled_reports",
+        "src.workers.tasks.compliance",
     ]
 )
 
@@ -73,24 +77,12 @@ celery_app.conf.update(
     # Rate limiting (to handle 3,000 sessions/day volume)
     task_default_rate_limit="125/m",  # 3000/day ≈ 125/minute average
 
-    # Queue configuration
-    task_queues=(
-        Queue("default", Exchange("default"), routing_key="default"),
-        Queue("data_generation", Exchange("data_generation"), routing_key="data.#"),
-        Queue("evaluation", Exchange("evaluation"), routing_key="eval.#"),
-        Queue("prediction", Exchange("prediction"), routing_key="predict.#"),
-        Queue("training", Exchange("training"), routing_key="train.#"),
-        Queue("email", Exchange("email"), routing_key="email.#"),
-    ),
-
-    # Task routing
-    task_routes={
-        "src.workers.tasks.data_generator.*": {"queue": "data_generation"},
-        "src.workers.tasks.performance_evaluator.*": {"queue": "evaluation"},
-        "src.workers.tasks.churn_predictor.*": {"queue": "prediction"},
-        "src.workers.tasks.model_trainer.*": {"queue": "training"},
-        "email_workflows.*": {"queue": "email"},
-    },
+    # Queues and routing by workload class (see src/workers/workloads.py).
+    # Worker pool, concurrency and prefetch are set per profile on the
+    # command line; the prefetch above is the fallback for ad-hoc workers.
+    task_queues=TASK_QUEUES,
+    task_default_queue="default",
+    task_routes=TASK_ROUTES,
 
     # Beat schedule (periodic tasks)
     beat_schedule={
@@ -116,6 +108,13 @@ celery_app.conf.update(
             "options": {"queue": "prediction"},
         },
 
+        # Risk segment summaries - daily reconciliation after the batch prediction
+        "reconcile-risk-segments-daily": {
+            "task": "src.workers.tasks.churn_predictor.reconcile_risk_segments",
+            "schedule": crontab(hour=1, minute=30),
+            "options": {"queue": "prediction"},
+        },
+
         # ML Model Trainer - daily at 2am
         "train-models-daily": {
             "task": "src.workers.tasks.model_trainer.train_models",
@@ -123,12 +122,19 @@ celery_app.conf.update(
             "options": {"queue": "training"},
         },
 
+        # Cold-storage archival - weekly, Sunday 3am (resumes until done)
+        "archive-expired-data-weekly": {
+            "task": "compliance.archive_expired_data",
+            "schedule": crontab(hour=3, minute=0, day_of_week=0),
+            "options": {"queue": "data_generation"},
+        },
+
         # Uptime Monitoring - every minute for >99.5% SLA tracking
         # FIXED: Using async_helper to avoid SIGSEGV on macOS
         "record-health-checks-every-minute": {
             "task": "src.workers.tasks.uptime_monitor.record_health_checks",
             "schedule": crontab(minute="*"),  # Every minute
-            "options": {"queue": "default"},
+            "options": {"queue": "realtime"},
         },
 
         # Uptime Report - hourly
@@ -149,11 +155,17 @@ celery_app.conf.update(
             "options": {"queue": "default"},
         },
 
-        # Cleanup old health checks - daily at 3am
+        # Compact rolled-up health checks - hourly at :15
         # FIXED: Using async_helper to avoid SIGSEGV on macOS
-        "cleanup-old-health-checks-daily": {
+        "cleanup-old-health-checks-hourly": {
             "task": "src.workers.tasks.uptime_monitor.cleanup_old_health_checks",
-            "schedule": crontab(hour=3, minute=0),
+            "schedule": crontab(minute=15),
+            "kwargs": {"days_to_keep": 30},
+            "options": {"queue": "default"},
+        },
+        "compact-api-response-times-hourly": {
+            "task": "src.workers.tasks.uptime_monitor.compact_api_response_times",
+            "schedule": crontab(minute=20),
             "kwargs": {"days_to_keep": 30},
             "options": {"queue": "default"},
         },
@@ -163,7 +175,7 @@ celery_app.conf.update(
         "check-and-send-alerts-every-5-min": {
             "task": "src.workers.tasks.alerting.check_and_send_alerts",
             "schedule": crontab(minute="*/5"),  # Every 5 minutes
-            "options": {"queue": "default"},
+            "options": {"queue": "realtime"},
         },
 
         # SLA violation check - every 5 minutes
@@ -171,7 +183,7 @@ celery_app.conf.update(
         "check-sla-violations-every-5-min": {
             "task": "src.workers.tasks.alerting.check_sla_violations",
             "schedule": crontab(minute="*/5"),  # Every 5 minutes
-            "options": {"queue": "default"},
+            "options": {"queue": "realtime"},
         },
 
         # Infrastructure check - every 2 minutes for faster failure detection
@@ -179,7 +191,7 @@ celery_app.conf.update(
         "check-infrastructure-every-2-min": {
             "task": "src.workers.tasks.alerting.check_infrastructure",
             "schedule": crontab(minute="*/2"),  # Every 2 minutes
-            "options": {"queue": "default"},
+            "options": {"queue": "realtime"},
         },
 
         # Email Workflows (Task 12 & 22)
@@ -218,6 +230,13 @@ celery_app.conf.update(
             "options": {"queue": "email"},
         },
 
+        # Copy ingested open/click events and counters to Postgres - every minute
+        "flush-email-events-every-minute": {
+            "task": "email_workflows.flush_email_events",
+            "schedule": crontab(minute="*"),  # Every minute
+            "options": {"queue": "email"},
+        },
+
         # Cleanup old tracking events - weekly on Sunday at 2am
         "cleanup-tracking-events-weekly": {
             "task": "email_workflows.cleanup_old_tracking_events",
@@ -231,28 +250,35 @@ celery_app.conf.update(
         "send-weekly-performance-report": {
             "task": "scheduled_reports.generate_weekly_report",
             "schedule": crontab(hour=9, minute=0, day_of_week=1),  # Monday 9am
-            "options": {"queue": "default"},
+            "options": {"queue": "reports"},
         },
 
         # Monthly performance report - 1st of month at 9am
         "send-monthly-performance-report": {
             "task": "scheduled_reports.generate_monthly_report",
             "schedule": crontab(hour=9, minute=0, day_of_month=1),  # 1st day of month
-            "options": {"queue": "default"},
+            "options": {"queue": "reports"},
         },
 
         # Weekly intervention effectiveness - Friday at 4pm
         "send-intervention-effectiveness-report": {
             "task": "scheduled_reports.generate_intervention_effectiveness_report",
             "schedule": crontab(hour=16, minute=0, day_of_week=5),  # Friday 4pm
-            "options": {"queue": "default"},
+            "options": {"queue": "reports"},
         },
 
         # Monthly churn analytics - 1st of month at 10am
         "send-churn-analytics-report": {
             "task": "scheduled_reports.generate_churn_analytics_report",
             "schedule": crontab(hour=10, minute=0, day_of_month=1),  # 1st day of month
-            "options": {"queue": "default"},
+            "options": {"queue": "reports"},
+        },
+
+        # Delete report and GDPR export files past their retention
+        "cleanup-expired-exports-hourly": {
+            "task": "scheduled_reports.cleanup_expired_exports",
+            "schedule": crontab(minute=45),  # Every hour at :45
+            "options": {"queue": "reports"},
         },
     },
 
@@ -262,6 +288,31 @@ celery_app.conf.update(
 )
 
 
+# Database pools: size them for a worker process, and never share the
+# parent's pooled connections with prefork children
+@worker_init.connect
+def configure_worker_engines(**kwargs):
+    """Switch the shared engine registry to worker pool sizing."""
+    engine_registry.configure(role="worker")
+
+
+@worker_process_init.connect
+def reset_engines_after_fork(**kwargs):
+    """Drop pooled connections inherited from the parent worker process."""
+    engine_registry.reset_after_fork()
+    worker_runtime.reset_after_fork()
+
+
+# Async tasks share one event loop per process (src/workers/runtime.py).
+# Prefork children get worker_process_shutdown; solo and threads pools only
+# worker_shutdown. Closes pooled connections on the loop that opened them.
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_worker_runtime(**kwargs):
+    """Close the worker runtime's connections and stop its event loop."""
+    worker_runtime.shutdown()
+
+
 # Event handlers for monitoring
 @celery_app.task(bind=True)
 def debug_task(self):
@@ -10,13 +10,13 @@ Handles:
 
 from celery import Celery, Task
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine, select, and_
-from sqlalchemy.orm import Session
+from sqlalchemy import select, and_
 import pandas as pd
 import logging
 import uuid
 import os
 
+from ..database.engines import get_sync_engine, get_sync_session
 from ..database.models import (
     FirstSessionPrediction,
     Session as SessionModel,
@@ -51,10 +51,6 @@ celery_app.conf.update(
     task_soft_time_limit=240,  # 4 minutes
 )
 
-# Database engine for worker (sync)
-DATABASE_URL = f"postgresql://{settings.postgres_user}:{settings.postgres_password}@{settings.postgres_host}:{settings.postgres_port}/{settings.postgres_db}"
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-
 
 class DatabaseTask(Task):
     """Base task with database session management."""
@@ -64,7 +60,7 @@ class DatabaseTask(Task):
     @property
     def db_session(self):
         if self._db_session is None:
-            self._db_session = Session(engine)
+            self._db_session = get_sync_session()
         return self._db_session
 
     def after_return(self, *args, **kwargs):
@@ -121,9 +117,10 @@ def predict_upcoming_first_sessions(lookahead_hours: int = 24) -> dict:
         logger.info(f"Found {len(upcoming_sessions)} upcoming first sessions")
 
         # Load historical data for feature calculation
-        tutors_df = pd.read_sql("SELECT * FROM tutors", engine)
-        sessions_df = pd.read_sql("SELECT * FROM sessions WHERE scheduled_start < NOW()", engine)
-        feedback_df = pd.read_sql("SELECT * FROM student_feedback", engine)
+        read_engine = get_sync_engine(replica=True)
+        tutors_df = pd.read_sql("SELECT * FROM tutors", read_engine)
+        sessions_df = pd.read_sql("SELECT * FROM sessions WHERE scheduled_start < NOW()", read_engine)
+        feedback_df = pd.read_sql("SELECT * FROM student_feedback", read_engine)
 
         predictions_made = 0
         alerts_sent = 0
@@ -117,19 +117,16 @@ class HealthCheck:
             Database health information
         """
         try:
-            from sqlalchemy import create_engine, text
-
-            # Use sync connection for health check
-            db_url = f"postgresql+psycopg2://{settings.postgres_user}:{settings.postgres_password}@{settings.postgres_host}:{settings.postgres_port}/{settings.postgres_db}"
-            engine = create_engine(db_url, pool_pre_ping=True)
+            from sqlalchemy import text
+            from ..database.engines import get_sync_engine
 
+            # Use the shared sync engine instead of opening a pool per check
             start_time = time.time()
-            with engine.connect() as conn:
+            with get_sync_engine().connect() as conn:
                 result = conn.execute(text("SELECT 1"))
                 result.fetchone()
 
             latency = (time.time() - start_time) * 1000  # ms
-            engine.dispose()
 
             return {
                 "status": "healthy",
@@ -0,0 +1,202 @@
+"""
+Worker Runtime - One persistent event loop per Celery worker process.
+
+Async tasks used to wrap their work in asyncio.run() (or a fresh loop from
+async_helper) on every invocation. That pays for a new loop per task and,
+worse, strands the shared asyncpg pool: connections opened on one loop cannot
+be reused on the next, so every task reconnected to PostgreSQL and Redis.
+
+WorkerRuntime keeps a single loop running in a background thread for the
+life of the process. Tasks submit coroutines with run_async() and block on
+the result, so they work the same from prefork children and from the threads
+pool (where several task threads share the loop). Everything created on the
+loop stays valid between tasks:
+
+- the async engine from src.database.engines (through async_session_maker)
+- one redis.asyncio client (runtime.redis())
+
+Inside a coroutine, independent I/O can simply be awaited concurrently
+(asyncio.gather), e.g. delivering a report to every recipient at once.
+
+The loop is started on first use. Celery signals in src/workers/celery_app.py
+reset it in each forked child (the parent's loop thread does not survive the
+fork) and shut it down, closing pooled connections, when the process exits.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+import redis.asyncio as aioredis
+
+from src.api.config import settings
+from src.database.engines import registry as engine_registry
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Seconds to wait for connections to close when the process shuts down
+SHUTDOWN_TIMEOUT_SECONDS = 10
+
+
+class WorkerRuntime:
+    """Persistent event loop, run in a daemon thread, plus loop-bound clients."""
+
+    def __init__(self, redis_url: Optional[str] = None):
+        """
+        Initialize the runtime (the loop starts on first use).
+
+        Args:
+            redis_url: Redis URL for the shared client (defaults to settings.redis_url)
+        """
+        self.redis_url = redis_url or settings.redis_url
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._redis: Optional[aioredis.Redis] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started if needed (and restarted after a fork)."""
+        loop = self._loop
+        if loop is not None and self._pid == os.getpid():
+            return loop
+
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._start()
+            return self._loop
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None and self._pid == os.getpid()
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=serve, name="worker-event-loop", daemon=True)
+        thread.start()
+        ready.wait()
+
+        self._loop, self._thread, self._pid = loop, thread, os.getpid()
+        self._redis = None
+        logger.info(f"Started worker event loop in process {self._pid}")
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the runtime loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before cancelling it; None to wait forever
+
+        Returns:
+            The coroutine's result (its exception is re-raised here)
+
+        Raises:
+            RuntimeError: If called from a coroutine already on the runtime
+                loop (await it instead; blocking would deadlock the loop)
+        """
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("WorkerRuntime.run() called on the runtime loop; await the coroutine instead")
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+        except BaseException:
+            # Interrupted while waiting (e.g. a soft time limit): stop the coroutine too
+            if not future.done():
+                future.cancel()
+            raise
+
+    # ------------------------------------------------------------------
+    # Shared clients
+    # ------------------------------------------------------------------
+
+    def redis(self) -> aioredis.Redis:
+        """
+        Shared async Redis client. Only use it from coroutines on the runtime loop.
+        """
+        if self._redis is None:
+            self._redis = aioredis.from_url(
+                self.redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+                max_connections=settings.redis_max_connections,
+                socket_connect_timeout=5,
+            )
+        return self._redis
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def reset_after_fork(self) -> None:
+        """Forget the parent's loop and clients; the child starts its own on first use."""
+        with self._lock:
+            self._loop = self._thread = self._redis = None
+            self._pid = None
+
+    async def _close_clients(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        # Async connections must be closed on the loop that opened them
+        await engine_registry.dispose_async()
+
+    def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """Close loop-bound connections and stop the loop."""
+        if not self.started:
+            return
+
+        try:
+            self.run(self._close_clients(), timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Error closing worker runtime clients: {e}")
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = self._redis = None
+            self._pid = None
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+        logger.info("Stopped worker event loop")
+
+
+runtime = WorkerRuntime()
+
+
+def run_async(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on this process's shared worker loop.
+
+    Example:
+        @celery_app.task
+        def my_task():
+            return run_async(do_work())
+    """
+    return runtime.run(coro, timeout)
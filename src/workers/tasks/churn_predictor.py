@@ -4,6 +4,12 @@ Celery tasks for churn prediction.
 Implements both batch and event-driven churn prediction tasks:
 - batch_predict_churn: Daily batch prediction for all active tutors (scheduled at midnight)
 - predict_churn_for_tutor: Event-driven prediction for individual tutor (triggered by events)
+- reconcile_risk_segments: Daily rebuild of the risk segment summaries, which
+  save_prediction otherwise maintains incrementally
+
+Features are computed per tutor, so the daily batch is split into chunks of
+churn_batch_size tutors that run in parallel as a Celery chord
+(predict_churn_chunk tasks followed by summarize_churn_predictions).
 """
 
 import logging
@@ -14,11 +20,14 @@ from typing import Dict, Any, Optional, List
 import uuid
 
 import pandas as pd
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker, Session
-from celery import Task
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from celery import Task, chord
 
 from ..celery_app import celery_app
+from ..config import worker_settings
+from ..workloads import chunked
+from ...database.engines import get_sync_session
 from ...database.models import (
     Tutor,
     Session as SessionModel,
@@ -27,29 +36,14 @@ from ...database.models import (
     TutorStatus,
     RiskLevel,
 )
-from ...api.config import settings
+from ...api.tutor_profile_service import invalidate_tutor_profiles_sync
 from ...evaluation.prediction_service import ChurnPredictionService
 from ...evaluation.feature_engineering import ChurnFeatureEngineer
+from ...evaluation.risk_segments import apply_prediction, rebuild_risk_segments
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Construct synchronous database URL for Celery
-# Celery tasks run synchronously, so we need psycopg2 driver instead of asyncpg
-SYNC_DATABASE_URL = f"postgresql+psycopg2://{settings.postgres_user}:{settings.postgres_password}@{settings.postgres_host}:{settings.postgres_port}/{settings.postgres_db}"
-
-# Create synchronous engine and session factory for worker tasks
-sync_engine = create_engine(
-    SYNC_DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=3600,
-    echo=False,
-)
-SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
-
-
 # Model loading and caching
 class ChurnPredictorTask(Task):
     """
@@ -94,7 +88,8 @@ class ChurnPredictorTask(Task):
 def load_tutor_data(
     db: Session,
     tutor_id: Optional[str] = None,
-    lookback_days: int = 90
+    lookback_days: int = 90,
+    tutor_ids: Optional[List[str]] = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Load tutor, session, and feedback data from database.
@@ -103,6 +98,7 @@ def load_tutor_data(
         db: Database session
         tutor_id: Optional tutor ID to filter for single tutor
         lookback_days: Number of days of historical data to include
+        tutor_ids: Optional tutor IDs to filter for one batch chunk
 
     Returns:
         Tuple of (tutors_df, sessions_df, feedback_df)
@@ -117,6 +113,8 @@ def load_tutor_data(
         )
     else:
         tutors_query = select(Tutor).where(Tutor.status == TutorStatus.ACTIVE)
+        if tutor_ids is not None:
+            tutors_query = tutors_query.where(Tutor.tutor_id.in_(tutor_ids))
 
     tutors = db.execute(tutors_query).scalars().all()
 
@@ -258,6 +256,8 @@ def save_prediction(
     )
 
     db.add(prediction)
+    # Count it in the risk segment summaries in the same transaction
+    apply_prediction(db, prediction)
     db.commit()
 
     logger.info(
@@ -286,6 +286,8 @@ def batch_predict_churn(self, lookback_days: int = 90) -> Dict[str, Any]:
 
     Scheduled to run daily at midnight via Celery Beat.
     Processes all active tutors and stores predictions in database.
+    Populations larger than churn_batch_size are split into chunks that
+    are predicted in parallel; the summary then comes from the chord callback.
 
     Args:
         lookback_days: Number of days of historical data to use for features
@@ -296,28 +298,123 @@ def batch_predict_churn(self, lookback_days: int = 90) -> Dict[str, Any]:
     logger.info("Starting batch churn prediction...")
     start_time = datetime.now()
 
-    db = SyncSessionLocal()
+    db = get_sync_session(replica=True)
+    try:
+        tutor_ids = db.execute(
+            select(Tutor.tutor_id)
+            .where(Tutor.status == TutorStatus.ACTIVE)
+            .order_by(Tutor.tutor_id)
+        ).scalars().all()
+    finally:
+        db.close()
+
+    chunks = chunked(list(tutor_ids), worker_settings.churn_batch_size)
+    if len(chunks) > 1:
+        summary = chord(
+            predict_churn_chunk.s(chunk, lookback_days) for chunk in chunks
+        )(summarize_churn_predictions.s(start_time.isoformat()))
+
+        logger.info(
+            f"Batch prediction split into {len(chunks)} chunks "
+            f"({len(tutor_ids)} tutors)"
+        )
+        return {
+            'status': 'dispatched',
+            'tutors_dispatched': len(tutor_ids),
+            'chunks_dispatched': len(chunks),
+            'summary_task_id': summary.id,
+            'timestamp': datetime.now().isoformat(),
+        }
+
+    chunk_ids = chunks[0] if chunks else []
+    return _summarize([_predict_and_save(self, chunk_ids, lookback_days)], start_time)
+
+
+@celery_app.task(
+    bind=True,
+    base=ChurnPredictorTask,
+    name="src.workers.tasks.churn_predictor.predict_churn_chunk",
+    max_retries=3,
+    default_retry_delay=300,  # 5 minutes
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,  # 10 minutes
+    retry_jitter=True,
+)
+def predict_churn_chunk(self, tutor_ids: List[str], lookback_days: int = 90) -> Dict[str, Any]:
+    """
+    Predict churn for one chunk of the daily batch.
+
+    Args:
+        tutor_ids: Tutors in this chunk
+        lookback_days: Number of days of historical data to use for features
+
+    Returns:
+        Dictionary with counts and risk distribution for the chunk
+    """
+    return _predict_and_save(self, tutor_ids, lookback_days)
+
+
+@celery_app.task(name="src.workers.tasks.churn_predictor.summarize_churn_predictions")
+def summarize_churn_predictions(chunk_results: List[Dict[str, Any]], started_at: str) -> Dict[str, Any]:
+    """
+    Chord callback combining the chunk results of one batch prediction run.
+
+    Args:
+        chunk_results: Results of the predict_churn_chunk tasks
+        started_at: ISO timestamp of the run that dispatched the chunks
+
+    Returns:
+        Dictionary with prediction summary statistics
+    """
+    return _summarize(chunk_results, datetime.fromisoformat(started_at))
+
+
+def _predict_and_save(
+    task: ChurnPredictorTask,
+    tutor_ids: Optional[List[str]],
+    lookback_days: int,
+) -> Dict[str, Any]:
+    """
+    Load data for a set of tutors, predict churn and save the predictions.
+
+    Args:
+        task: Task providing the cached model service
+        tutor_ids: Tutors to predict for (None for all active tutors)
+        lookback_days: Number of days of historical data to use for features
+
+    Returns:
+        Dictionary with counts and risk distribution
+    """
+    result = {
+        'tutors_processed': 0,
+        'predictions_created': 0,
+        'errors': 0,
+        'risk_distribution': {'LOW': 0, 'MEDIUM': 0, 'HIGH': 0, 'CRITICAL': 0},
+        'model_version': None,
+    }
+
+    # Feature reads can be served by the replica; predictions go to the primary
+    replica = get_sync_session(replica=True)
     try:
-        # Load data for all active tutors
         tutors_df, sessions_df, feedback_df = load_tutor_data(
-            db=db,
+            db=replica,
             tutor_id=None,
-            lookback_days=lookback_days
+            lookback_days=lookback_days,
+            tutor_ids=tutor_ids,
         )
+    finally:
+        replica.close()
 
+    db = get_sync_session()
+    try:
         if tutors_df.empty:
             logger.warning("No active tutors found for batch prediction")
-            return {
-                'status': 'completed',
-                'tutors_processed': 0,
-                'predictions_created': 0,
-                'errors': 0,
-                'duration_seconds': 0,
-            }
+            return result
 
         # Make predictions using cached model
         logger.info(f"Making predictions for {len(tutors_df)} tutors...")
-        predictions = self.model_service.predict_batch(
+        predictions = task.model_service.predict_batch(
             tutors_df=tutors_df,
             sessions_df=sessions_df,
             feedback_df=feedback_df,
@@ -326,9 +423,8 @@ def batch_predict_churn(self, lookback_days: int = 90) -> Dict[str, Any]:
 
         # Save predictions to database
         logger.info("Saving predictions to database...")
-        predictions_created = 0
-        errors = 0
-        risk_distribution = {'LOW': 0, 'MEDIUM': 0, 'HIGH': 0, 'CRITICAL': 0}
+        result['tutors_processed'] = len(tutors_df)
+        result['model_version'] = task.model_service.model_version
 
         for prediction in predictions:
             try:
@@ -336,34 +432,18 @@ def batch_predict_churn(self, lookback_days: int = 90) -> Dict[str, Any]:
                     db=db,
                     tutor_id=prediction['tutor_id'],
                     prediction_result=prediction,
-                    model_version=self.model_service.model_version
+                    model_version=task.model_service.model_version
                 )
-                predictions_created += 1
-                risk_distribution[prediction['risk_level']] += 1
+                result['predictions_created'] += 1
+                result['risk_distribution'][prediction['risk_level']] += 1
             except Exception as e:
                 logger.error(f"Failed to save prediction for {prediction['tutor_id']}: {e}")
-                errors += 1
-
-        duration = (datetime.now() - start_time).total_seconds()
-
-        summary = {
-            'status': 'completed',
-            'tutors_processed': len(tutors_df),
-            'predictions_created': predictions_created,
-            'errors': errors,
-            'risk_distribution': risk_distribution,
-            'duration_seconds': duration,
-            'model_version': self.model_service.model_version,
-            'timestamp': datetime.now().isoformat(),
-        }
+                result['errors'] += 1
 
-        logger.info(
-            f"Batch prediction completed: {predictions_created} predictions created "
-            f"in {duration:.1f}s (errors: {errors})"
-        )
-        logger.info(f"Risk distribution: {risk_distribution}")
+        # Cached tutor profiles embed the latest prediction
+        invalidate_tutor_profiles_sync(p['tutor_id'] for p in predictions)
 
-        return summary
+        return result
 
     except Exception as e:
         logger.error(f"Batch prediction failed: {e}", exc_info=True)
@@ -373,6 +453,35 @@ def batch_predict_churn(self, lookback_days: int = 90) -> Dict[str, Any]:
         db.close()
 
 
+def _summarize(results: List[Dict[str, Any]], start_time: datetime) -> Dict[str, Any]:
+    """Combine chunk results into the batch prediction summary."""
+    risk_distribution = {'LOW': 0, 'MEDIUM': 0, 'HIGH': 0, 'CRITICAL': 0}
+    for result in results:
+        for level, count in result['risk_distribution'].items():
+            risk_distribution[level] += count
+
+    duration = (datetime.now() - start_time).total_seconds()
+    summary = {
+        'status': 'completed',
+        'tutors_processed': sum(r['tutors_processed'] for r in results),
+        'predictions_created': sum(r['predictions_created'] for r in results),
+        'errors': sum(r['errors'] for r in results),
+        'risk_distribution': risk_distribution,
+        'duration_seconds': duration,
+        'model_version': next((r['model_version'] for r in results if r['model_version']), None),
+        'chunks': len(results),
+        'timestamp': datetime.now().isoformat(),
+    }
+
+    logger.info(
+        f"Batch prediction completed: {summary['predictions_created']} predictions created "
+        f"in {duration:.1f}s (errors: {summary['errors']})"
+    )
+    logger.info(f"Risk distribution: {risk_distribution}")
+
+    return summary
+
+
 @celery_app.task(
     bind=True,
     base=ChurnPredictorTask,
@@ -408,7 +517,7 @@ def predict_churn_for_tutor(
     logger.info(f"Starting churn prediction for tutor: {tutor_id}")
     start_time = datetime.now()
 
-    db = SyncSessionLocal()
+    db = get_sync_session()
     try:
         # Load data for specific tutor
         tutors_df, sessions_df, feedback_df = load_tutor_data(
@@ -442,6 +551,7 @@ def predict_churn_for_tutor(
             prediction_result=prediction,
             model_version=self.model_service.model_version
         )
+        invalidate_tutor_profiles_sync([tutor_id])
 
         duration = (datetime.now() - start_time).total_seconds()
 
@@ -475,3 +585,28 @@ def predict_churn_for_tutor(
         raise
     finally:
         db.close()
+
+
+@celery_app.task(name="src.workers.tasks.churn_predictor.reconcile_risk_segments")
+def reconcile_risk_segments() -> Dict[str, Any]:
+    """
+    Rebuild the risk segment summaries from churn_predictions.
+
+    Picks up tutor status changes and deletions, which do not pass through
+    save_prediction.
+
+    Returns:
+        Dictionary with the number of tutors counted
+    """
+    db = get_sync_session()
+    try:
+        tutors = rebuild_risk_segments(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    logger.info(f"Rebuilt risk segment summaries for {tutors} active tutors")
+    return {'tutors_counted': tutors, 'timestamp': datetime.now().isoformat()}
@@ -0,0 +1,122 @@
+"""
+Compliance Tasks
+
+Background GDPR erasure (Article 17). Requests are created through the data
+retention API and erased here with the set-based BulkErasure engine.
+Students past the FERPA retention period are moved to Parquet cold storage
+with the chunked ParquetArchiver.
+
+Tasks:
+    - erase_users: Run (or resume) an erasure request
+    - archive_expired_data: Run (or resume) cold-storage archival
+"""
+
+import logging
+from typing import Dict, Optional
+
+from src.workers.celery_app import celery_app
+from src.database.engines import get_sync_session
+from src.database.erasure import BulkErasure, ERASURE_CHUNK_SIZE
+
+
+logger = logging.getLogger(__name__)
+
+# Time budget per task run; an unfinished request is re-queued and resumes
+ERASURE_TIME_BUDGET_SECONDS = 300
+ARCHIVAL_TIME_BUDGET_SECONDS = 600
+
+
+@celery_app.task(name="compliance.erase_users")
+def erase_users(
+    request_id: str,
+    chunk_size: int = ERASURE_CHUNK_SIZE,
+    time_budget_seconds: Optional[float] = ERASURE_TIME_BUDGET_SECONDS,
+) -> Dict:
+    """
+    Erase the users of an erasure request.
+
+    Each run works for at most time_budget_seconds, then re-queues itself;
+    progress is checkpointed per chunk, so the next run (or a retry after a
+    crash) continues where this one stopped.
+
+    Args:
+        request_id: Erasure request ID (from BulkErasure.create)
+        chunk_size: Rows updated or deleted per transaction
+        time_budget_seconds: Stop and re-queue after this long; None for no limit
+
+    Returns:
+        Dict with request_id, users, rows_affected, chunks and completed
+    """
+    logger.info(f"Starting erasure {request_id} (chunk_size={chunk_size})")
+
+    try:
+        stats = BulkErasure(
+            get_sync_session,
+            chunk_size=chunk_size,
+            time_budget_seconds=time_budget_seconds,
+        ).run(request_id)
+
+    except Exception as e:
+        logger.error(f"Error in erasure {request_id}: {e}", exc_info=True)
+        raise
+
+    if not stats["completed"]:
+        erase_users.apply_async(kwargs={
+            "request_id": request_id,
+            "chunk_size": chunk_size,
+            "time_budget_seconds": time_budget_seconds,
+        })
+
+    logger.info(
+        f"Erasure {request_id} {'complete' if stats['completed'] else 'paused'}: "
+        f"{stats['users']} users, {sum(stats['rows_affected'].values())} rows in {stats['chunks']} chunks"
+    )
+
+    return stats
+
+
+@celery_app.task(name="compliance.archive_expired_data")
+def archive_expired_data(
+    days_to_keep: int = 2555,
+    time_budget_seconds: Optional[float] = ARCHIVAL_TIME_BUDGET_SECONDS,
+) -> Dict:
+    """
+    Archive students past the retention period to Parquet cold storage.
+
+    Like erase_users, an unfinished run re-queues itself and resumes from its
+    checkpoint, appending to the same manifest.
+
+    Args:
+        days_to_keep: Retention period (FERPA: 7 years); a resumed run keeps its cutoff
+        time_budget_seconds: Stop and re-queue after this long; None for no limit
+
+    Returns:
+        Dict with run_id, manifest, students_archived, rows_archived, chunks and completed
+    """
+    # pyarrow is only imported by workers that archive
+    from src.database.archival import ParquetArchiver
+
+    logger.info(f"Starting cold-storage archival (days_to_keep={days_to_keep})")
+
+    try:
+        stats = ParquetArchiver(
+            get_sync_session,
+            time_budget_seconds=time_budget_seconds,
+        ).run(days_to_keep)
+
+    except Exception as e:
+        logger.error(f"Error in cold-storage archival: {e}", exc_info=True)
+        raise
+
+    if not stats["completed"]:
+        archive_expired_data.apply_async(kwargs={
+            "days_to_keep": days_to_keep,
+            "time_budget_seconds": time_budget_seconds,
+        })
+
+    logger.info(
+        f"Archival run {stats['run_id']} {'complete' if stats['completed'] else 'paused'}: "
+        f"{stats['students_archived']} students in {stats['chunks']} chunks"
+    )
+
+    return stats
@@ -11,54 +11,30 @@ Tasks:
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional
 from uuid import uuid4
 
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
 from celery import Task
 from celery.exceptions import SoftTimeLimitExceeded
 
 from src.workers.celery_app import celery_app
 from src.data_generation.tutor_generator import TutorGenerator, BehavioralArchetype
 from src.data_generation.session_generator import SessionGenerator
+from src.database.engines import get_sync_session
 from src.database.models import Tutor, Student, Session as SessionModel
-from src.api.config import settings
+from src.database.retention import RetentionCleanup, RETENTION_CHUNK_SIZE
 
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
-# Synchronous database engine for Celery workers
-# Celery runs in a synchronous context, so we need psycopg2 instead of asyncpg
-SYNC_DATABASE_URL = (
-    f"postgresql+psycopg2://{settings.postgres_user}:{settings.postgres_password}"
-    f"@{settings.postgres_host}:{settings.postgres_port}/{settings.postgres_db}"
-)
-
-sync_engine = create_engine(
-    SYNC_DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=3600,
-    pool_pre_ping=True,
-    echo=False,
-)
-
-# Create session factory
-SyncSessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=sync_engine,
-)
-
-
 def get_db() -> Session:
     """Get a synchronous database session for Celery workers."""
-    return SyncSessionLocal()
+    return get_sync_session()
 
 
 class DataGeneratorTask(Task):
@@ -225,60 +201,59 @@ def generate_synthetic_data(
             date=session_date
         )
 
-        # Track created students
-        created_students = set()
-
-        # Store sessions in database
+        # One lookup for every student referenced by the batch
+        student_ids = {s["student_id"] for s in sessions_data}
+        existing_students = set(
+            db.execute(
+                select(Student.student_id).where(Student.student_id.in_(student_ids))
+            ).scalars().all()
+        ) if student_ids else set()
+
+        new_students = sorted(student_ids - existing_students)
+        if new_students:
+            db.execute(insert(Student), [
+                {
+                    "student_id": student_id,
+                    "name": f"Student {student_id.split('_')[1]}",
+                    "age": None,
+                    "grade_level": None,
+                    "subjects_interested": [],
+                }
+                for student_id in new_students
+            ])
+            stats["students_created"] = len(new_students)
+
+        session_rows = []
         for session_data in sessions_data:
             try:
-                # Check if student exists, create if not
-                student_id = session_data["student_id"]
-
-                existing_student = db.execute(
-                    select(Student).where(Student.student_id == student_id)
-                ).scalar_one_or_none()
-
-                if not existing_student and student_id not in created_students:
-                    # Generate student data
-                    student = Student(
-                        student_id=student_id,
-                        name=f"Student {student_id.split('_')[1]}",
-                        age=None,
-                        grade_level=None,
-                        subjects_interested=[],
-                    )
-                    db.add(student)
-                    created_students.add(student_id)
-                    stats["students_created"] += 1
-
-                # Create session
-                session = SessionModel(
-                    session_id=session_data["session_id"],
-                    tutor_id=session_data["tutor_id"],
-                    student_id=session_data["student_id"],
-                    session_number=session_data["session_number"],
-                    scheduled_start=datetime.fromisoformat(session_data["scheduled_start"]),
-                    actual_start=datetime.fromisoformat(session_data["actual_start"]) if session_data["actual_start"] else None,
-                    duration_minutes=session_data["duration_minutes"],
-                    subject=session_data["subject"],
-                    session_type=session_data["session_type"],
-                    tutor_initiated_reschedule=session_data["tutor_initiated_reschedule"],
-                    no_show=session_data["no_show"],
-                    late_start_minutes=session_data["late_start_minutes"],
-                    engagement_score=session_data["engagement_score"],
-                    learning_objectives_met=session_data["learning_objectives_met"],
-                    technical_issues=session_data["technical_issues"],
-                )
-
-                db.add(session)
-                stats["sessions_created"] += 1
-
+                session_rows.append({
+                    "session_id": session_data["session_id"],
+                    "tutor_id": session_data["tutor_id"],
+                    "student_id": session_data["student_id"],
+                    "session_number": session_data["session_number"],
+                    "scheduled_start": datetime.fromisoformat(session_data["scheduled_start"]),
+                    "actual_start": datetime.fromisoformat(session_data["actual_start"]) if session_data["actual_start"] else None,
+                    "duration_minutes": session_data["duration_minutes"],
+                    "subject": session_data["subject"],
+                    "session_type": session_data["session_type"],
+                    "tutor_initiated_reschedule": session_data["tutor_initiated_reschedule"],
+                    "no_show": session_data["no_show"],
+                    "late_start_minutes": session_data["late_start_minutes"],
+                    "engagement_score": session_data["engagement_score"],
+                    "learning_objectives_met": session_data["learning_objectives_met"],
+                    "technical_issues": session_data["technical_issues"],
+                })
             except Exception as e:
                 error_msg = f"Error creating session {session_data['session_id']}: {str(e)}"
                 logger.error(error_msg)
                 stats["errors"].append(error_msg)
                 continue
 
+        # Single executemany instead of one ORM object per session
+        if session_rows:
+            db.execute(insert(SessionModel), session_rows)
+            stats["sessions_created"] = len(session_rows)
+
         # Commit all sessions
         db.commit()
 
@@ -361,21 +336,33 @@ def generate_data_continuous(self, batch_size: int = 100) -> Dict:
     name="data_generator.cleanup_old_data",
     queue="data_generation",
 )
-def cleanup_old_data(self, days_to_keep: int = 90) -> Dict:
+def cleanup_old_data(
+    self,
+    days_to_keep: int = 90,
+    chunk_size: int = RETENTION_CHUNK_SIZE,
+    time_budget_seconds: Optional[float] = None,
+) -> Dict:
     """
     Clean up old synthetic data to prevent database bloat.
 
     This task removes sessions and orphaned students older than the specified
     retention period. Tutors are kept for historical analysis.
 
+    Rows are deleted set-based in chunks of chunk_size, each in its own short
+    transaction. Progress is checkpointed, so a run that fails or exceeds its
+    time budget is resumed (with the same cutoff) by the next run.
+
     Args:
         days_to_keep: Number of days of data to retain (default: 90)
+        chunk_size: Rows deleted per transaction
+        time_budget_seconds: Stop after this long and resume on the next run
 
     Returns:
         Dict with cleanup statistics:
             - sessions_deleted: Number of sessions removed
             - students_deleted: Number of students removed
             - cutoff_date: Date before which data was deleted
+            - completed: False if the run stopped early and will resume
 
     Example:
         # Add to Celery Beat schedule:
@@ -385,60 +372,25 @@ def cleanup_old_data(self, days_to_keep: int = 90) -> Dict:
             'kwargs': {'days_to_keep': 90},
         }
     """
-    cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
-
-    logger.info(f"Starting data cleanup: removing data before {cutoff_date.date()}")
-
-    stats = {
-        "sessions_deleted": 0,
-        "students_deleted": 0,
-        "cutoff_date": cutoff_date.isoformat(),
-    }
-
-    db = None
+    logger.info(f"Starting data cleanup (days_to_keep={days_to_keep}, chunk_size={chunk_size})")
 
     try:
-        db = get_db()
-
-        # Delete old sessions
-        old_sessions = db.execute(
-            select(SessionModel).where(SessionModel.scheduled_start < cutoff_date)
-        ).scalars().all()
-
-        for session in old_sessions:
-            db.delete(session)
-            stats["sessions_deleted"] += 1
-
-        db.commit()
-
-        # Find and delete orphaned students (students with no sessions)
-        all_students = db.execute(select(Student)).scalars().all()
-
-        for student in all_students:
-            sessions_count = db.execute(
-                select(SessionModel).where(SessionModel.student_id == student.student_id)
-            ).scalars().first()
-
-            if not sessions_count:
-                db.delete(student)
-                stats["students_deleted"] += 1
-
-        db.commit()
-
-        logger.info(
-            f"Cleanup complete: {stats['sessions_deleted']} sessions, "
-            f"{stats['students_deleted']} students deleted"
-        )
+        stats = RetentionCleanup(
+            get_db,
+            job_name="cleanup_old_data",
+            chunk_size=chunk_size,
+            time_budget_seconds=time_budget_seconds,
+        ).run(days_to_keep)
 
     except Exception as e:
         error_msg = f"Error in data cleanup: {str(e)}"
         logger.error(error_msg, exc_info=True)
-        if db:
-            db.rollback()
         raise
 
-    finally:
-        if db:
-            db.close()
+    logger.info(
+        f"Cleanup {'complete' if stats['completed'] else 'paused'}: "
+        f"{stats['sessions_deleted']} sessions, {stats['students_deleted']} students deleted "
+        f"before {stats['cutoff_date']}"
+    )
 
     return stats
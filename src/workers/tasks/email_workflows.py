@@ -6,6 +6,7 @@ Implements:
 - First session check-ins (2h after first session)
 - Rescheduling pattern alerts (3+ reschedules in 7 days)
 - Scheduled email campaigns
+- Batched flush of ingested open/click events to Postgres
 """
 
 import logging
@@ -16,14 +17,16 @@ from sqlalchemy import and_, or_, func
 from sqlalchemy.orm import Session
 
 from src.workers.celery_app import celery_app
-from src.database.database import get_db
+from src.database.engines import get_sync_session
 from src.database.models import (
     Session as TutoringSession,
     StudentFeedback,
     Tutor,
     Student
 )
+from src.email_automation.email_event_ingestion import flush_email_events as flush_ingested_events
 from src.email_automation.email_template_engine import EmailTemplateType
+from src.queue.client import get_redis_client
 from src.email_automation.email_delivery_service import (
     EnhancedEmailService,
     EmailPriority,
@@ -57,7 +60,7 @@ def send_feedback_reminders(self: Task) -> Dict[str, Any]:
     """
     logger.info("Starting feedback reminder task...")
 
-    db: Session = next(get_db())
+    db: Session = get_sync_session()
     email_service = get_email_service_from_settings()
 
     try:
@@ -172,7 +175,7 @@ def send_first_session_checkins(self: Task) -> Dict[str, Any]:
     """
     logger.info("Starting first session check-in task...")
 
-    db: Session = next(get_db())
+    db: Session = get_sync_session()
     email_service = get_email_service_from_settings()
 
     try:
@@ -277,7 +280,7 @@ def send_rescheduling_alerts(self: Task) -> Dict[str, Any]:
     """
     logger.info("Starting rescheduling pattern alert task...")
 
-    db: Session = next(get_db())
+    db: Session = get_sync_session()
     email_service = get_email_service_from_settings()
 
     try:
@@ -405,7 +408,7 @@ def send_scheduled_campaigns(self: Task) -> Dict[str, Any]:
     """
     logger.info("Starting scheduled campaign task...")
 
-    db: Session = next(get_db())
+    db: Session = get_sync_session()
 
     try:
         # This would query email_campaigns table for scheduled campaigns
@@ -455,7 +458,7 @@ def send_weekly_digests(self: Task) -> Dict[str, Any]:
     """
     logger.info("Starting weekly digest task...")
 
-    db: Session = next(get_db())
+    db: Session = get_sync_session()
     email_service = get_email_service_from_settings()
 
     try:
@@ -497,6 +500,29 @@ def send_weekly_digests(self: Task) -> Dict[str, Any]:
 # UTILITY TASKS
 # ============================================================================
 
+@celery_app.task(name="email_workflows.flush_email_events")
+def flush_email_events(batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Copy open/click events ingested by the tracking endpoints to Postgres.
+
+    Args:
+        batch_size: Stream entries / dirty messages handled per batch
+
+    Returns:
+        Dictionary with flush results
+    """
+    db: Session = get_sync_session()
+
+    try:
+        stats = flush_ingested_events(get_redis_client().get_client(), db, batch_size=batch_size)
+        if stats['events_stored'] or stats['events_skipped']:
+            logger.info(f"Flushed email events: {stats}")
+        return stats
+
+    finally:
+        db.close()
+
+
 @celery_app.task(name="email_workflows.cleanup_old_tracking_events")
 def cleanup_old_tracking_events(days_to_keep: int = 90) -> Dict[str, Any]:
     """
@@ -510,7 +536,7 @@ def cleanup_old_tracking_events(days_to_keep: int = 90) -> Dict[str, Any]:
     """
     logger.info(f"Cleaning up email tracking events older than {days_to_keep} days...")
 
-    db: Session = next(get_db())
+    db: Session = get_sync_session()
 
     try:
         # This would delete from email_tracking_events table
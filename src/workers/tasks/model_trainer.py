@@ -31,6 +31,7 @@ from celery.exceptions import SoftTimeLimitExceeded
 
 # Import Celery app
 from ..celery_app import celery_app
+from ..runtime import run_async
 
 # Import database dependencies
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -255,8 +256,6 @@ def _fetch_training_data(lookback_days: int) -> Tuple[pd.DataFrame, pd.DataFrame
     Returns:
         Tuple of (tutors_df, sessions_df, feedback_df)
     """
-    import asyncio
-
     async def fetch_data():
         async with async_session_maker() as session:
             # Calculate date range
@@ -363,8 +362,7 @@ def _fetch_training_data(lookback_days: int) -> Tuple[pd.DataFrame, pd.DataFrame
 
             return tutors_df, sessions_df, feedback_df
 
-    # Run async function
-    return asyncio.run(fetch_data())
+    return run_async(fetch_data())
 
 
 def _engineer_features(
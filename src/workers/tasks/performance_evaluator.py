@@ -7,17 +7,24 @@ This module implements the scheduled performance evaluation worker that:
 3. Stores results in the database
 4. Handles batch processing for efficiency
 5. Implements retry logic and error handling
+
+Large tutor populations are split into chunks of perf_eval_batch_size that
+run in parallel as a Celery chord (evaluate_tutor_chunk tasks followed by
+summarize_performance_evaluation), so one run spreads over the batch workers
+instead of holding a single worker slot for the whole population.
 """
 
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
-from celery import Task
+from typing import List, Dict, Any, Optional, Tuple
+from celery import Task, chord
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..celery_app import celery_app
 from ..config import worker_settings
+from ..runtime import run_async
+from ..workloads import chunked
 from ...database.database import async_session_maker
 from ...database.models import (
     Tutor,
@@ -80,9 +87,23 @@ def evaluate_tutor_performance(self) -> Dict[str, Any]:
     }
 
     try:
-        # Use asyncio to run the async evaluation
-        import asyncio
-        result = asyncio.run(_evaluate_all_tutors_async())
+        chunks, result = run_async(_evaluate_or_split_async())
+
+        if result is None:
+            # Fan out: one task per chunk, summarized when all have finished
+            summary = chord(evaluate_tutor_chunk.s(chunk) for chunk in chunks)(
+                summarize_performance_evaluation.s(start_time.isoformat())
+            )
+            stats["tutors_dispatched"] = sum(len(chunk) for chunk in chunks)
+            stats["chunks_dispatched"] = len(chunks)
+            stats["summary_task_id"] = summary.id
+            stats["execution_time_seconds"] = (datetime.utcnow() - start_time).total_seconds()
+
+            logger.info(
+                f"Performance evaluation split into {len(chunks)} chunks "
+                f"({stats['tutors_dispatched']} tutors)"
+            )
+            return stats
 
         stats.update(result)
 
@@ -105,10 +126,93 @@ def evaluate_tutor_performance(self) -> Dict[str, Any]:
         raise
 
 
-async def _evaluate_all_tutors_async() -> Dict[str, Any]:
+@celery_app.task(
+    bind=True,
+    base=PerformanceEvaluatorTask,
+    name="src.workers.tasks.performance_evaluator.evaluate_tutor_chunk"
+)
+def evaluate_tutor_chunk(self, tutor_ids: List[str]) -> Dict[str, Any]:
+    """
+    Evaluate one chunk of a fanned-out performance evaluation.
+
+    Args:
+        tutor_ids: Tutors in this chunk
+
+    Returns:
+        Dictionary with evaluation statistics for the chunk
+    """
+    result = run_async(_evaluate_all_tutors_async(tutor_ids))
+    logger.info(
+        f"Evaluated chunk of {len(tutor_ids)} tutors: "
+        f"{result['tutors_successful']} successful, {result['tutors_failed']} failed"
+    )
+    return result
+
+
+@celery_app.task(
+    name="src.workers.tasks.performance_evaluator.summarize_performance_evaluation"
+)
+def summarize_performance_evaluation(
+    chunk_results: List[Dict[str, Any]],
+    started_at: str,
+) -> Dict[str, Any]:
+    """
+    Chord callback combining the chunk results of one evaluation run.
+
+    Args:
+        chunk_results: Results of the evaluate_tutor_chunk tasks
+        started_at: ISO timestamp of the run that dispatched the chunks
+
+    Returns:
+        Dictionary with execution statistics for the whole run
+    """
+    stats = {
+        "tutors_evaluated": sum(r["tutors_evaluated"] for r in chunk_results),
+        "tutors_successful": sum(r["tutors_successful"] for r in chunk_results),
+        "tutors_failed": sum(r["tutors_failed"] for r in chunk_results),
+        "chunks": len(chunk_results),
+        "timestamp": started_at,
+        "execution_time_seconds": (
+            datetime.utcnow() - datetime.fromisoformat(started_at)
+        ).total_seconds(),
+    }
+
+    logger.info(
+        f"Performance evaluation completed: "
+        f"{stats['tutors_successful']}/{stats['tutors_evaluated']} successful "
+        f"in {stats['chunks']} chunks, "
+        f"{stats['tutors_failed']} failed, "
+        f"took {stats['execution_time_seconds']:.2f}s"
+    )
+    return stats
+
+
+async def _evaluate_or_split_async() -> Tuple[List[List[str]], Optional[Dict[str, Any]]]:
+    """
+    Evaluate all active tutors inline, or split them into chunks.
+
+    Populations that fit in one batch are evaluated directly; anything larger
+    is returned as chunks for the caller to fan out.
+
+    Returns:
+        Tuple of (chunks of tutor IDs, evaluation stats or None if not evaluated)
+    """
+    async with async_session_maker() as session:
+        tutor_ids = await _get_active_tutor_ids(session)
+
+    chunks = chunked(tutor_ids, worker_settings.perf_eval_batch_size)
+    if len(chunks) > 1:
+        return chunks, None
+    return chunks, await _evaluate_all_tutors_async(tutor_ids)
+
+
+async def _evaluate_all_tutors_async(tutor_ids: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Async function to evaluate all active tutors.
 
+    Args:
+        tutor_ids: Restrict the evaluation to these tutors (default: all active)
+
     Returns:
         Dictionary with evaluation statistics
     """
@@ -122,7 +226,7 @@ async def _evaluate_all_tutors_async() -> Dict[str, Any]:
     async with async_session_maker() as session:
         try:
             # Fetch all active tutors
-            tutors = await _get_active_tutors(session)
+            tutors = await _get_active_tutors(session, tutor_ids)
             logger.info(f"Found {len(tutors)} active tutors to evaluate")
 
             if not tutors:
@@ -168,17 +272,42 @@ async def _evaluate_all_tutors_async() -> Dict[str, Any]:
             raise
 
 
-async def _get_active_tutors(session: AsyncSession) -> List[Tutor]:
+async def _get_active_tutors(
+    session: AsyncSession,
+    tutor_ids: Optional[List[str]] = None
+) -> List[Tutor]:
     """
     Fetch all active tutors from the database.
 
     Args:
         session: Database session
+        tutor_ids: Optional tutor IDs to restrict the query to
 
     Returns:
         List of active Tutor objects
     """
     query = select(Tutor).where(Tutor.status == TutorStatus.ACTIVE)
+    if tutor_ids is not None:
+        query = query.where(Tutor.tutor_id.in_(tutor_ids))
+    result = await session.execute(query)
+    return list(result.scalars().all())
+
+
+async def _get_active_tutor_ids(session: AsyncSession) -> List[str]:
+    """
+    Fetch the IDs of all active tutors, in a stable order for chunking.
+
+    Args:
+        session: Database session
+
+    Returns:
+        List of active tutor IDs
+    """
+    query = (
+        select(Tutor.tutor_id)
+        .where(Tutor.status == TutorStatus.ACTIVE)
+        .order_by(Tutor.tutor_id)
+    )
     result = await session.execute(query)
     return list(result.scalars().all())
 
@@ -275,8 +404,7 @@ def evaluate_single_tutor(self, tutor_id: str, window: str = "30day") -> Dict[st
     logger.info(f"Starting single tutor evaluation: {tutor_id} ({window} window)")
 
     try:
-        import asyncio
-        result = asyncio.run(_evaluate_single_tutor_async(tutor_id, window))
+        result = run_async(_evaluate_single_tutor_async(tutor_id, window))
 
         logger.info(
             f"Single tutor evaluation completed for {tutor_id}: "
@@ -5,20 +5,27 @@ Implements Celery Beat integration for automated report generation and delivery
 via email to operations managers. Part of Task 24.
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from io import BytesIO
 
 from src.workers.celery_app import celery_app
+from src.workers.runtime import run_async
+from src.api.config import settings
 from src.database.database import get_db_session
-from src.api.export_service import ExportService
-from src.api.email_service import EmailService
+from src.api.export_service import ExportService, export_file_name
+from src.api.export_storage import ExportStorage
+from src.api.email_service import get_email_service_from_settings
 from src.database.models import User, UserRole
 from sqlalchemy import select
 
 logger = logging.getLogger(__name__)
 
+# Report emails sent at once (each holds an SMTP connection)
+REPORT_EMAIL_CONCURRENCY = 5
+
 
 @celery_app.task(name="scheduled_reports.generate_weekly_report")
 def generate_weekly_report():
@@ -138,6 +145,125 @@ def generate_churn_analytics_report():
         raise
 
 
+@celery_app.task(name="scheduled_reports.generate_export_file")
+def generate_export_file(
+    export_id: str,
+    report_type: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    tutor_ids: Optional[List[str]] = None,
+    status_filter: Optional[str] = None,
+    compress: bool = False,
+):
+    """
+    Write a large CSV export to export storage for later (resumable) download.
+
+    Triggered on demand by the reports API. The task ID is the export ID.
+
+    Args:
+        export_id: Export ID (also the Celery task ID)
+        report_type: "tutor_performance" or "intervention_history"
+        start_date: Optional ISO start date
+        end_date: Optional ISO end date
+        tutor_ids: Optional tutor IDs (tutor performance only)
+        status_filter: Optional intervention status value (interventions only)
+        compress: Gzip-compress the file
+    """
+    from src.database.models import InterventionStatus
+
+    logger.info(f"Starting background export {export_id} ({report_type})")
+
+    start = datetime.fromisoformat(start_date) if start_date else None
+    end = datetime.fromisoformat(end_date) if end_date else None
+    name = export_file_name(export_id, compress)
+    storage = ExportStorage()
+
+    async def _generate():
+        async with get_db_session() as db:
+            export_service = ExportService(db)
+            if report_type == "tutor_performance":
+                chunks = export_service.stream_tutor_performance_csv(
+                    start_date=start, end_date=end, tutor_ids=tutor_ids, compress=compress
+                )
+            elif report_type == "intervention_history":
+                chunks = export_service.stream_interventions_csv(
+                    start_date=start,
+                    end_date=end,
+                    status_filter=InterventionStatus(status_filter) if status_filter else None,
+                    compress=compress,
+                )
+            else:
+                raise ValueError(f"Unsupported export report type: {report_type}")
+            return await storage.write(chunks, name)
+
+    try:
+        size = run_async(_generate())
+        logger.info(f"Background export {export_id} complete ({size} bytes)")
+        return {
+            "status": "success",
+            "export_id": export_id,
+            "filename": name.rsplit("/", 1)[-1],
+            "size_bytes": size,
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to generate export {export_id}: {e}", exc_info=True)
+        raise
+
+
+@celery_app.task(name="scheduled_reports.generate_gdpr_export")
+def generate_gdpr_export(export_id: str):
+    """
+    Build a user's GDPR data export archive (Article 15/20).
+
+    Triggered on demand by the GDPR API, and re-run to resume an interrupted
+    export: sections finished by an earlier attempt are not exported again.
+
+    Args:
+        export_id: Export ID (job created with ExportJob.create)
+    """
+    from src.api.compliance.gdpr_export import ExportJob, GDPRExporter
+
+    job = ExportJob(export_id)
+    if job.manifest is None:
+        logger.error(f"GDPR export {export_id} not found (expired or never created)")
+        return {"status": "failed", "export_id": export_id, "error": "Export job not found"}
+
+    logger.info(f"Starting GDPR export {export_id} for user {job.manifest['user_id']}")
+
+    try:
+        archive = run_async(GDPRExporter().run(job))
+        size = job.storage.size(archive)
+        logger.info(f"GDPR export {export_id} complete ({size} bytes)")
+        return {
+            "status": "success",
+            "export_id": export_id,
+            "filename": job.archive_filename,
+            "size_bytes": size,
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to generate GDPR export {export_id}: {e}", exc_info=True)
+        raise
+
+
+@celery_app.task(name="scheduled_reports.cleanup_expired_exports")
+def cleanup_expired_exports():
+    """
+    Delete background export files past settings.export_retention_hours.
+
+    Covers report exports and GDPR export archives (which contain personal
+    data). Triggered by Celery Beat every hour.
+    """
+    try:
+        deleted = ExportStorage().delete_expired(timedelta(hours=settings.export_retention_hours))
+        return {"status": "success", "files_deleted": deleted}
+
+    except Exception as e:
+        logger.error(f"Failed to clean up expired exports: {e}", exc_info=True)
+        raise
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -157,8 +283,6 @@ def _send_performance_report(
         end_date: End date for report data
         subject: Email subject line
     """
-    import asyncio
-
     async def _generate_and_send():
         async with get_db_session() as db:
             # Generate CSV report
@@ -181,9 +305,6 @@ def _send_performance_report(
                 logger.warning("No operations manager emails found for report delivery")
                 return
 
-            # Send email with attachments
-            email_service = EmailService()
-
             email_body = f"""
 <html>
 <body>
@@ -226,21 +347,9 @@ def _send_performance_report(
                 }
             ]
 
-            # Send to each recipient
-            for recipient in recipients:
-                try:
-                    await email_service.send_email(
-                        to_email=recipient,
-                        subject=subject,
-                        html_body=email_body,
-                        attachments=attachments
-                    )
-                    logger.info(f"Sent {report_type} report to {recipient}")
-                except Exception as e:
-                    logger.error(f"Failed to send report to {recipient}: {e}")
+            await _deliver_report(recipients, subject, email_body, attachments, f"{report_type} report")
 
-    # Run async function
-    asyncio.run(_generate_and_send())
+    run_async(_generate_and_send())
 
 
 def _send_intervention_report(
@@ -256,8 +365,6 @@ def _send_intervention_report(
         end_date: End date for report data
         subject: Email subject line
     """
-    import asyncio
-
     async def _generate_and_send():
         async with get_db_session() as db:
             # Generate CSV report
@@ -274,9 +381,6 @@ def _send_intervention_report(
                 logger.warning("No operations manager emails found for intervention report")
                 return
 
-            # Send email with attachment
-            email_service = EmailService()
-
             email_body = f"""
 <html>
 <body>
@@ -308,20 +412,9 @@ def _send_intervention_report(
                 "mimetype": "text/csv"
             }]
 
-            # Send to each recipient
-            for recipient in recipients:
-                try:
-                    await email_service.send_email(
-                        to_email=recipient,
-                        subject=subject,
-                        html_body=email_body,
-                        attachments=attachments
-                    )
-                    logger.info(f"Sent intervention report to {recipient}")
-                except Exception as e:
-                    logger.error(f"Failed to send intervention report to {recipient}: {e}")
+            await _deliver_report(recipients, subject, email_body, attachments, "intervention report")
 
-    asyncio.run(_generate_and_send())
+    run_async(_generate_and_send())
 
 
 def _send_churn_report(
@@ -337,8 +430,6 @@ def _send_churn_report(
         end_date: End date for report data
         subject: Email subject line
     """
-    import asyncio
-
     async def _generate_and_send():
         async with get_db_session() as db:
             # Generate PDF report with analytics summary
@@ -355,9 +446,6 @@ def _send_churn_report(
                 logger.warning("No operations manager emails found for churn report")
                 return
 
-            # Send email with attachment
-            email_service = EmailService()
-
             email_body = f"""
 <html>
 <body>
@@ -389,20 +477,59 @@ def _send_churn_report(
                 "mimetype": "application/pdf"
             }]
 
-            # Send to each recipient
-            for recipient in recipients:
-                try:
-                    await email_service.send_email(
-                        to_email=recipient,
-                        subject=subject,
-                        html_body=email_body,
-                        attachments=attachments
-                    )
-                    logger.info(f"Sent churn analytics report to {recipient}")
-                except Exception as e:
-                    logger.error(f"Failed to send churn report to {recipient}: {e}")
-
-    asyncio.run(_generate_and_send())
+            await _deliver_report(recipients, subject, email_body, attachments, "churn analytics report")
+
+    run_async(_generate_and_send())
+
+
+async def _deliver_report(
+    recipients: List[str],
+    subject: str,
+    html_body: str,
+    attachments: List[Dict[str, Any]],
+    label: str,
+) -> int:
+    """
+    Email a report to all recipients concurrently.
+
+    SMTP delivery is blocking, so each message is sent from a worker thread;
+    at most REPORT_EMAIL_CONCURRENCY connections are open at once.
+
+    Args:
+        recipients: Recipient email addresses
+        subject: Email subject line
+        html_body: HTML email body
+        attachments: Report files (filename, content, mimetype)
+        label: Report name for logging
+
+    Returns:
+        Number of recipients the report was delivered to
+    """
+    email_service = get_email_service_from_settings()
+    if email_service is None:
+        logger.warning(f"SMTP not configured - {label} not sent")
+        return 0
+
+    semaphore = asyncio.Semaphore(REPORT_EMAIL_CONCURRENCY)
+
+    async def _send(recipient: str) -> bool:
+        async with semaphore:
+            return await asyncio.to_thread(
+                email_service.send_report, recipient, subject, html_body, attachments
+            )
+
+    results = await asyncio.gather(*(_send(r) for r in recipients), return_exceptions=True)
+
+    sent = 0
+    for recipient, result in zip(recipients, results):
+        if result is True:
+            sent += 1
+            logger.info(f"Sent {label} to {recipient}")
+        elif isinstance(result, Exception):
+            logger.error(f"Failed to send {label} to {recipient}: {result}")
+        else:
+            logger.error(f"Failed to send {label} to {recipient}")
+    return sent
 
 
 async def _get_operations_manager_emails(db) -> List[str]:
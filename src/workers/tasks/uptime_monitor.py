@@ -11,6 +11,7 @@ from datetime import datetime
 from src.workers.celery_app import celery_app
 from src.workers.utils.async_helper import run_async_task
 from src.api.uptime_service import get_uptime_monitor
+from src.api.sla_tracking_service import get_sla_tracking_service
 
 logger = logging.getLogger(__name__)
 
@@ -219,51 +220,87 @@ def check_sla_compliance(self, hours: int = 24):
 )
 def cleanup_old_health_checks(self, days_to_keep: int = 30):
     """
-    Clean up old health check records from database.
+    Compact health check data after it has been rolled up.
 
-    Keeps only the most recent data to prevent database bloat.
+    Successful raw checks are dropped once they are older than a day (they
+    are counted in the minute/hour rollups), failed checks are kept as
+    incidents for ``days_to_keep`` days, and old rollups are pruned.
 
     Args:
-        days_to_keep: Number of days of data to retain (default: 30)
+        days_to_keep: Number of days of incident records to retain (default: 30)
 
     Returns:
         Dict with cleanup results
     """
     try:
-        from datetime import timedelta
-        from sqlalchemy import select, delete
-        from src.database.models import ServiceHealthCheck
-        from src.database.database import get_db_session
-
-        logger.info(f"Cleaning up health check records older than {days_to_keep} days")
+        logger.info(f"Compacting health checks (incidents kept {days_to_keep} days)")
 
         async def _cleanup():
-            cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
+            uptime_monitor = get_uptime_monitor()
+            return await uptime_monitor.compact_health_checks(incident_retention_days=days_to_keep)
 
-            async with get_db_session() as session:
-                # Delete old records
-                stmt = delete(ServiceHealthCheck).where(
-                    ServiceHealthCheck.checked_at < cutoff_date
-                )
-                result = await session.execute(stmt)
-                await session.commit()
+        deleted = run_async_task(_cleanup())
+        deleted_count = sum(deleted.values())
+
+        logger.info(f"Cleanup completed: deleted {deleted_count} health check rows ({deleted})")
+
+        return {
+            "success": True,
+            "deleted_count": deleted_count,
+            "deleted": deleted,
+            "cutoff_days": days_to_keep,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to cleanup old health checks: {e}", exc_info=True)
+        return {
+            "success": False,
+            "error": str(e),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+
+@celery_app.task(
+    name="src.workers.tasks.uptime_monitor.compact_api_response_times",
+    bind=True,
+)
+def compact_api_response_times(self, days_to_keep: int = 30):
+    """
+    Compact API response time data after it has been histogrammed.
+
+    Raw SLA violation rows are kept for ``days_to_keep`` days; old minute
+    and hour latency histograms are pruned.
+
+    Args:
+        days_to_keep: Number of days of violation records to retain (default: 30)
 
-                deleted_count = result.rowcount
-                return deleted_count
+    Returns:
+        Dict with cleanup results
+    """
+    try:
+        logger.info(f"Compacting API response times (violations kept {days_to_keep} days)")
 
-        deleted_count = run_async_task(_cleanup())
+        async def _cleanup():
+            return await get_sla_tracking_service().compact_api_response_times(
+                violation_retention_days=days_to_keep
+            )
 
-        logger.info(f"Cleanup completed: deleted {deleted_count} old health check records")
+        deleted = run_async_task(_cleanup())
+        deleted_count = sum(deleted.values())
+
+        logger.info(f"Cleanup completed: deleted {deleted_count} API response time rows ({deleted})")
 
         return {
             "success": True,
             "deleted_count": deleted_count,
+            "deleted": deleted,
             "cutoff_days": days_to_keep,
             "timestamp": datetime.utcnow().isoformat(),
         }
 
     except Exception as e:
-        logger.error(f"Failed to cleanup old health checks: {e}", exc_info=True)
+        logger.error(f"Failed to compact API response times: {e}", exc_info=True)
         return {
             "success": False,
             "error": str(e),
@@ -4,15 +4,18 @@ Async Helper Utilities for Celery Tasks
 This module provides utilities to safely run async code in Celery tasks
 on macOS where asyncio.run() causes SIGSEGV in forked workers.
 
-The solution creates a new event loop for each task execution, which is
-safe in forked processes.
+Coroutines run on the worker process's persistent event loop
+(src.workers.runtime), which is started in each forked child rather than
+inherited, so they are safe in forked processes and reuse pooled connections
+between tasks.
 """
 
-import asyncio
 import logging
 from typing import Coroutine, TypeVar, Any
 from functools import wraps
 
+from src.workers.runtime import run_async
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -22,9 +25,9 @@ def run_async_task(coro: Coroutine[Any, Any, T]) -> T:
     """
     Safely run an async coroutine in a Celery task.
 
-    This function creates a new event loop for each execution, which is
-    safe in forked worker processes on macOS. It avoids the SIGSEGV issue
-    caused by asyncio.run() in forked processes.
+    The coroutine runs on the process's shared worker loop, which is safe in
+    forked worker processes on macOS. It avoids the SIGSEGV issue caused by
+    asyncio.run() in forked processes.
 
     Args:
         coro: The coroutine to run
@@ -41,29 +44,7 @@ def run_async_task(coro: Coroutine[Any, Any, T]) -> T:
             result = run_async_task(do_work())
             return result
     """
-    # Create a new event loop for this task
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        # Run the coroutine
-        result = loop.run_until_complete(coro)
-        return result
-    finally:
-        # Clean up the loop
-        try:
-            # Cancel any remaining tasks
-            pending = asyncio.all_tasks(loop)
-            for task in pending:
-                task.cancel()
-
-            # Run the loop one more time to process cancellations
-            if pending:
-                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-        except Exception as e:
-            logger.warning(f"Error cleaning up event loop: {e}")
-        finally:
-            loop.close()
+    return run_async(coro)
 
 
 def celery_async_task(func):
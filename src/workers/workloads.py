@@ -0,0 +1,152 @@
+"""
+Workload classes for TutorMax Celery tasks.
+
+Tasks are routed to queues by how they behave, and each queue is consumed by a
+worker profile tuned for that behaviour:
+
+- realtime: minute-level monitoring and alerting (seconds, I/O-bound)
+- io:       email workflows and other small tasks (I/O-bound)
+- batch:    tutor-population evaluation, data generation and reports
+            (CPU/DB, split into chunks)
+- ml:       churn prediction and model training (CPU-heavy, up to an hour)
+
+Short tasks therefore never wait behind a training run. Long jobs run with
+prefetch 1 so a worker only reserves the task it is executing (tasks are
+acknowledged late, after completion, via task_acks_late in celery_app).
+
+I/O profiles use the threads pool rather than gevent: the email tasks use
+psycopg2 and the monitors run asyncio loops, both of which would block
+gevent's hub.
+
+Start a worker for a profile with:
+    python scripts/deployment/run_worker_profile.py <profile>
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from kombu import Exchange, Queue
+
+
+# ============================================================================
+# Queues and Routing
+# ============================================================================
+
+QUEUE_NAMES = (
+    "realtime",
+    "default",
+    "email",
+    "evaluation",
+    "data_generation",
+    "reports",
+    "prediction",
+    "training",
+)
+
+TASK_QUEUES = tuple(
+    Queue(name, Exchange(name), routing_key=name) for name in QUEUE_NAMES
+)
+
+# Task names are matched as glob patterns, first match wins
+TASK_ROUTES = {
+    "src.workers.tasks.uptime_monitor.record_health_checks": {"queue": "realtime"},
+    "src.workers.tasks.alerting.*": {"queue": "realtime"},
+    "src.workers.tasks.uptime_monitor.*": {"queue": "default"},
+    "email_workflows.*": {"queue": "email"},
+    "data_generator.*": {"queue": "data_generation"},
+    "compliance.*": {"queue": "data_generation"},
+    "src.workers.tasks.performance_evaluator.*": {"queue": "evaluation"},
+    "scheduled_reports.*": {"queue": "reports"},
+    "src.workers.tasks.churn_predictor.*": {"queue": "prediction"},
+    "src.workers.tasks.model_trainer.*": {"queue": "training"},
+}
+
+
+# ============================================================================
+# Worker Profiles
+# ============================================================================
+
+@dataclass(frozen=True)
+class WorkerProfile:
+    """Pool, concurrency and prefetch settings for one workload class."""
+
+    name: str
+    queues: Tuple[str, ...]
+    pool: str
+    concurrency: int
+    prefetch_multiplier: int
+    max_tasks_per_child: Optional[int] = None
+    description: str = ""
+    extra_args: Tuple[str, ...] = field(default_factory=tuple)
+
+    def worker_args(self, concurrency: Optional[int] = None) -> List[str]:
+        """Arguments for `celery -A src.workers.celery_app worker`."""
+        args = [
+            f"--queues={','.join(self.queues)}",
+            f"--pool={self.pool}",
+            f"--concurrency={concurrency or self.concurrency}",
+            f"--prefetch-multiplier={self.prefetch_multiplier}",
+            f"--hostname={self.name}@%h",
+        ]
+        if self.max_tasks_per_child:
+            args.append(f"--max-tasks-per-child={self.max_tasks_per_child}")
+        return args + list(self.extra_args)
+
+
+WORKER_PROFILES: Dict[str, WorkerProfile] = {
+    "realtime": WorkerProfile(
+        name="realtime",
+        queues=("realtime",),
+        pool="threads",
+        concurrency=8,
+        prefetch_multiplier=4,
+        description="Minute-level health checks and alert evaluation",
+    ),
+    "io": WorkerProfile(
+        name="io",
+        queues=("email", "default"),
+        pool="threads",
+        concurrency=16,
+        prefetch_multiplier=4,
+        description="Email workflows and small I/O-bound tasks",
+    ),
+    "batch": WorkerProfile(
+        name="batch",
+        queues=("evaluation", "data_generation", "reports"),
+        pool="prefork",
+        concurrency=os.cpu_count() or 2,
+        prefetch_multiplier=1,
+        max_tasks_per_child=1000,
+        description="Chunked tutor evaluation, data generation and reports",
+    ),
+    "ml": WorkerProfile(
+        name="ml",
+        queues=("prediction", "training"),
+        pool="prefork",
+        concurrency=2,
+        prefetch_multiplier=1,
+        max_tasks_per_child=10,  # Model training holds a lot of memory
+        description="Churn prediction chunks and model training",
+    ),
+}
+
+
+def get_profile(name: str) -> WorkerProfile:
+    """
+    Look up a worker profile by name.
+
+    Raises:
+        ValueError: If the profile does not exist
+    """
+    try:
+        return WORKER_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown worker profile '{name}'. Available: {', '.join(WORKER_PROFILES)}"
+        )
+
+
+def chunked(items: List, size: int) -> List[List]:
+    """Split a list into consecutive chunks of at most `size` items."""
+    return [items[i:i + size] for i in range(0, len(items), max(1, size))]
@@ -0,0 +1,186 @@
+"""
+Unit tests for the cohort percentile index.
+
+Tests sketch construction, binary-search percentile ranks against the
+linear-scan definition, serialization, and cache-backed lookups.
+"""
+
+import random
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+from src.database.models import PerformanceTier
+from src.evaluation.cohort_percentiles import (
+    CohortPercentileIndex,
+    CohortPercentileSketch,
+    build_cohort_sketches,
+    cohort_key,
+    cohort_start_for,
+)
+
+
+def linear_percentile(value, all_values):
+    """Reference implementation previously used by the peer comparison endpoint."""
+    if not all_values or value is None:
+        return 50
+    sorted_values = sorted(all_values)
+    rank = sum(1 for v in sorted_values if v < value)
+    return int((rank / len(sorted_values)) * 100)
+
+
+def make_row(onboarding_date, avg_rating=4.5, sessions=20, engagement=7.5, tier=PerformanceTier.STRONG):
+    return {
+        "onboarding_date": onboarding_date,
+        "performance_tier": tier,
+        "avg_rating": avg_rating,
+        "sessions_completed": sessions,
+        "engagement_score": engagement,
+    }
+
+
+class TestCohortStart:
+    """Test cohort boundary helpers."""
+
+    def test_cohort_start_is_month_start(self):
+        start = cohort_start_for(datetime(2025, 3, 17, 14, 30, tzinfo=timezone.utc))
+        assert start == datetime(2025, 3, 1, tzinfo=timezone.utc)
+        assert cohort_key(start) == "2025-03"
+
+    def test_naive_dates_treated_as_utc(self):
+        start = cohort_start_for(datetime(2025, 3, 17))
+        assert start.tzinfo is not None
+
+
+class TestBuildCohortSketches:
+    """Test sketch construction from latest-metric rows."""
+
+    def test_percentiles_match_linear_scan(self):
+        rng = random.Random(42)
+        rows = [
+            make_row(
+                datetime(2025, 1, rng.randint(1, 28), tzinfo=timezone.utc),
+                avg_rating=round(rng.uniform(3.0, 5.0), 1),
+                sessions=rng.randint(0, 60),
+                engagement=round(rng.uniform(5.0, 10.0), 2),
+            )
+            for _ in range(200)
+        ]
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        sketch = build_cohort_sketches(rows)[cohort_key(start)]
+
+        for metric in ("avg_rating", "sessions_completed", "engagement_score"):
+            all_values = [r[metric] for r in rows if r[metric]]
+            for row in rows[:50]:
+                assert sketch.percentile_rank(metric, row[metric]) == linear_percentile(
+                    row[metric], all_values
+                )
+
+    def test_cohort_spans_ninety_days(self):
+        rows = [
+            make_row(datetime(2025, 1, 5, tzinfo=timezone.utc)),
+            make_row(datetime(2025, 3, 20, tzinfo=timezone.utc)),
+            make_row(datetime(2025, 4, 15, tzinfo=timezone.utc)),
+        ]
+        sketches = build_cohort_sketches(rows)
+
+        assert sketches["2025-01"].size == 2
+        assert sketches["2025-03"].size == 2
+        assert sketches["2025-04"].size == 1
+
+    def test_missing_and_zero_values_excluded(self):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        rows = [
+            make_row(start, avg_rating=None, sessions=0),
+            make_row(start, avg_rating=4.0, sessions=10),
+        ]
+        sketch = build_cohort_sketches(rows)["2025-01"]
+
+        assert sketch.size == 2
+        assert sketch.values["avg_rating"].tolist() == [4.0]
+        assert sketch.values["sessions_completed"].tolist() == [10.0]
+
+    def test_tier_distribution(self):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        rows = [
+            make_row(start, tier=PerformanceTier.EXEMPLARY),
+            make_row(start, tier=PerformanceTier.EXEMPLARY),
+            make_row(start, tier=PerformanceTier.AT_RISK),
+            make_row(start, tier=None),
+        ]
+        distribution = build_cohort_sketches(rows)["2025-01"].tier_distribution()
+
+        assert distribution["Exemplary"] == 50
+        assert distribution["At Risk"] == 25
+        assert distribution["Developing"] == 25
+        assert distribution["Strong"] == 0
+
+    def test_empty_rows(self):
+        assert build_cohort_sketches([]) == {}
+
+
+class TestCohortPercentileSketch:
+    """Test sketch lookups and serialization."""
+
+    def test_roundtrip(self):
+        start = datetime(2025, 2, 1, tzinfo=timezone.utc)
+        rows = [make_row(start, avg_rating=r) for r in (3.5, 4.0, 4.5, 4.9)]
+        sketch = build_cohort_sketches(rows)["2025-02"]
+
+        restored = CohortPercentileSketch.from_dict(sketch.to_dict())
+
+        assert restored.size == sketch.size
+        assert restored.cohort_start == sketch.cohort_start
+        assert restored.tier_counts == sketch.tier_counts
+        assert restored.values["avg_rating"].tolist() == [3.5, 4.0, 4.5, 4.9]
+        assert restored.percentile_rank("avg_rating", 4.5) == 50
+
+    def test_no_data_defaults_to_median(self):
+        sketch = CohortPercentileSketch(
+            cohort_start=datetime(2025, 2, 1, tzinfo=timezone.utc), size=0
+        )
+        assert sketch.percentile_rank("avg_rating", 4.5) == 50
+        assert sketch.percentile_rank("avg_rating", None) == 50
+
+
+class TestCohortPercentileIndex:
+    """Test cache-backed index lookups."""
+
+    @pytest.mark.asyncio
+    async def test_get_or_build_uses_cache(self):
+        start = datetime(2025, 2, 1, tzinfo=timezone.utc)
+        sketch = build_cohort_sketches([make_row(start)])["2025-02"]
+
+        cache = Mock()
+        cache.get_cohort_percentiles = AsyncMock(return_value=sketch.to_dict())
+        cache.cache_cohort_percentiles = AsyncMock(return_value=True)
+        session = Mock()
+        session.execute = AsyncMock()
+
+        result = await CohortPercentileIndex(cache).get_or_build(session, start)
+
+        assert result.size == 1
+        session.execute.assert_not_called()
+        cache.cache_cohort_percentiles.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_or_build_builds_on_miss(self):
+        start = datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+        cache = Mock()
+        cache.get_cohort_percentiles = AsyncMock(return_value=None)
+        cache.cache_cohort_percentiles = AsyncMock(return_value=True)
+
+        mappings = Mock()
+        mappings.all.return_value = [make_row(start), make_row(start, avg_rating=3.9)]
+        result = Mock()
+        result.mappings.return_value = mappings
+        session = Mock()
+        session.execute = AsyncMock(return_value=result)
+
+        sketch = await CohortPercentileIndex(cache).get_or_build(session, start)
+
+        assert sketch.size == 2
+        session.execute.assert_awaited_once()
+        cache.cache_cohort_percentiles.assert_awaited_once()
+        assert cache.cache_cohort_percentiles.call_args[0][0] == "2025-02"
@@ -152,6 +152,47 @@ class TestChurnDataGenerator:
             tutors_loaded = pd.read_csv(Path(tmpdir, "tutors.csv"))
             assert len(tutors_loaded) == len(tutors_df)
 
+    def test_typed_frames(self):
+        """Test frames come back with categorical and downcast dtypes."""
+        config = ChurnConfig(num_tutors=30, days_history=14, seed=42)
+
+        tutors_df, sessions_df, feedback_df = ChurnDataGenerator(config).generate_historical_data()
+
+        assert isinstance(sessions_df["tutor_id"].dtype, pd.CategoricalDtype)
+        assert isinstance(sessions_df["subject"].dtype, pd.CategoricalDtype)
+        assert sessions_df["engagement_score"].dtype == "float32"
+        assert sessions_df["late_start_minutes"].dtype == "int8"
+        assert pd.api.types.is_datetime64_any_dtype(sessions_df["scheduled_start"])
+        assert feedback_df["overall_rating"].dtype == "int8"
+        assert isinstance(tutors_df["behavioral_archetype"].dtype, pd.CategoricalDtype)
+
+        # would_recommend is only set for first sessions
+        first = feedback_df["is_first_session"]
+        assert feedback_df.loc[first, "would_recommend"].notna().all()
+        assert feedback_df.loc[~first, "would_recommend"].isna().all()
+
+    def test_churners_stop_at_churn_day(self):
+        """Test churners have no sessions from their churn day on."""
+        config = ChurnConfig(num_tutors=60, days_history=45, churn_rate=0.3, seed=7)
+
+        generator = ChurnDataGenerator(config)
+        tutors_df, sessions_df, _ = generator.generate_historical_data()
+
+        start = sessions_df["scheduled_start"].min().normalize()
+        last_day = sessions_df.groupby("tutor_id", observed=True)["scheduled_start"].max()
+        for tutor in tutors_df[tutors_df["will_churn"]].itertuples():
+            if tutor.tutor_id in last_day.index:
+                assert (last_day[tutor.tutor_id] - start).days < tutor.churn_day
+
+    def test_deterministic_for_seed(self):
+        """Test the same seed produces the same sessions."""
+        config = ChurnConfig(num_tutors=20, days_history=10, seed=3)
+
+        _, first, _ = ChurnDataGenerator(config).generate_historical_data()
+        _, second, _ = ChurnDataGenerator(config).generate_historical_data()
+
+        pd.testing.assert_frame_equal(first, second)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -9,10 +9,14 @@ Tests the complete notification workflow:
 - Batch processing
 """
 
+import smtplib
 import pytest
+from dataclasses import replace
 from datetime import datetime
+from unittest.mock import MagicMock, patch
 
 from src.evaluation.notification_service import (
+    AsyncEmailSender,
     NotificationService,
     EmailConfig,
     NotificationConfig,
@@ -497,6 +501,134 @@ class TestEndToEndIntegration:
         assert result["total_notifications_sent"] > 0
 
 
+# ============================================================================
+# BATCH PIPELINE TESTS
+# ============================================================================
+
+class TestBatchPipeline:
+    """Test the staged batch pipeline and concurrent email delivery."""
+
+    def test_stage_metrics(self, orchestrator, sample_tutor_state, critical_risk_tutor):
+        """Test that every stage reports its throughput."""
+        result = orchestrator.batch_evaluate_and_notify(
+            tutors=[(sample_tutor_state, "john.doe@example.com"), (critical_risk_tutor, "alice@example.com")],
+            create_interventions=False
+        )
+
+        assert set(result["stages"]) == {"evaluate", "render", "dispatch"}
+        assert result["stages"]["evaluate"]["items"] == 2
+        for stage in result["stages"].values():
+            assert stage["seconds"] >= 0
+            assert stage["items_per_second"] >= 0
+
+    def test_staff_notifications_grouped_into_digests(self, orchestrator, critical_risk_tutor):
+        """Test that notifications for the same recipient share one email."""
+        tutors = [
+            (replace(critical_risk_tutor, tutor_id=f"T{i:03d}"), f"tutor{i}@example.com")
+            for i in range(5)
+        ]
+
+        result = orchestrator.batch_evaluate_and_notify(tutors=tutors, create_interventions=False)
+
+        queue = orchestrator.notification_service.get_notification_queue()
+        assert len(queue) == result["total_triggers"]
+        assert result["email_digests"] == len({n["recipient_email"] for n in queue})
+        assert result["email_digests"] < result["total_triggers"]
+        assert result["total_notifications_sent"] == result["total_triggers"]
+        assert all(n["status"] == "sent" for n in queue)
+
+    def test_digest_content(self, notification_service, sample_intervention, sample_tutor_state):
+        """Test that a digest combines every notification for the recipient."""
+        records = [
+            notification_service.build_notification_record(
+                sample_intervention, replace(sample_tutor_state, tutor_name=name), "t@example.com"
+            )
+            for name in ("Maria Lopez", "Sam Chen")
+        ]
+
+        digest = notification_service.build_digest(records)
+
+        assert digest["to_email"] == "t@example.com"
+        assert digest["subject"].startswith("2 TutorMax notifications")
+        assert "Hi Maria" in digest["body_text"]
+        assert "Hi Sam" in digest["body_text"]
+        assert notification_service.build_digest(records[:1])["subject"] == records[0]["subject"]
+
+    def test_bulk_intervention_insert(self, critical_risk_tutor):
+        """Test that interventions for the whole batch are committed once."""
+        db_session = MagicMock()
+        orchestrator = create_orchestrator(db_session=db_session, enable_email=False)
+        tutors = [(replace(critical_risk_tutor, tutor_id=f"T{i:03d}"), "t@example.com") for i in range(3)]
+
+        with patch("src.api.tutor_profile_service.invalidate_tutor_profiles_sync") as invalidate:
+            result = orchestrator.batch_evaluate_and_notify(
+                tutors=tutors, send_notifications=False
+            )
+
+        assert result["total_interventions_created"] == result["total_triggers"]
+        db_session.add_all.assert_called_once()
+        assert len(db_session.add_all.call_args[0][0]) == result["total_triggers"]
+        db_session.commit.assert_called_once()
+        invalidate.assert_called_once()
+        assert sorted(invalidate.call_args[0][0]) == ["T000", "T001", "T002"]
+
+
+class TestAsyncEmailSender:
+    """Test bounded-concurrency SMTP delivery."""
+
+    @staticmethod
+    def _messages(count):
+        return [
+            {"to_email": f"user{i}@example.com", "subject": f"Subject {i}", "body_text": "Body"}
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reuses_bounded_connections(self):
+        """Test that at most max_concurrency connections send all messages."""
+        with patch("src.evaluation.notification_service.smtplib.SMTP") as smtp:
+            sender = AsyncEmailSender(EmailConfig(), max_concurrency=3)
+            results = await sender.send_all(self._messages(20))
+
+        assert results == [True] * 20
+        assert smtp.call_count <= 3
+        assert smtp.return_value.send_message.call_count == 20
+        assert smtp.return_value.quit.call_count == smtp.call_count
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_disconnect(self):
+        """Test that a dropped connection is replaced and the message retried."""
+        with patch("src.evaluation.notification_service.smtplib.SMTP") as smtp:
+            smtp.return_value.send_message.side_effect = [smtplib.SMTPServerDisconnected(), None, None]
+            sender = AsyncEmailSender(EmailConfig(), max_concurrency=1)
+            results = await sender.send_all(self._messages(2))
+
+        assert results == [True, True]
+        assert smtp.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_message_does_not_stop_batch(self):
+        """Test that a rejected message is reported without failing the others."""
+        with patch("src.evaluation.notification_service.smtplib.SMTP") as smtp:
+            smtp.return_value.send_message.side_effect = [
+                smtplib.SMTPRecipientsRefused({}), None, None
+            ]
+            sender = AsyncEmailSender(EmailConfig(), max_concurrency=1)
+            results = await sender.send_all(self._messages(3))
+
+        assert results == [False, True, True]
+
+    @pytest.mark.asyncio
+    async def test_disabled_email(self):
+        """Test that disabled email reports success without connecting."""
+        with patch("src.evaluation.notification_service.smtplib.SMTP") as smtp:
+            sender = AsyncEmailSender(EmailConfig(enabled=False))
+            results = await sender.send_all(self._messages(2))
+
+        assert results == [True, True]
+        smtp.assert_not_called()
+
+
 # ============================================================================
 # ERROR HANDLING TESTS
 # ============================================================================
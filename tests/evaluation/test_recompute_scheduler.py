@@ -0,0 +1,244 @@
+"""
+Tests for the distributed metrics recompute scheduler.
+
+Scheduler tests run the Lua scripts against Redis and are skipped when it is
+not reachable. Worker and calculator tests use mocks.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+import redis
+
+from src.database.models import MetricWindow
+from src.evaluation.metrics_update_worker import MetricsUpdateWorker
+from src.evaluation.performance_calculator import PerformanceCalculator
+from src.evaluation.recompute_scheduler import RecomputeScheduler
+from src.queue.client import RedisClient
+
+
+@pytest.fixture
+def redis_client():
+    """Connected Redis client, or skip when Redis is not running."""
+    client = RedisClient()
+    try:
+        client.connect()
+    except redis.ConnectionError:
+        pytest.skip("Redis not available")
+    yield client
+    client.disconnect()
+
+
+@pytest.fixture
+def key_prefix(redis_client):
+    """Unique key prefix per test, removed afterwards."""
+    prefix = f"test:recompute:{uuid.uuid4().hex[:8]}"
+    yield prefix
+    client = redis_client.get_client()
+    for suffix in ("due", "first_seen", "leases", "claimed"):
+        client.delete(f"{prefix}:{suffix}")
+
+
+def make_scheduler(redis_client, key_prefix, **kwargs):
+    kwargs.setdefault("debounce_seconds", 30)
+    kwargs.setdefault("lease_seconds", 60)
+    return RecomputeScheduler(redis_client, key_prefix=key_prefix, **kwargs)
+
+
+class TestRecomputeScheduler:
+    """Test debounce, claim and lease transitions in Redis."""
+
+    def test_debounce_extends_due_time(self, redis_client, key_prefix):
+        """Test that a new event pushes the due time back."""
+        scheduler = make_scheduler(redis_client, key_prefix)
+
+        scheduler.schedule(["t1", "t2"], now=1000.0)
+        scheduler.schedule(["t1"], now=1010.0)
+
+        assert scheduler.claim(10, now=1035.0) == [("t2", 1000.0)]
+        assert scheduler.claim(10, now=1039.0) == []
+        assert scheduler.claim(10, now=1040.0) == [("t1", 1000.0)]
+
+    def test_max_delay_caps_debounce(self, redis_client, key_prefix):
+        """Test that a continuously busy tutor is still recomputed."""
+        scheduler = make_scheduler(redis_client, key_prefix, max_delay_seconds=60)
+
+        for offset in range(0, 200, 10):
+            scheduler.schedule(["busy"], now=1000.0 + offset)
+
+        assert scheduler.claim(10, now=1060.0) == [("busy", 1000.0)]
+
+    def test_claims_are_exclusive(self, redis_client, key_prefix):
+        """Test that two workers never claim the same tutor."""
+        first = make_scheduler(redis_client, key_prefix)
+        second = make_scheduler(redis_client, key_prefix)
+        first.schedule([f"t{i}" for i in range(5)], now=1000.0)
+
+        claimed_first = first.claim(3, now=2000.0)
+        claimed_second = second.claim(3, now=2000.0)
+
+        assert len(claimed_first) == 3
+        assert len(claimed_second) == 2
+        assert not {t for t, _ in claimed_first} & {t for t, _ in claimed_second}
+        assert first.pending_count() == 0
+
+    def test_expired_lease_is_requeued(self, redis_client, key_prefix):
+        """Test that tutors held by a dead worker are retried."""
+        crashed = make_scheduler(redis_client, key_prefix)
+        survivor = make_scheduler(redis_client, key_prefix)
+        crashed.schedule(["t1"], now=1000.0)
+        crashed.claim(10, now=1030.0)
+
+        assert survivor.claim(10, now=1080.0) == []
+        assert survivor.claim(10, now=1091.0) == [("t1", 1000.0)]
+
+    def test_complete_releases_only_own_leases(self, redis_client, key_prefix):
+        """Test that completion needs the claiming worker's token."""
+        owner = make_scheduler(redis_client, key_prefix)
+        other = make_scheduler(redis_client, key_prefix)
+        owner.schedule(["t1"], now=1000.0)
+        owner.claim(10, now=1030.0)
+
+        assert other.complete(["t1"]) == 0
+        assert owner.complete(["t1"]) == 1
+        # Nothing left to requeue after the lease would have expired
+        assert other.claim(10, now=5000.0) == []
+
+    def test_force_claims_before_due(self, redis_client, key_prefix):
+        """Test that force ignores the debounce window."""
+        scheduler = make_scheduler(redis_client, key_prefix)
+        scheduler.schedule(["t1"], now=1000.0)
+
+        assert scheduler.claim(10, force=True, now=1001.0) == [("t1", 1000.0)]
+
+
+class TestMetricsUpdateWorkerScheduling:
+    """Test the worker's use of the shared recompute queue."""
+
+    @pytest.fixture
+    def scheduler(self):
+        scheduler = Mock(spec=RecomputeScheduler)
+        scheduler.pending_count.return_value = 0
+        return scheduler
+
+    def make_worker(self, scheduler, **kwargs):
+        worker = MetricsUpdateWorker(
+            redis_client=Mock(spec=RedisClient),
+            scheduler=scheduler,
+            **kwargs,
+        )
+        worker.consumer = Mock()
+        return worker
+
+    def test_events_are_scheduled_then_acknowledged(self, scheduler):
+        """Test that session events schedule their tutors in Redis."""
+        worker = self.make_worker(scheduler)
+        worker.consumer.consume.return_value = [
+            {"_redis_id": "1-0", "data": {"tutor_id": "t1", "session_id": "s1"}},
+            {"_redis_id": "2-0", "data": {"tutor_id": "t1", "session_id": "s2"}},
+            {"_redis_id": "3-0", "data": {"tutor_id": "t2", "session_id": "s3"}},
+        ]
+
+        assert worker._process_session_events("queue") == 3
+
+        scheduler.schedule.assert_called_once_with(["t1", "t1", "t2"])
+        assert worker.consumer.acknowledge.call_count == 3
+        assert worker.stats["events_processed"] == 3
+
+    def test_claimed_batches_are_recomputed(self, scheduler):
+        """Test that due tutors are recomputed and their leases released."""
+        scheduler.claim.side_effect = [
+            [("t1", 1000.0), ("t2", 1000.0)],
+            [("t3", 1000.0)],
+        ]
+        worker = self.make_worker(scheduler, recompute_batch_size=2)
+        worker._update_metrics_batch = AsyncMock(side_effect=lambda ids: ids)
+
+        with patch("src.evaluation.metrics_update_worker.time.time", return_value=1012.0):
+            worker._process_debounced_updates()
+
+        assert worker._update_metrics_batch.await_count == 2
+        assert [set(c.args[0]) for c in scheduler.complete.call_args_list] == [{"t1", "t2"}, {"t3"}]
+        stats = worker.get_stats()
+        assert stats["tutors_recomputed"] == 3
+        assert stats["avg_freshness_seconds"] == pytest.approx(12.0)
+        assert stats["freshness_max_seconds"] == pytest.approx(12.0)
+
+    def test_failed_tutors_keep_their_lease(self, scheduler):
+        """Test that only successfully recomputed tutors are completed."""
+        scheduler.claim.return_value = [("t1", 1000.0), ("t2", 1000.0)]
+        worker = self.make_worker(scheduler)
+        worker._update_metrics_batch = AsyncMock(return_value=["t2"])
+
+        worker._process_debounced_updates()
+
+        scheduler.complete.assert_called_once_with({"t2"})
+        assert worker.stats["tutors_recomputed"] == 1
+
+    def test_batch_failure_falls_back_to_single_tutors(self, scheduler):
+        """Test that a failing batch is retried tutor by tutor."""
+        worker = self.make_worker(scheduler)
+        session_cm = AsyncMock()
+        session_cm.__aenter__.side_effect = RuntimeError("batch failed")
+
+        async def update_one(tutor_id):
+            if tutor_id == "bad":
+                raise ValueError("bad data")
+
+        worker._update_tutor_metrics = AsyncMock(side_effect=update_one)
+
+        with patch("src.evaluation.metrics_update_worker.get_session", return_value=session_cm):
+            updated = worker._run_async(worker._update_metrics_batch(["t1", "bad", "t2"]))
+
+        assert updated == ["t1", "t2"]
+        assert worker.stats["errors"] == 2
+
+
+class TestBatchedCalculation:
+    """Test set-based metric calculation for many tutors."""
+
+    @pytest.mark.asyncio
+    async def test_matches_per_window_split(self):
+        """Test rows are split per tutor and window before calculating."""
+        now = datetime(2024, 6, 1)
+        sessions = [
+            SimpleNamespace(
+                tutor_id=tutor_id, session_id=f"{tutor_id}_{days}", session_number=1,
+                scheduled_start=now - timedelta(days=days), actual_start=now, no_show=False,
+                tutor_initiated_reschedule=days > 20, late_start_minutes=0,
+                engagement_score=80.0, learning_objectives_met=True,
+            )
+            for tutor_id in ("t1", "t2")
+            for days in (1, 5, 25, 60)
+        ]
+        feedback = [
+            SimpleNamespace(tutor_id=s.tutor_id, session_id=s.session_id,
+                            overall_rating=5 if s.tutor_id == "t1" else 3,
+                            scheduled_start=s.scheduled_start)
+            for s in sessions
+        ]
+
+        calculator = PerformanceCalculator(Mock())
+        calculator._get_sessions_for_tutors = AsyncMock(return_value=sessions)
+        calculator._get_feedback_for_tutors = AsyncMock(return_value=feedback)
+        calculator._get_tutor_events_for_tutors = AsyncMock(return_value=[])
+
+        windows = [MetricWindow.SEVEN_DAY, MetricWindow.THIRTY_DAY, MetricWindow.NINETY_DAY]
+        metrics = await calculator.calculate_metrics_for_tutors(["t1", "t2", "t3"], windows, now)
+
+        assert [(m.tutor_id, m.window) for m in metrics] == [
+            (t, w) for t in ("t1", "t2", "t3") for w in windows
+        ]
+        by_key = {(m.tutor_id, m.window): m for m in metrics}
+        assert by_key[("t1", MetricWindow.SEVEN_DAY)].total_sessions_scheduled == 2
+        assert by_key[("t1", MetricWindow.THIRTY_DAY)].reschedule_count == 1
+        assert by_key[("t1", MetricWindow.NINETY_DAY)].total_sessions_scheduled == 4
+        assert by_key[("t2", MetricWindow.THIRTY_DAY)].avg_rating == 3.0
+        assert by_key[("t3", MetricWindow.THIRTY_DAY)].sessions_completed == 0
+        # One query per table for the whole batch
+        calculator._get_sessions_for_tutors.assert_awaited_once_with(
+            ["t1", "t2", "t3"], now - timedelta(days=90), now
+        )
@@ -0,0 +1,193 @@
+"""
+Tests for incrementally maintained risk segment summaries.
+
+Covers delta computation, the generated upserts, applying a prediction
+against a fake session and reading segments back, so no database is required.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Select
+
+from src.database.models import RiskLevel, TutorRiskSegment, TutorStatus
+from src.evaluation.risk_segments import (
+    apply_prediction,
+    factor_upsert,
+    load_risk_segments,
+    prediction_factors,
+    segment_deltas,
+    summary_upsert,
+)
+
+
+def compile_sql(stmt) -> str:
+    return " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+
+
+def prediction(risk_level=RiskLevel.HIGH, churn_score=70, factors=None):
+    return SimpleNamespace(
+        prediction_id="pred_new",
+        tutor_id="tutor_1",
+        prediction_date=datetime(2025, 11, 16),
+        risk_level=risk_level,
+        churn_score=churn_score,
+        contributing_factors=factors if factors is not None else {"low_rating": 0.4, "no_shows": 0.2},
+    )
+
+
+class FakeDB:
+    """Sync session stub: tutor status, the tutor's counted entry and executed upserts."""
+
+    def __init__(self, status=TutorStatus.ACTIVE, current=None):
+        self.status = status
+        self.current = current
+        self.added = []
+        self.deleted = []
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        result = MagicMock()
+        if isinstance(stmt, Select):
+            result.scalar_one_or_none.return_value = self.status
+        return result
+
+    def get(self, model, key, with_for_update=False):
+        assert with_for_update
+        return self.current
+
+    def add(self, row):
+        self.added.append(row)
+
+    def delete(self, row):
+        self.deleted.append(row)
+
+
+class TestDeltas:
+    """Test delta computation for replacing a tutor's counted prediction."""
+
+    def test_first_prediction_adds(self):
+        summary, factors = segment_deltas(None, (RiskLevel.HIGH, 70, ["low_rating"]))
+
+        assert summary == {RiskLevel.HIGH: (1, 70)}
+        assert factors == {(RiskLevel.HIGH, "low_rating"): 1}
+
+    def test_moving_between_levels(self):
+        summary, factors = segment_deltas(
+            (RiskLevel.MEDIUM, 50, ["low_rating", "no_shows"]),
+            (RiskLevel.HIGH, 70, ["low_rating"]),
+        )
+
+        assert summary == {RiskLevel.MEDIUM: (-1, -50), RiskLevel.HIGH: (1, 70)}
+        assert factors == {
+            (RiskLevel.MEDIUM, "low_rating"): -1,
+            (RiskLevel.MEDIUM, "no_shows"): -1,
+            (RiskLevel.HIGH, "low_rating"): 1,
+        }
+
+    def test_same_level_keeps_only_changes(self):
+        summary, factors = segment_deltas(
+            (RiskLevel.HIGH, 70, ["low_rating", "no_shows"]),
+            (RiskLevel.HIGH, 75, ["low_rating"]),
+        )
+
+        assert summary == {RiskLevel.HIGH: (0, 5)}
+        assert factors == {(RiskLevel.HIGH, "no_shows"): -1}
+
+    def test_prediction_factors(self):
+        assert prediction_factors({"b": 1, "a": 2}) == ["a", "b"]
+        assert prediction_factors(None) == []
+        assert prediction_factors(["not", "a", "dict"]) == []
+
+
+class TestUpserts:
+    """Test the generated summary upserts."""
+
+    def test_summary_upsert_increments(self):
+        sql = compile_sql(summary_upsert({RiskLevel.HIGH: (1, 70), RiskLevel.CRITICAL: (-1, -90)}))
+
+        assert sql.startswith("INSERT INTO risk_segment_summaries")
+        assert "ON CONFLICT (risk_level) DO UPDATE SET" in sql
+        assert "tutor_count = (risk_segment_summaries.tutor_count + excluded.tutor_count)" in sql
+
+    def test_factor_upsert_rows_are_sorted(self):
+        stmt = factor_upsert({(RiskLevel.LOW, "b"): 1, (RiskLevel.CRITICAL, "z"): 1, (RiskLevel.LOW, "a"): -1})
+        params = stmt.compile(dialect=postgresql.dialect()).params
+
+        factors = [params[f"factor_m{i}"] for i in range(3)]
+        assert factors == ["z", "a", "b"]
+
+
+class TestApplyPrediction:
+    """Test counting a saved prediction."""
+
+    def test_new_tutor_is_counted(self):
+        db = FakeDB()
+
+        apply_prediction(db, prediction())
+
+        entry = db.added[0]
+        assert isinstance(entry, TutorRiskSegment)
+        assert entry.risk_level == RiskLevel.HIGH
+        assert entry.factors == ["low_rating", "no_shows"]
+        # Tutor lock, summary upsert, factor upsert
+        assert len(db.statements) == 3
+        assert "FOR NO KEY UPDATE" in compile_sql(db.statements[0])
+
+    def test_existing_entry_is_replaced(self):
+        current = SimpleNamespace(
+            prediction_id="pred_old", risk_level=RiskLevel.HIGH, churn_score=70,
+            factors=["low_rating", "no_shows"], updated_at=None,
+        )
+        db = FakeDB(current=current)
+
+        apply_prediction(db, prediction())
+
+        assert current.prediction_id == "pred_new"
+        assert not db.added
+        # Same level, score and factors: nothing to upsert
+        assert len(db.statements) == 1
+
+    def test_inactive_tutor_is_removed(self):
+        current = SimpleNamespace(risk_level=RiskLevel.LOW, churn_score=10, factors=[])
+        db = FakeDB(status=TutorStatus.CHURNED, current=current)
+
+        apply_prediction(db, prediction())
+
+        assert db.deleted == [current]
+        params = db.statements[1].compile(dialect=postgresql.dialect()).params
+        assert params["tutor_count_m0"] == -1
+
+
+class TestLoadRiskSegments:
+    """Test reading segments from the summary tables."""
+
+    @pytest.mark.asyncio
+    async def test_segments_in_risk_order_with_top_factors(self):
+        summaries = MagicMock()
+        summaries.scalars.return_value.all.return_value = [
+            SimpleNamespace(risk_level=RiskLevel.HIGH, tutor_count=4, churn_score_sum=290),
+            SimpleNamespace(risk_level=RiskLevel.LOW, tutor_count=2, churn_score_sum=25),
+        ]
+        factors = MagicMock()
+        factors.all.return_value = [
+            (RiskLevel.HIGH, "low_rating", 4),
+            (RiskLevel.HIGH, "no_shows", 3),
+            (RiskLevel.HIGH, "late_starts", 1),
+        ]
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[summaries, factors])
+
+        segments = await load_risk_segments(db, top_factors=2)
+
+        assert [s["risk_level"] for s in segments] == ["Low", "High"]
+        assert segments[1]["avg_churn_score"] == 72.5
+        assert segments[1]["common_factors"] == [
+            {"factor": "low_rating", "frequency": 4},
+            {"factor": "no_shows", "frequency": 3},
+        ]
+        assert segments[0]["common_factors"] == []
@@ -8,15 +8,20 @@ Usage:
 
 Then open http://localhost:8089 to configure and start the test.
 
+Bulk ingestion throughput only (JSON vs NDJSON batch endpoints):
+    locust -f tests/load_testing/locustfile.py BulkIngestionUser --host=http://localhost:8000
+
 Target metrics:
 - 30,000 sessions/day
 - p95 API response time < 200ms
 - Cache hit rate > 80%
 - No failed requests under normal load
+- Bulk ingestion items/sec reported at test end
 """
 
 import random
 import json
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Any
 
@@ -280,6 +285,88 @@ class DashboardUser(HttpUser):
             pass
 
 
+class BulkIngestionUser(HttpUser):
+    """
+    Pushes large session batches through the bulk ingestion endpoints.
+
+    Alternates JSON array and NDJSON bodies so both paths report separately;
+    queued item counts feed the items/sec figure printed at test end.
+    """
+
+    wait_time = between(0.1, 0.5)
+    host = "http://localhost:8000"
+    fixed_count = 1  # One bulk producer in mixed runs
+    batch_size = 1000
+
+    def on_start(self):
+        """Initialize bulk ingestion user."""
+        self.tutor_ids = [f"T{str(i).zfill(6)}" for i in range(1, 1001)]
+        self.student_ids = [f"S{str(i).zfill(6)}" for i in range(1, 5001)]
+        self.session_counter = 0
+
+    def _session(self) -> Dict[str, Any]:
+        self.session_counter += 1
+        scheduled = datetime.now() - timedelta(days=random.randint(0, 30))
+        return {
+            "session_id": f"BULK{id(self):x}{self.session_counter:010d}",
+            "tutor_id": random.choice(self.tutor_ids),
+            "student_id": random.choice(self.student_ids),
+            "session_number": random.randint(1, 50),
+            "is_first_session": random.random() < 0.1,
+            "scheduled_start": scheduled.isoformat(),
+            "actual_start": scheduled.isoformat(),
+            "duration_minutes": random.choice([30, 45, 60]),
+            "subject": random.choice(["Math", "Science", "English", "History"]),
+            "session_type": random.choice(["1-on-1", "group"]),
+            "tutor_initiated_reschedule": random.random() < 0.1,
+            "no_show": False,
+            "late_start_minutes": random.randint(0, 15),
+            "engagement_score": round(random.uniform(0.5, 1.0), 2),
+            "learning_objectives_met": random.random() < 0.85,
+            "technical_issues": random.random() < 0.1,
+            "created_at": scheduled.isoformat(),
+            "updated_at": scheduled.isoformat(),
+        }
+
+    def _record_items(self, response, body_format: str):
+        if response.status_code != 201:
+            response.failure(f"Bulk ingestion failed: {response.status_code}")
+            return
+
+        response.success()
+        count = response.json().get("count", 0)
+        metrics = self.environment.custom_metrics
+        metrics["ingested_items"] += count
+        metrics[f"ingested_items_{body_format}"] += count
+
+    @task(1)
+    def ingest_sessions_json(self):
+        """Ingest a large session batch as a JSON array."""
+        sessions = [self._session() for _ in range(self.batch_size)]
+
+        with self.client.post(
+            "/api/sessions/batch",
+            json=sessions,
+            catch_response=True,
+            name=f"/api/sessions/batch [POST] (bulk n={self.batch_size})"
+        ) as response:
+            self._record_items(response, "json")
+
+    @task(1)
+    def ingest_sessions_ndjson(self):
+        """Ingest a large session batch as NDJSON."""
+        body = "\n".join(json.dumps(self._session()) for _ in range(self.batch_size))
+
+        with self.client.post(
+            "/api/sessions/batch/ndjson",
+            data=body,
+            headers={"Content-Type": "application/x-ndjson"},
+            catch_response=True,
+            name=f"/api/sessions/batch/ndjson [POST] (bulk n={self.batch_size})"
+        ) as response:
+            self._record_items(response, "ndjson")
+
+
 # ==================== Custom Metrics ====================
 
 @events.init.add_listener
@@ -289,10 +376,22 @@ def on_locust_init(environment, **kwargs):
     """
     environment.custom_metrics = {
         "cache_hits": 0,
-        "cache_misses": 0
+        "cache_misses": 0,
+        "ingested_items": 0,
+        "ingested_items_json": 0,
+        "ingested_items_ndjson": 0,
+        "started_at": None,
     }
 
 
+@events.test_start.add_listener
+def on_test_start(environment, **kwargs):
+    """
+    Mark the start of the measurement window for throughput metrics.
+    """
+    environment.custom_metrics["started_at"] = time.monotonic()
+
+
 @events.request.add_listener
 def on_request(request_type, name, response_time, response_length, exception, context, **kwargs):
     """
@@ -321,4 +420,12 @@ def on_test_stop(environment, **kwargs):
         )
         print(f"Cache Hit Rate: {cache_hit_rate:.2f}%")
 
+        started_at = environment.custom_metrics.get('started_at')
+        ingested = environment.custom_metrics.get('ingested_items', 0)
+        if started_at is not None and ingested:
+            elapsed = time.monotonic() - started_at
+            print(f"Bulk Ingestion: {ingested} items in {elapsed:.1f}s ({ingested / elapsed:.1f} items/sec)")
+            print(f"  JSON items:   {environment.custom_metrics.get('ingested_items_json', 0)}")
+            print(f"  NDJSON items: {environment.custom_metrics.get('ingested_items_ndjson', 0)}")
+
     print("="*80 + "\n")
@@ -6,11 +6,23 @@ to enrichment queue publishing.
 """
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock
 from datetime import datetime
 
 from src.pipeline.validation.validation_worker import ValidationWorker
 from src.queue.client import RedisClient
+from src.queue.serializer import MessageSerializer
+from src.queue.stream_transport import StreamTransport, TrimPolicy
+
+
+def mock_transport(messages):
+    """Stream transport mock returning one batch of messages."""
+    transport = Mock()
+    transport.claim = AsyncMock(return_value=[])
+    transport.read = AsyncMock(return_value=messages)
+    transport.publish_entries = AsyncMock(return_value=[])
+    transport.ack = AsyncMock(return_value=len(messages))
+    return transport
 
 
 class TestValidationWorkerIntegration:
@@ -22,8 +34,7 @@ class TestValidationWorkerIntegration:
 
         assert worker is not None
         assert worker.validation_engine is not None
-        assert worker.consumer is not None
-        assert worker.publisher is not None
+        assert worker.transport is not None
 
     def test_queue_mappings(self):
         """Test that queue mappings are correct."""
@@ -48,9 +59,8 @@ class TestValidationWorkerIntegration:
         assert feedback_mapping["data_type"] == "feedback"
         assert feedback_mapping["enrichment_queue"] == "tutormax:feedback:enrichment"
 
-    @patch('src.pipeline.validation.validation_worker.MessageConsumer')
-    @patch('src.pipeline.validation.validation_worker.MessagePublisher')
-    def test_valid_message_flow(self, mock_publisher, mock_consumer):
+    @pytest.mark.asyncio
+    async def test_valid_message_flow(self):
         """Test that valid messages flow to enrichment queue."""
         # Setup
         worker = ValidationWorker()
@@ -74,38 +84,33 @@ class TestValidationWorkerIntegration:
 
         message = {
             "_redis_id": "test-id",
+            "_stream": "tutormax:tutors",
             "data": valid_tutor,
             "metadata": {}
         }
 
-        # Mock consumer to return our message
-        mock_consumer_instance = Mock()
-        mock_consumer_instance.consume.return_value = [message]
-        mock_consumer_instance.acknowledge.return_value = True
-        worker.consumer = mock_consumer_instance
-
-        # Mock publisher
-        mock_publisher_instance = Mock()
-        worker.publisher = mock_publisher_instance
+        # Mock transport to return our message
+        worker.transport = mock_transport([message])
 
         # Process message
-        worker._process_channel("tutormax:tutors")
+        await worker._process_channel("tutormax:tutors")
 
-        # Verify message was published to enrichment queue
-        mock_publisher_instance.publish.assert_called_once()
-        call_args = mock_publisher_instance.publish.call_args
-        assert call_args[0][0] == "tutormax:tutors:enrichment"
-        assert call_args[0][1] == valid_tutor
+        # Verify message was published to enrichment queue in one write
+        worker.transport.publish_entries.assert_awaited_once()
+        entries = worker.transport.publish_entries.call_args[0][0]
+        assert len(entries) == 1
+        assert entries[0][0] == "tutormax:tutors:enrichment"
+        assert entries[0][1] == valid_tutor
 
         # Verify message was acknowledged
-        mock_consumer_instance.acknowledge.assert_called_once_with(
+        worker.transport.ack.assert_awaited_once_with(
             "tutormax:tutors",
-            "test-id"
+            "validation-workers",
+            ["test-id"]
         )
 
-    @patch('src.pipeline.validation.validation_worker.MessageConsumer')
-    @patch('src.pipeline.validation.validation_worker.MessagePublisher')
-    def test_invalid_message_flow(self, mock_publisher, mock_consumer):
+    @pytest.mark.asyncio
+    async def test_invalid_message_flow(self):
         """Test that invalid messages flow to dead letter queue."""
         # Setup
         worker = ValidationWorker()
@@ -129,31 +134,25 @@ class TestValidationWorkerIntegration:
 
         message = {
             "_redis_id": "test-id",
+            "_stream": "tutormax:tutors",
             "data": invalid_tutor,
             "metadata": {}
         }
 
-        # Mock consumer
-        mock_consumer_instance = Mock()
-        mock_consumer_instance.consume.return_value = [message]
-        mock_consumer_instance.acknowledge.return_value = True
-        worker.consumer = mock_consumer_instance
-
-        # Mock publisher
-        mock_publisher_instance = Mock()
-        worker.publisher = mock_publisher_instance
+        # Mock transport
+        worker.transport = mock_transport([message])
 
         # Process message
-        worker._process_channel("tutormax:tutors")
+        await worker._process_channel("tutormax:tutors")
 
         # Verify message was published to dead letter queue
-        mock_publisher_instance.publish.assert_called_once()
-        call_args = mock_publisher_instance.publish.call_args
-        assert call_args[0][0] == "tutormax:dead_letter"
-        assert call_args[0][1] == invalid_tutor
+        worker.transport.publish_entries.assert_awaited_once()
+        entries = worker.transport.publish_entries.call_args[0][0]
+        assert entries[0][0] == "tutormax:dead_letter"
+        assert entries[0][1] == invalid_tutor
 
         # Verify metadata contains validation errors
-        metadata = call_args[1]["metadata"]
+        metadata = entries[0][2]
         assert "validation_errors" in metadata
         assert metadata["validation_errors"]["valid"] is False
         assert len(metadata["validation_errors"]["errors"]) > 0
@@ -178,6 +177,128 @@ class TestValidationWorkerIntegration:
         assert "by_type" in stats["validation_engine"]
 
 
+class FakeStreams:
+    """
+    In-memory stand-in for the stream commands StreamTransport uses, with
+    per-group pending lists and a manual clock for idle times.
+    """
+
+    def __init__(self):
+        self.now_ms = 0
+        self.streams = {}
+        self.last_delivered = {}
+        self.pending = {}  # (stream, group) -> {entry_id: (consumer, delivered_at)}
+
+    def add(self, stream, data):
+        entries = self.streams.setdefault(stream, [])
+        entry_id = f"{len(entries) + 1}-0"
+        entries.append((entry_id, {"message": MessageSerializer.serialize(stream, data)}))
+        return entry_id
+
+    async def xgroup_create(self, stream, group, start_id, mkstream=False):
+        self.streams.setdefault(stream, [])
+        self.last_delivered.setdefault((stream, group), 0)
+        self.pending.setdefault((stream, group), {})
+        return True
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        response = []
+        for stream in streams:
+            start = self.last_delivered[(stream, group)]
+            entries = self.streams[stream][start:start + count]
+            if entries:
+                self.last_delivered[(stream, group)] = start + len(entries)
+                for entry_id, _ in entries:
+                    self.pending[(stream, group)][entry_id] = (consumer, self.now_ms)
+                response.append((stream, entries))
+        return response
+
+    async def xautoclaim(self, stream, group, consumer, min_idle_time, start_id="0-0", count=None):
+        pending = self.pending[(stream, group)]
+        claimed = []
+        for entry_id, (_, delivered_at) in sorted(pending.items()):
+            if self.now_ms - delivered_at >= min_idle_time and len(claimed) < count:
+                pending[entry_id] = (consumer, self.now_ms)
+                claimed.append((entry_id, dict(self.streams[stream])[entry_id]))
+        return ["0-0", claimed, []]
+
+    async def xack(self, stream, group, *entry_ids):
+        pending = self.pending[(stream, group)]
+        return sum(pending.pop(entry_id, None) is not None for entry_id in entry_ids)
+
+    def pipeline(self, transaction=True):
+        streams = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def xadd(self, stream, fields, **trim):
+                self.calls.append((stream, fields))
+
+            async def execute(self):
+                ids = []
+                for stream, fields in self.calls:
+                    entries = streams.streams.setdefault(stream, [])
+                    ids.append(f"{len(entries) + 1}-0")
+                    entries.append((ids[-1], fields))
+                return ids
+
+        return Pipeline()
+
+
+class TestConsumerRecovery:
+    """Test redelivery of a batch whose consumer died before acknowledging."""
+
+    CHANNEL = "tutormax:tutors"
+
+    def make_worker(self, streams, name):
+        transport = StreamTransport(streams, trim_policy=TrimPolicy(strategy="none"))
+        return ValidationWorker(
+            transport=transport,
+            consumer_name=name,
+            batch_size=10,
+            claim_min_idle_ms=30_000,
+            claim_interval_ms=0,
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_of_killed_consumer_is_reclaimed(self):
+        streams = FakeStreams()
+        for i in range(3):
+            streams.add(self.CHANNEL, {"tutor_id": f"tutor_{i:05d}"})
+
+        # The first consumer is killed after reading, before forwarding or acking
+        crashed = self.make_worker(streams, "validator-a")
+        crashed.transport.publish_entries = AsyncMock(side_effect=ConnectionError("killed"))
+        assert await crashed._process_channel(self.CHANNEL) == 0
+        assert len(streams.pending[(self.CHANNEL, "validation-workers")]) == 3
+
+        survivor = self.make_worker(streams, "validator-b")
+
+        # Not stale yet: nothing new to read and nothing claimed
+        streams.now_ms = 10_000
+        assert await survivor._process_channel(self.CHANNEL) == 0
+
+        streams.now_ms = 40_000
+        assert await survivor._process_channel(self.CHANNEL) == 3
+
+        assert streams.pending[(self.CHANNEL, "validation-workers")] == {}
+        assert len(streams.streams["tutormax:dead_letter"]) == 3
+
+    def test_consumer_name_is_stable_across_restarts(self):
+        first = ValidationWorker(transport=Mock())
+        second = ValidationWorker(transport=Mock())
+
+        assert first.consumer_name == second.consumer_name
+
+
 class TestEndToEndValidation:
     """End-to-end validation tests."""
 
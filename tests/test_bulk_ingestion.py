@@ -0,0 +1,187 @@
+"""
+Tests for bulk ingestion.
+
+Covers the bulk stream enqueue, per-item acceptance on the JSON batch
+endpoints, line-by-line NDJSON ingestion, and backpressure responses.
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from fastapi.testclient import TestClient
+from redis.exceptions import RedisError
+
+from src.api.bulk_ingestion import iter_ndjson_lines, queue_ndjson
+from src.api.main import app
+from src.api.models import TutorProfile
+from src.api.redis_service import RedisService, redis_service
+from src.queue.stream_transport import Backpressure
+
+
+client = TestClient(app)
+
+
+def tutor(tutor_id="tutor_00001", **overrides):
+    data = {
+        "tutor_id": tutor_id,
+        "name": "John Doe",
+        "email": "john.doe@example.com",
+        "age": 28,
+        "location": "New York",
+        "education_level": "Master's Degree",
+        "subjects": ["Mathematics"],
+        "subject_type": "STEM",
+        "onboarding_date": "2024-01-15T10:00:00",
+        "tenure_days": 120,
+        "behavioral_archetype": "high_performer",
+        "baseline_sessions_per_week": 15,
+        "created_at": "2024-01-15T10:00:00",
+        "updated_at": "2024-05-14T10:00:00",
+    }
+    data.update(overrides)
+    return data
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+class TestEnqueueBulk:
+    """Test the bulk enqueue onto the shared stream transport."""
+
+    def make_service(self):
+        service = RedisService()
+        service.transport = Mock()
+        service.transport.publish_many = AsyncMock(return_value=["1-0", "1-1"])
+        return service
+
+    @pytest.mark.asyncio
+    async def test_one_publish_for_the_batch(self):
+        service = self.make_service()
+
+        assert await service.queue_tutors_bulk([{"n": 1}, {"n": 2}]) is True
+
+        service.transport.publish_many.assert_awaited_once_with("tutormax:tutors", [{"n": 1}, {"n": 2}])
+
+    @pytest.mark.asyncio
+    async def test_redis_error_rejects_batch(self):
+        service = self.make_service()
+        service.transport.publish_many.side_effect = RedisError("down")
+
+        assert await service.enqueue_bulk("q", [{}]) is False
+
+    @pytest.mark.asyncio
+    async def test_not_connected(self):
+        assert await RedisService().enqueue_bulk("q", [{}]) is False
+
+
+class TestNdjson:
+    """Test NDJSON parsing and chunked queueing."""
+
+    @pytest.mark.asyncio
+    async def test_lines_split_across_chunks(self):
+        lines = [line async for line in iter_ndjson_lines(chunked(b'{"a": 1}\n{"b": 2}\n\n{"c": 3}', 3))]
+        assert lines == [b'{"a": 1}', b'{"b": 2}', b"", b'{"c": 3}']
+
+    @pytest.mark.asyncio
+    async def test_invalid_lines_rejected_individually(self):
+        body = "\n".join([
+            json.dumps(tutor("tutor_00001")),
+            json.dumps(tutor("tutor_00002", email="not-an-email")),
+            "",
+            json.dumps(tutor("tutor_00003")),
+            "{broken",
+        ]).encode()
+        enqueue = AsyncMock(return_value=True)
+
+        response = await queue_ndjson(chunked(body, 64), TutorProfile, "tutor_id", enqueue, "tutors", flush_size=1)
+
+        assert response.count == 2
+        assert [(i.index, i.id, i.accepted) for i in response.items] == [
+            (1, "tutor_00001", True),
+            (2, None, False),
+            (4, "tutor_00003", True),
+            (5, None, False),
+        ]
+        assert response.errors[0].startswith("Line 2: email")
+        assert enqueue.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_marks_pending_items(self):
+        body = "\n".join(json.dumps(tutor(f"tutor_{i:05d}")) for i in range(3)).encode()
+        enqueue = AsyncMock(side_effect=[True, False])
+
+        response = await queue_ndjson(chunked(body, 1024), TutorProfile, "tutor_id", enqueue, "tutors", flush_size=2)
+
+        assert [i.accepted for i in response.items] == [True, True, False]
+        assert response.items[2].error == "Redis unavailable"
+        assert response.count == 2
+
+
+class TestBatchEndpoints:
+    """Test batch endpoints use one bulk write."""
+
+    def test_json_batch_reports_per_item_acceptance(self):
+        with patch.object(redis_service, "queue_tutors_bulk", AsyncMock(return_value=True)) as bulk:
+            response = client.post("/api/tutors/batch", json=[tutor("tutor_00001"), tutor("tutor_00002")])
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["count"] == 2
+        assert [item["id"] for item in data["items"]] == ["tutor_00001", "tutor_00002"]
+        bulk.assert_awaited_once()
+        assert bulk.call_args.args[0][0]["tutor_id"] == "tutor_00001"
+
+    def test_json_batch_redis_unavailable(self):
+        with patch.object(redis_service, "queue_tutors_bulk", AsyncMock(return_value=False)):
+            response = client.post("/api/tutors/batch", json=[tutor()])
+
+        data = response.json()
+        assert data["success"] is False
+        assert data["items"][0]["accepted"] is False
+
+    def test_ndjson_endpoint(self):
+        body = json.dumps(tutor("tutor_00001")) + "\n" + json.dumps(tutor("tutor_00002", age=5)) + "\n"
+        with patch.object(redis_service, "queue_tutors_bulk", AsyncMock(return_value=True)):
+            response = client.post(
+                "/api/tutors/batch/ndjson",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["count"] == 1
+        assert data["items"][1]["index"] == 2
+        assert data["items"][1]["accepted"] is False
+        assert data["items"][1]["error"].startswith("age:")
+
+    def test_ndjson_empty_body(self):
+        response = client.post("/api/tutors/batch/ndjson", content=b"\n\n")
+        assert response.status_code == 400
+
+
+class TestBackpressure:
+    """Test ingestion is refused while the validation workers lag."""
+
+    @pytest.mark.parametrize("state, status_code", [
+        (Backpressure.THROTTLE, 429),
+        (Backpressure.REJECT, 503),
+    ])
+    def test_backlogged_stream_rejects(self, state, status_code):
+        with patch.object(redis_service, "check_backpressure", AsyncMock(return_value=(state, 95000))), \
+                patch.object(redis_service, "queue_tutors_bulk", AsyncMock(return_value=True)) as bulk:
+            response = client.post("/api/tutors/batch", json=[tutor()])
+
+        assert response.status_code == status_code
+        assert response.headers["Retry-After"] == "5"
+        bulk.assert_not_awaited()
+
+    def test_lag_checked_per_stream(self):
+        check = AsyncMock(return_value=(Backpressure.OK, 0))
+        with patch.object(redis_service, "check_backpressure", check):
+            client.post("/api/sessions/batch/ndjson", content=b"")
+
+        check.assert_awaited_once_with("tutormax:sessions")
@@ -4,12 +4,19 @@ Tests for synthetic data generation modules.
 Validates data integrity, correlations, and adherence to PRD specifications.
 """
 
+import numpy as np
 import pytest
 from datetime import datetime, timedelta
 
 from src.data_generation.tutor_generator import TutorGenerator, BehavioralArchetype
 from src.data_generation.session_generator import SessionGenerator
 from src.data_generation.feedback_generator import FeedbackGenerator
+from src.data_generation.bulk_generator import (
+    BulkSessionGenerator,
+    SESSION_COLUMNS,
+    STUDENT_COLUMNS,
+    to_csv,
+)
 
 
 class TestTutorGenerator:
@@ -384,5 +391,73 @@ class TestDataIntegration:
         assert hp_avg_engagement > churner_avg_engagement + 0.2
 
 
+class TestBulkSessionGenerator:
+    """Tests for the vectorized BulkSessionGenerator"""
+
+    @pytest.fixture
+    def tutors(self):
+        return TutorGenerator(seed=42).generate_tutors(count=50)
+
+    def test_day_columns(self, tutors):
+        """Test a generated day has every session column with consistent lengths"""
+        day = BulkSessionGenerator(tutors, num_students=500, seed=1).generate_day(
+            datetime(2024, 1, 3).date(), target_count=5000
+        )
+
+        assert list(day) == SESSION_COLUMNS
+        n = len(day["session_id"])
+        assert 3500 <= n <= 6500
+        assert all(len(values) == n for values in day.values())
+        assert len(set(day["session_id"])) == n
+
+        # No-shows have no start, duration or engagement
+        no_show = day["no_show"]
+        assert (day["duration_minutes"][no_show] == 0).all()
+        assert (day["engagement_score"][no_show] == 0).all()
+        assert np.isnat(day["actual_start"][no_show]).all()
+
+    def test_deterministic_per_day(self, tutors):
+        """Test a day's rows depend only on seed and date, not on what ran before"""
+        day = datetime(2024, 1, 3).date()
+        first = BulkSessionGenerator(tutors, num_students=500, seed=7)
+        second = BulkSessionGenerator(tutors, num_students=500, seed=7)
+        list(second.iter_days(datetime(2024, 1, 1).date(), datetime(2024, 1, 2).date(), 1000))
+
+        assert to_csv(first.generate_day(day, 1000)) == to_csv(second.generate_day(day, 1000))
+        assert to_csv(first.generate_day(day, 1000)) != to_csv(
+            BulkSessionGenerator(tutors, num_students=500, seed=8).generate_day(day, 1000)
+        )
+
+    def test_archetype_rates(self):
+        """Test churners reschedule and no-show far more than high performers"""
+        tutor_gen = TutorGenerator(seed=42)
+        hp = tutor_gen.generate_tutor(archetype=BehavioralArchetype.HIGH_PERFORMER)
+        churner = tutor_gen.generate_tutor(archetype=BehavioralArchetype.CHURNER)
+        churner["baseline_sessions_per_week"] = hp["baseline_sessions_per_week"]
+
+        day = BulkSessionGenerator([hp, churner], num_students=100, seed=3).generate_day(
+            datetime(2024, 1, 3).date(), target_count=20000
+        )
+        is_churner = day["tutor_id"] == churner["tutor_id"]
+
+        assert day["tutor_initiated_reschedule"][is_churner].mean() > 0.3
+        assert day["tutor_initiated_reschedule"][~is_churner].mean() < 0.05
+        assert day["engagement_score"][is_churner & ~day["no_show"]].max() <= 0.5
+        assert day["engagement_score"][~is_churner & ~day["no_show"]].min() >= 0.76
+
+    def test_csv_matches_copy_format(self, tutors):
+        """Test CSV output uses COPY conventions (empty = NULL, t/f booleans, quoting)"""
+        generator = BulkSessionGenerator(tutors, num_students=10, seed=1)
+        students = generator.generate_students(datetime(2024, 1, 1))
+        assert list(students) == STUDENT_COLUMNS
+
+        line = to_csv(students).splitlines()[0].split(",")
+        assert line[0] == "bulk_stu_000000000"
+        assert line[4] in ("t", "f")
+
+        quoted = to_csv({"a": np.array(['x,y', 'say "hi"', "", None], dtype=object)})
+        assert quoted.splitlines() == ['"x,y"', '"say ""hi"""', '""', ""]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
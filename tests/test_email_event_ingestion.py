@@ -0,0 +1,232 @@
+"""
+Tests for buffered email open/click ingestion, signed click links and the
+batched flush to Postgres.
+"""
+
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.email_automation.email_event_ingestion import (
+    DIRTY_CAMPAIGNS,
+    DIRTY_MESSAGES,
+    EVENT_STREAM,
+    EmailEventIngestor,
+    flush_email_events,
+    sign_click_url,
+    verify_click_url,
+)
+from src.email_automation.email_tracking_service import EmailTrackingService
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for the ingestion pipeline."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.hlls = {}
+        self.sets = {}
+        self.stream = []
+        self.ttls = {}
+        self.executions = 0
+
+    def pipeline(self, transaction=True):
+        redis = self
+        ops = []
+
+        class Pipeline:
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: ops.append((name, args, kwargs))
+
+            async def execute(self):
+                redis.executions += 1
+                return [getattr(redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in ops]
+
+        return Pipeline()
+
+    def _xadd(self, key, fields, maxlen=None, approximate=True):
+        self.stream.append(fields)
+
+    def _hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = str(int(fields.get(field, 0)) + amount)
+
+    def _hsetnx(self, key, field, value):
+        self.hashes.setdefault(key, {}).setdefault(field, value)
+
+    def _hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def _pfadd(self, key, *members):
+        self.hlls.setdefault(key, set()).update(members)
+
+    def _pfcount(self, key):
+        return len(self.hlls.get(key, ()))
+
+    def _sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def _expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+
+def connected(client):
+    service = MagicMock()
+    service._connected = True
+    service.redis_client = client
+    return service
+
+
+class TestSignedClickLinks:
+    """Test click URLs carrying their signed destination."""
+
+    def test_round_trip(self):
+        service = EmailTrackingService(base_url="https://tutormax.com", signing_key="k")
+
+        url = service.generate_click_tracking_url(
+            "msg_1", "https://example.com/a?b=1&c=2", link_id="l1", campaign_id="camp_1"
+        )
+        parsed = urlparse(url)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+
+        assert parsed.path == "/api/email/track/click/msg_1/l1"
+        assert params["u"] == "https://example.com/a?b=1&c=2"
+        assert params["c"] == "camp_1"
+        assert verify_click_url(
+            "k", "msg_1", "l1", params["u"], params["s"], campaign_id="camp_1"
+        )
+
+    def test_rejects_tampered_destination(self):
+        signature = sign_click_url("k", "msg_1", "l1", "https://example.com")
+
+        assert not verify_click_url("k", "msg_1", "l1", "https://evil.example", signature)
+        assert not verify_click_url("other", "msg_1", "l1", "https://example.com", signature)
+        assert not verify_click_url("k", "msg_1", "l1", "https://example.com", None)
+
+    def test_rejects_tampered_campaign(self):
+        url = "https://example.com"
+        signature = sign_click_url("k", "msg_1", "l1", url, "camp_1")
+
+        assert verify_click_url("k", "msg_1", "l1", url, signature, campaign_id="camp_1")
+        assert not verify_click_url("k", "msg_1", "l1", url, signature, campaign_id="camp_2")
+        assert not verify_click_url("k", "msg_1", "l1", url, signature)
+
+    def test_wrapped_links_are_html_escaped(self):
+        service = EmailTrackingService(base_url="https://tutormax.com", signing_key="k")
+
+        html = service.wrap_links_for_tracking('<a href="https://example.com/?a=1&amp;b=2">x</a>', "msg_1")
+
+        assert "track/click/msg_1" in html
+        assert "&amp;s=" in html
+        assert "&s=" not in html
+
+
+class TestEmailEventIngestor:
+    """Test buffering, pre-aggregation and live counters."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_one_pipeline(self):
+        """Test that a burst of events is written in one pre-aggregated pipeline."""
+        client = FakeRedis()
+        ingestor = EmailEventIngestor(connected(client))
+        for i in range(10):
+            ingestor.record_open(f"msg_{i % 4}", campaign_id="camp_1", ip_address=f"10.0.0.{i}")
+        ingestor.record_click("msg_0", "l1", "https://example.com", campaign_id="camp_1")
+        ingestor.record_click("msg_0", "l1", "https://example.com", campaign_id="camp_1")
+
+        assert await ingestor.flush() == 12
+        assert client.executions == 1
+        assert len(client.stream) == 12
+        assert client.sets[DIRTY_MESSAGES] == {"msg_0", "msg_1", "msg_2", "msg_3"}
+        assert client.sets[DIRTY_CAMPAIGNS] == {"camp_1"}
+
+        stats = await ingestor.campaign_counters("camp_1")
+        assert stats["total_opens"] == 10
+        assert stats["unique_opens"] == 4
+        assert stats["total_clicks"] == 2
+        assert stats["unique_clicks"] == 1
+        assert stats["link_clicks"] == {"l1": 2}
+
+        message = await ingestor.message_counters("msg_0")
+        assert message["open_count"] == 3
+        assert message["opening_devices"] == 3
+        assert message["click_count"] == 2
+        assert message["first_opened_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_events_kept_when_redis_fails(self):
+        """Test that a failed write leaves the events buffered."""
+        service = connected(MagicMock())
+        service.redis_client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+        ingestor = EmailEventIngestor(service)
+        ingestor.record_open("msg_1")
+
+        assert await ingestor.flush() == 0
+        assert len(ingestor._buffer) == 1
+
+    @pytest.mark.asyncio
+    async def test_nothing_written_without_redis(self):
+        ingestor = EmailEventIngestor()
+        ingestor.record_open("msg_1")
+
+        assert await ingestor.flush() == 0
+        assert len(ingestor._buffer) == 1
+
+
+class TestFlushToPostgres:
+    """Test the Celery-side flush from Redis to Postgres."""
+
+    def sync_client(self, entries, dirty_messages=(), dirty_campaigns=()):
+        client = MagicMock()
+        client.xreadgroup.side_effect = [[], [[EVENT_STREAM, entries]]]
+        client.spop.side_effect = lambda key, count: list(
+            dirty_messages if key == DIRTY_MESSAGES else dirty_campaigns
+        )
+        return client
+
+    def test_moves_events_for_known_messages(self):
+        entries = [
+            ("1-0", {"event_type": "opened", "message_id": "msg_1", "event_time": "1763112000.000"}),
+            ("1-1", {"event_type": "opened", "message_id": "gone", "event_time": "1763112001.000"}),
+        ]
+        client = self.sync_client(entries)
+        db = MagicMock()
+        db.execute.return_value.scalars.return_value = ["msg_1"]
+
+        stats = flush_email_events(client, db)
+
+        assert stats["events_stored"] == 1
+        assert stats["events_skipped"] == 1
+        client.xack.assert_called_once_with(EVENT_STREAM, "email-db-flush", "1-0", "1-1")
+        client.xdel.assert_called_once_with(EVENT_STREAM, "1-0", "1-1")
+        db.commit.assert_called()
+
+    def test_acks_pending_entries_trimmed_from_stream(self):
+        entries = [
+            ("1-0", None),
+            ("1-1", {"event_type": "opened", "message_id": "msg_1", "event_time": "1763112001.0"}),
+        ]
+        client = self.sync_client([])
+        client.xreadgroup.side_effect = [[[EVENT_STREAM, entries]], []]
+        db = MagicMock()
+        db.execute.return_value.scalars.return_value = ["msg_1"]
+
+        stats = flush_email_events(client, db)
+
+        assert stats["events_stored"] == 1
+        assert stats["events_skipped"] == 1
+        assert client.xack.call_args_list[0].args == (EVENT_STREAM, "email-db-flush", "1-0")
+        client.xdel.assert_called_once_with(EVENT_STREAM, "1-1")
+
+    def test_counter_failure_restores_dirty_ids(self):
+        client = self.sync_client([], dirty_messages=["msg_1"])
+        client.pipeline.return_value.execute.return_value = [{"opens": "2"}]
+        db = MagicMock()
+        db.execute.side_effect = RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            flush_email_events(client, db)
+
+        db.rollback.assert_called_once()
+        client.sadd.assert_called_once_with(DIRTY_MESSAGES, "msg_1")
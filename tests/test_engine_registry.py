@@ -0,0 +1,158 @@
+"""
+Tests for the shared SQLAlchemy engine registry.
+
+Engines are created but never connected to Postgres; the pool metrics are
+exercised against SQLite.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool, QueuePool
+
+from src.database.engines import (
+    EngineRegistry,
+    _timed_pool_class,
+    _track_checkout,
+)
+
+
+def make_settings(**overrides):
+    values = dict(
+        postgres_user="tutormax",
+        postgres_password="secret",
+        postgres_host="primary.db",
+        postgres_port=5432,
+        postgres_db="tutormax",
+        db_echo=False,
+        db_pool_size=5,
+        db_max_overflow=10,
+        db_pool_timeout=30,
+        db_pool_recycle=3600,
+        db_worker_pool_size=2,
+        db_worker_max_overflow=3,
+        db_replica_host="",
+        db_replica_port=5432,
+        db_pgbouncer_transaction_mode=False,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestEngineRegistry:
+    """Test lazy creation, role sizing and read routing."""
+
+    def test_engines_are_lazy_and_shared(self):
+        """Test that engines are created on first use and reused."""
+        registry = EngineRegistry(make_settings())
+        assert registry._engines == {}
+
+        engine = registry.sync_engine()
+
+        assert registry.sync_engine() is engine
+        assert registry.async_engine() is not engine
+        assert len(registry._engines) == 2
+
+    def test_pool_sizing_by_role(self):
+        """Test that worker processes get the smaller pool."""
+        registry = EngineRegistry(make_settings())
+        assert registry.sync_engine().pool.size() == 5
+
+        registry.configure(role="worker")
+        engine = registry.sync_engine()
+
+        assert engine.pool.size() == 2
+        assert engine.pool._max_overflow == 3
+
+    def test_unknown_role(self):
+        """Test that an unknown role is rejected."""
+        with pytest.raises(ValueError, match="Unknown engine role"):
+            EngineRegistry(make_settings()).configure(role="batch")
+
+    def test_replica_falls_back_to_primary(self):
+        """Test that read routing uses the primary without a replica."""
+        registry = EngineRegistry(make_settings())
+        assert registry.sync_engine(replica=True) is registry.sync_engine()
+
+    def test_replica_routing(self):
+        """Test that read-only engines point at the replica host."""
+        registry = EngineRegistry(make_settings(db_replica_host="replica.db", db_replica_port=6432))
+
+        replica = registry.async_engine(replica=True)
+
+        assert replica is not registry.async_engine()
+        assert replica.url.host == "replica.db"
+        assert replica.url.port == 6432
+
+    def test_pgbouncer_transaction_mode(self):
+        """Test that PgBouncer mode disables pooling and prepared statements."""
+        registry = EngineRegistry(make_settings(db_pgbouncer_transaction_mode=True))
+
+        options = registry.pool_options("async")
+
+        assert options["poolclass"] is NullPool
+        assert options["connect_args"]["statement_cache_size"] == 0
+        assert options["connect_args"]["prepared_statement_cache_size"] == 0
+        assert isinstance(registry.async_engine().pool, NullPool)
+
+    def test_session_factory_follows_role_change(self):
+        """Test that factories bind to the engine current at session creation."""
+        registry = EngineRegistry(make_settings())
+        factory = registry.sync_session_factory()
+        api_engine = factory().bind
+
+        registry.configure(role="worker")
+
+        assert factory().bind is registry.sync_engine()
+        assert factory().bind is not api_engine
+
+    def test_reset_after_fork_replaces_pools(self):
+        """Test that a forked child gets fresh pools on the same engines."""
+        registry = EngineRegistry(make_settings())
+        engine = registry.sync_engine()
+        pool = engine.pool
+
+        registry.reset_after_fork()
+
+        assert registry.sync_engine() is engine
+        assert engine.pool is not pool
+        assert type(engine.pool) is type(pool)
+
+    def test_listeners_see_every_engine(self):
+        """Test that listeners run for existing and new engines."""
+        registry = EngineRegistry(make_settings())
+        existing = registry.sync_engine()
+        seen = []
+
+        registry.add_listener(seen.append)
+        created = registry.async_engine()
+
+        assert seen == [existing, created]
+
+
+class TestPoolMetrics:
+    """Test pool wait and checkout duration metrics."""
+
+    def sample(self, name, labels):
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    def test_wait_and_checkout_are_recorded(self):
+        """Test that connection checkouts are timed."""
+        labels = {"role": "test", "driver": "sync", "target": "primary"}
+        engine = create_engine(
+            "sqlite://",
+            poolclass=_timed_pool_class(QueuePool, labels),
+            pool_size=1,
+        )
+        _track_checkout(engine, labels)
+        waits = self.sample("db_pool_wait_seconds_count", labels)
+        checkouts = self.sample("db_connection_checkout_seconds_count", labels)
+
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        assert self.sample("db_pool_wait_seconds_count", labels) == waits + 3
+        assert self.sample("db_connection_checkout_seconds_count", labels) == checkouts + 3
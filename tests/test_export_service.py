@@ -0,0 +1,130 @@
+"""
+Tests for streaming report exports.
+
+Uses a fake streaming result so batches from the server-side cursor can be
+observed without a database.
+"""
+
+import csv
+import gzip
+import io
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+from src.api.export_service import (
+    EXPORT_BATCH_SIZE,
+    INTERVENTION_HEADERS,
+    TUTOR_PERFORMANCE_HEADERS,
+    ExportService,
+    gzip_stream,
+)
+from src.database.models import InterventionStatus, InterventionType, PerformanceTier
+
+
+class FakeStreamResult:
+    """AsyncResult stand-in yielding pre-built partitions."""
+
+    def __init__(self, partitions):
+        self._partitions = partitions
+
+    async def partitions(self):
+        for partition in self._partitions:
+            yield partition
+
+
+def make_session(partitions):
+    session = Mock()
+    session.stream = AsyncMock(return_value=FakeStreamResult(partitions))
+    return session
+
+
+def metric_row(tutor_id="tutor_001", rating=4.5):
+    return (
+        tutor_id,
+        datetime(2025, 11, 1),
+        PerformanceTier.STRONG,
+        rating,
+        80.0,
+        5.0,
+        1,
+        7.5,
+        90.0,
+        12,
+    )
+
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_csv_streams_one_chunk_per_batch():
+    partitions = [[metric_row(f"tutor_{i:03d}") for i in range(3)], [metric_row("tutor_999")]]
+    session = make_session(partitions)
+
+    chunks = [c async for c in ExportService(session).stream_tutor_performance_csv()]
+
+    # Header chunk plus one chunk per partition
+    assert len(chunks) == 3
+    query = session.stream.call_args[0][0]
+    assert query.get_execution_options()["yield_per"] == EXPORT_BATCH_SIZE
+
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert rows[0] == TUTOR_PERFORMANCE_HEADERS
+    assert [r[0] for r in rows[1:]] == ["tutor_000", "tutor_001", "tutor_002", "tutor_999"]
+    assert rows[1][2:4] == ["Strong", "4.50"]
+
+
+@pytest.mark.asyncio
+async def test_interventions_csv_formats_rows():
+    row = (
+        "intv_001",
+        "tutor_001",
+        InterventionType.AUTOMATED_COACHING,
+        InterventionStatus.PENDING,
+        datetime(2025, 11, 1, 9, 30),
+        None,
+        None,
+        None,
+        None,
+    )
+    session = make_session([[row]])
+
+    data = await collect(ExportService(session).stream_interventions_csv())
+
+    rows = list(csv.reader(io.StringIO(data.decode("utf-8"))))
+    assert rows[0] == INTERVENTION_HEADERS
+    assert rows[1] == [
+        "intv_001", "tutor_001", InterventionType.AUTOMATED_COACHING.value, "pending",
+        "2025-11-01 09:30", "N/A", "N/A", "Automated", "N/A",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_compressed_stream_is_valid_gzip():
+    session = make_session([[metric_row()] * 10])
+    service = ExportService(session)
+
+    compressed = await collect(service.stream_tutor_performance_csv(compress=True))
+    plain = await collect(ExportService(make_session([[metric_row()] * 10])).stream_tutor_performance_csv())
+
+    assert gzip.decompress(compressed) == plain
+
+
+@pytest.mark.asyncio
+async def test_export_csv_buffer_matches_stream():
+    session = make_session([[metric_row()]])
+
+    buffer = await ExportService(session).export_tutor_performance_csv()
+
+    assert buffer.getvalue().splitlines()[0].startswith("Tutor ID,")
+
+
+@pytest.mark.asyncio
+async def test_gzip_stream_empty_input():
+    async def nothing():
+        return
+        yield
+
+    assert gzip.decompress(await collect(gzip_stream(nothing()))) == b""
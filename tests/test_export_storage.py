@@ -0,0 +1,72 @@
+"""
+Tests for shared export storage: atomic writes, ranged reads and retention.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.api.export_storage import ExportStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    pytest.importorskip("pyarrow")
+    return ExportStorage(str(tmp_path / "exports"))
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+class TestExportStorage:
+    """Test writing, reading and expiring export files."""
+
+    @pytest.mark.asyncio
+    async def test_write_is_atomic(self, storage, tmp_path):
+        size = await storage.write(chunks(b"a,b\n", b"1,2\n"), "reports/abc.csv")
+
+        assert size == 8
+        assert storage.size("reports/abc.csv") == 8
+        assert b"".join(storage.read("reports/abc.csv")) == b"a,b\n1,2\n"
+        assert not storage.exists("reports/abc.csv.part")
+
+    @pytest.mark.asyncio
+    async def test_failed_write_leaves_nothing(self, storage):
+        async def failing():
+            yield b"a,b\n"
+            raise RuntimeError("cursor closed")
+
+        with pytest.raises(RuntimeError):
+            await storage.write(failing(), "reports/abc.csv")
+
+        assert not storage.exists("reports/abc.csv")
+        assert not storage.exists("reports/abc.csv.part")
+
+    @pytest.mark.asyncio
+    async def test_read_range(self, storage):
+        await storage.write(chunks(b"0123456789"), "reports/abc.csv")
+
+        assert b"".join(storage.read("reports/abc.csv", 2, 5, chunk_size=3)) == b"2345"
+        assert b"".join(storage.read("reports/abc.csv", 8)) == b"89"
+
+    def test_upload(self, storage, tmp_path):
+        local = tmp_path / "archive.zip"
+        local.write_bytes(b"zip")
+
+        assert storage.upload(str(local), "gdpr/x/archive.zip") == 3
+        assert b"".join(storage.read("gdpr/x/archive.zip")) == b"zip"
+
+    @pytest.mark.asyncio
+    async def test_delete_expired(self, storage, tmp_path):
+        await storage.write(chunks(b"old"), "gdpr/job/archive.zip")
+        await storage.write(chunks(b"new"), "reports/new.csv")
+
+        assert storage.delete_expired(timedelta(hours=72)) == 0
+
+        later = datetime.now(timezone.utc) + timedelta(hours=73)
+        assert storage.delete_expired(timedelta(hours=72), now=later) == 2
+        assert not storage.exists("gdpr/job/archive.zip")
+        assert not (tmp_path / "exports" / "gdpr").exists()
+        assert (tmp_path / "exports").exists()
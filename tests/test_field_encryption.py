@@ -0,0 +1,162 @@
+"""
+Tests for field-level encryption: AES-GCM envelopes with key IDs, legacy
+Fernet compatibility, batch operations, blind indexes and lazily decrypted
+model attributes.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import declarative_base
+
+from src.api.security.encryption import EncryptionService
+from src.database.encrypted_types import (
+    BlindIndex,
+    EncryptedAttribute,
+    EncryptedString,
+    prefetch_decrypted,
+)
+
+OLD_KEY = Fernet.generate_key()
+NEW_KEY = Fernet.generate_key()
+
+Base = declarative_base()
+
+
+class Contact(Base):
+    __tablename__ = "contacts"
+
+    id = Column(Integer, primary_key=True)
+    email_ciphertext = Column(String(500))
+    email_index = Column(BlindIndex(), index=True)
+    email = EncryptedAttribute("email_ciphertext", blind_index="email_index")
+
+
+@pytest.fixture
+def service():
+    return EncryptionService(NEW_KEY, key_id="k2", retired_keys={"k1": OLD_KEY})
+
+
+class TestEncryptionService:
+    """Test envelopes, rotation and batch operations."""
+
+    def test_round_trip_carries_key_id(self, service):
+        ciphertext = service.encrypt("student@example.com")
+
+        assert ciphertext.startswith("$g1$k2$")
+        assert service.decrypt(ciphertext) == "student@example.com"
+        assert service.encrypt("student@example.com") != ciphertext
+
+    def test_retired_key_and_rotation(self, service):
+        old = EncryptionService(OLD_KEY, key_id="k1", retired_keys={})
+        ciphertext = old.encrypt("555-1234")
+
+        assert service.decrypt(ciphertext) == "555-1234"
+        assert service.needs_rotation(ciphertext)
+
+        rotated = service.rotate(ciphertext)
+        assert service.key_id_of(rotated) == "k2"
+        assert service.decrypt(rotated) == "555-1234"
+        assert service.rotate(rotated) == rotated
+
+    def test_legacy_fernet_tokens_still_decrypt(self, service):
+        token = Fernet(NEW_KEY).encrypt(b"legacy@example.com").decode()
+
+        assert service.decrypt(token) == "legacy@example.com"
+        assert service.needs_rotation(token)
+
+    def test_legacy_token_under_retired_key_rotates(self, service):
+        # Written before the primary key moved to ENCRYPTION_RETIRED_KEYS
+        token = Fernet(OLD_KEY).encrypt(b"legacy@example.com").decode()
+
+        assert service.decrypt(token) == "legacy@example.com"
+        rotated = service.rotate(token)
+        assert service.key_id_of(rotated) == "k2"
+        assert service.decrypt(rotated) == "legacy@example.com"
+
+    def test_rotate_refuses_undecryptable_values(self, service):
+        unknown = EncryptionService(Fernet.generate_key(), key_id="k0", retired_keys={})
+        legacy = Fernet(Fernet.generate_key()).encrypt(b"lost@example.com").decode()
+
+        with pytest.raises(ValueError, match="'k0'"):
+            service.rotate(unknown.encrypt("lost@example.com"))
+        with pytest.raises(ValueError, match="legacy Fernet"):
+            service.rotate(legacy)
+
+    def test_key_id_is_authenticated(self, service):
+        ciphertext = service.encrypt("secret")
+        tampered = ciphertext.replace("$k2$", "$k1$")
+
+        # Undecryptable values are returned as-is
+        assert service.decrypt(tampered) == tampered
+
+    def test_batch_operations(self, service):
+        values = ["a@example.com", None, "", "b@example.com"]
+
+        encrypted = service.encrypt_many(values)
+
+        assert encrypted[1] is None and encrypted[2] == ""
+        assert encrypted[0] != encrypted[3]
+        assert service.decrypt_many(encrypted + [encrypted[0]]) == values + ["a@example.com"]
+
+    def test_blind_index(self, service):
+        index = service.blind_index(" Student@Example.com ")
+
+        assert index == service.blind_index("student@example.com")
+        assert index != service.blind_index("other@example.com")
+        assert len(index) == 64
+        assert service.blind_index(None) is None
+
+        pinned = EncryptionService(NEW_KEY, key_id="k2", retired_keys={}, blind_index_key=OLD_KEY)
+        rotated = EncryptionService(OLD_KEY, key_id="k3", retired_keys={}, blind_index_key=OLD_KEY)
+        assert pinned.blind_index("x@example.com") == rotated.blind_index("x@example.com")
+
+
+class TestEncryptedColumns:
+    """Test the SQLAlchemy types and lazily decrypted attributes."""
+
+    def test_encrypted_string_round_trip(self, service):
+        column_type = EncryptedString()
+        dialect = postgresql.dialect()
+
+        with patch("src.database.encrypted_types.encryption_service", service):
+            stored = column_type.process_bind_param("student@example.com", dialect)
+            assert column_type.process_result_value(stored, dialect) == "student@example.com"
+
+    def test_blind_index_compares_hashes(self, service):
+        query = select(Contact.id).where(Contact.email_index == "Student@example.com")
+        bind = query.whereclause.right
+
+        with patch("src.database.encrypted_types.encryption_service", service):
+            stored = bind.type.bind_processor(postgresql.dialect())(bind.value)
+
+        assert stored == service.blind_index("student@example.com")
+
+    def test_attribute_encrypts_and_decrypts_once(self, service):
+        with patch("src.database.encrypted_types.encryption_service", service):
+            contact = Contact(email="student@example.com")
+            assert contact.email_ciphertext.startswith("$g1$k2$")
+            assert contact.email_index == "student@example.com"
+
+            loaded = Contact(email_ciphertext=contact.email_ciphertext)
+            with patch.object(service, "decrypt", wraps=service.decrypt) as decrypt:
+                assert loaded.email == "student@example.com"
+                assert loaded.email == "student@example.com"
+            assert decrypt.call_count == 1
+
+    def test_prefetch_decrypts_batch(self, service):
+        with patch("src.database.encrypted_types.encryption_service", service):
+            ciphertexts = service.encrypt_many([f"s{i}@example.com" for i in range(5)])
+            contacts = [Contact(email_ciphertext=c) for c in ciphertexts]
+
+            with patch.object(service, "decrypt_many", wraps=service.decrypt_many) as decrypt_many:
+                prefetch_decrypted(contacts, "email")
+                emails = [contact.email for contact in contacts]
+                prefetch_decrypted(contacts, "email")
+
+        assert emails == [f"s{i}@example.com" for i in range(5)]
+        assert decrypt_many.call_count == 2
+        assert decrypt_many.call_args_list[1].args[0] == []
@@ -0,0 +1,197 @@
+"""
+Tests for set-based, resumable GDPR erasure.
+
+Statements are checked by compiling them for PostgreSQL; the chunk loop runs
+against a fake session, so no database is required.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import TextClause
+
+from src.database.erasure import (
+    PHASE_DONE,
+    PHASE_NAMES,
+    BulkErasure,
+    ErasureTargets,
+    anonymize_entities_update,
+    phase_statement,
+)
+
+
+def compile_sql(stmt) -> str:
+    return " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+
+
+class FakeDB:
+    """Minimal session: one erasure request row, user lookup and scripted chunk results."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def get(self, model, key):
+        return self.store["request"]
+
+    def add(self, row):
+        self.store["request"] = row
+
+    def commit(self):
+        self.store["commits"] += 1
+
+    def execute(self, stmt):
+        result = MagicMock()
+        if isinstance(stmt, TextClause):
+            self.store["settings"].append(stmt.text)
+            return None
+        if isinstance(stmt, Select):
+            result.all.return_value = self.store["users"]
+            return result
+        self.store["statements"].append(stmt)
+        chunks = self.store["chunks"]
+        result.scalars.return_value.all.return_value = chunks.pop(0) if chunks else []
+        return result
+
+
+def make_store(users=(), chunks=(), request=None):
+    return {
+        "users": list(users),
+        "chunks": list(chunks),
+        "request": request,
+        "statements": [],
+        "settings": [],
+        "commits": 0,
+    }
+
+
+TUTOR = SimpleNamespace(id=1, tutor_id="tutor_1", student_id=None)
+STUDENT = SimpleNamespace(id=2, tutor_id=None, student_id="stu_2")
+
+
+class TestStatements:
+    """Test generated UPDATE/DELETE statements."""
+
+    def test_phases_delete_children_before_parents(self):
+        assert PHASE_NAMES.index("student_feedback") < PHASE_NAMES.index("sessions")
+        assert PHASE_NAMES.index("sessions") < PHASE_NAMES.index("tutor")
+        assert PHASE_NAMES.index("interventions") < PHASE_NAMES.index("tutor")
+        assert PHASE_NAMES[-1] == "user_account"
+
+    def test_sessions_chunk_covers_tutors_and_students(self):
+        targets = ErasureTargets(user_ids=[1, 2], tutor_ids=["tutor_1"], student_ids=["stu_2"])
+
+        sql = compile_sql(phase_statement("sessions", targets, 500))
+
+        assert sql.startswith("WITH doomed AS")
+        assert "sessions.tutor_id = ANY (" in sql and " OR sessions.student_id = ANY (" in sql
+        assert "FOR UPDATE" in sql and "SKIP LOCKED" not in sql
+        assert "RETURNING sessions.session_id" in sql
+
+    def test_ids_bound_as_one_array(self):
+        user_ids = list(range(1, 50_001))
+        targets = ErasureTargets(user_ids=user_ids, tutor_ids=[], student_ids=[])
+
+        statement = phase_statement("user_account", targets, 500)
+        compiled = statement.compile(dialect=postgresql.dialect())
+
+        assert "users.id = ANY (" in str(compiled)
+        assert len(compiled.params) == 2  # the ID array and the chunk size
+        assert user_ids in compiled.params.values()
+
+    def test_tutor_phases_skipped_without_tutors(self):
+        targets = ErasureTargets(user_ids=[2], tutor_ids=[], student_ids=["stu_2"])
+
+        assert phase_statement("performance_metrics", targets, 500) is None
+        assert phase_statement("tutor", targets, 500) is None
+        assert phase_statement("sessions", targets, 500) is not None
+
+    def test_audit_logs_anonymized_or_deleted(self):
+        retained = ErasureTargets(user_ids=[1], tutor_ids=[], student_ids=[], retain_audit_logs=True)
+        deleted = ErasureTargets(user_ids=[1], tutor_ids=[], student_ids=[], retain_audit_logs=False)
+
+        anonymize = compile_sql(phase_statement("audit_logs", retained, 500))
+        assert "UPDATE audit_logs SET user_id=" in anonymize
+        assert "jsonb_typeof(audit_logs.metadata)" in anonymize
+        assert compile_sql(phase_statement("audit_logs", deleted, 500)).startswith(
+            "WITH doomed AS (SELECT audit_logs.log_id"
+        )
+
+    def test_anonymize_entities(self):
+        sql = compile_sql(anonymize_entities_update("tutor", ["tutor_1", "tutor_2"]))
+
+        assert sql.startswith("UPDATE tutors SET name=")
+        assert "RETURNING tutors.tutor_id" in sql
+        with pytest.raises(ValueError):
+            anonymize_entities_update("manager", ["m1"])
+
+
+class TestBulkErasure:
+    """Test request creation, the chunk loop and checkpointing."""
+
+    def test_create_resolves_targets(self):
+        store = make_store(users=[TUTOR, STUDENT])
+
+        request_id = BulkErasure(lambda: FakeDB(store)).create([1, 2, 99], "Test", requested_by=5)
+
+        request = store["request"]
+        assert request.request_id == request_id
+        assert request.user_ids == [1, 2]
+        assert request.tutor_ids == ["tutor_1"] and request.student_ids == ["stu_2"]
+        assert request.phase == PHASE_NAMES[0]
+
+    def test_runs_all_phases(self):
+        store = make_store(users=[TUTOR], chunks=[["f1", "f2"], ["f3"]])
+        erasure = BulkErasure(lambda: FakeDB(store), chunk_size=2)
+
+        stats = erasure.run(erasure.create([1], "Test"))
+
+        assert stats["completed"] is True
+        assert stats["rows_affected"]["student_feedback"] == 3
+        assert store["request"].phase == PHASE_DONE
+        assert store["request"].completed_at is not None
+        # Feedback needed a second chunk; the student phase has nothing to do for a tutor
+        assert len(store["statements"]) == len(PHASE_NAMES)
+        assert store["settings"].count("SET LOCAL lock_timeout = 2000") == len(PHASE_NAMES)
+
+    def test_resumes_from_checkpoint(self):
+        request = SimpleNamespace(
+            request_id="erasure_1",
+            user_ids=[1],
+            tutor_ids=["tutor_1"],
+            student_ids=[],
+            retain_audit_logs=True,
+            phase="tutor",
+            rows_affected={"sessions": 10},
+            completed_at=None,
+        )
+        store = make_store(chunks=[["tutor_1"], [1]], request=request)
+
+        stats = BulkErasure(lambda: FakeDB(store)).run("erasure_1")
+
+        assert stats["rows_affected"] == {"sessions": 10, "tutor": 1, "user_account": 1}
+        # The student phase has nothing to do for a tutor, so only two statements run
+        assert len(store["statements"]) == 2
+        assert stats["completed"] is True
+
+    def test_time_budget_leaves_request_resumable(self):
+        store = make_store(users=[TUTOR])
+        erasure = BulkErasure(lambda: FakeDB(store), time_budget_seconds=0)
+
+        stats = erasure.run(erasure.create([1], "Test"))
+
+        assert stats["completed"] is False
+        assert stats["chunks"] == 0
+        assert store["request"].phase == PHASE_NAMES[0]
+
+    def test_unknown_request(self):
+        with pytest.raises(ValueError, match="not found"):
+            BulkErasure(lambda: FakeDB(make_store())).run("erasure_missing")
@@ -0,0 +1,254 @@
+"""
+Tests for the streaming GDPR export: section queries, NDJSON section files,
+concurrent section export, resumable jobs (Redis manifest, shared export
+storage) and the ZIP archive.
+"""
+
+import json
+import zipfile
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.api.compliance import gdpr_export
+from src.api.config import settings
+from src.api.compliance.gdpr_export import (
+    ExportContext,
+    ExportJob,
+    ExportSection,
+    GDPRExporter,
+    EXPORT_SECTIONS,
+)
+from src.database.models import SessionType
+
+EXPORT_ID = "0123456789abcdef0123456789abcdef"
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the manifest commands ExportJob uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        self.expiry[key] = ex
+        return True
+
+
+class FakeStreamResult:
+    """Stands in for AsyncResult.scalars() with partitioned rows."""
+
+    def __init__(self, rows, batch_size):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    def scalars(self):
+        return self
+
+    async def partitions(self):
+        for start in range(0, len(self.rows), self.batch_size):
+            yield self.rows[start:start + self.batch_size]
+
+
+class FakeSessionFactory:
+    """Hands out sessions that stream rows by section query."""
+
+    def __init__(self, rows_by_query, fail_on=None):
+        self.rows_by_query = rows_by_query
+        self.fail_on = fail_on
+        self.streamed = []
+        self.open_sessions = 0
+        self.max_open_sessions = 0
+
+    @asynccontextmanager
+    async def __call__(self):
+        self.open_sessions += 1
+        self.max_open_sessions = max(self.max_open_sessions, self.open_sessions)
+        try:
+            yield SimpleNamespace(stream=self.stream)
+        finally:
+            self.open_sessions -= 1
+
+    async def stream(self, query):
+        name = query.get_execution_options()["section"]
+        if name == self.fail_on:
+            raise RuntimeError(f"{name} failed")
+        self.streamed.append(name)
+        return FakeStreamResult(self.rows_by_query[name], query.get_execution_options()["yield_per"])
+
+
+def fake_section(name):
+    from sqlalchemy import select, literal
+
+    return ExportSection(
+        name,
+        lambda ctx: select(literal(1)).execution_options(section=name),
+        lambda row, ctx: {"id": row, "user_id": ctx.user_id},
+    )
+
+
+@pytest.fixture
+def sections():
+    fakes = [fake_section("alpha"), fake_section("beta"), fake_section("gamma")]
+    profile = {
+        "export_metadata": {"user_id": 7},
+        "account_information": {"id": 7},
+        "tutor_data": None,
+        "student_data": None,
+        "context": ExportContext(user_id=7),
+    }
+    with patch.object(gdpr_export, "EXPORT_SECTIONS", fakes), \
+            patch.object(gdpr_export, "load_profile", AsyncMock(side_effect=lambda *a: dict(profile))):
+        yield fakes
+
+
+ROWS = {"alpha": list(range(5)), "beta": [], "gamma": list(range(100, 103))}
+
+
+@pytest.fixture
+def redis_client():
+    return FakeRedis()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    pytest.importorskip("pyarrow")
+    from src.api.export_storage import ExportStorage
+
+    return ExportStorage(str(tmp_path / "exports"))
+
+
+@pytest.fixture
+def new_job(storage, redis_client):
+    """Job handle as the API or a worker would open it (shared Redis and storage)."""
+    return lambda export_id=EXPORT_ID: ExportJob(export_id, storage=storage, redis_client=redis_client)
+
+
+class TestSectionQueries:
+    """Test the section queries and records shared with export_user_data."""
+
+    def test_sessions_selected_once_for_tutor_and_student(self):
+        ctx = ExportContext(user_id=1, tutor_id="T1", student_id="S1")
+        sql = str(gdpr_export._sessions_query(ctx).compile(dialect=postgresql.dialect()))
+
+        assert sql.count("FROM sessions") == 1
+        assert " OR " in sql
+
+    def test_no_query_without_role(self):
+        ctx = ExportContext(user_id=1)
+
+        skipped = [section.name for section in EXPORT_SECTIONS if section.query(ctx) is None]
+
+        assert "sessions" in skipped and "feedback" in skipped
+        assert "notifications" not in skipped
+
+    def test_session_record_depends_on_role(self):
+        ctx = ExportContext(user_id=1, tutor_id="T1", student_id="S1")
+        common = dict(
+            session_number=1, scheduled_start=datetime(2025, 1, 1), actual_start=None,
+            duration_minutes=60, subject="Algebra", session_type=SessionType.ONE_ON_ONE,
+            tutor_initiated_reschedule=False, no_show=False, late_start_minutes=0,
+            engagement_score=0.9, learning_objectives_met=True, technical_issues=False,
+        )
+
+        taught = gdpr_export._session_record(
+            SimpleNamespace(session_id="A", tutor_id="T1", student_id="S9", **common), ctx
+        )
+        attended = gdpr_export._session_record(
+            SimpleNamespace(session_id="B", tutor_id="T9", student_id="S1", **common), ctx
+        )
+
+        assert taught["student_id"] == "S9" and "no_show" in taught
+        assert attended["tutor_id"] == "T9" and "no_show" not in attended
+
+
+class TestGDPRExporter:
+    """Test background export jobs."""
+
+    @pytest.mark.asyncio
+    async def test_writes_archive(self, sections, new_job, storage, tmp_path):
+        factory = FakeSessionFactory(ROWS)
+        new_job().create(user_id=7)
+
+        # The worker opens the job created by the API
+        job = new_job()
+        archive = await GDPRExporter(factory, batch_size=2, max_concurrency=2).run(job)
+
+        assert archive == f"gdpr/{EXPORT_ID}/tutormax_data_export_7.zip"
+        local = tmp_path / "download.zip"
+        local.write_bytes(b"".join(storage.read(archive)))
+        with zipfile.ZipFile(local) as zf:
+            assert sorted(zf.namelist()) == ["alpha.ndjson", "beta.ndjson", "gamma.ndjson", "profile.json"]
+            alpha = [json.loads(line) for line in zf.read("alpha.ndjson").splitlines()]
+            assert zf.read("beta.ndjson") == b""
+            assert json.loads(zf.read("profile.json"))["account_information"] == {"id": 7}
+        assert alpha == [{"id": i, "user_id": 7} for i in range(5)]
+        assert factory.max_open_sessions <= 2
+
+        progress = new_job().progress()
+        assert progress["status"] == "ready"
+        assert progress["sections_done"] == progress["sections_total"] == 3
+        assert progress["rows_exported"] == {"alpha": 5, "beta": 0, "gamma": 3}
+        assert progress["expires_at"] is not None
+        assert [p.name for p in (tmp_path / "exports" / "gdpr" / EXPORT_ID).iterdir()] == [
+            "tutormax_data_export_7.zip"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_finished_sections(self, sections, new_job, storage):
+        job = new_job()
+        job.create(user_id=7)
+
+        with pytest.raises(RuntimeError):
+            await GDPRExporter(FakeSessionFactory(ROWS, fail_on="gamma"), max_concurrency=1).run(job)
+
+        failed = new_job()
+        assert failed.progress()["status"] == "failed"
+        assert failed.manifest["sections"]["alpha"]["status"] == "done"
+        assert not storage.exists(failed.section_name("gamma"))
+
+        factory = FakeSessionFactory(ROWS)
+        await GDPRExporter(factory).run(failed)
+
+        assert factory.streamed == ["gamma"]
+        assert failed.progress()["status"] == "ready"
+
+    def test_manifest_expires_with_retention(self, redis_client):
+        job = ExportJob(EXPORT_ID, redis_client=redis_client)
+        job.create(user_id=7)
+
+        assert redis_client.expiry[job.key] == settings.export_retention_hours * 3600
+        # Creating again keeps the existing job
+        job.update(status="running")
+        assert ExportJob(EXPORT_ID, redis_client=redis_client).create(user_id=8)["status"] == "running"
+
+    def test_unknown_job(self, redis_client):
+        from src.workers.tasks.scheduled_reports import generate_gdpr_export
+
+        assert ExportJob(EXPORT_ID, redis_client=redis_client).manifest is None
+        with patch.object(gdpr_export, "_job_redis", return_value=redis_client):
+            result = generate_gdpr_export.run(EXPORT_ID)
+        assert result["status"] == "failed"
+
+    def test_rejects_invalid_export_id(self):
+        with pytest.raises(ValueError):
+            ExportJob("../../etc")
+
+    def test_stalled_job(self, sections, redis_client):
+        job = ExportJob(EXPORT_ID, redis_client=redis_client)
+        job.create(user_id=7)
+        assert not job.is_stalled()
+
+        job.manifest["updated_at"] = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+        assert job.is_stalled()
@@ -0,0 +1,421 @@
+"""
+Tests for the workload-driven index advisor.
+
+Covers query shape parsing, index proposals, unused/redundant detection,
+ORM drift and migration rendering. The plan regression tests run EXPLAIN on
+hot queries (with literal values, so any supported PostgreSQL can plan them)
+and are skipped when no database is reachable.
+"""
+
+import pytest
+import pytest_asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from sqlalchemy import select, func
+from sqlalchemy.dialects import postgresql
+
+from src.database.index_advisor import (
+    IndexAdvisor,
+    IndexCandidate,
+    IndexInfo,
+    WorkloadRecorder,
+    detect_index_drift,
+    normalize_sql,
+    orm_indexes,
+    parse_query_shape,
+    render_index_migration,
+    summarize_plan,
+)
+from src.database.models import (
+    Base,
+    Intervention,
+    MetricWindow,
+    Session as SessionModel,
+    TutorPerformanceMetric,
+)
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def literal_sql(statement) -> str:
+    return str(statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+
+
+LATEST_METRIC = (
+    select(TutorPerformanceMetric)
+    .where(
+        TutorPerformanceMetric.tutor_id == "tutor_001",
+        TutorPerformanceMetric.window == MetricWindow.THIRTY_DAY,
+    )
+    .order_by(TutorPerformanceMetric.calculation_date.desc())
+    .limit(1)
+)
+LATEST_METRIC_SQL = compile_sql(LATEST_METRIC)
+
+OVERDUE_INTERVENTIONS_SQL = compile_sql(
+    select(Intervention.intervention_id, Intervention.status)
+    .where(
+        Intervention.tutor_id == "tutor_001",
+        Intervention.due_date < func.now(),
+        Intervention.completed_date.is_(None),
+    )
+)
+
+
+class TestNormalizeSql:
+    """Test statement normalization."""
+
+    def test_literals_and_parameters_collapse(self):
+        a = normalize_sql("SELECT * FROM tutors WHERE tutor_id = 'tutor_001' AND age > 30")
+        b = normalize_sql("SELECT * FROM tutors WHERE tutor_id = $1::VARCHAR AND age > %(age_1)s")
+        assert a == b == "SELECT * FROM tutors WHERE tutor_id = ? AND age > ?"
+
+    def test_in_lists_collapse(self):
+        assert normalize_sql("SELECT 1 FROM t WHERE t.id IN (1, 2, 3)") == "SELECT ? FROM t WHERE t.id IN (?)"
+
+    def test_boolean_literals_kept(self):
+        assert "is_active = true" in normalize_sql("SELECT * FROM t WHERE is_active = true")
+
+    def test_type_casts_kept(self):
+        sql = "SELECT * FROM sessions WHERE created_at::date = :day AND tutor_id = $1::VARCHAR"
+        assert normalize_sql(sql) == (
+            "SELECT * FROM sessions WHERE created_at::date = ? AND tutor_id = ?"
+        )
+        access = parse_query_shape(sql).accesses["sessions"]
+        assert access.equality_columns == ["tutor_id"]
+
+
+class TestParseQueryShape:
+    """Test predicate extraction."""
+
+    def test_equality_and_order(self):
+        access = parse_query_shape(LATEST_METRIC_SQL).accesses["tutor_performance_metrics"]
+
+        assert access.equality_columns == ["tutor_id", "window"]
+        assert access.order_columns == ["calculation_date"]
+        assert access.range_columns == []
+
+    def test_range_constant_and_select_list(self):
+        access = parse_query_shape(OVERDUE_INTERVENTIONS_SQL).accesses["interventions"]
+
+        assert access.equality_columns == ["tutor_id"]
+        assert access.range_columns == ["due_date"]
+        assert access.constant_predicates == ["completed_date IS NULL"]
+        assert access.selected_columns == ["intervention_id", "status"]
+
+    def test_join_aliases_resolved(self):
+        sql = (
+            "SELECT s.session_id FROM sessions AS s JOIN student_feedback AS f "
+            "ON s.session_id = f.session_id WHERE s.tutor_id = $1 AND f.overall_rating >= $2"
+        )
+        accesses = parse_query_shape(sql).accesses
+
+        assert accesses["sessions"].equality_columns == ["tutor_id"]
+        assert accesses["student_feedback"].range_columns == ["overall_rating"]
+
+
+class TestPropose:
+    """Test index proposals."""
+
+    def test_composite_index_key_order(self):
+        shape = parse_query_shape(LATEST_METRIC_SQL, calls=100, total_time_ms=5000)
+        [candidate] = IndexAdvisor().propose([shape])
+
+        assert candidate.columns == ["tutor_id", "window", "calculation_date"]
+        assert candidate.calls == 100
+        assert candidate.weight_ms == 5000
+
+    def test_partial_covering_index(self):
+        shape = parse_query_shape(OVERDUE_INTERVENTIONS_SQL, calls=10, total_time_ms=1000)
+        [candidate] = IndexAdvisor().propose([shape])
+
+        assert candidate.columns == ["tutor_id", "due_date"]
+        assert candidate.include_columns == ["intervention_id", "status"]
+        assert candidate.predicate == "completed_date IS NULL"
+        assert candidate.ddl() == (
+            "CREATE INDEX idx_interventions_tutor_id_due_date_partial ON interventions "
+            "(tutor_id, due_date) INCLUDE (intervention_id, status) WHERE completed_date IS NULL"
+        )
+
+    def test_existing_prefix_index_skips_candidate(self):
+        shape = parse_query_shape(LATEST_METRIC_SQL, calls=100, total_time_ms=5000)
+        existing = [IndexInfo(
+            name="idx_metrics_lookup",
+            table="tutor_performance_metrics",
+            columns=["tutor_id", "window", "calculation_date", "performance_tier"],
+        )]
+
+        assert IndexAdvisor().propose([shape], existing) == []
+
+    def test_light_workload_ignored(self):
+        shape = parse_query_shape(LATEST_METRIC_SQL, calls=1, total_time_ms=5)
+        assert IndexAdvisor(min_weight_ms=100).propose([shape]) == []
+
+    def test_statements_merged_by_index(self):
+        shapes = [
+            parse_query_shape(LATEST_METRIC_SQL, calls=10, total_time_ms=80),
+            parse_query_shape(LATEST_METRIC_SQL.replace("LIMIT", "LIMIT 5 OFFSET"), calls=5, total_time_ms=40),
+        ]
+        [candidate] = IndexAdvisor().propose(shapes)
+
+        assert candidate.calls == 15
+        assert candidate.weight_ms == 120
+
+
+class TestIndexAudit:
+    """Test unused and redundant index detection."""
+
+    def test_unused_excludes_constraints_and_small_indexes(self):
+        indexes = [
+            IndexInfo("idx_big_unused", "sessions", ["subject"], size_bytes=50_000_000),
+            IndexInfo("idx_small_unused", "sessions", ["session_type"], size_bytes=8192),
+            IndexInfo("sessions_pkey", "sessions", ["session_id"], primary=True, size_bytes=50_000_000),
+            IndexInfo("idx_used", "sessions", ["tutor_id"], size_bytes=50_000_000, scans=42),
+        ]
+        unused = IndexAdvisor().find_unused_indexes(indexes)
+
+        assert [idx.name for idx in unused] == ["idx_big_unused"]
+
+    def test_prefix_and_duplicate_indexes_are_redundant(self):
+        indexes = [
+            IndexInfo("idx_sessions_tutor", "sessions", ["tutor_id"]),
+            IndexInfo("idx_sessions_tutor_start", "sessions", ["tutor_id", "scheduled_start"]),
+            IndexInfo("idx_a_dup", "students", ["age"]),
+            IndexInfo("idx_b_dup", "students", ["age"]),
+            IndexInfo("idx_partial", "sessions", ["tutor_id"], predicate="(no_show = true)"),
+        ]
+        redundant = {idx.name: other.name for idx, other in IndexAdvisor.find_redundant_indexes(indexes)}
+
+        assert redundant == {
+            "idx_sessions_tutor": "idx_sessions_tutor_start",
+            "idx_b_dup": "idx_a_dup",
+        }
+
+
+class TestOrmDrift:
+    """Test ORM/database index drift detection."""
+
+    def test_detects_missing_and_undeclared(self):
+        declared = orm_indexes(Base.metadata)
+        assert declared, "models declare indexes"
+
+        live = [idx for idx in declared[1:]]
+        live.append(IndexInfo("idx_manual_hotfix", declared[0].table, ["created_at"]))
+
+        drift = detect_index_drift(declared, live)
+
+        assert [d["name"] for d in drift["missing_in_database"]] == [declared[0].name]
+        assert [d["name"] for d in drift["undeclared_in_orm"]] == ["idx_manual_hotfix"]
+
+    def test_primary_keys_ignored(self):
+        drift = detect_index_drift([], [IndexInfo("tutors_pkey", "tutors", ["tutor_id"], primary=True)])
+        assert drift == {"missing_in_database": [], "undeclared_in_orm": []}
+
+
+class TestRenderMigration:
+    """Test Alembic migration rendering."""
+
+    def test_migration_is_valid_python_and_reversible(self):
+        candidate = IndexCandidate(
+            table="interventions",
+            columns=["tutor_id", "due_date"],
+            include_columns=["status"],
+            predicate="completed_date IS NULL",
+        )
+        unused = IndexInfo("idx_old", "sessions", ["subject"])
+
+        source = render_index_migration(
+            "abc123def456", "60d4f94b9647", [candidate], [unused],
+            create_date=datetime(2025, 11, 12, 9, 30),
+        )
+        compile(source, "migration.py", "exec")
+
+        assert "revision = 'abc123def456'" in source
+        assert "down_revision = '60d4f94b9647'" in source
+        assert "postgresql_where=sa.text('completed_date IS NULL')" in source
+        assert "postgresql_include=['status']" in source
+        upgrade, downgrade = source.split("def downgrade")
+        assert "op.drop_index('idx_old'" in upgrade
+        assert "'idx_old'," in downgrade and "op.drop_index(" + repr(candidate.name) in downgrade
+
+
+class TestWorkloadRecorder:
+    """Test in-process workload capture."""
+
+    def test_records_normalized_shapes(self):
+        recorder = WorkloadRecorder()
+        recorder.record("SELECT * FROM tutors WHERE tutors.tutor_id = 'a'", 2.0)
+        recorder.record("SELECT * FROM tutors WHERE tutors.tutor_id = 'b'", 3.0)
+        recorder.record("SELECT * FROM students WHERE students.age > 10", 1.0)
+
+        shapes = recorder.shapes()
+
+        assert len(shapes) == 2
+        assert shapes[0].calls == 2
+        assert shapes[0].total_time_ms == 5.0
+        assert shapes[0].accesses["tutors"].equality_columns == ["tutor_id"]
+
+    def test_max_shapes_bounds_memory(self):
+        recorder = WorkloadRecorder(max_shapes=1)
+        recorder.record("SELECT * FROM tutors", 1.0)
+        recorder.record("SELECT * FROM students", 1.0)
+
+        assert len(recorder.shapes()) == 1
+
+
+class FakePlanSession:
+    """Records executed SQL and answers EXPLAIN with a fixed total cost."""
+
+    def __init__(self, server_version, fail_on=None):
+        self.server_version = server_version
+        self.fail_on = fail_on
+        self.executed = []
+        self.rolled_back = False
+
+    async def execute(self, statement, params=None):
+        sql = statement.text
+        self.executed.append(sql)
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError(f"{self.fail_on} failed")
+        if sql.startswith("SHOW"):
+            value = self.server_version
+        elif sql.startswith("EXPLAIN"):
+            value = [{"Plan": {"Total Cost": 10.0}}]
+        else:
+            value = None
+        return type("Result", (), {"scalar": lambda self: value})()
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+class TestHypotheticalEstimates:
+    """Test cost estimates for parameterized statements on each server version."""
+
+    def candidate(self):
+        return IndexCandidate(
+            table="sessions",
+            columns=["tutor_id"],
+            statements=["SELECT * FROM sessions WHERE sessions.tutor_id = ? LIMIT ?"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_generic_plan_on_pg16(self):
+        session = FakePlanSession(160002)
+
+        candidate = await IndexAdvisor().estimate_with_hypothetical_index(session, self.candidate())
+
+        assert candidate.estimated_cost_before == candidate.estimated_cost_after == 10.0
+        assert (
+            "EXPLAIN (FORMAT JSON, GENERIC_PLAN) "
+            "SELECT * FROM sessions WHERE sessions.tutor_id = $1 LIMIT $2"
+        ) in session.executed
+        assert session.executed.count("SHOW server_version_num") == 1
+
+    @pytest.mark.asyncio
+    async def test_prepared_generic_plan_before_pg16(self):
+        session = FakePlanSession(150008)
+
+        candidate = await IndexAdvisor().estimate_with_hypothetical_index(session, self.candidate())
+
+        assert candidate.estimated_cost_before == 10.0 and candidate.estimate_error is None
+        assert "SET LOCAL plan_cache_mode = force_generic_plan" in session.executed
+        assert "EXPLAIN (FORMAT JSON) EXECUTE index_advisor_plan(NULL, NULL)" in session.executed
+        assert not any("GENERIC_PLAN" in sql for sql in session.executed)
+        # Deallocated after both the before and after estimates
+        assert session.executed.count("DEALLOCATE index_advisor_plan") == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_is_reported(self):
+        session = FakePlanSession(150008, fail_on="hypopg_create_index")
+
+        candidate = await IndexAdvisor().estimate_with_hypothetical_index(session, self.candidate())
+
+        assert candidate.estimated_cost_before is None
+        assert candidate.estimate_error == "hypopg_create_index failed"
+        assert candidate.to_dict()["estimate_error"] == "hypopg_create_index failed"
+        assert session.rolled_back
+
+
+class TestSummarizePlan:
+    """Test EXPLAIN plan flattening."""
+
+    def test_collects_indexes_and_seq_scans(self):
+        plan = [{"Plan": {
+            "Node Type": "Nested Loop",
+            "Total Cost": 42.5,
+            "Plans": [
+                {"Node Type": "Index Scan", "Index Name": "idx_sessions_tutor_start", "Relation Name": "sessions"},
+                {"Node Type": "Seq Scan", "Relation Name": "student_feedback"},
+            ],
+        }}]
+        summary = summarize_plan(plan)
+
+        assert summary["total_cost"] == 42.5
+        assert summary["indexes"] == ["idx_sessions_tutor_start"]
+        assert summary["seq_scans"] == ["student_feedback"]
+
+
+# ==================== Plan Regression ====================
+
+HOT_QUERIES = {
+    "latest_metric": (literal_sql(LATEST_METRIC), "tutor_performance_metrics"),
+    "tutor_interventions": (
+        literal_sql(
+            select(Intervention)
+            .where(Intervention.tutor_id == "tutor_001")
+            .order_by(Intervention.recommended_date.desc())
+        ),
+        "interventions",
+    ),
+    "recent_sessions": (
+        literal_sql(
+            select(SessionModel)
+            .where(SessionModel.tutor_id == "tutor_001")
+            .order_by(SessionModel.scheduled_start.desc())
+            .limit(5)
+        ),
+        "sessions",
+    ),
+}
+
+
+@pytest_asyncio.fixture
+async def plan_session():
+    """Database session for EXPLAIN, skipping when no database is reachable."""
+    from sqlalchemy import text
+    from src.database.database import async_session_maker
+
+    try:
+        session = async_session_maker()
+        await session.execute(text("SELECT 1"))
+    except Exception as e:
+        pytest.skip(f"Database not available: {e}")
+
+    try:
+        await session.execute(text("SET enable_seqscan = off"))
+        yield session
+    finally:
+        await session.rollback()
+        await session.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query_name", sorted(HOT_QUERIES))
+async def test_hot_query_uses_index(plan_session, query_name):
+    """Hot queries must be answerable from an index, not a sequential scan."""
+    from sqlalchemy import text
+
+    sql, table = HOT_QUERIES[query_name]
+    result = await plan_session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    summary = summarize_plan(result.scalar())
+
+    assert table not in summary["seq_scans"], f"{query_name} fell back to a sequential scan"
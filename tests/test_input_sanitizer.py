@@ -0,0 +1,144 @@
+"""
+Equivalence tests for the marker-screened input sanitizer.
+
+Screening strings for pattern markers and walking payloads iteratively must
+give exactly the results of scanning every string with every pattern and
+recursing, as the sanitizer did before.
+"""
+
+import random
+
+import pytest
+
+from src.api.security.input_sanitizer import (
+    COMPILED_SQL_PATTERNS,
+    COMPILED_XSS_PATTERNS,
+    remove_xss_patterns,
+    sanitize_dict,
+    sanitize_list,
+    sanitize_string,
+    validate_no_sql_injection,
+)
+
+
+def reference_sql_safe(text):
+    return not any(pattern.search(text) for pattern in COMPILED_SQL_PATTERNS)
+
+
+def reference_remove_xss(text):
+    for pattern in COMPILED_XSS_PATTERNS:
+        text = pattern.sub('', text)
+    return text
+
+
+def reference_sanitize(value, max_length=10000):
+    if isinstance(value, str):
+        return sanitize_string(value, max_length=max_length, check_sql_injection=False)
+    if isinstance(value, dict):
+        return {key: reference_sanitize(item, max_length) for key, item in value.items()}
+    if isinstance(value, list):
+        return [reference_sanitize(item, max_length) for item in value]
+    return value
+
+
+FRAGMENTS = [
+    "union", "select", "from", "where", "insert", "into", "values", "update",
+    "set", "delete", "drop", "table", "exec(", "--", ";", "or", "and", "=",
+    "'", "<script>", "</script>", "javascript:", "onclick =", "<iframe src=x>",
+    "<style>", "</style>", "expression(", "vbscript:", "data:text/html",
+    "<scr", "ipt>", "Grüße", "tutor", "42", " ", "\n", "<b>", "é",
+    "ſelect", "unıon", "ONCLICK=", "DaTa:TeXt/HtMl",
+]
+
+KNOWN_CASES = [
+    "",
+    "plainAlnum123",
+    "Ünïcödé",
+    "John O'Brien",
+    "1 OR 1=1",
+    "admin'--",
+    "'; DROP TABLE users; --",
+    "SELECT name FROM tutors WHERE id = 1",
+    "please update the set list",
+    "<script>alert(1)</script>hello",
+    "<scr<script></script>ipt>alert(1)</script>",
+    "<a onmouseover=steal()>x</a>",
+    "great session, thanks!",
+    "ſelect name from tutors where id = 1",
+    "x' OR 'a'='a'",
+]
+
+
+def random_strings(count, seed=11):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 8)))
+
+
+class TestMarkerScreening:
+    """Test marker screening against scanning every string with every pattern."""
+
+    @pytest.mark.parametrize("text", KNOWN_CASES)
+    def test_known_cases(self, text):
+        assert validate_no_sql_injection(text, raise_on_suspicious=False) == reference_sql_safe(text)
+        assert remove_xss_patterns(text) == reference_remove_xss(text)
+
+    def test_random_fragments(self):
+        for text in random_strings(3000):
+            assert validate_no_sql_injection(text, raise_on_suspicious=False) == reference_sql_safe(text), text
+            assert remove_xss_patterns(text) == reference_remove_xss(text), text
+
+    def test_removal_exposing_later_pattern(self):
+        """Test that a removal exposing a later pattern's match is still caught."""
+        assert remove_xss_patterns("java<script></script>script:x") == "x"
+
+    def test_raises_on_injection(self):
+        with pytest.raises(ValueError, match="dangerous SQL patterns"):
+            validate_no_sql_injection("1; DROP TABLE tutors")
+
+
+class TestIterativePayloadWalk:
+    """Test the iterative dict/list walk against recursion."""
+
+    def test_nested_payload_matches_recursion(self):
+        rng = random.Random(5)
+        strings = list(random_strings(200, seed=3))
+        payload = {
+            "records": [
+                {
+                    "tutor_id": f"T{i}",
+                    "notes": rng.choice(strings),
+                    "scores": [1, 2.5, None, True],
+                    "tags": [rng.choice(strings), {"deep": [rng.choice(strings)]}],
+                }
+                for i in range(100)
+            ],
+            "count": 100,
+        }
+
+        result = sanitize_dict(payload, max_string_length=50, check_sql_injection=False)
+
+        assert result == reference_sanitize(payload, max_length=50)
+        assert list(result) == ["records", "count"]
+
+    def test_deep_nesting_beyond_recursion_limit(self):
+        payload = leaf = []
+        for _ in range(5000):
+            child = []
+            leaf.append(child)
+            leaf = child
+        leaf.append("<b>x</b>")
+
+        result = sanitize_list(payload)
+
+        for _ in range(5000):
+            result = result[0]
+        assert result == ["&lt;b&gt;x&lt;/b&gt;"]
+
+    def test_injection_in_nested_value_raises(self):
+        with pytest.raises(ValueError):
+            sanitize_dict({"a": [{"b": "x' OR '1'='1"}]})
+
+    def test_non_container_passthrough(self):
+        assert sanitize_dict("text") == "text"
+        assert sanitize_list({"a": 1}) == {"a": 1}
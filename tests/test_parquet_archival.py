@@ -0,0 +1,257 @@
+"""
+Tests for cold-storage archival to Parquet.
+
+Statements are checked by compiling them for PostgreSQL; files are written to
+a temporary local archive root by a fake session, so no database is required.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Delete, Select
+from sqlalchemy.sql.elements import TextClause
+
+from src.database.models import Session as SessionModel, SessionType, Student
+
+pa = pytest.importorskip("pyarrow")
+
+# archival imports pyarrow at module level, so it can only be imported after the skip
+from src.database.archival import (  # noqa: E402
+    ARCHIVE_TABLES,
+    PHASE_DONE,
+    ArchiveStore,
+    ParquetArchiver,
+    archived_rows,
+    eligible_students_select,
+    rows_to_table,
+    table_schema,
+)
+
+
+def compile_sql(stmt) -> str:
+    return " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+
+
+OLD = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+
+def student_row(student_id):
+    """Column values for a students row, in table order."""
+    values = {
+        "student_id": student_id,
+        "name": f"Student {student_id}",
+        "subjects_interested": ["Math"],
+        "is_under_13": False,
+        "parent_consent_given": False,
+        "created_at": OLD,
+        "updated_at": OLD,
+    }
+    return tuple(values.get(c.name) for c in Student.__table__.columns)
+
+
+def session_row(session_id, student_id):
+    values = {
+        "session_id": session_id,
+        "tutor_id": "tutor_1",
+        "student_id": student_id,
+        "session_number": 1,
+        "scheduled_start": OLD,
+        "duration_minutes": 60,
+        "subject": "Math",
+        "session_type": SessionType.ONE_ON_ONE,
+        "tutor_initiated_reschedule": False,
+        "no_show": False,
+        "late_start_minutes": 0,
+        "technical_issues": False,
+        "created_at": OLD,
+        "updated_at": OLD,
+    }
+    return tuple(values.get(c.name) for c in SessionModel.__table__.columns)
+
+
+class FakeDB:
+    """Minimal session: a checkpoint row, eligible students and rows per table."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def get(self, model, key):
+        return self.store["checkpoint"]
+
+    def add(self, row):
+        self.store["checkpoint"] = row
+
+    def commit(self):
+        self.store["commits"] += 1
+
+    def execute(self, stmt):
+        result = MagicMock()
+        if isinstance(stmt, TextClause):
+            self.store["settings"].append(stmt.text)
+            return None
+        if isinstance(stmt, Delete):
+            self.store["deletes"].append(stmt.table.name)
+            result.rowcount = len(self.store["rows"].get(stmt.table.name, []))
+            return result
+        if isinstance(stmt, Select) and stmt._for_update_arg is not None:
+            chunks = self.store["chunks"]
+            result.scalars.return_value.all.return_value = chunks.pop(0) if chunks else []
+            return result
+        table = stmt.get_final_froms()[0].name
+        rows = self.store["rows"].get(table, [])
+        result.partitions.return_value = iter([rows] if rows else [])
+        return result
+
+
+def make_store(chunks=(), rows=None, checkpoint=None):
+    return {
+        "chunks": list(chunks),
+        "rows": rows or {},
+        "checkpoint": checkpoint,
+        "settings": [],
+        "deletes": [],
+        "commits": 0,
+    }
+
+
+class TestStatements:
+    """Test eligibility and row selection statements."""
+
+    def test_eligible_students_keyset_and_locking(self):
+        sql = compile_sql(eligible_students_select(datetime(2018, 1, 1), "stu_9", 100))
+
+        assert "NOT (EXISTS (SELECT * FROM sessions" in sql
+        assert "sessions.scheduled_start >" in sql
+        assert "students.student_id >" in sql
+        assert "ORDER BY students.student_id" in sql
+        assert sql.endswith("FOR UPDATE OF students SKIP LOCKED")
+
+    def test_feedback_follows_sessions(self):
+        sql = compile_sql(archived_rows("student_feedback", ["stu_1"]))
+
+        assert "student_feedback.student_id IN" in sql
+        assert "student_feedback.session_id IN (SELECT sessions.session_id" in sql
+
+    def test_children_archived_before_parents(self):
+        names = [name for name, _ in ARCHIVE_TABLES]
+
+        assert names == ["student_feedback", "sessions", "students"]
+
+
+class TestSchema:
+    """Test the Arrow mapping of table columns."""
+
+    def test_session_schema(self):
+        schema, _ = table_schema(SessionModel)
+
+        assert schema.field("session_type").type == pa.string()
+        assert schema.field("duration_minutes").type == pa.int64()
+        assert schema.field("engagement_score").type == pa.float64()
+        assert schema.field("scheduled_start").type.tz == "UTC"
+
+    def test_rows_to_table_converts_enums(self):
+        schema, converters = table_schema(SessionModel)
+
+        table = rows_to_table([session_row("s1", "stu_1")], schema, converters)
+
+        assert table.column("session_type").to_pylist() == ["ONE_ON_ONE"]
+        assert table.column("engagement_score").to_pylist() == [None]
+
+
+class TestParquetArchiver:
+    """Test archival chunks, manifests and reading archives back."""
+
+    def rows(self):
+        return {
+            "students": [student_row("stu_1"), student_row("stu_2")],
+            "sessions": [session_row("s1", "stu_1"), session_row("s2", "stu_2")],
+        }
+
+    def test_run_archives_and_records_manifest(self, tmp_path):
+        store = make_store(chunks=[["stu_1", "stu_2"]], rows=self.rows())
+        archiver = ParquetArchiver(lambda: FakeDB(store), storage_uri=str(tmp_path), chunk_size=5)
+
+        stats = archiver.run(2555)
+
+        assert stats["completed"] is True
+        assert stats["students_archived"] == 2
+        assert stats["rows_archived"]["sessions"] == 2
+        assert store["checkpoint"].phase == PHASE_DONE
+        assert store["checkpoint"].cursor == "stu_2"
+        # Children are deleted before their parents
+        assert store["deletes"] == ["student_feedback", "sessions", "students"]
+
+        manifest = archiver.store.load_manifest(stats["run_id"])
+        assert manifest["completed_at"] is not None
+        # No feedback rows, so no feedback file
+        assert sorted(entry["table"] for entry in manifest["files"]) == ["sessions", "students"]
+        assert all(
+            entry["path"].split("/")[1].startswith("archived_on=") for entry in manifest["files"]
+        )
+        assert archiver.store.verify_manifest(stats["run_id"]) == []
+
+    def test_read_back_with_filters(self, tmp_path):
+        store = make_store(chunks=[["stu_1", "stu_2"]], rows=self.rows())
+        ParquetArchiver(lambda: FakeDB(store), storage_uri=str(tmp_path), chunk_size=5).run(2555)
+
+        sessions = ArchiveStore(str(tmp_path)).read("sessions", filters={"student_id": "stu_2"})
+
+        assert sessions.column("session_id").to_pylist() == ["s2"]
+        with pytest.raises(ValueError, match="Unknown archive table"):
+            ArchiveStore(str(tmp_path)).read("users")
+
+    def test_verify_detects_corruption(self, tmp_path):
+        store = make_store(chunks=[["stu_1", "stu_2"]], rows=self.rows())
+        archiver = ParquetArchiver(lambda: FakeDB(store), storage_uri=str(tmp_path), chunk_size=5)
+        stats = archiver.run(2555)
+        archive = ArchiveStore(str(tmp_path))
+        files = archive.load_manifest(stats["run_id"])["files"]
+        entry = next(e for e in files if e["table"] == "students")
+
+        (tmp_path / entry["path"]).write_bytes(b"not parquet")
+
+        assert archive.verify_manifest(stats["run_id"]) == [entry["path"]]
+
+    def test_resumes_from_checkpoint(self, tmp_path):
+        checkpoint = SimpleNamespace(
+            job_name="archive_students",
+            cutoff=datetime.utcnow() - timedelta(days=2555),
+            phase="students",
+            cursor="stu_0",
+            rows_deleted={"students": 1, "chunks": 1},
+            started_at=datetime(2025, 1, 5, 3, 0),
+            completed_at=None,
+        )
+        store = make_store(
+            chunks=[["stu_1"]], rows={"students": [student_row("stu_1")]}, checkpoint=checkpoint
+        )
+
+        archiver = ParquetArchiver(lambda: FakeDB(store), storage_uri=str(tmp_path), chunk_size=5)
+        stats = archiver.run(2555)
+
+        assert stats["resumed"] is True
+        assert stats["run_id"] == "archive_students-20250105T030000Z"
+        assert stats["students_archived"] == 2
+        files = ArchiveStore(str(tmp_path)).load_manifest(stats["run_id"])["files"]
+        assert [entry["chunk"] for entry in files] == [1]
+
+    def test_time_budget_leaves_run_resumable(self, tmp_path):
+        store = make_store()
+        archiver = ParquetArchiver(
+            lambda: FakeDB(store), storage_uri=str(tmp_path), time_budget_seconds=0
+        )
+
+        stats = archiver.run(2555)
+
+        assert stats["completed"] is False
+        assert stats["chunks"] == 0
+        assert store["checkpoint"].phase == "students"
@@ -0,0 +1,192 @@
+"""
+Tests for the pure-ASGI performance middleware pipeline.
+
+Covers response headers, rate limiting, streaming pass-through and the
+shared request timing delivered to observers and the audit hook.
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api.performance_middleware import (
+    PerformanceMiddleware,
+    RequestObserver,
+    SlidingWindowRateLimiter,
+)
+from src.api.security.security_headers import SecurityHeaders
+
+
+class RecordingObserver(RequestObserver):
+    def __init__(self):
+        self.started = 0
+        self.timings = []
+
+    def request_started(self, scope):
+        self.started += 1
+
+    def request_finished(self, timing):
+        self.timings.append(timing)
+
+
+class RecordingAuditHook:
+    def __init__(self):
+        self.timings = []
+
+    def should_audit(self, method, path):
+        return method == "POST"
+
+    def record(self, timing):
+        self.timings.append(timing)
+
+
+def build_app(**middleware_kwargs):
+    app = FastAPI()
+
+    @app.get("/api/tutors/{tutor_id}")
+    async def get_tutor(tutor_id: str):
+        return {"tutor_id": tutor_id}
+
+    @app.post("/api/tutors")
+    async def create_tutor():
+        return {"created": True}
+
+    app.add_middleware(PerformanceMiddleware, **middleware_kwargs)
+    return app
+
+
+def client_for(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+class TestHeaders:
+    """Test headers added at response start."""
+
+    @pytest.mark.asyncio
+    async def test_timing_and_cache_headers(self):
+        app = build_app()
+
+        async with client_for(app) as client:
+            response = await client.get("/api/tutors/t1", headers={"X-Request-ID": "req-1"})
+
+        assert response.status_code == 200
+        assert response.headers["server-timing"].startswith("app;dur=")
+        assert response.headers["x-response-time"].endswith("ms")
+        assert response.headers["x-request-id"] == "req-1"
+        assert response.headers["cache-control"] == "public, max-age=60, stale-while-revalidate=30"
+
+    @pytest.mark.asyncio
+    async def test_security_headers_hook(self):
+        app = build_app(security_headers=SecurityHeaders())
+
+        async with client_for(app) as client:
+            response = await client.get("/api/tutors/t1")
+
+        assert response.headers["x-frame-options"] == "DENY"
+        assert "strict-transport-security" not in response.headers
+
+
+class TestRateLimiting:
+    """Test the rate limit hook."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_over_limit(self):
+        observer = RecordingObserver()
+        app = build_app(
+            rate_limiter=SlidingWindowRateLimiter(requests_per_minute=2),
+            observers=[observer],
+        )
+
+        async with client_for(app) as client:
+            statuses = [(await client.get("/api/tutors/t1")).status_code for _ in range(3)]
+            limited = await client.get("/api/tutors/t1")
+
+        assert statuses == [200, 200, 429]
+        assert limited.headers["retry-after"] == "60"
+        assert limited.headers["x-ratelimit-remaining"] == "0"
+        # Rejected requests are still observed, once each
+        assert observer.started == len(observer.timings) == 4
+        assert observer.timings[-1].route == "unmatched"
+
+    def test_window_expires(self, monkeypatch):
+        limiter = SlidingWindowRateLimiter(requests_per_minute=1)
+        now = [1000.0]
+        monkeypatch.setattr("src.api.performance_middleware.time.monotonic", lambda: now[0])
+
+        assert limiter.check("1.2.3.4") == (True, 0)
+        assert limiter.check("1.2.3.4") == (False, 0)
+        now[0] += 61
+        assert limiter.check("1.2.3.4") == (True, 0)
+
+
+class TestSharedTiming:
+    """Test that one measurement feeds every consumer."""
+
+    @pytest.mark.asyncio
+    async def test_observers_get_route_template(self):
+        observer = RecordingObserver()
+        audit = RecordingAuditHook()
+        app = build_app(observers=[observer], audit_hook=audit)
+
+        async with client_for(app) as client:
+            await client.get("/api/tutors/t42")
+            await client.post("/api/tutors")
+
+        get_timing, post_timing = observer.timings
+        assert get_timing.route == "/api/tutors/{tutor_id}"
+        assert get_timing.path == "/api/tutors/t42"
+        assert get_timing.status_code == 200
+
+        # The audit hook receives the same timing object as the observers
+        assert audit.timings == [post_timing]
+
+    @pytest.mark.asyncio
+    async def test_failing_observer_does_not_break_request(self):
+        class BrokenObserver(RequestObserver):
+            def request_finished(self, timing):
+                raise RuntimeError("boom")
+
+        app = build_app(observers=[BrokenObserver()])
+
+        async with client_for(app) as client:
+            response = await client.get("/api/tutors/t1")
+
+        assert response.status_code == 200
+
+
+class TestStreaming:
+    """Test that streaming responses pass through unbuffered."""
+
+    @pytest.mark.asyncio
+    async def test_body_chunks_forwarded_as_sent(self):
+        observer = RecordingObserver()
+        forwarded = []
+
+        async def streaming_app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            for i in range(3):
+                await send({"type": "http.response.body", "body": f"{i}\n".encode(), "more_body": True})
+                # Each chunk reaches the server before the next is produced
+                assert len(forwarded) == i + 2
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        async def send(message):
+            forwarded.append(message)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        middleware = PerformanceMiddleware(streaming_app, observers=[observer])
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/stream",
+            "headers": [],
+            "client": ("127.0.0.1", 1234),
+        }
+        await middleware(scope, receive, send)
+
+        assert [m["type"] for m in forwarded] == ["http.response.start"] + ["http.response.body"] * 4
+        assert any(name == b"server-timing" for name, _ in forwarded[0]["headers"])
+        assert len(observer.timings) == 1
+        assert middleware.get_stats()["total_requests"] == 1
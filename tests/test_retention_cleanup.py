@@ -0,0 +1,180 @@
+"""
+Tests for chunked, resumable retention cleanup.
+
+Statements are checked by compiling them for PostgreSQL; the chunk loop runs
+against a fake session, so no database is required.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql.elements import TextClause
+
+from src.database.retention import (
+    PHASE_DONE,
+    PHASE_ORPHAN_STUDENTS,
+    PHASE_SESSIONS,
+    RetentionCleanup,
+    expired_sessions_delete,
+    orphan_students_delete,
+    run_chunk_with_retry,
+)
+
+
+def compile_sql(stmt) -> str:
+    return " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+
+
+class FakeDB:
+    """Minimal session: one checkpoint row and scripted DELETE results."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def get(self, model, key):
+        return self.store["checkpoint"]
+
+    def add(self, row):
+        self.store["checkpoint"] = row
+
+    def commit(self):
+        self.store["commits"] += 1
+
+    def execute(self, stmt):
+        if isinstance(stmt, TextClause):
+            self.store["settings"].append(stmt.text)
+            return None
+        self.store["statements"].append(stmt)
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = self.store["chunks"].pop(0)
+        return result
+
+
+def make_store(chunks, checkpoint=None):
+    return {"checkpoint": checkpoint, "chunks": list(chunks), "statements": [], "settings": [], "commits": 0}
+
+
+class TestStatements:
+    """Test generated DELETE statements."""
+
+    def test_expired_sessions_chunk(self):
+        sql = compile_sql(expired_sessions_delete(datetime(2024, 1, 1), 500))
+
+        assert sql.startswith("WITH doomed AS")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "DELETE FROM sessions" in sql
+        assert "RETURNING sessions.session_id" in sql
+
+    def test_orphan_students_anti_join_with_cursor(self):
+        sql = compile_sql(orphan_students_delete(datetime(2024, 1, 1), "stu_0100", 500))
+
+        assert "NOT (EXISTS (SELECT * FROM sessions WHERE sessions.student_id = students.student_id))" in sql
+        assert "students.student_id > " in sql
+        assert "FOR UPDATE OF students SKIP LOCKED" in sql
+        assert "RETURNING students.student_id" in sql
+
+    def test_orphan_students_without_cursor(self):
+        sql = compile_sql(orphan_students_delete(datetime(2024, 1, 1), None, 500))
+
+        assert "students.student_id > " not in sql
+
+
+class TestRetentionCleanup:
+    """Test the chunk loop and checkpointing."""
+
+    def test_runs_both_phases_to_completion(self):
+        store = make_store([
+            ["s1", "s2"], ["s3"], [],           # sessions
+            ["stu_a", "stu_c"], [],             # orphan students
+        ])
+
+        stats = RetentionCleanup(lambda: FakeDB(store), chunk_size=2).run(days_to_keep=90)
+
+        assert stats["sessions_deleted"] == 3
+        assert stats["students_deleted"] == 2
+        assert stats["chunks"] == 5
+        assert stats["completed"] is True
+        assert store["checkpoint"].phase == PHASE_DONE
+        assert store["checkpoint"].completed_at is not None
+        # Every chunk is bounded by its own lock and statement timeouts
+        assert store["settings"].count("SET LOCAL lock_timeout = 2000") == 5
+
+    def test_orphan_cursor_advances(self):
+        store = make_store([[], ["stu_b", "stu_a"], []])
+
+        RetentionCleanup(lambda: FakeDB(store)).run(days_to_keep=90)
+
+        last_sql = compile_sql(store["statements"][-1])
+        params = store["statements"][-1].compile(dialect=postgresql.dialect()).params
+        assert "students.student_id > " in last_sql
+        assert "stu_b" in params.values()
+
+    def test_resumes_from_checkpoint(self):
+        cutoff = datetime(2024, 1, 1)
+        checkpoint = SimpleNamespace(
+            job_name="cleanup_old_data",
+            cutoff=cutoff,
+            phase=PHASE_ORPHAN_STUDENTS,
+            cursor="stu_m",
+            rows_deleted={PHASE_SESSIONS: 1000},
+            completed_at=None,
+        )
+        store = make_store([["stu_z"], []], checkpoint=checkpoint)
+
+        stats = RetentionCleanup(lambda: FakeDB(store)).run(days_to_keep=1)
+
+        assert stats["resumed"] is True
+        assert stats["cutoff_date"] == cutoff.isoformat()
+        assert stats["sessions_deleted"] == 1000
+        assert stats["students_deleted"] == 1
+        assert len(store["statements"]) == 2
+
+    def test_time_budget_leaves_run_resumable(self):
+        store = make_store([["s1"]] * 10)
+
+        stats = RetentionCleanup(lambda: FakeDB(store), time_budget_seconds=0).run(days_to_keep=90)
+
+        assert stats["completed"] is False
+        assert stats["chunks"] == 0
+        assert store["checkpoint"].phase == PHASE_SESSIONS
+        assert store["checkpoint"].cutoff < datetime.utcnow() - timedelta(days=89)
+
+
+class TestChunkRetry:
+    """Test the shared timeout retry for chunk transactions."""
+
+    def test_retries_timed_out_chunk(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr("src.database.retention.time.sleep", sleeps.append)
+        outcomes = [OperationalError("DELETE", {}, Exception("lock timeout")), "done"]
+
+        def chunk():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert run_chunk_with_retry(chunk, attempts=3, describe="Test chunk") == "done"
+        assert sleeps == [1]
+
+    def test_gives_up_after_attempts(self, monkeypatch):
+        monkeypatch.setattr("src.database.retention.time.sleep", lambda seconds: None)
+        calls = []
+
+        def chunk():
+            calls.append(1)
+            raise OperationalError("DELETE", {}, Exception("statement timeout"))
+
+        with pytest.raises(OperationalError):
+            run_chunk_with_retry(chunk, attempts=2, describe="Test chunk")
+        assert len(calls) == 2
@@ -0,0 +1,208 @@
+"""
+Tests for the mergeable latency sketch and the per-route latency recorder.
+"""
+
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.api.latency_sketch import LatencySketch
+from src.api.performance_middleware import RequestTiming
+from src.api.route_latency import RouteLatencyRecorder
+
+
+def timing(route="/api/tutors/{tutor_id}", status_code=200, duration_ms=10.0, method="GET"):
+    return RequestTiming(
+        method=method,
+        path=route,
+        route=route,
+        status_code=status_code,
+        duration_ms=duration_ms,
+        client_ip="127.0.0.1",
+        scope={},
+    )
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for HINCRBY/HGETALL pipelines."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=True):
+        redis = self
+        ops = []
+
+        class Pipeline:
+            def hincrby(self, key, field, amount):
+                ops.append(("incr", key, field, amount, int))
+
+            def hincrbyfloat(self, key, field, amount):
+                ops.append(("incr", key, field, amount, float))
+
+            def expire(self, key, seconds):
+                ops.append(("expire", key, seconds))
+
+            def hgetall(self, key):
+                ops.append(("get", key))
+
+            async def execute(self):
+                results = []
+                for op in ops:
+                    if op[0] == "incr":
+                        fields = redis.hashes.setdefault(op[1], {})
+                        cast = op[4]
+                        fields[op[2]] = str(cast(fields.get(op[2], 0)) + op[3])
+                    elif op[0] == "expire":
+                        redis.ttls[op[1]] = op[2]
+                    else:
+                        results.append(dict(redis.hashes.get(op[1], {})))
+                return results
+
+        return Pipeline()
+
+
+def connected(client):
+    service = MagicMock()
+    service._connected = True
+    service.redis_client = client
+    return service
+
+
+class TestLatencySketch:
+    """Test sketch accuracy and merging."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Test that quantiles stay within 1% of the exact values."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(3, 1) for _ in range(20000)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        exact = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            expected = exact[int(q * (len(exact) - 1))]
+            assert sketch.quantile(q) == pytest.approx(expected, rel=0.011)
+        assert sketch.count == 20000
+        assert len(sketch.bins) < 1000
+
+    def test_merge_equals_single_sketch(self):
+        """Test that merging partial sketches matches one sketch of all values."""
+        values = [float(v) for v in range(1, 1001)]
+        whole, left, right = LatencySketch(), LatencySketch(), LatencySketch()
+        for value in values:
+            whole.add(value)
+            (left if value % 2 else right).add(value)
+
+        merged = left.merge(right)
+
+        assert merged.bins == whole.bins
+        assert merged.quantile(0.95) == whole.quantile(0.95)
+        assert merged.sum == whole.sum
+
+    def test_merge_rejects_different_accuracy(self):
+        """Test that sketches with different bucketing cannot be merged."""
+        with pytest.raises(ValueError, match="different relative accuracy"):
+            LatencySketch(0.01).merge(LatencySketch(0.02))
+
+    def test_zero_bucket_and_empty(self):
+        """Test tiny values and an empty sketch."""
+        sketch = LatencySketch()
+        assert sketch.quantile(0.5) is None
+        assert sketch.summary() == {"count": 0}
+
+        sketch.add(0.0)
+        sketch.add(5.0)
+
+        assert sketch.zero_count == 1
+        assert sketch.quantile(0.0) == 0.0
+        assert sketch.quantile(1.0) == 5.0
+
+    def test_round_trip(self):
+        """Test dict serialization."""
+        sketch = LatencySketch()
+        for value in (1.5, 20.0, 300.0):
+            sketch.add(value)
+
+        restored = LatencySketch.from_dict(sketch.to_dict())
+
+        assert restored.bins == sketch.bins
+        assert restored.quantile(0.5) == sketch.quantile(0.5)
+        assert restored.max == 300.0
+
+
+class TestRouteLatencyRecorder:
+    """Test per-route sketches, Redis merging and windows."""
+
+    def test_series_per_route_and_status_class(self):
+        """Test that requests are split by method, route and status class."""
+        recorder = RouteLatencyRecorder()
+        recorder.request_finished(timing(duration_ms=10))
+        recorder.request_finished(timing(duration_ms=20))
+        recorder.request_finished(timing(status_code=404, duration_ms=2))
+        recorder.request_finished(timing(route="/metrics"))
+
+        sketches = recorder._merge_local(window_minutes=5)
+
+        assert set(sketches) == {
+            ("GET", "/api/tutors/{tutor_id}", "2xx"),
+            ("GET", "/api/tutors/{tutor_id}", "4xx"),
+        }
+        assert sketches[("GET", "/api/tutors/{tutor_id}", "2xx")].count == 2
+
+    @pytest.mark.asyncio
+    async def test_workers_merge_in_redis(self):
+        """Test that two workers' flushes combine into one distribution."""
+        client = FakeRedis()
+        first = RouteLatencyRecorder(connected(client))
+        second = RouteLatencyRecorder(connected(client))
+        for value in range(1, 51):
+            first.request_finished(timing(duration_ms=float(value)))
+            second.request_finished(timing(duration_ms=float(value + 50)))
+
+        assert await first.flush() == 1
+        assert await second.flush() == 1
+        summary = await first.route_summary(window_minutes=5)
+
+        assert summary["source"] == "redis"
+        [route] = summary["routes"]
+        assert route["count"] == 100
+        assert route["p50_ms"] == pytest.approx(50, rel=0.02)
+        assert route["p99_ms"] == pytest.approx(99, rel=0.02)
+        assert route["mean_ms"] == pytest.approx(50.5)
+        assert summary["status_codes"] == {"2xx": 100}
+
+        minute_keys = [key for key in client.ttls if ":m:" in key]
+        hour_keys = [key for key in client.ttls if ":h:" in key]
+        assert client.ttls[minute_keys[0]] == 3 * 3600
+        assert client.ttls[hour_keys[0]] == 7 * 86400
+
+    @pytest.mark.asyncio
+    async def test_long_windows_use_hour_sketches(self):
+        """Test that windows beyond minute retention read hourly keys."""
+        client = FakeRedis()
+        recorder = RouteLatencyRecorder(connected(client))
+        recorder.request_finished(timing(duration_ms=42))
+        await recorder.flush()
+        client.hashes = {key: value for key, value in client.hashes.items() if ":h:" in key}
+
+        assert (await recorder.route_summary(window_minutes=60))["routes"] == []
+        [route] = (await recorder.route_summary(window_minutes=24 * 60))["routes"]
+        assert route["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_local_fallback_without_redis(self):
+        """Test that queries fall back to this process's sketches."""
+        service = connected(MagicMock())
+        service.redis_client.pipeline.return_value.execute = AsyncMock(side_effect=ConnectionError("down"))
+        recorder = RouteLatencyRecorder(service)
+        recorder.request_finished(timing(status_code=503, duration_ms=100))
+
+        assert await recorder.flush() == 0
+        summary = await recorder.route_summary(window_minutes=5, status="5xx")
+
+        assert summary["source"] == "local"
+        assert summary["routes"][0]["p50_ms"] == pytest.approx(100, rel=0.01)
@@ -0,0 +1,152 @@
+"""
+Tests for the histogram-bucketed SLA response time store.
+
+Covers bucket assignment, aggregation of samples into minute and hour
+histogram rows, quantile estimation and stats built from one grouped query.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.api.sla_tracking_service import (
+    APIResponseSample,
+    SLATrackingService,
+    build_histogram_rows,
+    histogram_quantile,
+    latency_bucket,
+)
+from src.api.time_buckets import HOUR_BUCKET, MINUTE_BUCKET
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def sample(endpoint, response_time_ms, recorded_at, status_code=200):
+    return APIResponseSample(endpoint, response_time_ms, status_code, recorded_at)
+
+
+def fake_session_factory(session):
+    @asynccontextmanager
+    async def fake_db_session():
+        yield session
+    return fake_db_session
+
+
+class TestLatencyBuckets:
+    """Test bucket assignment and histogram rows."""
+
+    def test_bucket_bounds_are_exclusive(self):
+        assert latency_bucket(0.4) == 5.0
+        assert latency_bucket(499.9) == 500.0
+        # A sample at the target is a violation, so it is outside the within-target buckets
+        assert latency_bucket(500) == 750.0
+        assert latency_bucket(60000) == float("inf")
+
+    def test_minute_and_hour_rows(self):
+        samples = [
+            sample("/api/tutors", 40.0, utc(2025, 11, 14, 9, 15, 5)),
+            sample("/api/tutors", 45.0, utc(2025, 11, 14, 9, 15, 40)),
+            sample("/api/tutors", 620.0, utc(2025, 11, 14, 9, 16, 5)),
+        ]
+        rows = {
+            (r["bucket_size"], r["bucket_start"], r["le_ms"]): r
+            for r in build_histogram_rows(samples)
+        }
+
+        minute = rows[(MINUTE_BUCKET, utc(2025, 11, 14, 9, 15), 50.0)]
+        assert minute["sample_count"] == 2
+        assert minute["sum_ms"] == 85.0
+        assert minute["min_ms"] == 40.0
+        assert minute["max_ms"] == 45.0
+
+        assert rows[(HOUR_BUCKET, utc(2025, 11, 14, 9), 50.0)]["sample_count"] == 2
+        assert rows[(HOUR_BUCKET, utc(2025, 11, 14, 9), 750.0)]["sample_count"] == 1
+        assert len(rows) == 4
+        keys = [
+            (r["endpoint"], r["bucket_size"], r["bucket_start"], r["le_ms"])
+            for r in build_histogram_rows(samples)
+        ]
+        assert keys == sorted(keys)
+
+
+class TestHistogramQuantile:
+    """Test quantile estimation from bucket counts."""
+
+    def test_interpolates_within_bucket(self):
+        buckets = [(100.0, 50), (200.0, 50)]
+        assert histogram_quantile(0.5, buckets, 1.0, 200.0) == 100.0
+        assert histogram_quantile(0.75, buckets, 1.0, 200.0) == 150.0
+
+    def test_overflow_bucket_uses_max(self):
+        buckets = [(10000.0, 9), (float("inf"), 1)]
+        assert histogram_quantile(1.0, buckets, 1.0, 30000.0) == 30000.0
+
+    def test_clamped_to_observed_range(self):
+        assert histogram_quantile(0.5, [(100.0, 3)], 80.0, 90.0) == 80.0
+        assert histogram_quantile(0.5, [], 0.0, 0.0) == 0.0
+
+
+class TestRecordAndStats:
+    """Test writes and stats against the histogram table."""
+
+    @pytest.mark.asyncio
+    async def test_only_violations_are_stored_raw(self):
+        session = Mock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+
+        samples = [
+            sample("/api/tutors", 40.0, utc(2025, 11, 14, 9, 15)),
+            sample("/api/tutors", 900.0, utc(2025, 11, 14, 9, 15), status_code=504),
+        ]
+        with patch("src.api.sla_tracking_service.get_db_session", fake_session_factory(session)):
+            recorded = await SLATrackingService().record_api_response_times(samples)
+
+        assert recorded == 2
+        [raw_rows] = session.add_all.call_args.args
+        assert [row.metric_value for row in raw_rows] == [900.0]
+        assert raw_rows[0].meets_sla is False
+        # One upsert for all histogram rows
+        session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stats_from_single_grouped_query(self):
+        result = Mock()
+        result.all.return_value = [
+            (50.0, 900, 27000.0, 12.0, 50.0),
+            (500.0, 80, 24000.0, 210.0, 480.0),
+            (1000.0, 20, 15000.0, 600.0, 990.0),
+        ]
+        session = Mock()
+        session.execute = AsyncMock(return_value=result)
+
+        with patch("src.api.sla_tracking_service.get_db_session", fake_session_factory(session)):
+            stats = await SLATrackingService().calculate_api_response_time_stats(hours=24)
+
+        session.execute.assert_awaited_once()
+        assert stats["sample_count"] == 1000
+        assert stats["average_ms"] == 66.0
+        assert stats["min_ms"] == 12.0
+        assert stats["max_ms"] == 990.0
+        assert stats["p50_ms"] < 50
+        assert stats["p95_ms"] == 331.25  # 50 + 450 * (950 - 900) / 80
+        assert stats["meets_p95_sla"] is True
+        assert stats["meets_p99_sla"] is True
+        assert stats["within_p95_target_percentage"] == 98.0
+
+    @pytest.mark.asyncio
+    async def test_no_samples(self):
+        result = Mock()
+        result.all.return_value = []
+        session = Mock()
+        session.execute = AsyncMock(return_value=result)
+
+        with patch("src.api.sla_tracking_service.get_db_session", fake_session_factory(session)):
+            stats = await SLATrackingService().calculate_api_response_time_stats(endpoint="/api/x")
+
+        assert stats["sample_count"] == 0
+        assert stats["endpoint"] == "/api/x"
+        assert stats["meets_p95_sla"] is True
@@ -0,0 +1,184 @@
+"""
+Tests for the async Redis Streams transport.
+
+Uses a mocked async Redis client, so no Redis server is required.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from redis.exceptions import ResponseError
+
+from src.queue.serializer import MessageSerializer
+from src.queue.stream_transport import Backpressure, StreamTransport, TrimPolicy
+
+
+def make_transport(**kwargs):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=["1-0", "1-1"])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+
+    client = MagicMock()
+    client.pipeline.return_value = pipe
+    client.xlen = AsyncMock(return_value=0)
+    client.xack = AsyncMock(return_value=1)
+    client.xgroup_create = AsyncMock(return_value=True)
+
+    kwargs.setdefault("trim_policy", TrimPolicy(strategy="maxlen", maxlen=1000))
+    return StreamTransport(client, **kwargs), client, pipe
+
+
+class TestTrimPolicy:
+    """Test XADD trimming arguments."""
+
+    def test_maxlen(self):
+        assert TrimPolicy(strategy="maxlen", maxlen=500).xadd_kwargs() == {"maxlen": 500, "approximate": True}
+
+    def test_minid_uses_retention_window(self):
+        policy = TrimPolicy(strategy="minid", retention_seconds=60)
+        assert policy.xadd_kwargs(now_ms=120_000) == {"minid": 60_000, "approximate": True}
+
+    def test_none(self):
+        assert TrimPolicy(strategy="none").xadd_kwargs() == {}
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            TrimPolicy(strategy="ttl").xadd_kwargs()
+
+
+class TestPublish:
+    """Test pipelined publishing."""
+
+    @pytest.mark.asyncio
+    async def test_entries_share_one_pipeline(self):
+        transport, client, pipe = make_transport()
+
+        ids = await transport.publish_entries([
+            ("tutormax:tutors:enrichment", {"tutor_id": "t1"}, {"validated_at": "now"}),
+            ("tutormax:dead_letter", {"tutor_id": "t2"}, None),
+        ])
+
+        assert ids == ["1-0", "1-1"]
+        client.pipeline.assert_called_once_with(transaction=False)
+        pipe.execute.assert_awaited_once()
+
+        (channel, fields), kwargs = pipe.xadd.call_args_list[0]
+        assert channel == "tutormax:tutors:enrichment"
+        assert kwargs == {"maxlen": 1000, "approximate": True}
+
+        message = MessageSerializer.deserialize(fields["message"])
+        assert message["data"] == {"tutor_id": "t1"}
+        assert message["metadata"] == {"validated_at": "now"}
+
+    @pytest.mark.asyncio
+    async def test_empty_publish_skips_redis(self):
+        transport, client, _ = make_transport()
+
+        assert await transport.publish_many("q", []) == []
+        client.pipeline.assert_not_called()
+
+
+class TestRead:
+    """Test consumer-group reads."""
+
+    @pytest.mark.asyncio
+    async def test_bad_entries_are_acked_and_dropped(self):
+        transport, client, _ = make_transport()
+        good = MessageSerializer.serialize("tutormax:tutors", {"tutor_id": "t1"})
+        client.xreadgroup = AsyncMock(return_value=[
+            ("tutormax:tutors", [("1-0", {"message": good}), ("1-1", {"message": "not json"})]),
+        ])
+
+        messages = await transport.read(["tutormax:tutors"], "workers", "c1", count=5)
+
+        assert [m["_redis_id"] for m in messages] == ["1-0"]
+        assert messages[0]["_stream"] == "tutormax:tutors"
+        client.xack.assert_awaited_once_with("tutormax:tutors", "workers", "1-1")
+
+    @pytest.mark.asyncio
+    async def test_group_created_once(self):
+        transport, client, _ = make_transport()
+        client.xreadgroup = AsyncMock(return_value=[])
+
+        await transport.read(["a", "b"], "workers", "c1")
+        await transport.read(["a", "b"], "workers", "c1")
+
+        assert client.xgroup_create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_existing_group_is_not_an_error(self):
+        transport, client, _ = make_transport()
+        client.xgroup_create.side_effect = ResponseError("BUSYGROUP Consumer Group name already exists")
+
+        assert await transport.ensure_group("a", "workers") is False
+
+    @pytest.mark.asyncio
+    async def test_claim_resumes_and_drops_trimmed_entries(self):
+        transport, client, _ = make_transport()
+        good = MessageSerializer.serialize("s", {"tutor_id": "t1"})
+        client.xautoclaim = AsyncMock(side_effect=[
+            ["5-0", [("1-0", {"message": good}), ("2-0", None)], []],
+            ["0-0", [], []],
+        ])
+
+        messages = await transport.claim(["s"], "workers", "c2", min_idle_ms=60_000, count=2)
+        await transport.claim(["s"], "workers", "c2", min_idle_ms=60_000, count=2)
+
+        assert [m["_redis_id"] for m in messages] == ["1-0"]
+        client.xack.assert_awaited_once_with("s", "workers", "2-0")
+        first, second = client.xautoclaim.await_args_list
+        assert first.args == ("s", "workers", "c2", 60_000)
+        assert first.kwargs == {"start_id": "0-0", "count": 2}
+        assert second.kwargs["start_id"] == "5-0"
+
+
+class TestBackpressure:
+    """Test lag measurement and admission thresholds."""
+
+    @pytest.mark.asyncio
+    async def test_lag_counts_undelivered_and_pending(self):
+        transport, client, _ = make_transport()
+        client.xinfo_groups = AsyncMock(return_value=[
+            {"name": "other", "lag": 999, "pending": 0},
+            {"name": "workers", "lag": 40, "pending": 2},
+        ])
+
+        assert await transport.lag("s", "workers") == 42
+
+    @pytest.mark.asyncio
+    async def test_lag_falls_back_to_length(self):
+        transport, client, _ = make_transport()
+        client.xinfo_groups = AsyncMock(return_value=[{"name": "workers", "lag": None, "pending": 3}])
+        client.xlen = AsyncMock(return_value=17)
+
+        assert await transport.lag("s", "workers") == 17
+
+    @pytest.mark.asyncio
+    async def test_missing_stream_has_no_lag(self):
+        transport, client, _ = make_transport()
+        client.xinfo_groups = AsyncMock(side_effect=ResponseError("no such key"))
+
+        assert await transport.lag("s", "workers") == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("lag, state", [
+        (10, Backpressure.OK),
+        (51, Backpressure.THROTTLE),
+        (91, Backpressure.REJECT),
+    ])
+    async def test_thresholds(self, lag, state):
+        transport, client, _ = make_transport(soft_lag=50, hard_lag=90)
+        client.xinfo_groups = AsyncMock(return_value=[{"name": "workers", "lag": lag, "pending": 0}])
+
+        assert await transport.backpressure("s", "workers") == (state, lag)
+
+    @pytest.mark.asyncio
+    async def test_lag_reading_is_cached(self):
+        transport, client, _ = make_transport(check_interval_ms=60_000)
+        client.xinfo_groups = AsyncMock(return_value=[{"name": "workers", "lag": 1, "pending": 0}])
+
+        await transport.backpressure("s", "workers")
+        await transport.backpressure("s", "workers")
+
+        client.xinfo_groups.assert_awaited_once()
@@ -0,0 +1,128 @@
+"""
+Tests for the tutor profile assembly service.
+
+Uses a fake session factory so each profile section query can be observed
+without a database.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+
+from src.api.tutor_profile_service import (
+    TutorProfileAssembler,
+    invalidate_tutor_profiles_sync,
+)
+
+
+class FakeSession:
+    """Async session stand-in that tracks concurrent use."""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    async def __aenter__(self):
+        self.tracker["open"] += 1
+        self.tracker["max_open"] = max(self.tracker["max_open"], self.tracker["open"])
+        return self
+
+    async def __aexit__(self, *exc):
+        self.tracker["open"] -= 1
+        return False
+
+
+def make_factory():
+    tracker = {"open": 0, "max_open": 0}
+    return (lambda: FakeSession(tracker)), tracker
+
+
+def patch_sections(assembler, tutor=Mock(tutor_id="tutor_001"), **overrides):
+    """Replace each section query with a coroutine that yields control first."""
+    results = {
+        "_fetch_tutor": tutor,
+        "_fetch_latest_prediction": None,
+        "_fetch_latest_metrics": None,
+        "_fetch_interventions": [],
+        "_fetch_manager_notes": [],
+        "_fetch_recent_feedback": [],
+    }
+    results.update(overrides)
+
+    for name, value in results.items():
+        async def section(session, tutor_id, value=value):
+            await asyncio.sleep(0)
+            if isinstance(value, Exception):
+                raise value
+            return value
+        setattr(assembler, name, section)
+
+
+@pytest.mark.asyncio
+async def test_fetch_runs_sections_concurrently():
+    factory, tracker = make_factory()
+    assembler = TutorProfileAssembler(session_factory=factory)
+    patch_sections(assembler, _fetch_interventions=["intv_1"])
+
+    data = await assembler.fetch("tutor_001")
+
+    assert data is not None
+    assert data.interventions == ["intv_1"]
+    assert tracker["max_open"] == 6
+    assert tracker["open"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_returns_none_for_unknown_tutor():
+    factory, _ = make_factory()
+    assembler = TutorProfileAssembler(session_factory=factory)
+    patch_sections(assembler, tutor=None)
+
+    assert await assembler.fetch("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_optional_sections_degrade_to_empty():
+    factory, _ = make_factory()
+    assembler = TutorProfileAssembler(session_factory=factory)
+    patch_sections(
+        assembler,
+        _fetch_manager_notes=RuntimeError("relation does not exist"),
+        _fetch_recent_feedback=RuntimeError("timeout"),
+    )
+
+    data = await assembler.fetch("tutor_001")
+
+    assert data.manager_notes == []
+    assert data.recent_feedback == []
+
+
+@pytest.mark.asyncio
+async def test_required_section_errors_propagate():
+    factory, _ = make_factory()
+    assembler = TutorProfileAssembler(session_factory=factory)
+    patch_sections(assembler, _fetch_interventions=RuntimeError("boom"))
+
+    with pytest.raises(RuntimeError):
+        await assembler.fetch("tutor_001")
+
+
+def test_sync_invalidation_deletes_profile_keys():
+    client = Mock()
+    client.delete.return_value = 2
+
+    with patch("src.api.tutor_profile_service.redis.Redis.from_url", return_value=client):
+        deleted = invalidate_tutor_profiles_sync(["tutor_001", "tutor_002", "tutor_001"])
+
+    assert deleted == 2
+    keys = set(client.delete.call_args[0])
+    assert keys == {
+        "tutormax:cache:tutor_profile:tutor_001",
+        "tutormax:cache:tutor_profile:tutor_002",
+    }
+    client.close.assert_called_once()
+
+
+def test_sync_invalidation_noop_without_tutors():
+    with patch("src.api.tutor_profile_service.redis.Redis.from_url") as from_url:
+        assert invalidate_tutor_profiles_sync([]) == 0
+    from_url.assert_not_called()
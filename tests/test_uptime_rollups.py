@@ -0,0 +1,120 @@
+"""
+Tests for uptime rollups.
+
+Covers rollup row aggregation, splitting report windows into minute and
+hour bucket ranges, and building reports from one grouped query.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.api.uptime_service import (
+    HOUR_BUCKET,
+    MINUTE_BUCKET,
+    ServiceStatus,
+    UptimeMonitor,
+    bucket_start,
+    build_rollup_rows,
+    rollup_ranges,
+)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestBuildRollupRows:
+    """Test aggregation of checks into rollup rows."""
+
+    def test_minute_and_hour_rows(self):
+        checks = [
+            {"service": "redis", "status": ServiceStatus.UP, "latency_ms": 2.0, "checked_at": utc(2025, 11, 12, 9, 15, 5)},
+            {"service": "redis", "status": ServiceStatus.DOWN, "latency_ms": 50.0, "checked_at": utc(2025, 11, 12, 9, 15, 40)},
+            {"service": "redis", "status": ServiceStatus.UP, "latency_ms": 4.0, "checked_at": utc(2025, 11, 12, 9, 16, 5)},
+        ]
+        rows = {(r["bucket_size"], r["bucket_start"]): r for r in build_rollup_rows(checks)}
+
+        minute = rows[(MINUTE_BUCKET, utc(2025, 11, 12, 9, 15))]
+        assert minute["total_checks"] == 2
+        assert minute["up_checks"] == 1
+        assert minute["up_latency_sum_ms"] == 2.0
+        assert minute["max_latency_ms"] == 50.0
+
+        hour = rows[(HOUR_BUCKET, utc(2025, 11, 12, 9))]
+        assert hour["total_checks"] == 3
+        assert hour["up_checks"] == 2
+        assert hour["up_latency_sum_ms"] == 6.0
+        assert len(rows) == 3
+
+    def test_naive_timestamps_are_utc(self):
+        assert bucket_start(datetime(2025, 11, 12, 9, 15, 30), HOUR_BUCKET) == utc(2025, 11, 12, 9)
+
+
+class TestRollupRanges:
+    """Test splitting report windows into bucket ranges."""
+
+    retention = utc(2025, 11, 1)
+
+    def test_edges_use_minutes_and_middle_uses_hours(self):
+        ranges = rollup_ranges(utc(2025, 11, 12, 9, 20), utc(2025, 11, 12, 12, 40, 30), self.retention)
+
+        assert ranges == [
+            (MINUTE_BUCKET, utc(2025, 11, 12, 9, 20), utc(2025, 11, 12, 10)),
+            (HOUR_BUCKET, utc(2025, 11, 12, 10), utc(2025, 11, 12, 12)),
+            (MINUTE_BUCKET, utc(2025, 11, 12, 12), utc(2025, 11, 12, 12, 41)),
+        ]
+
+    def test_window_within_an_hour_uses_minutes(self):
+        ranges = rollup_ranges(utc(2025, 11, 12, 9, 20), utc(2025, 11, 12, 9, 50), self.retention)
+        assert ranges == [(MINUTE_BUCKET, utc(2025, 11, 12, 9, 20), utc(2025, 11, 12, 9, 51))]
+
+    def test_aligned_window_has_no_minute_edges(self):
+        ranges = rollup_ranges(utc(2025, 11, 12, 9), utc(2025, 11, 12, 11, 59), self.retention)
+        assert ranges == [(HOUR_BUCKET, utc(2025, 11, 12, 9), utc(2025, 11, 12, 12))]
+
+    def test_start_older_than_minute_retention_widens_to_hour(self):
+        ranges = rollup_ranges(utc(2025, 10, 20, 9, 20), utc(2025, 11, 12, 9, 30), self.retention)
+        assert ranges[0] == (HOUR_BUCKET, utc(2025, 10, 20, 9), utc(2025, 11, 12, 9))
+        assert ranges[1] == (MINUTE_BUCKET, utc(2025, 11, 12, 9), utc(2025, 11, 12, 9, 31))
+
+    def test_window_older_than_minute_retention_uses_hours(self):
+        ranges = rollup_ranges(utc(2025, 10, 20, 9, 20), utc(2025, 10, 21, 9, 30), self.retention)
+        assert ranges == [(HOUR_BUCKET, utc(2025, 10, 20, 9), utc(2025, 10, 21, 10))]
+
+
+class TestUptimeReport:
+    """Test reports built from rollup aggregates."""
+
+    @pytest.mark.asyncio
+    async def test_report_uses_single_grouped_query(self):
+        result = Mock()
+        result.all.return_value = [
+            ("api", 1440, 1440, 0.0, 0.0),
+            ("redis", 1440, 1430, 2860.0, 120.0),
+            ("postgresql", 1440, 1440, 7200.0, 40.0),
+        ]
+        session = Mock()
+        session.execute = AsyncMock(return_value=result)
+
+        @asynccontextmanager
+        async def fake_db_session():
+            yield session
+
+        with patch("src.api.uptime_service.get_db_session", fake_db_session), \
+                patch("src.api.uptime_service.HealthCheck"):
+            report = await UptimeMonitor().get_uptime_report(hours=24)
+
+        session.execute.assert_awaited_once()
+
+        redis = report["services"]["redis"]
+        assert redis["total_checks"] == 1440
+        assert redis["failed_checks"] == 10
+        assert redis["uptime_percentage"] == round(1430 / 1440 * 100, 3)
+        assert redis["avg_latency_ms"] == 2.0
+        assert redis["max_latency_ms"] == 120.0
+
+        # Services without rollups report zero checks
+        assert report["services"]["celery_workers"]["total_checks"] == 0
+        assert report["meets_sla"] is False
@@ -0,0 +1,172 @@
+"""
+Tests for Celery workload routing, worker profiles and chunked fan-out.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.workers.celery_app import celery_app
+from src.workers.workloads import (
+    QUEUE_NAMES,
+    WORKER_PROFILES,
+    chunked,
+    get_profile,
+)
+
+
+def route_queue(task_name: str) -> str:
+    return celery_app.amqp.router.route({}, task_name)["queue"].name
+
+
+def run_now(result):
+    """Stand-in for run_async that discards the coroutine."""
+    def run(coro):
+        coro.close()
+        return result
+    return run
+
+
+class TestTaskRouting:
+    """Test that tasks land on the queue for their workload class."""
+
+    @pytest.mark.parametrize("task_name,queue", [
+        ("src.workers.tasks.uptime_monitor.record_health_checks", "realtime"),
+        ("src.workers.tasks.alerting.check_infrastructure", "realtime"),
+        ("src.workers.tasks.uptime_monitor.generate_uptime_report", "default"),
+        ("email_workflows.send_feedback_reminders", "email"),
+        ("data_generator.generate_data_continuous", "data_generation"),
+        ("src.workers.tasks.performance_evaluator.evaluate_tutor_chunk", "evaluation"),
+        ("scheduled_reports.generate_weekly_report", "reports"),
+        ("src.workers.tasks.churn_predictor.predict_churn_chunk", "prediction"),
+        ("src.workers.tasks.model_trainer.train_models", "training"),
+    ])
+    def test_route(self, task_name, queue):
+        """Test the queue each task is routed to."""
+        assert route_queue(task_name) == queue
+
+    def test_beat_entries_use_declared_queues(self):
+        """Test that every periodic task targets a queue some profile consumes."""
+        consumed = {q for profile in WORKER_PROFILES.values() for q in profile.queues}
+        assert consumed == set(QUEUE_NAMES)
+
+        for name, entry in celery_app.conf.beat_schedule.items():
+            assert entry["options"]["queue"] in consumed, name
+
+    def test_minute_level_tasks_are_realtime(self):
+        """Test that frequent monitors run apart from long jobs."""
+        schedule = celery_app.conf.beat_schedule
+        assert schedule["record-health-checks-every-minute"]["options"]["queue"] == "realtime"
+        assert schedule["check-infrastructure-every-2-min"]["options"]["queue"] == "realtime"
+
+
+class TestWorkerProfiles:
+    """Test worker profile definitions."""
+
+    def test_long_jobs_prefetch_one(self):
+        """Test that long-running profiles only reserve the task they run."""
+        assert get_profile("ml").prefetch_multiplier == 1
+        assert get_profile("batch").prefetch_multiplier == 1
+        assert get_profile("ml").pool == "prefork"
+
+    def test_worker_args(self):
+        """Test the celery worker arguments for a profile."""
+        args = get_profile("ml").worker_args(concurrency=1)
+
+        assert "--queues=prediction,training" in args
+        assert "--concurrency=1" in args
+        assert "--prefetch-multiplier=1" in args
+        assert "--max-tasks-per-child=10" in args
+
+    def test_unknown_profile(self):
+        """Test that an unknown profile name is rejected."""
+        with pytest.raises(ValueError, match="Unknown worker profile"):
+            get_profile("gpu")
+
+    def test_chunked(self):
+        """Test splitting a population into chunks."""
+        assert chunked(list(range(5)), 2) == [[0, 1], [2, 3], [4]]
+        assert chunked([], 2) == []
+
+
+class TestChunkedFanOut:
+    """Test splitting tutor-population jobs into chord chunks."""
+
+    def test_performance_evaluation_fans_out(self):
+        """Test that large populations are dispatched as a chord."""
+        from src.workers.tasks import performance_evaluator
+
+        chunks = [["t1", "t2"], ["t3", "t4"], ["t5"]]
+        with patch.object(performance_evaluator, "run_async", side_effect=run_now((chunks, None))), \
+                patch.object(performance_evaluator, "chord") as mock_chord:
+            mock_chord.return_value.return_value.id = "summary-1"
+            stats = performance_evaluator.evaluate_tutor_performance.run()
+
+        header = list(mock_chord.call_args.args[0])
+        assert [sig.args for sig in header] == [(chunk,) for chunk in chunks]
+        assert stats["tutors_dispatched"] == 5
+        assert stats["chunks_dispatched"] == 3
+        assert stats["summary_task_id"] == "summary-1"
+
+    def test_small_population_runs_inline(self):
+        """Test that a single chunk is evaluated without a chord."""
+        from src.workers.tasks import performance_evaluator
+
+        result = {"tutors_evaluated": 2, "tutors_successful": 2, "tutors_failed": 0}
+        with patch.object(performance_evaluator, "run_async", side_effect=run_now(([["t1", "t2"]], result))), \
+                patch.object(performance_evaluator, "chord") as mock_chord:
+            stats = performance_evaluator.evaluate_tutor_performance.run()
+
+        mock_chord.assert_not_called()
+        assert stats["tutors_successful"] == 2
+
+    def test_performance_summary(self):
+        """Test that the chord callback adds up chunk results."""
+        from src.workers.tasks.performance_evaluator import summarize_performance_evaluation
+
+        stats = summarize_performance_evaluation.run(
+            [
+                {"tutors_evaluated": 2, "tutors_successful": 2, "tutors_failed": 0},
+                {"tutors_evaluated": 3, "tutors_successful": 1, "tutors_failed": 2},
+            ],
+            "2024-06-01T00:00:00",
+        )
+
+        assert stats["tutors_evaluated"] == 5
+        assert stats["tutors_failed"] == 2
+        assert stats["chunks"] == 2
+
+    def test_churn_batch_fans_out(self):
+        """Test that the daily churn batch is split by churn_batch_size."""
+        from src.workers.tasks import churn_predictor
+
+        db = MagicMock()
+        db.execute.return_value.scalars.return_value.all.return_value = [f"t{i}" for i in range(5)]
+        with patch.object(churn_predictor, "get_sync_session", return_value=db), \
+                patch.object(churn_predictor.worker_settings, "churn_batch_size", 2), \
+                patch.object(churn_predictor, "chord") as mock_chord:
+            mock_chord.return_value.return_value.id = "summary-2"
+            result = churn_predictor.batch_predict_churn.run(lookback_days=30)
+
+        header = list(mock_chord.call_args.args[0])
+        assert [sig.args for sig in header] == [
+            (["t0", "t1"], 30), (["t2", "t3"], 30), (["t4"], 30),
+        ]
+        assert result["status"] == "dispatched"
+        assert result["chunks_dispatched"] == 3
+        db.close.assert_called_once()
+
+    def test_churn_summary(self):
+        """Test that chunk risk distributions are combined."""
+        from src.workers.tasks.churn_predictor import summarize_churn_predictions
+
+        chunk = {
+            "tutors_processed": 2, "predictions_created": 2, "errors": 0,
+            "risk_distribution": {"LOW": 1, "MEDIUM": 0, "HIGH": 1, "CRITICAL": 0},
+            "model_version": "v1",
+        }
+        summary = summarize_churn_predictions.run([chunk, chunk], "2024-06-01T00:00:00")
+
+        assert summary["predictions_created"] == 4
+        assert summary["risk_distribution"] == {"LOW": 2, "MEDIUM": 0, "HIGH": 2, "CRITICAL": 0}
+        assert summary["model_version"] == "v1"
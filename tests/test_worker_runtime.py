@@ -0,0 +1,140 @@
+"""
+Tests for the per-process worker event loop and concurrent report delivery.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.workers.runtime import WorkerRuntime
+
+
+@pytest.fixture
+def runtime():
+    worker_runtime = WorkerRuntime(redis_url="redis://localhost:6379/15")
+    with patch("src.workers.runtime.engine_registry.dispose_async", new=AsyncMock()):
+        yield worker_runtime
+        worker_runtime.shutdown()
+
+
+async def current_loop():
+    return asyncio.get_running_loop()
+
+
+class TestWorkerRuntime:
+    """Test running task coroutines on the shared loop."""
+
+    def test_loop_is_reused_between_tasks(self, runtime):
+        """Test that consecutive tasks run on the same loop."""
+        first = runtime.run(current_loop())
+        second = runtime.run(current_loop())
+
+        assert first is second is runtime.loop
+        assert first.is_running()
+
+    def test_concurrent_tasks_from_threads(self, runtime):
+        """Test that tasks submitted from a threads pool overlap on the loop."""
+        async def task(i):
+            await asyncio.sleep(0.1)
+            return i
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: runtime.run(task(i)), range(8)))
+
+        assert results == list(range(8))
+        assert time.perf_counter() - started < 0.5
+
+    def test_exception_is_raised_in_caller(self, runtime):
+        """Test that a failing coroutine raises in the task thread."""
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            runtime.run(fail())
+        # The loop survives the failure
+        assert runtime.run(current_loop()).is_running()
+
+    def test_timeout_cancels_coroutine(self, runtime):
+        """Test that a timed out coroutine is cancelled on the loop."""
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            runtime.run(slow(), timeout=0.05)
+        assert cancelled.wait(1)
+
+    def test_run_on_loop_thread_is_rejected(self, runtime):
+        """Test that blocking on the loop from inside it fails instead of deadlocking."""
+        async def nested():
+            runtime.run(current_loop())
+
+        with pytest.raises(RuntimeError, match="await the coroutine"):
+            runtime.run(nested())
+
+    def test_reset_after_fork_starts_new_loop(self, runtime):
+        """Test that a forked child does not reuse the parent's loop."""
+        parent = runtime.run(current_loop())
+
+        runtime.reset_after_fork()
+        child = runtime.run(current_loop())
+
+        assert child is not parent
+        parent.call_soon_threadsafe(parent.stop)
+
+    def test_shutdown_closes_clients_and_stops_loop(self, runtime):
+        """Test that shutdown closes the shared Redis client and the loop."""
+        loop = runtime.loop
+        client = runtime.redis()
+        client.aclose = AsyncMock()
+
+        runtime.shutdown()
+
+        client.aclose.assert_awaited_once()
+        assert not runtime.started
+        assert loop.is_closed()
+
+
+class TestReportDelivery:
+    """Test sending scheduled reports to all recipients at once."""
+
+    @pytest.mark.asyncio
+    async def test_recipients_are_sent_concurrently(self):
+        """Test that slow SMTP sends overlap and failures are counted out."""
+        from src.workers.tasks import scheduled_reports
+
+        def send_report(to_email, subject, html_body, attachments):
+            time.sleep(0.1)
+            return to_email != "bad@example.com"
+
+        service = MagicMock()
+        service.send_report.side_effect = send_report
+        recipients = ["a@example.com", "b@example.com", "bad@example.com", "c@example.com"]
+
+        started = time.perf_counter()
+        with patch.object(scheduled_reports, "get_email_service_from_settings", return_value=service):
+            sent = await scheduled_reports._deliver_report(recipients, "Report", "<p>hi</p>", [], "weekly report")
+
+        assert sent == 3
+        assert service.send_report.call_count == 4
+        assert time.perf_counter() - started < 0.3
+
+    @pytest.mark.asyncio
+    async def test_smtp_not_configured(self):
+        """Test that nothing is sent without SMTP settings."""
+        from src.workers.tasks import scheduled_reports
+
+        with patch.object(scheduled_reports, "get_email_service_from_settings", return_value=None):
+            sent = await scheduled_reports._deliver_report(["a@example.com"], "Report", "", [], "weekly report")
+
+        assert sent == 0